@@ -0,0 +1,353 @@
+#############################################################################
+# Copyright (c) 2010 by Casey Duncan
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, 
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name(s) of the copyright holders nor the names of its
+#   contributors may be used to endorse or promote products derived from this
+#   software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AS IS AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO
+# EVENT SHALL THE COPYRIGHT HOLDERS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, 
+# OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#############################################################################
+
+"""Spatial indexing of bounded shapes and points"""
+
+from __future__ import division
+import math
+import heapq
+import planar
+from planar.util import is_buffer
+
+
+class RTree(object):
+    """Static R-tree spatial index for efficiently finding shapes by their
+    location. The tree is bulk-loaded from the shapes provided using the
+    Sort-Tile-Recursive (STR) algorithm, which produces well packed
+    nodes with little overlap. The tree cannot be modified after
+    it is created.
+
+    :param shapes: Iterable of shapes to index. Each shape must
+        have a ``bounding_box`` attribute.
+    :param node_capacity: The maximum number of children
+        for each node of the tree, must be at least 2.
+    :type node_capacity: int
+    """
+
+    def __init__(self, shapes, node_capacity=16):
+        node_capacity = int(node_capacity)
+        if node_capacity < 2:
+            raise ValueError("RTree: node_capacity must be at least 2")
+        self._shapes = tuple(shapes)
+        # Tree nodes are lists of [min_x, min_y, max_x, max_y, children]
+        # For leaf entries, children is the index of the shape
+        level = []
+        for i, shape in enumerate(self._shapes):
+            bbox = shape.bounding_box
+            min_x, min_y = bbox.min_point
+            max_x, max_y = bbox.max_point
+            level.append([min_x, min_y, max_x, max_y, i])
+        while len(level) > 1:
+            level = self._pack_level(level, node_capacity)
+        self._root = level[0] if level else None
+
+    @staticmethod
+    def _pack_level(entries, node_capacity):
+        """Sort and tile the entries of a tree level, returning
+        their parent nodes.
+        """
+        leaf_count = int(math.ceil(len(entries) / node_capacity))
+        slice_size = int(math.ceil(math.sqrt(leaf_count))) * node_capacity
+        entries.sort(key=lambda e: e[0] + e[2])
+        parents = []
+        for i in range(0, len(entries), slice_size):
+            vslice = entries[i:i + slice_size]
+            vslice.sort(key=lambda e: e[1] + e[3])
+            for j in range(0, len(vslice), node_capacity):
+                children = vslice[j:j + node_capacity]
+                parents.append([
+                    min(c[0] for c in children),
+                    min(c[1] for c in children),
+                    max(c[2] for c in children),
+                    max(c[3] for c in children),
+                    children])
+        return parents
+
+    def __len__(self):
+        return len(self._shapes)
+
+    def __iter__(self):
+        return iter(self._shapes)
+
+    def _search(self, min_x, min_y, max_x, max_y):
+        """Return a sorted list of the indices of shapes with bounding
+        boxes intersecting the box specified.
+        """
+        found = []
+        if self._root is None:
+            return found
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if (node[0] <= max_x and node[2] >= min_x
+                and node[1] <= max_y and node[3] >= min_y):
+                children = node[4]
+                if isinstance(children, list):
+                    stack.extend(children)
+                else:
+                    found.append(children)
+        found.sort()
+        return found
+
+    def query_box(self, box):
+        """Return a list of the indexed shapes with bounding boxes that
+        intersect the box specified, in the order they were indexed.
+        Boxes that share an edge or corner are considered intersecting.
+
+        :param box: The query box. This may also be any shape with a
+            ``bounding_box`` attribute.
+        :type box: :class:`~planar.BoundingBox`
+        :rtype: list
+        """
+        bbox = box.bounding_box
+        min_x, min_y = bbox.min_point
+        max_x, max_y = bbox.max_point
+        shapes = self._shapes
+        return [shapes[i] for i in self._search(min_x, min_y, max_x, max_y)]
+
+    def query_point(self, point, exact=False):
+        """Return a list of the indexed shapes with bounding boxes that
+        contain the point specified, in the order they were indexed. Points
+        on the edge of a bounding box are considered to be contained.
+
+        :param point: The query point.
+        :type point: :class:`~planar.Vec2`
+        :param exact: If true, the shapes found are further refined
+            by calling their ``contains_point()`` method, so that only
+            the shapes that actually contain the point are returned.
+        :type exact: bool
+        :rtype: list
+        """
+        x, y = point
+        shapes = self._shapes
+        found = [shapes[i] for i in self._search(x, y, x, y)]
+        if exact:
+            point = planar.Vec2(x, y)
+            found = [shape for shape in found if shape.contains_point(point)]
+        return found
+
+    def nearest(self, point, k=1):
+        """Return a list of the ``k`` indexed shapes nearest to the point
+        specified, ordered closest first. The distance to each shape is
+        measured to its bounding box, shapes with bounding boxes that
+        contain the point have a distance of zero. Shapes at equal
+        distance are returned in the order they were indexed.
+
+        :param point: The query point.
+        :type point: :class:`~planar.Vec2`
+        :param k: The maximum number of shapes to return.
+        :type k: int
+        :rtype: list
+        """
+        x, y = point
+        found = []
+        if self._root is None or k < 1:
+            return found
+        # Heap items are (distance2, is_shape, tie_breaker, node)
+        # nodes are expanded before shapes at equal distance, so that
+        # shapes at equal distance are returned in index order
+        heap = [(0.0, 0, 0, self._root)]
+        count = 0
+        while heap and len(found) < k:
+            node = heapq.heappop(heap)[3]
+            children = node[4]
+            if not isinstance(children, list):
+                found.append(self._shapes[children])
+                continue
+            for child in children:
+                dx = max(child[0] - x, x - child[2], 0.0)
+                dy = max(child[1] - y, y - child[3], 0.0)
+                if isinstance(child[4], list):
+                    count += 1
+                    heapq.heappush(heap, (dx*dx + dy*dy, 0, count, child))
+                else:
+                    heapq.heappush(heap, (dx*dx + dy*dy, 1, child[4], child))
+        return found
+
+    def __repr__(self):
+        return "RTree(<%d shapes>)" % len(self._shapes)
+
+
+class KDTree(object):
+    """Static 2-d tree spatial index for efficiently finding points by their
+    location. The tree is balanced by splitting the points at the median,
+    alternating between the x and y axes at each level. The tree cannot
+    be modified after it is created.
+
+    Queries return the indices of the points found in the sequence the
+    tree was created from, which can be used to look up the points
+    themselves or any data associated with them.
+
+    :param points: The points to index, either a :class:`~planar.Vec2Array`,
+        an object supporting the buffer protocol with shape ``(n, 2)``,
+        or an iterable of points.
+    """
+
+    def __init__(self, points):
+        if is_buffer(points):
+            points = planar.Vec2Array.from_buffer(points)
+        else:
+            points = planar.Vec2Array(points)
+        self._points = points
+        # The tree is stored implicitly, with the node for each subtree
+        # at the midpoint of its range of the arrays below
+        order = list(range(len(points)))
+        self._build(order, 0, len(order), 0)
+        self._index = order
+        self._tree_points = [tuple(points[i]) for i in order]
+
+    def _build(self, order, lo, hi, axis):
+        """Arrange the range of point indices in place so that the 
+        median of the range along the axis is at its midpoint, then
+        build the subtrees on either side.
+        """
+        while hi - lo > 1:
+            points = self._points
+            order[lo:hi] = sorted(order[lo:hi], key=lambda i: points[i][axis])
+            mid = (lo + hi) // 2
+            self._build(order, lo, mid, 1 - axis)
+            lo = mid + 1
+            axis = 1 - axis
+
+    @property
+    def points(self):
+        """The indexed points, in their original order, as a
+        :class:`~planar.Vec2Array`.
+        """
+        return planar.Vec2Array(self._points)
+
+    def __len__(self):
+        return len(self._points)
+
+    def __iter__(self):
+        return iter(self._points)
+
+    def _nearest(self, x, y, k, heap, lo, hi, axis):
+        """Find the k points nearest to x, y in the subtree. The heap
+        contains (-distance2, -index) for the nearest points found so far.
+        """
+        while lo < hi:
+            mid = (lo + hi) // 2
+            px, py = self._tree_points[mid]
+            entry = (-((px - x)**2 + (py - y)**2), -self._index[mid])
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            diff = x - px if axis == 0 else y - py
+            if diff < 0:
+                near, far = (lo, mid), (mid + 1, hi)
+            else:
+                near, far = (mid + 1, hi), (lo, mid)
+            self._nearest(x, y, k, heap, near[0], near[1], 1 - axis)
+            if len(heap) == k and diff*diff > -heap[0][0]:
+                return
+            lo, hi = far
+            axis = 1 - axis
+
+    def nearest(self, point, k=1):
+        """Return a list of the indices of the ``k`` points nearest to the
+        point specified, ordered closest first. Points at equal distance
+        are returned in index order.
+
+        :param point: The query point.
+        :type point: :class:`~planar.Vec2`
+        :param k: The maximum number of points to return.
+        :type k: int
+        :rtype: list
+        """
+        x, y = point
+        k = min(k, len(self))
+        if k < 1:
+            return []
+        heap = []
+        self._nearest(x, y, k, heap, 0, len(self), 0)
+        heap.sort(reverse=True)
+        return [-i for d, i in heap]
+
+    def nearest_each(self, points):
+        """Return a list of the index of the point nearest to each
+        of the query points specified. This is more efficient than
+        calling :meth:`nearest` repeatedly. If the tree is empty, the
+        list contains ``None`` for each query point.
+
+        :param points: The query points, either a
+            :class:`~planar.Vec2Array`, an object supporting the buffer
+            protocol with shape ``(n, 2)``, or an iterable of points.
+        :rtype: list
+        """
+        if is_buffer(points):
+            points = planar.Vec2Array.from_buffer(points)
+        size = len(self)
+        found = []
+        for x, y in points:
+            if size:
+                heap = []
+                self._nearest(x, y, 1, heap, 0, size, 0)
+                found.append(-heap[0][1])
+            else:
+                found.append(None)
+        return found
+
+    def within_distance(self, point, distance):
+        """Return a list of the indices of the points within the distance
+        specified of the query point, in index order. Points exactly
+        at the distance specified are included.
+
+        :param point: The query point.
+        :type point: :class:`~planar.Vec2`
+        :param distance: The query radius.
+        :type distance: float
+        :rtype: list
+        """
+        x, y = point
+        found = []
+        if distance >= 0:
+            r2 = distance * distance
+            stack = [(0, len(self), 0)]
+            while stack:
+                lo, hi, axis = stack.pop()
+                if lo >= hi:
+                    continue
+                mid = (lo + hi) // 2
+                px, py = self._tree_points[mid]
+                if (px - x)**2 + (py - y)**2 <= r2:
+                    found.append(self._index[mid])
+                diff = x - px if axis == 0 else y - py
+                if diff >= -distance:
+                    stack.append((mid + 1, hi, 1 - axis))
+                if diff <= distance:
+                    stack.append((lo, mid, 1 - axis))
+            found.sort()
+        return found
+
+    def __repr__(self):
+        return "KDTree(<%d points>)" % len(self)
+
+
+# vim: ai ts=4 sts=4 et sw=4 tw=78
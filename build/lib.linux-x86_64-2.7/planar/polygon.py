@@ -0,0 +1,2278 @@
+#############################################################################
+# Copyright (c) 2010 by Casey Duncan
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, 
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name(s) of the copyright holders nor the names of its
+#   contributors may be used to endorse or promote products derived from this
+#   software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AS IS AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO
+# EVENT SHALL THE COPYRIGHT HOLDERS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, 
+# OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#############################################################################
+
+from __future__ import division
+
+import sys
+import math
+import bisect
+import array
+import planar
+from planar import stats as _stats
+from planar.util import cached_property, assert_unorderable, cos_sin_deg
+from planar.util import is_buffer, SweepStatus
+from planar.line import _snap_points
+
+class BasePolygon(object):
+    """Polygon operations implemented using the vertex sequence API.
+    Subclasses combine this with a :class:`~planar.Seq2` implementation
+    that stores the vertices.
+    """
+
+    _prepared = False
+
+    def __init__(self, vertices, is_convex=None, is_simple=None):
+        if len(self) < 3:
+            raise ValueError("Polygon(): minimum of 3 vertices required")
+        self._clear_cached_properties()
+        if is_convex is not None and self._convex is _unknown:
+            self._convex = bool(is_convex)
+            self._simple = self._convex or _unknown
+            if self._convex and len(self) > 3:
+                self._split_y_polylines()
+        if is_simple is not None and self._simple is _unknown:
+            self._simple = bool(is_simple)
+
+    @classmethod
+    def regular(cls, vertex_count, radius, center=(0, 0), angle=0):
+        """Create a regular polygon with the specified number of vertices
+        radius distance from the center point. Regular polygons are
+        always convex.
+
+        :param vertex_count: The number of vertices in the polygon.
+            Must be >= 3.
+        :type vertex_count: int
+        :param radius: distance from vertices to center point.
+        :type radius: float
+        :param center: The center point of the polygon. If omitted,
+            the polygon will be centered on the origin.
+        :type center: Vec2
+        :param angle: The starting angle for the vertices, in degrees.
+        :type angle: float
+        """
+        cx, cy = center
+        angle_step = 360.0 / vertex_count
+        verts = []
+        for i in range(vertex_count):
+            x, y = cos_sin_deg(angle)
+            verts.append((x * radius + cx, y * radius + cy))
+            angle += angle_step
+        poly = cls(verts, is_convex=True)
+        poly._centroid = planar.Vec2(*center)
+        poly._max_r = radius
+        poly._max_r2 = radius * radius
+        poly._min_r = min_r = ((poly[0] + poly[1]) * 0.5 - center).length
+        poly._min_r2 = min_r * min_r
+        poly._dupe_verts = False
+        return poly
+
+    @classmethod
+    def star(cls, peak_count, radius1, radius2, center=(0, 0), angle=0):
+        """Create a radial pointed star polygon with the specified number
+        of peaks.
+
+        :param peak_count: The number of peaks. The resulting polygon will
+            have twice this number of vertices. Must be >= 2.
+        :type peak_count: int
+        :param radius1: The peak or valley vertex radius. A vertex
+            is aligned on ``angle`` with this radius.
+        :type radius1: float
+        :param radius2: The alternating vertex radius.
+        :type radius2: float
+        :param center: The center point of the polygon. If omitted,
+            the polygon will be centered on the origin.
+        :type center: Vec2
+        :param angle: The starting angle for the vertices, in degrees.
+        :type angle: float
+        """
+        if peak_count < 2:
+            raise ValueError(
+                "star polygon must have a minimum of 2 peaks")
+        cx, cy = center
+        angle_step = 180.0 / peak_count
+        verts = []
+        for i in range(peak_count):
+            x, y = cos_sin_deg(angle)
+            verts.append((x * radius1 + cx, y * radius1 + cy))
+            angle += angle_step
+            x, y = cos_sin_deg(angle)
+            verts.append((x * radius2 + cx, y * radius2 + cy))
+            angle += angle_step
+        is_simple = (radius1 > 0.0) == (radius2 > 0.0)
+        poly = cls(verts, is_convex=(radius1 == radius2), 
+            is_simple=is_simple or None)
+        if is_simple:
+            poly._centroid = planar.Vec2(*center)
+        poly._max_r = max_r = max(abs(radius1), abs(radius2))
+        poly._max_r2 = max_r * max_r
+        if (radius1 >= 0.0) == (radius2 >= 0.0):
+            if radius1 != radius2:
+                poly._min_r = min_r = min(abs(radius1), abs(radius2))
+                poly._min_r2 = min_r * min_r
+            else:
+                poly._min_r = min_r = (
+                    (poly[0] + poly[1]) * 0.5 - center).length
+                poly._min_r2 = min_r * min_r
+        if radius1 > 0.0 and radius2 > 0.0:
+            poly._dupe_verts = False
+        return poly
+
+    @classmethod
+    def from_points(cls, points):
+        """Create a polygon from a sequence of points"""
+        poly = super(BasePolygon, cls).from_points(points)
+        poly._clear_cached_properties()
+        return poly
+
+    def _clear_cached_properties(self):
+        if len(self) > 3:
+            self._convex = _unknown
+            self._simple = _unknown
+        else:
+            self._convex = True
+            self._simple = True
+            if '_pnp_triangle_test' in self.__dict__:
+                # clear cached closure
+                del self.__dict__['_pnp_triangle_test']
+        self._y_polylines = None
+        self._dupe_verts = _unknown
+        self._degenerate = _unknown
+        self._bbox = None
+        self._triangles = None
+        self._grid = None
+        self._centroid = _unknown
+        self._signed_area = None
+        self._perimeter = None
+        self._max_r = self._max_r2 = None
+        self._min_r = self._min_r2 = None
+
+    @property
+    def bounding_box(self):
+        """The bounding box of the polygon"""
+        if _stats.enabled:
+            _stats.count_cache('bounding_box', self._bbox is not None)
+        if self._bbox is None:
+            self._bbox = planar.BoundingBox(self)
+        return self._bbox
+
+    @property
+    def is_convex(self):
+        """True if the polygon is convex.
+
+        If this is unknown then it is calculated from the vertices
+        of the polygon and cached. Runtime complexity: O(n)
+        """
+        if _stats.enabled:
+            _stats.count_cache('is_convex', self._convex is not _unknown)
+        if self._convex is _unknown:
+            self._classify()
+        return self._convex
+
+    @property
+    def is_convex_known(self):
+        """True if the polygon is already known to be convex or not.
+
+        If this value is True, then the value of ``is_convex`` is 
+        cached and does not require additional calculation to access.
+        Mutating the polygon will invalidate the cached value.
+        """
+        return self._convex is not _unknown
+
+    def _iter_edge_vectors(self):
+        """Iterate the edges of the polygon as vectors
+        """
+        for i in range(len(self)):
+            yield self[i] - self[i - 1]
+
+    @_stats.timed('classify')
+    def _classify(self):
+        """Calculate the polygon convexity, winding direction,
+        detecting and handling degenerate cases.
+
+        Algorithm derived from Graphics Gems IV.
+        """
+        dir_changes = 0
+        angle_sign = 0
+        count = 0
+        self._convex = True
+        self._winding = 0
+        # Zero-length edges are skipped, so the turn at the first vertex
+        # is measured from the last edge with any length
+        deltas = [delta for delta in self._iter_edge_vectors() if delta]
+        last_delta = deltas[-1] if deltas else planar.Vec2(0, 0)
+        last_dir = (
+            (last_delta.x > 0) * -1 or
+            (last_delta.x < 0) * 1 or
+            (last_delta.y > 0) * -1 or
+            (last_delta.y < 0) * 1) or 0
+        for delta in deltas:
+            count += 1
+            this_dir = (
+                (delta.x > 0) * -1 or
+                (delta.x < 0) * 1 or
+                (delta.y > 0) * -1 or
+                (delta.y < 0) * 1) or 0
+            dir_changes += (this_dir == -last_dir)
+            last_dir = this_dir
+            cross = last_delta.cross(delta)
+            if cross > 0.0: # XXX Should this be cross > planar.EPSILON?
+                if angle_sign == -1:
+                    self._convex = False
+                    break
+                angle_sign = 1
+            elif cross < 0.0:
+                if angle_sign == 1:
+                    self._convex = False
+                    break
+                angle_sign = -1
+            elif last_delta.dot(delta) < 0.0:
+                # Edge turns straight back along the last one
+                self._convex = False
+                break
+            last_delta = delta
+        if dir_changes <= 2:
+            self._winding = angle_sign
+        else:
+            self._convex = False
+        if self._convex:
+            self._simple = True
+        self._degenerate = not count or not angle_sign
+        if self._convex and not self._degenerate:
+            self._dupe_verts = (count < len(self))
+            self._split_y_polylines()
+    
+    def _extreme_indices(self):
+        """Return the indices of the first vertices with the minimum y,
+        maximum y, minimum x and maximum x coordinates.
+        """
+        min_y = max_y = self[0].y
+        min_x = max_x = self[0].x
+        min_i = max_i = left_i = right_i = 0
+        for i, vert in enumerate(self):
+            if vert.y < min_y:
+                min_y = vert.y
+                min_i = i
+            if vert.y > max_y:
+                max_y = vert.y
+                max_i = i
+            if vert.x < min_x:
+                min_x = vert.x
+                left_i = i
+            if vert.x > max_x:
+                max_x = vert.x
+                right_i = i
+        return min_i, max_i, left_i, right_i
+
+    def _split_y_polylines(self):
+        """Split the polygon into left and right y-monotone polylines.
+        This optimizes operations on y-monotone polygons.
+        """
+        min_i, max_i = self._extreme_indices()[:2]
+        verts_yx = [(y, x) for x, y in self]
+        # Twice the signed area, positive if counter-clockwise
+        area2 = sum(x0 * y1 - x1 * y0 for (y0, x0), (y1, x1)
+            in zip(verts_yx[-1:] + verts_yx[:-1], verts_yx))
+        if min_i < max_i:
+            pl1 = verts_yx[min_i:max_i+1]
+            pl2 = verts_yx[max_i:] + verts_yx[:min_i+1]
+        else:
+            pl1 = verts_yx[max_i:min_i+1]
+            pl2 = verts_yx[min_i:] + verts_yx[:max_i+1]
+        # The vertices from the minimum y to the maximum y in order are
+        # on the right side of a counter-clockwise polygon. The leftmost
+        # and rightmost vertices cannot tell the sides apart when they
+        # are also the lowest or highest
+        if (min_i < max_i) == (area2 > 0.0):
+            self._y_polylines = pl2, pl1
+        else:
+            self._y_polylines = pl1, pl2
+        if pl1[0][0] > pl1[-1][0]:
+            pl1.reverse()
+        if pl2[0][0] > pl2[-1][0]:
+            pl2.reverse()
+
+    @property
+    def is_simple(self):
+        """True if the polygon is simple, i.e., it has no self-intersections.
+
+        If this is unknown then it is calculated from the vertices
+        of the polygon and cached. 
+        Polygons with overlapping edges, including edges that double 
+        back along each other, are not simple.
+        Runtime complexity: O(n) convex, O(n log n) non-convex
+        """
+        if _stats.enabled:
+            _stats.count_cache('is_simple', self._simple is not _unknown)
+        if self._simple is _unknown:
+            if self._convex is _unknown:
+                self._classify()
+            if self._simple is _unknown:
+                self._check_is_simple()
+        return self._simple
+    
+    @property
+    def is_simple_known(self):
+        """True if the polygon is already known to be simple or not.
+
+        If this value is True, then the value of ``is_simple`` is 
+        cached and does not require additional calculation to access.
+        Mutating the polygon will invalidate the cached value.
+        """
+        return self._simple is not _unknown
+
+    def _segments_intersect(self, a, b, c, d):
+        """Return True if the line segment a->b intersects with
+        line segment c->d
+        """
+        dir1 = (b[0] - a[0])*(c[1] - a[1]) - (c[0] - a[0])*(b[1] - a[1])
+        dir2 = (b[0] - a[0])*(d[1] - a[1]) - (d[0] - a[0])*(b[1] - a[1])
+        if (dir1 > 0.0) != (dir2 > 0.0) or (not dir1) != (not dir2): 
+            dir1 = (d[0] - c[0])*(a[1] - c[1]) - (a[0] - c[0])*(d[1] - c[1])
+            dir2 = (d[0] - c[0])*(b[1] - c[1]) - (b[0] - c[0])*(d[1] - c[1])
+            return ((dir1 > 0.0) != (dir2 > 0.0) 
+                or (not dir1) != (not dir2))
+        return False
+
+    @_stats.timed('check_is_simple')
+    def _check_is_simple(self):
+        """Check the polygon for self-intersection and cache the result
+
+        We use the Shamos-Hoey plane sweep algorithm. Edges are kept in
+        a balanced binary tree ordered by their position along the sweep
+        line, so that only neighboring edges need to be tested against each
+        other. This guarantees O(n log n) time even for polygons
+        with many edges spanning the sweep line at once, and stops at the
+        first intersection found.
+        """
+        intersects = self._segments_intersect
+        last_index = len(self) - 1
+        lefts = []
+        rights = []
+        events = []
+        directions = []
+        for i in range(len(self)):
+            start = tuple(self[i - 1])
+            end = tuple(self[i])
+            if start != end:
+                directions.append((end[0] - start[0], end[1] - start[1]))
+            if end < start:
+                start, end = end, start
+            lefts.append(start)
+            rights.append(end)
+            # Zero-length edges cannot intersect anything
+            if start != end:
+                events.append((start, 0, i))
+                events.append((end, 1, i))
+        events.sort() # lexicographical sort, starts before ends
+
+        # An edge that turns straight back along the one before it
+        # overlaps it. The two edges are identical along their overlap,
+        # so they need not be neighbors in the sweep status
+        for (dx0, dy0), (dx1, dy1) in zip(
+            directions[-1:] + directions[:-1], directions):
+            if dx0*dy1 - dy0*dx1 == 0.0 and dx0*dx1 + dy0*dy1 < 0.0:
+                self._simple = False
+                return False
+
+        def crosses(i, j):
+            if j is None:
+                return False
+            a = lefts[i]
+            b = rights[i]
+            c = lefts[j]
+            d = rights[j]
+            adjacent = not last_index > abs(i - j) > 1
+            if not adjacent and intersects(a, b, c, d):
+                return True
+            # Collinear edges are not ordered along the sweep line, so
+            # overlaps must be detected here. Adjacent edges may only 
+            # share their common vertex, otherwise the polygon doubles 
+            # back on itself
+            if ((b[0] - a[0])*(c[1] - a[1]) - (c[0] - a[0])*(b[1] - a[1])
+                or (b[0] - a[0])*(d[1] - a[1]) - (d[0] - a[0])*(b[1] - a[1])):
+                return False
+            if adjacent:
+                return max(a, c) < min(b, d)
+            return max(a, c) <= min(b, d)
+
+        status = SweepStatus(len(self), _sweep_edge_order(lefts, rights))
+        for point, is_end, index in events:
+            if not is_end:
+                status.insert(index)
+                if (crosses(index, status.prev(index)) 
+                    or crosses(index, status.next(index))):
+                    self._simple = False
+                    return False
+            else:
+                prev_index = status.prev(index)
+                next_index = status.next(index)
+                status.remove(index)
+                if prev_index is not None and crosses(prev_index, next_index):
+                    self._simple = False
+                    return False
+        self._simple = True
+        return True
+
+    @property
+    def centroid(self):
+        """The geometric center point of the polygon. This point only exists 
+        for simple polygons. For non-simple polygons it is ``None``. Note
+        in concave polygons, this point may lie outside of the polygon itself.
+
+        If the centroid is unknown, it is calculated from the vertices and
+        cached. If the polygon is known to be simple, this takes O(n) time. If
+        not, then the simple polygon check is also performed, which has an
+        expected complexity of O(n log n).
+        """
+        if _stats.enabled:
+            _stats.count_cache('centroid', self._centroid is not _unknown)
+        if self._centroid is _unknown:
+            if self.is_simple:
+                # Compute the centroid using by summing the centroids
+                # of triangles made from each edge with vertex[0] weighted
+                # (positively or negatively) by each triangle's area
+                a = self[0]
+                b = self[1]
+                total_area = 0.0
+                centroid = planar.Vec2(0, 0)
+                for i in range(2, len(self)):
+                    c = self[i]
+                    area = ((b[0] - a[0]) * (c[1] - a[1]) 
+                        - (c[0] - a[0]) * (b[1] - a[1]))
+                    centroid += (a + b + c) * area
+                    total_area += area
+                    b = c
+                self._centroid = centroid / (3.0 * total_area)
+                self._signed_area = total_area * 0.5
+            else:
+                self._centroid = None
+        return self._centroid
+
+    @property
+    def is_centroid_known(self):
+        """True if the polygon's centroid has been pre-calculated and cached.
+
+        Mutating the polygon will invalidate the cached value.
+        """
+        return self._centroid is not _unknown
+
+    @property
+    def signed_area(self):
+        """The area of the polygon, positive if its vertices are wound
+        counter-clockwise and negative if they are wound clockwise.
+        Regions of non-simple polygons are weighted by their winding
+        number, so overlapping loops may add or cancel.
+
+        If the area is unknown, it is calculated from the vertices and
+        cached in O(n) time. Computing the centroid also caches the area.
+        """
+        if _stats.enabled:
+            _stats.count_cache('signed_area', self._signed_area is not None)
+        if self._signed_area is None:
+            # Sum the areas of triangles made from each edge with vertex[0]
+            a = self[0]
+            b = self[1]
+            ax, ay = a
+            total_area = 0.0
+            for i in range(2, len(self)):
+                c = self[i]
+                total_area += ((b[0] - ax) * (c[1] - ay) 
+                    - (c[0] - ax) * (b[1] - ay))
+                b = c
+            self._signed_area = total_area * 0.5
+        return self._signed_area
+
+    @property
+    def area(self):
+        """The area of the polygon, i.e., the absolute value of
+        :attr:`signed_area`.
+        """
+        return abs(self.signed_area)
+
+    @property
+    def perimeter(self):
+        """The total length of the polygon's edges. This is calculated
+        from the vertices and cached in O(n) time.
+        """
+        if _stats.enabled:
+            _stats.count_cache('perimeter', self._perimeter is not None)
+        if self._perimeter is None:
+            perimeter = 0.0
+            a = self[-1]
+            for b in self:
+                dx = b[0] - a[0]
+                dy = b[1] - a[1]
+                perimeter += math.sqrt(dx*dx + dy*dy)
+                a = b
+            self._perimeter = perimeter
+        return self._perimeter
+
+    def triangulate(self):
+        """Divide the polygon into triangles. The triangles are returned 
+        as an :class:`array.array` of vertex indices, three per triangle,
+        with each triangle wound in the same direction as the polygon. A
+        polygon with n distinct vertices is divided into n - 2 triangles.
+
+        Convex polygons are triangulated as a fan in O(n) time. Other 
+        simple polygons are divided into monotone pieces that are 
+        triangulated separately, which takes O(n log n) time. The result 
+        is cached, and mutating the polygon will invalidate it.
+
+        :raises ValueError: If the polygon is not simple.
+        :rtype: :class:`array.array` of unsigned ints
+        """
+        if _stats.enabled:
+            _stats.count_cache('triangles', self._triangles is not None)
+        if self._triangles is None:
+            if self.is_convex:
+                triangles = array.array('I')
+                for i in range(1, len(self) - 1):
+                    triangles.extend((0, i, i + 1))
+            elif self.is_simple:
+                triangles = _triangulate_simple(self)
+            else:
+                raise ValueError("Cannot triangulate non-simple polygon")
+            self._triangles = triangles
+        return self._triangles[:]
+
+    @classmethod
+    def areas(cls, polygons):
+        """Return the areas of a sequence of polygons. The values are
+        cached in each polygon as with the :attr:`area` property.
+
+        :param polygons: An iterable of polygons.
+        :rtype: :class:`array.array` of doubles
+        """
+        return array.array('d', [
+            abs(poly.signed_area) for poly in _iter_polygons(polygons)])
+
+    @classmethod
+    def signed_areas(cls, polygons):
+        """Return the signed areas of a sequence of polygons, see
+        :attr:`signed_area`.
+
+        :param polygons: An iterable of polygons.
+        :rtype: :class:`array.array` of doubles
+        """
+        return array.array('d', [
+            poly.signed_area for poly in _iter_polygons(polygons)])
+
+    @classmethod
+    def perimeters(cls, polygons):
+        """Return the perimeters of a sequence of polygons, see
+        :attr:`perimeter`.
+
+        :param polygons: An iterable of polygons.
+        :rtype: :class:`array.array` of doubles
+        """
+        return array.array('d', [
+            poly.perimeter for poly in _iter_polygons(polygons)])
+
+    def __setitem__(self, index, vert):
+        super(BasePolygon, self).__setitem__(index, vert)
+        if _stats.enabled:
+            state = dict(self.__dict__)
+            self._clear_cached_properties()
+            self._count_invalidations(state)
+        else:
+            self._clear_cached_properties()
+
+    def __eq__(self, other):
+        """Return True if other is the same shape as self, irrespective
+        of initial vertex and winding direction. Note if the polygons
+        have duplicate vertices, then these must also match for the
+        polygons to be considered equal.
+        """
+        if not isinstance(other, BasePolygon) or len(self) != len(other):
+            return False
+        if self is other:
+            return True
+
+        # Test for identical verts
+        indices = range(len(self))
+        for i in indices:
+            if self[i] != other[i]:
+                break
+        else:
+            return True
+
+        # Test for identical edges
+        self_edges = set()
+        add_self_edge = self_edges.add
+        for i in indices:
+            tgram = (self[i-2], self[i-1], self[i], 0)
+            while tgram in self_edges:
+                a, b, c, i = tgram
+                tgram = (a, b, c, i+1)
+            add_self_edge(tgram)
+
+        other_edges = set()
+        add_other_edge = other_edges.add
+        for i in indices:
+            tgram = (other[i-2], other[i-1], other[i], 0)
+            while tgram in other_edges:
+                a, b, c, i = tgram
+                tgram = (a, b, c, i+1)
+            if tgram in self_edges:
+                add_other_edge(tgram)
+            else:
+                # Sets can't possibly match
+                break
+        else:
+            if self_edges == other_edges:
+                return True
+
+        # Try reverse winding
+        other_edges.clear()
+        for i in indices:
+            tgram = (other[i], other[i-1], other[i-2], 0)
+            while tgram in other_edges:
+                a, b, c, i = tgram
+                tgram = (a, b, c, i+1)
+            if tgram in self_edges:
+                add_other_edge(tgram)
+            else:
+                # Sets can't possibly match
+                return False
+        return self_edges == other_edges
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        kwargs = ""
+        if self.is_convex_known:
+            kwargs += ", is_convex=%r" % self.is_convex
+            if not self.is_convex and self.is_simple_known:
+                kwargs += ", is_simple=%r" % self.is_simple
+        return "%s([%s]%s)" % (self.__class__.__name__,
+            ', '.join(repr(tuple(v)) for v in self),
+            kwargs)
+
+    __str__ = __repr__
+
+    def __imul__(self, other):
+        state = dict(self.__dict__)
+        if _stats.enabled:
+            # Invalidations are counted once the transformed properties
+            # are restored, not as each vertex is assigned
+            self._clear_cached_properties()
+        try:
+           other.itransform(self)
+        except AttributeError:
+            raise TypeError("Cannot multiply %s with %s"
+                % (type(self).__name__, type(other).__name__))
+        self._transform_cached_properties(state, other)
+        if _stats.enabled:
+            self._count_invalidations(state)
+        return self
+
+    def _count_invalidations(self, state):
+        """Count the cached properties in ``state``, the instance dict of
+        the polygon before it was changed, that are no longer cached.
+        """
+        for prop, name, unknown in _cached_attrs:
+            if (state.get(name, unknown) is not unknown
+                and getattr(self, name) is unknown):
+                _stats.count('cache.%s.invalidations' % prop)
+
+    def _transform_cached_properties(self, state, transform):
+        """Restore the cached properties in ``state``, computed for the
+        vertices of this polygon before ``transform`` was applied to them.
+        Only properties that the transform preserves, or that can be mapped
+        through it directly, are kept.
+        """
+        self._clear_cached_properties()
+        self._prepared = state.get('_prepared', self._prepared)
+        if transform.is_degenerate:
+            return
+        a, b, c, d, e, f = tuple(transform)[:6]
+        det = transform.determinant
+        # Non-degenerate affine maps preserve convexity, simplicity and
+        # the vertex topology, including the triangulation
+        for name in ('_convex', '_simple', '_dupe_verts', '_degenerate',
+            '_triangles'):
+            setattr(self, name, state.get(name, getattr(self, name)))
+        centroid = state.get('_centroid', _unknown)
+        if centroid is _unknown:
+            centroid = None
+        elif centroid is None:
+            # Not simple, no centroid
+            self._centroid = None
+        else:
+            self._centroid = centroid = transform * centroid
+        if state.get('_signed_area') is not None:
+            self._signed_area = state['_signed_area'] * det
+        bbox = state.get('_bbox')
+        if bbox is not None and (b == d == 0.0 or a == e == 0.0):
+            # Rectilinear transforms map the box corners to the corners
+            # of the transformed bounding box
+            self._bbox = planar.BoundingBox(
+                [transform * bbox.min_point, transform * bbox.max_point])
+        if (a == e and b == -d) or (a == -e and b == d):
+            # Similarity transforms scale all distances uniformly
+            scale = math.sqrt(abs(det))
+            if state.get('_perimeter') is not None:
+                self._perimeter = state['_perimeter'] * scale
+            if centroid is not None and state.get('_max_r') is not None:
+                self._max_r = max_r = state['_max_r'] * scale
+                self._max_r2 = max_r * max_r
+            if centroid is not None and state.get('_min_r') is not None:
+                self._min_r = min_r = state['_min_r'] * scale
+                self._min_r2 = min_r * min_r
+        if (self._convex is True and self._degenerate is not True 
+            and len(self) > 3):
+            self._split_y_polylines()
+
+    def __copy__(self):
+        copy = self.from_points(self)
+        copy._convex = self._convex
+        copy._simple = self._simple
+        copy._y_polylines = self._y_polylines
+        copy._dupe_verts = self._dupe_verts
+        copy._degenerate = self._degenerate
+        copy._bbox = self._bbox
+        copy._triangles = self._triangles
+        copy._prepared = self._prepared
+        copy._grid = self._grid
+        copy._centroid = self._centroid
+        copy._signed_area = self._signed_area
+        copy._perimeter = self._perimeter
+        copy._max_r = self._max_r
+        copy._max_r2 = self._max_r2
+        copy._min_r = self._min_r
+        copy._min_r2 = self._min_r2
+        return copy
+
+    def __deepcopy__(self, memo):
+        copy = self.__copy__()
+        copy._y_polylines = None
+        copy._bbox = None
+        copy._grid = None
+        return copy
+
+    _pickled_properties = ('_convex', '_simple', '_dupe_verts', '_degenerate',
+        '_centroid', '_signed_area', '_perimeter', '_max_r', '_max_r2',
+        '_min_r', '_min_r2')
+
+    @classmethod
+    def _from_bytes(cls, data):
+        """Create a new polygon from packed native double ``x, y``
+        pairs, as pickled by :meth:`__reduce_ex__`.
+        """
+        return cls.from_points(planar.Vec2Array._from_bytes(data))
+
+    def __reduce_ex__(self, protocol):
+        from_bytes, args = super(BasePolygon, self).__reduce_ex__(
+            protocol)[:2]
+        state = {}
+        for name in self._pickled_properties:
+            value = getattr(self, name, None)
+            if value is not None and value is not _unknown:
+                state[name] = value
+        if self._centroid is None:
+            # Known to have no centroid, because it is not simple
+            state['_centroid'] = None
+        return (from_bytes, args, state)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if (self._convex is True and self._degenerate is not True 
+            and len(self) > 3):
+            self._split_y_polylines()
+
+    ## Point in poly methods ##
+
+    def _pnp_winding_test(self, point):
+        """Return True if the point is in the polygon using a fast winding
+        number test. This is a general point-in-poly test and will work
+        correctly with all polygons.
+
+        Note this test returns different results from the crossing test for
+        non-simple polygons. In this test, self-overlapping sections of the
+        polygon are still considered "inside", whereas the crossing test
+        considers these regions "outside".
+
+        Algorithm derived from:
+        http://www.softsurfer.com/Archive/algorithm_0103/algorithm_0103.htm
+
+        Complexity: O(n)
+        """
+        px, py = point
+        winding_no = 0
+        v0_x, v0_y = self[-1]
+        v0_above = (v0_y >= py)
+        for v1_x, v1_y in self:
+            v1_above = (v1_y >= py)
+            if v0_above != v1_above:
+                if v1_above: # upward crossing
+                    if ((v1_x - v0_x) * (py - v0_y)
+                        - (px - v0_x) * (v1_y - v0_y) <= 0):
+                        # point is right of edge, valid up intersect
+                        winding_no += 1
+                else:
+                    if ((v1_x - v0_x) * (py - v0_y)
+                        - (px - v0_x) * (v1_y - v0_y) >= 0):
+                        # point is left of edge, valid down intersect
+                        winding_no -= 1
+            v0_above = v1_above
+            v0_x = v1_x
+            v0_y = v1_y
+        return winding_no != 0
+    
+    def _build_grid(self):
+        """Build the grid used by :meth:`_pnp_grid_test`. The bounding box
+        of the polygon is divided into about one cell per vertex. Each cell
+        lists the edges overlapping it, and stores the winding number at its
+        center. Cells without edges are entirely inside or outside the
+        polygon.
+        """
+        size = len(self)
+        min_x = min(x for x, y in self)
+        min_y = min(y for x, y in self)
+        width = max(x for x, y in self) - min_x
+        height = max(y for x, y in self) - min_y
+        cols = rows = 1
+        x_scale = y_scale = 0.0
+        if width > 0.0 and height > 0.0:
+            cols = int(math.sqrt(size * width / height) + 0.5)
+            cols = max(1, min(cols, size))
+            rows = max(1, size // cols)
+            x_scale = cols / width
+            y_scale = rows / height
+        cells = [[] for i in range(cols * rows)]
+        winding = [0] * (cols * rows)
+        v0_x, v0_y = self[-1]
+        for v1_x, v1_y in self:
+            edge = (v0_x, v0_y, v1_x, v1_y)
+            c0 = _grid_index(min(v0_x, v1_x), min_x, x_scale, cols)
+            c1 = _grid_index(max(v0_x, v1_x), min_x, x_scale, cols)
+            r0 = _grid_index(min(v0_y, v1_y), min_y, y_scale, rows)
+            r1 = _grid_index(max(v0_y, v1_y), min_y, y_scale, rows)
+            for row in range(r0, r1 + 1):
+                for col in range(c0, c1 + 1):
+                    cells[row * cols + col].append(edge)
+                # Count the crossings of the row's center line
+                # left of each cell center
+                if y_scale:
+                    cy = min_y + (row + 0.5) / y_scale
+                else:
+                    cy = min_y
+                v1_above = (v1_y >= cy)
+                if (v0_y >= cy) != v1_above:
+                    x = v0_x + (cy - v0_y) * (v1_x - v0_x) / (v1_y - v0_y)
+                    col = max(0, int(math.ceil((x - min_x) * x_scale - 0.5)))
+                    if col < cols:
+                        winding[row * cols + col] += 1 if v1_above else -1
+            v0_x = v1_x
+            v0_y = v1_y
+        for cell in range(len(winding)):
+            if cell % cols:
+                winding[cell] += winding[cell - 1]
+        self._grid = (min_x, min_y, x_scale, y_scale, cols, rows, 
+            cells, winding)
+
+    def _pnp_grid_test(self, point):
+        """Return True if the point is in the polygon using a grid of its
+        edges. The result is the same as :meth:`_pnp_winding_test`, but
+        only the edges between the point and the nearest empty cell to its
+        left in its row of the grid are tested. The winding number of the
+        empty cell accounts for the edges farther left. Each edge crossing
+        is counted only in the cell containing it.
+
+        Complexity: O(1) expected, O(n) worst case
+        """
+        if self._grid is None:
+            self._build_grid()
+        min_x, min_y, x_scale, y_scale, cols, rows, cells, winding = self._grid
+        px, py = point
+        pt_col = _grid_index(px, min_x, x_scale, cols)
+        row_start = _grid_index(py, min_y, y_scale, rows) * cols
+        winding_no = 0
+        for col in range(pt_col, -1, -1):
+            edges = cells[row_start + col]
+            if not edges:
+                winding_no += winding[row_start + col]
+                break
+            for v0_x, v0_y, v1_x, v1_y in edges:
+                v1_above = (v1_y >= py)
+                if (v0_y >= py) == v1_above:
+                    continue
+                x = v0_x + (py - v0_y) * (v1_x - v0_x) / (v1_y - v0_y)
+                x = max(min(v0_x, v1_x), min(x, max(v0_x, v1_x)))
+                x_col = _grid_index(x, min_x, x_scale, cols)
+                # Crossings rounded past the point's cell count in its cell
+                if x_col == col or (col == pt_col and x_col > col):
+                    side = ((v1_x - v0_x) * (py - v0_y)
+                        - (px - v0_x) * (v1_y - v0_y))
+                    if v1_above: # upward crossing
+                        if side <= 0:
+                            winding_no += 1
+                    elif side >= 0:
+                        winding_no -= 1
+        return winding_no != 0
+
+    def _pnp_y_monotone_test(self, point):
+        """Return True if the point is in the polygon using a
+        binary search of the polygon's 2 y-monotone edge polylines.
+        This algorithm works only with convex or simple y-montone
+        polygons.
+
+        Complexity: O(log n)
+        """
+        if self._y_polylines is None:
+            self._split_y_polylines()
+        px, py = point
+        pt_y_tuple = (py,)
+        lpline, rpline = self._y_polylines
+        i = bisect.bisect_right(lpline, pt_y_tuple)
+        if i == 0 or i == len(lpline):
+            return False # Point above or below
+        v0_y, v0_x = lpline[i-1]
+        v1_y, v1_x = lpline[i]
+        if ((v1_x - v0_x) * (py - v0_y)
+            - (px - v0_x) * (v1_y - v0_y) > 0):
+            return False # Point too far left
+        i = bisect.bisect_right(rpline, pt_y_tuple)
+        v0_y, v0_x = rpline[i-1]
+        v1_y, v1_x = rpline[i]
+        return ((v1_x - v0_x) * (py - v0_y)
+            - (px - v0_x) * (v1_y - v0_y) > 0)
+
+    def _pnp_triangle_test(self, point):
+        """Return True if the point is in the triangle polygon using
+        barycentric coordinates. This only works with triangles,
+        of course.
+
+        More info here:
+        http://www.blackpawn.com/texts/pointinpoly/default.html
+
+        Complexity: O(1)
+        """
+        lo, mid, hi = sorted(self, key=lambda xy: (xy[1], xy[0]))
+        v0 = lo - mid
+        v1 = hi - mid
+        if v0.is_null or v1.is_null:
+            return False
+        dot01 = v0.dot(v1)
+        dot00 = v0.length2
+        dot11 = v1.length2
+        denom = (dot00 * dot11 - dot01 * dot01)
+        if not denom:
+            return False # degenerate triangle
+        inv_denom = 1.0 / denom
+        # The above vars are cached in the closure defined below
+
+        if ((hi[0] - lo[0])*(mid[1] - lo[1]) 
+            - (mid[0] - lo[0])*(hi[1] - lo[1]) > 0.0):
+            # Triangle has 2 inclusive leading edges
+            def _pnp_triangle_test(point):
+                v2 = point - mid
+                dot02 = v0.dot(v2)
+                dot12 = v1.dot(v2)
+                u = (dot11 * dot02 - dot01 * dot12) * inv_denom
+                v = (dot00 * dot12 - dot01 * dot02) * inv_denom
+                return u >= 0.0 and v >= 0.0 and u + v < 1.0
+        else:
+            # Triangle has 1 inclusive leading edge
+            def _pnp_triangle_test(point):
+                v2 = point - mid
+                dot02 = v0.dot(v2)
+                dot12 = v1.dot(v2)
+                u = (dot11 * dot02 - dot01 * dot12) * inv_denom
+                v = (dot00 * dot12 - dot01 * dot02) * inv_denom
+                return u > 0.0 and v > 0.0 and u + v <= 1.0
+
+        # Store the closure in the instance as a method override
+        # which will intercept future calls
+        self._pnp_triangle_test = _pnp_triangle_test
+        return _pnp_triangle_test(point)
+    
+    def contains_point(self, point):
+        """Return True if the specified point is inside the polygon.
+
+        This test can use various strategies depending on the
+        classification of the polygon, i.e., triangular, radial, 
+        y-monotone, convex, or other. 
+
+        The runtime complexity will depend on the polygon:
+
+        Triangle or best-case radial: O(1)
+        y-monotone, convex: O(log n)
+        other: O(n)
+
+        :param point: A point vector.
+        :type point: :class:`~planar.Vec2`
+        :rtype: bool
+        """
+        sides = len(self)
+        if sides == 3:
+            if _stats.enabled:
+                _stats.count('pip.triangle')
+            return self._pnp_triangle_test(point)
+        centroid = self._centroid
+        if centroid is not _unknown and centroid is not None and sides > 4:
+            d2 = (centroid - point).length2
+            if self._min_r2 is not None and d2 < self._min_r2:
+                if _stats.enabled:
+                    _stats.count('pip.radius_inside')
+                return True
+            if self._max_r2 is not None and d2 > self._max_r2:
+                if _stats.enabled:
+                    _stats.count('pip.radius_outside')
+                return False
+        if self.is_convex and sides > 5:
+            if _stats.enabled:
+                _stats.count('pip.y_monotone')
+                _stats.count_cache('y_polylines', 
+                    self._y_polylines is not None)
+            return self._pnp_y_monotone_test(point)
+        if sides == 4 or self.bounding_box.contains_point(point):
+            if self._prepared:
+                if _stats.enabled:
+                    _stats.count('pip.grid')
+                    _stats.count_cache('grid', self._grid is not None)
+                return self._pnp_grid_test(point)
+            if _stats.enabled:
+                _stats.count('pip.winding')
+            return self._pnp_winding_test(point)
+        if _stats.enabled:
+            _stats.count('pip.bbox_reject')
+        return False
+
+    def contains_points(self, points):
+        """Test a batch of points for containment in the polygon. The test
+        strategy is selected once for the entire batch, making this
+        much more efficient than calling :meth:`contains_point`
+        repeatedly.
+
+        The result is a :class:`bytearray` with one byte per point, which
+        is 1 if the point is inside the polygon and 0 otherwise. The
+        result can be viewed as a boolean array by NumPy, e.g., using
+        ``numpy.frombuffer(result, dtype=bool)``.
+
+        :param points: The points to test, either a
+            :class:`~planar.Vec2Array`, an object supporting the buffer
+            protocol with shape ``(n, 2)``, or an iterable of points.
+        :rtype: bytearray
+        """
+        if is_buffer(points):
+            points = planar.Vec2Array.from_buffer(points)
+        else:
+            points = [planar.Vec2(*p) for p in points]
+        sides = len(self)
+        if sides == 3:
+            if _stats.enabled:
+                _stats.count('pip.triangle', len(points))
+            return bytearray(self._pnp_triangle_test(p) for p in points)
+        bbox = None
+        if self.is_convex and sides > 5:
+            if _stats.enabled:
+                _stats.count_cache('y_polylines', 
+                    self._y_polylines is not None)
+            strategy = 'pip.y_monotone'
+            test = self._pnp_y_monotone_test
+        else:
+            if sides > 4:
+                bbox = self.bounding_box
+            if self._prepared:
+                if _stats.enabled:
+                    _stats.count_cache('grid', self._grid is not None)
+                strategy = 'pip.grid'
+                test = self._pnp_grid_test
+            else:
+                strategy = 'pip.winding'
+                test = self._pnp_winding_test
+        centroid = self._centroid
+        use_radius = (centroid is not _unknown and centroid is not None
+            and sides > 4 
+            and (self._min_r2 is not None or self._max_r2 is not None))
+        if use_radius:
+            min_r2 = self._min_r2 if self._min_r2 is not None else -1.0
+            max_r2 = self._max_r2
+            if max_r2 is None:
+                max_r2 = float('inf')
+        result = bytearray(len(points))
+        radius_inside = radius_outside = bbox_reject = 0
+        for i, p in enumerate(points):
+            if use_radius:
+                d2 = (centroid - p).length2
+                if d2 < min_r2:
+                    result[i] = 1
+                    radius_inside += 1
+                    continue
+                if d2 > max_r2:
+                    radius_outside += 1
+                    continue
+            if bbox is not None and not bbox.contains_point(p):
+                bbox_reject += 1
+                continue
+            result[i] = test(p)
+        if _stats.enabled:
+            tested = (len(points) - radius_inside - radius_outside 
+                - bbox_reject)
+            _stats.count('pip.radius_inside', radius_inside)
+            _stats.count('pip.radius_outside', radius_outside)
+            _stats.count('pip.bbox_reject', bbox_reject)
+            _stats.count(strategy, tested)
+        return result
+
+    def prepare(self):
+        """Accelerate repeated point containment tests for this polygon.
+
+        After this is called, :meth:`contains_point` and
+        :meth:`contains_points` test points in non-convex polygons using a
+        grid of the polygon's edges, built on first use. This makes the
+        expected cost of each test nearly constant rather than O(n), which
+        is worthwhile for large polygons that are tested many times. The
+        grid requires memory proportional to the number of vertices, and
+        is rebuilt as needed if the polygon is mutated or transformed.
+
+        Convex polygons already use an O(log n) test, and are not affected.
+        """
+        self._prepared = True
+
+    ## Tangent methods ##
+    # See: http://softsurfer.com/Archive/algorithm_0201/algorithm_0201.htm
+
+    def _pt_tangents(self, point):
+        """Return the pair of tangent points for the given exterior point.
+        This general algorithm works for all polygons in O(n) time.
+        """
+        px, py = point
+        left_tan = right_tan = self[0]
+        verts = iter(self)
+        v0_x, v0_y = self[-2]
+        v1_x, v1_y = self[-1]
+        prev_turn = (v1_x - v0_x)*(py - v0_y) - (px - v0_x)*(v1_y - v0_y)
+        v0_x = v1_x
+        v0_y = v1_y
+        for v1_x, v1_y in self:
+            next_turn = (v1_x - v0_x)*(py - v0_y) - (px - v0_x)*(v1_y - v0_y)
+            if prev_turn <= 0.0 and next_turn > 0.0:
+                if ((v0_x - px)*(right_tan.y - py)
+                    - (right_tan.x - px)*(v0_y - py) >= 0.0):
+                    right_tan = planar.Vec2(v0_x, v0_y)
+            elif prev_turn > 0.0 and next_turn <= 0.0:
+                if ((v0_x - px)*(left_tan.y - py)
+                    - (left_tan.x - px)*(v0_y - py) <= 0.0):
+                    left_tan = planar.Vec2(v0_x, v0_y)
+            v0_x = v1_x
+            v0_y = v1_y
+            prev_turn = next_turn
+        return left_tan, right_tan
+
+    @staticmethod
+    def _pt_above(p, a, b):
+        """Return True if a is above b relative to fixed point p"""
+        return ((a[0] - p[0])*(b[1] - p[1]) 
+            - (b[0] - p[0])*(a[1] - p[1]) > 0.0)
+
+    @staticmethod
+    def _pt_below(p, a, b):
+        """Return True if a is below b relative to fixed point p"""
+        return ((a[0] - p[0])*(b[1] - p[1]) 
+            - (b[0] - p[0])*(a[1] - p[1]) < 0.0)
+
+    def _left_tan_i_convex(self, point):
+        """Return the left tangent index to the given exterior point for a 
+        convex polygon using a binary search.
+        """
+        below = self._pt_below
+        above = self._pt_above
+        
+        # See if vertex[-1] is the tangent point
+        if (not below(point, self[0], self[-1]) 
+            and above(point, self[-2], self[-1])):
+            return -1
+
+        a = -1
+        b = len(self) - 1
+        limit = len(self)
+        while limit:
+            c = (a + b) // 2
+            down_c = below(point, self[c+1], self[c])
+            if not down_c and above(point, self[c-1], self[c]):
+                # We have our man
+                return c
+            if below(point, self[a+1], self[a]):
+                if not down_c or below(point, self[a], self[c]):
+                    b = c
+                else:
+                    a = c
+            else:
+                if down_c or not above(point, self[a], self[c]):
+                    a = c
+                else:
+                    b = c
+            limit -= 1
+        return a # Interior point
+
+    def _right_tan_i_convex(self, point):
+        """Return the right tangent index to the given exterior point for a 
+        convex polygon using a binary search.
+        """
+        below = self._pt_below
+        above = self._pt_above
+        
+        # See if vertex[-1] is the tangent point
+        if (below(point, self[0], self[-1]) 
+            and not above(point, self[-2], self[-1])):
+            return -1
+
+        a = -1
+        b = len(self) - 1
+        limit = len(self)
+        while limit:
+            c = (a + b) // 2
+            down_c = below(point, self[c+1], self[c])
+            if down_c and not above(point, self[c-1], self[c]):
+                # We have our man
+                return c
+            if above(point, self[a+1], self[a]):
+                if down_c or above(point, self[a], self[c]):
+                    b = c
+                else:
+                    a = c
+            else:
+                if not down_c or not below(point, self[a], self[c]):
+                    a = c
+                else:
+                    b = c
+            limit -= 1
+        return a # Interior point
+
+    def tangents_to_point(self, point):
+        """Given a point **exterior** to the polygon, return the pair of
+        vertex points from the polygon that define the tangent lines with the
+        specified point.
+
+        Runtime Complexity: O(log n) convex, O(n) other
+
+        :param point: A point outside the polygon. If the point specified is
+            inside, the result is undefined.
+        :type point: :class:`~planar.Vec2`
+        :return: A tuple containing the left and right tangent points.
+        :rtype: tuple of :class:`~planar.Vec2`
+        """
+        if len(self) > 20 and self.is_convex and not self._dupe_verts:
+            return (self[self._left_tan_i_convex(point)], 
+                self[self._right_tan_i_convex(point)])
+        else:
+            return self._pt_tangents(point)
+
+    ## Clipping ##
+
+    def clip(self, convex):
+        """Return the part of this polygon inside a convex polygon, using
+        the Sutherland-Hodgman algorithm. This polygon may be concave or
+        even non-simple, but the clip region must be convex. The clip
+        region may also be a :class:`~planar.BoundingBox`, which is
+        treated like its :meth:`~planar.BoundingBox.to_polygon`.
+
+        The result has the same winding as this polygon.  If this polygon
+        is concave, disjoint parts of the result are joined by edges along
+        the boundary of the clip region. The runtime complexity is O(nm),
+        where n and m are the sizes of the two polygons.
+
+        :param convex: The convex clip region.
+        :type convex: :class:`~planar.Polygon` or 
+            :class:`~planar.BoundingBox`
+        :return: A new polygon, or ``None`` if nothing remains after
+            clipping.
+        :rtype: Polygon
+        :raises ValueError: If the clip polygon is not convex.
+        """
+        clip_pts = _convex_clip_points(convex)
+        if clip_pts is None:
+            return None
+        points = _clip_convex([tuple(p) for p in self], clip_pts)
+        if len(points) < 3:
+            return None
+        return type(self)(points)
+
+    def intersection(self, convex):
+        """Return the intersection of this polygon with a convex polygon.
+        If this polygon is also convex, the intersection is computed in
+        O(n + m) time using O'Rourke's algorithm, and the result is known
+        to be convex. Otherwise this is equivalent to :meth:`clip`.
+
+        The result has the same winding as this polygon.
+
+        :param convex: The convex polygon to intersect with.
+        :type convex: :class:`~planar.Polygon` or 
+            :class:`~planar.BoundingBox`
+        :return: A new polygon, or ``None`` if the polygons do not overlap.
+        :rtype: Polygon
+        :raises ValueError: If the other polygon is not convex.
+        """
+        if not self.is_convex:
+            return self.clip(convex)
+        other_pts = _convex_clip_points(convex)
+        if other_pts is None:
+            return None
+        points = [tuple(p) for p in self]
+        if self.signed_area < 0:
+            points.reverse()
+        points = _intersect_convex(_dedupe_points(points), other_pts)
+        if len(points) < 3:
+            return None
+        if self.signed_area < 0:
+            points.reverse()
+        return type(self)(points, is_convex=True)
+
+    ## Boolean Operations ##
+
+    def union(self, other):
+        """Return the region covered by either this polygon or another
+        shape. See :meth:`symmetric_difference` for details of the
+        arguments and result.
+
+        :param other: The other shape.
+        :type other: :class:`~planar.Polygon` or sequence of polygons
+        :return: A list of polygons bounding the union.
+        """
+        return _boolean_op(self, other, lambda a, b: a or b)
+
+    def difference(self, other):
+        """Return the region covered by this polygon but not by another
+        shape. See :meth:`symmetric_difference` for details of the
+        arguments and result.
+
+        :param other: The shape to subtract.
+        :type other: :class:`~planar.Polygon` or sequence of polygons
+        :return: A list of polygons bounding the difference.
+        """
+        return _boolean_op(self, other, lambda a, b: a and not b)
+
+    def symmetric_difference(self, other):
+        """Return the region covered by exactly one of this polygon and
+        another shape.
+
+        Both polygons may be concave or non-simple. Points are considered
+        inside a non-simple polygon using the non-zero winding rule, the
+        same as :meth:`contains_point`. The other shape may also be a
+        sequence of polygons, which are treated as a single shape. This
+        shape may contain holes, so long as they are wound opposite to
+        the polygon enclosing them, such as the results of other boolean
+        operations.
+
+        The result is a list of polygons. Those bounding the resulting
+        regions are wound counter-clockwise, and those bounding holes in
+        them are wound clockwise. The list is empty if the result has no
+        area. The runtime complexity is O((n + k) log n), where n is the
+        total number of vertices and k the number of pairs of intersecting
+        edges.
+
+        :param other: The other shape.
+        :type other: :class:`~planar.Polygon` or sequence of polygons
+        :return: A list of polygons bounding the symmetric difference.
+        """
+        return _boolean_op(self, other, lambda a, b: a != b)
+
+    ## Convex Hull ##
+
+    @classmethod
+    def convex_hull(cls, points):
+        """Return a new polygon that is the convex hull of the supplied
+        sequence of points. 
+
+        If points is a polygon known to be convex, a copy of the 
+        polygon is returned.
+
+        The hull is computed using an adaptive quick-hull algorithm.  The
+        expected runtime complexity of this algorithm is O(n log h) (where h
+        is the size of the hull), the worst case is O(n log n) when the
+        supplied points are already nearly convex. This algorithm is
+        especially fast when many of the supplied points are inside the
+        resulting hull.
+
+        :param points: A sequence of points.
+        :rtype: Polygon
+        """
+        if isinstance(points, BasePolygon):
+            if points.is_convex_known and points.is_convex:
+                return points.__copy__()
+        return cls(_adaptive_quick_hull(points), is_convex=True)
+
+
+# The C Seq2 stores the vertices when the object is created, 
+# but the Python Seq2 stores them when it is initialized
+_seq2_stores_on_init = planar.Seq2.__init__ is not object.__init__
+
+
+class Polygon(BasePolygon, planar.Seq2):
+    """Arbitrary polygon represented as a list of vertices. 
+
+    The individual vertices of a polygon are mutable, but the number
+    of vertices is fixed at construction.
+
+    :param vertices: Iterable containing three or more :class:`~planar.Vec2` 
+        objects.
+    :param is_convex: Optionally allows the polygon to be declared convex
+        or non-convex at construction time, thus saving additional time spent
+        checking the vertices to calculate this property later. Only specify
+        this value if you are certain of the convexity of the vertices
+        provided, as no additional checking will be performed. The results are
+        undefined if a non-convex polygon is declared convex or vice-versa.
+        Note that triangles are always considered convex, regardless of this
+        value.
+    :type is_convex: bool
+    :param is_simple: Optionally allows the polygon to be declared simple
+        (i.e., not self-intersecting) or non-simple at construction time,
+        which can save time calculating this property later. As with
+        ``is_convex`` above, only specify this value if you are certain of
+        this value for the vertices provided, or the results are undefined.
+        Note that convex polygons are always considered simple, regardless of
+        this value.
+    :type is_simple: bool
+
+    .. note::
+        Several operations on polygons, such as checking for containment, or
+        intersection, rely on knowing the convexity to select the appropriate
+        algorithm. So, it may be beneficial to specify these values in the
+        constructor, even if your application does not access the ``is_convex``,
+        or ``is_simple`` properties itself later. However, be cautious when 
+        specifying these values here, as incorrect values will likely
+        result in incorrect results when operating on the polygon.
+
+    .. note::
+        If the polygon is mutated, the cached values of ``is_convex`` and 
+        ``is_simple`` will be invalidated.
+    """
+
+    def __init__(self, vertices, is_convex=None, is_simple=None):
+        if _seq2_stores_on_init:
+            super(BasePolygon, self).__init__(vertices)
+        BasePolygon.__init__(self, vertices, is_convex, is_simple)
+
+
+def _iter_polygons(polygons):
+    """Iterate a sequence of polygons, checking their type"""
+    for poly in polygons:
+        if not isinstance(poly, BasePolygon):
+            raise TypeError("expected iterable of Polygon objects")
+        yield poly
+
+
+def _convex_clip_points(convex):
+    """Return the vertices of a convex clip region as a list of distinct
+    tuples wound counter-clockwise, or None if the region has no area.
+    """
+    if not isinstance(convex, (BasePolygon, planar.Polygon)):
+        try:
+            (x1, y1), (x2, y2) = convex.min_point, convex.max_point
+        except AttributeError:
+            raise TypeError("Expected Polygon or BoundingBox, got %r" 
+                % type(convex).__name__)
+        if x1 >= x2 or y1 >= y2:
+            return None
+        return [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+    if not convex.is_convex:
+        raise ValueError("Clip polygon must be convex")
+    area = convex.signed_area
+    if area == 0:
+        return None
+    points = [tuple(p) for p in convex]
+    if area < 0:
+        points.reverse()
+    return _dedupe_points(points)
+
+
+def _dedupe_points(points):
+    """Remove consecutive duplicates from a closed sequence of points"""
+    result = [p for i, p in enumerate(points) if p != points[i - 1]]
+    return result or points[:1]
+
+
+def _clip_convex(points, clip_pts):
+    """Clip a closed sequence of points against each edge of the
+    counter-clockwise convex polygon clip_pts in turn, returning the 
+    clipped points.
+    """
+    cx, cy = clip_pts[-1]
+    for dx, dy in clip_pts:
+        if not points:
+            break
+        ex = dx - cx
+        ey = dy - cy
+        output = []
+        ax, ay = points[-1]
+        a_side = ex * (ay - cy) - ey * (ax - cx)
+        for b in points:
+            bx, by = b
+            b_side = ex * (by - cy) - ey * (bx - cx)
+            if (a_side >= 0) != (b_side >= 0):
+                # Edge crosses the clip line, add the intersection point
+                t = a_side / (a_side - b_side)
+                output.append((ax + (bx - ax) * t, ay + (by - ay) * t))
+            if b_side >= 0:
+                output.append(b)
+            ax, ay, a_side = bx, by, b_side
+        points = _dedupe_points(output) if output else output
+        cx, cy = dx, dy
+    return points
+
+
+def _intersect_convex(P, Q):
+    """Return the intersection of two counter-clockwise convex polygons P
+    and Q, given as lists of distinct point tuples, as a list of points.
+    This uses O'Rourke's algorithm, which advances around both polygons
+    together, emitting the boundary of the intersection as it goes.
+
+    See O'Rourke, J. et al., "A new linear algorithm for intersecting
+    convex polygons", Computer Graphics and Image Processing 19, 1982.
+    """
+    def sign(x):
+        return (x > 0) - (x < 0)
+
+    def orient(a, b, c):
+        return sign((b[0] - a[0]) * (c[1] - a[1]) 
+            - (c[0] - a[0]) * (b[1] - a[1]))
+
+    n = len(P)
+    m = len(Q)
+    a = b = a_count = b_count = 0
+    inside = None # None, 'P' or 'Q'
+    first = True
+    output = []
+    while True:
+        pa0 = P[a - 1]
+        pa1 = P[a]
+        qb0 = Q[b - 1]
+        qb1 = Q[b]
+        ax = pa1[0] - pa0[0]
+        ay = pa1[1] - pa0[1]
+        bx = qb1[0] - qb0[0]
+        by = qb1[1] - qb0[1]
+        cross = sign(ax * by - ay * bx)
+        a_side = orient(qb0, qb1, pa1)
+        b_side = orient(pa0, pa1, qb1)
+        code, point = _segment_intersection(pa0, pa1, qb0, qb1)
+        if code == '1' or code == 'v':
+            if inside is None and first:
+                a_count = b_count = 0
+                first = False
+            output.append(point)
+            if a_side > 0:
+                inside = 'P'
+            elif b_side > 0:
+                inside = 'Q'
+        if code == 'e' and ax * bx + ay * by < 0:
+            # Polygons touch along an edge
+            return []
+        if cross == 0 and a_side < 0 and b_side < 0:
+            # Parallel separating edges
+            return []
+        if cross == 0 and a_side == 0 and b_side == 0:
+            # Collinear edges, advance the outside one
+            advance_a = inside != 'P'
+        elif cross >= 0:
+            advance_a = b_side > 0
+        else:
+            advance_a = a_side <= 0
+        if advance_a:
+            if inside == 'P':
+                output.append(pa1)
+            a = (a + 1) % n
+            a_count += 1
+        else:
+            if inside == 'Q':
+                output.append(qb1)
+            b = (b + 1) % m
+            b_count += 1
+        if ((a_count >= n and b_count >= m) 
+            or a_count >= 2 * n or b_count >= 2 * m):
+            break
+    if inside is None:
+        # The boundaries do not cross, so either one polygon contains the
+        # other, or they do not overlap. The interior point of the contained
+        # polygon will be inside the container, but the reverse may also
+        # be true, in which case the smaller polygon is contained.
+        p_in_q = _convex_contains(Q, _mean_point(P))
+        q_in_p = _convex_contains(P, _mean_point(Q))
+        if p_in_q and q_in_p:
+            return P if _twice_area(P) <= _twice_area(Q) else Q
+        if p_in_q:
+            return P
+        if q_in_p:
+            return Q
+        return []
+    return _dedupe_points(output)
+
+
+def _segment_intersection(a, b, c, d):
+    """Classify the intersection of segments ab and cd, returning a code
+    and the intersection point, if any. The code is '1' if the segments
+    cross properly, 'v' if an endpoint of one lies on the other, 'e' if
+    the segments overlap collinearly and '0' if they do not intersect.
+    """
+    denom = (a[0] * (d[1] - c[1]) + b[0] * (c[1] - d[1]) 
+        + d[0] * (b[1] - a[1]) + c[0] * (a[1] - b[1]))
+    if denom == 0:
+        # Parallel segments
+        if ((b[0] - a[0]) * (c[1] - a[1]) 
+            - (c[0] - a[0]) * (b[1] - a[1]) != 0):
+            return '0', None
+        for p, q0, q1 in ((c, a, b), (d, a, b), (a, c, d), (b, c, d)):
+            if (min(q0[0], q1[0]) <= p[0] <= max(q0[0], q1[0])
+                and min(q0[1], q1[1]) <= p[1] <= max(q0[1], q1[1])):
+                return 'e', p
+        return '0', None
+    code = None
+    num = a[0] * (d[1] - c[1]) + c[0] * (a[1] - d[1]) + d[0] * (c[1] - a[1])
+    if num == 0 or num == denom:
+        code = 'v'
+    s = num / denom
+    num = -(a[0] * (c[1] - b[1]) + b[0] * (a[1] - c[1]) 
+        + c[0] * (b[1] - a[1]))
+    if num == 0 or num == denom:
+        code = 'v'
+    t = num / denom
+    if 0 < s < 1 and 0 < t < 1:
+        code = '1'
+    elif s < 0 or s > 1 or t < 0 or t > 1:
+        code = '0'
+    return code, (a[0] + s * (b[0] - a[0]), a[1] + s * (b[1] - a[1]))
+
+
+def _mean_point(points):
+    """Return the average of a list of points"""
+    n = len(points)
+    return (sum(p[0] for p in points) / n, sum(p[1] for p in points) / n)
+
+
+def _twice_area(points):
+    """Return twice the signed area of a closed sequence of points"""
+    ax, ay = points[-1]
+    total = 0.0
+    for bx, by in points:
+        total += ax * by - bx * ay
+        ax, ay = bx, by
+    return total
+
+
+def _convex_contains(points, pt):
+    """Return True if pt is inside or on the boundary of the 
+    counter-clockwise convex polygon points.
+    """
+    x, y = pt
+    ax, ay = points[-1]
+    for bx, by in points:
+        if (bx - ax) * (y - ay) - (x - ax) * (by - ay) < 0:
+            return False
+        ax, ay = bx, by
+    return True
+
+
+def _boolean_op(poly, other, op):
+    """Perform a boolean operation on a polygon and another shape,
+    returning the boundary of the result as a list of polygons. ``op``
+    takes two booleans, whether a point is inside each shape, and returns
+    True if the point is inside the result.
+
+    The edges of both shapes are split at every intersection point, found
+    with a Bentley-Ottmann sweep. A second sweep over the split edges
+    finds the winding number of each shape on both sides of every edge.
+    The edges where the result changes from outside to inside are kept,
+    and joined into closed boundaries.
+    """
+    if isinstance(other, (BasePolygon, planar.Polygon)):
+        other = [other]
+    rings = []
+    for owner, shape in enumerate(([poly], other)):
+        for ring in shape:
+            if not isinstance(ring, (BasePolygon, planar.Polygon)):
+                raise TypeError(
+                    "Expected Polygon or sequence of Polygons, got %r" 
+                    % type(ring).__name__)
+            rings.append((owner, len(ring)))
+    # Vertices shared by the shapes up to rounding error must be
+    # identical, so the edges meeting there are joined
+    points = _snap_points(
+        [pt for shape in ([poly], other) for ring in shape for pt in ring])
+    segments = []
+    owners = []
+    start = 0
+    for owner, size in rings:
+        ring = points[start:start + size]
+        start += size
+        prev = ring[-1]
+        for pt in ring:
+            if pt != prev:
+                segments.append((prev, pt))
+                owners.append(owner)
+            prev = pt
+
+    # Split the edges at each intersection, merging coincident pieces.
+    # Each piece keeps the change in winding number of each shape from
+    # its right side to its left side, when oriented in sweep order
+    splits = [[] for i in range(len(segments))]
+    for point, indices in planar.find_intersections(segments):
+        point = tuple(point)
+        for i in indices:
+            splits[i].append(point)
+    windings = {}
+    for (start, end), owner, points in zip(segments, owners, splits):
+        direction = 1
+        if end < start:
+            start, end = end, start
+            direction = -1
+        points = sorted(set(p for p in points if start < p < end))
+        points.append(end)
+        for pt in points:
+            key = (start, pt)
+            if key not in windings:
+                windings[key] = [0, 0]
+            windings[key][owner] += direction
+            start = pt
+    edges = [key for key in sorted(windings) 
+        if windings[key][0] or windings[key][1]]
+
+    # Sweep the edges in lexicographical order, taking the winding 
+    # numbers below each edge from the edge below it. Edges ending at a
+    # point are removed before those starting there are inserted in 
+    # ascending order, so the edge below is always correct
+    lefts = [left for left, right in edges]
+    rights = [right for left, right in edges]
+    events = []
+    for i, (left, right) in enumerate(edges):
+        events.append((left, 1, 
+            math.atan2(right[1] - left[1], right[0] - left[0]), i))
+        events.append((right, 0, 0.0, i))
+    events.sort()
+    status = SweepStatus(len(edges), _sweep_edge_order(lefts, rights))
+    above = [None] * len(edges)
+    boundary = {}
+    for point, is_start, angle, i in events:
+        if not is_start:
+            status.remove(i)
+            continue
+        status.insert(i)
+        below = status.prev(i)
+        a, b = above[below] if below is not None else (0, 0)
+        inside_below = op(a != 0, b != 0)
+        a += windings[edges[i]][0]
+        b += windings[edges[i]][1]
+        above[i] = (a, b)
+        inside_above = op(a != 0, b != 0)
+        if inside_above != inside_below:
+            # Orient the edge with the result inside to the left
+            start, end = edges[i]
+            if inside_below:
+                start, end = end, start
+            boundary.setdefault(start, []).append(end)
+    return [type(poly)(ring) for ring in _join_boundary(boundary)]
+
+
+def _join_boundary(boundary):
+    """Join directed edges into closed rings, given as a dict mapping
+    each start point to a list of end points. Where several edges leave
+    a point, the one turning furthest left is followed, so that rings 
+    touching at a point are kept separate. Collinear vertices are 
+    omitted from the rings.
+    """
+    two_pi = 2.0 * math.pi
+
+    def next_point(prev, pt):
+        ends = boundary[pt]
+        best = 0
+        if len(ends) > 1:
+            back = math.atan2(prev[1] - pt[1], prev[0] - pt[0])
+            best_turn = None
+            for i, end in enumerate(ends):
+                turn = (back - math.atan2(end[1] - pt[1], end[0] - pt[0])
+                    ) % two_pi or two_pi
+                if best_turn is None or turn < best_turn:
+                    best = i
+                    best_turn = turn
+        return ends.pop(best)
+
+    rings = []
+    for first in sorted(boundary):
+        while boundary[first]:
+            # The first edge is left in place, so it can be chosen to
+            # close the ring if it turns furthest left at the end
+            prev = first
+            pt = first_end = boundary[first][-1]
+            ring = [first]
+            while True:
+                if not boundary.get(pt):
+                    # Not closed due to rounding errors
+                    boundary[first].remove(first_end)
+                    ring = []
+                    break
+                ring.append(pt)
+                prev, pt = pt, next_point(prev, pt)
+                if prev == first and pt == first_end:
+                    ring.pop()
+                    break
+            ring = _remove_collinear(ring)
+            if len(ring) >= 3:
+                rings.append(ring)
+    return rings
+
+
+def _remove_collinear(ring):
+    """Remove vertices that lie in the middle of a straight line
+    from a closed sequence of points
+    """
+    result = []
+    count = len(ring)
+    for i in range(count):
+        a = result[-1] if result else ring[i - 1]
+        b = ring[i]
+        c = ring[(i + 1) % count]
+        if ((b[0] - a[0]) * (c[1] - b[1]) - (c[0] - b[0]) * (b[1] - a[1]) 
+            or (b[0] - a[0]) * (c[0] - b[0]) + (b[1] - a[1]) * (c[1] - b[1]) 
+            < 0.0):
+            result.append(b)
+    return result
+
+
+@_stats.timed('convex_hull')
+def _adaptive_quick_hull(points):
+    """Compute the convex hull from an arbitrary collection of points
+    using an adaptive quick hull algorithm. Return the points of the hull
+    as a list in radial sequence.
+
+    The adaptive algorithm paritions the points as in quick-hull unless
+    the paritioning fails to cull enough points to remain efficient.
+    If this occurs then the algorithm changes to a monotone chain
+    (A simplified variant of Graham's scan) for the partition to avoid
+    the worst-case quick-hull behavior.
+    """
+    leftmost = rightmost = points[0]
+    for p in points:
+        if p[0] < leftmost[0]:
+            leftmost = p
+        elif p[0] > rightmost[0]:
+            rightmost = p
+    upper_points = set()
+    lower_points = set()
+    add_upper = upper_points.add
+    add_lower = lower_points.add
+    lx, ly = leftmost
+    line_w = rightmost[0] - leftmost[0]
+    line_h = rightmost[1] - leftmost[1]
+    for p in points:
+        if line_w * (p[1] - ly) - (p[0] - lx) * line_h > 0.0:
+            add_upper(p)
+        else:
+            add_lower(p)
+    upper_points.discard(leftmost)
+    upper_points.discard(rightmost)
+    lower_points.discard(leftmost)
+    lower_points.discard(rightmost)
+    hull = []
+    if upper_points:
+        _ahull_partition_points(hull, upper_points, leftmost, rightmost)
+    else:
+        hull.append(leftmost)
+    if lower_points:
+        _ahull_partition_points(hull, lower_points, rightmost, leftmost)
+    else:
+        hull.append(rightmost)
+    return hull
+
+def _ahull_partition_points(hull, points, p0, p1):
+    """Partition the points 'above' p0->p1 to compute the sub-hull"""
+
+    # Find point furthest from line p0->p1 as partition point
+    furthest = -1.0
+    p0_x, p0_y = p0
+    pline_dx = p1[0] - p0[0]
+    pline_dy = p1[1] - p0[1]
+    for p in points:
+        dist = pline_dx * (p[1] - p0_y) - (p[0] - p0_x) * pline_dy
+        if dist > furthest:
+            furthest = dist
+            partition_point = p
+    partition_point = planar.Vec2(*partition_point)
+    
+    # Compute the triangle partition_point->p0->p1
+    # in barycentric coordinates
+    # All points inside this triangle are not in the hull
+    # divide the remaining points into left and right sets
+    left_points = []
+    right_points = []
+    add_left = left_points.append
+    add_right = right_points.append
+    v0 = p0 - partition_point
+    v1 = p1 - partition_point
+    dot00 = v0.length2
+    dot01 = v0.dot(v1)
+    dot11 = v1.length2
+    denom = (dot00 * dot11 - dot01 * dot01)
+    # If denom is zero, the triangle has no area and
+    # all points lie on the partition line 
+    # and thus can be culled
+    if denom:
+        inv_denom = 1.0 / denom
+        for p in points:
+            v2 = p - partition_point
+            dot02 = v0.dot(v2)
+            dot12 = v1.dot(v2)
+            u = (dot11 * dot02 - dot01 * dot12) * inv_denom
+            v = (dot00 * dot12 - dot01 * dot02) * inv_denom
+            # Since the partition point is the furthest from p0->p1
+            # u and v cannot both be negative
+            # Note the partition point is discarded here
+            if v < 0.0:
+                add_left(p)
+            elif u < 0.0:
+                add_right(p)
+
+    left_count = len(left_points)
+    right_count = len(right_points)
+    # Heuristic to determine if we should continue to partition
+    # recursively, or complete the sub-hull via a sorted scan.
+    # The more points culled by this partition, the greater
+    # the chance we will partition further. If paritioning
+    # culled few points, it is likely that a sorted scan
+    # will be the more efficient algorithm. Note the scaling
+    # factor here is not particularly sensitive.
+    max_partition = (len(points) - left_count - right_count) * 4
+
+    if left_count <= 1:
+        # Trivial partition
+        hull.append(p0)
+        hull.extend(left_points)
+    elif left_count <= max_partition:
+        _ahull_partition_points(hull, left_points, p0, partition_point)
+    else:
+        _ahull_sort_points(hull, left_points, p0, partition_point)
+
+    if right_count <= 1:
+        # Trivial partition
+        hull.append(partition_point)
+        hull.extend(right_points)
+    elif right_count <= max_partition:
+        _ahull_partition_points(hull, right_points, partition_point, p1)
+    else:
+        _ahull_sort_points(hull, right_points, partition_point, p1)
+
+def _ahull_sort_points(hull, points, p0, p1):
+    """Compute the sub-hull using a sorted chain-hull algorithm"""
+    dx, dy = p1 - p0
+    p0_x, p0_y = p0
+    def line_order(pt):
+        return dx * (pt[0] - p0_x) + dy * (pt[1] - p0_y)
+    points.sort(key=line_order)
+    points.append(p1)
+    stack = [p0]
+    push = stack.append
+    pop = stack.pop
+    for p in points:
+        while len(stack) >= 2:
+            v0 = stack[-2]
+            v1 = stack[-1]
+            if ((v1[0] - v0[0])*(p[1] - v0[1]) 
+                - (p[0] - v0[0])*(v1[1] - v0[1]) >= 0.0):
+                pop()
+            else:
+                break
+        push(p)
+    pop()
+    hull.extend(stack)
+
+
+def _triangulate_simple(poly):
+    """Triangulate a simple polygon, returning an array of vertex indices.
+
+    The polygon is first divided into pieces monotone in the
+    lexicographical sweep direction by a plane sweep that connects each
+    split and merge vertex to a nearby vertex with a diagonal. Each
+    piece is then triangulated in linear time. Total runtime is O(n log n).
+    """
+    # Work on the distinct vertices in counter-clockwise order
+    indices = range(len(poly))
+    clockwise = poly.signed_area < 0.0
+    if clockwise:
+        indices = reversed(indices)
+    pts = []
+    vert_index = []
+    for i in indices:
+        pt = tuple(poly[i])
+        if not pts or pt != pts[-1]:
+            pts.append(pt)
+            vert_index.append(i)
+    while len(pts) > 1 and pts[-1] == pts[0]:
+        pts.pop()
+        vert_index.pop()
+    count = len(pts)
+    triangles = array.array('I')
+    if count < 3:
+        return triangles
+
+    def orient(a, b, c):
+        return (b[0] - a[0])*(c[1] - a[1]) - (c[0] - a[0])*(b[1] - a[1])
+
+    # Edge i goes from vertex i to vertex i + 1. The sweep status holds
+    # the edges with the polygon interior above them, each with its helper
+    # vertex, the last vertex processed that can see the edge from above
+    lefts = []
+    rights = []
+    for i in range(count):
+        a = pts[i]
+        b = pts[(i + 1) % count]
+        lefts.append(min(a, b))
+        rights.append(max(a, b))
+    status = SweepStatus(count, _sweep_edge_order(lefts, rights))
+    helper = [None] * count
+    is_merge = [False] * count
+    diagonals = []
+
+    def edge_below(pt):
+        return status.find_last(
+            lambda i: orient(lefts[i], rights[i], pt) > 0.0)
+
+    def connect_helper(v, edge):
+        if edge is not None and is_merge[helper[edge]]:
+            diagonals.append((v, helper[edge]))
+
+    for v in sorted(range(count), key=pts.__getitem__):
+        pt = pts[v]
+        prev_v = (v - 1) % count
+        prev_pt = pts[prev_v]
+        next_pt = pts[(v + 1) % count]
+        reflex = orient(prev_pt, pt, next_pt) < 0.0
+        if prev_pt > pt and next_pt > pt:
+            if reflex:
+                # Split vertex
+                edge = edge_below(pt)
+                if edge is not None:
+                    diagonals.append((v, helper[edge]))
+                    helper[edge] = v
+            # Start or split vertex
+            status.insert(v)
+            helper[v] = v
+        elif prev_pt < pt and next_pt < pt:
+            # End or merge vertex
+            connect_helper(v, prev_v)
+            status.remove(prev_v)
+            if reflex:
+                is_merge[v] = True
+                edge = edge_below(pt)
+                connect_helper(v, edge)
+                if edge is not None:
+                    helper[edge] = v
+        elif prev_pt < pt:
+            # Regular vertex with the interior above
+            connect_helper(v, prev_v)
+            status.remove(prev_v)
+            status.insert(v)
+            helper[v] = v
+        else:
+            # Regular vertex with the interior below
+            edge = edge_below(pt)
+            connect_helper(v, edge)
+            if edge is not None:
+                helper[edge] = v
+
+    # Trace the faces formed by the diagonals. Walking around each 
+    # face counter-clockwise, the next vertex is the neighbor of the 
+    # current vertex that is clockwise adjacent to the previous one
+    triangle_verts = []
+    if diagonals:
+        neighbors = {}
+        for a, b in diagonals:
+            for v, u in ((a, b), (b, a)):
+                if v not in neighbors:
+                    neighbors[v] = [(v - 1) % count, (v + 1) % count]
+                neighbors[v].append(u)
+        fans = {}
+        for v, adjacent in neighbors.items():
+            vx, vy = pts[v]
+            fan = sorted((math.atan2(pts[u][1] - vy, pts[u][0] - vx), u) 
+                for u in adjacent)
+            fans[v] = ([angle for angle, u in fan], [u for angle, u in fan])
+        half_edges = [(i, (i + 1) % count) for i in range(count)]
+        half_edges.extend(diagonals)
+        half_edges.extend((b, a) for a, b in diagonals)
+        visited = set()
+        for start in half_edges:
+            if start in visited:
+                continue
+            face = []
+            u, v = start
+            while True:
+                visited.add((u, v))
+                face.append(u)
+                if v in fans:
+                    angles, adjacent = fans[v]
+                    w = adjacent[bisect.bisect_left(angles, math.atan2(
+                        pts[u][1] - pts[v][1], pts[u][0] - pts[v][0])) - 1]
+                else:
+                    w = (v + 1) % count
+                u, v = v, w
+                if (u, v) == start:
+                    break
+            _triangulate_monotone(pts, face, triangle_verts)
+    else:
+        _triangulate_monotone(pts, list(range(count)), triangle_verts)
+
+    if clockwise:
+        # Restore the polygon's winding
+        for i in range(0, len(triangle_verts), 3):
+            triangle_verts[i + 1], triangle_verts[i + 2] = (
+                triangle_verts[i + 2], triangle_verts[i + 1])
+    triangles.extend(vert_index[v] for v in triangle_verts)
+    return triangles
+
+def _triangulate_monotone(pts, face, triangles):
+    """Triangulate a polygon monotone in the lexicographical direction,
+    with vertex indices in ``face`` wound counter-clockwise. The 
+    vertex indices of the triangles are appended to ``triangles``.
+    """
+    count = len(face)
+    if count <= 3:
+        if count == 3:
+            triangles.extend(face)
+        return
+    key = pts.__getitem__
+    lo = min(range(count), key=lambda i: key(face[i]))
+    hi = max(range(count), key=lambda i: key(face[i]))
+    # Merge the lower and upper chains, which run counter-clockwise
+    # and clockwise from the lowest vertex respectively
+    verts = [(face[lo], False)]
+    i = (lo + 1) % count
+    j = (lo - 1) % count
+    while i != hi or j != hi:
+        if j == hi or (i != hi and key(face[i]) < key(face[j])):
+            verts.append((face[i], False))
+            i = (i + 1) % count
+        else:
+            verts.append((face[j], True))
+            j = (j - 1) % count
+    verts.append((face[hi], False))
+
+    def orient(a, b, c):
+        a = pts[a]
+        b = pts[b]
+        c = pts[c]
+        return (b[0] - a[0])*(c[1] - a[1]) - (c[0] - a[0])*(b[1] - a[1])
+
+    def add_fan(v, upper, stack):
+        # Add triangles from v to the edges of the reflex chain in stack
+        for k in range(len(stack) - 1):
+            a = stack[k][0]
+            b = stack[k + 1][0]
+            if upper:
+                triangles.extend((a, b, v))
+            else:
+                triangles.extend((b, a, v))
+
+    stack = verts[:2]
+    for v, upper in verts[2:-1]:
+        if upper != stack[-1][1]:
+            add_fan(v, upper, stack)
+            stack = [stack[-1], (v, upper)]
+        else:
+            last = stack.pop()
+            while stack:
+                top = stack[-1][0]
+                side = orient(top, last[0], v)
+                if upper and side < 0.0:
+                    triangles.extend((top, v, last[0]))
+                elif not upper and side > 0.0:
+                    triangles.extend((top, last[0], v))
+                else:
+                    break
+                last = stack.pop()
+            stack.append(last)
+            stack.append((v, upper))
+    add_fan(verts[-1][0], not stack[-1][1], stack)
+
+
+def _sweep_edge_order(lefts, rights):
+    """Return a function that orders edges by their position along a
+    sweep line moving in lexicographical order. The edges are given as 
+    sequences of their left and right (lexicographically min and max)
+    endpoints. Edges are only ordered correctly when both span the
+    sweep line and do not cross.
+    """
+    def below(i, j):
+        # Return True if edge i is ordered before edge j along the 
+        # sweep line. The position of the edge that begins later is
+        # compared against the line of the other edge
+        a = lefts[i]
+        b = rights[i]
+        c = lefts[j]
+        d = rights[j]
+        if a <= c:
+            side = 0.0
+            if a != c:
+                side = ((b[0] - a[0])*(c[1] - a[1]) 
+                    - (c[0] - a[0])*(b[1] - a[1]))
+            if not side:
+                side = ((b[0] - a[0])*(d[1] - a[1]) 
+                    - (d[0] - a[0])*(b[1] - a[1]))
+            if side:
+                return side > 0.0
+        else:
+            side = ((d[0] - c[0])*(a[1] - c[1]) 
+                - (a[0] - c[0])*(d[1] - c[1]))
+            if not side:
+                side = ((d[0] - c[0])*(b[1] - c[1]) 
+                    - (b[0] - c[0])*(d[1] - c[1]))
+            if side:
+                return side < 0.0
+        # collinear edges are ordered arbitrarily
+        return i < j
+    return below
+
+
+_unknown = object()
+
+# Attributes of the polygon cached properties counted by planar.stats,
+# and their values when unknown
+_cached_attrs = (('is_convex', '_convex', _unknown),
+    ('is_simple', '_simple', _unknown),
+    ('centroid', '_centroid', _unknown),
+    ('signed_area', '_signed_area', None),
+    ('perimeter', '_perimeter', None),
+    ('bounding_box', '_bbox', None),
+    ('triangles', '_triangles', None),
+    ('y_polylines', '_y_polylines', None),
+    ('grid', '_grid', None))
+
+
+def _grid_index(value, origin, scale, count):
+    """Return the index of the grid cell containing ``value`` along
+    one axis, clamped to the grid.
+    """
+    index = int((value - origin) * scale)
+    if index < 0:
+        return 0
+    if index >= count:
+        return count - 1
+    return index
+
+
+# vim: ai ts=4 sts=4 et sw=4 tw=78
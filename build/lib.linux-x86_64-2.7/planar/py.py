@@ -0,0 +1,42 @@
+#############################################################################
+# Copyright (c) 2010 by Casey Duncan
+# Portions copyright (c) 2009 The Super Effective Team 
+#                             (www.supereffective.org)
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, 
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name(s) of the copyright holders nor the names of its
+#   contributors may be used to endorse or promote products derived from this
+#   software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AS IS AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO
+# EVENT SHALL THE COPYRIGHT HOLDERS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, 
+# OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#############################################################################
+"""Convenience namespace module for importing Python class implementations"""
+
+__all__ = ('Vec2', 'Point', 'Vec2Array', 'Vec2Array32', 'Seq2', 
+	'Affine', 'Line', 'Ray', 'LineSegment', 'BoundingBox', 'Polygon',
+	'RTree', 'KDTree', 'find_intersections')
+
+from planar.vector import Vec2, Vec2Array, Vec2Array32, Seq2
+from planar.vector import Vec2 as Point
+from planar.transform import Affine
+from planar.line import Line, Ray, LineSegment, find_intersections
+from planar.box import BoundingBox
+from planar.polygon import Polygon
+from planar.index import RTree, KDTree
@@ -0,0 +1,187 @@
+#############################################################################
+# Copyright (c) 2010 by Casey Duncan
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, 
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name(s) of the copyright holders nor the names of its
+#   contributors may be used to endorse or promote products derived from this
+#   software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AS IS AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO
+# EVENT SHALL THE COPYRIGHT HOLDERS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, 
+# OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#############################################################################
+
+"""Runtime statistics for diagnosing the performance of polygon queries.
+
+When enabled, planar counts the strategy used to test each point in
+:meth:`Polygon.contains_point` and :meth:`Polygon.contains_points`,
+the hits, misses and invalidations of each cached polygon property,
+and the calls and time spent classifying polygons, checking if they are
+simple and computing convex hulls. Statistics are collected from both the
+C and Python implementations, and are disabled by default. When
+disabled, the only overhead is a flag test, and when enabled each count
+costs little more, so they can be left enabled in production.
+"""
+
+__all__ = ('enable', 'disable', 'is_enabled', 'reset', 'snapshot',
+    'cache_hit_rates')
+
+import functools
+from timeit import default_timer
+
+cached_properties = ('is_convex', 'is_simple', 'centroid', 'signed_area',
+    'perimeter', 'bounding_box', 'triangles', 'y_polylines', 'grid')
+"""Names of the polygon cached properties counted. ``triangles`` is
+the cached result of :meth:`Polygon.triangulate`, ``y_polylines`` and
+``grid`` are the structures used for point containment tests of convex
+and prepared polygons.
+"""
+
+names = tuple(['pip.triangle', 'pip.radius_inside', 'pip.radius_outside',
+    'pip.y_monotone', 'pip.bbox_reject', 'pip.grid', 'pip.winding']
+    + ['cache.%s.%s' % (prop, stat) for prop in cached_properties
+        for stat in ('hits', 'misses', 'invalidations')]
+    + ['%s.%s' % (op, stat) 
+        for op in ('classify', 'check_is_simple', 'convex_hull')
+        for stat in ('calls', 'time')])
+"""Names of the statistics, in the order reported"""
+
+enabled = False
+"""True if statistics are being collected. Use :func:`enable` and
+:func:`disable` to change.
+"""
+
+# Statistics collected from the Python implementation
+_counts = dict.fromkeys(names, 0)
+
+def _c_module():
+    try:
+        from planar import c
+    except ImportError: # pragma: no cover
+        return None
+    return c
+
+def enable():
+    """Start collecting statistics"""
+    global enabled
+    enabled = True
+    c = _c_module()
+    if c is not None:
+        c._set_stats_enabled(True)
+
+def disable():
+    """Stop collecting statistics. The statistics collected so far are
+    kept until :func:`reset` is called.
+    """
+    global enabled
+    enabled = False
+    c = _c_module()
+    if c is not None:
+        c._set_stats_enabled(False)
+
+def is_enabled():
+    """Return True if statistics are being collected"""
+    return enabled
+
+def reset():
+    """Reset all statistics to zero"""
+    for name in names:
+        _counts[name] = 0
+    c = _c_module()
+    if c is not None:
+        c._reset_stats()
+
+def snapshot():
+    """Return a dict of the statistics collected so far, by name. Counts
+    are integers and times are in seconds. The C and Python
+    implementations' statistics are combined.
+
+    Point containment tests are counted by the strategy that decided the
+    result:
+
+    - ``pip.triangle``: barycentric test of a triangle (Python only)
+    - ``pip.radius_inside``, ``pip.radius_outside``: the point is within
+      the inner radius, or beyond the outer radius, around the centroid
+    - ``pip.y_monotone``: binary search of a convex polygon's edges
+    - ``pip.bbox_reject``: the point is outside the bounding box
+    - ``pip.grid``: grid test of a prepared polygon
+    - ``pip.winding``: winding number test of all the edges
+
+    Cached polygon properties have ``cache.<property>.hits``, ``misses``
+    and ``invalidations`` counts. Invalidations count cached values
+    discarded because the polygon was mutated, or transformed by an
+    :class:`~planar.Affine` that does not preserve them. The
+    ``classify``, ``check_is_simple`` and ``convex_hull`` operations have
+    ``<operation>.calls`` and ``<operation>.time`` statistics.
+    """
+    stats = dict(_counts)
+    c = _c_module()
+    if c is not None:
+        for name, value in c._stats().items():
+            stats[name] += value
+    return stats
+
+def cache_hit_rates(stats=None):
+    """Return a dict of the fraction of accesses to each cached property
+    that were hits, from 0.0 to 1.0, or None if it was not accessed.
+
+    :param stats: Statistics returned by :func:`snapshot`, by default
+        the current statistics.
+    """
+    if stats is None:
+        stats = snapshot()
+    rates = {}
+    for prop in cached_properties:
+        hits = stats['cache.%s.hits' % prop]
+        total = hits + stats['cache.%s.misses' % prop]
+        rates[prop] = hits / float(total) if total else None
+    return rates
+
+def count(name, n=1):
+    """Add n to the statistic name, used by the Python implementation"""
+    _counts[name] += n
+
+def count_cache(prop, hit):
+    """Count a hit or miss of a cached property"""
+    if hit:
+        _counts['cache.%s.hits' % prop] += 1
+    else:
+        _counts['cache.%s.misses' % prop] += 1
+
+def timed(name):
+    """Decorator to count the calls and time spent in a function 
+    while statistics are enabled, as ``<name>.calls`` and ``<name>.time``
+    """
+    calls_name = name + '.calls'
+    time_name = name + '.time'
+    def decorator(func):
+        @functools.wraps(func)
+        def timed_func(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = default_timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _counts[time_name] += default_timer() - start
+                _counts[calls_name] += 1
+        return timed_func
+    return decorator
+
+
+# vim: ai ts=4 sts=4 et sw=4 tw=78
@@ -0,0 +1,303 @@
+"""Spatial index unit tests"""
+
+from __future__ import division
+import sys
+import math
+import random
+import unittest
+from nose.tools import assert_equal, assert_almost_equal, raises
+
+
+class RTreeBaseTestCase(object):
+
+    def grid_boxes(self, width=10, height=10):
+        return [self.BoundingBox([(x, y), (x + 0.5, y + 0.5)])
+            for y in range(height) for x in range(width)]
+
+    def random_boxes(self, count, seed=42):
+        rand = random.Random(seed)
+        boxes = []
+        for i in range(count):
+            x = rand.uniform(-100, 100)
+            y = rand.uniform(-100, 100)
+            boxes.append(self.BoundingBox([(x, y), 
+                (x + rand.uniform(0, 10), y + rand.uniform(0, 10))]))
+        return boxes
+
+    def brute_query_box(self, shapes, box):
+        return [shape for shape in shapes
+            if shape.bounding_box.min_point.x <= box.max_point.x
+            and shape.bounding_box.max_point.x >= box.min_point.x
+            and shape.bounding_box.min_point.y <= box.max_point.y
+            and shape.bounding_box.max_point.y >= box.min_point.y]
+
+    def box_distance(self, box, point):
+        dx = max(box.min_point.x - point[0], point[0] - box.max_point.x, 0)
+        dy = max(box.min_point.y - point[1], point[1] - box.max_point.y, 0)
+        return math.sqrt(dx*dx + dy*dy)
+
+    def test_empty(self):
+        tree = self.RTree([])
+        assert_equal(len(tree), 0)
+        assert_equal(list(tree), [])
+        assert_equal(tree.query_box(self.BoundingBox([(0,0), (1,1)])), [])
+        assert_equal(tree.query_point((0, 0)), [])
+        assert_equal(tree.nearest((0, 0)), [])
+
+    def test_single_shape(self):
+        box = self.BoundingBox([(0,0), (1,1)])
+        tree = self.RTree([box])
+        assert_equal(len(tree), 1)
+        assert tree.query_box(self.BoundingBox([(0.5,0.5), (2,2)]))[0] is box
+        assert_equal(tree.query_box(self.BoundingBox([(1.5,1.5), (2,2)])), [])
+        assert tree.query_point((0.5, 0.5))[0] is box
+        assert_equal(tree.query_point((-0.5, 0.5)), [])
+        assert tree.nearest((10, 10))[0] is box
+
+    def test_len_and_iter(self):
+        boxes = self.grid_boxes()
+        tree = self.RTree(iter(boxes))
+        assert_equal(len(tree), 100)
+        assert_equal(list(tree), boxes)
+
+    def test_query_box(self):
+        boxes = self.grid_boxes()
+        tree = self.RTree(boxes, node_capacity=4)
+        found = tree.query_box(self.BoundingBox([(2.25, 3.25), (4.75, 4.25)]))
+        assert_equal(found, [self.BoundingBox([(x, y), (x + 0.5, y + 0.5)])
+            for y in (3, 4) for x in (2, 3, 4)])
+        for shape, expected in zip(found, boxes[32:35] + boxes[42:45]):
+            assert shape is expected
+
+    def test_query_box_touching(self):
+        tree = self.RTree(self.grid_boxes())
+        found = tree.query_box(self.BoundingBox([(1.5, 1.5), (2, 2)]))
+        assert_equal(found, [
+            self.BoundingBox([(1,1), (1.5,1.5)]),
+            self.BoundingBox([(2,1), (2.5,1.5)]),
+            self.BoundingBox([(1,2), (1.5,2.5)]),
+            self.BoundingBox([(2,2), (2.5,2.5)])])
+
+    def test_query_box_shape(self):
+        tree = self.RTree(self.grid_boxes())
+        tri = self.Polygon([(0.25,0.25), (1.25,0.25), (0.25,1.25)])
+        assert_equal(len(tree.query_box(tri)), 4)
+
+    def test_query_box_matches_brute_force(self):
+        boxes = self.random_boxes(500)
+        rand = random.Random(7)
+        for capacity in (2, 3, 16, 100):
+            tree = self.RTree(boxes, node_capacity=capacity)
+            for i in range(50):
+                x, y = rand.uniform(-110, 110), rand.uniform(-110, 110)
+                query = self.BoundingBox([(x, y), 
+                    (x + rand.uniform(0, 40), y + rand.uniform(0, 40))])
+                assert_equal(tree.query_box(query), 
+                    self.brute_query_box(boxes, query))
+
+    def test_query_point(self):
+        boxes = self.grid_boxes()
+        tree = self.RTree(boxes)
+        found = tree.query_point((3.25, 5.5))
+        assert_equal(len(found), 1)
+        assert found[0] is boxes[53]
+        assert_equal(tree.query_point((3.75, 5.5)), [])
+        assert_equal(tree.query_point(self.Vec2(2, 2)), [boxes[22]])
+        assert_equal(tree.query_point((100, 100)), [])
+
+    def test_query_point_exact(self):
+        tri1 = self.Polygon([(0,0), (2,0), (0,2)])
+        tri2 = self.Polygon([(2,2), (2,0), (0,2)])
+        square = self.Polygon([(3,0), (4,0), (4,1), (3,1)])
+        tree = self.RTree([tri1, tri2, square])
+        assert_equal(tree.query_point((0.5, 0.5)), [tri1, tri2])
+        assert_equal(tree.query_point((0.5, 0.5), exact=True), [tri1])
+        assert_equal(tree.query_point((1.5, 1.5), exact=True), [tri2])
+        assert_equal(tree.query_point((3.5, 0.5), True), [square])
+        assert_equal(tree.query_point((2.5, 0.5), exact=True), [])
+
+    def test_nearest(self):
+        boxes = self.grid_boxes()
+        tree = self.RTree(boxes)
+        assert tree.nearest((3.2, 4.2))[0] is boxes[43]
+        assert tree.nearest((-1, -1))[0] is boxes[0]
+        assert tree.nearest((100, 8.25), k=1)[0] is boxes[89]
+        found = tree.nearest((3.75, 4.25), 3)
+        assert_equal(len(found), 3)
+        assert found[0] is boxes[43]
+        assert found[1] is boxes[44]
+        assert_equal(tree.nearest((0, 0), 0), [])
+        assert_equal(len(tree.nearest((0, 0), 1000)), 100)
+
+    def test_nearest_ordered(self):
+        boxes = self.random_boxes(300, seed=3)
+        tree = self.RTree(boxes, node_capacity=5)
+        rand = random.Random(11)
+        for i in range(20):
+            pt = (rand.uniform(-120, 120), rand.uniform(-120, 120))
+            found = tree.nearest(pt, k=10)
+            assert_equal(len(found), 10)
+            distances = sorted(self.box_distance(b, pt) for b in boxes)
+            assert_equal([self.box_distance(b, pt) for b in found],
+                distances[:10])
+
+    def test_nearest_ties_in_index_order(self):
+        boxes = self.grid_boxes()
+        tree = self.RTree(boxes, node_capacity=3)
+        found = tree.nearest((4.75, 4.75), k=4)
+        for shape, expected in zip(found, 
+            [boxes[44], boxes[45], boxes[54], boxes[55]]):
+            assert shape is expected
+
+    @raises(ValueError)
+    def test_bad_node_capacity(self):
+        self.RTree(self.grid_boxes(), node_capacity=1)
+
+    @raises(AttributeError)
+    def test_unbounded_shape(self):
+        self.RTree([self.Vec2(0, 0)])
+
+    def test_repr(self):
+        assert_equal(repr(self.RTree(self.grid_boxes(3, 2))), 
+            'RTree(<6 shapes>)')
+
+
+class KDTreeBaseTestCase(object):
+
+    def random_points(self, count, seed=42):
+        rand = random.Random(seed)
+        return [(rand.uniform(-100, 100), rand.uniform(-100, 100))
+            for i in range(count)]
+
+    def brute_nearest(self, points, pt, k):
+        return sorted(range(len(points)), 
+            key=lambda i: ((points[i][0] - pt[0])**2 
+                + (points[i][1] - pt[1])**2, i))[:k]
+
+    def test_empty(self):
+        tree = self.KDTree([])
+        assert_equal(len(tree), 0)
+        assert_equal(list(tree), [])
+        assert_equal(tree.nearest((0, 0)), [])
+        assert_equal(tree.nearest_each([(0, 0), (1, 1)]), [None, None])
+        assert_equal(tree.within_distance((0, 0), 100), [])
+
+    def test_single_point(self):
+        tree = self.KDTree([(2, 3)])
+        assert_equal(len(tree), 1)
+        assert_equal(tree.nearest((100, -50)), [0])
+        assert_equal(tree.nearest((100, -50), k=5), [0])
+        assert_equal(tree.within_distance((2, 4), 1), [0])
+        assert_equal(tree.within_distance((2, 4), 0.99), [])
+
+    def test_points(self):
+        points = self.random_points(50)
+        tree = self.KDTree(points)
+        assert_equal(len(tree), 50)
+        assert_equal(type(tree.points).__name__, 'Vec2Array')
+        assert_equal(list(tree.points), [self.Vec2(*p) for p in points])
+        assert_equal(list(tree), [self.Vec2(*p) for p in points])
+
+    def test_from_vec2array(self):
+        points = self.Vec2Array([(0, 0), (1, 0), (0, 1), (1, 1)])
+        tree = self.KDTree(points)
+        assert_equal(tree.nearest((0.9, 0.8)), [3])
+        points[3] = (5, 5)
+        assert_equal(tree.nearest((0.9, 0.8)), [3])
+
+    def test_nearest(self):
+        points = [(x, y) for y in range(10) for x in range(10)]
+        tree = self.KDTree(points)
+        assert_equal(tree.nearest((3.2, 4.1)), [43])
+        assert_equal(tree.nearest(self.Vec2(-5, -5)), [0])
+        assert_equal(tree.nearest((100, 8.25), k=1), [89])
+        assert_equal(tree.nearest((3.1, 4.2), 3), [43, 53, 44])
+        assert_equal(tree.nearest((0, 0), 0), [])
+        assert_equal(sorted(tree.nearest((0, 0), 1000)), list(range(100)))
+
+    def test_nearest_ties_in_index_order(self):
+        points = [(x, y) for y in range(10) for x in range(10)]
+        tree = self.KDTree(points)
+        assert_equal(tree.nearest((4.5, 4.5), k=4), [44, 45, 54, 55])
+        assert_equal(tree.nearest((4.5, 4), k=2), [44, 45])
+
+    def test_nearest_duplicates(self):
+        tree = self.KDTree([(1, 1)] * 10 + [(0, 0)] * 5)
+        assert_equal(tree.nearest((0.9, 0.9), k=3), [0, 1, 2])
+        assert_equal(tree.nearest((0, 0), k=6), [10, 11, 12, 13, 14, 0])
+        assert_equal(tree.within_distance((0, 0), 0), [10, 11, 12, 13, 14])
+
+    def test_nearest_matches_brute_force(self):
+        points = self.random_points(500)
+        tree = self.KDTree(points)
+        rand = random.Random(7)
+        for i in range(50):
+            pt = (rand.uniform(-120, 120), rand.uniform(-120, 120))
+            k = rand.randint(1, 20)
+            assert_equal(tree.nearest(pt, k), 
+                self.brute_nearest(points, pt, k))
+
+    def test_nearest_each(self):
+        points = self.random_points(300, seed=3)
+        tree = self.KDTree(points)
+        queries = self.random_points(100, seed=5)
+        expected = [self.brute_nearest(points, pt, 1)[0] for pt in queries]
+        assert_equal(tree.nearest_each(queries), expected)
+        assert_equal(tree.nearest_each(self.Vec2Array(queries)), expected)
+        assert_equal(tree.nearest_each(iter(queries)), expected)
+        assert_equal(tree.nearest_each([]), [])
+
+    def test_within_distance(self):
+        points = self.random_points(500, seed=11)
+        tree = self.KDTree(points)
+        rand = random.Random(13)
+        for i in range(50):
+            pt = (rand.uniform(-120, 120), rand.uniform(-120, 120))
+            radius = rand.uniform(0, 30)
+            assert_equal(tree.within_distance(pt, radius), 
+                [j for j, p in enumerate(points) 
+                    if (p[0] - pt[0])**2 + (p[1] - pt[1])**2 <= radius**2])
+        assert_equal(tree.within_distance((0, 0), -1), [])
+
+    def test_within_distance_boundary(self):
+        tree = self.KDTree([(0, 0), (3, 4), (-3, -4), (0, 5.5)])
+        assert_equal(tree.within_distance((0, 0), 5), [0, 1, 2])
+
+    @raises(TypeError)
+    def test_nearest_bad_point(self):
+        self.KDTree([(0, 0)]).nearest(None)
+
+    @raises(TypeError)
+    def test_bad_points(self):
+        self.KDTree([(0, 0), None])
+
+    def test_repr(self):
+        assert_equal(repr(self.KDTree([(0, 0), (1, 1), (2, 0)])), 
+            'KDTree(<3 points>)')
+
+
+class PyRTreeTestCase(RTreeBaseTestCase, unittest.TestCase):
+    from planar.vector import Vec2
+    from planar.box import BoundingBox
+    from planar.polygon import Polygon
+    from planar.index import RTree
+
+
+class CRTreeTestCase(RTreeBaseTestCase, unittest.TestCase):
+    from planar.c import Vec2, BoundingBox, Polygon, RTree
+
+
+class PyKDTreeTestCase(KDTreeBaseTestCase, unittest.TestCase):
+    from planar.vector import Vec2, Vec2Array
+    from planar.index import KDTree
+
+
+class CKDTreeTestCase(KDTreeBaseTestCase, unittest.TestCase):
+    from planar.c import Vec2, Vec2Array, KDTree
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+# vim: ai ts=4 sts=4 et sw=4 tw=78
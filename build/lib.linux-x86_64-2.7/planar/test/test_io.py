@@ -0,0 +1,354 @@
+"""WKB import and export unit tests"""
+
+from __future__ import division
+import os
+import sys
+import struct
+import subprocess
+import unittest
+from nose.tools import assert_equal, raises
+
+
+def wkb_point(x, y, byte_order='<'):
+    return struct.pack(byte_order + 'BIdd', 
+        byte_order == '<', 1, x, y)
+
+def wkb_linestring(points, type_code=2, dims=2, byte_order='<'):
+    data = struct.pack(byte_order + 'BII', 
+        byte_order == '<', type_code, len(points))
+    for point in points:
+        point = tuple(point) + (0.5,) * (dims - 2)
+        data += struct.pack(byte_order + '%dd' % dims, *point)
+    return data
+
+def wkb_polygon(rings, byte_order='<'):
+    data = struct.pack(byte_order + 'BII', 
+        byte_order == '<', 3, len(rings))
+    for ring in rings:
+        data += struct.pack(byte_order + 'I', len(ring))
+        for point in ring:
+            data += struct.pack(byte_order + 'dd', *point)
+    return data
+
+def wkb_multi(type_code, parts):
+    return struct.pack('<BII', 1, type_code, len(parts)) + b''.join(parts)
+
+
+class WKBBaseTestCase(object):
+
+    def test_point(self):
+        point = self.from_wkb(wkb_point(1.5, -2))
+        assert isinstance(point, self.Vec2)
+        assert_equal(point, self.Vec2(1.5, -2))
+        assert_equal(self.to_wkb(self.Vec2(1.5, -2)), wkb_point(1.5, -2))
+
+    def test_point_big_endian(self):
+        assert_equal(self.from_wkb(wkb_point(3, 4, '>')), self.Vec2(3, 4))
+
+    def test_linestring(self):
+        points = [(0, 0), (1, 2.5), (-3, 4)]
+        line = self.from_wkb(wkb_linestring(points))
+        assert isinstance(line, self.Vec2Array)
+        assert_equal(tuple(line), tuple(self.Vec2(*p) for p in points))
+        assert_equal(self.to_wkb(line), wkb_linestring(points))
+        assert_equal(tuple(self.from_wkb(
+            wkb_linestring(points, byte_order='>'))), tuple(line))
+
+    def test_linestring_empty(self):
+        line = self.from_wkb(wkb_linestring([]))
+        assert isinstance(line, self.Vec2Array)
+        assert_equal(len(line), 0)
+        assert_equal(self.to_wkb(self.Vec2Array()), wkb_linestring([]))
+
+    def test_line_segment(self):
+        seg = self.LineSegment((1, 2), (3, -1))
+        assert_equal(self.to_wkb(seg), wkb_linestring([(1, 2), (4, 1)]))
+
+    def test_vec2array32(self):
+        a = self.Vec2Array32([(0.5, 1), (2, 3)])
+        assert_equal(self.to_wkb(a), wkb_linestring([(0.5, 1), (2, 3)]))
+
+    def test_polygon(self):
+        ring = [(0, 0), (4, 0), (4, 3), (0, 3), (0, 0)]
+        poly = self.from_wkb(wkb_polygon([ring]))
+        assert isinstance(poly, self.Polygon)
+        assert_equal(tuple(poly), tuple(self.Vec2(*p) for p in ring[:-1]))
+        assert_equal(poly.area, 12)
+        assert_equal(self.to_wkb(poly), wkb_polygon([ring]))
+        assert_equal(tuple(self.from_wkb(
+            wkb_polygon([ring], byte_order='>'))), tuple(poly))
+
+    def test_polygon_unclosed_ring(self):
+        poly = self.from_wkb(wkb_polygon([[(0, 0), (1, 0), (0, 1)]]))
+        assert_equal(len(poly), 3)
+        assert poly.is_convex
+
+    def test_polygon_with_holes(self):
+        shell = [(0, 0), (4, 0), (4, 4), (0, 4), (0, 0)]
+        hole = [(1, 1), (1, 3), (3, 3), (3, 1), (1, 1)]
+        rings = self.from_wkb(wkb_polygon([shell, hole]))
+        assert isinstance(rings, self.PolygonWithHoles)
+        assert_equal(len(rings), 2)
+        assert isinstance(rings[0], self.Polygon)
+        assert isinstance(rings[1], self.Polygon)
+        assert_equal(rings[0].signed_area, 16)
+        assert_equal(rings[1].signed_area, -4)
+        assert rings.exterior is rings[0]
+        assert_equal(rings.holes, (rings[1],))
+
+    def test_polygon_with_holes_round_trip(self):
+        shell = [(0, 0), (4, 0), (4, 4), (0, 4), (0, 0)]
+        holes = [[(1, 1), (1, 2), (2, 2), (1, 1)], 
+            [(3, 3), (3, 3.5), (3.5, 3.5), (3.5, 3), (3, 3)]]
+        data = wkb_polygon([shell] + holes)
+        assert_equal(self.to_wkb(self.from_wkb(data)), data)
+        multi = wkb_multi(6, [data, wkb_polygon([shell])])
+        assert_equal(self.to_wkb(self.from_wkb(multi)), multi)
+        poly = self.PolygonWithHoles(shell[:-1], [holes[0][:-1]])
+        assert isinstance(poly.exterior, self.Polygon)
+        assert_equal(self.to_wkb(poly), wkb_polygon([shell, holes[0]]))
+
+    def test_tuple_of_polygons_is_multipolygon(self):
+        squares = tuple(self.Polygon.regular(4, 1, center=(x, 0)) 
+            for x in range(2))
+        assert_equal(self.to_wkb(squares), self.to_wkb(list(squares)))
+
+    @raises(ValueError)
+    def test_polygon_empty(self):
+        self.from_wkb(wkb_polygon([]))
+
+    @raises(ValueError)
+    def test_multipolygon_with_empty_polygon(self):
+        self.from_wkb(wkb_multi(6, [wkb_polygon([])]))
+
+    def test_empty_collection_round_trip(self):
+        data = self.to_wkb([])
+        assert_equal(data, wkb_multi(7, []))
+        assert_equal(self.from_wkb(data), [])
+
+    @raises(ValueError)
+    def test_polygon_too_few_vertices(self):
+        self.from_wkb(wkb_polygon([[(0, 0), (1, 0), (0, 0)]]))
+
+    def test_multipoint(self):
+        data = wkb_multi(4, [wkb_point(1, 2), wkb_point(3, 4, '>')])
+        assert_equal(self.from_wkb(data), [self.Vec2(1, 2), self.Vec2(3, 4)])
+        assert_equal(self.to_wkb([self.Vec2(1, 2), self.Vec2(3, 4)]), 
+            wkb_multi(4, [wkb_point(1, 2), wkb_point(3, 4)]))
+
+    def test_multilinestring(self):
+        lines = [[(0, 0), (1, 1)], [(2, 2), (3, 3), (4, 5)]]
+        data = wkb_multi(5, [wkb_linestring(line) for line in lines])
+        result = self.from_wkb(data)
+        assert_equal([tuple(line) for line in result], 
+            [tuple(self.Vec2(*p) for p in line) for line in lines])
+        assert_equal(self.to_wkb(result), data)
+        assert_equal(self.to_wkb(
+            (self.Vec2Array(lines[0]), self.LineSegment((2, 2), (1, 1)))), 
+            wkb_multi(5, [wkb_linestring(lines[0]), 
+                wkb_linestring([(2, 2), (3, 3)])]))
+
+    def test_multipolygon(self):
+        squares = [self.Polygon.regular(4, 1, center=(x, 0)) 
+            for x in range(3)]
+        data = self.to_wkb(squares)
+        assert_equal(data, wkb_multi(6, 
+            [wkb_polygon([list(poly) + [poly[0]]]) for poly in squares]))
+        result = self.from_wkb(data)
+        assert_equal(len(result), 3)
+        for poly, square in zip(result, squares):
+            assert isinstance(poly, self.Polygon)
+            assert_equal(tuple(poly), tuple(square))
+
+    def test_geometry_collection(self):
+        poly = self.Polygon([(0, 0), (1, 0), (0, 1)])
+        geoms = [self.Vec2(1, 2), poly, [self.Vec2(3, 4)], []]
+        data = self.to_wkb(geoms)
+        assert_equal(data, wkb_multi(7, [wkb_point(1, 2), 
+            wkb_polygon([[(0, 0), (1, 0), (0, 1), (0, 0)]]),
+            wkb_multi(4, [wkb_point(3, 4)]), wkb_multi(7, [])]))
+        result = self.from_wkb(data)
+        assert_equal(len(result), 4)
+        assert_equal(result[0], self.Vec2(1, 2))
+        assert_equal(tuple(result[1]), tuple(poly))
+        assert_equal(result[2], [self.Vec2(3, 4)])
+        assert_equal(result[3], [])
+
+    def test_z_and_m_coordinates_discarded(self):
+        for type_code, dims in [(1002, 3), (2002, 3), (3002, 4), 
+            (0x80000002, 3), (0x40000002, 3), (0xc0000002, 4)]:
+            line = self.from_wkb(wkb_linestring(
+                [(1, 2), (3, 4)], type_code, dims))
+            assert_equal(tuple(line), (self.Vec2(1, 2), self.Vec2(3, 4)))
+        point = self.from_wkb(struct.pack('<BIddd', 1, 1001, 5, 6, 7))
+        assert_equal(point, self.Vec2(5, 6))
+
+    def test_ewkb_srid(self):
+        data = struct.pack('<BIIdd', 1, 0x20000001, 4326, 5, 6)
+        assert_equal(self.from_wkb(data), self.Vec2(5, 6))
+        data = struct.pack('>BIIddd', 0, 0xa0000001, 4326, 5, 6, 7)
+        assert_equal(self.from_wkb(data), self.Vec2(5, 6))
+
+    def test_from_bytearray_and_memoryview(self):
+        data = wkb_linestring([(1, 2), (3, 4)])
+        for buf in (bytearray(data), memoryview(data)):
+            assert_equal(tuple(self.from_wkb(buf)), 
+                (self.Vec2(1, 2), self.Vec2(3, 4)))
+
+    def test_iter_wkb(self):
+        data = (wkb_point(1, 2) + wkb_linestring([(3, 4), (5, 6)])
+            + wkb_polygon([[(0, 0), (1, 0), (0, 1)]]) + wkb_point(7, 8, '>'))
+        geoms = list(self.iter_wkb(data))
+        assert_equal(len(geoms), 4)
+        assert_equal(geoms[0], self.Vec2(1, 2))
+        assert isinstance(geoms[1], self.Vec2Array)
+        assert_equal(tuple(geoms[1]), (self.Vec2(3, 4), self.Vec2(5, 6)))
+        assert isinstance(geoms[2], self.Polygon)
+        assert_equal(geoms[3], self.Vec2(7, 8))
+        assert_equal(list(self.iter_wkb(bytearray(data))), geoms[:1] 
+            + [geoms[1], geoms[2], geoms[3]])
+
+    def test_iter_wkb_empty(self):
+        assert_equal(list(self.iter_wkb(b'')), [])
+
+    def test_iter_wkb_truncated(self):
+        data = wkb_point(1, 2) + wkb_point(3, 4)[:-1]
+        geoms = self.iter_wkb(data)
+        assert_equal(next(geoms), self.Vec2(1, 2))
+        try:
+            next(geoms)
+        except ValueError:
+            pass
+        else:
+            assert False, "Expected ValueError"
+
+    def test_round_trip_many(self):
+        polys = [self.Polygon.regular(n, n, angle=n) for n in range(3, 50)]
+        data = b''.join(self.to_wkb(poly) for poly in polys)
+        for poly, result in zip(polys, self.iter_wkb(data)):
+            assert_equal(tuple(result), tuple(poly))
+
+    @raises(ValueError)
+    def test_truncated(self):
+        self.from_wkb(wkb_linestring([(1, 2), (3, 4)])[:-4])
+
+    @raises(ValueError)
+    def test_truncated_header(self):
+        self.from_wkb(b'\x01\x01\x00')
+
+    @raises(ValueError)
+    def test_empty_data(self):
+        self.from_wkb(b'')
+
+    @raises(ValueError)
+    def test_bad_count(self):
+        self.from_wkb(struct.pack('<BII', 1, 2, 0xffffffff) + b'\0' * 32)
+
+    @raises(ValueError)
+    def test_bad_ring_count(self):
+        self.from_wkb(struct.pack('<BIII', 1, 3, 1, 0xffffffff) + b'\0' * 32)
+
+    @raises(ValueError)
+    def test_truncated_ring_header(self):
+        self.from_wkb(struct.pack('<BII', 1, 3, 2) + b'\0' * 4)
+
+    @raises(ValueError)
+    def test_truncated_ring_count(self):
+        self.from_wkb(struct.pack('<BII', 1, 3, 0x7fffffff))
+
+    @raises(ValueError)
+    def test_truncated_part_count(self):
+        self.from_wkb(struct.pack('<BII', 1, 4, 0x7fffffff))
+
+    @raises(ValueError)
+    def test_truncated_collection_count(self):
+        self.from_wkb(struct.pack('<BII', 1, 7, 0x7fffffff) + b'\0' * 16)
+
+    @raises(ValueError)
+    def test_bad_byte_order(self):
+        self.from_wkb(b'\x02' + wkb_point(1, 2)[1:])
+
+    @raises(ValueError)
+    def test_unsupported_type(self):
+        self.from_wkb(struct.pack('<BII', 1, 17, 0))
+
+    @raises(ValueError)
+    def test_trailing_data(self):
+        self.from_wkb(wkb_point(1, 2) + b'\x01')
+
+    @raises(TypeError)
+    def test_from_wkb_not_buffer(self):
+        self.from_wkb(None)
+
+    @raises(TypeError)
+    def test_to_wkb_unsupported_type(self):
+        self.to_wkb(self.BoundingBox([(0, 0), (1, 1)]))
+
+    @raises(TypeError)
+    def test_to_wkb_tuple_of_numbers(self):
+        self.to_wkb((1, 2))
+
+    @raises(TypeError)
+    def test_to_wkb_holed_polygon_bad_ring(self):
+        poly = self.PolygonWithHoles([(0, 0), (4, 0), (0, 4)])
+        self.to_wkb(tuple.__new__(type(poly), (poly[0], self.Vec2(1, 1))))
+
+
+class PyWKBTestCase(WKBBaseTestCase, unittest.TestCase):
+    # Geometries are decoded using the default implementation
+    from planar import Vec2, Vec2Array, Polygon
+    from planar.vector import Vec2Array32
+    from planar.line import LineSegment
+    from planar.box import BoundingBox
+    from planar.wkb import from_wkb, to_wkb, iter_wkb, PolygonWithHoles
+    from_wkb = staticmethod(from_wkb)
+    to_wkb = staticmethod(to_wkb)
+    iter_wkb = staticmethod(iter_wkb)
+
+
+class CWKBTestCase(WKBBaseTestCase, unittest.TestCase):
+    from planar.c import Vec2, Vec2Array, Vec2Array32, LineSegment, \
+        BoundingBox, Polygon, from_wkb, to_wkb, iter_wkb
+    from planar.wkb import PolygonWithHoles
+    from_wkb = staticmethod(from_wkb)
+    to_wkb = staticmethod(to_wkb)
+    iter_wkb = staticmethod(iter_wkb)
+
+
+class IOModuleTestCase(unittest.TestCase):
+
+    def test_imports(self):
+        import planar.io
+        from planar.io import from_wkb, to_wkb, iter_wkb
+        assert_equal(set(planar.io.__all__), 
+            set(['from_wkb', 'to_wkb', 'iter_wkb', 'PolygonWithHoles']))
+
+    def test_python_fallback(self):
+        # Run the Python codec in a new interpreter, since the
+        # implementation is chosen when planar is first imported
+        import planar
+        script = (
+            "import sys\n"
+            "for name in sys.argv[1:]:\n"
+            "    sys.modules[name] = None\n"
+            "import planar, planar.io\n"
+            "assert planar.__implementation__ != 'C'\n"
+            "poly = planar.Polygon.star(7, 1, 2)\n"
+            "line = planar.Vec2Array([(0, 0), (1, 2)])\n"
+            "for geom in (poly, line, [poly, poly]):\n"
+            "    data = planar.io.to_wkb(geom)\n"
+            "    assert planar.io.to_wkb(planar.io.from_wkb(data)) == data\n"
+            "assert tuple(planar.io.from_wkb(planar.io.to_wkb(poly))) "
+                "== tuple(poly)\n")
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(
+            os.path.dirname(os.path.abspath(planar.__file__))))
+        for blocked in (['planar.c'], ['planar.c', 'numpy']):
+            subprocess.check_call(
+                [sys.executable, '-c', script] + blocked, env=env)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+# vim: ai ts=4 sts=4 et sw=4 tw=78
@@ -0,0 +1,75 @@
+from nose.tools import assert_equal, assert_almost_equal, raises
+
+def test_version_info():
+    import planar
+    assert_equal('%s.%s.%s' % planar.__versioninfo__, planar.__version__)
+
+def test_default_implementation():
+    import planar
+    import planar.c
+    assert_equal(planar.__implementation__, 'C')
+    assert planar.Vec2 is planar.c.Vec2, planar.Vec2
+
+def test_default_epsilon():
+    import planar
+    assert_equal(planar.EPSILON, 1e-5)
+    assert_equal(planar.EPSILON2, 1e-5**2)
+
+def test_set_epsilon():
+    import planar
+    old_e = planar.EPSILON
+    assert not planar.Vec2(0,0).almost_equals((0.01, 0))
+    try:
+        planar.set_epsilon(0.02)
+        assert_equal(planar.EPSILON, 0.02)
+        assert_equal(planar.EPSILON2, 0.0004)
+        assert planar.Vec2(0,0).almost_equals((0.01, 0))
+    finally:
+        planar.set_epsilon(old_e)
+    assert_equal(planar.EPSILON, old_e)
+    assert_equal(planar.EPSILON2, old_e**2)
+    assert not planar.Vec2(0,0).almost_equals((0.01, 0))
+
+def test_py_imports():
+	import planar
+	import planar.py
+	from planar.py import (Vec2, Point, Vec2Array, Vec2Array32, Seq2, 
+		Line, Ray, LineSegment, Affine, BoundingBox, Polygon, RTree,
+		KDTree, find_intersections)
+	assert set(planar.py.__all__).issubset(set(planar.__all__)), (
+		planar.py.__all__, planar.__all__)
+
+def test_np_imports():
+	try:
+		import numpy
+	except ImportError: # pragma: no cover
+		return
+	import planar
+	import planar.np
+	from planar.np import (Vec2, Point, Vec2Array, Vec2Array32, Seq2, 
+		Line, Ray, LineSegment, Affine, BoundingBox, Polygon, RTree,
+		KDTree, find_intersections)
+	assert set(planar.np.__all__).issubset(set(planar.__all__)), (
+		planar.np.__all__, planar.__all__)
+	assert issubclass(Polygon, Seq2)
+
+def test_c_imports():
+	import planar.c
+	from planar.c import (Vec2, Vec2Array, Vec2Array32, Seq2, 
+		Line, Ray, LineSegment, Affine, BoundingBox, Polygon, RTree,
+		KDTree, find_intersections)
+
+def test_c_free_threaded():
+	import os, sys, sysconfig
+	if (not sysconfig.get_config_var('Py_GIL_DISABLED') 
+		or os.environ.get('PYTHON_GIL') == '1'):
+		return
+	import planar.c
+	# Importing the extension must not re-enable the GIL
+	assert not sys._is_gil_enabled()
+
+def test_direct_imports():
+	from planar import (Vec2, Point, Vec2Array, Vec2Array32, Seq2, 
+		Line, Ray, LineSegment, Affine, BoundingBox, Polygon, RTree,
+		KDTree, find_intersections)
+
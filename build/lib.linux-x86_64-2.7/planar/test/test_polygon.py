@@ -0,0 +1,1906 @@
+"""Polygon class unit tests"""
+
+from __future__ import division
+import sys
+import math
+import array
+import unittest
+from nose.tools import assert_equal, assert_almost_equal, raises
+
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
+
+def assert_contains_point(polys, i, p):
+    containing = [j for j, t in enumerate(polys) 
+        if t.contains_point(p)]
+    if i is not None:
+        assert_equal([i], containing)
+    else:
+        assert_equal([], containing)
+
+
+def assert_valid_triangulation(poly, triangles):
+    assert isinstance(triangles, array.array)
+    assert_equal(len(triangles) % 3, 0)
+    total_area = 0.0
+    for i in range(0, len(triangles), 3):
+        a, b, c = [poly[j] for j in triangles[i:i + 3]]
+        area = ((b[0] - a[0]) * (c[1] - a[1]) 
+            - (c[0] - a[0]) * (b[1] - a[1])) * 0.5
+        # Triangles are wound the same as the polygon
+        assert area * poly.signed_area >= 0.0, (a, b, c)
+        total_area += area
+    assert_almost_equal(total_area, poly.signed_area)
+
+
+class PolygonBaseTestCase(object):
+
+    @raises(TypeError)
+    def test_too_few_args(self):
+        self.Polygon()
+
+    @raises(ValueError)
+    def test_no_verts(self):
+        self.Polygon([])
+
+    @raises(ValueError)
+    def test_too_few_verts(self):
+        self.Polygon([(0,0), (1,1)])
+
+    def test_init_triangle(self):
+        poly = self.Polygon([(-1,0), (1,1), (0,0)])
+        assert_equal(len(poly), 3)
+        assert_equal(tuple(poly), 
+            (self.Vec2(-1,0), self.Vec2(1,1), self.Vec2(0,0)))
+
+    def test_is_Seq2_subclass(self):
+        import planar
+        assert issubclass(self.Polygon, planar.Seq2)
+        poly = self.Polygon([(-1,0), (-1,1), (0,0), (0, -1)])
+        assert isinstance(poly, planar.Seq2)
+
+    def test_triangle_is_known_convex(self):
+        poly = self.Polygon([(-1,0), (1,1), (0,0)])
+        assert poly.is_convex_known
+        assert poly.is_convex
+
+    def test_triangle_is_known_simple(self):
+        poly = self.Polygon([(-1,0), (1,1), (0,0)])
+        assert poly.is_simple_known
+        assert poly.is_simple
+
+    def test_convex_not_known(self):
+        poly = self.Polygon([(-1,0), (-1,1), (0,0), (0, -1)])
+        assert_equal(len(poly), 4)
+        assert not poly.is_convex_known
+
+    def test_specify_convex(self):
+        poly = self.Polygon([(-1,0), (-1,1), (0,0), (0, -1)], 
+            is_convex=True)
+        assert_equal(len(poly), 4)
+        assert poly.is_convex_known
+        assert poly.is_convex
+        assert poly.is_simple_known
+        assert poly.is_simple
+
+    def test_triangle_is_always_convex(self):
+        poly = self.Polygon([(-1,0), (1,1), (0,0)], is_convex=False)
+        assert poly.is_convex_known
+        assert poly.is_convex
+        assert poly.is_simple_known
+        assert poly.is_simple
+
+    def test_specify_simple(self):
+        poly = self.Polygon([(-1,0), (-0.5, 0.5), (-1,1), (0,0), (0, -1)], 
+            is_simple=True)
+        assert poly.is_simple_known
+        assert poly.is_simple
+        assert not poly.is_convex_known
+
+    def test_is_convex(self):
+        poly = self.Polygon([(-1,0), (-1,1), (0,0), (0, -1)])
+        assert not poly.is_convex_known
+        assert poly.is_convex
+        assert poly.is_convex_known
+        assert poly.is_convex # test cached value
+
+    def test_not_is_convex(self):
+        poly = self.Polygon([(0,0), (-1,1), (0,0.5), (-1, -1)])
+        assert not poly.is_convex_known
+        assert not poly.is_convex
+        assert poly.is_convex_known
+        assert not poly.is_convex # test cached value
+
+    def test_convex_degenerate_cases(self):
+        # Pentagram
+        poly = self.Polygon([(-1,-1), (0,1), (1,-1), (-1,0), (1,0)])
+        assert not poly.is_convex
+        # Rect with backtracking vert along edge
+        poly = self.Polygon([(0,0), (2,0), (1,0), (4,0), (4,-1), (0,-1)])
+        assert not poly.is_convex
+        # Rect with coincident edges
+        poly = self.Polygon([(0,0), (0,1), (1,1), (1,0), 
+            (0,0), (0,1), (1,1), (1,0)])
+        assert not poly.is_convex
+        # Triangle with coincident intruding edges
+        poly = self.Polygon([(-2,0), (0,2), (-0.5,1), (0,2), (2,0)])
+        assert not poly.is_convex
+        # Vertical edge retraced by the next one
+        poly = self.Polygon([(2,4), (2,1), (2,4), (1,3), (4,1), (4,2)])
+        assert not poly.is_convex
+        # Reflex first vertex after a zero-length closing edge
+        poly = self.Polygon([(1,1), (3,0), (1,2), (0,1), (0,0), (1,1)])
+        assert not poly.is_convex
+
+    def test_convex_is_simple(self):
+        poly = self.Polygon([(-1,-1), (1,-1), (0.5,0), (0, 0)])
+        assert not poly.is_simple_known
+        assert poly.is_convex
+        assert poly.is_simple_known
+        assert poly.is_simple
+        assert poly.is_simple # test cached value
+
+    def test_non_convex_simple_unknown(self):
+        poly = self.Polygon([(-1,-1), (1,-1), (1,0), (0, -0.9)])
+        assert not poly.is_simple_known
+        assert not poly.is_convex
+        assert not poly.is_simple_known
+
+    def test_is_simple(self):
+        poly = self.Polygon([(0,0), (-1,-1), (-2, 0), (-1, 1)])
+        assert not poly.is_simple_known
+        assert poly.is_simple
+        assert poly.is_simple_known
+        assert poly.is_simple # test cached value
+
+    def test_not_is_simple(self):
+        poly = self.Polygon([(0,0), (-1,1), (1,1), (-1,0)])
+        assert not poly.is_simple_known
+        assert not poly.is_simple
+        assert poly.is_simple_known
+        assert not poly.is_simple # test cached value
+    
+    def test_not_is_simple_touching(self):
+        # Vertex touching a non-adjacent edge
+        poly = self.Polygon([(0,0), (2,0), (2,2), (1,0), (0,2)])
+        assert not poly.is_simple
+        # Polygon pinched at a vertex
+        poly = self.Polygon([(0,0), (1,1), (2,0), (2,2), (1,1), (0,2)])
+        assert not poly.is_simple
+
+    def test_not_is_simple_overlapping_edges(self):
+        # Non-adjacent collinear edges overlap
+        poly = self.Polygon([(0,0), (3,0), (3,1), (2,0), (1,0), (0,1)])
+        assert not poly.is_simple
+        # Adjacent edges double back along each other
+        poly = self.Polygon([(1,2), (2,0), (0,2), (2,2)])
+        assert not poly.is_simple
+        # An edge retraced exactly backwards by the next one
+        poly = self.Polygon([(2,4), (2,1), (2,4), (1,3), (4,1), (4,2)])
+        assert not poly.is_simple
+        # A duplicate vertex between the edges does not hide it
+        poly = self.Polygon(
+            [(2,4), (2,1), (2,1), (2,3), (1,3), (4,1), (4,2)])
+        assert not poly.is_simple
+        # Adjacent collinear edges are simple
+        poly = self.Polygon([(0,0), (1,0), (2,0), (1,1)])
+        assert poly.is_simple
+
+    def test_is_simple_spiral(self):
+        # Many edges span the sweep line at once
+        outer = []
+        inner = []
+        for i in range(2000):
+            angle = i * 0.01
+            outer.append(
+                (math.cos(angle) * (angle + 1.0), 
+                 math.sin(angle) * (angle + 1.0)))
+            inner.append(
+                (math.cos(angle) * (angle + 2.0), 
+                 math.sin(angle) * (angle + 2.0)))
+        poly = self.Polygon(outer + inner[::-1])
+        assert poly.is_simple
+        poly = self.Polygon(outer + inner[::-1] + [(-30, 1)])
+        assert not poly.is_simple
+
+    def test_is_simple_matches_brute_force(self):
+        import random
+        rand = random.Random(42)
+        def crosses(a, b, c, d):
+            def side(p, q, r):
+                return ((q[0] - p[0])*(r[1] - p[1]) 
+                    - (r[0] - p[0])*(q[1] - p[1])) > 0.0
+            return (side(a, b, c) != side(a, b, d) 
+                and side(c, d, a) != side(c, d, b))
+        def brute_force_is_simple(verts):
+            n = len(verts)
+            for i in range(n):
+                for j in range(i + 2, n):
+                    if (j - i < n - 1 and crosses(
+                        verts[i - 1], verts[i], verts[j - 1], verts[j])):
+                        return False
+            return True
+        for i in range(200):
+            verts = [(rand.random(), rand.random()) 
+                for j in range(rand.randint(4, 12))]
+            poly = self.Polygon(verts, is_convex=False)
+            assert_equal(poly.is_simple, brute_force_is_simple(verts), verts)
+
+    def test_mutation_invalidates_cached_properties(self):
+        poly = self.Polygon([(0.5,0.5), (0.5,-0.5), (-0.5,-0.5), (-0.5,0.5)])
+        assert poly.is_convex
+        assert poly.is_simple
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+        poly[0] = (0, 0.6)
+        assert not poly.is_convex_known
+        assert not poly.is_simple_known
+        assert poly.is_convex
+        assert poly.is_simple
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+        poly[-1] = (0, 0)
+        assert not poly.is_convex_known
+        assert not poly.is_simple_known
+        assert not poly.is_convex
+        assert poly.is_simple
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+        poly[-1] = (1, 0)
+        assert not poly.is_convex_known
+        assert not poly.is_simple_known
+        assert not poly.is_convex
+        assert not poly.is_simple
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+        poly[0] = (0.5, 0.5)
+        poly[1] = (0.5, -0.5)
+        poly[2] = (-0.5, -0.5)
+        poly[3] = (-0.5, 0.5)
+        assert not poly.is_convex_known
+        assert not poly.is_simple_known
+        assert poly.is_convex
+        assert poly.is_simple
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+
+    def test_regular(self):
+        import planar
+        poly = self.Polygon.regular(5, 1.5)
+        assert isinstance(poly, self.Polygon)
+        assert_equal(len(poly), 5)
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+        assert poly.is_centroid_known
+        assert poly.is_convex
+        assert poly.is_simple
+        assert isinstance(poly.centroid, planar.Vec2)
+        assert_equal(poly.centroid, (0, 0))
+        angle = 0
+        for i in range(5):
+            assert_equal(self.Vec2.polar(angle, 1.5), poly[i])
+            angle += 72
+
+    def test_regular_with_center_and_angle(self):
+        import planar
+        angle = -60
+        poly = self.Polygon.regular(vertex_count=3, radius=2, 
+            center=(-3, 1), angle=angle)
+        assert_equal(len(poly), 3)
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+        assert poly.is_centroid_known
+        assert poly.is_convex
+        assert poly.is_simple
+        assert isinstance(poly.centroid, planar.Vec2)
+        assert_equal(poly.centroid, (-3, 1))
+        for i in range(3):
+            assert_equal(self.Vec2.polar(angle, 2) + (-3, 1), poly[i])
+            angle += 120
+
+    @raises(ValueError)
+    def test_regular_too_few_sides(self):
+        self.Polygon.regular(2, 1)
+
+    def test_star(self):
+        import planar
+        poly = self.Polygon.star(5, 3, 5)
+        assert_equal(len(poly), 10)
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+        assert poly.is_centroid_known
+        assert not poly.is_convex
+        assert poly.is_simple
+        assert isinstance(poly.centroid, planar.Vec2)
+        assert_equal(poly.centroid, (0, 0))
+        angle = 0
+        for i in range(5):
+            assert_equal(self.Vec2.polar(angle, 3), poly[i * 2])
+            angle += 36
+            assert_equal(self.Vec2.polar(angle, 5), poly[i * 2 + 1])
+            angle += 36
+
+    def test_star_is_convex_with_same_radii(self):
+        import planar
+        poly = self.Polygon.star(9, 2, 2)
+        assert_equal(len(poly), 18)
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+        assert poly.is_centroid_known
+        assert poly.is_convex
+        assert poly.is_simple
+        assert isinstance(poly.centroid, planar.Vec2)
+        assert_equal(poly.centroid, (0, 0))
+
+    def test_star_with_center_and_angle(self):
+        import planar
+        poly = self.Polygon.star(peak_count=2, radius1=1.5, radius2=3, 
+            center=(-11, 3), angle=15)
+        assert isinstance(poly, self.Polygon)
+        assert_equal(len(poly), 4)
+        assert poly.is_convex_known
+        assert poly.is_simple_known
+        assert poly.is_centroid_known
+        assert not poly.is_convex
+        assert poly.is_simple
+        assert isinstance(poly.centroid, planar.Vec2)
+        assert_equal(poly.centroid, (-11, 3))
+        assert_equal(poly[0], self.Vec2.polar(15, 1.5) + (-11, 3))
+        assert_equal(poly[1], self.Vec2.polar(105, 3) + (-11, 3))
+        assert_equal(poly[2], self.Vec2.polar(195, 1.5) + (-11, 3))
+        assert_equal(poly[3], self.Vec2.polar(285, 3) + (-11, 3))
+
+    def test_star_with_one_negative_radius(self):
+        import planar
+        poly = self.Polygon.star(3, -1, 2)
+        assert_equal(len(poly), 6)
+        assert poly.is_convex_known
+        assert not poly.is_simple_known
+        assert not poly.is_centroid_known
+        assert not poly.is_convex
+        assert not poly.is_simple
+        assert_equal(poly.centroid, None)
+
+    @raises(ValueError)
+    def test_star_too_few_peaks(self):
+        self.Polygon.star(1, 1, 2)
+
+    def test_centroid_convex(self):
+        import planar
+        poly = self.Polygon([(1, -2), (0, 0), (1, 0), (3, 0), (4, -2)])
+        assert poly.is_convex
+        assert not poly.is_centroid_known
+        assert_equal(poly.centroid, (2, -1))
+        assert isinstance(poly.centroid, planar.Vec2)
+        assert poly.is_centroid_known
+        assert_equal(poly.centroid, (2, -1)) # check cached value
+
+    def test_centroid_concave(self):
+        import planar
+        poly = self.Polygon([(3,3), (1,-1), (-1,-1), (-3,3), (-1,-2), (1,-2)])
+        assert not poly.is_convex
+        assert poly.is_simple
+        assert not poly.is_centroid_known
+        assert_equal(poly.centroid, (0, -0.75))
+        assert isinstance(poly.centroid, planar.Vec2)
+        assert poly.is_centroid_known
+        assert_equal(poly.centroid, (0, -0.75)) # check cached value
+
+    def test_centroid_non_simple(self):
+        poly = self.Polygon([(-1,1), (0,0), (1,1), (0,1), (0,-2)])
+        assert not poly.is_centroid_known
+        assert not poly.is_simple_known
+        assert_equal(poly.centroid, None)
+        assert poly.is_centroid_known
+        assert_equal(poly.centroid, None)
+        assert not poly.is_simple
+
+    def test_area(self):
+        poly = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        assert_equal(poly.signed_area, 4)
+        assert_equal(poly.area, 4)
+        assert_equal(poly.signed_area, 4) # check cached value
+        poly = self.Polygon([(0,2), (2,2), (2,0), (0,0)])
+        assert_equal(poly.signed_area, -4)
+        assert_equal(poly.area, 4)
+
+    def test_area_concave(self):
+        poly = self.Polygon([(3,3), (1,-1), (-1,-1), (-3,3), (-1,-2), (1,-2)])
+        assert_equal(poly.signed_area, 4)
+        assert_equal(poly.area, 4)
+        poly = self.Polygon.star(5, 2, 1)
+        assert_almost_equal(poly.area, 
+            10 * 0.5 * 2 * 1 * math.sin(math.radians(36)))
+
+    def test_area_non_simple(self):
+        # Opposite loops cancel
+        poly = self.Polygon([(0,0), (2,2), (2,0), (0,2)])
+        assert_equal(poly.signed_area, 0)
+        assert_equal(poly.area, 0)
+
+    def test_area_from_centroid(self):
+        poly = self.Polygon([(3,3), (1,-1), (-1,-1), (-3,3), (-1,-2), (1,-2)])
+        poly.centroid
+        assert_equal(poly.signed_area, 4)
+
+    def test_perimeter(self):
+        poly = self.Polygon([(0,0), (3,0), (3,4)])
+        assert_equal(poly.perimeter, 12)
+        assert_equal(poly.perimeter, 12) # check cached value
+        poly = self.Polygon.regular(100, 1)
+        assert_almost_equal(poly.perimeter, 200 * math.sin(math.pi / 100))
+
+    def test_mutation_invalidates_area_and_perimeter(self):
+        poly = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        assert_equal(poly.area, 4)
+        assert_equal(poly.perimeter, 8)
+        poly[2] = (2, 4)
+        assert_equal(poly.area, 6)
+        assert_almost_equal(poly.perimeter, 8 + math.sqrt(8))
+        poly2 = poly * self.Affine.scale(2)
+        assert_equal(poly2.area, 24)
+        assert_equal(poly.area, 6)
+        poly *= self.Affine.scale(2)
+        assert_equal(poly.area, 24)
+
+    def test_copy_area_and_perimeter(self):
+        from copy import copy
+        poly = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        assert_equal(poly.area, 4)
+        assert_equal(poly.perimeter, 8)
+        poly2 = copy(poly)
+        assert_equal(poly2.area, 4)
+        assert_equal(poly2.perimeter, 8)
+
+    def test_batch_areas_and_perimeters(self):
+        polys = [
+            self.Polygon([(0,0), (2,0), (2,2), (0,2)]),
+            self.Polygon([(0,0), (0,4), (3,0)]),
+            self.Polygon.regular(6, 1),
+        ]
+        areas = self.Polygon.areas(polys)
+        assert isinstance(areas, array.array)
+        assert_equal(areas.typecode, 'd')
+        assert_equal(list(areas), [poly.area for poly in polys])
+        assert_equal(list(self.Polygon.signed_areas(polys)), 
+            [poly.signed_area for poly in polys])
+        assert_equal(list(self.Polygon.signed_areas(polys))[:2], [4, -6])
+        assert_equal(list(self.Polygon.perimeters(iter(polys))), 
+            [poly.perimeter for poly in polys])
+        assert_equal(list(self.Polygon.areas([])), [])
+
+    @raises(TypeError)
+    def test_batch_areas_wrong_type(self):
+        self.Polygon.areas([self.Polygon([(0,0), (0,4), (3,0)]), None])
+
+    def test_triangulate_triangle(self):
+        poly = self.Polygon([(0,0), (1,0), (0,1)])
+        assert_equal(list(poly.triangulate()), [0, 1, 2])
+
+    def test_triangulate_convex(self):
+        poly = self.Polygon.regular(6, 1)
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 12)
+        assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_concave(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 9)
+        assert_valid_triangulation(poly, triangles)
+        assert_equal(sorted(set(triangles)), [0, 1, 2, 3, 4])
+
+    def test_triangulate_clockwise(self):
+        poly = self.Polygon([(0,4), (2,1), (4,4), (4,0), (0,0)])
+        assert poly.signed_area < 0
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 9)
+        assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_star(self):
+        poly = self.Polygon.star(20, 1, 3)
+        assert_valid_triangulation(poly, poly.triangulate())
+        poly = self.Polygon.star(20, -1, -3)
+        assert_valid_triangulation(poly, poly.triangulate())
+
+    def test_triangulate_comb(self):
+        # Many split and merge vertices from teeth pointing both ways
+        verts = [(0, -1), (40, -1)]
+        for x in range(40, -1, -1):
+            verts.append((x, 5 if x % 2 == 0 else 1))
+        for teeth in (verts, [(y, x) for x, y in verts]):
+            poly = self.Polygon(teeth)
+            triangles = poly.triangulate()
+            assert_equal(len(triangles), (len(poly) - 2) * 3)
+            assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_collinear_verts(self):
+        poly = self.Polygon([(0,0), (1,0), (2,0), (2,2), (1,1), (0,2)])
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 12)
+        assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_duplicate_verts(self):
+        poly = self.Polygon([(0,0), (4,0), (4,0), (4,4), (2,1), (0,4), (0,0)],
+            is_simple=True)
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 9)
+        assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_random_star_shaped(self):
+        import random
+        rand = random.Random(42)
+        for i in range(100):
+            # One vertex per sector keeps the gaps under 180 degrees, 
+            # so the polygon is star-shaped around the origin
+            n = rand.randint(4, 50)
+            angles = [(j + rand.random()) * 360.0 / n for j in range(n)]
+            poly = self.Polygon([self.Vec2.polar(angle, rand.uniform(0.1, 1))
+                for angle in angles])
+            triangles = poly.triangulate()
+            assert_equal(len(triangles), (len(poly) - 2) * 3)
+            assert_valid_triangulation(poly, triangles)
+
+    @raises(ValueError)
+    def test_triangulate_non_simple(self):
+        self.Polygon([(0,0), (1,1), (1,0), (0,1)]).triangulate()
+
+    def test_triangulate_cached(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        triangles = poly.triangulate()
+        triangles[0] = 99
+        assert_equal(poly.triangulate()[0], poly.triangulate()[0])
+        assert 99 not in poly.triangulate()
+        poly[3] = (2, 8)
+        triangles = poly.triangulate()
+        assert_equal(list(triangles), [0, 1, 2, 0, 2, 3, 0, 3, 4])
+
+    def test_clip_convex(self):
+        square = self.Polygon([(0,0), (4,0), (4,4), (0,4)])
+        clipped = square.clip(self.Polygon([(2,2), (6,2), (2,6)]))
+        assert isinstance(clipped, self.Polygon)
+        assert_equal(len(clipped), 4)
+        assert_almost_equal(clipped.signed_area, 4)
+        assert_equal(sorted(tuple(p) for p in clipped), [(2,2), (2,4), (4,2), (4,4)])
+
+    def test_clip_concave(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        clipped = poly.clip(self.BoundingBox([(-1,2), (5,5)]))
+        # The two separate parts are joined along the clip boundary
+        assert_equal(len(clipped), 6)
+        assert_almost_equal(clipped.area, 8.0 / 3.0)
+        assert not clipped.is_simple
+
+    def test_clip_preserves_winding(self):
+        poly = self.Polygon([(0,4), (4,4), (4,0), (0,0)])
+        clipped = poly.clip(self.Polygon([(2,-1), (5,-1), (5,2), (2,2)]))
+        assert_almost_equal(clipped.signed_area, -4)
+        clipped = poly.clip(self.Polygon([(2,2), (5,2), (5,-1), (2,-1)]))
+        assert_almost_equal(clipped.signed_area, -4)
+
+    def test_clip_bounding_box(self):
+        poly = self.Polygon.regular(8, 2)
+        clipped = poly.clip(self.BoundingBox([(-1,-1), (1,1)]))
+        assert_equal(sorted(tuple(p) for p in clipped), [(-1,-1), (-1,1), (1,-1), (1,1)])
+        assert poly.clip(self.BoundingBox([(-5,-5), (5,5)])) == poly
+
+    def test_clip_outside(self):
+        poly = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        assert poly.clip(self.Polygon([(2,2), (3,2), (3,3)])) is None
+        assert poly.clip(self.BoundingBox([(1,0), (2,1)])) is None
+        assert poly.clip(self.BoundingBox([(0,0), (0,1)])) is None
+
+    @raises(ValueError)
+    def test_clip_non_convex(self):
+        poly = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        poly.clip(self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)]))
+
+    @raises(TypeError)
+    def test_clip_wrong_type(self):
+        self.Polygon([(0,0), (1,0), (1,1), (0,1)]).clip(None)
+
+    def test_intersection_convex(self):
+        square = self.Polygon([(0,0), (4,0), (4,4), (0,4)])
+        triangle = self.Polygon([(2,2), (6,2), (2,6)])
+        for a, b in ((square, triangle), (triangle, square)):
+            result = a.intersection(b)
+            assert result.is_convex_known
+            assert result.is_convex
+            assert_almost_equal(result.signed_area, 4)
+            assert_equal(sorted(tuple(p) for p in result), [(2,2), (2,4), (4,2), (4,4)])
+
+    def test_intersection_contained(self):
+        outer = self.Polygon.regular(6, 4)
+        inner = self.Polygon([(0,0), (1,0), (0,1)])
+        assert_equal(outer.intersection(inner), inner)
+        assert_equal(inner.intersection(outer), inner)
+        assert_equal(outer.intersection(outer), outer)
+
+    def test_intersection_shared_edge(self):
+        a = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        b = self.Polygon([(1,0), (3,0), (3,2), (1,2)])
+        assert_equal(sorted(tuple(p) for p in a.intersection(b)), 
+            [(1,0), (1,2), (2,0), (2,2)])
+        assert a.intersection(self.Polygon([(2,0), (3,0), (3,2), (2,2)])) is None
+
+    def test_intersection_disjoint(self):
+        a = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        assert a.intersection(self.Polygon([(2,2), (3,2), (3,3)])) is None
+        assert a.intersection(self.Polygon([(2,0), (3,0), (3,1)])) is None
+
+    def test_intersection_clockwise(self):
+        a = self.Polygon([(0,4), (4,4), (4,0), (0,0)])
+        result = a.intersection(self.Polygon([(2,2), (2,6), (6,2)]))
+        assert_almost_equal(result.signed_area, -4)
+
+    def test_intersection_concave(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        box = self.BoundingBox([(-1,2), (5,5)])
+        assert_equal(poly.intersection(box), poly.clip(box))
+
+    def test_intersection_matches_clip(self):
+        import random
+        rand = random.Random(42)
+        for i in range(100):
+            a = self.Polygon.convex_hull([self.Vec2(rand.random(), rand.random())
+                for j in range(rand.randint(3, 12))])
+            b = self.Polygon.convex_hull([self.Vec2(rand.random(), rand.random())
+                for j in range(rand.randint(3, 12))])
+            result = a.intersection(b)
+            clipped = a.clip(b)
+            if result is None:
+                assert clipped is None or clipped.area < 1e-9
+            else:
+                assert_almost_equal(result.area, clipped.area)
+                assert_almost_equal(result.area, b.intersection(a).area)
+
+    def test_union_overlapping(self):
+        a = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        b = self.Polygon([(1,1), (3,1), (3,3), (1,3)])
+        result = a.union(b)
+        assert_equal(len(result), 1)
+        assert_almost_equal(result[0].signed_area, 7)
+        assert_equal(sorted(tuple(p) for p in result[0]), 
+            [(0,0), (0,2), (1,2), (1,3), (2,0), (2,1), (3,1), (3,3)])
+
+    def test_union_shared_edge(self):
+        a = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        b = self.Polygon([(1,0), (2,0), (2,1), (1,1)])
+        result = a.union(b)
+        assert_equal(len(result), 1)
+        assert_equal(sorted(tuple(p) for p in result[0]), 
+            [(0,0), (0,1), (2,0), (2,1)])
+
+    def test_union_disjoint(self):
+        a = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        b = self.Polygon([(3,1), (2,1), (2,0), (3,0)])
+        result = a.union(b)
+        assert_equal(len(result), 2)
+        for poly in result:
+            assert_almost_equal(poly.signed_area, 1)
+
+    def test_difference_overlapping(self):
+        a = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        b = self.Polygon([(1,1), (3,1), (3,3), (1,3)])
+        result = a.difference(b)
+        assert_equal(len(result), 1)
+        assert_almost_equal(result[0].signed_area, 3)
+        assert_equal(sorted(tuple(p) for p in result[0]), 
+            [(0,0), (0,2), (1,1), (1,2), (2,0), (2,1)])
+
+    def test_difference_hole(self):
+        outer = self.Polygon([(0,0), (4,0), (4,4), (0,4)])
+        inner = self.Polygon([(1,1), (2,1), (2,2), (1,2)])
+        result = outer.difference(inner)
+        assert_equal(len(result), 2)
+        areas = sorted(poly.signed_area for poly in result)
+        assert_almost_equal(areas[0], -1)
+        assert_almost_equal(areas[1], 16)
+        assert_equal(inner.difference(outer), [])
+
+    def test_difference_of_holes(self):
+        outer = self.Polygon([(0,0), (4,0), (4,4), (0,4)])
+        inner = self.Polygon([(1,1), (3,1), (3,3), (1,3)])
+        ring = outer.difference(inner)
+        result = self.Polygon([(2,0), (5,0), (5,4), (2,4)]).difference(ring)
+        assert_equal(len(result), 2)
+        assert_almost_equal(sum(poly.area for poly in result), 6)
+        assert_almost_equal(inner.union(ring)[0].area, 16)
+
+    def test_symmetric_difference(self):
+        a = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        b = self.Polygon([(1,1), (3,1), (3,3), (1,3)])
+        result = a.symmetric_difference(b)
+        assert_equal(len(result), 2)
+        for poly in result:
+            assert_almost_equal(poly.signed_area, 3)
+        assert_equal(a.symmetric_difference(a), [])
+
+    def test_boolean_clockwise_and_non_simple(self):
+        bowtie = self.Polygon([(0,0), (2,2), (2,0), (0,2)])
+        square = self.Polygon([(0,2), (2,2), (2,0), (0,0)])
+        result = square.difference(bowtie)
+        assert_equal(len(result), 2)
+        for poly in result:
+            assert_almost_equal(poly.signed_area, 1)
+        assert_almost_equal(bowtie.union(square)[0].signed_area, 4)
+
+    def test_boolean_preserves_type(self):
+        class SubPoly(self.Polygon):
+            pass
+        a = SubPoly([(0,0), (2,0), (2,2), (0,2)])
+        result = a.union(self.Polygon([(1,1), (3,1), (3,3), (1,3)]))
+        assert isinstance(result[0], SubPoly)
+
+    @raises(TypeError)
+    def test_boolean_wrong_type(self):
+        self.Polygon([(0,0), (1,0), (1,1), (0,1)]).union(None)
+
+    def test_boolean_random(self):
+        import random
+        rand = random.Random(23)
+        for i in range(50):
+            a = self.Polygon([self.Vec2(rand.random(), rand.random())
+                for j in range(rand.randint(3, 8))])
+            b = self.Polygon([self.Vec2(rand.random(), rand.random())
+                for j in range(rand.randint(3, 8))])
+            union = sum(p.signed_area for p in a.union(b))
+            diff_ab = sum(p.signed_area for p in a.difference(b))
+            diff_ba = sum(p.signed_area for p in b.difference(a))
+            xor = sum(p.signed_area for p in a.symmetric_difference(b))
+            assert_almost_equal(xor, diff_ab + diff_ba)
+            area_b = sum(p.signed_area for p in b.union(b))
+            assert_almost_equal(union, diff_ab + area_b)
+            for j in range(20):
+                pt = self.Vec2(rand.random(), rand.random())
+                in_a = a._pnp_winding_test(pt)
+                in_b = b._pnp_winding_test(pt)
+                winding = sum(1 if p.signed_area > 0 else -1 
+                    for p in a.union(b) if p._pnp_winding_test(pt))
+                assert_equal(winding > 0, in_a or in_b)
+
+    def test_bounding_box(self):
+        import planar
+        poly = self.Polygon([(1, -2), (0, 0), (1, 0), (3, 0), (4, -2)])
+        bbox = poly.bounding_box
+        assert isinstance(bbox, planar.BoundingBox)
+        assert_equal(bbox.min_point, (0, -2))
+        assert_equal(bbox.max_point, (4, 0))
+
+    def test_eq_identical(self):
+        poly1 = self.Polygon([(0,0), (1,0), (1,1), (-1, 1)])
+        poly2 = self.Polygon([(0,0), (1,0), (1,1), (-1, 1)])
+        assert poly1 == poly2
+        assert not poly1 != poly2
+
+    def test_eq_same_object(self):
+        poly = self.Polygon([(-1,1), (0,0), (1,1), (0,1), (0,-2)])
+        assert poly == poly
+        assert not poly != poly
+
+    def test_eq_not_polygon(self):
+        verts = [(1, -2), (0, 0), (1, 0), (3, 0), (4, -2)]
+        assert self.Polygon(verts) != self.Seq2(verts)
+        assert not self.Polygon(verts) == self.Seq2(verts)
+        assert self.Polygon(verts) != None
+        assert not self.Polygon(verts) == None
+
+    def test_eq_different_lengths(self):
+        poly1 = self.Polygon([(0,0), (1,0), (1,1), (-1, 1), (0,0)])
+        poly2 = self.Polygon([(0,0), (1,0), (1,1), (-1, 1)])
+        assert not poly1 == poly2
+        assert poly1 != poly2
+
+    def test_eq_different_verts(self):
+        poly1 = self.Polygon([(0,0), (1,0), (1,1), (-1, 1)])
+        poly2 = self.Polygon([(0,0), (1,0), (1,1), (0, 1)])
+        assert not poly1 == poly2
+        assert poly1 != poly2
+    
+    def test_eq_different_starting_vert(self):
+        poly1 = self.Polygon([(-3,3), (-1,-2), (1,-2), (3,3), (1,-1), (-1,-1)])
+        poly2 = self.Polygon([(3,3), (1,-1), (-1,-1), (-3,3), (-1,-2), (1,-2)])
+        assert poly1 == poly2
+        assert not poly1 != poly2
+        poly3 = self.Polygon([(3,3), (1,0), (-1,-1), (-4,3), (-1,-2), (1,-2)])
+        assert poly1 != poly3
+        assert not poly1 == poly3
+
+    def test_eq_different_winding(self):
+        verts = [(1, -2), (0, 0), (1, 0), (3, 0), (4, -2)]
+        poly1 = self.Polygon(verts)
+        verts.reverse()
+        poly2 = self.Polygon(verts)
+        assert poly1 == poly2
+        assert not poly1 != poly2
+        poly3 = self.Polygon(verts[2:] + verts[:2])
+        assert poly1 == poly3
+        assert not poly1 != poly3
+        verts[2] = (0.5, 0)
+        poly4 = self.Polygon(verts)
+        assert not poly1 == poly4
+        assert poly1 != poly4
+
+    def test_eq_degenerate_cases(self):
+        verts = [(0,0)]*3 + [(0,1)] + [(0,0)]*2
+        assert self.Polygon(verts) == self.Polygon(verts)
+        assert self.Polygon(reversed(verts)) == self.Polygon(verts)
+        assert self.Polygon(verts) == self.Polygon(verts[:-2] + verts[-2:])
+        # Rect with coincident edges
+        verts = [(0,0), (0,1), (1,1), (1,0), (0,0), (0,1), (1,1), (1,0)]
+        assert self.Polygon(verts) == self.Polygon(verts)
+        assert self.Polygon(reversed(verts)) == self.Polygon(verts)
+        assert self.Polygon(verts) == self.Polygon(verts[:1] + verts[1:])
+        # Different repeating verts
+        poly1 = self.Polygon([(0,0), (0,1), (0,1), (0,1), (1,1)])
+        poly2 = self.Polygon([(0,0), (0,1), (1,1), (1,1), (1,1)])
+        assert poly1 != poly2
+        poly3 = self.Polygon([(1,1), (0,1), (0,1), (0,1), (0,0)])
+        assert poly1 == poly3
+        assert not poly2 == poly3
+
+    def test_contains_point_triangle(self):
+        poly = self.Polygon([(0,1), (1, -1), (-0.5,-0.5)])
+        assert poly.contains_point((0, 0))
+        assert poly.contains_point((-0.2, -0.2))
+        assert poly.contains_point(self.Vec2(0, 0.9))
+        assert poly.contains_point((0.5, -0.5))
+        assert not poly.contains_point(self.Vec2(-0.7, 0.9))
+        assert not poly.contains_point(self.Vec2(-0.4, 0))
+        assert not poly.contains_point(self.Vec2(0.4, 0.5))
+        assert not poly.contains_point((100, 0))
+        assert not poly.contains_point((-100, 0))
+        assert not poly.contains_point((0, -100))
+        assert not poly.contains_point((0, 100))
+        assert not poly.contains_point((-100, -100))
+        assert not poly.contains_point((100, -100))
+        assert not poly.contains_point((-100, 100))
+        assert not poly.contains_point((100, 100))
+
+    def test_contains_point_triangle_with_mutation(self):
+        poly = self.Polygon([(0,0), (1, -1), (0.5,0.5)])
+        assert poly.contains_point((0.5, -0.1))
+        poly[1] = (1, 0)
+        assert not poly.contains_point((0.5, -0.1))
+
+    def test_contains_point_degenerate_triangle(self):
+        poly = self.Polygon([(2,3), (2,0), (2,5)])
+        assert not poly.contains_point((0,0))
+        assert not poly.contains_point((2,0))
+        assert not poly.contains_point((2,4))
+        assert not poly.contains_point((0,4))
+        assert not poly.contains_point((2.1,4))
+
+    def test_contains_point_null_triangle(self):
+        poly = self.Polygon([(1,1), (1,1), (1,1)])
+        assert not poly.contains_point((0,0))
+        assert not poly.contains_point((1,1))
+        assert not poly.contains_point((2,2))
+
+    def test_contains_point_convex_no_centroid(self):
+        poly = self.Polygon(
+            [(1,1), (0,2), (-0.9, 1.5), (-1,0.5), (-1,-1), (0.5,-1)])
+        assert poly.is_convex
+        assert not poly.is_centroid_known
+        assert poly.contains_point((0, 0))
+        assert poly.contains_point((0, 1))
+        assert poly.contains_point((0.5, 1))
+        assert poly.contains_point((-0.5, -0.5))
+        assert poly.contains_point(self.Vec2(-0.75, 0.5))
+        assert not poly.contains_point((-1.1, 0.5))
+        assert not poly.contains_point((1, 0))
+        assert not poly.contains_point((-1.01, -1))
+        assert not poly.contains_point(self.Vec2(-0.5, -10))
+        assert not poly.contains_point((100, 0))
+        assert not poly.contains_point((-100, 0))
+        assert not poly.contains_point((0, -100))
+        assert not poly.contains_point((0, 100))
+        assert not poly.contains_point((-100, -100))
+        assert not poly.contains_point((100, -100))
+        assert not poly.contains_point((-100, 100))
+        assert not poly.contains_point((100, 100))
+
+    def test_contains_point_convex_with_mutation(self):
+        poly = self.Polygon(
+            [(-1.5,0), (0,2), (1, 0), (1.5,-2), (-0.5,-2), (-1,-1.5)])
+        assert poly.is_convex
+        assert poly.contains_point((0, 0))
+        assert poly.contains_point((1,-1.5))
+        poly[3] = (0.5,-2)
+        assert poly.is_convex
+        assert poly.contains_point((0, 0))
+        assert not poly.contains_point((1,-1.5))
+
+    def test_contains_point_convex_extreme_vertex_ties(self):
+        # The leftmost vertex is also the highest, and the rightmost
+        # vertex the lowest
+        quad = [(0.0029,-0.99999), (-0.11196,-0.99371), (-0.52421,-0.85159),
+            (-0.93909,-0.34367)]
+        hexagon = [(0.00349,-0.99999), (-0.10453,-0.99452),
+            (-0.25882,-0.96593), (-0.5,-0.86603), (-0.76604,-0.64279),
+            (-0.93969,-0.34202)]
+        for verts in (quad, quad[::-1], hexagon, hexagon[::-1]):
+            poly = self.Polygon(verts)
+            assert poly.is_convex
+            assert poly.contains_point((-0.3, -0.9))
+            assert not poly.contains_point((-0.3, -0.7))
+            assert not poly.contains_point((-0.3, -0.99))
+            for i in range(13):
+                for j in range(9):
+                    pt = (i * 0.1 - 1.05, j * 0.1 - 1.05)
+                    assert_equal(poly._pnp_y_monotone_test(pt),
+                        poly._pnp_winding_test(pt), (verts, pt))
+
+    def test_contains_point_regular(self):
+        poly = self.Polygon.regular(8, 1.5, center=(1,1), angle=22.5)
+        assert poly.is_centroid_known
+        assert poly.contains_point((1, 1))
+        assert poly.contains_point((-0.25, 1))
+        assert poly.contains_point((0, 1))
+        assert poly.contains_point((1, -0.2))
+        assert poly.contains_point((0.75, -0.38))
+        assert poly.contains_point(self.Vec2(-0.3, 1.2))
+        assert not poly.contains_point((0, 0))
+        assert not poly.contains_point((2, 2))
+        assert not poly.contains_point(self.Vec2(-0.5, -0.5))
+        assert not poly.contains_point((2.6, 1))
+        assert not poly.contains_point((0, 2.6))
+        assert not poly.contains_point((100, 0))
+        assert not poly.contains_point((-100, 0))
+        assert not poly.contains_point((0, -100))
+        assert not poly.contains_point((0, 100))
+        assert not poly.contains_point((-100, -100))
+        assert not poly.contains_point((100, -100))
+        assert not poly.contains_point((-100, 100))
+        assert not poly.contains_point((100, 100))
+
+    def test_contains_point_radial_concave(self):
+        poly = self.Polygon.star(4, 4, 1)
+        assert poly.is_centroid_known
+        assert poly.contains_point((0, 0))
+        assert poly.contains_point((0, 3))
+        assert poly.contains_point(poly[3])
+        assert poly.contains_point((-3, 0))
+        assert poly.contains_point((-4, 0))
+        assert poly.contains_point(poly[5])
+        assert poly.contains_point((3.99, 0))
+        assert poly.contains_point((0, 3.99))
+        assert not poly.contains_point((4, 0))
+        assert not poly.contains_point((0, 4))
+        assert not poly.contains_point(poly[1])
+        assert not poly.contains_point(poly[7])
+        assert not poly.contains_point((-1.1, 1.1))
+        assert not poly.contains_point((-1, 2))
+        assert not poly.contains_point((1, 2))
+        assert not poly.contains_point((-2, 1))
+        assert not poly.contains_point((-2, -1))
+        assert not poly.contains_point((-1, -2))
+        assert not poly.contains_point((1, -2))
+        assert not poly.contains_point((2, 1))
+        assert not poly.contains_point((2, -1))
+        assert not poly.contains_point((100, 0))
+        assert not poly.contains_point((-100, 0))
+        assert not poly.contains_point((0, -100))
+        assert not poly.contains_point((0, 100))
+        assert not poly.contains_point((-100, -100))
+        assert not poly.contains_point((100, -100))
+        assert not poly.contains_point((-100, 100))
+        assert not poly.contains_point((100, 100))
+
+    def test_contains_point_concave(self):
+        poly = self.Polygon([(-1,0), (-1,1), (2,1), (2,0), (1.5,-1), 
+            (1,0), (0.5,-1), (0,0), (-0.5,-1)])
+        assert not poly.is_convex
+        assert poly.is_simple
+        assert poly.contains_point((1, 0.5))
+        assert poly.contains_point((-0.5, -0.25))
+        assert poly.contains_point((0.5, -0.6))
+        assert poly.contains_point((1.5, -0.1))
+        assert poly.contains_point((-0.5, -0.999))
+        assert poly.contains_point((0.5, 0))
+        assert not poly.contains_point((0, 1.1))
+        assert not poly.contains_point((0.5, -1.1))
+        assert not poly.contains_point((0.9, 2.1))
+        assert not poly.contains_point((-0.9, -0.5))
+        assert not poly.contains_point((0, -0.1))
+        assert not poly.contains_point((0.4, -0.9))
+        assert not poly.contains_point((1, -0.1))
+        assert not poly.contains_point((1.8, -0.8))
+        assert not poly.contains_point((100, 0))
+        assert not poly.contains_point((-100, 0))
+        assert not poly.contains_point((0, -100))
+        assert not poly.contains_point((0, 100))
+        assert not poly.contains_point((-100, -100))
+        assert not poly.contains_point((100, -100))
+        assert not poly.contains_point((-100, 100))
+        assert not poly.contains_point((100, 100))
+
+    def test_contains_point_non_simple(self):
+        poly = self.Polygon([(2,-2), (-2,-2), (-2,2), (0,2), (0,-1), 
+            (1,-1), (1,0), (-1,0), (-1,1), (2,1)])
+        assert not poly.is_convex
+        assert not poly.is_simple
+        assert poly.contains_point((0.5, 0.5))
+        assert poly.contains_point((1.5, 0.5))
+        assert poly.contains_point((1.5, -1.5))
+        assert poly.contains_point((-1, -1))
+        assert poly.contains_point((-1.5, 0.5))
+        assert poly.contains_point((-0.5, 1.5))
+        assert poly.contains_point((-0.5, 0.5)) # self-overlap
+        assert not poly.contains_point((1, 1.5))
+        assert not poly.contains_point((1.5, 1.5))
+        assert not poly.contains_point((2.1, 0))
+        assert not poly.contains_point((-2.1, 0))
+        assert not poly.contains_point((0, -2.1))
+        assert not poly.contains_point((0, 2.1))
+        assert not poly.contains_point((0.5, 2.1))
+        assert not poly.contains_point((0.5, -0.5)) # hole
+        assert not poly.contains_point((100, 0))
+        assert not poly.contains_point((-100, 0))
+        assert not poly.contains_point((0, -100))
+        assert not poly.contains_point((0, 100))
+        assert not poly.contains_point((-100, -100))
+        assert not poly.contains_point((100, -100))
+        assert not poly.contains_point((-100, 100))
+        assert not poly.contains_point((100, 100))
+
+    def test_contains_point_degenerate(self):
+        poly = self.Polygon([(-2,1), (2,1), (3,1), (5,1), (5.2,1)])
+        assert not poly.contains_point((0,0))
+        assert not poly.contains_point((2,1))
+        assert not poly.contains_point((5,1))
+        assert not poly.contains_point((5.2,1))
+        assert not poly.contains_point((-2.1,1))
+        assert not poly.contains_point((2.1,4))
+
+    def test_contains_point_exclusive_triangles(self):
+        tris = [
+            self.Polygon([(0,0), (0,3), (3,3)]),
+            self.Polygon([(0,0), (3,0), (3,3)]),
+            self.Polygon([(-1,-1), (0,0), (0,3)]),
+            self.Polygon([(3,3), (0,3), (1,4)]),
+        ]
+        assert_contains_point(tris, 0, (0, 1))
+        assert_contains_point(tris, 0, (0, 2))
+        assert_contains_point(tris, 0, (0, 3))
+        assert_contains_point(tris, 0, (1.5, 3))
+        assert_contains_point(tris, 1, (2, 2))
+        assert_contains_point(tris, 1, (1, 1))
+        assert_contains_point(tris, None, (0, 0))
+        assert_contains_point(tris, None, (1.5, 0))
+        assert_contains_point(tris, None, (3, 0))
+        assert_contains_point(tris, None, (3, 1.5))
+        assert_contains_point(tris, None, (3, 3))
+
+    def test_contains_point_exclusive_convex(self):
+        polys = [
+            self.Polygon([(2,2), (0,0), (-2,1), (0,3)]),
+            self.Polygon([(0,-1), (0,0), (-2,1), (-2,-3)]),
+            self.Polygon([(2,-1), (0,-1), (0,0), (2,2)]),
+        ]
+        assert polys[0].is_convex
+        assert polys[1].is_convex
+        assert polys[2].is_convex
+        assert_contains_point(polys, 0, (-1, 2))
+        assert_contains_point(polys, 0, (-2, 1))
+        assert_contains_point(polys, 0, (-1, 0.5))
+        assert_contains_point(polys, 1, (-1, 0))
+        assert_contains_point(polys, 1, (-2, 0))
+        assert_contains_point(polys, 1, (-2, -2))
+        assert_contains_point(polys, 2, (0, 0))
+        assert_contains_point(polys, 2, (1, 1))
+        assert_contains_point(polys, 2, (0, -0.5))
+        assert_contains_point(polys, None, (0, -1))
+        assert_contains_point(polys, None, (1, -1))
+        assert_contains_point(polys, None, (2, -1))
+        assert_contains_point(polys, None, (2, 0))
+        assert_contains_point(polys, None, (-1, -2))
+        assert_contains_point(polys, None, (-2, -3))
+        assert_contains_point(polys, None, (0, 3))
+        assert_contains_point(polys, None, (1.5, 2.5))
+        assert_contains_point(polys, None, (2, 2))
+
+    def test_contains_point_exclusive_concave(self):
+        polys = [
+            self.Polygon([(0,0), (0,1), (1,1), (2,2), (3,2), (3,0)]),
+            self.Polygon([(2,2), (1,1), (0,1), (1,2), (0,3), (1,3)]),
+            self.Polygon([(4,3), (1,3), (2,2), (3,2), (3,0), 
+                (4,0), (5,2), (5,1)]),
+        ]
+        assert not polys[0].is_convex
+        assert not polys[1].is_convex
+        assert not polys[2].is_convex
+        assert_contains_point(polys, 0, (0, 1))
+        assert_contains_point(polys, 0, (0, 0.5))
+        assert_contains_point(polys, 0, (1, 1))
+        assert_contains_point(polys, 0, (1.5, 1.5))
+        assert_contains_point(polys, 0, (2, 2))
+        assert_contains_point(polys, 0, (2.5, 2))
+        assert_contains_point(polys, 1, (0, 3))
+        assert_contains_point(polys, 1, (0.5, 3))
+        assert_contains_point(polys, 1, (0.5, 2.5))
+        assert_contains_point(polys, 1, (1, 2))
+        assert_contains_point(polys, 1, (0.5, 1.5))
+        assert_contains_point(polys, 2, (3, 2))
+        assert_contains_point(polys, 2, (3, 1))
+        assert_contains_point(polys, 2, (1, 3))
+        assert_contains_point(polys, 2, (2, 3))
+        assert_contains_point(polys, 2, (1.5, 2.5))
+        assert_contains_point(polys, None, (0, 0))
+        assert_contains_point(polys, None, (1, 0))
+        assert_contains_point(polys, None, (3, 0))
+        assert_contains_point(polys, None, (3.5, 0))
+        assert_contains_point(polys, None, (4, 0))
+        assert_contains_point(polys, None, (4, 3))
+        assert_contains_point(polys, None, (4.5, 2))
+        assert_contains_point(polys, None, (4.5, 1))
+        assert_contains_point(polys, None, (5, 2))
+        assert_contains_point(polys, None, (5, 1.5))
+        assert_contains_point(polys, None, (5, 1))
+
+    def assert_contains_points_consistent(self, poly):
+        points = [(x / 4.0, y / 4.0) 
+            for x in range(-12, 13) for y in range(-12, 13)]
+        expected = bytearray(poly.contains_point(p) for p in points)
+        result = poly.contains_points(points)
+        assert isinstance(result, bytearray)
+        assert_equal(result, expected)
+        assert_equal(poly.contains_points(
+            self.Seq2([self.Vec2(*p) for p in points])), expected)
+        assert_equal(poly.contains_points(
+            array.array('d', [c for p in points for c in p])), expected)
+
+    def test_contains_points_triangle(self):
+        self.assert_contains_points_consistent(
+            self.Polygon([(-1,-1), (2,0), (0,2)]))
+
+    def test_contains_points_convex(self):
+        poly = self.Polygon(
+            [(1,1), (0,2), (-0.9, 1.5), (-1,0.5), (-1,-1), (0.5,-1)])
+        self.assert_contains_points_consistent(poly)
+        assert poly.is_convex
+        self.assert_contains_points_consistent(poly)
+
+    def test_contains_points_regular(self):
+        self.assert_contains_points_consistent(
+            self.Polygon.regular(8, 1.5, center=(0.5,0.5), angle=22.5))
+        self.assert_contains_points_consistent(
+            self.Polygon.star(7, 1, 2.5))
+
+    def test_contains_points_concave(self):
+        self.assert_contains_points_consistent(self.Polygon(
+            [(0,0), (1,1), (2,0), (2,2), (1,1.5), (-1,2), (-0.5,-1)]))
+
+    def test_contains_points_non_simple(self):
+        self.assert_contains_points_consistent(self.Polygon(
+            [(-1,-1), (2,2), (2,-1), (-1,2)]))
+
+    def test_contains_points_non_simple_no_centroid(self):
+        poly = self.Polygon([(0,0), (4,4), (4,0), (0,4), (2,-1)])
+        assert poly.centroid is None
+        assert_equal(list(poly.contains_points([(3,1.5), (9,9)])), [1, 0])
+        assert poly.contains_point((3,1.5))
+        self.assert_contains_points_consistent(poly)
+
+    def test_contains_points_empty(self):
+        poly = self.Polygon([(-1,-1), (2,0), (0,2), (-1,1)])
+        assert_equal(poly.contains_points([]), bytearray())
+
+    @raises(TypeError)
+    def test_contains_points_bad_points(self):
+        self.Polygon([(-1,-1), (2,0), (0,2)]).contains_points([(1,2,3)])
+
+    def assert_prepared_consistent(self, poly):
+        points = [(x / 4.0, y / 4.0) 
+            for x in range(-12, 13) for y in range(-12, 13)]
+        unprepared = self.Polygon(poly)
+        expected = bytearray(unprepared.contains_point(p) for p in points)
+        poly.prepare()
+        assert_equal(bytearray(poly.contains_point(p) for p in points), 
+            expected)
+        assert_equal(poly.contains_points(points), expected)
+
+    def test_prepare_concave(self):
+        poly = self.Polygon([(-1,0), (-1,1), (2,1), (2,0), (1.5,-1), 
+            (1,0), (0.5,-1), (0,0), (-0.5,-1)])
+        self.assert_prepared_consistent(poly)
+        assert poly.contains_point((1, 0.5))
+        assert poly.contains_point((0.5, -0.6))
+        assert not poly.contains_point((0, -0.1))
+        assert not poly.contains_point((1.8, -0.8))
+        assert not poly.contains_point((100, 0))
+
+    def test_prepare_comb(self):
+        # Vertices aligned with the grid cell boundaries
+        verts = [(0,0), (3,0)]
+        for x in range(3, -3, -1):
+            verts.extend([(x, 3), (x - 0.5, 3), (x - 0.5, 1), (x - 1, 1)])
+        self.assert_prepared_consistent(self.Polygon(verts))
+
+    def test_prepare_non_simple(self):
+        poly = self.Polygon([(2,-2), (-2,-2), (-2,2), (0,2), (0,-1), 
+            (1,-1), (1,0), (-1,0), (-1,1), (2,1)])
+        self.assert_prepared_consistent(poly)
+        assert poly.contains_point((-0.5, 0.5)) # self-overlap
+        assert not poly.contains_point((0.5, -0.5)) # hole
+
+    def test_prepare_large(self):
+        self.assert_prepared_consistent(self.Polygon.star(200, 2, 2.8))
+
+    def test_prepare_convex(self):
+        self.assert_prepared_consistent(self.Polygon.regular(16, 2.5))
+
+    def test_prepare_with_mutation(self):
+        poly = self.Polygon([(-1,0), (-1,1), (2,1), (2,0), (1.5,-1), 
+            (1,0), (0.5,-1), (0,0), (-0.5,-1)])
+        poly.prepare()
+        assert not poly.contains_point((0.5, 1.5))
+        poly[2] = (2, 2)
+        assert poly.contains_point((0.5, 1.2))
+        self.assert_prepared_consistent(poly)
+
+    def test_prepare_with_transform(self):
+        poly = self.Polygon.star(20, 1, 2.5)
+        poly.prepare()
+        assert poly.contains_point((0.5, 0))
+        rotated = poly * self.Affine.rotation(45)
+        self.assert_prepared_consistent(rotated)
+        poly *= self.Affine.translation((1, 1))
+        self.assert_prepared_consistent(poly)
+
+    def test_threaded_properties(self):
+        import threading
+        verts = list(self.Polygon.star(1500, 1, 2))
+        points = [(x / 4.0, y / 4.0) 
+            for x in range(-12, 13) for y in range(-12, 13)]
+        def properties(poly):
+            return (poly.is_convex, poly.is_simple, poly.centroid, 
+                poly.bounding_box, poly.contains_points(points),
+                list(self.Polygon.convex_hull(poly)))
+        expected = properties(self.Polygon(verts))
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(properties(self.Polygon(verts))))
+            for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert_equal(results, [expected] * 4)
+
+    def test_prepare_copy(self):
+        import copy
+        poly = self.Polygon.star(20, 1, 2.5)
+        poly.prepare()
+        assert poly.contains_point((0.5, 0))
+        self.assert_prepared_consistent(copy.copy(poly))
+        self.assert_prepared_consistent(copy.deepcopy(poly))
+
+    def test_tangents_to_point_convex(self):
+        poly = self.Polygon.regular(30, 2)
+        assert_equal(poly.tangents_to_point((0,10)), 
+            (self.Vec2.polar(12, 2), self.Vec2.polar(168, 2)))
+        assert_equal(poly.tangents_to_point((0,5)), 
+            (self.Vec2.polar(24, 2), self.Vec2.polar(156, 2)))
+        assert_equal(poly.tangents_to_point((10,10)), 
+            (self.Vec2.polar(-36, 2), self.Vec2.polar(132, 2)))
+        assert_equal(poly.tangents_to_point((2,2)), 
+            (self.Vec2.polar(0, 2), self.Vec2.polar(96, 2)))
+        assert_equal(poly.tangents_to_point((-2,-2)), 
+            (self.Vec2.polar(180, 2), self.Vec2.polar(-84, 2)))
+        assert_equal(poly.tangents_to_point((-2,-20)), 
+            (self.Vec2.polar(180, 2), self.Vec2.polar(-12, 2)))
+        assert_equal(poly.tangents_to_point((5,20)), 
+            (self.Vec2.polar(-12, 2), self.Vec2.polar(156, 2)))
+
+    def test_tangents_to_point_convex_reverse_wound(self):
+        poly = self.Polygon(reversed(self.Polygon.regular(30, 2)))
+        assert_equal(poly.tangents_to_point((0,10)), 
+            (self.Vec2.polar(12, 2), self.Vec2.polar(168, 2)))
+        assert_equal(poly.tangents_to_point((0,-5)), 
+            (self.Vec2.polar(-156, 2), self.Vec2.polar(-24, 2)))
+        assert_equal(poly.tangents_to_point((10,10)), 
+            (self.Vec2.polar(-36, 2), self.Vec2.polar(132, 2)))
+        assert_equal(poly.tangents_to_point((2,2)), 
+            (self.Vec2.polar(0, 2), self.Vec2.polar(96, 2)))
+        assert_equal(poly.tangents_to_point((-2,-2)), 
+            (self.Vec2.polar(180, 2), self.Vec2.polar(-84, 2)))
+        assert_equal(poly.tangents_to_point((-2,-20)), 
+            (self.Vec2.polar(180, 2), self.Vec2.polar(-12, 2)))
+        assert_equal(poly.tangents_to_point((5,20)), 
+            (self.Vec2.polar(-12, 2), self.Vec2.polar(156, 2)))
+
+    def test_tangents_to_interior_point_convex(self):
+        # Although the results of this are undefined, we need 
+        # to ensure the library is at least well-behaved
+        poly = self.Polygon.regular(30, 2)
+        verts = list(poly)
+        assert poly.contains_point((0, 0))
+        left, right = poly.tangents_to_point((0, 0))
+        assert left in verts
+        assert right in verts
+
+    def test_tangents_to_point_non_convex(self):
+        poly = self.Polygon([(1,-1), (0,-3), (-1,3), (0,1), (2,2), (2,-2)])
+        assert not poly.is_convex
+        assert_equal(poly.tangents_to_point((2.1,1)), ((2,-2), (2,2)))
+        assert_equal(poly.tangents_to_point((0,-4)), ((-1,3), (2,-2)))
+        assert_equal(poly.tangents_to_point((1,-4)), ((0,-3), (2,-2)))
+        assert_equal(poly.tangents_to_point((20,20)), ((2,-2), (-1,3)))
+        assert_equal(poly.tangents_to_point((-5,2)), ((-1,3), (0,-3)))
+
+    def test_tangents_to_interior_point_non_convex(self):
+        # Although the results of this are undefined, we need 
+        # to ensure the library is at least well-behaved
+        verts = [(1,-1), (0,-3), (-1,3), (0,1), (2,2), (2,-2)]
+        poly = self.Polygon(verts)
+        assert not poly.is_convex
+        assert poly.contains_point((0, 0))
+        left, right = poly.tangents_to_point((0, 0))
+        assert left in verts
+        assert right in verts
+
+    def test_convex_hull_triangle(self):
+        points = [(0,0), (1, -2), (2, 3)]
+        hull = self.Polygon.convex_hull(points)
+        assert hull.is_convex
+        assert_equal(hull, self.Polygon(points))
+        points = [(0,0), (1, 2), (2, 3)]
+        hull = self.Polygon.convex_hull(points)
+        assert hull.is_convex
+        assert_equal(hull, self.Polygon(points))
+
+    def confirm_hull(self, points, hull):
+        poly = self.Polygon(list(hull))
+        assert poly.is_convex, hull
+        for pt in hull:
+            assert pt in points, "Hull pt %r not in points" % pt
+        for pt in points:
+            assert poly.contains_point(pt) or pt in hull, (
+                "Pt %r outside hull %r" % (pt, hull))
+
+    def test_convex_hull_random_points(self):
+        points = [(55,27), (53,95), (57,15), (55,24), (54,0), (3,28), (21,93),
+            (10,86), (17,74), (51,44), (7,4), (5,93), (25,86), (20,55),
+            (27,24), (47,52), (55,62), (57,85), (71,71), (75,46), (90,10),
+            (25,42), (62,72), (36,38), (27,52), (69,17), (93,40), (70,51),
+            (77,80), (43,88), (88,74), (91,76), (63,45), (40,13), (10,59),
+            (8,16), (3,63), (18,67), (47,65), (88,65), (19,25), (14,2),
+            (55,97), (41,70), (83,86), (0,80), (46,78), (12,20), (54,46),
+            (48,72), (25,34), (67,68), (24,22), (91,63), (58,88), (100,77),
+            (93,73), (43,65), (2,27), (81,2), (53,52), (64,3), (16,76),
+            (8,10), (64,18), (93,48), (93,96), (37,17), (48,83), (96,94),
+            (56,21), (36,6), (82,92), (2,88), (1,7), (99,42), (56,48), (35,0),
+            (54,7), (92,57), (26,11), (31,28), (31,73), (54,7), (91,52),
+            (40,31), (15,78), (67,6), (89,72), (9,3), (25,58), (6,86),
+            (58,75), (17,63), (32,11), (71,71), (95,53), (22,78), (63,78),
+            (88,33)]
+        hull = self.Polygon.convex_hull(points)
+        self.confirm_hull(points, hull)
+
+    def test_convex_hull_convex_input_ordered(self):
+        points = self.Polygon.regular(33, 5)
+        hull = self.Polygon.convex_hull(points)
+        assert points == hull, (list(points), list(hull))
+
+    def test_convex_hull_almost_convex_input_unordered(self):
+        points = [(-1.57211, 1.23632), (1.16011, -1.62915), 
+            (1.85674, -0.743325), (-1.77767, 0.916453), (1.85674, 0.743325),
+            (-1.77767, -0.916453), (1.44747, -1.38016), (0.471518, 1.94362),
+            (-1.30972, 1.5115), (2, 0), (1.96386, 0.378502), 
+            (-1.99094, -0.190112), (1.16011, 1.62915), (0.0951638, -1.99773), 
+            (1.96386, -0.378502), (-1, -1.73205), (-0.28463, 1.97964), 
+            (0.0951638, 1.99773), (-0.28463, -1.97964), (0.471518, -1.94362), 
+            (-1.91899, -0.563465), (1.44747, 1.38016), (1.44747, 1.379), 
+            (-0.654136, 1.89), (-1.99094, 0.190112), (-1.57211, -1.23632), 
+            (-1.91899, 0.563465), (0.83083, -1.81926), (1.68251, 1.08128), 
+            (-1.30972, -1.5115), (-1, 1.73205), (-0.654136, -1.89), 
+            (0.83083, 1.81926), (1.68251, -1.08128),]
+        hull = self.Polygon.convex_hull(points)
+        assert len(hull) == len(points) - 1, (len(hull), len(points))
+        self.confirm_hull(points, hull)
+
+    def test_convex_hull_degenerate(self):
+        points = [(0,1), (2,1), (5,1), (7,1), (12,1)]
+        hull = list(self.Polygon.convex_hull(points))
+        assert (0,1) in points
+        assert (12,1) in points
+        assert_equal(len(hull), 3)
+        while hull:
+            pt = hull.pop()
+            assert pt[1] == 1, pt
+            assert 0 <= pt[0] <= 12, pt
+
+    def test_str_and_repr(self):
+        poly = self.Polygon([(0.25,3.5), (1.3,4.25), (0.16,2.25), (-0.5,0.16)])
+        assert_equal(repr(poly), 
+            "Polygon([(0.25, 3.5), (1.3, 4.25), (0.16, 2.25), (-0.5, 0.16)])")
+        assert_equal(repr(poly), str(poly))
+        assert not poly.is_convex
+        assert poly.is_simple
+        assert_equal(repr(poly), 
+            "Polygon([(0.25, 3.5), (1.3, 4.25), (0.16, 2.25), (-0.5, 0.16)], "
+            "is_convex=False, is_simple=True)")
+        assert_equal(repr(poly), str(poly))
+        poly = self.Polygon([(1.3,1.5), (0.16,0.16), (2.25,2.25)])
+        assert poly.is_convex
+        assert_equal(repr(poly),
+            "Polygon([(1.3, 1.5), (0.16, 0.16), (2.25, 2.25)], is_convex=True)")
+        assert_equal(repr(poly), str(poly))
+
+    def test_copy(self):
+        from copy import copy
+        p = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        assert p.is_convex
+        centroid = p.centroid
+        c = copy(p)
+        assert isinstance(c, self.Polygon)
+        assert c is not p
+        assert_equal(tuple(c), tuple(p))
+        assert c.is_convex_known
+        assert c.is_convex
+        assert c.is_simple_known
+        assert c.is_simple
+        assert c.is_centroid_known
+        assert_equal(c.centroid, centroid)
+        c[0] = (0,0.1)
+        assert c[0] != p[0]
+
+        p = self.Polygon([(0,0), (1,1), (1,0), (0,1)])
+        assert not p.is_simple
+        c = copy(p)
+        assert isinstance(c, self.Polygon)
+        assert c is not p
+        assert_equal(tuple(c), tuple(p))
+        assert c.is_convex_known
+        assert not c.is_convex
+        assert c.is_simple_known
+        assert not c.is_simple
+        c[0] = (0,0.1)
+        assert c[0] != p[0]
+
+    def test_copy_subclass(self):
+        from copy import copy
+        class PolySubclass(self.Polygon):
+            from_points_called = False
+            @classmethod
+            def from_points(cls, points):
+                cls.from_points_called = True
+                return super(PolySubclass, cls).from_points(points)
+
+        a = PolySubclass([(0,1), (1,2), (3,4)])
+        assert not PolySubclass.from_points_called
+        b = copy(a)
+        assert PolySubclass.from_points_called
+        assert a is not b
+        assert isinstance(b, PolySubclass)
+        assert_equal(tuple(a), tuple(b))
+        a[0] = (0, 0)
+        assert_equal(b[0], self.Vec2(0, 1))
+
+    def test_deepcopy(self):
+        from copy import deepcopy
+        p = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        bbox = p.bounding_box
+        c = deepcopy(p)
+        assert isinstance(c, self.Polygon)
+        assert c is not p
+        assert_equal(tuple(c), tuple(p))
+        c[0] = (0,0.1)
+        assert c[0] != p[0]
+        assert c.bounding_box is not bbox
+
+    def test_pickle(self):
+        import pickle
+        p = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        assert p.is_convex
+        centroid = p.centroid
+        area = p.area
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            c = pickle.loads(pickle.dumps(p, protocol))
+            assert isinstance(c, self.Polygon)
+            assert_equal(tuple(c), tuple(p))
+            assert c.is_convex_known
+            assert c.is_convex
+            assert c.is_simple_known
+            assert c.is_simple
+            assert c.is_centroid_known
+            assert_equal(c.centroid, centroid)
+            assert_equal(c.area, area)
+            for pt in [(1.5, 1), (0.5, 0.5), (3, 1)]:
+                assert_equal(c.contains_point(pt), p.contains_point(pt))
+
+    def test_pickle_not_simple(self):
+        import pickle
+        p = self.Polygon([(0,0), (1,1), (1,0), (0,1)])
+        assert not p.is_simple
+        c = pickle.loads(pickle.dumps(p, 2))
+        assert_equal(tuple(c), tuple(p))
+        assert c.is_convex_known
+        assert not c.is_convex
+        assert c.is_simple_known
+        assert not c.is_simple
+        assert not c.is_centroid_known
+        assert p.centroid is None
+        c = pickle.loads(pickle.dumps(p, 2))
+        assert c.is_centroid_known
+        assert c.centroid is None
+        c = pickle.loads(pickle.dumps(self.Polygon(p), 2))
+        assert not c.is_convex_known
+        assert not c.is_simple_known
+        assert not c.is_centroid_known
+
+    def test_pickle_known_centroid(self):
+        import pickle
+        p = self.Polygon.regular(5, 2, center=(1, 3))
+        assert p.is_centroid_known
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            c = pickle.loads(pickle.dumps(p, protocol))
+            assert c.is_centroid_known
+            assert_equal(c.centroid, (1, 3))
+
+    def test_pickle_out_of_band(self):
+        import pickle
+        if pickle.HIGHEST_PROTOCOL < 5:
+            return
+        p = self.Polygon.regular(100, 10)
+        buffers = []
+        data = pickle.dumps(p, 5, buffer_callback=buffers.append)
+        assert_equal(len(buffers), 1)
+        assert_equal(len(buffers[0].raw()), 1600)
+        c = pickle.loads(data, buffers=buffers)
+        assert_equal(tuple(c), tuple(p))
+        assert c.is_convex
+
+    def test_imul_by_transform(self):
+        b = a = self.Polygon([(1,2), (3,4), (5,6)])
+        a *= self.Affine.translation((5, -4))
+        assert a is b
+        V = self.Vec2
+        assert_equal(tuple(a), (V(6, -2), V(8, 0), V(10, 2)))
+
+    @raises(TypeError)
+    def test_imul_incompatible(self):
+        a = self.Polygon([(1,2), (3,4), (5,6)])
+        a *= None
+
+    def test_mul_by_transform(self):
+        a = self.Polygon([(1,2), (3,4), (5,6)])
+        b = a * self.Affine.scale((2, -1))
+        assert a is not b
+        assert isinstance(b, self.Polygon)
+        V = self.Vec2
+        assert_equal(tuple(b), (V(2, -2), V(6, -4), V(10, -6)))
+
+    @raises(TypeError)
+    def test_mul_incompatible(self):
+        a = self.Polygon([(1,2), (3,4), (5,6)]) * 2
+
+    def test_transform_keeps_classification(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        assert not poly.is_convex
+        assert poly.is_simple
+        t = self.Affine.rotation(30) * self.Affine.shear(10, 0)
+        for result in (poly * t, t * poly):
+            assert result.is_convex_known
+            assert not result.is_convex
+            assert result.is_simple_known
+            assert result.is_simple
+        poly *= self.Affine.scale((2, -1))
+        assert poly.is_convex_known
+        assert not poly.is_convex
+        assert poly.is_simple_known
+        assert not poly.contains_point((4, -3))
+        assert poly.contains_point((4, -0.5))
+
+    def test_transform_convex_contains_point(self):
+        poly = self.Polygon.regular(12, 2)
+        assert poly.is_convex
+        t = (self.Affine.translation((3, 1)) * self.Affine.rotation(10)
+            * self.Affine.scale((1, 0.5)))
+        result = poly * t
+        assert result.is_convex_known
+        assert result.is_convex
+        fresh = self.Polygon(list(result))
+        for point in [(3, 1), (4.5, 1.2), (1.2, 1), (3, 2.5), (10, 10)]:
+            assert_equal(result.contains_point(point), 
+                fresh.contains_point(point))
+
+    def test_transform_maps_centroid_and_area(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        centroid = poly.centroid
+        area = poly.signed_area
+        t = self.Affine.translation((1, 2)) * self.Affine.shear(20, 5) \
+            * self.Affine.scale((-2, 1))
+        result = poly * t
+        assert result.is_centroid_known
+        fresh = self.Polygon(list(result))
+        assert result.centroid.almost_equals(fresh.centroid)
+        assert result.centroid.almost_equals(t * centroid)
+        assert_almost_equal(result.signed_area, area * t.determinant)
+        assert_almost_equal(result.signed_area, fresh.signed_area)
+
+    def test_transform_not_simple_centroid(self):
+        poly = self.Polygon([(0,0), (1,1), (1,0), (0,1)])
+        assert poly.centroid is None
+        result = poly * self.Affine.rotation(45)
+        assert result.is_centroid_known
+        assert result.centroid is None
+
+    def test_transform_rectilinear_bounding_box(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (-1,4)])
+        poly.bounding_box
+        for t in (self.Affine.scale((2, -3)), self.Affine.rotation(90),
+            self.Affine.translation((-2, 3)) * self.Affine.rotation(270)):
+            result = poly * t
+            bbox = self.BoundingBox(list(result))
+            assert_equal(result.bounding_box.min_point, bbox.min_point)
+            assert_equal(result.bounding_box.max_point, bbox.max_point)
+        result = poly * self.Affine.rotation(30)
+        bbox = self.BoundingBox(list(result))
+        assert_equal(result.bounding_box.min_point, bbox.min_point)
+        assert_equal(result.bounding_box.max_point, bbox.max_point)
+
+    def test_transform_perimeter(self):
+        poly = self.Polygon.regular(7, 3)
+        perimeter = poly.perimeter
+        t = self.Affine.rotation(33) * self.Affine.scale(2)
+        assert_almost_equal((poly * t).perimeter, perimeter * 2)
+        t = self.Affine.scale((2, 1))
+        fresh = self.Polygon(list(poly * t))
+        assert_almost_equal((poly * t).perimeter, fresh.perimeter)
+
+    def test_transform_keeps_triangulation(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        triangles = poly.triangulate()
+        for t in (self.Affine.rotation(40), self.Affine.scale((-1, 2))):
+            result = poly * t
+            assert_equal(result.triangulate(), triangles)
+            for i in range(0, len(triangles), 3):
+                a, b, c = [result[j] for j in triangles[i:i + 3]]
+                assert_equal((b - a).cross(c - a) > 0, 
+                    result.signed_area > 0)
+
+    def test_degenerate_transform_clears_properties(self):
+        poly = self.Polygon.regular(6, 1)
+        poly.centroid
+        poly.bounding_box
+        result = poly * self.Affine.scale((1, 0))
+        assert not result.is_convex_known
+        assert not result.is_centroid_known
+        assert_equal(result.area, 0)
+
+
+class PyPolygonTestCase(PolygonBaseTestCase, unittest.TestCase):
+    from planar.vector import Vec2, Seq2
+    from planar.transform import Affine
+    from planar.box import BoundingBox
+    from planar.polygon import Polygon
+
+
+class CPolygonTestCase(PolygonBaseTestCase, unittest.TestCase):
+    from planar.c import Vec2, Seq2, Affine, BoundingBox
+    from planar.c import Polygon
+
+    def test_threaded_mutation(self):
+        # Properties computed with the GIL released while another
+        # thread mutates the polygon must not be cached
+        import threading
+        poly = self.Polygon.regular(4096, 10)
+        first = poly[0]
+        done = []
+        def mutate():
+            try:
+                for i in range(50):
+                    p = poly
+                    p[0] = (0, 0)
+                    p[0] = first
+                    p *= self.Affine.rotation(1)
+                    assert p is poly
+                poly[0] = (0, 0)
+            finally:
+                done.append(True)
+        def read():
+            while not done:
+                poly.is_convex
+                poly.is_simple
+                poly.centroid
+                poly.bounding_box
+                poly.contains_points([(0, 0), (5, 5), (20, 0)])
+        threads = [threading.Thread(target=mutate)] + [
+            threading.Thread(target=read) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = self.Polygon(poly)
+        assert not expected.is_convex
+        assert_equal(poly.is_convex, expected.is_convex)
+        assert_equal(poly.is_simple, expected.is_simple)
+        assert poly.centroid.almost_equals(expected.centroid)
+        assert_equal(poly.bounding_box, expected.bounding_box)
+        points = [(x / 2.0, y / 2.0) 
+            for x in range(-24, 25) for y in range(-24, 25)]
+        assert_equal(poly.contains_points(points), 
+            expected.contains_points(points))
+
+    def test_subinterpreters(self):
+        # Isolated sub-interpreters with their own GIL each get their
+        # own module state and types, available from Python 3.12
+        if sys.version_info < (3, 12):
+            raise unittest.SkipTest("module state shared by interpreters")
+        try:
+            import _interpreters as interpreters
+            create = lambda: interpreters.create('isolated')
+        except ImportError:
+            import _xxsubinterpreters as interpreters
+            create = lambda: interpreters.create(isolated=True)
+        import threading
+        verts = [tuple(v) for v in self.Polygon.star(500, 1, 2)]
+        expected = [tuple(v) for v in self.Polygon.convex_hull(verts)]
+        code = "\n".join([
+            "import sys",
+            "sys.path[:0] = %r" % sys.path,
+            "import planar.c",
+            "from planar.c import Polygon",
+            "planar.c._set_epsilon(0.01)",
+            "for i in range(20):",
+            "    hull = Polygon.convex_hull(%r)" % verts,
+            "    assert type(hull) is Polygon",
+            "    assert [tuple(v) for v in hull] == %r" % expected,
+        ])
+        errors = []
+        def run(interp):
+            try:
+                errors.append(interpreters.run_string(interp, code))
+            except Exception as err:
+                errors.append(err)
+        interps = [create() for i in range(4)]
+        try:
+            threads = [threading.Thread(target=run, args=(interp,))
+                for interp in interps]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            for interp in interps:
+                interpreters.destroy(interp)
+        assert_equal(errors, [None] * 4)
+        # Settings of the sub-interpreters do not leak into this one
+        from planar.c import Vec2
+        assert not Vec2(0, 0).almost_equals((0.001, 0))
+
+    def test_buffer(self):
+        poly = self.Polygon([(0,0), (1,0), (1,2), (0,1)])
+        view = memoryview(poly)
+        assert_equal(view.format, 'd')
+        assert_equal(view.shape, (4, 2))
+        assert_equal(view.strides, (16, 8))
+        assert view.readonly
+        assert_equal(array.array('d', view.tobytes()).tolist(), 
+            [0, 0, 1, 0, 1, 2, 0, 1])
+        poly[2] = (3, 4)
+        assert_equal(array.array('d', view.tobytes())[4:6].tolist(), [3, 4])
+        if sys.version_info >= (3,):
+            # Python 2 memoryviews cannot index multi-dimensional buffers
+            assert_equal(view.tolist(), [[0, 0], [1, 0], [3, 4], [0, 1]])
+            assert_equal(view[2, 0], 3)
+
+
+class PyPolygonWhiteBoxTestCase(unittest.TestCase):
+    from planar.vector import Vec2, Seq2
+    from planar.polygon import Polygon
+
+    def test_split_y_polylines_convex(self):
+        poly = self.Polygon([(-1,0), (-1,1), (-0.5,2), (0,2), 
+            (0.5,1.5), (0.5,-1), (-0.8, -0.5)])
+        assert poly._y_polylines is None
+        assert poly.is_convex
+        assert_equal(poly._y_polylines, (
+            [(-1,0.5), (-0.5,-0.8), (0,-1), (1,-1), (2,-0.5)],
+            [(-1,0.5), (1.5,0.5), (2,0), (2,-0.5)]))
+
+    def test_split_y_polylines_straight_edge(self):
+        poly = self.Polygon([(0,0), (0,3), (1,2), (1,1)], is_convex=True)
+        assert_equal(poly._y_polylines, (
+            [(0,0), (3,0)],
+            [(0,0), (1,1), (2,1), (3,0)]))
+        poly = self.Polygon([(2,0), (2,3), (1,2), (1,1)], is_convex=True)
+        assert_equal(poly._y_polylines, (
+            [(0,2), (1,1), (2,1), (3,2)],
+            [(0,2), (3,2)]))
+
+
+if numpy is not None:
+    class NpPolygonTestCase(PolygonBaseTestCase, unittest.TestCase):
+        from planar.np import Vec2, Seq2, Affine, BoundingBox
+        from planar.np import Polygon
+
+        def random_polygon(self, count, convex=False):
+            rand = numpy.random.RandomState(count)
+            angles = numpy.sort(rand.uniform(0, 2 * math.pi, count))
+            radii = 1.0 if convex else rand.uniform(0.2, 1.0, count)
+            return self.Polygon(numpy.column_stack(
+                (radii * numpy.cos(angles), radii * numpy.sin(angles))))
+
+        def test_is_Seq2_subclass(self):
+            # planar.Seq2 is the NumPy Seq2 only without the C extension
+            assert issubclass(self.Polygon, self.Seq2)
+            poly = self.Polygon([(-1,0), (-1,1), (0,0), (0, -1)])
+            assert isinstance(poly, self.Seq2)
+
+        def test_classify_matches_python(self):
+            from planar.polygon import Polygon as PyPolygon
+            polys = [self.random_polygon(n, convex) 
+                for n in (5, 100, 1000) for convex in (True, False)]
+            polys.append(self.Polygon([(0,0), (1,0), (1,0), (1,1), (0,1)]))
+            polys.append(self.Polygon([(0,0), (1,0), (2,0), (3,0)]))
+            polys.append(self.Polygon([(0,0), (1,1), (1,0), (0,1)]))
+            for poly in polys:
+                py_poly = PyPolygon(list(poly))
+                assert_equal(poly.is_convex, py_poly.is_convex)
+                for name in ('_winding', '_degenerate', '_dupe_verts', 
+                    '_y_polylines'):
+                    assert_equal(getattr(poly, name, None), 
+                        getattr(py_poly, name, None), name)
+
+        def brute_force_contains(self, poly, points):
+            """Return the points not on the polygon boundary, and whether
+            each is inside by a brute force winding number
+            """
+            v1 = numpy.array(list(poly), dtype=float)
+            v0 = numpy.roll(v1, 1, axis=0)
+            ex, ey = (v1 - v0).T
+            px = points[:, :1]
+            py = points[:, 1:]
+            side = ex * (py - v0[:, 1]) - (px - v0[:, 0]) * ey
+            up = (v0[:, 1] <= py) & (py < v1[:, 1]) & (side > 0)
+            down = (v1[:, 1] <= py) & (py < v0[:, 1]) & (side < 0)
+            winding = up.sum(axis=1) - down.sum(axis=1)
+            t = ((px - v0[:, 0]) * ex + (py - v0[:, 1]) * ey) / (ex**2 + ey**2)
+            t = t.clip(0, 1)
+            d2 = (v0[:, 0] + t * ex - px)**2 + (v0[:, 1] + t * ey - py)**2
+            off_edge = d2.min(axis=1) > 1e-12
+            return points[off_edge], (winding[off_edge] != 0).tolist()
+
+        def test_contains_points_matches_winding_number(self):
+            points = numpy.random.RandomState(1).uniform(-1.2, 1.2, (500, 2))
+            polys = [self.random_polygon(n, convex) 
+                for n in (4, 6, 20, 200) for convex in (True, False)]
+            polys.append(self.Polygon([(0.0029,-0.99999), (-0.11196,-0.99371),
+                (-0.52421,-0.85159), (-0.93909,-0.34367)]))
+            polys.append(self.Polygon([(0.00349,-0.99999), 
+                (-0.10453,-0.99452), (-0.25882,-0.96593), (-0.5,-0.86603),
+                (-0.76604,-0.64279), (-0.93969,-0.34202)]))
+            for poly in polys:
+                pts, expected = self.brute_force_contains(poly, points)
+                poly.is_convex
+                assert_equal(list(map(bool, poly.contains_points(pts))), 
+                    expected)
+                assert_equal([poly.contains_point(p) for p in pts.tolist()],
+                    expected)
+                poly.prepare()
+                assert_equal(list(map(bool, poly.contains_points(pts))), 
+                    expected)
+
+        def test_convex_hull_many_points(self):
+            from planar.polygon import _adaptive_quick_hull
+            rand = numpy.random.RandomState(2)
+            for points in (rand.uniform(-1, 1, (5000, 2)), 
+                self.random_polygon(2000, convex=True)):
+                hull = self.Polygon.convex_hull(points)
+                assert hull.is_convex
+                expected = _adaptive_quick_hull(
+                    [self.Vec2(*p) for p in numpy.asarray(points).tolist()])
+                assert_equal(sorted(hull), sorted(expected))
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+# vim: ai ts=4 sts=4 et sw=4 tw=78
+
@@ -30,26 +30,29 @@
 """2d planar geometry library for Python"""
 
 __all__ = ('TransformNotInvertibleError', 'set_epsilon', 
-    'Vec2', 'Point', 'Vec2Array', 'Seq2', 
+    'Vec2', 'Point', 'Vec2Array', 'Vec2Array32', 'Seq2', 
     'Line', 'Ray', 'LineSegment',
-    'Affine', 'BoundingBox', 'Polygon')
+    'Affine', 'BoundingBox', 'Polygon', 'RTree', 'KDTree', 
+    'find_intersections')
 
 __versioninfo__ = (0, 4, 0)
 __version__ = '.'.join(str(n) for n in __versioninfo__)
 
 try: # pragma: no cover
     # Default to C implementation
-    from planar.c import _set_epsilon, Vec2, Vec2Array, Seq2, Affine, \
-        BoundingBox, Polygon, TransformNotInvertibleError
+    from planar.c import _set_epsilon, Vec2, Vec2Array, Vec2Array32, Seq2, \
+        Affine, Line, Ray, LineSegment, BoundingBox, Polygon, RTree, KDTree, \
+        TransformNotInvertibleError, find_intersections
 
     __implementation__ = 'C'
 except ImportError: # pragma: no cover
     # Fall-back to Python implementation
-    from planar.vector import Vec2, Vec2Array, Seq2
+    from planar.vector import Vec2, Vec2Array, Vec2Array32, Seq2
     from planar.transform import Affine
-    from planar.line import Line, Ray, LineSegment
+    from planar.line import Line, Ray, LineSegment, find_intersections
     from planar.box import BoundingBox
     from planar.polygon import Polygon
+    from planar.index import RTree, KDTree
 
     class TransformNotInvertibleError(Exception):
         """The transform could not be inverted"""
@@ -57,6 +60,12 @@ except ImportError: # pragma: no cover
     def _set_epsilon(e): pass
 
     __implementation__ = 'Python'
+    try:
+        # Vectorize the Python implementation if NumPy is available
+        from planar.np import Seq2, Vec2Array, Affine, BoundingBox, Polygon
+        __implementation__ = 'NumPy'
+    except ImportError:
+        pass
 
 Point = Vec2
 """``Point`` is an alias for ``Vec2``. 
@@ -14,26 +14,29 @@
 #include "planar.h"
 
 #define BBOX_FREE_MAX 200
-static PyObject *bbox_free_list = NULL;
-static int bbox_free_size = 0;
 
 static int
 BBox_init_from_points(PlanarBBoxObject *self, PyObject *points) 
 {
-    planar_vec2_t *vec;
-    Py_ssize_t size;
-    int i;
+    planar_vec2_t *vec, *vectors;
+    Py_ssize_t size, i;
     double x, y;
+	PyThreadState *state;
 
     if (PlanarSeq2_Check(points)) {
         /* Optimized code path for Seq2 objects */
-        if (Py_SIZE(points) < 1) {
+		if (!Seq2_GetVectors((PlanarSeq2Object *)points, &vectors, &size)) {
+			return -1;
+		}
+        if (size < 1) {
+			Seq2_ReleaseVectors((PlanarSeq2Object *)points, vectors);
             goto tooShort;
         }
-        vec = ((PlanarSeq2Object *)points)->vec;
+        vec = vectors;
         self->max.x = self->min.x = vec->x;
         self->max.y = self->min.y = vec->y;
-        for (i = 1; i < Py_SIZE(points); ++i) {
+		state = Planar_BeginNoGIL(size);
+        for (i = 1; i < size; ++i) {
             ++vec;
             if (vec->x > self->max.x) {
                 self->max.x = vec->x;
@@ -46,6 +49,8 @@ BBox_init_from_points(PlanarBBoxObject *self, PyObject *points)
                 self->min.y = vec->y;
             }
         }
+		Planar_EndNoGIL(state);
+		Seq2_ReleaseVectors((PlanarSeq2Object *)points, vectors);
     } else {
         points = PySequence_Fast(points, "expected iterable of Vec2 objects");
 		if (points == NULL) {
@@ -93,44 +98,61 @@ tooShort:
 }
 
 static int
-BBox_init(PlanarBBoxObject *self, PyObject *args)
+BBox_init_array(PlanarBBoxObject *self, PyObject *const *args, 
+    Py_ssize_t nargs)
 {
     assert(PlanarBBox_Check(self));
-    if (PyTuple_GET_SIZE(args) != 1) {
+    if (nargs != 1) {
         PyErr_SetString(PyExc_TypeError, 
             "BoundingBox: wrong number of arguments");
         return -1;
     }
-    return BBox_init_from_points(self, PyTuple_GET_ITEM(args, 0));
+    return BBox_init_from_points(self, args[0]);
+}
+
+static int
+BBox_init(PlanarBBoxObject *self, PyObject *args)
+{
+    return BBox_init_array(self, 
+        &PyTuple_GET_ITEM(args, 0), PyTuple_GET_SIZE(args));
+}
+
+#if PY_VERSION_HEX >= 0x03090000
+PyObject *
+PlanarBBox_vectorcall(PyObject *type, PyObject *const *args, 
+    size_t nargsf, PyObject *kwnames)
+{
+    return Planar_VectorcallNew(&PlanarBBoxType, 
+        (planar_initarrayfunc)BBox_init_array, type, args, nargsf, kwnames);
 }
+#endif
 
 static PyObject *
 BBox_alloc(PyTypeObject *type, Py_ssize_t nitems)
 {
     PlanarBBoxObject *box;
 
-    assert(PyType_IsSubtype(type, &PlanarBBoxType));
-    if (bbox_free_list != NULL) {
-        box = (PlanarBBoxObject *)bbox_free_list;
-        Py_INCREF(box);
-        bbox_free_list = box->next_free;
-        --bbox_free_size;
-		return (PyObject *)box;
-    } else {
-        return PyType_GenericAlloc(type, nitems);
+    assert(Planar_TypeIsSubtype(type, &PlanarBBoxType));
+    if (Planar_TypeIsExact(type, &PlanarBBoxType)) {
+        box = (PlanarBBoxObject *)Planar_FreeListPop(
+            PLANAR_FREELIST(bbox, type), type);
+        if (box != NULL) {
+            return (PyObject *)box;
+        }
     }
+    return PyType_GenericAlloc(type, nitems);
 }
 
 static void
 BBox_dealloc(PlanarBBoxObject *self)
 {
-    if (PlanarBBox_CheckExact(self) && bbox_free_size < BBOX_FREE_MAX) {
-        self->next_free = bbox_free_list;
-        bbox_free_list = (PyObject *)self;
-        ++bbox_free_size;
-    } else {
-        Py_TYPE(self)->tp_free((PyObject *)self);
+    PyTypeObject *type = Py_TYPE(self);
+
+    if (!PlanarBBox_CheckExact(self) || !Planar_FreeListPush(
+        PLANAR_FREELIST(bbox, type), (PyObject *)self, BBOX_FREE_MAX)) {
+        type->tp_free((PyObject *)self);
     }
+    Planar_DECREF_TYPE(type);
 }
 
 
@@ -221,7 +243,7 @@ BBox_new_from_points(PyTypeObject *type, PyObject *points)
 {
     PlanarBBoxObject *box;
 
-    assert(PyType_IsSubtype(type, &PlanarBBoxType));
+    assert(Planar_TypeIsSubtype(type, &PlanarBBoxType));
     box = (PlanarBBoxObject *)type->tp_alloc(type, 0);
     if (box != NULL && BBox_init_from_points(box, points) == 0) {
         return box;
@@ -285,14 +307,8 @@ get_bounding_box(PyObject *shape)
 {
     PlanarBBoxObject *bbox;
 
-    static PyObject *bounding_box_str = NULL;
-    if (bounding_box_str == NULL) {
-        bounding_box_str = PyUnicode_InternFromString("bounding_box");
-		if (bounding_box_str == NULL) {
-			return NULL;
-		}
-	}
-    bbox = (PlanarBBoxObject *)PyObject_GetAttr(shape, bounding_box_str);
+    bbox = (PlanarBBoxObject *)PyObject_GetAttr(
+        shape, Planar_GetState()->bounding_box_str);
     if (bbox != NULL && !PlanarBBox_Check(bbox)) {
         PyErr_SetString(PyExc_TypeError,
             "Shape returned incompatible object "
@@ -309,7 +325,7 @@ BBox_new_from_shapes(PyTypeObject *type, PyObject *shapes)
     Py_ssize_t size;
     PyObject **item;
 
-    assert(PyType_IsSubtype(type, &PlanarBBoxType));
+    assert(Planar_TypeIsSubtype(type, &PlanarBBoxType));
     result = (PlanarBBoxObject *)type->tp_alloc(type, 0);
     shapes = PySequence_Fast(shapes, "expected iterable of bounded shapes");
     if (result == NULL || shapes == NULL) {
@@ -354,20 +370,22 @@ error:
 }
 
 static PlanarBBoxObject *
-BBox_new_from_center(PyTypeObject *type, PyObject *args, PyObject *kwargs) 
+BBox_new_from_center(PyTypeObject *type, PyObject *const *args, 
+    Py_ssize_t nargs, PyObject *kwnames) 
 {
     PlanarBBoxObject *bbox;
-    PyObject *center_arg;
+    PyObject *values[3];
     double width, height, cx, cy;
-    static char *kwlist[] = {"center", "width", "height", NULL};
+    static const char *const kwlist[] = {"center", "width", "height", NULL};
 
-    assert(PyType_IsSubtype(type, &PlanarBBoxType));
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, 
-        "Odd:BoundingBox.from_center", kwlist, 
-        &center_arg, &width, &height)) {
+    assert(Planar_TypeIsSubtype(type, &PlanarBBoxType));
+    if (!Planar_ParseKeywords("BoundingBox.from_center", args, nargs, 
+            kwnames, kwlist, 3, values)
+        || !Planar_OptionalDouble(values[1], &width)
+        || !Planar_OptionalDouble(values[2], &height)) {
         return NULL;
     }
-    if (!PlanarVec2_Parse(center_arg, &cx, &cy)) {
+    if (!PlanarVec2_Parse(values[0], &cx, &cy)) {
         PyErr_SetString(PyExc_TypeError,
             "expected Vec2 for argument center");
         return NULL;
@@ -385,6 +403,8 @@ BBox_new_from_center(PyTypeObject *type, PyObject *args, PyObject *kwargs)
     return bbox;
 }
 
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(BBox_new_from_center)
+
 static PlanarBBoxObject *
 BBox_inflate(PlanarBBoxObject *self, PyObject *amount)
 {
@@ -405,7 +425,7 @@ BBox_inflate(PlanarBBoxObject *self, PyObject *amount)
     }
     ix *= 0.5;
     iy *= 0.5;
-    bbox = (PlanarBBoxObject *)PlanarBBoxType.tp_alloc(&PlanarBBoxType, 0);
+    bbox = (PlanarBBoxObject *)Planar_Alloc(PLANAR_TYPE(BBox));
     if (bbox == NULL) {
         return NULL;
     }
@@ -451,8 +471,7 @@ BBox_fit(PlanarBBoxObject *self, PyObject *shape)
         scale = (w_ratio < h_ratio ? w_ratio : h_ratio) * 0.5;
         half_width = (bbox->max.x - bbox->min.x) * scale;
         half_height = (bbox->max.y - bbox->min.y) * scale;
-        bbox = (PlanarBBoxObject *)PlanarBBoxType.tp_alloc(
-            &PlanarBBoxType, 0);
+        bbox = (PlanarBBoxObject *)Planar_Alloc(PLANAR_TYPE(BBox));
         if (bbox != NULL) {
             bbox->min.x = cx - half_width;
             bbox->max.x = cx + half_width;
@@ -489,7 +508,7 @@ BBox_to_polygon(PlanarBBoxObject *self)
 	PlanarPolygonObject *poly;
 
     assert(PlanarBBox_Check(self));
-	poly = Poly_new(&PlanarPolygonType, 4);
+	poly = Poly_new(PLANAR_TYPE(Polygon), 4);
 	if (poly != NULL) {
 		poly->vert[0].x = self->min.x;
 		poly->vert[0].y = self->min.y;
@@ -505,14 +524,21 @@ BBox_to_polygon(PlanarBBoxObject *self)
 	return poly;
 }
 
+static PyObject *
+BBox_reduce(PlanarBBoxObject *self)
+{
+    return Py_BuildValue("(O(((dd)(dd))))", Py_TYPE(self), 
+        self->min.x, self->min.y, self->max.x, self->max.y);
+}
+
 static PyMethodDef BBox_methods[] = {
     {"from_points", (PyCFunction)BBox_new_from_points, METH_CLASS | METH_O, 
         "Create a bounding box that encloses all of the specified points."},
     {"from_shapes", (PyCFunction)BBox_new_from_shapes, METH_CLASS | METH_O, 
         "Creating a bounding box that completely encloses all of the "
         "shapes provided."},
-    {"from_center", (PyCFunction)BBox_new_from_center, 
-        METH_CLASS | METH_VARARGS | METH_KEYWORDS, 
+    {"from_center", Planar_FASTCALL_KEYWORDS(BBox_new_from_center), 
+        METH_CLASS | PLANAR_METH_FASTCALL_KEYWORDS, 
         "Create a bounding box centered at a particular point."},
     {"inflate", (PyCFunction)BBox_inflate, METH_O, 
 		"Return a new box resized from this one. The new "
@@ -530,6 +556,7 @@ static PyMethodDef BBox_methods[] = {
     {"almost_equals", (PyCFunction)BBox_almost_equals, METH_O,
         "Return True if this bounding box is approximately equal to "
         "another box, within precision limits."},
+    {"__reduce__", (PyCFunction)BBox_reduce, METH_NOARGS, NULL},
     {NULL, NULL}
 };
 
@@ -0,0 +1,1079 @@
+/***************************************************************************
+* Copyright (c) 2010 by Casey Duncan
+* All rights reserved.
+*
+* This software is subject to the provisions of the BSD License
+* A copy of the license should accompany this distribution.
+* THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+* IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+* FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+****************************************************************************/
+#include "Python.h"
+#include <math.h>
+#include <string.h>
+#include "planar.h"
+
+#define RTREE_DEFAULT_CAPACITY 16
+
+/* Get the bounding box extents of a shape, return 0 on error */
+static int
+get_shape_bounds(PyObject *shape, planar_vec2_t *min, planar_vec2_t *max)
+{
+    PlanarBBoxObject *bbox;
+
+    bbox = (PlanarBBoxObject *)PyObject_GetAttr(
+        shape, Planar_GetState()->bounding_box_str);
+	if (bbox == NULL) {
+		return 0;
+	}
+    if (!PlanarBBox_Check(bbox)) {
+        PyErr_SetString(PyExc_TypeError,
+            "Shape returned incompatible object "
+            "for attribute bounding_box.");
+        Py_DECREF(bbox);
+		return 0;
+    }
+	*min = bbox->min;
+	*max = bbox->max;
+	Py_DECREF(bbox);
+	return 1;
+}
+
+/* Sort-Tile-Recursive bulk loading */
+
+static int
+compare_node_x(const void *a, const void *b)
+{
+	const planar_rtree_node_t *na = (const planar_rtree_node_t *)a;
+	const planar_rtree_node_t *nb = (const planar_rtree_node_t *)b;
+	double ca = na->min.x + na->max.x;
+	double cb = nb->min.x + nb->max.x;
+	return (ca > cb) - (ca < cb);
+}
+
+static int
+compare_node_y(const void *a, const void *b)
+{
+	const planar_rtree_node_t *na = (const planar_rtree_node_t *)a;
+	const planar_rtree_node_t *nb = (const planar_rtree_node_t *)b;
+	double ca = na->min.y + na->max.y;
+	double cb = nb->min.y + nb->max.y;
+	return (ca > cb) - (ca < cb);
+}
+
+/* Sort and tile the nodes of a single tree level, located
+   at offset level_start in the node array. The parent nodes
+   are stored immediately after the level. Return the number
+   of parent nodes created */
+static Py_ssize_t
+RTree_pack_level(planar_rtree_node_t *nodes, Py_ssize_t level_start, 
+	Py_ssize_t size, Py_ssize_t capacity)
+{
+	planar_rtree_node_t *level = nodes + level_start;
+	planar_rtree_node_t *parent = level + size;
+	planar_rtree_node_t *child, *child_end;
+	Py_ssize_t leaf_count, slice_size, slice_len, i, j;
+
+	leaf_count = (size + capacity - 1) / capacity;
+	slice_size = (Py_ssize_t)ceil(sqrt((double)leaf_count)) * capacity;
+	qsort(level, size, sizeof(planar_rtree_node_t), compare_node_x);
+	for (i = 0; i < size; i += slice_size) {
+		slice_len = MIN(slice_size, size - i);
+		qsort(level + i, slice_len, sizeof(planar_rtree_node_t), 
+			compare_node_y);
+		for (j = i; j < i + slice_len; j += capacity) {
+			parent->first = level_start + j;
+			parent->count = MIN(capacity, i + slice_len - j);
+			parent->min = level[j].min;
+			parent->max = level[j].max;
+			child_end = level + j + parent->count;
+			for (child = level + j + 1; child < child_end; ++child) {
+				parent->min.x = MIN(parent->min.x, child->min.x);
+				parent->min.y = MIN(parent->min.y, child->min.y);
+				parent->max.x = MAX(parent->max.x, child->max.x);
+				parent->max.y = MAX(parent->max.y, child->max.y);
+			}
+			++parent;
+		}
+	}
+	return parent - (level + size);
+}
+
+static PlanarRTreeObject *
+RTree_new(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+{
+	PlanarRTreeObject *self;
+	PyObject *shapes;
+	Py_ssize_t capacity = RTREE_DEFAULT_CAPACITY;
+	Py_ssize_t size, total, level_start, level_size, i;
+
+    static char *kwlist[] = {"shapes", "node_capacity", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|n:RTree", kwlist,
+		&shapes, &capacity)) {
+		return NULL;
+	}
+	if (capacity < 2) {
+		PyErr_SetString(PyExc_ValueError, 
+			"RTree: node_capacity must be at least 2");
+		return NULL;
+	}
+	self = (PlanarRTreeObject *)type->tp_alloc(type, 0);
+	if (self == NULL) {
+		return NULL;
+	}
+	self->shapes = PySequence_Tuple(shapes);
+	if (self->shapes == NULL) {
+		goto error;
+	}
+	size = PyTuple_GET_SIZE(self->shapes);
+	total = size;
+	for (level_size = size; level_size > 1; total += level_size) {
+		level_size = (level_size + capacity - 1) / capacity;
+	}
+	self->nodes = (planar_rtree_node_t *)PyMem_Malloc(
+		sizeof(planar_rtree_node_t) * (total > 0 ? total : 1));
+	if (self->nodes == NULL) {
+		PyErr_NoMemory();
+		goto error;
+	}
+	for (i = 0; i < size; ++i) {
+		if (!get_shape_bounds(PyTuple_GET_ITEM(self->shapes, i), 
+			&self->nodes[i].min, &self->nodes[i].max)) {
+			goto error;
+		}
+		self->nodes[i].first = i;
+		self->nodes[i].count = 0;
+	}
+	level_start = 0;
+	level_size = size;
+	while (level_size > 1) {
+		i = RTree_pack_level(self->nodes, level_start, level_size, capacity);
+		level_start += level_size;
+		level_size = i;
+	}
+	assert(level_start + level_size == total);
+	self->node_count = total;
+	return self;
+
+error:
+	Py_DECREF(self);
+	return NULL;
+}
+
+static int
+RTree_traverse(PlanarRTreeObject *self, visitproc visit, void *arg)
+{
+	Planar_VISIT_TYPE(self);
+	Py_VISIT(self->shapes);
+	return 0;
+}
+
+static int
+RTree_clear(PlanarRTreeObject *self)
+{
+	Py_CLEAR(self->shapes);
+	return 0;
+}
+
+static void
+RTree_dealloc(PlanarRTreeObject *self)
+{
+	PyObject_GC_UnTrack(self);
+	Py_CLEAR(self->shapes);
+	if (self->nodes != NULL) {
+		PyMem_Free(self->nodes);
+		self->nodes = NULL;
+	}
+    Planar_FreeObject((PyObject *)self);
+}
+
+/* Queries */
+
+typedef struct {
+	Py_ssize_t *index;
+	Py_ssize_t size;
+	Py_ssize_t allocated;
+} rtree_results_t;
+
+static int
+results_append(rtree_results_t *results, Py_ssize_t index)
+{
+	Py_ssize_t *new_index;
+
+	if (results->size == results->allocated) {
+		results->allocated = results->allocated * 2 + 16;
+		new_index = (Py_ssize_t *)PyMem_Realloc(results->index,
+			sizeof(Py_ssize_t) * results->allocated);
+		if (new_index == NULL) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		results->index = new_index;
+	}
+	results->index[results->size++] = index;
+	return 0;
+}
+
+static int
+compare_index(const void *a, const void *b)
+{
+	Py_ssize_t ia = *(const Py_ssize_t *)a;
+	Py_ssize_t ib = *(const Py_ssize_t *)b;
+	return (ia > ib) - (ia < ib);
+}
+
+/* Recursively find all leaf entries intersecting the box min, max */
+static int
+RTree_search(PlanarRTreeObject *self, planar_rtree_node_t *node, 
+	planar_vec2_t *min, planar_vec2_t *max, rtree_results_t *results)
+{
+	planar_rtree_node_t *child, *child_end;
+
+	if (node->min.x > max->x || node->max.x < min->x 
+		|| node->min.y > max->y || node->max.y < min->y) {
+		return 0;
+	}
+	if (node->count == 0) {
+		return results_append(results, node->first);
+	}
+	child_end = self->nodes + node->first + node->count;
+	for (child = self->nodes + node->first; child < child_end; ++child) {
+		if (RTree_search(self, child, min, max, results) == -1) {
+			return -1;
+		}
+	}
+	return 0;
+}
+
+/* Return a list of shapes intersecting the box min, max
+   in the order they were indexed */
+static PyObject *
+RTree_search_list(PlanarRTreeObject *self, 
+	planar_vec2_t *min, planar_vec2_t *max)
+{
+	rtree_results_t results = {NULL, 0, 0};
+	PyObject *list = NULL, *shape;
+	Py_ssize_t i;
+
+	if (self->node_count > 0 && RTree_search(self, 
+		self->nodes + self->node_count - 1, min, max, &results) == -1) {
+		goto done;
+	}
+	if (results.size > 1) {
+		qsort(results.index, results.size, sizeof(Py_ssize_t), 
+			compare_index);
+	}
+	list = PyList_New(results.size);
+	if (list == NULL) {
+		goto done;
+	}
+	for (i = 0; i < results.size; ++i) {
+		shape = PyTuple_GET_ITEM(self->shapes, results.index[i]);
+		Py_INCREF(shape);
+		PyList_SET_ITEM(list, i, shape);
+	}
+done:
+	if (results.index != NULL) {
+		PyMem_Free(results.index);
+	}
+	return list;
+}
+
+static PyObject *
+RTree_query_box(PlanarRTreeObject *self, PyObject *box)
+{
+	planar_vec2_t min, max;
+
+	if (!get_shape_bounds(box, &min, &max)) {
+		return NULL;
+	}
+	return RTree_search_list(self, &min, &max);
+}
+
+static PyObject *
+RTree_query_point(PlanarRTreeObject *self, PyObject *const *args, 
+	Py_ssize_t nargs, PyObject *kwnames)
+{
+	planar_vec2_t pt;
+	PyObject *values[2], *point, *exact;
+	PyObject *found, *result, *shape, *pt_obj, *contains;
+	Py_ssize_t i;
+	int is_exact;
+
+    static const char *const kwlist[] = {"point", "exact", NULL};
+
+    if (!Planar_ParseKeywords("query_point", args, nargs, kwnames, kwlist, 
+		1, values)) {
+		return NULL;
+	}
+	point = values[0];
+	exact = values[1];
+	if (!PlanarVec2_Parse(point, &pt.x, &pt.y)) {
+		PyErr_SetString(PyExc_TypeError,
+			"RTree.query_point(): expected Vec2 object for argument");
+		return NULL;
+	}
+	is_exact = exact != NULL ? PyObject_IsTrue(exact) : 0;
+	if (is_exact == -1) {
+		return NULL;
+	}
+	found = RTree_search_list(self, &pt, &pt);
+	if (found == NULL || !is_exact) {
+		return found;
+	}
+	pt_obj = (PyObject *)PlanarVec2_FromStruct(&pt);
+	result = PyList_New(0);
+	if (pt_obj == NULL || result == NULL) {
+		goto error;
+	}
+	for (i = 0; i < PyList_GET_SIZE(found); ++i) {
+		shape = PyList_GET_ITEM(found, i);
+		contains = PyObject_CallMethod(shape, "contains_point", "O", pt_obj);
+		if (contains == NULL) {
+			goto error;
+		}
+		switch (PyObject_IsTrue(contains)) {
+			case 1:
+				if (PyList_Append(result, shape) == -1) {
+					Py_DECREF(contains);
+					goto error;
+				}
+				break;
+			case -1:
+				Py_DECREF(contains);
+				goto error;
+		}
+		Py_DECREF(contains);
+	}
+	Py_DECREF(pt_obj);
+	Py_DECREF(found);
+	return result;
+
+error:
+	Py_XDECREF(pt_obj);
+	Py_XDECREF(result);
+	Py_DECREF(found);
+	return NULL;
+}
+
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(RTree_query_point)
+
+/* Nearest neighbor search */
+
+typedef struct {
+	double dist2;
+	planar_rtree_node_t *node;
+} rtree_heap_item_t;
+
+/* Heap ordering for nearest neighbor search. Nodes are expanded before
+   leaf entries at equal distance so that shapes at equal distance are 
+   found in index order */
+static int
+heap_item_lt(rtree_heap_item_t *a, rtree_heap_item_t *b)
+{
+	if (a->dist2 != b->dist2) {
+		return a->dist2 < b->dist2;
+	}
+	if ((a->node->count == 0) != (b->node->count == 0)) {
+		return a->node->count != 0;
+	}
+	return a->node->first < b->node->first;
+}
+
+static void
+heap_push(rtree_heap_item_t *heap, Py_ssize_t *size, 
+	double dist2, planar_rtree_node_t *node)
+{
+	Py_ssize_t i = (*size)++;
+	Py_ssize_t parent;
+	rtree_heap_item_t item;
+
+	item.dist2 = dist2;
+	item.node = node;
+	while (i > 0) {
+		parent = (i - 1) / 2;
+		if (!heap_item_lt(&item, &heap[parent])) {
+			break;
+		}
+		heap[i] = heap[parent];
+		i = parent;
+	}
+	heap[i] = item;
+}
+
+static planar_rtree_node_t *
+heap_pop(rtree_heap_item_t *heap, Py_ssize_t *size)
+{
+	planar_rtree_node_t *top = heap[0].node;
+	rtree_heap_item_t last = heap[--(*size)];
+	Py_ssize_t i = 0;
+	Py_ssize_t child;
+
+	while ((child = i * 2 + 1) < *size) {
+		if (child + 1 < *size && heap_item_lt(&heap[child + 1], &heap[child])) {
+			++child;
+		}
+		if (!heap_item_lt(&heap[child], &last)) {
+			break;
+		}
+		heap[i] = heap[child];
+		i = child;
+	}
+	heap[i] = last;
+	return top;
+}
+
+static double
+node_dist2(planar_rtree_node_t *node, planar_vec2_t *pt)
+{
+	double dx = 0.0, dy = 0.0;
+
+	if (pt->x < node->min.x) {
+		dx = node->min.x - pt->x;
+	} else if (pt->x > node->max.x) {
+		dx = pt->x - node->max.x;
+	}
+	if (pt->y < node->min.y) {
+		dy = node->min.y - pt->y;
+	} else if (pt->y > node->max.y) {
+		dy = pt->y - node->max.y;
+	}
+	return dx*dx + dy*dy;
+}
+
+static PyObject *
+RTree_nearest(PlanarRTreeObject *self, PyObject *const *args, 
+	Py_ssize_t nargs, PyObject *kwnames)
+{
+	planar_vec2_t pt;
+	PyObject *values[2], *point, *result, *shape;
+	Py_ssize_t k = 1;
+	Py_ssize_t heap_size = 0;
+	rtree_heap_item_t *heap;
+	planar_rtree_node_t *node, *child, *child_end;
+
+    static const char *const kwlist[] = {"point", "k", NULL};
+
+    if (!Planar_ParseKeywords("nearest", args, nargs, kwnames, kwlist, 
+		1, values)
+		|| !Planar_OptionalSsize(values[1], &k)) {
+		return NULL;
+	}
+	point = values[0];
+	if (!PlanarVec2_Parse(point, &pt.x, &pt.y)) {
+		PyErr_SetString(PyExc_TypeError,
+			"RTree.nearest(): expected Vec2 object for argument");
+		return NULL;
+	}
+	result = PyList_New(0);
+	if (result == NULL || self->node_count == 0 || k < 1) {
+		return result;
+	}
+	/* Each node is pushed onto the heap at most once */
+	heap = (rtree_heap_item_t *)PyMem_Malloc(
+		sizeof(rtree_heap_item_t) * self->node_count);
+	if (heap == NULL) {
+		Py_DECREF(result);
+		return PyErr_NoMemory();
+	}
+	heap_push(heap, &heap_size, 0.0, self->nodes + self->node_count - 1);
+	while (heap_size > 0 && PyList_GET_SIZE(result) < k) {
+		node = heap_pop(heap, &heap_size);
+		if (node->count == 0) {
+			shape = PyTuple_GET_ITEM(self->shapes, node->first);
+			if (PyList_Append(result, shape) == -1) {
+				Py_CLEAR(result);
+				break;
+			}
+			continue;
+		}
+		child_end = self->nodes + node->first + node->count;
+		for (child = self->nodes + node->first; child < child_end; ++child) {
+			heap_push(heap, &heap_size, node_dist2(child, &pt), child);
+		}
+	}
+	PyMem_Free(heap);
+	return result;
+}
+
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(RTree_nearest)
+
+static PyMethodDef RTree_methods[] = {
+	{"query_box", (PyCFunction)RTree_query_box, METH_O,
+		"Return a list of the indexed shapes with bounding boxes that "
+		"intersect the box specified, in the order they were indexed."},
+	{"query_point", Planar_FASTCALL_KEYWORDS(RTree_query_point), 
+		PLANAR_METH_FASTCALL_KEYWORDS,
+		"Return a list of the indexed shapes with bounding boxes that "
+		"contain the point specified, in the order they were indexed. "
+		"If exact is true, only shapes that contain the point are returned."},
+	{"nearest", Planar_FASTCALL_KEYWORDS(RTree_nearest), 
+		PLANAR_METH_FASTCALL_KEYWORDS,
+		"Return a list of the k indexed shapes with bounding boxes "
+		"nearest to the point specified, ordered closest first."},
+    {NULL, NULL}
+};
+
+static Py_ssize_t
+RTree_length(PlanarRTreeObject *self)
+{
+	return PyTuple_GET_SIZE(self->shapes);
+}
+
+static PySequenceMethods RTree_as_sequence = {
+	(lenfunc)RTree_length,	/* sq_length */
+};
+
+static PyObject *
+RTree_iter(PlanarRTreeObject *self)
+{
+	return PyObject_GetIter(self->shapes);
+}
+
+static PyObject *
+RTree_repr(PlanarRTreeObject *self)
+{
+	return PyUnicode_FromFormat("RTree(<%zd shapes>)", 
+		PyTuple_GET_SIZE(self->shapes));
+}
+
+PyDoc_STRVAR(RTree_doc, 
+    "Static R-tree spatial index of bounded shapes, bulk-loaded "
+	"using the Sort-Tile-Recursive algorithm.\n\n"
+    "RTree(shapes, node_capacity=16)"
+);
+
+PyTypeObject PlanarRTreeType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "planar.RTree",       /* tp_name */
+    sizeof(PlanarRTreeObject), /* tp_basicsize */
+    0,                    /* tp_itemsize */
+    (destructor)RTree_dealloc, /* tp_dealloc */
+    0,                    /* tp_print */
+    0,                    /* tp_getattr */
+    0,                    /* tp_setattr */
+    0,                    /* reserved */
+    (reprfunc)RTree_repr, /* tp_repr */
+    0,                    /* tp_as_number */
+    &RTree_as_sequence,   /* tp_as_sequence */
+    0,                    /* tp_as_mapping */
+    0,                    /* tp_hash */
+    0,                    /* tp_call */
+    (reprfunc)RTree_repr, /* tp_str */
+    0,                    /* tp_getattro */
+    0,                    /* tp_setattro */
+    0,                    /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /* tp_flags */
+    RTree_doc,            /* tp_doc */
+    (traverseproc)RTree_traverse, /* tp_traverse */
+    (inquiry)RTree_clear, /* tp_clear */
+    0,                    /* tp_richcompare */
+    0,                    /* tp_weaklistoffset */
+    (getiterfunc)RTree_iter, /* tp_iter */
+    0,                    /* tp_iternext */
+    RTree_methods,        /* tp_methods */
+    0,                    /* tp_members */
+    0,                    /* tp_getset */
+    0,                    /* tp_base */
+    0,                    /* tp_dict */
+    0,                    /* tp_descr_get */
+    0,                    /* tp_descr_set */
+    0,                    /* tp_dictoffset */
+    0,                    /* tp_init */
+    0,                    /* tp_alloc */
+    (newfunc)RTree_new,   /* tp_new */
+    0,                    /* tp_free */
+};
+
+
+/***************************************************************************/
+
+/* KDTree */
+
+#define KD_COORD(node, axis) ((axis) ? (node)->pt.y : (node)->pt.x)
+
+/* Partially order the nodes in the range [lo, hi) along the axis so
+   that the node at nth is the one that would be there if the range were
+   sorted, with no greater nodes before it, and no lesser nodes after */
+static void
+KDTree_select(planar_kdtree_node_t *nodes, Py_ssize_t lo, Py_ssize_t hi,
+	Py_ssize_t nth, int axis)
+{
+	planar_kdtree_node_t tmp;
+	Py_ssize_t lt, gt, i;
+	double pivot, c;
+
+	while (hi - lo > 1) {
+		pivot = KD_COORD(nodes + lo + (hi - lo) / 2, axis);
+		/* Three-way partition, so duplicate coordinates 
+		   don't degrade performance */
+		lt = i = lo;
+		gt = hi;
+		while (i < gt) {
+			c = KD_COORD(nodes + i, axis);
+			if (c < pivot) {
+				tmp = nodes[lt]; nodes[lt++] = nodes[i]; nodes[i++] = tmp;
+			} else if (c > pivot) {
+				tmp = nodes[--gt]; nodes[gt] = nodes[i]; nodes[i] = tmp;
+			} else {
+				++i;
+			}
+		}
+		if (nth < lt) {
+			hi = lt;
+		} else if (nth >= gt) {
+			lo = gt;
+		} else {
+			return;
+		}
+	}
+}
+
+static void
+KDTree_build(planar_kdtree_node_t *nodes, Py_ssize_t lo, Py_ssize_t hi,
+	int axis)
+{
+	Py_ssize_t mid;
+
+	while (hi - lo > 1) {
+		mid = lo + (hi - lo) / 2;
+		KDTree_select(nodes, lo, hi, mid, axis);
+		KDTree_build(nodes, lo, mid, !axis);
+		lo = mid + 1;
+		axis = !axis;
+	}
+}
+
+static PlanarKDTreeObject *
+KDTree_new(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+{
+	PlanarKDTreeObject *self;
+	PlanarSeq2Object *seq;
+	PyObject *points;
+	Py_ssize_t i;
+
+    static char *kwlist[] = {"points", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O:KDTree", kwlist,
+		&points)) {
+		return NULL;
+	}
+	seq = Seq2_FromPoints(points);
+	if (seq == NULL) {
+		return NULL;
+	}
+	self = (PlanarKDTreeObject *)type->tp_alloc(type, 0);
+	if (self == NULL) {
+		Py_DECREF(seq);
+		return NULL;
+	}
+	self->size = Py_SIZE(seq);
+	self->nodes = (planar_kdtree_node_t *)PyMem_Malloc(
+		sizeof(planar_kdtree_node_t) * (self->size > 0 ? self->size : 1));
+	if (self->nodes == NULL) {
+		Py_DECREF(seq);
+		Py_DECREF(self);
+		return (PlanarKDTreeObject *)PyErr_NoMemory();
+	}
+	for (i = 0; i < self->size; ++i) {
+		self->nodes[i].pt = seq->vec[i];
+		self->nodes[i].index = i;
+	}
+	Py_DECREF(seq);
+	KDTree_build(self->nodes, 0, self->size, 0);
+	return self;
+}
+
+static void
+KDTree_dealloc(PlanarKDTreeObject *self)
+{
+	if (self->nodes != NULL) {
+		PyMem_Free(self->nodes);
+		self->nodes = NULL;
+	}
+    Planar_FreeObject((PyObject *)self);
+}
+
+/* Nearest neighbor search */
+
+typedef struct {
+	double dist2;
+	Py_ssize_t index;
+} kdtree_heap_item_t;
+
+#define KD_ITEM_LT(a, b) ((a)->dist2 < (b)->dist2 \
+	|| ((a)->dist2 == (b)->dist2 && (a)->index < (b)->index))
+
+typedef struct {
+	kdtree_heap_item_t *items;
+	Py_ssize_t size;
+	Py_ssize_t k;
+} kdtree_heap_t;
+
+/* Add an item to the max-heap of the k nearest points found so far, 
+   replacing the farthest item if the heap is full */
+static void
+kdtree_heap_add(kdtree_heap_t *heap, double dist2, Py_ssize_t index)
+{
+	kdtree_heap_item_t item, *items = heap->items;
+	Py_ssize_t i, child;
+
+	item.dist2 = dist2;
+	item.index = index;
+	if (heap->size < heap->k) {
+		i = heap->size++;
+		while (i > 0 && KD_ITEM_LT(&items[(i - 1) / 2], &item)) {
+			items[i] = items[(i - 1) / 2];
+			i = (i - 1) / 2;
+		}
+		items[i] = item;
+	} else if (KD_ITEM_LT(&item, &items[0])) {
+		i = 0;
+		while ((child = i * 2 + 1) < heap->size) {
+			if (child + 1 < heap->size 
+				&& KD_ITEM_LT(&items[child], &items[child + 1])) {
+				++child;
+			}
+			if (!KD_ITEM_LT(&item, &items[child])) {
+				break;
+			}
+			items[i] = items[child];
+			i = child;
+		}
+		items[i] = item;
+	}
+}
+
+static int
+compare_heap_items(const void *a, const void *b)
+{
+	const kdtree_heap_item_t *ia = (const kdtree_heap_item_t *)a;
+	const kdtree_heap_item_t *ib = (const kdtree_heap_item_t *)b;
+	return KD_ITEM_LT(ia, ib) ? -1 : KD_ITEM_LT(ib, ia);
+}
+
+static void
+KDTree_search_nearest(planar_kdtree_node_t *nodes, Py_ssize_t lo, 
+	Py_ssize_t hi, int axis, const planar_vec2_t *pt, kdtree_heap_t *heap)
+{
+	planar_kdtree_node_t *node;
+	Py_ssize_t mid;
+	double dx, dy, diff;
+
+	while (lo < hi) {
+		mid = lo + (hi - lo) / 2;
+		node = nodes + mid;
+		dx = pt->x - node->pt.x;
+		dy = pt->y - node->pt.y;
+		kdtree_heap_add(heap, dx*dx + dy*dy, node->index);
+		diff = axis ? dy : dx;
+		if (diff < 0.0) {
+			KDTree_search_nearest(nodes, lo, mid, !axis, pt, heap);
+			lo = mid + 1;
+		} else {
+			KDTree_search_nearest(nodes, mid + 1, hi, !axis, pt, heap);
+			hi = mid;
+		}
+		if (heap->size == heap->k && diff*diff > heap->items[0].dist2) {
+			return;
+		}
+		axis = !axis;
+	}
+}
+
+static PyObject *
+KDTree_nearest(PlanarKDTreeObject *self, PyObject *const *args, 
+	Py_ssize_t nargs, PyObject *kwnames)
+{
+	planar_vec2_t pt;
+	PyObject *values[2], *point, *result, *index;
+	kdtree_heap_t heap;
+	Py_ssize_t k = 1;
+	Py_ssize_t i;
+
+    static const char *const kwlist[] = {"point", "k", NULL};
+
+    if (!Planar_ParseKeywords("nearest", args, nargs, kwnames, kwlist, 
+		1, values)
+		|| !Planar_OptionalSsize(values[1], &k)) {
+		return NULL;
+	}
+	point = values[0];
+	if (!PlanarVec2_Parse(point, &pt.x, &pt.y)) {
+		PyErr_SetString(PyExc_TypeError,
+			"KDTree.nearest(): expected Vec2 object for argument");
+		return NULL;
+	}
+	heap.k = MIN(k, self->size);
+	if (heap.k < 1) {
+		return PyList_New(0);
+	}
+	heap.size = 0;
+	heap.items = (kdtree_heap_item_t *)PyMem_Malloc(
+		sizeof(kdtree_heap_item_t) * heap.k);
+	if (heap.items == NULL) {
+		return PyErr_NoMemory();
+	}
+	KDTree_search_nearest(self->nodes, 0, self->size, 0, &pt, &heap);
+	qsort(heap.items, heap.size, sizeof(kdtree_heap_item_t), 
+		compare_heap_items);
+	result = PyList_New(heap.size);
+	if (result != NULL) {
+		for (i = 0; i < heap.size; ++i) {
+			index = PyLong_FromSsize_t(heap.items[i].index);
+			if (index == NULL) {
+				Py_CLEAR(result);
+				break;
+			}
+			PyList_SET_ITEM(result, i, index);
+		}
+	}
+	PyMem_Free(heap.items);
+	return result;
+}
+
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(KDTree_nearest)
+
+static PyObject *
+KDTree_nearest_each(PlanarKDTreeObject *self, PyObject *points)
+{
+	PlanarSeq2Object *seq;
+	PyObject *result, *index;
+	kdtree_heap_item_t item;
+	kdtree_heap_t heap;
+	Py_ssize_t i;
+
+	seq = Seq2_FromPoints(points);
+	if (seq == NULL) {
+		return NULL;
+	}
+	result = PyList_New(Py_SIZE(seq));
+	if (result == NULL) {
+		Py_DECREF(seq);
+		return NULL;
+	}
+	heap.items = &item;
+	heap.k = 1;
+	for (i = 0; i < Py_SIZE(seq); ++i) {
+		if (self->size > 0) {
+			heap.size = 0;
+			KDTree_search_nearest(self->nodes, 0, self->size, 0, 
+				seq->vec + i, &heap);
+			index = PyLong_FromSsize_t(item.index);
+			if (index == NULL) {
+				Py_DECREF(result);
+				Py_DECREF(seq);
+				return NULL;
+			}
+		} else {
+			Py_INCREF(Py_None);
+			index = Py_None;
+		}
+		PyList_SET_ITEM(result, i, index);
+	}
+	Py_DECREF(seq);
+	return result;
+}
+
+/* Radius search */
+
+static int
+KDTree_search_radius(planar_kdtree_node_t *nodes, Py_ssize_t lo, 
+	Py_ssize_t hi, int axis, const planar_vec2_t *pt, double radius, 
+	rtree_results_t *results)
+{
+	planar_kdtree_node_t *node;
+	Py_ssize_t mid;
+	double dx, dy, diff;
+
+	while (lo < hi) {
+		mid = lo + (hi - lo) / 2;
+		node = nodes + mid;
+		dx = pt->x - node->pt.x;
+		dy = pt->y - node->pt.y;
+		if (dx*dx + dy*dy <= radius*radius 
+			&& results_append(results, node->index) == -1) {
+			return -1;
+		}
+		diff = axis ? dy : dx;
+		if (diff <= radius && diff >= -radius) {
+			if (KDTree_search_radius(
+				nodes, lo, mid, !axis, pt, radius, results) == -1) {
+				return -1;
+			}
+			lo = mid + 1;
+		} else if (diff < 0.0) {
+			hi = mid;
+		} else {
+			lo = mid + 1;
+		}
+		axis = !axis;
+	}
+	return 0;
+}
+
+static PyObject *
+KDTree_within_distance(PlanarKDTreeObject *self, PyObject *const *args,
+	Py_ssize_t nargs)
+{
+	planar_vec2_t pt;
+	PyObject *result = NULL, *index;
+	rtree_results_t results = {NULL, 0, 0};
+	double radius;
+	Py_ssize_t i;
+
+	if (!Planar_CheckArgCount("within_distance", nargs, 2)) {
+		return NULL;
+	}
+	radius = PyFloat_AsDouble(args[1]);
+	if (radius == -1.0 && PyErr_Occurred()) {
+		return NULL;
+	}
+	if (!PlanarVec2_Parse(args[0], &pt.x, &pt.y)) {
+		PyErr_SetString(PyExc_TypeError,
+			"KDTree.within_distance(): expected Vec2 object for argument");
+		return NULL;
+	}
+	if (radius >= 0.0 && KDTree_search_radius(self->nodes, 0, self->size, 
+		0, &pt, radius, &results) == -1) {
+		goto done;
+	}
+	if (results.size > 1) {
+		qsort(results.index, results.size, sizeof(Py_ssize_t), 
+			compare_index);
+	}
+	result = PyList_New(results.size);
+	if (result == NULL) {
+		goto done;
+	}
+	for (i = 0; i < results.size; ++i) {
+		index = PyLong_FromSsize_t(results.index[i]);
+		if (index == NULL) {
+			Py_CLEAR(result);
+			goto done;
+		}
+		PyList_SET_ITEM(result, i, index);
+	}
+done:
+	if (results.index != NULL) {
+		PyMem_Free(results.index);
+	}
+	return result;
+}
+
+Planar_DEFINE_FASTCALL_COMPAT(KDTree_within_distance)
+
+static PyMethodDef KDTree_methods[] = {
+	{"nearest", Planar_FASTCALL_KEYWORDS(KDTree_nearest), 
+		PLANAR_METH_FASTCALL_KEYWORDS,
+		"Return a list of the indices of the k points nearest to the "
+		"point specified, ordered closest first."},
+	{"nearest_each", (PyCFunction)KDTree_nearest_each, METH_O,
+		"Return a list of the index of the point nearest to each "
+		"of the query points specified."},
+	{"within_distance", Planar_FASTCALL(KDTree_within_distance), 
+		PLANAR_METH_FASTCALL,
+		"Return a list of the indices of the points within the distance "
+		"specified of the query point, in index order."},
+    {NULL, NULL}
+};
+
+static PyObject *
+KDTree_get_points(PlanarKDTreeObject *self)
+{
+	PlanarSeq2Object *points;
+	Py_ssize_t i;
+
+	points = Seq2_New(PLANAR_TYPE(Vec2Array), self->size);
+	if (points != NULL) {
+		for (i = 0; i < self->size; ++i) {
+			points->vec[self->nodes[i].index] = self->nodes[i].pt;
+		}
+	}
+	return (PyObject *)points;
+}
+
+static PyGetSetDef KDTree_getset[] = {
+    {"points", (getter)KDTree_get_points, NULL, 
+		"The indexed points, in their original order, as a Vec2Array.", NULL},
+    {NULL}
+};
+
+static Py_ssize_t
+KDTree_length(PlanarKDTreeObject *self)
+{
+	return self->size;
+}
+
+static PySequenceMethods KDTree_as_sequence = {
+	(lenfunc)KDTree_length,	/* sq_length */
+};
+
+static PyObject *
+KDTree_iter(PlanarKDTreeObject *self)
+{
+	PyObject *points, *iter;
+
+	points = KDTree_get_points(self);
+	if (points == NULL) {
+		return NULL;
+	}
+	iter = PyObject_GetIter(points);
+	Py_DECREF(points);
+	return iter;
+}
+
+static PyObject *
+KDTree_repr(PlanarKDTreeObject *self)
+{
+	return PyUnicode_FromFormat("KDTree(<%zd points>)", self->size);
+}
+
+PyDoc_STRVAR(KDTree_doc, 
+    "Static 2-d tree spatial index of points, balanced by splitting "
+	"at the median.\n\n"
+    "KDTree(points)"
+);
+
+PyTypeObject PlanarKDTreeType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "planar.KDTree",      /* tp_name */
+    sizeof(PlanarKDTreeObject), /* tp_basicsize */
+    0,                    /* tp_itemsize */
+    (destructor)KDTree_dealloc, /* tp_dealloc */
+    0,                    /* tp_print */
+    0,                    /* tp_getattr */
+    0,                    /* tp_setattr */
+    0,                    /* reserved */
+    (reprfunc)KDTree_repr, /* tp_repr */
+    0,                    /* tp_as_number */
+    &KDTree_as_sequence,  /* tp_as_sequence */
+    0,                    /* tp_as_mapping */
+    0,                    /* tp_hash */
+    0,                    /* tp_call */
+    (reprfunc)KDTree_repr, /* tp_str */
+    0,                    /* tp_getattro */
+    0,                    /* tp_setattro */
+    0,                    /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
+    KDTree_doc,           /* tp_doc */
+    0,                    /* tp_traverse */
+    0,                    /* tp_clear */
+    0,                    /* tp_richcompare */
+    0,                    /* tp_weaklistoffset */
+    (getiterfunc)KDTree_iter, /* tp_iter */
+    0,                    /* tp_iternext */
+    KDTree_methods,       /* tp_methods */
+    0,                    /* tp_members */
+    KDTree_getset,        /* tp_getset */
+    0,                    /* tp_base */
+    0,                    /* tp_dict */
+    0,                    /* tp_descr_get */
+    0,                    /* tp_descr_set */
+    0,                    /* tp_dictoffset */
+    0,                    /* tp_init */
+    0,                    /* tp_alloc */
+    (newfunc)KDTree_new,  /* tp_new */
+    0,                    /* tp_free */
+};
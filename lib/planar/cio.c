@@ -0,0 +1,744 @@
+/***************************************************************************
+* Copyright (c) 2010 by Casey Duncan
+* All rights reserved.
+*
+* This software is subject to the provisions of the BSD License
+* A copy of the license should accompany this distribution.
+* THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+* IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+* FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+****************************************************************************/
+#include "Python.h"
+#include <string.h>
+#include "planar.h"
+
+/* Well-known binary (WKB) geometry codec */
+
+#define WKB_POINT 1
+#define WKB_LINESTRING 2
+#define WKB_POLYGON 3
+#define WKB_MULTIPOINT 4
+#define WKB_MULTILINESTRING 5
+#define WKB_MULTIPOLYGON 6
+#define WKB_GEOMETRYCOLLECTION 7
+
+/* EWKB type flags, as written by PostGIS */
+#define EWKB_Z_FLAG 0x80000000UL
+#define EWKB_M_FLAG 0x40000000UL
+#define EWKB_SRID_FLAG 0x20000000UL
+#define EWKB_FLAGS_MASK 0xf0000000UL
+
+#define WKB_HEADER_SIZE 5
+#define WKB_UINT32_MAX 0xffffffffUL
+
+typedef struct {
+	const unsigned char *buf;
+	Py_ssize_t len;
+	Py_ssize_t pos;
+} planar_wkb_reader_t;
+
+static int
+wkb_host_is_little_endian(void)
+{
+	const unsigned int one = 1;
+	return *(const unsigned char *)&one;
+}
+
+static int
+wkb_truncated(void)
+{
+	PyErr_SetString(PyExc_ValueError, "from_wkb: truncated data");
+	return 0;
+}
+
+static int
+wkb_read_uint32(planar_wkb_reader_t *r, int little, unsigned long *value)
+{
+	const unsigned char *p;
+
+	if (r->len - r->pos < 4) {
+		return wkb_truncated();
+	}
+	p = r->buf + r->pos;
+	if (little) {
+		*value = (unsigned long)p[0] | ((unsigned long)p[1] << 8)
+			| ((unsigned long)p[2] << 16) | ((unsigned long)p[3] << 24);
+	} else {
+		*value = (unsigned long)p[3] | ((unsigned long)p[2] << 8)
+			| ((unsigned long)p[1] << 16) | ((unsigned long)p[0] << 24);
+	}
+	r->pos += 4;
+	return 1;
+}
+
+/* Check that count points of dims coordinates remain to be read */
+static int
+wkb_check_points(planar_wkb_reader_t *r, int dims, unsigned long count)
+{
+	if (count > (unsigned long)((r->len - r->pos) / (dims * sizeof(double)))) {
+		return wkb_truncated();
+	}
+	return 1;
+}
+
+static double
+wkb_get_double(const unsigned char *p, int swap)
+{
+	union {
+		double d;
+		unsigned char b[sizeof(double)];
+	} u;
+	int i;
+
+	if (swap) {
+		for (i = 0; i < (int)sizeof(double); ++i) {
+			u.b[i] = p[sizeof(double) - 1 - i];
+		}
+	} else {
+		memcpy(u.b, p, sizeof(double));
+	}
+	return u.d;
+}
+
+/* Copy count points from packed coordinates of dims doubles,
+   keeping only x and y. The caller must check that the points
+   are present with wkb_check_points() */
+static void
+wkb_copy_points(const unsigned char *p, int little, int dims, 
+	Py_ssize_t count, planar_vec2_t *vec)
+{
+	const Py_ssize_t stride = dims * sizeof(double);
+	const int swap = little != wkb_host_is_little_endian();
+	Py_ssize_t i;
+
+	if (!swap && dims == 2) {
+		memcpy(vec, p, count * sizeof(planar_vec2_t));
+		return;
+	}
+	for (i = 0; i < count; ++i, p += stride) {
+		vec[i].x = wkb_get_double(p, swap);
+		vec[i].y = wkb_get_double(p + sizeof(double), swap);
+	}
+}
+
+/* Read a geometry header, returning the geometry type, or -1 on error.
+   The byte order of the geometry and the number of coordinates
+   per point are stored in little and dims */
+static int
+wkb_read_header(planar_wkb_reader_t *r, int *little, int *dims)
+{
+	unsigned long type_code, geom_type, iso_dims;
+
+	if (r->pos >= r->len) {
+		wkb_truncated();
+		return -1;
+	}
+	*little = r->buf[r->pos];
+	if (*little > 1) {
+		PyErr_Format(PyExc_ValueError,
+			"from_wkb: invalid byte order %d at byte %d",
+			*little, (int)r->pos);
+		return -1;
+	}
+	r->pos++;
+	if (!wkb_read_uint32(r, *little, &type_code)) {
+		return -1;
+	}
+	*dims = 2;
+	if (type_code & EWKB_SRID_FLAG) {
+		if (r->len - r->pos < 4) {
+			wkb_truncated();
+			return -1;
+		}
+		r->pos += 4;
+	}
+	if (type_code & EWKB_Z_FLAG) {
+		++*dims;
+	}
+	if (type_code & EWKB_M_FLAG) {
+		++*dims;
+	}
+	iso_dims = (type_code & ~EWKB_FLAGS_MASK) / 1000;
+	geom_type = (type_code & ~EWKB_FLAGS_MASK) % 1000;
+	if (iso_dims == 3) {
+		*dims += 2;
+	} else if (iso_dims) {
+		++*dims;
+	}
+	if (iso_dims > 3 || geom_type < WKB_POINT 
+		|| geom_type > WKB_GEOMETRYCOLLECTION) {
+		PyErr_Format(PyExc_ValueError,
+			"from_wkb: unsupported geometry type %lu", type_code);
+		return -1;
+	}
+	return (int)geom_type;
+}
+
+static PyObject *
+wkb_decode_linestring(planar_wkb_reader_t *r, int little, int dims)
+{
+	PlanarSeq2Object *line;
+	unsigned long count;
+
+	if (!wkb_read_uint32(r, little, &count)
+		|| !wkb_check_points(r, dims, count)) {
+		return NULL;
+	}
+	line = Seq2_New(PLANAR_TYPE(Vec2Array), count);
+	if (line == NULL) {
+		return NULL;
+	}
+	wkb_copy_points(r->buf + r->pos, little, dims, count, line->vec);
+	r->pos += count * dims * sizeof(double);
+	return (PyObject *)line;
+}
+
+static PyObject *
+wkb_decode_ring(planar_wkb_reader_t *r, int little, int dims)
+{
+	PlanarPolygonObject *poly;
+	const unsigned char *p;
+	unsigned long count, size;
+	planar_vec2_t first, last;
+
+	if (!wkb_read_uint32(r, little, &count)
+		|| !wkb_check_points(r, dims, count)) {
+		return NULL;
+	}
+	p = r->buf + r->pos;
+	size = count;
+	if (count > 1) {
+		/* Omit the closing vertex */
+		wkb_copy_points(p, little, dims, 1, &first);
+		wkb_copy_points(p + (count - 1) * dims * sizeof(double), 
+			little, dims, 1, &last);
+		if (VEC_EQ(&first, &last)) {
+			--size;
+		}
+	}
+	poly = Poly_new(PLANAR_TYPE(Polygon), size);
+	if (poly == NULL) {
+		return NULL;
+	}
+	wkb_copy_points(p, little, dims, size, poly->vert);
+	if (size == 3) {
+		poly->flags = (POLY_CONVEX_FLAG | POLY_CONVEX_KNOWN_FLAG 
+			| POLY_SIMPLE_FLAG | POLY_SIMPLE_KNOWN_FLAG);
+	}
+	r->pos += count * dims * sizeof(double);
+	return (PyObject *)poly;
+}
+
+static PyObject *wkb_decode(planar_wkb_reader_t *r);
+
+/* Return the planar.wkb.PolygonWithHoles type, importing it on first use */
+static PyTypeObject *
+wkb_holed_polygon_type(void)
+{
+	planar_state *state = Planar_GetState();
+	PyObject *module, *type;
+
+	if (state->holed_polygon_type == NULL) {
+		module = PyImport_ImportModule("planar.wkb");
+		if (module == NULL) {
+			return NULL;
+		}
+		type = PyObject_GetAttrString(module, "PolygonWithHoles");
+		Py_DECREF(module);
+		if (type == NULL) {
+			return NULL;
+		}
+		if (!PyType_Check(type)) {
+			PyErr_SetString(PyExc_TypeError, 
+				"planar.wkb.PolygonWithHoles is not a type");
+			Py_DECREF(type);
+			return NULL;
+		}
+		state->holed_polygon_type = type;
+	}
+	return (PyTypeObject *)state->holed_polygon_type;
+}
+
+static PyObject *
+wkb_decode_parts(planar_wkb_reader_t *r, int little, int geom_type, int dims)
+{
+	PyObject *parts, *part;
+	unsigned long count, i;
+
+	if (!wkb_read_uint32(r, little, &count)) {
+		return NULL;
+	}
+	/* Sanity check the count before allocating the list. Each ring
+	   takes at least 4 bytes, and each part at least 5 */
+	if (count > (unsigned long)((r->len - r->pos) 
+		/ (geom_type == WKB_POLYGON ? 4 : 5))) {
+		wkb_truncated();
+		return NULL;
+	}
+	parts = PyList_New(count);
+	if (parts == NULL) {
+		return NULL;
+	}
+	for (i = 0; i < count; ++i) {
+		if (geom_type == WKB_POLYGON) {
+			part = wkb_decode_ring(r, little, dims);
+		} else {
+			part = wkb_decode(r);
+		}
+		if (part == NULL) {
+			Py_DECREF(parts);
+			return NULL;
+		}
+		PyList_SET_ITEM(parts, i, part);
+	}
+	return parts;
+}
+
+/* Return the polygon for a list of decoded rings, which is consumed.
+   Polygons without holes are returned directly */
+static PyObject *
+wkb_polygon_from_rings(PyObject *rings)
+{
+	PyTypeObject *holed_type;
+	PyObject *holes, *result;
+
+	if (PyList_GET_SIZE(rings) == 1) {
+		result = PyList_GET_ITEM(rings, 0);
+		Py_INCREF(result);
+		Py_DECREF(rings);
+		return result;
+	}
+	holed_type = wkb_holed_polygon_type();
+	holes = PyList_GetSlice(rings, 1, PyList_GET_SIZE(rings));
+	result = NULL;
+	if (holed_type != NULL && holes != NULL) {
+		result = PyObject_CallFunctionObjArgs((PyObject *)holed_type,
+			PyList_GET_ITEM(rings, 0), holes, NULL);
+	}
+	Py_XDECREF(holes);
+	Py_DECREF(rings);
+	return result;
+}
+
+/* Decode the geometry at the current reader position */
+static PyObject *
+wkb_decode(planar_wkb_reader_t *r)
+{
+	PyObject *result;
+	planar_vec2_t point;
+	int geom_type, little, dims;
+
+	geom_type = wkb_read_header(r, &little, &dims);
+	switch (geom_type) {
+		case -1:
+			return NULL;
+		case WKB_POINT:
+			if (!wkb_check_points(r, dims, 1)) {
+				return NULL;
+			}
+			wkb_copy_points(r->buf + r->pos, little, dims, 1, &point);
+			r->pos += dims * sizeof(double);
+			return (PyObject *)PlanarVec2_FromStruct(&point);
+		case WKB_LINESTRING:
+			return wkb_decode_linestring(r, little, dims);
+		case WKB_POLYGON:
+			result = wkb_decode_parts(r, little, geom_type, dims);
+			if (result == NULL) {
+				return NULL;
+			}
+			if (PyList_GET_SIZE(result) == 0) {
+				Py_DECREF(result);
+				PyErr_SetString(PyExc_ValueError,
+					"from_wkb: empty polygons are not supported");
+				return NULL;
+			}
+			return wkb_polygon_from_rings(result);
+		default:
+			if (Py_EnterRecursiveCall(" while decoding WKB")) {
+				return NULL;
+			}
+			result = wkb_decode_parts(r, little, geom_type, dims);
+			Py_LeaveRecursiveCall();
+			return result;
+	}
+}
+
+PyObject *
+Planar_from_wkb(PyObject *module, PyObject *data)
+{
+	planar_wkb_reader_t reader;
+	PyObject *result;
+	Py_buffer view;
+
+	if (PyObject_GetBuffer(data, &view, PyBUF_SIMPLE) == -1) {
+		return NULL;
+	}
+	reader.buf = (const unsigned char *)view.buf;
+	reader.len = view.len;
+	reader.pos = 0;
+	result = wkb_decode(&reader);
+	if (result != NULL && reader.pos != reader.len) {
+		PyErr_Format(PyExc_ValueError,
+			"from_wkb: unexpected data after geometry at byte %d", 
+			(int)reader.pos);
+		Py_CLEAR(result);
+	}
+	PyBuffer_Release(&view);
+	return result;
+}
+
+/* WKB record iterator */
+
+typedef struct {
+	PyObject_HEAD
+	Py_buffer view;
+	planar_wkb_reader_t reader;
+} PlanarWKBIterObject;
+
+PyObject *
+Planar_iter_wkb(PyObject *module, PyObject *data)
+{
+	PlanarWKBIterObject *iter;
+
+	iter = PyObject_New(PlanarWKBIterObject, PLANAR_TYPE(WKBIter));
+	if (iter == NULL) {
+		return NULL;
+	}
+	if (PyObject_GetBuffer(data, &iter->view, PyBUF_SIMPLE) == -1) {
+		iter->view.obj = NULL;
+		Py_DECREF(iter);
+		return NULL;
+	}
+	iter->reader.buf = (const unsigned char *)iter->view.buf;
+	iter->reader.len = iter->view.len;
+	iter->reader.pos = 0;
+	return (PyObject *)iter;
+}
+
+static void
+WKBIter_release(PlanarWKBIterObject *self)
+{
+	if (self->view.obj != NULL) {
+		PyBuffer_Release(&self->view);
+		self->view.obj = NULL;
+	}
+	self->reader.buf = NULL;
+	self->reader.len = self->reader.pos = 0;
+}
+
+static void
+WKBIter_dealloc(PlanarWKBIterObject *self)
+{
+	WKBIter_release(self);
+	Planar_FreeObject((PyObject *)self);
+}
+
+static PyObject *
+WKBIter_next(PlanarWKBIterObject *self)
+{
+	PyObject *result;
+
+	if (self->reader.pos >= self->reader.len) {
+		/* Release the data as soon as we are done with it */
+		WKBIter_release(self);
+		return NULL;
+	}
+	result = wkb_decode(&self->reader);
+	if (result == NULL) {
+		WKBIter_release(self);
+	}
+	return result;
+}
+
+PyTypeObject PlanarWKBIterType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "planar.WKBIterator", /* tp_name */
+    sizeof(PlanarWKBIterObject), /* tp_basicsize */
+    0,                    /* tp_itemsize */
+    (destructor)WKBIter_dealloc, /* tp_dealloc */
+    0,                    /* tp_print */
+    0,                    /* tp_getattr */
+    0,                    /* tp_setattr */
+    0,                    /* reserved */
+    0,                    /* tp_repr */
+    0,                    /* tp_as_number */
+    0,                    /* tp_as_sequence */
+    0,                    /* tp_as_mapping */
+    0,                    /* tp_hash */
+    0,                    /* tp_call */
+    0,                    /* tp_str */
+    0,                    /* tp_getattro */
+    0,                    /* tp_setattro */
+    0,                    /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT,   /* tp_flags */
+    "Iterator of geometries decoded from WKB records", /* tp_doc */
+    0,                    /* tp_traverse */
+    0,                    /* tp_clear */
+    0,                    /* tp_richcompare */
+    0,                    /* tp_weaklistoffset */
+    PyObject_SelfIter,    /* tp_iter */
+    (iternextfunc)WKBIter_next, /* tp_iternext */
+};
+
+/* Encoding */
+
+/* Return true if the object is a polygon with holes. The type is always
+   loaded by wkb_geometry_type() before the geometry is sized or written */
+static int
+wkb_is_holed_polygon(PyObject *geom)
+{
+	planar_state *state = Planar_GetState();
+
+	return (PyTuple_Check(geom) && !PyTuple_CheckExact(geom)
+		&& state->holed_polygon_type != NULL 
+		&& PyObject_TypeCheck(geom, 
+			(PyTypeObject *)state->holed_polygon_type));
+}
+
+/* Return the WKB geometry type used to encode an object, 
+   or -1 if it cannot be encoded */
+static int
+wkb_geometry_type(PyObject *geom)
+{
+	PyObject *part;
+	Py_ssize_t i, size;
+	int geom_type, part_type, common_type = 0;
+
+	if (PyTuple_Check(geom) && !PyTuple_CheckExact(geom)
+		&& wkb_holed_polygon_type() == NULL) {
+		return -1;
+	}
+	if (PlanarVec2_Check(geom)) {
+		return WKB_POINT;
+	} else if (PlanarPolygon_Check(geom)) {
+		return WKB_POLYGON;
+	} else if (wkb_is_holed_polygon(geom)) {
+		size = PyTuple_GET_SIZE(geom);
+		for (i = 0; i < size; ++i) {
+			if (!PlanarPolygon_Check(PyTuple_GET_ITEM(geom, i))) {
+				PyErr_SetString(PyExc_TypeError,
+					"to_wkb: polygon rings must be Polygon objects");
+				return -1;
+			}
+		}
+		return WKB_POLYGON;
+	} else if (PlanarSeq2_Check(geom) || PlanarVec2Array32_Check(geom)
+		|| PlanarSegment_Check(geom)) {
+		return WKB_LINESTRING;
+	} else if (PyList_Check(geom) || PyTuple_Check(geom)) {
+		if (Py_EnterRecursiveCall(" while encoding WKB")) {
+			return -1;
+		}
+		size = PySequence_Fast_GET_SIZE(geom);
+		for (i = 0; i < size; ++i) {
+			part = PySequence_Fast_GET_ITEM(geom, i);
+			part_type = wkb_geometry_type(part);
+			if (part_type == -1) {
+				Py_LeaveRecursiveCall();
+				return -1;
+			}
+			if (i == 0) {
+				common_type = part_type;
+			} else if (part_type != common_type) {
+				common_type = 0;
+			}
+		}
+		Py_LeaveRecursiveCall();
+		geom_type = WKB_GEOMETRYCOLLECTION;
+		if (common_type == WKB_POINT) {
+			geom_type = WKB_MULTIPOINT;
+		} else if (common_type == WKB_LINESTRING) {
+			geom_type = WKB_MULTILINESTRING;
+		} else if (common_type == WKB_POLYGON) {
+			geom_type = WKB_MULTIPOLYGON;
+		}
+		return geom_type;
+	}
+	PyErr_Format(PyExc_TypeError,
+		"to_wkb: cannot encode %.200s object as WKB", Py_TYPE(geom)->tp_name);
+	return -1;
+}
+
+static Py_ssize_t
+wkb_point_count(PyObject *geom)
+{
+	if (PlanarPolygon_Check(geom)) {
+		/* Include the closing vertex */
+		return Py_SIZE(geom) + 1;
+	} else if (PlanarSegment_Check(geom)) {
+		return 2;
+	}
+	return Py_SIZE(geom);
+}
+
+/* Return the size of the WKB encoding of a geometry, 
+   whose type must have been checked with wkb_geometry_type() */
+static Py_ssize_t
+wkb_encoded_size(PyObject *geom)
+{
+	Py_ssize_t i, size, part_size, total;
+
+	if (PlanarVec2_Check(geom)) {
+		return WKB_HEADER_SIZE + sizeof(planar_vec2_t);
+	} else if (wkb_is_holed_polygon(geom)) {
+		size = PyTuple_GET_SIZE(geom);
+		total = WKB_HEADER_SIZE + 4;
+		for (i = 0; i < size; ++i) {
+			part_size = wkb_point_count(PyTuple_GET_ITEM(geom, i));
+			if ((unsigned long)part_size > WKB_UINT32_MAX) {
+				PyErr_SetString(PyExc_ValueError, 
+					"to_wkb: too many points");
+				return -1;
+			}
+			total += 4 + part_size * sizeof(planar_vec2_t);
+		}
+		return total;
+	} else if (PyList_Check(geom) || PyTuple_Check(geom)) {
+		size = PySequence_Fast_GET_SIZE(geom);
+		total = WKB_HEADER_SIZE + 4;
+		for (i = 0; i < size; ++i) {
+			part_size = wkb_encoded_size(PySequence_Fast_GET_ITEM(geom, i));
+			if (part_size == -1) {
+				return -1;
+			}
+			total += part_size;
+		}
+		return total;
+	}
+	size = wkb_point_count(geom);
+	if ((unsigned long)size > WKB_UINT32_MAX) {
+		PyErr_SetString(PyExc_ValueError, "to_wkb: too many points");
+		return -1;
+	}
+	total = WKB_HEADER_SIZE + 4 + size * sizeof(planar_vec2_t);
+	if (PlanarPolygon_Check(geom)) {
+		/* Ring count */
+		total += 4;
+	}
+	return total;
+}
+
+static unsigned char *
+wkb_put_uint32(unsigned char *p, unsigned long value)
+{
+	p[0] = value & 0xff;
+	p[1] = (value >> 8) & 0xff;
+	p[2] = (value >> 16) & 0xff;
+	p[3] = (value >> 24) & 0xff;
+	return p + 4;
+}
+
+/* Write a double byte-swapped, for little-endian output
+   on big-endian hosts */
+static unsigned char *
+wkb_put_double(unsigned char *p, double value)
+{
+	const unsigned char *b = (const unsigned char *)&value;
+	int i;
+
+	for (i = 0; i < (int)sizeof(double); ++i) {
+		p[i] = b[sizeof(double) - 1 - i];
+	}
+	return p + sizeof(double);
+}
+
+static unsigned char *
+wkb_put_points(unsigned char *p, const planar_vec2_t *vec, Py_ssize_t count)
+{
+	Py_ssize_t i;
+
+	if (wkb_host_is_little_endian()) {
+		memcpy(p, vec, count * sizeof(planar_vec2_t));
+		return p + count * sizeof(planar_vec2_t);
+	}
+	for (i = 0; i < count; ++i) {
+		p = wkb_put_double(p, vec[i].x);
+		p = wkb_put_double(p, vec[i].y);
+	}
+	return p;
+}
+
+/* Write a closed polygon ring */
+static unsigned char *
+wkb_put_ring(unsigned char *p, PlanarPolygonObject *poly)
+{
+	p = wkb_put_uint32(p, Py_SIZE(poly) + 1);
+	p = wkb_put_points(p, poly->vert, Py_SIZE(poly));
+	return wkb_put_points(p, poly->vert, 1);
+}
+
+/* Write the little-endian WKB encoding of a geometry, 
+   returning a pointer to the end of the data written */
+static unsigned char *
+wkb_write(PyObject *geom, unsigned char *p)
+{
+	PlanarVec2Array32Object *a32;
+	PlanarLineObject *seg;
+	planar_vec2_t vec[2];
+	Py_ssize_t i, size;
+
+	*p++ = 1;
+	p = wkb_put_uint32(p, wkb_geometry_type(geom));
+	if (PlanarVec2_Check(geom)) {
+		vec[0].x = ((PlanarVec2Object *)geom)->x;
+		vec[0].y = ((PlanarVec2Object *)geom)->y;
+		return wkb_put_points(p, vec, 1);
+	} else if (wkb_is_holed_polygon(geom)) {
+		size = PyTuple_GET_SIZE(geom);
+		p = wkb_put_uint32(p, size);
+		for (i = 0; i < size; ++i) {
+			p = wkb_put_ring(p, 
+				(PlanarPolygonObject *)PyTuple_GET_ITEM(geom, i));
+		}
+		return p;
+	} else if (PyList_Check(geom) || PyTuple_Check(geom)) {
+		size = PySequence_Fast_GET_SIZE(geom);
+		p = wkb_put_uint32(p, size);
+		for (i = 0; i < size; ++i) {
+			p = wkb_write(PySequence_Fast_GET_ITEM(geom, i), p);
+		}
+		return p;
+	}
+	if (PlanarPolygon_Check(geom)) {
+		p = wkb_put_uint32(p, 1);
+		return wkb_put_ring(p, (PlanarPolygonObject *)geom);
+	}
+	size = wkb_point_count(geom);
+	p = wkb_put_uint32(p, size);
+	if (PlanarSegment_Check(geom)) {
+		seg = (PlanarLineObject *)geom;
+		vec[0] = seg->anchor;
+		vec[1].x = seg->anchor.x - seg->normal.y * seg->length;
+		vec[1].y = seg->anchor.y + seg->normal.x * seg->length;
+		return wkb_put_points(p, vec, 2);
+	} else if (PlanarVec2Array32_Check(geom)) {
+		a32 = (PlanarVec2Array32Object *)geom;
+		for (i = 0; i < size; ++i) {
+			vec[0].x = a32->vec[i].x;
+			vec[0].y = a32->vec[i].y;
+			p = wkb_put_points(p, vec, 1);
+		}
+		return p;
+	}
+	return wkb_put_points(p, ((PlanarSeq2Object *)geom)->vec, size);
+}
+
+PyObject *
+Planar_to_wkb(PyObject *module, PyObject *geom)
+{
+	PyObject *data;
+	Py_ssize_t size;
+
+	if (wkb_geometry_type(geom) == -1) {
+		return NULL;
+	}
+	size = wkb_encoded_size(geom);
+	if (size == -1) {
+		return NULL;
+	}
+	data = PyBytes_FromStringAndSize(NULL, size);
+	if (data != NULL) {
+		wkb_write(geom, (unsigned char *)PyBytes_AS_STRING(data));
+	}
+	return data;
+}
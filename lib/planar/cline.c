@@ -77,7 +77,7 @@ Line_get_points(PlanarLineObject *self) {
     PlanarSeq2Object *seq;
     double sx, sy;
 
-    seq = Seq2_New(&PlanarSeq2Type, 2);
+    seq = Seq2_New(PLANAR_TYPE(Seq2), 2);
     if (seq != NULL) {
         seq->vec[0].x = sx = self->normal.x * self->offset;
         seq->vec[0].y = sy = self->normal.y * self->offset;
@@ -118,18 +118,18 @@ static PyGetSetDef Line_getset[] = {
 /* Methods */
 
 static int
-Line_init(PlanarLineObject *self, PyObject *args)
+Line_init_array(PlanarLineObject *self, PyObject *const *args, 
+    Py_ssize_t nargs)
 {
     assert(PlanarLine_Check(self) || PlanarRay_Check(self));
-    if (PyTuple_GET_SIZE(args) != 2) {
+    if (nargs != 2) {
         PyErr_SetString(PyExc_TypeError, "Line: wrong number of arguments");
         return -1;
     }
-    if (!PlanarVec2_Parse(PyTuple_GET_ITEM(args, 0), 
-        &self->anchor.x, &self->anchor.y)) {
+    if (!PlanarVec2_Parse(args[0], &self->anchor.x, &self->anchor.y)) {
         return -1;
     }
-    if (Line_set_direction(self, PyTuple_GET_ITEM(args, 1), NULL) == -1) {
+    if (Line_set_direction(self, args[1], NULL) == -1) {
         return -1;
     }
     self->offset = self->anchor.x * self->normal.x 
@@ -137,6 +137,31 @@ Line_init(PlanarLineObject *self, PyObject *args)
     return 0;
 }
 
+static int
+Line_init(PlanarLineObject *self, PyObject *args)
+{
+    return Line_init_array(self, 
+        &PyTuple_GET_ITEM(args, 0), PyTuple_GET_SIZE(args));
+}
+
+#if PY_VERSION_HEX >= 0x03090000
+PyObject *
+PlanarLine_vectorcall(PyObject *type, PyObject *const *args, 
+    size_t nargsf, PyObject *kwnames)
+{
+    return Planar_VectorcallNew(&PlanarLineType, 
+        (planar_initarrayfunc)Line_init_array, type, args, nargsf, kwnames);
+}
+
+PyObject *
+PlanarRay_vectorcall(PyObject *type, PyObject *const *args, 
+    size_t nargsf, PyObject *kwnames)
+{
+    return Planar_VectorcallNew(&PlanarRayType, 
+        (planar_initarrayfunc)Line_init_array, type, args, nargsf, kwnames);
+}
+#endif
+
 static PyObject *
 Line_repr(PlanarLineObject *self)
 {
@@ -205,8 +230,8 @@ Line_new_from_points(PyTypeObject *type, PyObject *points)
     double x, y, dx, dy, px, py, d;
     double L = 0.0;
 
-    assert(PyType_IsSubtype(type, &PlanarLineType)
-        || PyType_IsSubtype(type, &PlanarRayType));
+    assert(Planar_TypeIsSubtype(type, &PlanarLineType)
+        || Planar_TypeIsSubtype(type, &PlanarRayType));
     line = (PlanarLineObject *)type->tp_alloc(type, 0);
     if (line == NULL) {
         return NULL;
@@ -300,28 +325,30 @@ notCollinear:
 }
 
 static PlanarLineObject *
-Line_new_from_normal(PyTypeObject *type, PyObject *args)
+Line_new_from_normal(PyTypeObject *type, PyObject *const *args, 
+    Py_ssize_t nargs)
 {
     PlanarLineObject *line;
 
-    assert(PyType_IsSubtype(type, &PlanarLineType));
-    if (PyTuple_GET_SIZE(args) != 2) {
+    assert(Planar_TypeIsSubtype(type, &PlanarLineType));
+    if (nargs != 2) {
         PyErr_SetString(PyExc_TypeError, 
             "Line.from_normal: wrong number of arguments");
         return NULL;
     }
     line = (PlanarLineObject *)type->tp_alloc(type, 0);
     if (line != NULL) {
-        if (Line_set_normal(line, PyTuple_GET_ITEM(args, 0), NULL) == -1) {
-            return NULL;
-        }
-        if (Line_set_offset(line, PyTuple_GET_ITEM(args, 1)) == -1) {
+        if (Line_set_normal(line, args[0], NULL) == -1
+            || Line_set_offset(line, args[1]) == -1) {
+            Py_DECREF(line);
             return NULL;
         }
     }
     return line;
 }
 
+Planar_DEFINE_FASTCALL_COMPAT(Line_new_from_normal)
+
 static PyObject *
 Line_distance_to(PlanarLineObject *self, PyObject *pt)
 {
@@ -413,7 +440,7 @@ Line_parallel(PlanarLineObject *self, PyObject *pt)
     if (!PlanarVec2_Parse(pt, &px, &py)) {
         return NULL;
     }
-    line = (PlanarLineObject *)PlanarLineType.tp_alloc(&PlanarLineType, 0);
+    line = (PlanarLineObject *)Planar_Alloc(PLANAR_TYPE(Line));
     if (line != NULL) {
         line->normal.x = self->normal.x;
         line->normal.y = self->normal.y;
@@ -432,7 +459,7 @@ Line_perpendicular(PlanarLineObject *self, PyObject *pt)
     if (!PlanarVec2_Parse(pt, &px, &py)) {
         return NULL;
     }
-    line = (PlanarLineObject *)PlanarLineType.tp_alloc(&PlanarLineType, 0);
+    line = (PlanarLineObject *)Planar_Alloc(PLANAR_TYPE(Line));
     if (line != NULL) {
         line->normal.x = -self->normal.y;
         line->normal.y = self->normal.x;
@@ -441,11 +468,154 @@ Line_perpendicular(PlanarLineObject *self, PyObject *pt)
     return line;
 }
 
+/* Get the parametric form of a line, ray or line segment. The points on 
+   the shape are point + dir * s for lo <= s <= hi 
+*/
+static int
+Line_get_extent(PyObject *shape, planar_vec2_t *point, planar_vec2_t *dir,
+    double *lo, double *hi)
+{
+    PlanarLineObject *line = (PlanarLineObject *)shape;
+
+    if (PlanarLine_Check(shape)) {
+        point->x = line->normal.x * line->offset;
+        point->y = line->normal.y * line->offset;
+        *lo = -Py_HUGE_VAL;
+        *hi = Py_HUGE_VAL;
+    } else if (PlanarRay_Check(shape)) {
+        point->x = line->anchor.x;
+        point->y = line->anchor.y;
+        *lo = 0.0;
+        *hi = Py_HUGE_VAL;
+    } else if (PlanarSegment_Check(shape)) {
+        point->x = line->anchor.x;
+        point->y = line->anchor.y;
+        *lo = 0.0;
+        *hi = line->length;
+    } else {
+        PyErr_SetString(PyExc_TypeError, 
+            "Expected Line, Ray or LineSegment");
+        return 0;
+    }
+    dir->x = -line->normal.y;
+    dir->y = line->normal.x;
+    return 1;
+}
+
+/* Return true if the point is within epsilon of the shape 
+   with the extent specified */
+static int
+extent_contains_point(const planar_vec2_t *point, const planar_vec2_t *dir,
+    double lo, double hi, double px, double py)
+{
+    double s;
+
+    px -= point->x;
+    py -= point->y;
+    s = px * dir->x + py * dir->y;
+    if (s < lo) {
+        s = lo;
+    } else if (s > hi) {
+        s = hi;
+    }
+    px -= dir->x * s;
+    py -= dir->y * s;
+    return px*px + py*py < PLANAR_EPSILON2;
+}
+
+static PyObject *
+Line_intersection(PyObject *self, PyObject *other)
+{
+    planar_vec2_t p1, d1, p2, d2;
+    double lo1, hi1, lo2, hi2, denom, wx, wy, t, u, s;
+
+    if (!Line_get_extent(self, &p1, &d1, &lo1, &hi1)
+        || !Line_get_extent(other, &p2, &d2, &lo2, &hi2)) {
+        return NULL;
+    }
+    denom = d1.x * d2.y - d1.y * d2.x;
+    if (denom > -PLANAR_EPSILON && denom < PLANAR_EPSILON) {
+        /* Parallel */
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    wx = p2.x - p1.x;
+    wy = p2.y - p1.y;
+    t = (wx * d2.y - wy * d2.x) / denom;
+    u = (wx * d1.y - wy * d1.x) / denom;
+    if (t >= lo1 && t <= hi1 && u >= lo2 && u <= hi2) {
+        /* Snap intersections near endpoints to the endpoint */
+        if (t - lo1 < PLANAR_EPSILON) {
+            t = lo1;
+        } else if (hi1 - t < PLANAR_EPSILON) {
+            t = hi1;
+        } else if (u - lo2 < PLANAR_EPSILON) {
+            return (PyObject *)PlanarVec2_FromDoubles(
+                p2.x + d2.x * lo2, p2.y + d2.y * lo2);
+        } else if (hi2 - u < PLANAR_EPSILON) {
+            return (PyObject *)PlanarVec2_FromDoubles(
+                p2.x + d2.x * hi2, p2.y + d2.y * hi2);
+        }
+        return (PyObject *)PlanarVec2_FromDoubles(
+            p1.x + d1.x * t, p1.y + d1.y * t);
+    }
+    /* The containing lines cross outside of the shapes,
+       but they may still touch at an endpoint */
+    if (t < lo1 || t > hi1) {
+        s = t < lo1 ? lo1 : hi1;
+        if (extent_contains_point(&p2, &d2, lo2, hi2, 
+            p1.x + d1.x * s, p1.y + d1.y * s)) {
+            return (PyObject *)PlanarVec2_FromDoubles(
+                p1.x + d1.x * s, p1.y + d1.y * s);
+        }
+    }
+    if (u < lo2 || u > hi2) {
+        s = u < lo2 ? lo2 : hi2;
+        if (extent_contains_point(&p1, &d1, lo1, hi1, 
+            p2.x + d2.x * s, p2.y + d2.y * s)) {
+            return (PyObject *)PlanarVec2_FromDoubles(
+                p2.x + d2.x * s, p2.y + d2.y * s);
+        }
+    }
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+/* Pickle support. The constructor normalizes the direction vector, so the
+   exact field values are restored from the state by __setstate__ */
+
+static PyObject *
+Linear_reduce(PlanarLineObject *self)
+{
+    return Py_BuildValue("(O((dd)(dd))((dd)(dd)(dd)d))", Py_TYPE(self),
+        self->anchor.x, self->anchor.y, -self->normal.y, self->normal.x,
+        self->normal.x, self->normal.y, self->anchor.x, self->anchor.y,
+        self->end.x, self->end.y, self->offset);
+}
+
+static PyObject *
+Linear_setstate(PlanarLineObject *self, PyObject *state)
+{
+    if (!PyTuple_Check(state)) {
+        PyErr_Format(PyExc_TypeError, "%.200s.__setstate__: expected tuple",
+            Py_TYPE(self)->tp_name);
+        return NULL;
+    }
+    if (!PyArg_ParseTuple(state, "(dd)(dd)(dd)d:__setstate__",
+        &self->normal.x, &self->normal.y, &self->anchor.x, &self->anchor.y,
+        &self->end.x, &self->end.y, &self->offset)) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
 static PyMethodDef Line_methods[] = {
     {"from_points", (PyCFunction)Line_new_from_points, METH_CLASS | METH_O, 
         "Create a line from two or more collinear points."},
-    {"from_normal", (PyCFunction)Line_new_from_normal, 
-        METH_CLASS | METH_VARARGS, 
+    {"__reduce__", (PyCFunction)Linear_reduce, METH_NOARGS, NULL},
+    {"__setstate__", (PyCFunction)Linear_setstate, METH_O, NULL},
+    {"from_normal", Planar_FASTCALL(Line_new_from_normal), 
+        METH_CLASS | PLANAR_METH_FASTCALL, 
         "Create a line given a normal vector perpendicular to it, at the "
         "specified distance from the origin."},
     {"distance_to", (PyCFunction)Line_distance_to, METH_O,
@@ -469,6 +639,9 @@ static PyMethodDef Line_methods[] = {
     {"parallel", (PyCFunction)Line_parallel, METH_O,
         "Return a line parallel to this one that passes through the "
         "given point."},
+    {"intersection", (PyCFunction)Line_intersection, METH_O,
+        "Return the point where this line and another line, ray or line "
+        "segment intersect, or None if they do not intersect."},
     {"almost_equals", (PyCFunction)Line_almost_equals, METH_O,
         "Return True if this line is approximately equal to "
         "another line, within precision limits."},
@@ -744,7 +917,7 @@ static PlanarSeq2Object *
 Ray_get_points(PlanarLineObject *self) {
     PlanarSeq2Object *seq;
 
-    seq = Seq2_New(&PlanarSeq2Type, 2);
+    seq = Seq2_New(PLANAR_TYPE(Seq2), 2);
     if (seq != NULL) {
         seq->vec[0].x = self->anchor.x;
         seq->vec[0].y = self->anchor.y;
@@ -758,7 +931,7 @@ static PlanarLineObject *
 Ray_get_line(PlanarLineObject *self) {
     PlanarLineObject *line;
 
-    line = (PlanarLineObject *)PlanarLineType.tp_alloc(&PlanarLineType, 0);
+    line = (PlanarLineObject *)Planar_Alloc(PLANAR_TYPE(Line));
     if (line != NULL) {
         line->normal.x = self->normal.x;
         line->normal.y = self->normal.y;
@@ -893,6 +1066,8 @@ Ray_project(PlanarLineObject *self, PyObject *pt)
 static PyMethodDef Ray_methods[] = {
     {"from_points", (PyCFunction)Line_new_from_points, METH_CLASS | METH_O, 
         "Create a ray from two or more collinear points."},
+    {"__reduce__", (PyCFunction)Linear_reduce, METH_NOARGS, NULL},
+    {"__setstate__", (PyCFunction)Linear_setstate, METH_O, NULL},
     {"distance_to", (PyCFunction)Ray_distance_to, METH_O,
         "Return the signed distance from the line to the specified point."},
     {"point_behind", (PyCFunction)Ray_point_behind, METH_O,
@@ -909,6 +1084,9 @@ static PyMethodDef Ray_methods[] = {
     {"project", (PyCFunction)Ray_project, METH_O,
         "Compute the projection of a point onto the ray. This "
         "is the closest point on the ray to the specified point."},
+    {"intersection", (PyCFunction)Line_intersection, METH_O,
+        "Return the point where this ray and another line, ray or line "
+        "segment intersect, or None if they do not intersect."},
     {"almost_equals", (PyCFunction)Ray_almost_equals, METH_O,
         "Return True if this ray is approximately equal to "
         "another ray, within precision limits."},
@@ -1190,24 +1368,42 @@ Segment_get_mid(PlanarLineObject *self) {
 }
 
 static int
-Segment_init(PlanarLineObject *self, PyObject *args)
+Segment_init_array(PlanarLineObject *self, PyObject *const *args, 
+    Py_ssize_t nargs)
 {
     assert(PlanarSegment_Check(self));
-    if (PyTuple_GET_SIZE(args) != 2) {
+    if (nargs != 2) {
         PyErr_SetString(PyExc_TypeError, 
             "LineSegment: wrong number of arguments");
         return -1;
     }
-    if (!PlanarVec2_Parse(PyTuple_GET_ITEM(args, 0), 
-        &self->anchor.x, &self->anchor.y)) {
+    if (!PlanarVec2_Parse(args[0], &self->anchor.x, &self->anchor.y)) {
         return -1;
     }
-    if (Segment_set_vector(self, PyTuple_GET_ITEM(args, 1), NULL) == -1) {
+    if (Segment_set_vector(self, args[1], NULL) == -1) {
         return -1;
     }
     return 0;
 }
 
+static int
+Segment_init(PlanarLineObject *self, PyObject *args)
+{
+    return Segment_init_array(self, 
+        &PyTuple_GET_ITEM(args, 0), PyTuple_GET_SIZE(args));
+}
+
+#if PY_VERSION_HEX >= 0x03090000
+PyObject *
+PlanarSegment_vectorcall(PyObject *type, PyObject *const *args, 
+    size_t nargsf, PyObject *kwnames)
+{
+    return Planar_VectorcallNew(&PlanarSegmentType, 
+        (planar_initarrayfunc)Segment_init_array, type, args, nargsf, 
+        kwnames);
+}
+#endif
+
 static PyObject *
 Segment_repr(PlanarLineObject *self)
 {
@@ -1277,7 +1473,7 @@ static PlanarSeq2Object *
 Segment_get_points(PlanarLineObject *self) {
     PlanarSeq2Object *seq;
 
-    seq = Seq2_New(&PlanarSeq2Type, 2);
+    seq = Seq2_New(PLANAR_TYPE(Seq2), 2);
     if (seq != NULL) {
         seq->vec[0].x = self->anchor.x;
         seq->vec[0].y = self->anchor.y;
@@ -1319,22 +1515,27 @@ static PyMemberDef Segment_members[] = {
 /* Methods */
 
 static PlanarLineObject *
-Segment_new_from_normal(PyTypeObject *type, PyObject *args)
+Segment_new_from_normal(PyTypeObject *type, PyObject *const *args, 
+    Py_ssize_t nargs)
 {
     PlanarLineObject *line;
-    PyObject *normal_arg;
     double offset, start_dist, end_dist;
 
-    assert(PyType_IsSubtype(type, &PlanarSegmentType));
-    if (!PyArg_ParseTuple(args, "Oddd:LineSegment.from_normal", 
-        &normal_arg, &offset, &start_dist, &end_dist)) {
+    assert(Planar_TypeIsSubtype(type, &PlanarSegmentType));
+    if (!Planar_CheckArgCount("LineSegment.from_normal", nargs, 4)) {
+        return NULL;
+    }
+    offset = PyFloat_AsDouble(args[1]);
+    start_dist = PyFloat_AsDouble(args[2]);
+    end_dist = PyFloat_AsDouble(args[3]);
+    if (PyErr_Occurred()) {
         return NULL;
     }
     line = (PlanarLineObject *)type->tp_alloc(type, 0);
     if (line == NULL) {
         return NULL;
     }
-    if (Line_set_normal(line, normal_arg, NULL) == -1) {
+    if (Line_set_normal(line, args[0], NULL) == -1) {
         Py_DECREF(line);
         return NULL;
     }
@@ -1344,6 +1545,8 @@ Segment_new_from_normal(PyTypeObject *type, PyObject *args)
     return line;
 }
 
+Planar_DEFINE_FASTCALL_COMPAT(Segment_new_from_normal)
+
 static PlanarLineObject *
 Segment_new_from_points(PyTypeObject *type, PyObject *points) 
 {
@@ -1358,7 +1561,7 @@ Segment_new_from_points(PyTypeObject *type, PyObject *points)
     double sx = 0.0;
     double sy = 0.0;
 
-    assert(PyType_IsSubtype(type, &PlanarSegmentType));
+    assert(Planar_TypeIsSubtype(type, &PlanarSegmentType));
     line = (PlanarLineObject *)type->tp_alloc(type, 0);
     if (line == NULL) {
         return NULL;
@@ -1588,8 +1791,8 @@ Segment_project(PlanarLineObject *self, PyObject *pt)
 }
 
 static PyMethodDef Segment_methods[] = {
-    {"from_normal", (PyCFunction)Segment_new_from_normal, 
-        METH_CLASS | METH_VARARGS, 
+    {"from_normal", Planar_FASTCALL(Segment_new_from_normal), 
+        METH_CLASS | PLANAR_METH_FASTCALL, 
         "Create a line segment from a normal vector perpendicular to the "
         "line containing the segment, the offset distance from that line to "
         "origin, and the signed distances along that line from the projection "
@@ -1599,6 +1802,8 @@ static PyMethodDef Segment_methods[] = {
         "Create a line segment from one or more collinear points.  The first "
         "point is assumed to be the anchor. The furthest point from the "
         "anchor is the end point."},
+    {"__reduce__", (PyCFunction)Linear_reduce, METH_NOARGS, NULL},
+    {"__setstate__", (PyCFunction)Linear_setstate, METH_O, NULL},
     {"distance_to", (PyCFunction)Segment_distance_to, METH_O,
         "Return the distance from the line segment to the specified point."},
     {"point_behind", (PyCFunction)Segment_point_behind, METH_O,
@@ -1618,6 +1823,9 @@ static PyMethodDef Segment_methods[] = {
     {"project", (PyCFunction)Segment_project, METH_O,
         "Compute the projection of a point onto the line segment. This "
         "is the closest point on the line segment to the specified point."},
+    {"intersection", (PyCFunction)Line_intersection, METH_O,
+        "Return the point where this line segment and another line, ray or "
+        "line segment intersect, or None if they do not intersect."},
     {"almost_equals", (PyCFunction)Segment_almost_equals, METH_O,
         "Return True if this line segment is approximately equal to "
         "another, within precision limits."},
@@ -1810,3 +2018,587 @@ PyTypeObject PlanarSegmentType = {
     0,                    /* tp_free */
 };
 
+
+/***************************************************************************/
+
+/* Bentley-Ottmann sweep used by find_intersections(). The sweep line
+   moves in the +x direction, events at the same x are handled in 
+   ascending y order. Vertical segments are treated as if tilted very 
+   slightly clockwise from vertical. The status is a balanced tree of 
+   the segments crossing the sweep line, so an event with m segments
+   passing through its point takes O((m + 1) log n) time.
+*/
+
+typedef struct {
+    double x;
+    double y;
+    Py_ssize_t segment; /* Segment starting at this point, or -1 */
+} planar_sweep_event_t;
+
+typedef struct {
+    double slope;
+    Py_ssize_t segment;
+} planar_sweep_order_t;
+
+typedef struct {
+    planar_vec2_t *ends; /* Left and right endpoint of each segment */
+    planar_sweep_event_t *events; /* Binary min-heap */
+    Py_ssize_t event_count;
+    Py_ssize_t event_alloc;
+    planar_edge_node_t *nodes; /* Status tree nodes, one per segment */
+    Py_ssize_t root; /* Status tree root, lowest segment first */
+} planar_sweep_t;
+
+#define SWEEP_EVENT_LT(a, b) \
+    ((a).x < (b).x || ((a).x == (b).x && (a).y < (b).y))
+
+static int
+sweep_push(planar_sweep_t *sweep, double x, double y, Py_ssize_t segment)
+{
+    planar_sweep_event_t *events = sweep->events;
+    planar_sweep_event_t event;
+    Py_ssize_t i, parent;
+
+    if (sweep->event_count == sweep->event_alloc) {
+        events = (planar_sweep_event_t *)PyMem_Realloc(events, 
+            sizeof(planar_sweep_event_t) * sweep->event_alloc * 2);
+        if (events == NULL) {
+            PyErr_NoMemory();
+            return 0;
+        }
+        sweep->events = events;
+        sweep->event_alloc *= 2;
+    }
+    event.x = x;
+    event.y = y;
+    event.segment = segment;
+    i = sweep->event_count++;
+    while (i > 0) {
+        parent = (i - 1) / 2;
+        if (!SWEEP_EVENT_LT(event, events[parent])) {
+            break;
+        }
+        events[i] = events[parent];
+        i = parent;
+    }
+    events[i] = event;
+    return 1;
+}
+
+static planar_sweep_event_t
+sweep_pop(planar_sweep_t *sweep)
+{
+    planar_sweep_event_t *events = sweep->events;
+    planar_sweep_event_t top = events[0];
+    planar_sweep_event_t last = events[--sweep->event_count];
+    const Py_ssize_t count = sweep->event_count;
+    Py_ssize_t i = 0, child;
+
+    while ((child = i * 2 + 1) < count) {
+        if (child + 1 < count 
+            && SWEEP_EVENT_LT(events[child + 1], events[child])) {
+            child++;
+        }
+        if (!SWEEP_EVENT_LT(events[child], last)) {
+            break;
+        }
+        events[i] = events[child];
+        i = child;
+    }
+    events[i] = last;
+    return top;
+}
+
+/* Return the y coordinate of the segment at the sweep point */
+static double
+sweep_y_at(const planar_vec2_t *ends, Py_ssize_t i, double x, double y)
+{
+    const planar_vec2_t *a = ends + i * 2;
+    const planar_vec2_t *b = a + 1;
+
+    if (a->x == b->x) {
+        /* Vertical segments are always level with the sweep point */
+        return y;
+    }
+    return a->y + (x - a->x) * (b->y - a->y) / (b->x - a->x);
+}
+
+static double
+sweep_slope(const planar_vec2_t *ends, Py_ssize_t i)
+{
+    const planar_vec2_t *a = ends + i * 2;
+    const planar_vec2_t *b = a + 1;
+
+    if (a->x == b->x) {
+        return Py_HUGE_VAL;
+    }
+    return (b->y - a->y) / (b->x - a->x);
+}
+
+static int
+sweep_contains(const planar_vec2_t *ends, Py_ssize_t i, double x, double y)
+{
+    const planar_vec2_t *a = ends + i * 2;
+    const planar_vec2_t *b = a + 1;
+    const double dx = b->x - a->x;
+    const double dy = b->y - a->y;
+    double px = x - a->x;
+    double py = y - a->y;
+    double t;
+
+    t = (px * dx + py * dy) / (dx * dx + dy * dy);
+    if (t < 0.0) {
+        t = 0.0;
+    } else if (t > 1.0) {
+        t = 1.0;
+    }
+    px -= dx * t;
+    py -= dy * t;
+    return px * px + py * py < PLANAR_EPSILON2;
+}
+
+/* Add an event for the intersection of segments i and j 
+   if it is ahead of the sweep point */
+static int
+sweep_schedule(planar_sweep_t *sweep, Py_ssize_t i, Py_ssize_t j, 
+    double x, double y)
+{
+    const planar_vec2_t *a = sweep->ends + i * 2;
+    const planar_vec2_t *b = a + 1;
+    const planar_vec2_t *c = sweep->ends + j * 2;
+    const planar_vec2_t *d = c + 1;
+    const double rx = b->x - a->x;
+    const double ry = b->y - a->y;
+    const double sx = d->x - c->x;
+    const double sy = d->y - c->y;
+    const double denom = rx * sy - ry * sx;
+    const double r_len = sqrt(rx * rx + ry * ry);
+    const double s_len = sqrt(sx * sx + sy * sy);
+    double wx, wy, t, u, qx, qy;
+
+    if (fabs(denom) < PLANAR_EPSILON * r_len * s_len) {
+        return 1;
+    }
+    wx = c->x - a->x;
+    wy = c->y - a->y;
+    t = (wx * sy - wy * sx) / denom;
+    u = (wx * ry - wy * rx) / denom;
+    if (!(t >= 0.0 && t <= 1.0 && u >= 0.0 && u <= 1.0)) {
+        /* Segments touching at an endpoint are found at the endpoint */
+        return 1;
+    }
+    if (t * r_len < PLANAR_EPSILON) {
+        qx = a->x;
+        qy = a->y;
+    } else if ((1.0 - t) * r_len < PLANAR_EPSILON) {
+        qx = b->x;
+        qy = b->y;
+    } else if (u * s_len < PLANAR_EPSILON) {
+        qx = c->x;
+        qy = c->y;
+    } else if ((1.0 - u) * s_len < PLANAR_EPSILON) {
+        qx = d->x;
+        qy = d->y;
+    } else {
+        qx = a->x + rx * t;
+        qy = a->y + ry * t;
+    }
+    if ((qx > x || (qx == x && qy > y))
+        && (qx - x)*(qx - x) + (qy - y)*(qy - y) >= PLANAR_EPSILON2) {
+        return sweep_push(sweep, qx, qy, -1);
+    }
+    return 1;
+}
+
+static int
+compare_ssize(const void *a, const void *b)
+{
+    const Py_ssize_t ia = *(Py_ssize_t *)a;
+    const Py_ssize_t ib = *(Py_ssize_t *)b;
+    return (ia > ib) - (ia < ib);
+}
+
+static int
+compare_sweep_order(const void *a, const void *b)
+{
+    const planar_sweep_order_t *oa = (planar_sweep_order_t *)a;
+    const planar_sweep_order_t *ob = (planar_sweep_order_t *)b;
+    const int result = (oa->slope > ob->slope) - (oa->slope < ob->slope);
+    return result ? result : 
+        (oa->segment > ob->segment) - (oa->segment < ob->segment);
+}
+
+/* Get the endpoints of a LineSegment or point pair */
+static int
+sweep_parse_segment(PyObject *item, planar_vec2_t *a, planar_vec2_t *b)
+{
+    PlanarLineObject *line;
+    PyObject *pair;
+    int ok;
+
+    if (PlanarSegment_Check(item)) {
+        line = (PlanarLineObject *)item;
+        a->x = line->anchor.x;
+        a->y = line->anchor.y;
+        b->x = line->anchor.x + -line->normal.y * line->length;
+        b->y = line->anchor.y + line->normal.x * line->length;
+        return 1;
+    }
+    pair = PySequence_Fast(item, "Expected LineSegment or pair of points");
+    if (pair == NULL) {
+        return 0;
+    }
+    ok = PySequence_Fast_GET_SIZE(pair) == 2
+        && PlanarVec2_Parse(PySequence_Fast_GET_ITEM(pair, 0), &a->x, &a->y)
+        && PlanarVec2_Parse(PySequence_Fast_GET_ITEM(pair, 1), &b->x, &b->y);
+    Py_DECREF(pair);
+    if (!ok) {
+        PyErr_SetString(PyExc_TypeError, 
+            "Expected LineSegment or pair of points");
+    }
+    return ok;
+}
+
+static PyObject *
+sweep_intersection_item(double x, double y, 
+    Py_ssize_t *segments, Py_ssize_t count)
+{
+    PyObject *indices, *point, *index;
+    Py_ssize_t i;
+
+    indices = PyTuple_New(count);
+    if (indices == NULL) {
+        return NULL;
+    }
+    for (i = 0; i < count; i++) {
+        index = PyInt_FromSsize_t(segments[i]);
+        if (index == NULL) {
+            Py_DECREF(indices);
+            return NULL;
+        }
+        PyTuple_SET_ITEM(indices, i, index);
+    }
+    point = (PyObject *)PlanarVec2_FromDoubles(x, y);
+    if (point == NULL) {
+        Py_DECREF(indices);
+        return NULL;
+    }
+    return Py_BuildValue("(NN)", point, indices);
+}
+
+typedef struct {
+    double cx;
+    double cy;
+    planar_vec2_t pt;
+    Py_ssize_t index;
+} planar_snap_key_t;
+
+static int
+compare_snap_cells(const planar_snap_key_t *a, double cx, double cy)
+{
+    int result = (a->cx > cx) - (a->cx < cx);
+    return result ? result : (a->cy > cy) - (a->cy < cy);
+}
+
+static int
+compare_snap_keys(const void *a, const void *b)
+{
+    const planar_snap_key_t *ka = (planar_snap_key_t *)a;
+    const planar_snap_key_t *kb = (planar_snap_key_t *)b;
+    int result = compare_snap_cells(ka, kb->cx, kb->cy);
+    if (!result) {
+        result = (ka->pt.x > kb->pt.x) - (ka->pt.x < kb->pt.x);
+    }
+    if (!result) {
+        result = (ka->pt.y > kb->pt.y) - (ka->pt.y < kb->pt.y);
+    }
+    if (!result) {
+        result = (ka->index > kb->index) - (ka->index < kb->index);
+    }
+    return result;
+}
+
+/* Replace each point within epsilon of an earlier point with it, so
+   points that differ only by rounding error become exactly equal. The 
+   points are visited in order of the epsilon sized grid cells that 
+   contain them, and compared with the points kept in the neighboring 
+   cells. Return 0 and set an exception on error */
+int
+planar_snap_points(planar_vec2_t *points, Py_ssize_t n)
+{
+    const double epsilon = PLANAR_EPSILON;
+    const double epsilon2 = PLANAR_EPSILON2;
+    planar_snap_key_t *keys;
+    Py_ssize_t *kept;
+    Py_ssize_t i, j, lo, hi, mid, found;
+    double cx, cy, dx, dy;
+    int ncx, ncy;
+
+    if (n < 2 || !(epsilon > 0.0)) {
+        return 1;
+    }
+    keys = (planar_snap_key_t *)PyMem_Malloc(sizeof(planar_snap_key_t) * n);
+    kept = (Py_ssize_t *)PyMem_Malloc(sizeof(Py_ssize_t) * n);
+    if (keys == NULL || kept == NULL) {
+        PyMem_Free(keys);
+        PyMem_Free(kept);
+        PyErr_NoMemory();
+        return 0;
+    }
+    for (i = 0; i < n; i++) {
+        keys[i].cx = floor(points[i].x / epsilon);
+        keys[i].cy = floor(points[i].y / epsilon);
+        keys[i].pt = points[i];
+        keys[i].index = i;
+        kept[i] = 0;
+    }
+    qsort(keys, n, sizeof(planar_snap_key_t), compare_snap_keys);
+    /* kept[k] is set once the point at sorted position k is kept */
+    for (i = 0; i < n; i++) {
+        found = -1;
+        for (ncx = -1; ncx <= 1 && found < 0; ncx++) {
+            for (ncy = -1; ncy <= 1 && found < 0; ncy++) {
+                cx = keys[i].cx + ncx;
+                cy = keys[i].cy + ncy;
+                lo = 0;
+                hi = i;
+                while (lo < hi) {
+                    mid = (lo + hi) / 2;
+                    if (compare_snap_cells(keys + mid, cx, cy) < 0) {
+                        lo = mid + 1;
+                    } else {
+                        hi = mid;
+                    }
+                }
+                for (j = lo; j < i 
+                    && !compare_snap_cells(keys + j, cx, cy); j++) {
+                    dx = keys[j].pt.x - keys[i].pt.x;
+                    dy = keys[j].pt.y - keys[i].pt.y;
+                    if (kept[j] && dx*dx + dy*dy < epsilon2) {
+                        found = j;
+                        break;
+                    }
+                }
+            }
+        }
+        if (found < 0) {
+            kept[i] = 1;
+        } else {
+            points[keys[i].index] = keys[found].pt;
+        }
+    }
+    PyMem_Free(keys);
+    PyMem_Free(kept);
+    return 1;
+}
+
+/* Find all points where two or more of n segments meet, calling report
+   for each with the point and the sorted indices of the segments. The
+   endpoints of segment i are ends[i * 2] and ends[i * 2 + 1]. They are
+   snapped together in place by planar_snap_points(), and swapped so that 
+   the left endpoint is first. Return 0 and set an exception on error */
+int
+planar_find_intersections(planar_vec2_t *ends, Py_ssize_t n,
+    planar_intersection_func report, void *arg)
+{
+    planar_sweep_t sweep = {NULL, NULL, 0, 0, NULL, -1};
+    planar_sweep_event_t event;
+    planar_sweep_order_t *order = NULL;
+    planar_edge_node_t *nodes;
+    planar_vec2_t *a, *b, tmp;
+    Py_ssize_t *meeting = NULL;
+    Py_ssize_t i, node, below, above, count, starting, continuing;
+    double x, y, dx, dy, last_x = 0.0, last_y = 0.0;
+    int have_last = 0, ok = 0;
+
+    sweep.ends = ends;
+    sweep.event_alloc = n * 2 + 16;
+    sweep.events = (planar_sweep_event_t *)PyMem_Malloc(
+        sizeof(planar_sweep_event_t) * sweep.event_alloc);
+    sweep.nodes = nodes = (planar_edge_node_t *)PyMem_Malloc(
+        sizeof(planar_edge_node_t) * (n + 1));
+    meeting = (Py_ssize_t *)PyMem_Malloc(sizeof(Py_ssize_t) * (n + 1));
+    order = (planar_sweep_order_t *)PyMem_Malloc(
+        sizeof(planar_sweep_order_t) * (n + 1));
+    if (sweep.events == NULL || nodes == NULL
+        || meeting == NULL || order == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    if (!planar_snap_points(ends, n * 2)) {
+        goto done;
+    }
+    for (i = 0; i < n; i++) {
+        a = ends + i * 2;
+        b = a + 1;
+        if (b->x < a->x || (b->x == a->x && b->y < a->y)) {
+            tmp = *a;
+            *a = *b;
+            *b = tmp;
+        }
+        nodes[i].start = a;
+        nodes[i].end = b;
+        if (!sweep_push(&sweep, a->x, a->y, i)) {
+            goto done;
+        }
+        if ((b->x != a->x || b->y != a->y) 
+            && !sweep_push(&sweep, b->x, b->y, -1)) {
+            goto done;
+        }
+    }
+
+    while (sweep.event_count) {
+        event = sweep_pop(&sweep);
+        x = event.x;
+        y = event.y;
+        count = 0;
+        if (event.segment >= 0) {
+            meeting[count++] = event.segment;
+        }
+        while (sweep.event_count 
+            && sweep.events[0].x == x && sweep.events[0].y == y) {
+            event = sweep_pop(&sweep);
+            if (event.segment >= 0) {
+                meeting[count++] = event.segment;
+            }
+        }
+        if (!count && have_last && 
+            (x - last_x)*(x - last_x) + (y - last_y)*(y - last_y) 
+            < PLANAR_EPSILON2) {
+            /* Already handled at the last event, the
+               difference is only rounding error */
+            continue;
+        }
+        last_x = x;
+        last_y = y;
+        have_last = 1;
+
+        /* Find the segments passing through the event point, 
+           and those just below and above it */
+        below = -1;
+        node = sweep.root;
+        while (node >= 0) {
+            if (sweep_y_at(sweep.ends, node, x, y) < y) {
+                below = node;
+                node = nodes[node].right;
+            } else {
+                node = nodes[node].left;
+            }
+        }
+        while (below >= 0 && sweep_contains(sweep.ends, below, x, y)) {
+            below = edge_tree_prev(nodes, below);
+        }
+        if (below >= 0) {
+            above = edge_tree_next(nodes, below);
+        } else {
+            above = sweep.root >= 0 ? edge_tree_first(nodes, sweep.root) : -1;
+        }
+        starting = count;
+        while (above >= 0 && sweep_contains(sweep.ends, above, x, y)) {
+            meeting[count++] = above;
+            above = edge_tree_next(nodes, above);
+        }
+        for (i = starting; i < count; i++) {
+            edge_tree_remove(nodes, &sweep.root, meeting[i]);
+        }
+        if (count > 1) {
+            qsort(meeting, count, sizeof(Py_ssize_t), compare_ssize);
+            if (!report(x, y, meeting, count, arg)) {
+                goto done;
+            }
+        }
+
+        /* Replace the segments at the event point with those 
+           that continue past it, in their order beyond the point */
+        continuing = 0;
+        for (i = 0; i < count; i++) {
+            b = sweep.ends + meeting[i] * 2 + 1;
+            dx = b->x - x;
+            dy = b->y - y;
+            if (dx*dx + dy*dy >= PLANAR_EPSILON2) {
+                order[continuing].slope = sweep_slope(sweep.ends, meeting[i]);
+                order[continuing].segment = meeting[i];
+                continuing++;
+            }
+        }
+        qsort(order, continuing, sizeof(planar_sweep_order_t), 
+            compare_sweep_order);
+        node = below;
+        for (i = 0; i < continuing; i++) {
+            edge_tree_insert_after(
+                nodes, &sweep.root, order[i].segment, node);
+            node = order[i].segment;
+        }
+        if (below >= 0 && continuing
+            && !sweep_schedule(&sweep, below, order[0].segment, x, y)) {
+            goto done;
+        }
+        if (node >= 0 && above >= 0
+            && !sweep_schedule(&sweep, node, above, x, y)) {
+            goto done;
+        }
+    }
+    ok = 1;
+
+done:
+    PyMem_Free(sweep.events);
+    PyMem_Free(sweep.nodes);
+    PyMem_Free(meeting);
+    PyMem_Free(order);
+    return ok;
+}
+
+/* Append an intersection to the list of results */
+static int
+sweep_report_item(double x, double y, 
+    Py_ssize_t *segments, Py_ssize_t count, void *result)
+{
+    PyObject *item;
+    int ok;
+
+    item = sweep_intersection_item(x, y, segments, count);
+    if (item == NULL) {
+        return 0;
+    }
+    ok = PyList_Append((PyObject *)result, item) == 0;
+    Py_DECREF(item);
+    return ok;
+}
+
+PyObject *
+Planar_find_intersections(PyObject *module, PyObject *segments)
+{
+    planar_vec2_t *ends;
+    PyObject *seq;
+    PyObject *result = NULL;
+    Py_ssize_t n, i;
+
+    seq = PySequence_Fast(segments, 
+        "Expected iterable of LineSegments or point pairs");
+    if (seq == NULL) {
+        return NULL;
+    }
+    n = PySequence_Fast_GET_SIZE(seq);
+    ends = (planar_vec2_t *)PyMem_Malloc(
+        sizeof(planar_vec2_t) * 2 * (n + 1));
+    if (ends == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    for (i = 0; i < n; i++) {
+        if (!sweep_parse_segment(PySequence_Fast_GET_ITEM(seq, i), 
+            ends + i * 2, ends + i * 2 + 1)) {
+            goto done;
+        }
+    }
+    result = PyList_New(0);
+    if (result != NULL 
+        && !planar_find_intersections(ends, n, sweep_report_item, result)) {
+        Py_CLEAR(result);
+    }
+
+done:
+    Py_DECREF(seq);
+    PyMem_Free(ends);
+    return result;
+}
@@ -11,46 +11,701 @@
 #include "Python.h"
 #include "planar.h"
 
-double PLANAR_EPSILON = 1e-5;
-double PLANAR_EPSILON2 = 1e-5 * 1e-5;
+#ifdef PLANAR_HEAP_TYPES
+#include "pythread.h"
+
+#ifdef _MSC_VER
+__declspec(thread) planar_state_cache_t planar_state_cache;
+#else
+_Thread_local planar_state_cache_t planar_state_cache;
+#endif
+unsigned long planar_state_generation = 0;
+planar_state *planar_main_state = NULL;
+
+/* Module state registered for an interpreter by planar_exec() */
+typedef struct planar_state_entry_s {
+    PY_INT64_T interp_id;
+    planar_state *state;
+    struct planar_state_entry_s *next;
+} planar_state_entry_t;
+
+/* Registered states of all interpreters, guarded by the registry lock */
+static planar_state_entry_t *planar_registry = NULL;
+static PyThread_type_lock planar_registry_lock = NULL;
+
+#define Planar_ModuleState(module) ((planar_state *)PyModule_GetState(module))
+
+/* Return the registry lock, allocating it on first use. Return NULL
+   if it cannot be allocated */
+static PyThread_type_lock
+registry_lock(void)
+{
+    PyThread_type_lock lock = Planar_SharedLoadPtr(&planar_registry_lock);
+
+    if (lock == NULL) {
+        lock = PyThread_allocate_lock();
+        if (lock != NULL && !Planar_SharedCompareExchangePtr(
+            &planar_registry_lock, NULL, lock)) {
+            /* Allocated by another interpreter meanwhile */
+            PyThread_free_lock(lock);
+            lock = Planar_SharedLoadPtr(&planar_registry_lock);
+        }
+    }
+    return lock;
+}
+
+/* Find the module state of the interpreter with the id given and cache
+   it for the current thread, return NULL if the module is not loaded */
+planar_state *
+Planar_LookupState(PY_INT64_T interp_id)
+{
+    PyThread_type_lock lock = Planar_SharedLoadPtr(&planar_registry_lock);
+    planar_state_entry_t *entry;
+    planar_state *state = NULL;
+    /* Read before the lookup, so the cache is invalidated if the
+       state found is freed meanwhile */
+    unsigned long generation = Planar_SharedLoad(&planar_state_generation);
+
+    if (lock == NULL) {
+        /* Nothing registered yet */
+        return NULL;
+    }
+    PyThread_acquire_lock(lock, WAIT_LOCK);
+    for (entry = planar_registry; entry != NULL; entry = entry->next) {
+        if (entry->interp_id == interp_id) {
+            state = entry->state;
+            break;
+        }
+    }
+    PyThread_release_lock(lock);
+    planar_state_cache.interp_id = interp_id;
+    planar_state_cache.generation = generation;
+    planar_state_cache.state = state;
+    return state;
+}
+
+/* Register the state for Planar_GetState(), replacing the state of
+   an earlier import of the module in the same interpreter */
+static int
+register_state(planar_state *state)
+{
+    PY_INT64_T interp_id = PyInterpreterState_GetID(PyInterpreterState_Get());
+    PyThread_type_lock lock = registry_lock();
+    planar_state_entry_t *entry;
+
+    if (interp_id < 0) {
+        return -1;
+    }
+    if (lock == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    PyThread_acquire_lock(lock, WAIT_LOCK);
+    for (entry = planar_registry; entry != NULL; entry = entry->next) {
+        if (entry->interp_id == interp_id) {
+            break;
+        }
+    }
+    if (entry == NULL) {
+        entry = PyMem_RawMalloc(sizeof(planar_state_entry_t));
+        if (entry != NULL) {
+            entry->interp_id = interp_id;
+            entry->next = planar_registry;
+            planar_registry = entry;
+        }
+    }
+    if (entry != NULL) {
+        entry->state = state;
+    }
+    PyThread_release_lock(lock);
+    if (entry == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    Planar_SharedIncrement(&planar_state_generation);
+    if (interp_id == 0) {
+        Planar_SharedStorePtr(&planar_main_state, state);
+    }
+    return 0;
+}
+
+/* Unregister the state if it has not been replaced by another 
+   import of the module, and invalidate cached references to it */
+static void
+unregister_state(planar_state *state)
+{
+    PyThread_type_lock lock = Planar_SharedLoadPtr(&planar_registry_lock);
+    planar_state_entry_t **link, *entry;
+
+    Planar_SharedCompareExchangePtr(&planar_main_state, state, NULL);
+    if (lock != NULL) {
+        PyThread_acquire_lock(lock, WAIT_LOCK);
+        for (link = &planar_registry; *link != NULL; link = &(*link)->next) {
+            if ((*link)->state == state) {
+                entry = *link;
+                *link = entry->next;
+                PyMem_RawFree(entry);
+                break;
+            }
+        }
+        PyThread_release_lock(lock);
+    }
+    Planar_SharedIncrement(&planar_state_generation);
+}
+#else
+planar_state planar_global_state;
+
+#define Planar_ModuleState(module) (&planar_global_state)
+#endif
 
 static PyObject *
-_set_epsilon_func(PyObject *self, PyObject *epsilon)
+_set_epsilon_func(PyObject *module, PyObject *epsilon)
 {
+    planar_state *state = Planar_ModuleState(module);
+
     epsilon = PyObject_ToFloat(epsilon);
     if (epsilon == NULL) {
         return NULL;
     }
 
-    PLANAR_EPSILON = PyFloat_AS_DOUBLE(epsilon);
-    PLANAR_EPSILON2 = PLANAR_EPSILON * PLANAR_EPSILON;
+    Planar_AtomicStoreDouble(&state->epsilon, PyFloat_AS_DOUBLE(epsilon));
     Py_DECREF(epsilon);
     Py_INCREF(Py_None);
     return Py_None;
 }
 
-PyObject *PlanarTransformNotInvertibleError;
+#ifdef _WIN32
+#include <windows.h>
+
+PY_LONG_LONG
+Planar_Clock(void)
+{
+    LARGE_INTEGER count, freq;
+
+    QueryPerformanceCounter(&count);
+    QueryPerformanceFrequency(&freq);
+    return (PY_LONG_LONG)(count.QuadPart * (1e9 / freq.QuadPart));
+}
+#else
+#include <time.h>
+
+PY_LONG_LONG
+Planar_Clock(void)
+{
+    struct timespec ts;
+
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (PY_LONG_LONG)ts.tv_sec * 1000000000 + ts.tv_nsec;
+}
+#endif
+
+/* Names of the statistics in planar_state.stats, 
+   see the PLANAR_STAT_* constants */
+static const char *stat_names[PLANAR_STAT_COUNT] = {
+    "pip.radius_inside",
+    "pip.radius_outside",
+    "pip.y_monotone",
+    "pip.bbox_reject",
+    "pip.grid",
+    "pip.winding",
+#define CACHE_STAT_NAMES(name) \
+    "cache." name ".hits", "cache." name ".misses", \
+    "cache." name ".invalidations"
+    CACHE_STAT_NAMES("is_convex"),
+    CACHE_STAT_NAMES("is_simple"),
+    CACHE_STAT_NAMES("centroid"),
+    CACHE_STAT_NAMES("signed_area"),
+    CACHE_STAT_NAMES("perimeter"),
+    CACHE_STAT_NAMES("bounding_box"),
+    CACHE_STAT_NAMES("triangles"),
+    CACHE_STAT_NAMES("y_polylines"),
+    CACHE_STAT_NAMES("grid"),
+#undef CACHE_STAT_NAMES
+    "classify.calls", "classify.time",
+    "check_is_simple.calls", "check_is_simple.time",
+    "convex_hull.calls", "convex_hull.time",
+};
+
+static PyObject *
+_set_stats_enabled_func(PyObject *module, PyObject *enabled)
+{
+    int flag = PyObject_IsTrue(enabled);
+
+    if (flag == -1) {
+        return NULL;
+    }
+    Planar_ModuleState(module)->stats_enabled = flag;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+_reset_stats_func(PyObject *module)
+{
+    planar_state *state = Planar_ModuleState(module);
+
+    memset(state->stats, 0, sizeof(state->stats));
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+static PyObject *
+_stats_func(PyObject *module)
+{
+    planar_state *state = Planar_ModuleState(module);
+    PyObject *stats, *value;
+    int i;
+
+    stats = PyDict_New();
+    if (stats == NULL) {
+        return NULL;
+    }
+    for (i = 0; i < PLANAR_STAT_COUNT; ++i) {
+        if (i >= PLANAR_STAT_CLASSIFY && (i - PLANAR_STAT_CLASSIFY) % 2) {
+            /* Times are reported in seconds */
+            value = PyFloat_FromDouble(state->stats[i] * 1e-9);
+        } else {
+            value = PyLong_FromLongLong(state->stats[i]);
+        }
+        if (value == NULL || PyDict_SetItemString(
+            stats, stat_names[i], value) < 0) {
+            Py_XDECREF(value);
+            Py_DECREF(stats);
+            return NULL;
+        }
+        Py_DECREF(value);
+    }
+    return stats;
+}
+
+/* Recreate an object pickled by Seq2_Reduce() from its type and data.
+   Pickles refer to this function rather than the _from_bytes() class 
+   method of the type, since class methods cannot be pickled in Py 2 */
+static PyObject *
+_from_bytes_func(PyObject *module, PyObject *args)
+{
+    PyObject *type, *data;
+
+    if (!PyArg_ParseTuple(args, "OO:_from_bytes", &type, &data)) {
+        return NULL;
+    }
+    return PyObject_CallMethod(type, "_from_bytes", "O", data);
+}
 
 static PyMethodDef module_functions[] = {
     {"_set_epsilon", (PyCFunction) _set_epsilon_func, METH_O,
      "PRIVATE: Set epsilon value used by C extension"},
+    {"_set_stats_enabled", (PyCFunction) _set_stats_enabled_func, METH_O,
+     "PRIVATE: Enable or disable statistics, see planar.stats"},
+    {"_reset_stats", (PyCFunction) _reset_stats_func, METH_NOARGS,
+     "PRIVATE: Reset statistics to zero, see planar.stats"},
+    {"_stats", (PyCFunction) _stats_func, METH_NOARGS,
+     "PRIVATE: Return a dict of statistics, see planar.stats"},
+    {"_from_bytes", (PyCFunction) _from_bytes_func, METH_VARARGS,
+     "PRIVATE: Recreate a pickled vector sequence or polygon"},
+    {"find_intersections", (PyCFunction) Planar_find_intersections, METH_O,
+     "Find all points where two or more line segments intersect."},
+    {"from_wkb", (PyCFunction) Planar_from_wkb, METH_O,
+     "Decode a geometry from well-known binary (WKB) data."},
+    {"iter_wkb", (PyCFunction) Planar_iter_wkb, METH_O,
+     "Iterate the geometries in a sequence of concatenated WKB records."},
+    {"to_wkb", (PyCFunction) Planar_to_wkb, METH_O,
+     "Encode a geometry as little-endian well-known binary (WKB)."},
     {NULL}
 };
 
 PyDoc_STRVAR(module_doc, "Planar native code classes");
 
-#define INIT_TYPE(type, name) {                                         \
+#ifdef PLANAR_HEAP_TYPES
+
+#define PLANAR_MAX_SLOTS 96
+
+#define ADD_SLOT(id, value) {                \
+    if ((value) != NULL) {                   \
+        slot->slot = (id);                   \
+        slot->pfunc = (void *)(value);       \
+        ++slot;                              \
+    }                                        \
+}
+
+/* Create a heap type for the module from the static type definition 
+   tmpl, with the heap type base in place of the template's base */
+static PyTypeObject *
+new_type_from_template(PyObject *module, PyTypeObject *tmpl,
+    PyTypeObject *base, unsigned long flags)
+{
+    PyType_Slot slots[PLANAR_MAX_SLOTS];
+    PyType_Slot *slot = slots;
+    PyType_Spec spec;
+    PyNumberMethods *nb = tmpl->tp_as_number;
+    PySequenceMethods *sq = tmpl->tp_as_sequence;
+    PyMappingMethods *mp = tmpl->tp_as_mapping;
+    PyBufferProcs *bf = tmpl->tp_as_buffer;
+
+    ADD_SLOT(Py_tp_base, base);
+    ADD_SLOT(Py_tp_dealloc, tmpl->tp_dealloc);
+    ADD_SLOT(Py_tp_repr, tmpl->tp_repr);
+    ADD_SLOT(Py_tp_hash, tmpl->tp_hash);
+    ADD_SLOT(Py_tp_call, tmpl->tp_call);
+    ADD_SLOT(Py_tp_str, tmpl->tp_str);
+    ADD_SLOT(Py_tp_getattro, tmpl->tp_getattro);
+    ADD_SLOT(Py_tp_setattro, tmpl->tp_setattro);
+    ADD_SLOT(Py_tp_doc, tmpl->tp_doc);
+    ADD_SLOT(Py_tp_traverse, tmpl->tp_traverse);
+    ADD_SLOT(Py_tp_clear, tmpl->tp_clear);
+    ADD_SLOT(Py_tp_richcompare, tmpl->tp_richcompare);
+    ADD_SLOT(Py_tp_iter, tmpl->tp_iter);
+    ADD_SLOT(Py_tp_iternext, tmpl->tp_iternext);
+    ADD_SLOT(Py_tp_methods, tmpl->tp_methods);
+    ADD_SLOT(Py_tp_members, tmpl->tp_members);
+    ADD_SLOT(Py_tp_getset, tmpl->tp_getset);
+    ADD_SLOT(Py_tp_descr_get, tmpl->tp_descr_get);
+    ADD_SLOT(Py_tp_descr_set, tmpl->tp_descr_set);
+    ADD_SLOT(Py_tp_init, tmpl->tp_init);
+    ADD_SLOT(Py_tp_alloc, tmpl->tp_alloc);
+    ADD_SLOT(Py_tp_free, tmpl->tp_free);
+    if (tmpl->tp_new != NULL) {
+        ADD_SLOT(Py_tp_new, tmpl->tp_new);
+    } else if (!(flags & Py_TPFLAGS_DISALLOW_INSTANTIATION)) {
+        ADD_SLOT(Py_tp_new, PyType_GenericNew);
+    }
+    if (nb != NULL) {
+        ADD_SLOT(Py_nb_add, nb->nb_add);
+        ADD_SLOT(Py_nb_subtract, nb->nb_subtract);
+        ADD_SLOT(Py_nb_multiply, nb->nb_multiply);
+        ADD_SLOT(Py_nb_remainder, nb->nb_remainder);
+        ADD_SLOT(Py_nb_divmod, nb->nb_divmod);
+        ADD_SLOT(Py_nb_power, nb->nb_power);
+        ADD_SLOT(Py_nb_negative, nb->nb_negative);
+        ADD_SLOT(Py_nb_positive, nb->nb_positive);
+        ADD_SLOT(Py_nb_absolute, nb->nb_absolute);
+        ADD_SLOT(Py_nb_bool, nb->nb_bool);
+        ADD_SLOT(Py_nb_invert, nb->nb_invert);
+        ADD_SLOT(Py_nb_lshift, nb->nb_lshift);
+        ADD_SLOT(Py_nb_rshift, nb->nb_rshift);
+        ADD_SLOT(Py_nb_and, nb->nb_and);
+        ADD_SLOT(Py_nb_xor, nb->nb_xor);
+        ADD_SLOT(Py_nb_or, nb->nb_or);
+        ADD_SLOT(Py_nb_int, nb->nb_int);
+        ADD_SLOT(Py_nb_float, nb->nb_float);
+        ADD_SLOT(Py_nb_inplace_add, nb->nb_inplace_add);
+        ADD_SLOT(Py_nb_inplace_subtract, nb->nb_inplace_subtract);
+        ADD_SLOT(Py_nb_inplace_multiply, nb->nb_inplace_multiply);
+        ADD_SLOT(Py_nb_inplace_remainder, nb->nb_inplace_remainder);
+        ADD_SLOT(Py_nb_inplace_power, nb->nb_inplace_power);
+        ADD_SLOT(Py_nb_inplace_lshift, nb->nb_inplace_lshift);
+        ADD_SLOT(Py_nb_inplace_rshift, nb->nb_inplace_rshift);
+        ADD_SLOT(Py_nb_inplace_and, nb->nb_inplace_and);
+        ADD_SLOT(Py_nb_inplace_xor, nb->nb_inplace_xor);
+        ADD_SLOT(Py_nb_inplace_or, nb->nb_inplace_or);
+        ADD_SLOT(Py_nb_floor_divide, nb->nb_floor_divide);
+        ADD_SLOT(Py_nb_true_divide, nb->nb_true_divide);
+        ADD_SLOT(Py_nb_inplace_floor_divide, nb->nb_inplace_floor_divide);
+        ADD_SLOT(Py_nb_inplace_true_divide, nb->nb_inplace_true_divide);
+        ADD_SLOT(Py_nb_index, nb->nb_index);
+        ADD_SLOT(Py_nb_matrix_multiply, nb->nb_matrix_multiply);
+        ADD_SLOT(Py_nb_inplace_matrix_multiply, 
+            nb->nb_inplace_matrix_multiply);
+    }
+    if (sq != NULL) {
+        ADD_SLOT(Py_sq_length, sq->sq_length);
+        ADD_SLOT(Py_sq_concat, sq->sq_concat);
+        ADD_SLOT(Py_sq_repeat, sq->sq_repeat);
+        ADD_SLOT(Py_sq_item, sq->sq_item);
+        ADD_SLOT(Py_sq_ass_item, sq->sq_ass_item);
+        ADD_SLOT(Py_sq_contains, sq->sq_contains);
+        ADD_SLOT(Py_sq_inplace_concat, sq->sq_inplace_concat);
+        ADD_SLOT(Py_sq_inplace_repeat, sq->sq_inplace_repeat);
+    }
+    if (mp != NULL) {
+        ADD_SLOT(Py_mp_length, mp->mp_length);
+        ADD_SLOT(Py_mp_subscript, mp->mp_subscript);
+        ADD_SLOT(Py_mp_ass_subscript, mp->mp_ass_subscript);
+    }
+    if (bf != NULL) {
+        ADD_SLOT(Py_bf_getbuffer, bf->bf_getbuffer);
+        ADD_SLOT(Py_bf_releasebuffer, bf->bf_releasebuffer);
+    }
+    slot->slot = 0;
+    slot->pfunc = NULL;
+    assert(slot - slots < PLANAR_MAX_SLOTS);
+
+    spec.name = tmpl->tp_name;
+    spec.basicsize = (int)tmpl->tp_basicsize;
+    spec.itemsize = (int)tmpl->tp_itemsize;
+    spec.flags = tmpl->tp_flags | Py_TPFLAGS_IMMUTABLETYPE | flags;
+    spec.slots = slots;
+    return (PyTypeObject *)PyType_FromModuleAndSpec(module, &spec, NULL);
+}
+
+#undef ADD_SLOT
+
+#define NEW_TYPE(field, tmpl, base, flags) {                         \
+    state->field = new_type_from_template(module, &(tmpl), (base), (flags)); \
+    if (state->field == NULL) {                                      \
+        return -1;                                                   \
+    }                                                                \
+}
+
+/* Create the module types for the current interpreter */
+static int
+init_types(PyObject *module, planar_state *state)
+{
+    NEW_TYPE(Vec2Type, PlanarVec2Type, NULL, 0);
+    NEW_TYPE(Seq2Type, PlanarSeq2Type, NULL, 0);
+    NEW_TYPE(Vec2ArrayType, PlanarVec2ArrayType, state->Seq2Type, 0);
+	/* Override inheritance of tp_itemsize, ugly */
+    state->Vec2ArrayType->tp_itemsize = 0;
+    NEW_TYPE(Vec2Array32Type, PlanarVec2Array32Type, NULL, 0);
+    NEW_TYPE(AffineType, PlanarAffineType, NULL, 0);
+    NEW_TYPE(BBoxType, PlanarBBoxType, NULL, 0);
+    NEW_TYPE(LineType, PlanarLineType, NULL, 0);
+    NEW_TYPE(RayType, PlanarRayType, NULL, 0);
+    NEW_TYPE(SegmentType, PlanarSegmentType, NULL, 0);
+    NEW_TYPE(PolygonType, PlanarPolygonType, state->Seq2Type, 0);
+    NEW_TYPE(RTreeType, PlanarRTreeType, NULL, 0);
+    NEW_TYPE(KDTreeType, PlanarKDTreeType, NULL, 0);
+    NEW_TYPE(WKBIterType, PlanarWKBIterType, NULL, 
+        Py_TPFLAGS_DISALLOW_INSTANTIATION);
+
+    /* Construct the basic types without an argument tuple */
+    state->Vec2Type->tp_vectorcall = PlanarVec2_vectorcall;
+    state->AffineType->tp_vectorcall = PlanarAffine_vectorcall;
+    state->BBoxType->tp_vectorcall = PlanarBBox_vectorcall;
+    state->LineType->tp_vectorcall = PlanarLine_vectorcall;
+    state->RayType->tp_vectorcall = PlanarRay_vectorcall;
+    state->SegmentType->tp_vectorcall = PlanarSegment_vectorcall;
+    return 0;
+}
+
+#undef NEW_TYPE
+
+#else
+
+#define INIT_TYPE(field, type) {                                        \
     if ((type).tp_new == 0) {                                           \
 		(type).tp_new = PyType_GenericNew;                              \
     }                                                                   \
     if (PyType_Ready(&(type)) < 0) {                                    \
-        goto fail;                                                      \
+        return -1;                                                      \
     }                                                                   \
-    if (PyModule_AddObject(module, (name), (PyObject *)&(type)) < 0) {  \
-        goto fail;                                                      \
+    state->field = &(type);                                             \
+}
+
+/* Ready the static types shared by all interpreters */
+static int
+init_types(PyObject *module, planar_state *state)
+{
+#if PY_VERSION_HEX >= 0x03090000
+    /* Construct the basic types without an argument tuple */
+    PlanarVec2Type.tp_vectorcall = PlanarVec2_vectorcall;
+    PlanarAffineType.tp_vectorcall = PlanarAffine_vectorcall;
+    PlanarBBoxType.tp_vectorcall = PlanarBBox_vectorcall;
+    PlanarLineType.tp_vectorcall = PlanarLine_vectorcall;
+    PlanarRayType.tp_vectorcall = PlanarRay_vectorcall;
+    PlanarSegmentType.tp_vectorcall = PlanarSegment_vectorcall;
+#endif
+
+    INIT_TYPE(Vec2Type, PlanarVec2Type);
+    INIT_TYPE(Seq2Type, PlanarSeq2Type);
+    INIT_TYPE(Vec2ArrayType, PlanarVec2ArrayType);
+	/* Override inheritance of tp_itemsize, ugly */
+	PlanarVec2ArrayType.tp_itemsize = 0;
+    INIT_TYPE(Vec2Array32Type, PlanarVec2Array32Type);
+    INIT_TYPE(AffineType, PlanarAffineType);
+    INIT_TYPE(BBoxType, PlanarBBoxType);
+    INIT_TYPE(LineType, PlanarLineType);
+    INIT_TYPE(RayType, PlanarRayType);
+    INIT_TYPE(SegmentType, PlanarSegmentType);
+    INIT_TYPE(PolygonType, PlanarPolygonType);
+    INIT_TYPE(RTreeType, PlanarRTreeType);
+    INIT_TYPE(KDTreeType, PlanarKDTreeType);
+	/* Not exposed in the module, created by iter_wkb() */
+	if (PyType_Ready(&PlanarWKBIterType) < 0) {
+		return -1;
+	}
+    state->WKBIterType = &PlanarWKBIterType;
+    return 0;
+}
+
+#undef INIT_TYPE
+
+#endif
+
+/* Initialize the module state, once per interpreter with heap types, 
+   otherwise once per process */
+static int
+init_state(PyObject *module, planar_state *state)
+{
+    if (state->Vec2Type != NULL) {
+        return 0;
+    }
+    state->epsilon = 1e-5;
+    state->from_points_str = PyUnicode_InternFromString("from_points");
+    if (state->from_points_str == NULL) {
+        return -1;
+    }
+    state->bounding_box_str = PyUnicode_InternFromString("bounding_box");
+    if (state->bounding_box_str == NULL) {
+        return -1;
+    }
+    state->from_bytes_func = PyObject_GetAttrString(module, "_from_bytes");
+    if (state->from_bytes_func == NULL) {
+        return -1;
+    }
+	state->TransformNotInvertibleError = PyErr_NewException(
+		"planar.TransformNotInvertibleError", NULL, NULL);
+	if (state->TransformNotInvertibleError == NULL) {
+		return -1;
+	}
+    return init_types(module, state);
+}
+
+#define ADD_OBJECT(name, obj) {                                         \
+    Py_INCREF((PyObject *)(obj));                                       \
+    if (PyModule_AddObject(module, (name), (PyObject *)(obj)) < 0) {    \
+        Py_DECREF((PyObject *)(obj));                                   \
+        return -1;                                                      \
     }                                                                   \
 }
 
+static int
+planar_exec(PyObject *module)
+{
+    planar_state *state = Planar_ModuleState(module);
+
+    if (init_state(module, state) < 0) {
+        return -1;
+    }
+#ifdef PLANAR_HEAP_TYPES
+    if (register_state(state) < 0) {
+        return -1;
+    }
+#endif
+
+    ADD_OBJECT("Vec2", state->Vec2Type);
+    ADD_OBJECT("Seq2", state->Seq2Type);
+    ADD_OBJECT("Vec2Array", state->Vec2ArrayType);
+    ADD_OBJECT("Vec2Array32", state->Vec2Array32Type);
+    ADD_OBJECT("Affine", state->AffineType);
+    ADD_OBJECT("BoundingBox", state->BBoxType);
+    ADD_OBJECT("Line", state->LineType);
+    ADD_OBJECT("Ray", state->RayType);
+    ADD_OBJECT("LineSegment", state->SegmentType);
+    ADD_OBJECT("Polygon", state->PolygonType);
+    ADD_OBJECT("RTree", state->RTreeType);
+    ADD_OBJECT("KDTree", state->KDTreeType);
+    ADD_OBJECT("TransformNotInvertibleError", 
+        state->TransformNotInvertibleError);
+    return 0;
+}
+
+#undef ADD_OBJECT
+
+#ifdef PLANAR_HEAP_TYPES
+
+#define VISIT_STATE(visit_func) {                       \
+    visit_func(state->Vec2Type);                        \
+    visit_func(state->Seq2Type);                        \
+    visit_func(state->Vec2ArrayType);                   \
+    visit_func(state->Vec2Array32Type);                 \
+    visit_func(state->AffineType);                      \
+    visit_func(state->LineType);                        \
+    visit_func(state->RayType);                         \
+    visit_func(state->SegmentType);                     \
+    visit_func(state->BBoxType);                        \
+    visit_func(state->PolygonType);                     \
+    visit_func(state->RTreeType);                       \
+    visit_func(state->KDTreeType);                      \
+    visit_func(state->WKBIterType);                     \
+    visit_func(state->TransformNotInvertibleError);     \
+    visit_func(state->from_points_str);                 \
+    visit_func(state->bounding_box_str);                \
+    visit_func(state->from_bytes_func);                 \
+    visit_func(state->array_type);                      \
+    visit_func(state->holed_polygon_type);              \
+}
+
+static int
+planar_traverse(PyObject *module, visitproc visit, void *arg)
+{
+    planar_state *state = Planar_ModuleState(module);
+
+    VISIT_STATE(Py_VISIT);
+    return 0;
+}
+
+static int
+planar_clear(PyObject *module)
+{
+    planar_state *state = Planar_ModuleState(module);
+
+    VISIT_STATE(Py_CLEAR);
+    return 0;
+}
+
+#undef VISIT_STATE
+
+static void
+planar_free(void *module)
+{
+    planar_state *state = Planar_ModuleState((PyObject *)module);
+
+    unregister_state(state);
+    Planar_FreeListClear(&state->vec2_free);
+    Planar_FreeListClear(&state->affine_free);
+    Planar_FreeListClear(&state->bbox_free);
+    planar_clear((PyObject *)module);
+}
+
+#endif
+
+#if PY_VERSION_HEX >= 0x03050000
+
+static PyModuleDef_Slot module_slots[] = {
+    {Py_mod_exec, (void *)planar_exec},
+#ifdef PLANAR_HEAP_TYPES
+    {Py_mod_multiple_interpreters, Py_MOD_PER_INTERPRETER_GIL_SUPPORTED},
+#endif
+#ifdef Py_GIL_DISABLED
+    /* Safe to use without the GIL, see the free threading utils 
+       in planar.h */
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, NULL}
+};
+
+struct PyModuleDef planar_moduledef = {
+        PyModuleDef_HEAD_INIT,
+        "planar.c",
+        module_doc,
+#ifdef PLANAR_HEAP_TYPES
+        sizeof(planar_state), /* m_size */
+#else
+        0,                  /* m_size */
+#endif
+        module_functions,   /* m_methods */
+        module_slots,       /* m_slots */
+#ifdef PLANAR_HEAP_TYPES
+        planar_traverse,    /* m_traverse */
+        planar_clear,       /* m_clear */
+        planar_free         /* m_free */
+#else
+        NULL,               /* m_traverse */
+        NULL,               /* m_clear */
+        NULL                /* m_free */
+#endif
+};
+
+PyMODINIT_FUNC
+PyInit_c(void)
+{
+    return PyModuleDef_Init(&planar_moduledef);
+}
+
+#else
+/* Single-phase initialization for older Pythons */
+
 #if PY_MAJOR_VERSION >= 3
 
 static struct PyModuleDef moduledef = {
@@ -82,55 +737,18 @@ initc(void)
 #else
     PyObject *module = Py_InitModule3("c", module_functions, module_doc);
 #endif
-    Py_INCREF((PyObject *)&PlanarVec2Type);
-    Py_INCREF((PyObject *)&PlanarSeq2Type);
-    Py_INCREF((PyObject *)&PlanarVec2ArrayType);
-    Py_INCREF((PyObject *)&PlanarAffineType);
-    Py_INCREF((PyObject *)&PlanarBBoxType);
-    Py_INCREF((PyObject *)&PlanarLineType);
-    Py_INCREF((PyObject *)&PlanarRayType);
-    Py_INCREF((PyObject *)&PlanarSegmentType);
-    Py_INCREF((PyObject *)&PlanarPolygonType);
-
-    INIT_TYPE(PlanarVec2Type, "Vec2");
-    INIT_TYPE(PlanarSeq2Type, "Seq2");
-    INIT_TYPE(PlanarVec2ArrayType, "Vec2Array");
-	/* Override inheritance of tp_itemsize, ugly */
-	PlanarVec2ArrayType.tp_itemsize = 0;
-    INIT_TYPE(PlanarAffineType, "Affine");
-    INIT_TYPE(PlanarBBoxType, "BoundingBox");
-    INIT_TYPE(PlanarLineType, "Line");
-    INIT_TYPE(PlanarRayType, "Ray");
-    INIT_TYPE(PlanarSegmentType, "LineSegment");
-    INIT_TYPE(PlanarPolygonType, "Polygon");
-
-	PlanarTransformNotInvertibleError = PyErr_NewException(
-		"planar.TransformNotInvertibleError", NULL, NULL);
-	if (PlanarTransformNotInvertibleError == NULL) {
-		goto fail;
-	}
-    if (PyModule_AddObject(
-        module, "TransformNotInvertibleError", 
-		PlanarTransformNotInvertibleError) < 0) {
-        Py_DECREF(PlanarTransformNotInvertibleError);
-        goto fail;
+    if (module == NULL) {
+        INITERROR;
+    }
+    if (planar_exec(module) < 0) {
+        Py_DECREF(module);
+        INITERROR;
     }
 #if PY_MAJOR_VERSION >= 3
     return module;
 #else
     return;
 #endif
-fail:
-    Py_DECREF((PyObject *)&PlanarVec2Type);
-    Py_DECREF((PyObject *)&PlanarSeq2Type);
-    Py_DECREF((PyObject *)&PlanarVec2ArrayType);
-    Py_DECREF((PyObject *)&PlanarAffineType);
-    Py_DECREF((PyObject *)&PlanarBBoxType);
-    Py_DECREF((PyObject *)&PlanarLineType);
-    Py_DECREF((PyObject *)&PlanarRayType);
-    Py_DECREF((PyObject *)&PlanarSegmentType);
-    Py_DECREF((PyObject *)&PlanarPolygonType);
-    Py_DECREF(module);
-    INITERROR;
 }
 
+#endif
@@ -75,20 +75,37 @@ error:
 	return NULL;
 }
 
+static void
+pip_grid_free(planar_pip_grid_t *grid)
+{
+	if (grid != NULL) {
+		PyMem_Free(grid->cell_start);
+		PyMem_Free(grid->cell_edges);
+		PyMem_Free(grid->winding);
+		PyMem_Free(grid);
+	}
+}
+
 static void
 Poly_dealloc(PlanarPolygonObject *self) {
 	Py_XDECREF(self->bbox);
 	self->bbox = NULL;
+	pip_grid_free(self->grid);
+	self->grid = NULL;
 	if (self->lt_y_poly != NULL) {
 		PyMem_Free(self->lt_y_poly);
 		self->lt_y_poly = NULL;
 		self->rt_y_poly = NULL;
 	}
-    Py_TYPE(self)->tp_free((PyObject *)self);
+	if (self->triangles != NULL) {
+		PyMem_Free(self->triangles);
+		self->triangles = NULL;
+	}
+    Planar_FreeObject((PyObject *)self);
 }
 
 static PyObject *
-Poly_copy(PlanarPolygonObject *self, PyObject *args)
+poly_copy(PlanarPolygonObject *self)
 {
 	PyObject *result;
     PlanarPolygonObject *poly;
@@ -100,9 +117,11 @@ Poly_copy(PlanarPolygonObject *self, PyObject *args)
     }
     memcpy(poly->vert, self->vert, sizeof(planar_vec2_t) * Py_SIZE(self));
 	if (PlanarPolygon_CheckExact(self)) {
-		poly->flags = self->flags;
+		poly->flags = POLY_FLAGS(self);
 		poly->centroid.x = self->centroid.x;
 		poly->centroid.y = self->centroid.y;
+		poly->signed_area = self->signed_area;
+		poly->perimeter = self->perimeter;
 		poly->min_r2 = self->min_r2;
 		poly->max_r2 = self->max_r2;
 		if (self->lt_y_poly != NULL) {
@@ -117,6 +136,17 @@ Poly_copy(PlanarPolygonObject *self, PyObject *args)
 			poly->rt_y_poly = poly->lt_y_poly + (
 				self->rt_y_poly - self->lt_y_poly);
 		}
+		if (self->triangles != NULL) {
+			poly->triangles = (unsigned int *)PyMem_Malloc(
+				sizeof(unsigned int) * self->triangle_count * 3);
+			if (poly->triangles == NULL) {
+				Py_DECREF(poly);
+				return PyErr_NoMemory();
+			}
+			memcpy(poly->triangles, self->triangles, 
+				sizeof(unsigned int) * self->triangle_count * 3);
+			poly->triangle_count = self->triangle_count;
+		}
 		return (PyObject *)poly;
 	} else {
 		result = call_from_points((PyObject *)self, (PyObject *)poly);
@@ -125,6 +155,17 @@ Poly_copy(PlanarPolygonObject *self, PyObject *args)
 	}
 }
 
+static PyObject *
+Poly_copy(PlanarPolygonObject *self, PyObject *args)
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = poly_copy(self);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
 static PlanarPolygonObject *
 Poly_create_new_from_points(PyTypeObject *type, PyObject *points)
 {
@@ -171,24 +212,28 @@ Poly_create_new_from_points(PyTypeObject *type, PyObject *points)
 }
 
 static PlanarPolygonObject *
-Poly_create_new_regular(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+Poly_create_new_regular(PyTypeObject *type, PyObject *const *args, 
+	Py_ssize_t nargs, PyObject *kwnames)
 {
 	Py_ssize_t vert_count, i;
 	double radius, angle_step, x, y;
-	PyObject *center_arg = NULL;
+	PyObject *values[4], *center_arg;
 	double center_x = 0.0, center_y = 0.0;
 	double angle = 0.0;
 	planar_vec2_t *vert;
 	PlanarPolygonObject *poly;
 
-    static char *kwlist[] = {
+    static const char *const kwlist[] = {
 		"vertex_count", "radius", "center", "angle", NULL};
 
-    if (!PyArg_ParseTupleAndKeywords(
-        args, kwargs, "nd|Od:Polygon.regular", kwlist, 
-			&vert_count, &radius, &center_arg, &angle)) {
+    if (!Planar_ParseKeywords("Polygon.regular", args, nargs, kwnames, 
+			kwlist, 2, values)
+		|| !Planar_OptionalSsize(values[0], &vert_count)
+		|| !Planar_OptionalDouble(values[1], &radius)
+		|| !Planar_OptionalDouble(values[3], &angle)) {
         return NULL;
     }
+	center_arg = values[2];
 	if (center_arg != NULL) {
 		if (!PlanarVec2_Parse(center_arg, &center_x, &center_y)) {
 			PyErr_SetString(PyExc_TypeError,
@@ -224,25 +269,32 @@ Poly_create_new_regular(PyTypeObject *type, PyObject *args, PyObject *kwargs)
 	return poly;
 }
 
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Poly_create_new_regular)
+
 static PlanarPolygonObject *
-Poly_create_new_star(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+Poly_create_new_star(PyTypeObject *type, PyObject *const *args, 
+	Py_ssize_t nargs, PyObject *kwnames)
 {
 	Py_ssize_t peak_count, i;
 	double radius1, radius2, angle_step, x, y;
-	PyObject *center_arg = NULL;
+	PyObject *values[5], *center_arg;
 	double center_x = 0.0, center_y = 0.0;
 	double angle = 0.0;
 	planar_vec2_t *vert;
 	PlanarPolygonObject *poly;
 
-    static char *kwlist[] = {
+    static const char *const kwlist[] = {
 		"peak_count", "radius1", "radius2", "center", "angle", NULL};
 
-    if (!PyArg_ParseTupleAndKeywords(
-        args, kwargs, "ndd|Od:Polygon.regular", kwlist, 
-			&peak_count, &radius1, &radius2, &center_arg, &angle)) {
+    if (!Planar_ParseKeywords("Polygon.star", args, nargs, kwnames, 
+			kwlist, 3, values)
+		|| !Planar_OptionalSsize(values[0], &peak_count)
+		|| !Planar_OptionalDouble(values[1], &radius1)
+		|| !Planar_OptionalDouble(values[2], &radius2)
+		|| !Planar_OptionalDouble(values[4], &angle)) {
         return NULL;
     }
+	center_arg = values[3];
 	if (peak_count < 2) {
 		PyErr_SetString(PyExc_ValueError,
 			"star polygon must have a minimum of 2 peaks");
@@ -307,6 +359,8 @@ Poly_create_new_star(PyTypeObject *type, PyObject *args, PyObject *kwargs)
 	return poly;
 }
 
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Poly_create_new_star)
+
 #define DUP_FIRST_VERT(poly) {                          \
 	(poly)->vert[Py_SIZE(poly)].x = (poly)->vert[0].x;  \
 	(poly)->vert[Py_SIZE(poly)].y = (poly)->vert[0].y;  \
@@ -317,6 +371,23 @@ Poly_create_new_star(PyTypeObject *type, PyObject *args, PyObject *kwargs)
 	(poly)->data[0].y = (poly)->vert[Py_SIZE(poly)-1].y;  \
 }
 
+/* Execute stmt, which reads the polygon's vertices, with the GIL released
+   if the polygon is large. If another thread mutates the polygon
+   meanwhile, stmt is executed again with the GIL held, so that the
+   results cached on the polygon are consistent with its vertices */
+#define POLY_NOGIL(poly, stmt) {                                \
+	unsigned long _version = (poly)->version;                   \
+	PyThreadState *_state = Planar_BeginNoGIL(Py_SIZE(poly));   \
+	stmt;                                                       \
+	if (_state != NULL) {                                       \
+		Planar_EndNoGIL(_state);                                \
+		if (_version != (poly)->version) {                      \
+			DUP_FIRST_VERT(poly);                               \
+			stmt;                                               \
+		}                                                       \
+	}                                                           \
+}
+
 /* Comparison function for sorting of vector triples */
 static int
 compare_vec_triples(const void *a, const void *b)
@@ -455,26 +526,28 @@ Poly_compare(PyObject *a, PyObject *b, int op)
 /* Property descriptors */
 
 /* Calculate the polygon convexity, winding direction,
- * detecting and handling degenerate cases.
+ * detecting and handling degenerate cases. Return the 
+ * resulting polygon flags. The first vertex must be
+ * duplicated after the last.
  */
-static void
-Poly_classify(PlanarPolygonObject *self) 
+static unsigned long
+classify_verts(const planar_vec2_t *vert, const Py_ssize_t size) 
 {
 	int dir_changes = 0;
 	Py_ssize_t count = 0;
 	int same_turns = 1;
 	Py_ssize_t i;
-	const Py_ssize_t size = Py_SIZE(self);
-	const planar_vec2_t *vert = self->vert;
-	double last_dx = vert[0].x - vert[size - 1].x;
-	double last_dy = vert[0].y - vert[size - 1].y;
+	unsigned long flags;
+	double last_dx = 0.0;
+	double last_dy = 0.0;
 	double dx, dy;
 	double side = 0.0;
 	double last_side = 0.0;
 	int last_dir, this_dir;
-	DUP_FIRST_VERT(self);
 
-	for (i = 1; i <= size && !last_dx && !last_dy; ++i) {
+	/* Zero-length edges are skipped, so the turn at the first vertex
+	   is measured from the last edge with any length */
+	for (i = size; i > 0 && !last_dx && !last_dy; --i) {
 		last_dx = vert[i].x - vert[i - 1].x;
 		last_dy = vert[i].y - vert[i - 1].y;
 	}
@@ -482,12 +555,14 @@ Poly_classify(PlanarPolygonObject *self)
 	last_dir = last_dx ? (last_dx < 0.0) - (last_dx > 0.0) 
 		: (last_dy < 0.0) - (last_dy > 0.0);
 
-	for (; i <= size && same_turns && dir_changes <= 2; ++i) {
+	for (i = 1; i <= size && same_turns && dir_changes <= 2; ++i) {
 		dx = vert[i].x - vert[i - 1].x;
 		dy = vert[i].y - vert[i - 1].y;
 		if (dx != 0.0 || dy != 0.0) {
 			this_dir = (dx < 0.0) - (dx > 0.0) ;
-			this_dir += (!this_dir) & ((dy < 0.0) - (dy > 0.0));
+			if (!this_dir) {
+				this_dir = (dy < 0.0) - (dy > 0.0);
+			}
 			dir_changes += (this_dir == -last_dir);
 			last_dir = this_dir;
 			side = last_dx * dy - last_dy * dx;
@@ -495,6 +570,9 @@ Poly_classify(PlanarPolygonObject *self)
 				same_turns = (side > 0.0) == (last_side > 0.0)
 					|| last_side == 0.0;
 				last_side = side;
+			} else if (last_dx * dx + last_dy * dy < 0.0) {
+				/* Edge turns straight back along the last one */
+				same_turns = 0;
 			}
 			last_dx = dx;
 			last_dy = dy;
@@ -502,101 +580,485 @@ Poly_classify(PlanarPolygonObject *self)
 		}
 	}
 	if (same_turns && dir_changes <= 2) {
-		self->flags |= (POLY_CONVEX_KNOWN_FLAG | POLY_CONVEX_FLAG
+		flags = (POLY_CONVEX_KNOWN_FLAG | POLY_CONVEX_FLAG
 			| POLY_SIMPLE_KNOWN_FLAG | POLY_SIMPLE_FLAG 
 			| POLY_DUP_VERTS_KNOWN_FLAG);
-		if (count < Py_SIZE(self)) {
-			self->flags |= POLY_DUP_VERTS_FLAG;
-		} else {
-			self->flags &= ~POLY_DUP_VERTS_FLAG;
+		if (count < size) {
+			flags |= POLY_DUP_VERTS_FLAG;
 		}
 	} else {
-		self->flags |= POLY_CONVEX_KNOWN_FLAG;
-		self->flags &= ~POLY_CONVEX_FLAG;
+		flags = POLY_CONVEX_KNOWN_FLAG;
 	}
-	self->flags |= POLY_DEGEN_KNOWN_FLAG;
+	flags |= POLY_DEGEN_KNOWN_FLAG;
 	if (!count || !side) {
-		self->flags |= POLY_DEGEN_FLAG;
-	} else {
-		self->flags &= ~POLY_DEGEN_FLAG;
+		flags |= POLY_DEGEN_FLAG;
 	}
+	return flags;
 }
 
-/* Check the polygon for self-intersection */
+static void
+Poly_classify(PlanarPolygonObject *self) 
+{
+	unsigned long flags;
+	PY_LONG_LONG start = PLANAR_STAT_START();
+
+	DUP_FIRST_VERT(self);
+	POLY_NOGIL(self, flags = classify_verts(self->vert, Py_SIZE(self)));
+	POLY_UPDATE_FLAGS(self, POLY_CONVEX_FLAG | POLY_DEGEN_FLAG
+		| (flags & POLY_CONVEX_FLAG ? POLY_DUP_VERTS_FLAG : 0), flags);
+	PLANAR_STAT_TIME(PLANAR_STAT_CLASSIFY, start);
+}
+
+typedef struct {
+	planar_vec2_t *pt;
+	int is_end;
+	Py_ssize_t edge;
+} planar_edge_event_t;
+
+/* Comparison function for sorting sweep events. Events are ordered
+   lexicographically by point, with edge starts before edge ends */
 static int
-Poly_check_is_simple(PlanarPolygonObject *self)
+compare_edge_events(const void *a, const void *b)
 {
-	planar_vec2_t **points, **p, *v;
-	planar_vec2_t **open = NULL;
-	planar_vec2_t **o, **next_open;
-	const Py_ssize_t size = Py_SIZE(self);
-	const Py_ssize_t last_index = size - 1;
-	int result = 1;
+	const planar_edge_event_t *ea = (planar_edge_event_t *)a;
+	const planar_edge_event_t *eb = (planar_edge_event_t *)b;
+	int result = (ea->pt->x > eb->pt->x) - (ea->pt->x < eb->pt->x);
+	if (!result) {
+		result = (ea->pt->y > eb->pt->y) - (ea->pt->y < eb->pt->y);
+	}
+	if (!result) {
+		result = ea->is_end - eb->is_end;
+	}
+	if (!result) {
+		result = (ea->edge > eb->edge) - (ea->edge < eb->edge);
+	}
+	return result;
+}
 
-	points = (planar_vec2_t **)PyMem_Malloc(
-		sizeof(planar_vec2_t *) * size);
-	if (points == NULL) {
-		PyErr_NoMemory();
-		result = 0;
-		goto finish;
+#define ORIENT(a, b, c) \
+	(((b)->x - (a)->x)*((c)->y - (a)->y) - ((c)->x - (a)->x)*((b)->y - (a)->y))
+
+/* Return true if edge i is ordered before edge j along the sweep line.
+   The position of the edge that begins later is compared against the 
+   line of the other edge */
+static int
+edge_below(planar_edge_node_t *nodes, Py_ssize_t i, Py_ssize_t j)
+{
+	const planar_edge_node_t *a = nodes + i;
+	const planar_edge_node_t *b = nodes + j;
+	double side;
+
+	if (compare_vec_lexi(&a->start, &b->start) <= 0) {
+		side = (a->start == b->start) ? 0.0 : ORIENT(a->start, a->end, b->start);
+		if (side == 0.0) {
+			side = ORIENT(a->start, a->end, b->end);
+		}
+		if (side != 0.0) {
+			return side > 0.0;
+		}
+	} else {
+		side = ORIENT(b->start, b->end, a->start);
+		if (side == 0.0) {
+			side = ORIENT(b->start, b->end, a->end);
+		}
+		if (side != 0.0) {
+			return side < 0.0;
+		}
 	}
-	DUP_FIRST_VERT(self);
-	p = points;
-	for (v = self->vert; v < self->vert + size; ++v) {
-		*(p++) = v;
-	}
-	qsort(points, size, sizeof(planar_vec2_t *), compare_vec_lexi);	
-	open = (planar_vec2_t **)PyMem_Malloc(
-		sizeof(planar_vec2_t *) * (size + 1));
-	if (open == NULL) {
-		PyErr_NoMemory();
-		result = 0;
-		goto finish;
+	/* collinear edges are ordered arbitrarily */
+	return i < j;
+}
+
+#define NODE_HEIGHT(nodes, n) ((n) >= 0 ? (nodes)[n].height : 0)
+
+static void
+edge_tree_update(planar_edge_node_t *nodes, Py_ssize_t n)
+{
+	const int lh = NODE_HEIGHT(nodes, nodes[n].left);
+	const int rh = NODE_HEIGHT(nodes, nodes[n].right);
+	nodes[n].height = 1 + (lh > rh ? lh : rh);
+}
+
+/* Replace node n with child in n's parent */
+static void
+edge_tree_replace(planar_edge_node_t *nodes, Py_ssize_t *root,
+	Py_ssize_t n, Py_ssize_t child)
+{
+	const Py_ssize_t parent = nodes[n].parent;
+	if (parent < 0) {
+		*root = child;
+	} else if (nodes[parent].left == n) {
+		nodes[parent].left = child;
+	} else {
+		nodes[parent].right = child;
 	}
+	if (child >= 0) {
+		nodes[child].parent = parent;
+	}
+}
 
-	next_open = open;
-	for (p = points; p < points + size; ++p) {
-		for (o = open; o < next_open; ++o) {
-			if ((*p == (*o)+1) | (*o - *p == last_index)) {
-				/* Segment end point */ 
-				--next_open;
-				if (o < next_open && *o != *next_open) {
-					*o = *next_open;
-					--o;
-				}
-			} else if (abs(*p - *o) > 1 && abs(*p - *o) < last_index 
-				/* ignore adjacent edges */
-				&& segments_intersect(*p, (*p)+1, *o, (*o)+1)) {
-				self->flags |= POLY_SIMPLE_KNOWN_FLAG;
-				self->flags &= ~POLY_SIMPLE_FLAG;
-				goto finish;
+static Py_ssize_t
+edge_tree_rotate_left(planar_edge_node_t *nodes, Py_ssize_t *root, 
+	Py_ssize_t n)
+{
+	const Py_ssize_t pivot = nodes[n].right;
+	nodes[n].right = nodes[pivot].left;
+	if (nodes[pivot].left >= 0) {
+		nodes[nodes[pivot].left].parent = n;
+	}
+	edge_tree_replace(nodes, root, n, pivot);
+	nodes[pivot].left = n;
+	nodes[n].parent = pivot;
+	edge_tree_update(nodes, n);
+	edge_tree_update(nodes, pivot);
+	return pivot;
+}
+
+static Py_ssize_t
+edge_tree_rotate_right(planar_edge_node_t *nodes, Py_ssize_t *root, 
+	Py_ssize_t n)
+{
+	const Py_ssize_t pivot = nodes[n].left;
+	nodes[n].left = nodes[pivot].right;
+	if (nodes[pivot].right >= 0) {
+		nodes[nodes[pivot].right].parent = n;
+	}
+	edge_tree_replace(nodes, root, n, pivot);
+	nodes[pivot].right = n;
+	nodes[n].parent = pivot;
+	edge_tree_update(nodes, n);
+	edge_tree_update(nodes, pivot);
+	return pivot;
+}
+
+/* Restore the AVL height balance from node n up to the root */
+static void
+edge_tree_rebalance(planar_edge_node_t *nodes, Py_ssize_t *root, 
+	Py_ssize_t n)
+{
+	Py_ssize_t l, r;
+	int balance;
+
+	while (n >= 0) {
+		edge_tree_update(nodes, n);
+		l = nodes[n].left;
+		r = nodes[n].right;
+		balance = NODE_HEIGHT(nodes, l) - NODE_HEIGHT(nodes, r);
+		if (balance > 1) {
+			if (NODE_HEIGHT(nodes, nodes[l].left) 
+				< NODE_HEIGHT(nodes, nodes[l].right)) {
+				edge_tree_rotate_left(nodes, root, l);
 			}
+			n = edge_tree_rotate_right(nodes, root, n);
+		} else if (balance < -1) {
+			if (NODE_HEIGHT(nodes, nodes[r].right) 
+				< NODE_HEIGHT(nodes, nodes[r].left)) {
+				edge_tree_rotate_right(nodes, root, r);
+			}
+			n = edge_tree_rotate_left(nodes, root, n);
 		}
-		*(next_open++) = *p;
+		n = nodes[n].parent;
 	}
-	self->flags |= POLY_SIMPLE_KNOWN_FLAG | POLY_SIMPLE_FLAG;
-finish:
-	if (open != NULL) {
-		PyMem_Free(open);
+}
+
+/* Return the first node in the subtree at n */
+Py_ssize_t
+edge_tree_first(planar_edge_node_t *nodes, Py_ssize_t n)
+{
+	while (nodes[n].left >= 0) {
+		n = nodes[n].left;
+	}
+	return n;
+}
+
+static void
+edge_tree_insert(planar_edge_node_t *nodes, Py_ssize_t *root, Py_ssize_t n)
+{
+	Py_ssize_t parent = *root;
+
+	nodes[n].left = nodes[n].right = nodes[n].parent = -1;
+	nodes[n].height = 1;
+	if (parent < 0) {
+		*root = n;
+		return;
 	}
-	if (points != NULL) {
-		PyMem_Free(points);
+	for (;;) {
+		if (edge_below(nodes, n, parent)) {
+			if (nodes[parent].left < 0) {
+				nodes[parent].left = n;
+				break;
+			}
+			parent = nodes[parent].left;
+		} else {
+			if (nodes[parent].right < 0) {
+				nodes[parent].right = n;
+				break;
+			}
+			parent = nodes[parent].right;
+		}
 	}
-	return result;
+	nodes[n].parent = parent;
+	edge_tree_rebalance(nodes, root, parent);
+}
+
+/* Insert node n immediately after node after, or first if after is -1,
+   without comparing edges. Used when the position is already known */
+void
+edge_tree_insert_after(planar_edge_node_t *nodes, Py_ssize_t *root,
+	Py_ssize_t n, Py_ssize_t after)
+{
+	Py_ssize_t parent;
+
+	nodes[n].left = nodes[n].right = nodes[n].parent = -1;
+	nodes[n].height = 1;
+	if (after < 0) {
+		if (*root < 0) {
+			*root = n;
+			return;
+		}
+		parent = edge_tree_first(nodes, *root);
+		nodes[parent].left = n;
+	} else if (nodes[after].right < 0) {
+		parent = after;
+		nodes[parent].right = n;
+	} else {
+		parent = edge_tree_first(nodes, nodes[after].right);
+		nodes[parent].left = n;
+	}
+	nodes[n].parent = parent;
+	edge_tree_rebalance(nodes, root, parent);
+}
+
+void
+edge_tree_remove(planar_edge_node_t *nodes, Py_ssize_t *root, Py_ssize_t n)
+{
+	Py_ssize_t succ, start;
+
+	if (nodes[n].left >= 0 && nodes[n].right >= 0) {
+		/* Replace the node with its successor */
+		succ = nodes[n].right;
+		while (nodes[succ].left >= 0) {
+			succ = nodes[succ].left;
+		}
+		if (nodes[succ].parent != n) {
+			start = nodes[succ].parent;
+			edge_tree_replace(nodes, root, succ, nodes[succ].right);
+			nodes[succ].right = nodes[n].right;
+			nodes[nodes[succ].right].parent = succ;
+		} else {
+			start = succ;
+		}
+		edge_tree_replace(nodes, root, n, succ);
+		nodes[succ].left = nodes[n].left;
+		nodes[nodes[succ].left].parent = succ;
+		nodes[succ].height = nodes[n].height;
+	} else {
+		start = nodes[n].parent;
+		edge_tree_replace(nodes, root, n, 
+			nodes[n].left >= 0 ? nodes[n].left : nodes[n].right);
+	}
+	edge_tree_rebalance(nodes, root, start);
+}
+
+Py_ssize_t
+edge_tree_prev(planar_edge_node_t *nodes, Py_ssize_t n)
+{
+	if (nodes[n].left >= 0) {
+		n = nodes[n].left;
+		while (nodes[n].right >= 0) {
+			n = nodes[n].right;
+		}
+		return n;
+	}
+	while (nodes[n].parent >= 0 && nodes[nodes[n].parent].left == n) {
+		n = nodes[n].parent;
+	}
+	return nodes[n].parent;
+}
+
+Py_ssize_t
+edge_tree_next(planar_edge_node_t *nodes, Py_ssize_t n)
+{
+	if (nodes[n].right >= 0) {
+		n = nodes[n].right;
+		while (nodes[n].left >= 0) {
+			n = nodes[n].left;
+		}
+		return n;
+	}
+	while (nodes[n].parent >= 0 && nodes[nodes[n].parent].right == n) {
+		n = nodes[n].parent;
+	}
+	return nodes[n].parent;
+}
+
+/* Return true if polygon edges i and j intersect. Adjacent edges
+   may only share their common vertex */
+static int
+edges_intersect(planar_edge_node_t *nodes, Py_ssize_t i, Py_ssize_t j, 
+	Py_ssize_t last_index)
+{
+	planar_edge_node_t *a, *b;
+	planar_vec2_t *lo, *hi;
+	Py_ssize_t diff;
+	int adjacent, overlap;
+
+	if (j < 0) {
+		return 0;
+	}
+	a = nodes + i;
+	b = nodes + j;
+	diff = i > j ? i - j : j - i;
+	adjacent = (diff == 1) | (diff == last_index);
+	if (!adjacent && segments_intersect(a->start, a->end, b->start, b->end)) {
+		return 1;
+	}
+	/* Collinear edges are not ordered along the sweep line, 
+	   so overlaps must be detected here */
+	if (ORIENT(a->start, a->end, b->start) != 0.0 
+		|| ORIENT(a->start, a->end, b->end) != 0.0) {
+		return 0;
+	}
+	lo = compare_vec_lexi(&a->start, &b->start) >= 0 ? a->start : b->start;
+	hi = compare_vec_lexi(&a->end, &b->end) <= 0 ? a->end : b->end;
+	overlap = compare_vec_lexi(&lo, &hi);
+	return adjacent ? overlap < 0 : overlap <= 0;
+}
+
+/* Return true if an edge turns straight back along the edge before it,
+   skipping zero-length edges. The two edges overlap, but are identical
+   along their overlap, so they need not be neighbors in the sweep status.
+   The first vertex must be duplicated after the last */
+static int
+edges_double_back(planar_vec2_t *vert, const Py_ssize_t size)
+{
+	double prev_dx = 0.0, prev_dy = 0.0, dx, dy;
+	Py_ssize_t i;
+
+	for (i = size - 1; i >= 0 && prev_dx == 0.0 && prev_dy == 0.0; --i) {
+		prev_dx = vert[i + 1].x - vert[i].x;
+		prev_dy = vert[i + 1].y - vert[i].y;
+	}
+	for (i = 0; i < size; ++i) {
+		dx = vert[i + 1].x - vert[i].x;
+		dy = vert[i + 1].y - vert[i].y;
+		if (dx == 0.0 && dy == 0.0) {
+			continue;
+		}
+		if (prev_dx * dy - prev_dy * dx == 0.0 
+			&& prev_dx * dx + prev_dy * dy < 0.0) {
+			return 1;
+		}
+		prev_dx = dx;
+		prev_dy = dy;
+	}
+	return 0;
+}
+
+/* Check the polygon vertices for self-intersection using the Shamos-Hoey
+   sweep line algorithm. The edges crossing the sweep line are kept 
+   ordered in an AVL tree, so this takes O(n log n) time worst case.
+   The first vertex must be duplicated after the last */
+static int
+is_simple_verts(planar_vec2_t *vert, const Py_ssize_t size, 
+	planar_edge_node_t *nodes, planar_edge_event_t *events)
+{
+	planar_edge_event_t *e;
+	planar_vec2_t *v, *w;
+	const Py_ssize_t last_index = size - 1;
+	Py_ssize_t i, prev, next, root = -1, event_count = 0;
+	int simple = 1;
+
+	if (edges_double_back(vert, size)) {
+		return 0;
+	}
+	for (i = 0; i < size; ++i) {
+		v = vert + i;
+		w = v + 1;
+		if (compare_vec_lexi(&v, &w) <= 0) {
+			nodes[i].start = v;
+			nodes[i].end = w;
+		} else {
+			nodes[i].start = w;
+			nodes[i].end = v;
+		}
+		/* Zero-length edges cannot intersect anything */
+		if (v->x != w->x || v->y != w->y) {
+			events[event_count].pt = nodes[i].start;
+			events[event_count].is_end = 0;
+			events[event_count++].edge = i;
+			events[event_count].pt = nodes[i].end;
+			events[event_count].is_end = 1;
+			events[event_count++].edge = i;
+		}
+	}
+	qsort(events, event_count, sizeof(planar_edge_event_t), 
+		compare_edge_events);
+
+	for (e = events; simple && e < events + event_count; ++e) {
+		i = e->edge;
+		if (!e->is_end) {
+			edge_tree_insert(nodes, &root, i);
+			simple = !(
+				edges_intersect(nodes, i, edge_tree_prev(nodes, i), last_index)
+				|| edges_intersect(nodes, i, edge_tree_next(nodes, i), 
+					last_index));
+		} else {
+			prev = edge_tree_prev(nodes, i);
+			next = edge_tree_next(nodes, i);
+			edge_tree_remove(nodes, &root, i);
+			simple = !(prev >= 0 
+				&& edges_intersect(nodes, prev, next, last_index));
+		}
+	}
+	return simple;
+}
+
+static int
+Poly_check_is_simple(PlanarPolygonObject *self)
+{
+	planar_edge_node_t *nodes = NULL;
+	planar_edge_event_t *events = NULL;
+	const Py_ssize_t size = Py_SIZE(self);
+	int simple;
+	PY_LONG_LONG start = PLANAR_STAT_START();
+
+	nodes = (planar_edge_node_t *)PyMem_Malloc(
+		sizeof(planar_edge_node_t) * size);
+	events = (planar_edge_event_t *)PyMem_Malloc(
+		sizeof(planar_edge_event_t) * size * 2);
+	if (nodes == NULL || events == NULL) {
+		PyErr_NoMemory();
+		PyMem_Free(nodes);
+		PyMem_Free(events);
+		return 0;
+	}
+	DUP_FIRST_VERT(self);
+	POLY_NOGIL(self, 
+		simple = is_simple_verts(self->vert, size, nodes, events));
+	POLY_UPDATE_FLAGS(self, POLY_SIMPLE_FLAG, 
+		POLY_SIMPLE_KNOWN_FLAG | (simple ? POLY_SIMPLE_FLAG : 0));
+	PyMem_Free(nodes);
+	PyMem_Free(events);
+	PLANAR_STAT_TIME(PLANAR_STAT_CHECK_IS_SIMPLE, start);
+	return 1;
 }
 
 static PyObject *
 Poly_get_is_convex_known(PlanarPolygonObject *self) {
-	return Py_BOOL(self->flags & POLY_CONVEX_KNOWN_FLAG);
+	return Py_BOOL(POLY_FLAGS(self) & POLY_CONVEX_KNOWN_FLAG);
 }
 
 static int
 poly_is_convex(PlanarPolygonObject *self)
 {
-	if (!(self->flags & POLY_CONVEX_KNOWN_FLAG)) {
+	const int known = (POLY_FLAGS(self) & POLY_CONVEX_KNOWN_FLAG) != 0;
+
+	PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_CONVEX, known);
+	if (!known) {
 		Poly_classify(self);
 	}
-	return self->flags & POLY_CONVEX_FLAG;
+	return POLY_FLAGS(self) & POLY_CONVEX_FLAG;
 }
 
 static PyObject *
@@ -607,69 +1069,90 @@ Poly_get_is_convex(PlanarPolygonObject *self)
 
 static PyObject *
 Poly_get_is_simple_known(PlanarPolygonObject *self) {
-	return Py_BOOL(self->flags & POLY_SIMPLE_KNOWN_FLAG);
+	return Py_BOOL(POLY_FLAGS(self) & POLY_SIMPLE_KNOWN_FLAG);
 }
 
 
 static PyObject *
 Poly_get_is_simple(PlanarPolygonObject *self)
 {
-	if (!(self->flags & POLY_SIMPLE_KNOWN_FLAG)) {
-		if (!(self->flags & POLY_CONVEX_KNOWN_FLAG)) {
+	const int known = (POLY_FLAGS(self) & POLY_SIMPLE_KNOWN_FLAG) != 0;
+
+	PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_SIMPLE, known);
+	if (!known) {
+		if (!(POLY_FLAGS(self) & POLY_CONVEX_KNOWN_FLAG)) {
 			Poly_classify(self);
 		}
-		if (!(self->flags & POLY_SIMPLE_KNOWN_FLAG)) {
+		if (!(POLY_FLAGS(self) & POLY_SIMPLE_KNOWN_FLAG)) {
 			if (!Poly_check_is_simple(self)) {
 				return NULL;
 			}
 		}
 	}
-	return Py_BOOL(self->flags & POLY_SIMPLE_FLAG);
+	return Py_BOOL(POLY_FLAGS(self) & POLY_SIMPLE_FLAG);
 }
 
 static PyObject *
 Poly_get_is_centroid_known(PlanarPolygonObject *self) {
-	return Py_BOOL(self->flags & POLY_CENTROID_KNOWN_FLAG);
+	return Py_BOOL(POLY_FLAGS(self) & POLY_CENTROID_KNOWN_FLAG);
+}
+
+/* Compute the centroid of a simple polygon's vertices, returning
+   twice its signed area */
+static double
+centroid_verts(const planar_vec2_t *vert, const Py_ssize_t size, 
+	planar_vec2_t *centroid)
+{
+	Py_ssize_t i;
+	double area, total_area = 0.0;
+	const planar_vec2_t *a, *b, *c;
+
+	centroid->x = centroid->y = 0.0;
+	a = vert;
+	b = vert + 1;
+	for (i = 2; i < size; ++i) {
+		c = vert + i;
+		area = ((b->x - a->x) * (c->y - a->y)
+			- (c->x - a->x) * (b->y - a->y));
+		centroid->x += (a->x + b->x + c->x) * area;
+		centroid->y += (a->y + b->y + c->y) * area;
+		total_area += area;
+		b = c;
+	}
+	centroid->x /= 3.0 * total_area;
+	centroid->y /= 3.0 * total_area;
+	return total_area;
 }
 
 static PyObject *
 Poly_get_centroid(PlanarPolygonObject *self)
 {
-	Py_ssize_t i;
-	double area, total_area;
-	planar_vec2_t *a, *b, *c;
+	planar_vec2_t centroid;
+	double total_area;
+	const int known = (POLY_FLAGS(self) & POLY_CENTROID_KNOWN_FLAG)
+		&& (POLY_FLAGS(self) & POLY_SIMPLE_KNOWN_FLAG);
 
-	if (!(self->flags & POLY_CENTROID_KNOWN_FLAG) 
-		|| !(self->flags & POLY_SIMPLE_KNOWN_FLAG)) {
-		if (!(self->flags & POLY_CONVEX_KNOWN_FLAG)) {
+	PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_CENTROID, known);
+	if (!known) {
+		if (!(POLY_FLAGS(self) & POLY_CONVEX_KNOWN_FLAG)) {
 			Poly_classify(self);
 		}
-		if (!(self->flags & POLY_SIMPLE_KNOWN_FLAG)) {
+		if (!(POLY_FLAGS(self) & POLY_SIMPLE_KNOWN_FLAG)) {
 			if (!Poly_check_is_simple(self)) {
 				return NULL;
 			}
 		}
-		if (self->flags & POLY_SIMPLE_FLAG) {
+		if (POLY_FLAGS(self) & POLY_SIMPLE_FLAG) {
 			DUP_FIRST_VERT(self);
-			total_area = 0.0;
-			self->centroid.x = self->centroid.y = 0.0;
-			a = self->vert;
-			b = self->vert + 1;
-			for (i = 2; i < Py_SIZE(self); ++i) {
-				c = self->vert + i;
-				area = ((b->x - a->x) * (c->y - a->y)
-					- (c->x - a->x) * (b->y - a->y));
-				self->centroid.x += (a->x + b->x + c->x) * area;
-				self->centroid.y += (a->y + b->y + c->y) * area;
-				total_area += area;
-				b = c;
-			}
-			self->centroid.x /= 3.0 * total_area;
-			self->centroid.y /= 3.0 * total_area;
+			POLY_NOGIL(self, total_area = centroid_verts(
+				self->vert, Py_SIZE(self), &centroid));
+			self->centroid = centroid;
+			self->signed_area = total_area * 0.5;
+			POLY_SET_FLAGS(self, POLY_AREA_KNOWN_FLAG);
 		}
-		self->flags |= POLY_CENTROID_KNOWN_FLAG;
+		POLY_SET_FLAGS(self, POLY_CENTROID_KNOWN_FLAG);
 	}
-	if (self->flags & POLY_SIMPLE_FLAG) {
+	if (POLY_FLAGS(self) & POLY_SIMPLE_FLAG) {
 		return (PyObject *)PlanarVec2_FromStruct(&self->centroid);
 	} else {
 		/* No centroid for non-simple polygon */
@@ -677,77 +1160,810 @@ Poly_get_centroid(PlanarPolygonObject *self)
 	}
 }
 
-static PlanarBBoxObject *
-Poly_get_bbox(PlanarPolygonObject *self) {
-	if (self->bbox == NULL) {
-		self->bbox = PlanarBBox_fromSeq2((PlanarSeq2Object *)self);
-		if (self->bbox == NULL) {
-			return NULL;
+static double
+poly_signed_area(PlanarPolygonObject *self)
+{
+	Py_ssize_t i;
+	double total_area;
+	planar_vec2_t *a, *b, *c;
+	const int known = (POLY_FLAGS(self) & POLY_AREA_KNOWN_FLAG) != 0;
+
+	PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_AREA, known);
+	if (!known) {
+		/* Sum the areas of triangles made from each edge with vertex[0] */
+		total_area = 0.0;
+		a = self->vert;
+		b = self->vert + 1;
+		for (i = 2; i < Py_SIZE(self); ++i) {
+			c = self->vert + i;
+			total_area += ((b->x - a->x) * (c->y - a->y)
+				- (c->x - a->x) * (b->y - a->y));
+			b = c;
 		}
+		self->signed_area = total_area * 0.5;
+		POLY_SET_FLAGS(self, POLY_AREA_KNOWN_FLAG);
 	}
-	Py_INCREF(self->bbox);
-	return self->bbox;
+	return self->signed_area;
 }
 
-static PyGetSetDef Poly_getset[] = {
-    {"is_convex_known", (getter)Poly_get_is_convex_known, NULL, 
-		"True if the polygon is already known to be convex or not.", NULL},
-    {"is_convex", (getter)Poly_get_is_convex, NULL, 
-		"True if the polygon is convex.", NULL},
-    {"is_simple_known", (getter)Poly_get_is_simple_known, NULL, 
-		"True if the polygon is already known to be simple or not.", NULL},
-    {"is_simple", (getter)Poly_get_is_simple, NULL, 
-		"True if the polygon is simple.", NULL},
-    {"is_centroid_known", (getter)Poly_get_is_centroid_known, NULL, 
-		"True if the polygon's centroid has been pre-calculated and cached.",
-		NULL},
-    {"centroid", (getter)Poly_get_centroid, NULL, 
-		"The geometric center point of the polygon. This point only exists "
-        "for simple polygons. For non-simple polygons it is None. Note "
-        "in concave polygons, this point may lie outside of the polygon "
-		"itself.", NULL},
-    {"bounding_box", (getter)Poly_get_bbox, NULL, 
-		"The bounding box of the polygon", NULL},
-    {NULL}
-};
+static double
+poly_perimeter(PlanarPolygonObject *self)
+{
+	planar_vec2_t *a, *b;
+	double perimeter;
+	const int known = (POLY_FLAGS(self) & POLY_PERIMETER_KNOWN_FLAG) != 0;
 
-/* Sequence Methods */
+	PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_PERIMETER, known);
+	if (!known) {
+		DUP_FIRST_VERT(self);
+		perimeter = 0.0;
+		for (a = self->vert, b = a + 1; a < self->vert + Py_SIZE(self); 
+			++a, ++b) {
+			perimeter += sqrt((b->x - a->x) * (b->x - a->x) 
+				+ (b->y - a->y) * (b->y - a->y));
+		}
+		self->perimeter = perimeter;
+		POLY_SET_FLAGS(self, POLY_PERIMETER_KNOWN_FLAG);
+	}
+	return self->perimeter;
+}
 
 static PyObject *
-Poly_getitem(PlanarPolygonObject *self, Py_ssize_t index)
+Poly_get_signed_area(PlanarPolygonObject *self)
 {
-    Py_ssize_t size = Py_SIZE(self);
-    if (index >= 0 && index < size) {
-        return (PyObject *)PlanarVec2_FromStruct(self->vert + index);
-    }
-    PyErr_Format(PyExc_IndexError, "index %d out of range", (int)index);
-    return NULL;
+	return PyFloat_FromDouble(poly_signed_area(self));
 }
 
-static void
-clear_cached_properties(PlanarPolygonObject *self)
+static PyObject *
+Poly_get_area(PlanarPolygonObject *self)
 {
-	self->flags = 0;
-	Py_XDECREF(self->bbox);
-	self->bbox = NULL;
-	if (self->lt_y_poly != NULL) {
-		PyMem_Free(self->lt_y_poly);
-		self->lt_y_poly = NULL;
-		self->rt_y_poly = NULL;
-	}
+	return PyFloat_FromDouble(fabs(poly_signed_area(self)));
 }
 
-static int
-Poly_assitem(PlanarPolygonObject *self, Py_ssize_t index, PyObject *v)
+static PyObject *
+Poly_get_perimeter(PlanarPolygonObject *self)
 {
-    double x, y;
-    Py_ssize_t size = Py_SIZE(self);
-    if (index >= 0 && index < size) {
-		if (!PlanarVec2_Parse(v, &x, &y)) {
-			if (!PyErr_Occurred()) {
-			PyErr_Format(PyExc_TypeError, 
-				"Cannot assign %.200s into %.200s",
-				Py_TYPE(v)->tp_name, Py_TYPE(self)->tp_name);
+	return PyFloat_FromDouble(poly_perimeter(self));
+}
+
+/* Triangulation */
+
+/* Return the last edge in the status tree below the point pt, or -1 */
+static Py_ssize_t
+edge_tree_find_below(planar_edge_node_t *nodes, Py_ssize_t n, 
+	const planar_vec2_t *pt)
+{
+	Py_ssize_t found = -1;
+
+	while (n >= 0) {
+		if (ORIENT(nodes[n].start, nodes[n].end, pt) > 0.0) {
+			found = n;
+			n = nodes[n].right;
+		} else {
+			n = nodes[n].left;
+		}
+	}
+	return found;
+}
+
+typedef struct {
+	planar_vec2_t *pt;
+	Py_ssize_t index;
+} planar_tri_vert_t;
+
+/* Neighbor of a vertex, ordered by angle */
+typedef struct {
+	double angle;
+	Py_ssize_t index;
+	int visited;
+} planar_tri_fan_t;
+
+static int
+compare_tri_verts(const void *a, const void *b)
+{
+	return compare_vec_lexi(
+		&((planar_tri_vert_t *)a)->pt, &((planar_tri_vert_t *)b)->pt);
+}
+
+static int
+compare_tri_fans(const void *a, const void *b)
+{
+	const double aa = ((planar_tri_fan_t *)a)->angle;
+	const double ab = ((planar_tri_fan_t *)b)->angle;
+	return (aa > ab) - (aa < ab);
+}
+
+typedef struct {
+	Py_ssize_t index;
+	int upper;
+} planar_chain_vert_t;
+
+/* Add triangles from vertex v to the edges of the reflex chain 
+   stack[0] - stack[top], wound counter-clockwise */
+static Py_ssize_t *
+triangulate_chain_fan(planar_chain_vert_t *stack, Py_ssize_t top,
+	Py_ssize_t v, int upper, Py_ssize_t *tri)
+{
+	Py_ssize_t k;
+
+	for (k = 0; k < top; ++k) {
+		*(tri++) = stack[k + !upper].index;
+		*(tri++) = stack[k + upper].index;
+		*(tri++) = v;
+	}
+	return tri;
+}
+
+/* Triangulate the monotone polygon with vertex indices in face wound
+   counter-clockwise. The stack array must have room for count
+   elements. Return a pointer past the last triangle vertex written */
+static Py_ssize_t *
+triangulate_monotone(planar_vec2_t **pts, Py_ssize_t *face, Py_ssize_t count,
+	planar_chain_vert_t *stack, Py_ssize_t *tri)
+{
+	Py_ssize_t lo = 0, hi = 0, i, j, top, v;
+	planar_chain_vert_t last;
+	int upper;
+	double side;
+
+	if (count == 3) {
+		*(tri++) = face[0];
+		*(tri++) = face[1];
+		*(tri++) = face[2];
+		return tri;
+	}
+	for (i = 1; i < count; ++i) {
+		if (compare_vec_lexi(&pts[face[i]], &pts[face[lo]]) < 0) {
+			lo = i;
+		}
+		if (compare_vec_lexi(&pts[face[i]], &pts[face[hi]]) > 0) {
+			hi = i;
+		}
+	}
+	/* Merge the lower and upper chains, which run counter-clockwise and
+	   clockwise from the lowest vertex respectively, in sweep order */
+	stack[0].index = face[lo];
+	stack[0].upper = 0;
+	top = -1;
+	i = (lo + 1) % count;
+	j = (lo + count - 1) % count;
+	while (i != hi || j != hi) {
+		if (j == hi || (i != hi 
+			&& compare_vec_lexi(&pts[face[i]], &pts[face[j]]) < 0)) {
+			v = face[i];
+			upper = 0;
+			i = (i + 1) % count;
+		} else {
+			v = face[j];
+			upper = 1;
+			j = (j + count - 1) % count;
+		}
+		if (top < 0) {
+			top = 0;
+		} else if (upper != stack[top].upper) {
+			tri = triangulate_chain_fan(stack, top, v, upper, tri);
+			stack[0] = stack[top];
+			top = 0;
+		} else {
+			last = stack[top--];
+			while (top >= 0) {
+				side = ORIENT(pts[stack[top].index], pts[last.index], pts[v]);
+				if (upper ? side >= 0.0 : side <= 0.0) {
+					break;
+				}
+				*(tri++) = stack[top].index;
+				*(tri++) = upper ? v : last.index;
+				*(tri++) = upper ? last.index : v;
+				last = stack[top--];
+			}
+			stack[++top] = last;
+		}
+		++top;
+		stack[top].index = v;
+		stack[top].upper = upper;
+	}
+	return triangulate_chain_fan(
+		stack, top, face[hi], !stack[top].upper, tri);
+}
+
+/* Triangulate a simple polygon by dividing it into monotone pieces with a
+   plane sweep that connects split and merge vertices to a nearby vertex
+   using a diagonal, then triangulating each piece. Store the triangle
+   vertex indices in the polygon, return 0 on failure */
+static int
+poly_triangulate_simple(PlanarPolygonObject *self)
+{
+	planar_vec2_t **pts = NULL;
+	Py_ssize_t *vert_index = NULL, *helper = NULL, *diagonals = NULL;
+	Py_ssize_t *fan_offset = NULL, *face = NULL, *tri = NULL, *tri_end;
+	planar_edge_node_t *nodes = NULL;
+	planar_tri_vert_t *order = NULL;
+	planar_tri_fan_t *fans = NULL, *fan;
+	planar_chain_vert_t *stack = NULL;
+	char *is_merge = NULL;
+	const Py_ssize_t size = Py_SIZE(self);
+	Py_ssize_t count = 0, diag_count = 0, i, k, v, u, w, prev_v, edge, root = -1;
+	Py_ssize_t lo, hi, mid, face_count, start_u, start_v;
+	planar_vec2_t *pt, *prev_pt, *next_pt;
+	int clockwise, reflex, prev_before, next_before, result = 0;
+	double angle;
+
+	pts = (planar_vec2_t **)PyMem_Malloc(sizeof(planar_vec2_t *) * size);
+	vert_index = (Py_ssize_t *)PyMem_Malloc(sizeof(Py_ssize_t) * size);
+	if (pts == NULL || vert_index == NULL) {
+		goto nomem;
+	}
+	/* Work on the distinct vertices in counter-clockwise order */
+	clockwise = poly_signed_area(self) < 0.0;
+	for (i = 0; i < size; ++i) {
+		pt = self->vert + (clockwise ? size - 1 - i : i);
+		if (count == 0 || pt->x != pts[count - 1]->x 
+			|| pt->y != pts[count - 1]->y) {
+			pts[count] = pt;
+			vert_index[count++] = pt - self->vert;
+		}
+	}
+	while (count > 1 && pts[count - 1]->x == pts[0]->x 
+		&& pts[count - 1]->y == pts[0]->y) {
+		--count;
+	}
+	if (count < 3) {
+		self->triangles = (unsigned int *)PyMem_Malloc(0);
+		if (self->triangles == NULL) {
+			goto nomem;
+		}
+		self->triangle_count = 0;
+		result = 1;
+		goto finish;
+	}
+
+	nodes = (planar_edge_node_t *)PyMem_Malloc(
+		sizeof(planar_edge_node_t) * count);
+	order = (planar_tri_vert_t *)PyMem_Malloc(
+		sizeof(planar_tri_vert_t) * count);
+	helper = (Py_ssize_t *)PyMem_Malloc(sizeof(Py_ssize_t) * count);
+	diagonals = (Py_ssize_t *)PyMem_Malloc(sizeof(Py_ssize_t) * count * 4);
+	is_merge = (char *)PyMem_Malloc(count);
+	if (nodes == NULL || order == NULL || helper == NULL 
+		|| diagonals == NULL || is_merge == NULL) {
+		goto nomem;
+	}
+	/* Edge i goes from vertex i to vertex i + 1. The sweep status holds
+	   the edges with the polygon interior above them, each with its 
+	   helper vertex, the last vertex processed that can see the edge 
+	   from above */
+	for (i = 0; i < count; ++i) {
+		pt = pts[i];
+		next_pt = pts[(i + 1) % count];
+		if (compare_vec_lexi(&pt, &next_pt) <= 0) {
+			nodes[i].start = pt;
+			nodes[i].end = next_pt;
+		} else {
+			nodes[i].start = next_pt;
+			nodes[i].end = pt;
+		}
+		order[i].pt = pt;
+		order[i].index = i;
+		is_merge[i] = 0;
+	}
+	qsort(order, count, sizeof(planar_tri_vert_t), compare_tri_verts);
+
+#define ADD_DIAGONAL(a, b) { \
+	diagonals[diag_count * 2] = (a); \
+	diagonals[diag_count * 2 + 1] = (b); \
+	++diag_count; }
+#define CONNECT_HELPER(v, edge) \
+	if ((edge) >= 0 && is_merge[helper[edge]]) { \
+		ADD_DIAGONAL((v), helper[edge]); }
+
+	for (k = 0; k < count; ++k) {
+		v = order[k].index;
+		pt = pts[v];
+		prev_v = (v + count - 1) % count;
+		prev_pt = pts[prev_v];
+		next_pt = pts[(v + 1) % count];
+		reflex = ORIENT(prev_pt, pt, next_pt) < 0.0;
+		prev_before = compare_vec_lexi(&prev_pt, &pt) < 0;
+		next_before = compare_vec_lexi(&next_pt, &pt) < 0;
+		if (!prev_before && !next_before) {
+			if (reflex) {
+				/* Split vertex */
+				edge = edge_tree_find_below(nodes, root, pt);
+				if (edge >= 0) {
+					ADD_DIAGONAL(v, helper[edge]);
+					helper[edge] = v;
+				}
+			}
+			/* Start or split vertex */
+			edge_tree_insert(nodes, &root, v);
+			helper[v] = v;
+		} else if (prev_before && next_before) {
+			/* End or merge vertex */
+			CONNECT_HELPER(v, prev_v);
+			edge_tree_remove(nodes, &root, prev_v);
+			if (reflex) {
+				is_merge[v] = 1;
+				edge = edge_tree_find_below(nodes, root, pt);
+				CONNECT_HELPER(v, edge);
+				if (edge >= 0) {
+					helper[edge] = v;
+				}
+			}
+		} else if (prev_before) {
+			/* Regular vertex with the interior above */
+			CONNECT_HELPER(v, prev_v);
+			edge_tree_remove(nodes, &root, prev_v);
+			edge_tree_insert(nodes, &root, v);
+			helper[v] = v;
+		} else {
+			/* Regular vertex with the interior below */
+			edge = edge_tree_find_below(nodes, root, pt);
+			CONNECT_HELPER(v, edge);
+			if (edge >= 0) {
+				helper[edge] = v;
+			}
+		}
+	}
+#undef CONNECT_HELPER
+#undef ADD_DIAGONAL
+
+	face = (Py_ssize_t *)PyMem_Malloc(sizeof(Py_ssize_t) * count);
+	stack = (planar_chain_vert_t *)PyMem_Malloc(
+		sizeof(planar_chain_vert_t) * count);
+	tri = (Py_ssize_t *)PyMem_Malloc(sizeof(Py_ssize_t) * (count - 2) * 3);
+	if (face == NULL || stack == NULL || tri == NULL) {
+		goto nomem;
+	}
+	if (diag_count == 0) {
+		for (i = 0; i < count; ++i) {
+			face[i] = i;
+		}
+		tri_end = triangulate_monotone(pts, face, count, stack, tri);
+	} else {
+		/* Order the neighbors of each vertex with diagonals by angle.
+		   Vertices without diagonals have no fan entries */
+		fan_offset = (Py_ssize_t *)PyMem_Malloc(
+			sizeof(Py_ssize_t) * (count + 1));
+		fans = (planar_tri_fan_t *)PyMem_Malloc(
+			sizeof(planar_tri_fan_t) * (diag_count * 6));
+		if (fan_offset == NULL || fans == NULL) {
+			goto nomem;
+		}
+		memset(fan_offset, 0, sizeof(Py_ssize_t) * (count + 1));
+		for (i = 0; i < diag_count * 2; ++i) {
+			v = diagonals[i];
+			fan_offset[v + 1] += fan_offset[v + 1] ? 1 : 3;
+		}
+		for (v = 0; v < count; ++v) {
+			fan_offset[v + 1] += fan_offset[v];
+			k = fan_offset[v + 1] - fan_offset[v];
+			if (k) {
+				/* Polygon neighbors first, diagonals filled in below */
+				fans[fan_offset[v]].index = (v + count - 1) % count;
+				fans[fan_offset[v] + 1].index = (v + 1) % count;
+				for (i = 2; i < k; ++i) {
+					fans[fan_offset[v] + i].index = -1;
+				}
+			}
+		}
+		for (i = 0; i < diag_count * 2; ++i) {
+			v = diagonals[i];
+			u = diagonals[i ^ 1];
+			for (fan = fans + fan_offset[v]; fan->index >= 0; ++fan);
+			fan->index = u;
+		}
+		for (v = 0; v < count; ++v) {
+			for (fan = fans + fan_offset[v]; fan < fans + fan_offset[v + 1];
+				++fan) {
+				fan->angle = atan2(pts[fan->index]->y - pts[v]->y, 
+					pts[fan->index]->x - pts[v]->x);
+				/* The exterior half-edge is never traversed */
+				fan->visited = fan->index == (v + count - 1) % count;
+			}
+			qsort(fans + fan_offset[v], fan_offset[v + 1] - fan_offset[v],
+				sizeof(planar_tri_fan_t), compare_tri_fans);
+		}
+		for (i = 0; i < count; ++i) {
+			is_merge[i] = 0; /* Reused for polygon edges visited */
+		}
+
+		/* Trace the faces formed by the diagonals. Walking around each
+		   face counter-clockwise, the next vertex is the neighbor of the 
+		   current vertex that is clockwise adjacent to the previous one */
+		tri_end = tri;
+		for (start_u = 0; start_u < count; ++start_u) {
+			k = fan_offset[start_u + 1] - fan_offset[start_u];
+			for (i = 0; i < (k ? k : 1); ++i) {
+				if (k) {
+					fan = fans + fan_offset[start_u] + i;
+					if (fan->visited) {
+						continue;
+					}
+					fan->visited = 1;
+					start_v = fan->index;
+				} else {
+					if (is_merge[start_u]) {
+						continue;
+					}
+					is_merge[start_u] = 1;
+					start_v = (start_u + 1) % count;
+				}
+				face_count = 0;
+				u = start_u;
+				v = start_v;
+				do {
+					face[face_count++] = u;
+					if (fan_offset[v + 1] > fan_offset[v]) {
+						/* Find u in the fan of v by angle */
+						angle = atan2(pts[u]->y - pts[v]->y, 
+							pts[u]->x - pts[v]->x);
+						lo = fan_offset[v];
+						hi = fan_offset[v + 1];
+						while (lo < hi) {
+							mid = (lo + hi) / 2;
+							if (fans[mid].angle < angle) {
+								lo = mid + 1;
+							} else {
+								hi = mid;
+							}
+						}
+						fan = fans + (lo > fan_offset[v] 
+							? lo - 1 : fan_offset[v + 1] - 1);
+						fan->visited = 1;
+						w = fan->index;
+					} else {
+						is_merge[v] = 1;
+						w = (v + 1) % count;
+					}
+					u = v;
+					v = w;
+				} while ((u != start_u || v != start_v) 
+					&& face_count < count);
+				if (face_count < 3) {
+					continue;
+				}
+				if ((tri_end - tri) + (face_count - 2) * 3 > (count - 2) * 3) {
+					/* Only possible with numerically inconsistent input */
+					PyErr_SetString(PyExc_ValueError,
+						"Cannot triangulate non-simple polygon");
+					goto finish;
+				}
+				tri_end = triangulate_monotone(
+					pts, face, face_count, stack, tri_end);
+			}
+		}
+	}
+
+	/* Store the triangles, restoring the polygon's winding */
+	self->triangles = (unsigned int *)PyMem_Malloc(
+		sizeof(unsigned int) * (tri_end - tri));
+	if (self->triangles == NULL) {
+		goto nomem;
+	}
+	self->triangle_count = (tri_end - tri) / 3;
+	for (i = 0; i < tri_end - tri; i += 3) {
+		self->triangles[i] = (unsigned int)vert_index[tri[i]];
+		self->triangles[i + 1] = (unsigned int)vert_index[
+			tri[i + (clockwise ? 2 : 1)]];
+		self->triangles[i + 2] = (unsigned int)vert_index[
+			tri[i + (clockwise ? 1 : 2)]];
+	}
+	result = 1;
+	goto finish;
+
+nomem:
+	PyErr_NoMemory();
+finish:
+	PyMem_Free(pts);
+	PyMem_Free(vert_index);
+	PyMem_Free(nodes);
+	PyMem_Free(order);
+	PyMem_Free(helper);
+	PyMem_Free(diagonals);
+	PyMem_Free(is_merge);
+	PyMem_Free(fan_offset);
+	PyMem_Free(fans);
+	PyMem_Free(face);
+	PyMem_Free(stack);
+	PyMem_Free(tri);
+	return result;
+}
+
+/* Return a new array.array of the given type code, initialized
+   from the raw data in a bytes object */
+static PyObject *
+new_array_from_bytes(const char *typecode, PyObject *data)
+{
+	PyObject *array_module, *result;
+
+	array_module = PyImport_ImportModule("array");
+	if (array_module == NULL) {
+		return NULL;
+	}
+	result = PyObject_CallMethod(array_module, "array", "sO", typecode, data);
+	Py_DECREF(array_module);
+	return result;
+}
+
+static PyObject *
+poly_triangulate(PlanarPolygonObject *self)
+{
+	PyObject *data, *result;
+	Py_ssize_t i;
+	unsigned int *tri;
+
+	PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_TRIANGLES, self->triangles != NULL);
+	if (self->triangles == NULL) {
+		if (poly_is_convex(self)) {
+			self->triangle_count = Py_SIZE(self) - 2;
+			tri = self->triangles = (unsigned int *)PyMem_Malloc(
+				sizeof(unsigned int) * self->triangle_count * 3);
+			if (tri == NULL) {
+				return PyErr_NoMemory();
+			}
+			for (i = 1; i < Py_SIZE(self) - 1; ++i) {
+				*(tri++) = 0;
+				*(tri++) = (unsigned int)i;
+				*(tri++) = (unsigned int)i + 1;
+			}
+		} else {
+			if (!(POLY_FLAGS(self) & POLY_SIMPLE_KNOWN_FLAG) 
+				&& !Poly_check_is_simple(self)) {
+				return NULL;
+			}
+			if (!(POLY_FLAGS(self) & POLY_SIMPLE_FLAG)) {
+				PyErr_SetString(PyExc_ValueError,
+					"Cannot triangulate non-simple polygon");
+				return NULL;
+			}
+			if (!poly_triangulate_simple(self)) {
+				return NULL;
+			}
+		}
+	}
+	data = PyBytes_FromStringAndSize((char *)self->triangles, 
+		sizeof(unsigned int) * self->triangle_count * 3);
+	if (data == NULL) {
+		return NULL;
+	}
+	result = new_array_from_bytes("I", data);
+	Py_DECREF(data);
+	return result;
+}
+
+static PyObject *
+Poly_triangulate(PlanarPolygonObject *self)
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = poly_triangulate(self);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static PlanarBBoxObject *
+poly_get_bbox(PlanarPolygonObject *self) {
+	PlanarBBoxObject *bbox;
+	unsigned long version;
+
+	PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_BBOX, self->bbox != NULL);
+	while (self->bbox == NULL) {
+		/* The GIL is released for large polygons, so only cache
+		   the box if the polygon was not mutated meanwhile */
+		version = self->version;
+		bbox = PlanarBBox_fromSeq2((PlanarSeq2Object *)self);
+		if (bbox == NULL) {
+			return NULL;
+		}
+		if (self->bbox == NULL && version == self->version) {
+			self->bbox = bbox;
+		} else {
+			Py_DECREF(bbox);
+		}
+	}
+	Py_INCREF(self->bbox);
+	return self->bbox;
+}
+
+static PlanarBBoxObject *
+Poly_get_bbox(PlanarPolygonObject *self) {
+	PlanarBBoxObject *bbox;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	bbox = poly_get_bbox(self);
+	Planar_END_CRITICAL_SECTION();
+	return bbox;
+}
+
+static PyGetSetDef Poly_getset[] = {
+    {"is_convex_known", (getter)Poly_get_is_convex_known, NULL, 
+		"True if the polygon is already known to be convex or not.", NULL},
+    {"is_convex", (getter)Poly_get_is_convex, NULL, 
+		"True if the polygon is convex.", NULL},
+    {"is_simple_known", (getter)Poly_get_is_simple_known, NULL, 
+		"True if the polygon is already known to be simple or not.", NULL},
+    {"is_simple", (getter)Poly_get_is_simple, NULL, 
+		"True if the polygon is simple.", NULL},
+    {"is_centroid_known", (getter)Poly_get_is_centroid_known, NULL, 
+		"True if the polygon's centroid has been pre-calculated and cached.",
+		NULL},
+    {"centroid", (getter)Poly_get_centroid, NULL, 
+		"The geometric center point of the polygon. This point only exists "
+        "for simple polygons. For non-simple polygons it is None. Note "
+        "in concave polygons, this point may lie outside of the polygon "
+		"itself.", NULL},
+    {"signed_area", (getter)Poly_get_signed_area, NULL, 
+		"The area of the polygon, positive if its vertices are wound "
+		"counter-clockwise and negative if they are wound clockwise. "
+		"Regions of non-simple polygons are weighted by their winding "
+		"number.", NULL},
+    {"area", (getter)Poly_get_area, NULL, 
+		"The area of the polygon, i.e., the absolute value of the "
+		"signed area.", NULL},
+    {"perimeter", (getter)Poly_get_perimeter, NULL, 
+		"The total length of the polygon's edges.", NULL},
+    {"bounding_box", (getter)Poly_get_bbox, NULL, 
+		"The bounding box of the polygon", NULL},
+    {NULL}
+};
+
+/* Sequence Methods */
+
+static PyObject *
+Poly_getitem(PlanarPolygonObject *self, Py_ssize_t index)
+{
+    Py_ssize_t size = Py_SIZE(self);
+    if (index >= 0 && index < size) {
+        return (PyObject *)PlanarVec2_FromStruct(self->vert + index);
+    }
+    PyErr_Format(PyExc_IndexError, "index %d out of range", (int)index);
+    return NULL;
+}
+
+/* Count the invalidation of each cached property of the polygon
+   about to be cleared */
+static void
+count_invalidations(PlanarPolygonObject *self, unsigned long flags)
+{
+	if (!Planar_GetState()->stats_enabled) {
+		return;
+	}
+	if (flags & POLY_CONVEX_KNOWN_FLAG) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_CONVEX);
+	}
+	if (flags & POLY_SIMPLE_KNOWN_FLAG) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_SIMPLE);
+	}
+	if (flags & POLY_CENTROID_KNOWN_FLAG) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_CENTROID);
+	}
+	if (flags & POLY_AREA_KNOWN_FLAG) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_AREA);
+	}
+	if (flags & POLY_PERIMETER_KNOWN_FLAG) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_PERIMETER);
+	}
+	if (self->bbox != NULL) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_BBOX);
+	}
+	if (self->triangles != NULL) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_TRIANGLES);
+	}
+	if (self->lt_y_poly != NULL) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_Y_POLYLINES);
+	}
+	if (self->grid != NULL) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_GRID);
+	}
+}
+
+static void
+clear_cached_properties(PlanarPolygonObject *self)
+{
+	count_invalidations(self, POLY_FLAGS(self));
+	/* Preparation is requested by the user, only the grid is cached */
+	Planar_AtomicAnd(&self->flags, POLY_PREPARED_FLAG);
+	++self->version;
+	pip_grid_free(self->grid);
+	self->grid = NULL;
+	Py_XDECREF(self->bbox);
+	self->bbox = NULL;
+	if (self->lt_y_poly != NULL) {
+		PyMem_Free(self->lt_y_poly);
+		self->lt_y_poly = NULL;
+		self->rt_y_poly = NULL;
+	}
+	if (self->triangles != NULL) {
+		PyMem_Free(self->triangles);
+		self->triangles = NULL;
+	}
+}
+
+/* Update the cached properties of a polygon whose vertices have just
+   been transformed. Properties preserved by the transform, or that
+   can be mapped through it directly, are kept */
+static void
+transform_cached_properties(PlanarPolygonObject *self, PlanarAffineObject *t)
+{
+	const double det = t->a * t->e - t->b * t->d;
+	PlanarBBoxObject *bbox = NULL;
+	planar_vec2_t p1, p2;
+	double scale;
+
+	if (fabs(det) < PLANAR_EPSILON) {
+		clear_cached_properties(self);
+		return;
+	}
+	if (self->bbox != NULL && ((t->b == 0.0 && t->d == 0.0) 
+		|| (t->a == 0.0 && t->e == 0.0))) {
+		/* Rectilinear transforms map the box corners to the corners
+		   of the transformed bounding box */
+		bbox = (PlanarBBoxObject *)Planar_Alloc(PLANAR_TYPE(BBox));
+		if (bbox != NULL) {
+			p1.x = self->bbox->min.x*t->a + self->bbox->min.y*t->d + t->c;
+			p1.y = self->bbox->min.x*t->b + self->bbox->min.y*t->e + t->f;
+			p2.x = self->bbox->max.x*t->a + self->bbox->max.y*t->d + t->c;
+			p2.y = self->bbox->max.x*t->b + self->bbox->max.y*t->e + t->f;
+			bbox->min.x = MIN(p1.x, p2.x);
+			bbox->min.y = MIN(p1.y, p2.y);
+			bbox->max.x = MAX(p1.x, p2.x);
+			bbox->max.y = MAX(p1.y, p2.y);
+		} else {
+			PyErr_Clear();
+		}
+	}
+	if (self->bbox != NULL && bbox == NULL) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_BBOX);
+	}
+	Py_XDECREF(self->bbox);
+	self->bbox = bbox;
+	if (self->lt_y_poly != NULL) {
+		/* Recomputed on demand */
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_Y_POLYLINES);
+		PyMem_Free(self->lt_y_poly);
+		self->lt_y_poly = NULL;
+		self->rt_y_poly = NULL;
+	}
+	if (self->grid != NULL) {
+		PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_GRID);
+		pip_grid_free(self->grid);
+		self->grid = NULL;
+	}
+	/* Non-degenerate affine maps preserve convexity, simplicity and
+	   the vertex topology, including the triangulation */
+	if (POLY_FLAGS(self) & POLY_CENTROID_KNOWN_FLAG) {
+		p1 = self->centroid;
+		self->centroid.x = p1.x*t->a + p1.y*t->d + t->c;
+		self->centroid.y = p1.x*t->b + p1.y*t->e + t->f;
+	}
+	self->signed_area *= det;
+	if ((t->a == t->e && t->b == -t->d) || (t->a == -t->e && t->b == t->d)) {
+		/* Similarity transforms scale all distances uniformly */
+		scale = sqrt(fabs(det));
+		self->perimeter *= scale;
+		self->max_r2 *= fabs(det);
+		self->min_r2 *= fabs(det);
+	} else {
+		if (POLY_FLAGS(self) & POLY_PERIMETER_KNOWN_FLAG) {
+			PLANAR_STAT_INVALIDATED(PLANAR_STAT_CACHE_PERIMETER);
+		}
+		POLY_CLEAR_FLAGS(self, 
+			POLY_PERIMETER_KNOWN_FLAG | POLY_RADIUS_KNOWN_FLAG);
+	}
+}
+
+static int
+poly_assitem(PlanarPolygonObject *self, Py_ssize_t index, PyObject *v)
+{
+    double x, y;
+    Py_ssize_t size = Py_SIZE(self);
+    if (index >= 0 && index < size) {
+		if (!PlanarVec2_Parse(v, &x, &y)) {
+			if (!PyErr_Occurred()) {
+			PyErr_Format(PyExc_TypeError, 
+				"Cannot assign %.200s into %.200s",
+				Py_TYPE(v)->tp_name, Py_TYPE(self)->tp_name);
 			}
 			return -1;
 		}
@@ -761,6 +1977,17 @@ Poly_assitem(PlanarPolygonObject *self, Py_ssize_t index, PyObject *v)
     return -1;
 }
 
+static int
+Poly_assitem(PlanarPolygonObject *self, Py_ssize_t index, PyObject *v)
+{
+	int result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = poly_assitem(self, index, v);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
 static Py_ssize_t
 Poly_length(PlanarPolygonObject *self)
 {
@@ -921,23 +2148,212 @@ pnp_winding_test(PlanarPolygonObject *self, planar_vec2_t *pt)
 	return winding_no != 0;
 }
 
-static int 
-split_y_polylines(PlanarPolygonObject *self) 
+/* Edge grid point-in-polygon test, see Polygon.prepare()
+ *
+ * The bounding box of the polygon is divided into a uniform grid of
+ * about one cell per vertex. Each cell lists the edges whose bounding
+ * boxes overlap it, and stores the winding number at its center.
+ * Cells without edges are entirely inside or outside the polygon.
+ *
+ * A point is tested by walking left along its row of cells, counting
+ * the edge crossings of a ray cast to the left from the point, exactly
+ * as in pnp_winding_test(), until an empty cell is reached. The winding
+ * number of the empty cell accounts for all crossings farther left.
+ * Each crossing is attributed to the cell containing it, so that edges
+ * listed in more than one cell are only counted once.
+ */
+
+static Py_ssize_t
+pip_grid_col(planar_pip_grid_t *grid, double x)
 {
-	double min_x, max_x, min_y, max_y;	
-	planar_vec2_t *v, *v_end, *p, *pl1, *pl2;
-	planar_vec2_t *min, *max, *left, *right;
+	Py_ssize_t col = (Py_ssize_t)((x - grid->min.x) * grid->x_scale);
+	return col < 0 ? 0 : (col >= grid->cols ? grid->cols - 1 : col);
+}
 
-	self->lt_y_poly = (planar_vec2_t *)PyMem_Malloc(
-		sizeof(planar_vec2_t) * (Py_SIZE(self) + 2));
-	if (self->lt_y_poly == NULL) {
-		return -1;
+static Py_ssize_t
+pip_grid_row(planar_pip_grid_t *grid, double y)
+{
+	Py_ssize_t row = (Py_ssize_t)((y - grid->min.y) * grid->y_scale);
+	return row < 0 ? 0 : (row >= grid->rows ? grid->rows - 1 : row);
+}
+
+static planar_pip_grid_t *
+pip_grid_new(PlanarPolygonObject *self)
+{
+	const Py_ssize_t size = Py_SIZE(self);
+	planar_pip_grid_t *grid;
+	planar_vec2_t max, *v0, *v1;
+	Py_ssize_t i, col, row, c0, c1, r0, r1, cell, cells, *fill = NULL;
+	double width, height, cy, x;
+
+	grid = (planar_pip_grid_t *)PyMem_Malloc(sizeof(planar_pip_grid_t));
+	if (grid == NULL) {
+		return NULL;
+	}
+	memset(grid, 0, sizeof(planar_pip_grid_t));
+	grid->min = max = self->vert[0];
+	for (i = 1; i < size; ++i) {
+		grid->min.x = MIN(grid->min.x, self->vert[i].x);
+		grid->min.y = MIN(grid->min.y, self->vert[i].y);
+		max.x = MAX(max.x, self->vert[i].x);
+		max.y = MAX(max.y, self->vert[i].y);
+	}
+	width = max.x - grid->min.x;
+	height = max.y - grid->min.y;
+	grid->cols = grid->rows = 1;
+	if (width > 0.0 && height > 0.0) {
+		grid->cols = (Py_ssize_t)(sqrt(size * width / height) + 0.5);
+		grid->cols = MAX(1, MIN(grid->cols, size));
+		grid->rows = MAX(1, size / grid->cols);
+		grid->x_scale = grid->cols / width;
+		grid->y_scale = grid->rows / height;
+	}
+	cells = grid->cols * grid->rows;
+	grid->cell_start = (Py_ssize_t *)PyMem_Malloc(
+		sizeof(Py_ssize_t) * (cells + 1));
+	grid->winding = (int *)PyMem_Malloc(sizeof(int) * cells);
+	fill = (Py_ssize_t *)PyMem_Malloc(sizeof(Py_ssize_t) * cells);
+	if (grid->cell_start == NULL || grid->winding == NULL || fill == NULL) {
+		goto error;
+	}
+	memset(grid->cell_start, 0, sizeof(Py_ssize_t) * (cells + 1));
+	memset(grid->winding, 0, sizeof(int) * cells);
+
+	/* Count the edges overlapping each cell, and the
+	   crossings of each row's center line left of each cell */
+	v0 = self->vert + size - 1;
+	for (v1 = self->vert; v1 < self->vert + size; v0 = v1++) {
+		c0 = pip_grid_col(grid, MIN(v0->x, v1->x));
+		c1 = pip_grid_col(grid, MAX(v0->x, v1->x));
+		r0 = pip_grid_row(grid, MIN(v0->y, v1->y));
+		r1 = pip_grid_row(grid, MAX(v0->y, v1->y));
+		for (row = r0; row <= r1; ++row) {
+			for (col = c0; col <= c1; ++col) {
+				++grid->cell_start[row * grid->cols + col + 1];
+			}
+			cy = grid->y_scale > 0.0 ? 
+				grid->min.y + (row + 0.5) / grid->y_scale : grid->min.y;
+			if ((v0->y >= cy) != (v1->y >= cy)) {
+				x = v0->x + (cy - v0->y) * (v1->x - v0->x) / (v1->y - v0->y);
+				/* First cell with its center at or right of x */
+				col = (Py_ssize_t)ceil(
+					(x - grid->min.x) * grid->x_scale - 0.5);
+				col = MAX(0, col);
+				if (col < grid->cols) {
+					grid->winding[row * grid->cols + col] += 
+						(v1->y >= cy) ? 1 : -1;
+				}
+			}
+		}
+	}
+	for (cell = 0; cell < cells; ++cell) {
+		grid->cell_start[cell + 1] += grid->cell_start[cell];
+		fill[cell] = grid->cell_start[cell];
+		if (cell % grid->cols) {
+			grid->winding[cell] += grid->winding[cell - 1];
+		}
+	}
+	grid->cell_edges = (Py_ssize_t *)PyMem_Malloc(
+		sizeof(Py_ssize_t) * MAX(1, grid->cell_start[cells]));
+	if (grid->cell_edges == NULL) {
+		goto error;
+	}
+	v0 = self->vert + size - 1;
+	for (i = 0; i < size; ++i) {
+		v1 = self->vert + i;
+		c0 = pip_grid_col(grid, MIN(v0->x, v1->x));
+		c1 = pip_grid_col(grid, MAX(v0->x, v1->x));
+		r0 = pip_grid_row(grid, MIN(v0->y, v1->y));
+		r1 = pip_grid_row(grid, MAX(v0->y, v1->y));
+		for (row = r0; row <= r1; ++row) {
+			for (col = c0; col <= c1; ++col) {
+				grid->cell_edges[fill[row * grid->cols + col]++] = i;
+			}
+		}
+		v0 = v1;
+	}
+	PyMem_Free(fill);
+	return grid;
+
+error:
+	PyMem_Free(fill);
+	pip_grid_free(grid);
+	return NULL;
+}
+
+static int
+grid_test(planar_vec2_t *vert, Py_ssize_t size, planar_pip_grid_t *grid, 
+	planar_vec2_t *pt)
+{
+	planar_vec2_t *v0, *v1;
+	Py_ssize_t *edge, *edge_end;
+	Py_ssize_t cell, col, pt_col, row_start, x_col;
+	int winding_no = 0;
+	int v1_above;
+	double x;
+
+	pt_col = pip_grid_col(grid, pt->x);
+	row_start = pip_grid_row(grid, pt->y) * grid->cols;
+	for (col = pt_col; col >= 0; --col) {
+		cell = row_start + col;
+		edge = grid->cell_edges + grid->cell_start[cell];
+		edge_end = grid->cell_edges + grid->cell_start[cell + 1];
+		if (edge == edge_end) {
+			winding_no += grid->winding[cell];
+			break;
+		}
+		for (; edge < edge_end; ++edge) {
+			v1 = vert + *edge;
+			v0 = (*edge > 0) ? v1 - 1 : vert + size - 1;
+			v1_above = (v1->y >= pt->y);
+			if ((v0->y >= pt->y) == v1_above) {
+				continue;
+			}
+			x = v0->x + (pt->y - v0->y) * (v1->x - v0->x) / (v1->y - v0->y);
+			x = MAX(MIN(v0->x, v1->x), MIN(x, MAX(v0->x, v1->x)));
+			x_col = pip_grid_col(grid, x);
+			/* Crossings rounded past the point's cell count in its cell */
+			if (x_col == col || (col == pt_col && x_col > col)) {
+				if (v1_above) { /* Upward crossing */
+					winding_no += (SIDE(v0, v1, pt) <= 0);
+				} else {
+					winding_no -= (SIDE(v0, v1, pt) >= 0);
+				}
+			}
+		}
+	}
+	return winding_no != 0;
+}
+
+static int
+pnp_grid_test(PlanarPolygonObject *self, planar_vec2_t *pt)
+{
+	PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_GRID, self->grid != NULL);
+	if (self->grid == NULL) {
+		self->grid = pip_grid_new(self);
+		if (self->grid == NULL) {
+			return -1;
+		}
 	}
-	min = max = left = right = self->vert;
-	min_y = max_y = self->vert[0].y;
-	min_x = max_x = self->vert[0].x;
-	v_end = self->vert + Py_SIZE(self) - 1;
-	for (v = self->vert + 1; v <= v_end; ++v) {
+	return grid_test(self->vert, Py_SIZE(self), self->grid, pt);
+}
+
+/* Split the vertices of a convex polygon into two y-monotone polylines
+   stored consecutively in buf, which must have room for size + 2
+   vertices. Return the offset of the right polyline in buf */
+static Py_ssize_t
+split_y_verts(planar_vec2_t *vert, const Py_ssize_t size, planar_vec2_t *buf)
+{
+	double min_y, max_y, area2;
+	planar_vec2_t *v, *v_end, *p, *pl1, *pl2;
+	planar_vec2_t *min, *max, *rt;
+
+	min = max = vert;
+	min_y = max_y = vert[0].y;
+	v_end = vert + size - 1;
+	/* Twice the signed area, positive if counter-clockwise */
+	area2 = v_end->x * vert[0].y - vert[0].x * v_end->y;
+	for (v = vert + 1; v <= v_end; ++v) {
 		if (v->y < min_y) {
 			min_y = v->y;
 			min = v;
@@ -946,28 +2362,25 @@ split_y_polylines(PlanarPolygonObject *self)
 			max_y = v->y;
 			max = v;
 		}
-		if (v->x < min_x) {
-			min_x = v->x;
-			left = v;
-		}
-		if (v->x > max_x) {
-			max_x = v->x;
-			right = v;
-		}
+		area2 += (v - 1)->x * v->y - v->x * (v - 1)->y;
 	}
+	/* The vertices from min to max in order are on the right side
+	   of a counter-clockwise polygon. The leftmost and rightmost 
+	   vertices cannot tell the sides apart when they are also the 
+	   lowest or highest */
 	if (min < max) {
-		if ((min <= left && left < max) || right < min || right > max) {
-			pl1 = self->lt_y_poly;
-			pl2 = self->rt_y_poly = pl1 + (max - min) + 1;
+		if (!(area2 > 0.0)) {
+			pl1 = buf;
+			pl2 = rt = pl1 + (max - min) + 1;
 		} else {
-			pl2 = self->lt_y_poly;
-			pl1 = self->rt_y_poly = pl2 + (Py_SIZE(self) - (max - min)) + 1;
+			pl2 = buf;
+			pl1 = rt = pl2 + (size - (max - min)) + 1;
 		}
 		for (v = min, p = pl1; v <= max; ++v, ++p) {
 			p->x = v->x;
 			p->y = v->y;
 		}
-		for (v = min, p = pl2; v >= self->vert; --v, ++p) {
+		for (v = min, p = pl2; v >= vert; --v, ++p) {
 			p->x = v->x;
 			p->y = v->y;
 		}
@@ -976,12 +2389,12 @@ split_y_polylines(PlanarPolygonObject *self)
 			p->y = v->y;
 		}
 	} else {
-		if ((min >= left && left > max) || right > min || right < max) {
-			pl1 = self->lt_y_poly;
-			pl2 = self->rt_y_poly = pl1 + (min - max) + 1;
+		if (area2 > 0.0) {
+			pl1 = buf;
+			pl2 = rt = pl1 + (min - max) + 1;
 		} else {
-			pl2 = self->lt_y_poly;
-			pl1 = self->rt_y_poly = pl2 + (Py_SIZE(self) - (min - max)) + 1;
+			pl2 = buf;
+			pl1 = rt = pl2 + (size - (min - max)) + 1;
 		}
 		for (v = min, p = pl1; v >= max; --v, ++p) {
 			p->x = v->x;
@@ -991,156 +2404,1366 @@ split_y_polylines(PlanarPolygonObject *self)
 			p->x = v->x;
 			p->y = v->y;
 		}
-		for (v = self->vert; v <= max; ++v, ++p) {
+		for (v = vert; v <= max; ++v, ++p) {
 			p->x = v->x;
 			p->y = v->y;
 		}
 	}
-	return 0;
+	return rt - buf;
+}
+
+static int 
+split_y_polylines(PlanarPolygonObject *self) 
+{
+	planar_vec2_t *buf;
+	Py_ssize_t rt_offset;
+
+	buf = (planar_vec2_t *)PyMem_Malloc(
+		sizeof(planar_vec2_t) * (Py_SIZE(self) + 2));
+	if (buf == NULL) {
+		return -1;
+	}
+	POLY_NOGIL(self, 
+		rt_offset = split_y_verts(self->vert, Py_SIZE(self), buf));
+	if (self->lt_y_poly != NULL) {
+		/* Split by another thread while the GIL was released */
+		PyMem_Free(buf);
+	} else {
+		self->lt_y_poly = buf;
+		self->rt_y_poly = buf + rt_offset;
+	}
+	return 0;
+}
+
+/* Test a point against the y-monotone polylines of a convex polygon,
+   split by split_y_verts() */
+static int 
+y_monotone_test(planar_vec2_t *lt_y_poly, planar_vec2_t *rt_y_poly, 
+	Py_ssize_t size, planar_vec2_t *pt)
+{
+	planar_vec2_t *v, *lo, *hi;
+	double pt_y = pt->y;
+
+	lo = lt_y_poly;
+	hi = rt_y_poly - 1;
+	if ((pt_y < lo->y) | (pt_y > hi->y)) {
+		return 0;
+	}
+	while (lo < hi) {
+		v = lo + (hi - lo) / 2;
+		if (pt_y < v->y) {
+			hi = v;
+		} else {
+			lo = v + 1;
+		}
+	}
+	if (SIDE(lo - 1, lo, pt) > 0.0) {
+		/* pt too far left */
+		return 0;
+	}
+	lo = rt_y_poly;
+	hi = lt_y_poly + size + 1;
+	while (lo < hi) {
+		v = lo + (hi - lo) / 2;
+		if (pt_y < v->y) {
+			hi = v;
+		} else {
+			lo = v + 1;
+		}
+	}
+	return SIDE(lo - 1, lo, pt) > 0.0;
+}
+
+static int pnp_y_monotone_test(PlanarPolygonObject *self, planar_vec2_t *pt)
+{
+	PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_Y_POLYLINES, self->lt_y_poly != NULL);
+	if (self->lt_y_poly == NULL) {
+		if (split_y_polylines(self) == -1) {
+			return -1;
+		}
+	}
+	return y_monotone_test(
+		self->lt_y_poly, self->rt_y_poly, Py_SIZE(self), pt);
+}
+
+static PyObject *
+poly_contains_point(PlanarPolygonObject *self, PyObject *point)
+{
+	planar_vec2_t pt;
+	int result = 0;
+	double d2;
+	PlanarBBoxObject *bbox;
+	
+	if (!PlanarVec2_Parse(point, &pt.x, &pt.y)) {
+		PyErr_SetString(PyExc_TypeError,
+			"Polygon.contains_point(): "
+			"expected Vec2 object for argument");
+		return NULL;
+	}
+	if ((POLY_FLAGS(self) & (POLY_RADIUS_KNOWN_FLAG | POLY_CENTROID_KNOWN_FLAG))
+		== (POLY_RADIUS_KNOWN_FLAG | POLY_CENTROID_KNOWN_FLAG)) {
+		d2 = (pt.x - self->centroid.x)*(pt.x - self->centroid.x)
+			+ (pt.y - self->centroid.y)*(pt.y - self->centroid.y);
+		if (d2 < self->min_r2) {
+			PLANAR_STAT(PLANAR_STAT_PIP_RADIUS_INSIDE);
+			return Py_BOOL(1);
+		}
+		if (d2 > self->max_r2) {
+			PLANAR_STAT(PLANAR_STAT_PIP_RADIUS_OUTSIDE);
+			return Py_BOOL(0);
+		}
+	}
+	if (poly_is_convex(self) && Py_SIZE(self) > 5) {
+		PLANAR_STAT(PLANAR_STAT_PIP_Y_MONOTONE);
+		result = pnp_y_monotone_test(self, &pt);
+	} else {
+		if (Py_SIZE(self) > 4) {
+			bbox = poly_get_bbox(self);
+			if (bbox == NULL) {
+				return NULL;
+			}
+			if (!PlanarBBox_contains_point(bbox, &pt)) {
+				Py_DECREF(bbox);
+				PLANAR_STAT(PLANAR_STAT_PIP_BBOX_REJECT);
+				return Py_BOOL(0);
+			}
+			Py_DECREF(bbox);
+		}
+		if (POLY_FLAGS(self) & POLY_PREPARED_FLAG) {
+			PLANAR_STAT(PLANAR_STAT_PIP_GRID);
+			result = pnp_grid_test(self, &pt);
+		} else {
+			PLANAR_STAT(PLANAR_STAT_PIP_WINDING);
+			result = pnp_winding_test(self, &pt);
+		}
+	}
+	if (result != -1) {
+		return Py_BOOL(result);
+	} else {
+		return PyErr_NoMemory();
+	}
+}
+
+static PyObject *
+Poly_contains_point(PlanarPolygonObject *self, PyObject *point)
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = poly_contains_point(self, point);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static PyObject *
+poly_contains_points(PlanarPolygonObject *self, PyObject *points)
+{
+	PlanarSeq2Object *seq;
+	PlanarBBoxObject *bbox = NULL;
+	PyObject *result = NULL;
+	planar_vec2_t *vectors = NULL, *pt, *pt_end;
+	planar_vec2_t *lt_y_poly, *rt_y_poly, centroid;
+	planar_pip_grid_t *grid;
+	PyThreadState *state;
+	Py_ssize_t size;
+	char *out;
+	double dx, dy, d2, min_r2, max_r2;
+	int use_radius, use_y_monotone, use_grid, i;
+	unsigned long version;
+	/* Points tested by each strategy, indexed by PLANAR_STAT_PIP_* */
+	Py_ssize_t counts[PLANAR_STAT_PIP_WINDING + 1] = {0};
+
+	seq = Seq2_FromPoints(points);
+	if (seq == NULL) {
+		return NULL;
+	}
+	if (!Seq2_GetVectors(seq, &vectors, &size)) {
+		goto error;
+	}
+	result = PyByteArray_FromStringAndSize(NULL, size);
+	if (result == NULL) {
+		goto error;
+	}
+	out = PyByteArray_AS_STRING(result);
+	pt = vectors;
+	pt_end = pt + size;
+
+	/* Select the strategy once for the whole batch, 
+	   consistent with Poly_contains_point() */
+	use_radius = (POLY_FLAGS(self) 
+		& (POLY_RADIUS_KNOWN_FLAG | POLY_CENTROID_KNOWN_FLAG))
+		== (POLY_RADIUS_KNOWN_FLAG | POLY_CENTROID_KNOWN_FLAG);
+	use_y_monotone = poly_is_convex(self) && Py_SIZE(self) > 5;
+	if (use_y_monotone) {
+		PLANAR_STAT_CACHE(
+			PLANAR_STAT_CACHE_Y_POLYLINES, self->lt_y_poly != NULL);
+		if (self->lt_y_poly == NULL && split_y_polylines(self) == -1) {
+			PyErr_NoMemory();
+			goto error;
+		}
+	} else if (Py_SIZE(self) > 4) {
+		bbox = poly_get_bbox(self);
+		if (bbox == NULL) {
+			goto error;
+		}
+	}
+	use_grid = !use_y_monotone && (POLY_FLAGS(self) & POLY_PREPARED_FLAG);
+	if (use_grid) {
+		PLANAR_STAT_CACHE(PLANAR_STAT_CACHE_GRID, self->grid != NULL);
+	}
+	if (use_grid && self->grid == NULL) {
+		self->grid = pip_grid_new(self);
+		if (self->grid == NULL) {
+			PyErr_NoMemory();
+			goto error;
+		}
+	}
+
+	centroid = self->centroid;
+	min_r2 = self->min_r2;
+	max_r2 = self->max_r2;
+	lt_y_poly = self->lt_y_poly;
+	rt_y_poly = self->rt_y_poly;
+	grid = self->grid;
+	version = self->version;
+	state = Planar_BeginNoGIL(size);
+	if (state != NULL) {
+		/* Take the cached polylines and grid from the polygon while the
+		   GIL is released, so they are not freed if another thread 
+		   mutates the polygon meanwhile */
+		self->lt_y_poly = self->rt_y_poly = NULL;
+		self->grid = NULL;
+	}
+	for (; pt < pt_end; ++pt, ++out) {
+		if (use_radius) {
+			dx = pt->x - centroid.x;
+			dy = pt->y - centroid.y;
+			d2 = dx*dx + dy*dy;
+			if (d2 < min_r2) {
+				*out = 1;
+				++counts[PLANAR_STAT_PIP_RADIUS_INSIDE];
+				continue;
+			}
+			if (d2 > max_r2) {
+				*out = 0;
+				++counts[PLANAR_STAT_PIP_RADIUS_OUTSIDE];
+				continue;
+			}
+		}
+		if (use_y_monotone) {
+			*out = y_monotone_test(lt_y_poly, rt_y_poly, Py_SIZE(self), pt);
+			++counts[PLANAR_STAT_PIP_Y_MONOTONE];
+		} else if (bbox != NULL && !PlanarBBox_contains_point(bbox, pt)) {
+			*out = 0;
+			++counts[PLANAR_STAT_PIP_BBOX_REJECT];
+		} else if (use_grid) {
+			*out = grid_test(self->vert, Py_SIZE(self), grid, pt);
+			++counts[PLANAR_STAT_PIP_GRID];
+		} else {
+			*out = pnp_winding_test(self, pt);
+			++counts[PLANAR_STAT_PIP_WINDING];
+		}
+	}
+	if (state != NULL) {
+		Planar_EndNoGIL(state);
+		/* Give the cached data back, unless the polygon has changed,
+		   or another thread has cached its own */
+		if (self->lt_y_poly == NULL && version == self->version) {
+			self->lt_y_poly = lt_y_poly;
+			self->rt_y_poly = rt_y_poly;
+		} else {
+			PyMem_Free(lt_y_poly);
+		}
+		if (self->grid == NULL && version == self->version) {
+			self->grid = grid;
+		} else {
+			pip_grid_free(grid);
+		}
+	}
+	if (Planar_GetState()->stats_enabled) {
+		for (i = 0; i <= PLANAR_STAT_PIP_WINDING; ++i) {
+			PLANAR_STAT_ADD(i, counts[i]);
+		}
+	}
+	Seq2_ReleaseVectors(seq, vectors);
+	Py_XDECREF(bbox);
+	Py_DECREF(seq);
+	return result;
+
+error:
+	if (vectors != NULL) {
+		Seq2_ReleaseVectors(seq, vectors);
+	}
+	Py_XDECREF(result);
+	Py_XDECREF(bbox);
+	Py_DECREF(seq);
+	return NULL;
+}
+
+static PyObject *
+Poly_contains_points(PlanarPolygonObject *self, PyObject *points)
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = poly_contains_points(self, points);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static PyObject *
+Poly_pnp_y_monotone_test(PlanarPolygonObject *self, PyObject *point)
+{
+	planar_vec2_t pt;
+	int result;
+	
+	if (!PlanarVec2_Parse(point, &pt.x, &pt.y)) {
+		PyErr_SetString(PyExc_TypeError,
+			"Polygon.contains_point(): "
+			"expected Vec2 object for argument");
+		return NULL;
+	}
+	result = pnp_y_monotone_test(self, &pt);
+	if (result != -1) {
+		return Py_BOOL(result);
+	} else {
+		return PyErr_NoMemory();
+	}
+}
+
+static PyObject *
+Poly_prepare(PlanarPolygonObject *self)
+{
+	POLY_SET_FLAGS(self, POLY_PREPARED_FLAG);
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
+static PyObject *
+Poly_pnp_winding_test(PlanarPolygonObject *self, PyObject *point)
+{
+	planar_vec2_t pt;
+	int result;
+	
+	if (!PlanarVec2_Parse(point, &pt.x, &pt.y)) {
+		PyErr_SetString(PyExc_TypeError,
+			"Polygon.contains_point(): "
+			"expected Vec2 object for argument");
+		return NULL;
+	}
+		result = pnp_winding_test(self, &pt);
+	if (result != -1) {
+		return Py_BOOL(result);
+	} else {
+		return PyErr_NoMemory();
+	}
+}
+
+static PyObject *
+Poly__repr__(PlanarPolygonObject *self)
+{
+	char props[256];
+	
+	props[0] = 0;
+	if (POLY_FLAGS(self) & POLY_CONVEX_KNOWN_FLAG) {
+		if (!(POLY_FLAGS(self) & POLY_CONVEX_FLAG)
+			&& POLY_FLAGS(self) & POLY_SIMPLE_KNOWN_FLAG) {
+			PyOS_snprintf(props, 255, ", is_convex=%s, is_simple=%s",
+				POLY_FLAGS(self) & POLY_CONVEX_FLAG ? "True" : "False",
+				POLY_FLAGS(self) & POLY_SIMPLE_FLAG ? "True" : "False");
+		} else {
+			PyOS_snprintf(props, 255, ", is_convex=%s", 
+				POLY_FLAGS(self) & POLY_CONVEX_FLAG ? "True" : "False");
+		}
+	}
+	return Seq2__repr__((PlanarSeq2Object *)self, "Polygon", props);
+}
+
+/* Clipping */
+
+#define VEC_EQUAL(a, b) (((a)->x == (b)->x) & ((a)->y == (b)->y))
+
+/* Remove consecutive duplicates from a closed sequence of points
+   in place, returning the new size */
+static Py_ssize_t
+dedupe_points(planar_vec2_t *pts, Py_ssize_t size)
+{
+	planar_vec2_t prev, cur;
+	Py_ssize_t i, count = 0;
+
+	if (size == 0) {
+		return 0;
+	}
+	prev = pts[size - 1];
+	for (i = 0; i < size; ++i) {
+		cur = pts[i];
+		if (!VEC_EQUAL(&cur, &prev)) {
+			pts[count++] = cur;
+		}
+		prev = cur;
+	}
+	return count ? count : 1;
+}
+
+/* Store the vertices of a convex clip region in a newly allocated
+   array of distinct points wound counter-clockwise. Return 1 on success,
+   0 if the region has no area, or -1 on error */
+static int
+convex_clip_points(PyObject *convex, planar_vec2_t **pts, Py_ssize_t *size)
+{
+	PlanarPolygonObject *poly;
+	PlanarBBoxObject *bbox;
+	planar_vec2_t *p;
+	double area;
+	Py_ssize_t i;
+
+	if (PlanarBBox_Check(convex)) {
+		bbox = (PlanarBBoxObject *)convex;
+		if (bbox->min.x >= bbox->max.x || bbox->min.y >= bbox->max.y) {
+			return 0;
+		}
+		p = *pts = (planar_vec2_t *)PyMem_Malloc(sizeof(planar_vec2_t) * 4);
+		if (p == NULL) {
+			PyErr_NoMemory();
+			return -1;
+		}
+		p[0].x = p[3].x = bbox->min.x;
+		p[1].x = p[2].x = bbox->max.x;
+		p[0].y = p[1].y = bbox->min.y;
+		p[2].y = p[3].y = bbox->max.y;
+		*size = 4;
+		return 1;
+	}
+	if (!PlanarPolygon_Check(convex)) {
+		PyErr_Format(PyExc_TypeError, 
+			"Expected Polygon or BoundingBox, got %.200s",
+			Py_TYPE(convex)->tp_name);
+		return -1;
+	}
+	poly = (PlanarPolygonObject *)convex;
+	if (!poly_is_convex(poly)) {
+		PyErr_SetString(PyExc_ValueError, "Clip polygon must be convex");
+		return -1;
+	}
+	area = poly_signed_area(poly);
+	if (area == 0.0) {
+		return 0;
+	}
+	p = *pts = (planar_vec2_t *)PyMem_Malloc(
+		sizeof(planar_vec2_t) * Py_SIZE(poly));
+	if (p == NULL) {
+		PyErr_NoMemory();
+		return -1;
+	}
+	for (i = 0; i < Py_SIZE(poly); ++i) {
+		p[i] = poly->vert[area > 0.0 ? i : Py_SIZE(poly) - 1 - i];
+	}
+	*size = dedupe_points(p, Py_SIZE(poly));
+	return 1;
+}
+
+/* Clip a closed sequence of points against each edge of the
+   counter-clockwise convex polygon clip in turn, using the
+   Sutherland-Hodgman algorithm. Return a newly allocated array of
+   the clipped points, storing its length in size */
+static planar_vec2_t *
+clip_convex(planar_vec2_t *pts, Py_ssize_t *size,
+	planar_vec2_t *clip, Py_ssize_t clip_size)
+{
+	planar_vec2_t *input, *output, *tmp, *a, *b, *c, *d;
+	Py_ssize_t capacity, in_size = *size, out_size, i, j;
+	double ex, ey, a_side, b_side, t;
+
+	capacity = in_size * 2;
+	input = (planar_vec2_t *)PyMem_Malloc(sizeof(planar_vec2_t) * capacity);
+	output = (planar_vec2_t *)PyMem_Malloc(sizeof(planar_vec2_t) * capacity);
+	if (input == NULL || output == NULL) {
+		goto error;
+	}
+	memcpy(input, pts, sizeof(planar_vec2_t) * in_size);
+	c = clip + clip_size - 1;
+	for (j = 0; j < clip_size && in_size > 0; ++j) {
+		d = clip + j;
+		if (in_size * 2 > capacity) {
+			/* Each pass can at most double the number of points */
+			capacity = in_size * 2;
+			tmp = (planar_vec2_t *)PyMem_Realloc(
+				input, sizeof(planar_vec2_t) * capacity);
+			if (tmp == NULL) goto error;
+			input = tmp;
+			tmp = (planar_vec2_t *)PyMem_Realloc(
+				output, sizeof(planar_vec2_t) * capacity);
+			if (tmp == NULL) goto error;
+			output = tmp;
+		}
+		ex = d->x - c->x;
+		ey = d->y - c->y;
+		out_size = 0;
+		a = input + in_size - 1;
+		a_side = ex * (a->y - c->y) - ey * (a->x - c->x);
+		for (i = 0; i < in_size; ++i) {
+			b = input + i;
+			b_side = ex * (b->y - c->y) - ey * (b->x - c->x);
+			if ((a_side >= 0.0) != (b_side >= 0.0)) {
+				/* Edge crosses the clip line, add the intersection point */
+				t = a_side / (a_side - b_side);
+				output[out_size].x = a->x + (b->x - a->x) * t;
+				output[out_size].y = a->y + (b->y - a->y) * t;
+				++out_size;
+			}
+			if (b_side >= 0.0) {
+				output[out_size++] = *b;
+			}
+			a = b;
+			a_side = b_side;
+		}
+		in_size = dedupe_points(output, out_size);
+		tmp = input;
+		input = output;
+		output = tmp;
+		c = d;
+	}
+	PyMem_Free(output);
+	*size = in_size;
+	return input;
+
+error:
+	PyMem_Free(input);
+	PyMem_Free(output);
+	PyErr_NoMemory();
+	return NULL;
+}
+
+#define SEG_DISJOINT '0'
+#define SEG_CROSS '1'
+#define SEG_VERTEX 'v'
+#define SEG_OVERLAP 'e'
+
+/* Classify the intersection of segments ab and cd, storing the
+   intersection point, if any, in pt. Return SEG_CROSS if the segments 
+   cross properly, SEG_VERTEX if an endpoint of one lies on the other,
+   SEG_OVERLAP if they overlap collinearly, and SEG_DISJOINT if they do
+   not intersect */
+static int
+segment_intersection(planar_vec2_t *a, planar_vec2_t *b,
+	planar_vec2_t *c, planar_vec2_t *d, planar_vec2_t *pt)
+{
+	double denom, num, s, t;
+	planar_vec2_t *p, *q0, *q1;
+	planar_vec2_t *overlap_tests[4][3] = {
+		{c, a, b}, {d, a, b}, {a, c, d}, {b, c, d}};
+	int code = SEG_DISJOINT, i;
+
+	denom = (a->x * (d->y - c->y) + b->x * (c->y - d->y) 
+		+ d->x * (b->y - a->y) + c->x * (a->y - b->y));
+	if (denom == 0.0) {
+		/* Parallel segments */
+		if (SIDE(a, b, c) != 0.0) {
+			return SEG_DISJOINT;
+		}
+		for (i = 0; i < 4; ++i) {
+			p = overlap_tests[i][0];
+			q0 = overlap_tests[i][1];
+			q1 = overlap_tests[i][2];
+			if (p->x >= MIN(q0->x, q1->x) && p->x <= MAX(q0->x, q1->x)
+				&& p->y >= MIN(q0->y, q1->y) && p->y <= MAX(q0->y, q1->y)) {
+				*pt = *p;
+				return SEG_OVERLAP;
+			}
+		}
+		return SEG_DISJOINT;
+	}
+	num = a->x * (d->y - c->y) + c->x * (a->y - d->y) + d->x * (c->y - a->y);
+	if (num == 0.0 || num == denom) {
+		code = SEG_VERTEX;
+	}
+	s = num / denom;
+	num = -(a->x * (c->y - b->y) + b->x * (a->y - c->y) 
+		+ c->x * (b->y - a->y));
+	if (num == 0.0 || num == denom) {
+		code = SEG_VERTEX;
+	}
+	t = num / denom;
+	if (s > 0.0 && s < 1.0 && t > 0.0 && t < 1.0) {
+		code = SEG_CROSS;
+	} else if (s < 0.0 || s > 1.0 || t < 0.0 || t > 1.0) {
+		code = SEG_DISJOINT;
+	}
+	pt->x = a->x + s * (b->x - a->x);
+	pt->y = a->y + s * (b->y - a->y);
+	return code;
+}
+
+/* Return twice the signed area of a closed sequence of points */
+static double
+twice_area(planar_vec2_t *pts, Py_ssize_t size)
+{
+	planar_vec2_t *a = pts + size - 1, *b;
+	double total = 0.0;
+
+	for (b = pts; b < pts + size; a = b++) {
+		total += a->x * b->y - b->x * a->y;
+	}
+	return total;
+}
+
+/* Return 1 if the average of the points in inner is inside or on the
+   boundary of the counter-clockwise convex polygon outer */
+static int
+convex_contains_mean(planar_vec2_t *outer, Py_ssize_t outer_size,
+	planar_vec2_t *inner, Py_ssize_t inner_size)
+{
+	planar_vec2_t pt, *a, *b;
+	Py_ssize_t i;
+
+	pt.x = pt.y = 0.0;
+	for (i = 0; i < inner_size; ++i) {
+		pt.x += inner[i].x;
+		pt.y += inner[i].y;
+	}
+	pt.x /= inner_size;
+	pt.y /= inner_size;
+	a = outer + outer_size - 1;
+	for (b = outer; b < outer + outer_size; a = b++) {
+		if (SIDE(a, b, &pt) < 0.0) {
+			return 0;
+		}
+	}
+	return 1;
+}
+
+#define INSIDE_UNKNOWN 0
+#define INSIDE_P 1
+#define INSIDE_Q 2
+
+/* Return the intersection of two counter-clockwise convex polygons P
+   and Q, given as arrays of distinct points, in a newly allocated array,
+   storing its length in size. This uses O'Rourke's algorithm, which 
+   advances around both polygons together, emitting the boundary of the
+   intersection as it goes.
+
+   See O'Rourke, J. et al., "A new linear algorithm for intersecting
+   convex polygons", Computer Graphics and Image Processing 19, 1982.
+ */
+static planar_vec2_t *
+intersect_convex(planar_vec2_t *P, Py_ssize_t n, 
+	planar_vec2_t *Q, Py_ssize_t m, Py_ssize_t *size)
+{
+	planar_vec2_t *output, *pa0, *pa1, *qb0, *qb1, *result;
+	planar_vec2_t pt;
+	Py_ssize_t a = 0, b = 0, a_count = 0, b_count = 0, count = 0;
+	double ax, ay, bx, by, cross, a_side, b_side;
+	int inside = INSIDE_UNKNOWN, first = 1, advance_a, code, p_in_q, q_in_p;
+
+	/* Each step emits at most two points, and the loop
+	   takes at most 2(n + m) steps */
+	output = (planar_vec2_t *)PyMem_Malloc(
+		sizeof(planar_vec2_t) * 4 * (n + m + 1));
+	if (output == NULL) {
+		PyErr_NoMemory();
+		return NULL;
+	}
+	for (;;) {
+		pa0 = P + (a ? a - 1 : n - 1);
+		pa1 = P + a;
+		qb0 = Q + (b ? b - 1 : m - 1);
+		qb1 = Q + b;
+		ax = pa1->x - pa0->x;
+		ay = pa1->y - pa0->y;
+		bx = qb1->x - qb0->x;
+		by = qb1->y - qb0->y;
+		cross = ax * by - ay * bx;
+		a_side = SIDE(qb0, qb1, pa1);
+		b_side = SIDE(pa0, pa1, qb1);
+		code = segment_intersection(pa0, pa1, qb0, qb1, &pt);
+		if (code == SEG_CROSS || code == SEG_VERTEX) {
+			if (inside == INSIDE_UNKNOWN && first) {
+				a_count = b_count = 0;
+				first = 0;
+			}
+			output[count++] = pt;
+			if (a_side > 0.0) {
+				inside = INSIDE_P;
+			} else if (b_side > 0.0) {
+				inside = INSIDE_Q;
+			}
+		}
+		if ((code == SEG_OVERLAP && ax * bx + ay * by < 0.0)
+			|| (cross == 0.0 && a_side < 0.0 && b_side < 0.0)) {
+			/* Polygons touch along an edge, or have parallel
+			   separating edges */
+			*size = 0;
+			return output;
+		}
+		if (cross == 0.0 && a_side == 0.0 && b_side == 0.0) {
+			/* Collinear edges, advance the outside one */
+			advance_a = inside != INSIDE_P;
+		} else if (cross >= 0.0) {
+			advance_a = b_side > 0.0;
+		} else {
+			advance_a = a_side <= 0.0;
+		}
+		if (advance_a) {
+			if (inside == INSIDE_P) {
+				output[count++] = *pa1;
+			}
+			a = (a + 1) % n;
+			++a_count;
+		} else {
+			if (inside == INSIDE_Q) {
+				output[count++] = *qb1;
+			}
+			b = (b + 1) % m;
+			++b_count;
+		}
+		if ((a_count >= n && b_count >= m) 
+			|| a_count >= 2 * n || b_count >= 2 * m) {
+			break;
+		}
+	}
+	if (inside == INSIDE_UNKNOWN) {
+		/* The boundaries do not cross, so either one polygon contains the
+		   other, or they do not overlap. The interior point of the contained
+		   polygon will be inside the container, but the reverse may also
+		   be true, in which case the smaller polygon is contained. */
+		p_in_q = convex_contains_mean(Q, m, P, n);
+		q_in_p = convex_contains_mean(P, n, Q, m);
+		if (p_in_q && q_in_p) {
+			result = twice_area(P, n) <= twice_area(Q, m) ? P : Q;
+		} else {
+			result = p_in_q ? P : (q_in_p ? Q : NULL);
+		}
+		if (result == NULL) {
+			*size = 0;
+		} else {
+			*size = result == P ? n : m;
+			memcpy(output, result, sizeof(planar_vec2_t) * *size);
+		}
+		return output;
+	}
+	*size = dedupe_points(output, count);
+	return output;
+}
+
+/* Return a new polygon of the same type as self from an array of
+   points, or None if there are too few points */
+static PyObject *
+poly_from_clipped(PlanarPolygonObject *self, planar_vec2_t *pts, 
+	Py_ssize_t size, int is_convex)
+{
+	PlanarPolygonObject *poly;
+	PyObject *result;
+
+	if (size < 3) {
+		Py_RETURN_NONE;
+	}
+	poly = Poly_new(Py_TYPE(self), size);
+	if (poly == NULL) {
+		return NULL;
+	}
+	memcpy(poly->vert, pts, sizeof(planar_vec2_t) * size);
+	if (is_convex) {
+		poly->flags = (POLY_CONVEX_FLAG | POLY_CONVEX_KNOWN_FLAG 
+			| POLY_SIMPLE_FLAG | POLY_SIMPLE_KNOWN_FLAG);
+	}
+	if (PlanarPolygon_CheckExact(self)) {
+		return (PyObject *)poly;
+	}
+	result = call_from_points((PyObject *)self, (PyObject *)poly);
+	Py_DECREF(poly);
+	return result;
+}
+
+static PyObject *
+Poly_clip(PlanarPolygonObject *self, PyObject *convex)
+{
+	planar_vec2_t *clip_pts = NULL, *pts;
+	Py_ssize_t clip_size, size;
+	PyObject *result;
+	int status;
+
+	status = convex_clip_points(convex, &clip_pts, &clip_size);
+	if (status <= 0) {
+		if (status == 0) {
+			Py_RETURN_NONE;
+		}
+		return NULL;
+	}
+	size = Py_SIZE(self);
+	pts = clip_convex(self->vert, &size, clip_pts, clip_size);
+	PyMem_Free(clip_pts);
+	if (pts == NULL) {
+		return NULL;
+	}
+	result = poly_from_clipped(self, pts, size, 0);
+	PyMem_Free(pts);
+	return result;
+}
+
+static PyObject *
+Poly_intersection(PlanarPolygonObject *self, PyObject *convex)
+{
+	planar_vec2_t *other_pts = NULL, *pts, *result_pts, tmp;
+	Py_ssize_t other_size, size, i;
+	PyObject *result;
+	int status, reversed;
+
+	if (!poly_is_convex(self)) {
+		return Poly_clip(self, convex);
+	}
+	status = convex_clip_points(convex, &other_pts, &other_size);
+	if (status <= 0) {
+		if (status == 0) {
+			Py_RETURN_NONE;
+		}
+		return NULL;
+	}
+	size = Py_SIZE(self);
+	pts = (planar_vec2_t *)PyMem_Malloc(sizeof(planar_vec2_t) * size);
+	if (pts == NULL) {
+		PyMem_Free(other_pts);
+		return PyErr_NoMemory();
+	}
+	reversed = poly_signed_area(self) < 0.0;
+	for (i = 0; i < size; ++i) {
+		pts[i] = self->vert[reversed ? size - 1 - i : i];
+	}
+	size = dedupe_points(pts, size);
+	result_pts = intersect_convex(pts, size, other_pts, other_size, &size);
+	PyMem_Free(pts);
+	PyMem_Free(other_pts);
+	if (result_pts == NULL) {
+		return NULL;
+	}
+	if (reversed) {
+		for (i = 0; i < size / 2; ++i) {
+			tmp = result_pts[i];
+			result_pts[i] = result_pts[size - 1 - i];
+			result_pts[size - 1 - i] = tmp;
+		}
+	}
+	result = poly_from_clipped(self, result_pts, size, 1);
+	PyMem_Free(result_pts);
+	return result;
+}
+
+/* Boolean operations */
+
+#define BOOL_UNION 0
+#define BOOL_DIFFERENCE 1
+#define BOOL_XOR 2
+
+#define BOOL_RING(seq, self, i) ((i) ? \
+	(PlanarPolygonObject *)PySequence_Fast_GET_ITEM(seq, (i) - 1) : (self))
+
+/* Piece of an edge between intersections, with its endpoints in sweep
+   order, and the change in winding number of each shape from the right
+   side of the piece to its left side */
+typedef struct {
+	planar_vec2_t left;
+	planar_vec2_t right;
+	int winding[2];
+} planar_bool_edge_t;
+
+typedef struct {
+	planar_vec2_t pt;
+	Py_ssize_t segment;
+} planar_bool_split_t;
+
+typedef struct {
+	planar_bool_split_t *splits;
+	Py_ssize_t count;
+	Py_ssize_t allocated;
+} planar_bool_splits_t;
+
+typedef struct {
+	planar_vec2_t *pt;
+	int is_start;
+	double angle;
+	Py_ssize_t edge;
+} planar_bool_event_t;
+
+/* Directed edge of the result boundary */
+typedef struct {
+	planar_vec2_t start;
+	planar_vec2_t end;
+	Py_ssize_t order;
+	int used;
+} planar_boundary_edge_t;
+
+static int
+compare_points(const planar_vec2_t *a, const planar_vec2_t *b)
+{
+	const int result = (a->x > b->x) - (a->x < b->x);
+	return result ? result : (a->y > b->y) - (a->y < b->y);
+}
+
+static int
+compare_bool_splits(const void *a, const void *b)
+{
+	const planar_bool_split_t *sa = (planar_bool_split_t *)a;
+	const planar_bool_split_t *sb = (planar_bool_split_t *)b;
+	const int result = (sa->segment > sb->segment) 
+		- (sa->segment < sb->segment);
+	return result ? result : compare_points(&sa->pt, &sb->pt);
+}
+
+static int
+compare_bool_edges(const void *a, const void *b)
+{
+	const planar_bool_edge_t *ea = (planar_bool_edge_t *)a;
+	const planar_bool_edge_t *eb = (planar_bool_edge_t *)b;
+	const int result = compare_points(&ea->left, &eb->left);
+	return result ? result : compare_points(&ea->right, &eb->right);
+}
+
+/* Comparison function for sorting boolean sweep events. Events are
+   ordered lexicographically by point, with edge ends before edge starts,
+   and edge starts in ascending order along the sweep line */
+static int
+compare_bool_events(const void *a, const void *b)
+{
+	const planar_bool_event_t *ea = (planar_bool_event_t *)a;
+	const planar_bool_event_t *eb = (planar_bool_event_t *)b;
+	int result = compare_points(ea->pt, eb->pt);
+	if (!result) {
+		result = ea->is_start - eb->is_start;
+	}
+	if (!result) {
+		result = (ea->angle > eb->angle) - (ea->angle < eb->angle);
+	}
+	if (!result) {
+		result = (ea->edge > eb->edge) - (ea->edge < eb->edge);
+	}
+	return result;
+}
+
+static int
+compare_boundary_edges(const void *a, const void *b)
+{
+	const planar_boundary_edge_t *ea = (planar_boundary_edge_t *)a;
+	const planar_boundary_edge_t *eb = (planar_boundary_edge_t *)b;
+	const int result = compare_points(&ea->start, &eb->start);
+	return result ? result : (ea->order > eb->order) - (ea->order < eb->order);
+}
+
+/* Record the split points of segments at an intersection */
+static int
+bool_add_splits(double x, double y, 
+	Py_ssize_t *segments, Py_ssize_t count, void *arg)
+{
+	planar_bool_splits_t *s = (planar_bool_splits_t *)arg;
+	planar_bool_split_t *splits;
+	Py_ssize_t i;
+
+	if (s->count + count > s->allocated) {
+		s->allocated = (s->count + count) * 2;
+		splits = (planar_bool_split_t *)PyMem_Realloc(s->splits,
+			sizeof(planar_bool_split_t) * s->allocated);
+		if (splits == NULL) {
+			PyErr_NoMemory();
+			return 0;
+		}
+		s->splits = splits;
+	}
+	for (i = 0; i < count; ++i) {
+		s->splits[s->count].pt.x = x;
+		s->splits[s->count].pt.y = y;
+		s->splits[s->count++].segment = segments[i];
+	}
+	return 1;
+}
+
+static void
+bool_add_edge(planar_bool_edge_t *edge, planar_vec2_t *left, 
+	planar_vec2_t *right, int owner, int direction)
+{
+	edge->left = *left;
+	edge->right = *right;
+	edge->winding[owner] = direction;
+	edge->winding[!owner] = 0;
+}
+
+static int
+bool_inside(int op, int a, int b)
+{
+	switch (op) {
+		case BOOL_UNION:
+			return a || b;
+		case BOOL_DIFFERENCE:
+			return a && !b;
+		default:
+			return a != b;
+	}
+}
+
+/* Return the range of boundary edges starting at pt */
+static planar_boundary_edge_t *
+boundary_find(planar_boundary_edge_t *edges, Py_ssize_t count, 
+	const planar_vec2_t *pt, planar_boundary_edge_t **end)
+{
+	Py_ssize_t lo = 0, hi = count, mid;
+
+	while (lo < hi) {
+		mid = (lo + hi) / 2;
+		if (compare_points(&edges[mid].start, pt) < 0) {
+			lo = mid + 1;
+		} else {
+			hi = mid;
+		}
+	}
+	for (hi = lo; hi < count && compare_points(&edges[hi].start, pt) == 0;
+		++hi);
+	*end = edges + hi;
+	return edges + lo;
+}
+
+/* Return the unused edge leaving pt that turns furthest left when 
+   arriving from prev, or NULL if there are none */
+static planar_boundary_edge_t *
+boundary_next(planar_boundary_edge_t *edges, Py_ssize_t count, 
+	const planar_vec2_t *prev, const planar_vec2_t *pt)
+{
+	planar_boundary_edge_t *e, *end, *best = NULL;
+	double back, turn, best_turn = 0.0;
+	Py_ssize_t unused = 0;
+
+	edges = boundary_find(edges, count, pt, &end);
+	for (e = edges; e < end; ++e) {
+		if (!e->used) {
+			best = e;
+			++unused;
+		}
+	}
+	if (unused > 1) {
+		best = NULL;
+		back = atan2(prev->y - pt->y, prev->x - pt->x);
+		for (e = edges; e < end; ++e) {
+			if (!e->used) {
+				turn = fmod(back - atan2(e->end.y - pt->y, e->end.x - pt->x), 
+					2.0 * M_PI);
+				if (turn <= 0.0) {
+					turn += 2.0 * M_PI;
+				}
+				if (best == NULL || turn < best_turn) {
+					best = e;
+					best_turn = turn;
+				}
+			}
+		}
+	}
+	return best;
+}
+
+/* Remove vertices that lie in the middle of a straight line from
+   a closed sequence of points, storing the result in out and returning
+   its length */
+static Py_ssize_t
+remove_collinear(planar_vec2_t *ring, Py_ssize_t size, planar_vec2_t *out)
+{
+	planar_vec2_t *a, *b, *c;
+	Py_ssize_t i, count = 0;
+
+	for (i = 0; i < size; ++i) {
+		a = count ? out + count - 1 : ring + (i ? i - 1 : size - 1);
+		b = ring + i;
+		c = ring + (i + 1) % size;
+		if ((b->x - a->x) * (c->y - b->y) - (c->x - b->x) * (b->y - a->y) 
+			!= 0.0 || (b->x - a->x) * (c->x - b->x) 
+			+ (b->y - a->y) * (c->y - b->y) < 0.0) {
+			out[count++] = *b;
+		}
+	}
+	return count;
+}
+
+/* Join the boundary edges into closed rings, returning a list of 
+   polygons. Where several edges leave a point, the one turning furthest
+   left is followed, so that rings touching at a point are kept separate */
+static PyObject *
+boundary_join(PlanarPolygonObject *self, 
+	planar_boundary_edge_t *edges, Py_ssize_t count)
+{
+	planar_boundary_edge_t *group, *group_end, *first, *e;
+	planar_vec2_t *ring = NULL, *out = NULL, *prev, *pt;
+	Py_ssize_t size;
+	PyObject *result, *poly;
+
+	result = PyList_New(0);
+	ring = (planar_vec2_t *)PyMem_Malloc(sizeof(planar_vec2_t) * (count + 1));
+	out = (planar_vec2_t *)PyMem_Malloc(sizeof(planar_vec2_t) * (count + 1));
+	if (result == NULL || ring == NULL || out == NULL) {
+		if (result != NULL) {
+			PyErr_NoMemory();
+		}
+		goto error;
+	}
+	qsort(edges, count, sizeof(planar_boundary_edge_t), 
+		compare_boundary_edges);
+	for (group = edges; group < edges + count; group = group_end) {
+		for (group_end = group; group_end < edges + count 
+			&& compare_points(&group_end->start, &group->start) == 0;
+			++group_end);
+		for (;;) {
+			/* The first edge is left unused, so it can be chosen to
+			   close the ring if it turns furthest left at the end */
+			for (first = group_end - 1; first >= group && first->used; 
+				--first);
+			if (first < group) {
+				break;
+			}
+			prev = &first->start;
+			pt = &first->end;
+			ring[0] = first->start;
+			size = 1;
+			for (;;) {
+				e = boundary_next(edges, count, prev, pt);
+				if (e == NULL) {
+					/* Not closed due to rounding errors */
+					first->used = 1;
+					size = 0;
+					break;
+				}
+				ring[size++] = *pt;
+				e->used = 1;
+				prev = &e->start;
+				pt = &e->end;
+				if (e == first) {
+					--size;
+					break;
+				}
+			}
+			size = remove_collinear(ring, size, out);
+			if (size >= 3) {
+				poly = poly_from_clipped(self, out, size, 0);
+				if (poly == NULL || PyList_Append(result, poly) == -1) {
+					Py_XDECREF(poly);
+					goto error;
+				}
+				Py_DECREF(poly);
+			}
+		}
+	}
+	PyMem_Free(ring);
+	PyMem_Free(out);
+	return result;
+
+error:
+	Py_XDECREF(result);
+	PyMem_Free(ring);
+	PyMem_Free(out);
+	return NULL;
 }
 
-static int pnp_y_monotone_test(PlanarPolygonObject *self, planar_vec2_t *pt)
+/* Perform a boolean operation on a polygon and another shape,
+   returning the boundary of the result as a list of polygons.
+
+   The edges of both shapes are split at every intersection point, found
+   with a Bentley-Ottmann sweep. A second sweep over the split edges
+   finds the winding number of each shape on both sides of every edge.
+   The edges where the result changes from outside to inside are kept,
+   and joined into closed boundaries */
+static PyObject *
+poly_boolean_op(PlanarPolygonObject *self, PyObject *other, int op)
 {
-	planar_vec2_t *v, *lo, *hi;
-	double pt_y = pt->y;
+	PyObject *seq = NULL, *result = NULL;
+	PlanarPolygonObject *ring;
+	planar_vec2_t *ends = NULL, *a, *b, *pt;
+	int *owners = NULL, *directions = NULL, *above = NULL;
+	planar_bool_splits_t s = {NULL, 0, 0};
+	planar_bool_edge_t *edges = NULL, *edge;
+	planar_edge_node_t *nodes = NULL;
+	planar_bool_event_t *events = NULL, *event;
+	planar_boundary_edge_t *boundary = NULL;
+	Py_ssize_t ring_count, seg_count = 0, edge_count = 0, boundary_count = 0;
+	Py_ssize_t i, j, k, root = -1, below;
+	int wa, wb, inside_below, inside_above;
 
-	if (self->lt_y_poly == NULL) {
-		if (split_y_polylines(self) == -1) {
-			return -1;
+	if (PlanarPolygon_Check(other)) {
+		seq = PyTuple_Pack(1, other);
+	} else {
+		seq = PySequence_Fast(other, 
+			"Expected Polygon or sequence of Polygons");
+	}
+	if (seq == NULL) {
+		return NULL;
+	}
+	/* Ring 0 is this polygon, the rest belong to the other shape */
+	ring_count = PySequence_Fast_GET_SIZE(seq) + 1;
+	for (i = 0; i < ring_count; ++i) {
+		ring = BOOL_RING(seq, self, i);
+		if (!PlanarPolygon_Check(ring)) {
+			PyErr_Format(PyExc_TypeError, 
+				"Expected Polygon or sequence of Polygons, got %.200s",
+				Py_TYPE(ring)->tp_name);
+			goto done;
 		}
+		seg_count += Py_SIZE(ring);
 	}
-	lo = self->lt_y_poly;
-	hi = self->rt_y_poly - 1;
-	if ((pt_y < lo->y) | (pt_y > hi->y)) {
-		return 0;
+	ends = (planar_vec2_t *)PyMem_Malloc(
+		sizeof(planar_vec2_t) * 2 * (seg_count + 1));
+	owners = (int *)PyMem_Malloc(sizeof(int) * (seg_count + 1));
+	directions = (int *)PyMem_Malloc(sizeof(int) * (seg_count + 1));
+	if (ends == NULL || owners == NULL || directions == NULL) {
+		PyErr_NoMemory();
+		goto done;
 	}
-	while (lo < hi) {
-		v = lo + (hi - lo) / 2;
-		if (pt_y < v->y) {
-			hi = v;
-		} else {
-			lo = v + 1;
+	seg_count = 0;
+	for (i = 0; i < ring_count; ++i) {
+		ring = BOOL_RING(seq, self, i);
+		a = ring->vert + Py_SIZE(ring) - 1;
+		for (b = ring->vert; b < ring->vert + Py_SIZE(ring); a = b++) {
+			ends[seg_count * 2] = *a;
+			ends[seg_count * 2 + 1] = *b;
+			owners[seg_count++] = i > 0;
 		}
 	}
-	if (SIDE(lo - 1, lo, pt) > 0.0) {
-		/* pt too far left */
-		return 0;
+	/* Vertices shared by the shapes up to rounding error must be
+	   identical, so the edges meeting there are joined */
+	if (!planar_snap_points(ends, seg_count * 2)) {
+		goto done;
 	}
-	lo = self->rt_y_poly;
-	hi = self->lt_y_poly + Py_SIZE(self) + 1;
-	while (lo < hi) {
-		v = lo + (hi - lo) / 2;
-		if (pt_y < v->y) {
-			hi = v;
-		} else {
-			lo = v + 1;
+	for (i = 0, j = 0; i < seg_count; ++i) {
+		a = ends + i * 2;
+		b = a + 1;
+		if (a->x != b->x || a->y != b->y) {
+			ends[j * 2] = *a;
+			ends[j * 2 + 1] = *b;
+			owners[j] = owners[i];
+			directions[j++] = compare_points(a, b) < 0 ? 1 : -1;
 		}
 	}
-	return SIDE(lo - 1, lo, pt) > 0.0;
-}
+	seg_count = j;
 
-static PyObject *
-Poly_contains_point(PlanarPolygonObject *self, PyObject *point)
-{
-	planar_vec2_t pt;
-	int result = 0;
-	double d2;
-	PlanarBBoxObject *bbox;
-	
-	if (!PlanarVec2_Parse(point, &pt.x, &pt.y)) {
-		PyErr_SetString(PyExc_TypeError,
-			"Polygon.contains_point(): "
-			"expected Vec2 object for argument");
-		return NULL;
+	/* Split the edges at each intersection, merging coincident pieces */
+	if (!planar_find_intersections(ends, seg_count, bool_add_splits, &s)) {
+		goto done;
 	}
-	if ((self->flags & (POLY_RADIUS_KNOWN_FLAG | POLY_CENTROID_KNOWN_FLAG))
-		== (POLY_RADIUS_KNOWN_FLAG | POLY_CENTROID_KNOWN_FLAG)) {
-		d2 = (pt.x - self->centroid.x)*(pt.x - self->centroid.x)
-			+ (pt.y - self->centroid.y)*(pt.y - self->centroid.y);
-		if (d2 < self->min_r2) return Py_BOOL(1);
-		if (d2 > self->max_r2) return Py_BOOL(0);
+	qsort(s.splits, s.count, sizeof(planar_bool_split_t), 
+		compare_bool_splits);
+	edges = (planar_bool_edge_t *)PyMem_Malloc(
+		sizeof(planar_bool_edge_t) * (seg_count + s.count + 1));
+	if (edges == NULL) {
+		PyErr_NoMemory();
+		goto done;
 	}
-	if (poly_is_convex(self) && Py_SIZE(self) > 5) {
-		result = pnp_y_monotone_test(self, &pt);
-	} else {
-		if (Py_SIZE(self) > 4) {
-			bbox = Poly_get_bbox(self);
-			if (bbox == NULL) {
-				return NULL;
-			}
-			if (!PlanarBBox_contains_point(bbox, &pt)) {
-				Py_DECREF(bbox);
-				return Py_BOOL(0);
+	for (i = 0, j = 0; i < seg_count; ++i) {
+		a = ends + i * 2;
+		b = a + 1;
+		for (; j < s.count && s.splits[j].segment == i; ++j) {
+			pt = &s.splits[j].pt;
+			if (compare_points(a, pt) < 0 && compare_points(pt, b) < 0) {
+				bool_add_edge(edges + edge_count++, a, pt, 
+					owners[i], directions[i]);
+				a = pt;
 			}
-			Py_DECREF(bbox);
 		}
-		result = pnp_winding_test(self, &pt);
+		bool_add_edge(edges + edge_count++, a, b, owners[i], directions[i]);
 	}
-	if (result != -1) {
-		return Py_BOOL(result);
-	} else {
-		return PyErr_NoMemory();
+	qsort(edges, edge_count, sizeof(planar_bool_edge_t), compare_bool_edges);
+	for (i = 0, k = 0; i < edge_count; i = j) {
+		edges[k] = edges[i];
+		for (j = i + 1; j < edge_count 
+			&& compare_bool_edges(edges + i, edges + j) == 0; ++j) {
+			edges[k].winding[0] += edges[j].winding[0];
+			edges[k].winding[1] += edges[j].winding[1];
+		}
+		if (edges[k].winding[0] || edges[k].winding[1]) {
+			++k;
+		}
+	}
+	edge_count = k;
+
+	/* Sweep the edges in lexicographical order, taking the winding 
+	   numbers below each edge from the edge below it. Edges ending at a
+	   point are removed before those starting there are inserted in 
+	   ascending order, so the edge below is always correct */
+	nodes = (planar_edge_node_t *)PyMem_Malloc(
+		sizeof(planar_edge_node_t) * (edge_count + 1));
+	events = (planar_bool_event_t *)PyMem_Malloc(
+		sizeof(planar_bool_event_t) * (edge_count * 2 + 1));
+	above = (int *)PyMem_Malloc(sizeof(int) * (edge_count * 2 + 1));
+	boundary = (planar_boundary_edge_t *)PyMem_Malloc(
+		sizeof(planar_boundary_edge_t) * (edge_count + 1));
+	if (nodes == NULL || events == NULL || above == NULL 
+		|| boundary == NULL) {
+		PyErr_NoMemory();
+		goto done;
+	}
+	for (i = 0; i < edge_count; ++i) {
+		edge = edges + i;
+		nodes[i].start = &edge->left;
+		nodes[i].end = &edge->right;
+		event = events + i * 2;
+		event->pt = &edge->left;
+		event->is_start = 1;
+		event->angle = atan2(edge->right.y - edge->left.y, 
+			edge->right.x - edge->left.x);
+		event->edge = i;
+		++event;
+		event->pt = &edge->right;
+		event->is_start = 0;
+		event->angle = 0.0;
+		event->edge = i;
+	}
+	qsort(events, edge_count * 2, sizeof(planar_bool_event_t), 
+		compare_bool_events);
+	for (event = events; event < events + edge_count * 2; ++event) {
+		i = event->edge;
+		if (!event->is_start) {
+			edge_tree_remove(nodes, &root, i);
+			continue;
+		}
+		edge_tree_insert(nodes, &root, i);
+		below = edge_tree_prev(nodes, i);
+		wa = below >= 0 ? above[below * 2] : 0;
+		wb = below >= 0 ? above[below * 2 + 1] : 0;
+		inside_below = bool_inside(op, wa != 0, wb != 0);
+		wa = above[i * 2] = wa + edges[i].winding[0];
+		wb = above[i * 2 + 1] = wb + edges[i].winding[1];
+		inside_above = bool_inside(op, wa != 0, wb != 0);
+		if (inside_above != inside_below) {
+			/* Orient the edge with the result inside to the left */
+			boundary[boundary_count].start = 
+				inside_below ? edges[i].right : edges[i].left;
+			boundary[boundary_count].end = 
+				inside_below ? edges[i].left : edges[i].right;
+			boundary[boundary_count].order = boundary_count;
+			boundary[boundary_count++].used = 0;
+		}
 	}
+	result = boundary_join(self, boundary, boundary_count);
+
+done:
+	Py_DECREF(seq);
+	PyMem_Free(ends);
+	PyMem_Free(owners);
+	PyMem_Free(directions);
+	PyMem_Free(s.splits);
+	PyMem_Free(edges);
+	PyMem_Free(nodes);
+	PyMem_Free(events);
+	PyMem_Free(above);
+	PyMem_Free(boundary);
+	return result;
 }
 
 static PyObject *
-Poly_pnp_y_monotone_test(PlanarPolygonObject *self, PyObject *point)
+Poly_union(PlanarPolygonObject *self, PyObject *other)
 {
-	planar_vec2_t pt;
-	int result;
-	
-	if (!PlanarVec2_Parse(point, &pt.x, &pt.y)) {
-		PyErr_SetString(PyExc_TypeError,
-			"Polygon.contains_point(): "
-			"expected Vec2 object for argument");
-		return NULL;
-	}
-	result = pnp_y_monotone_test(self, &pt);
-	if (result != -1) {
-		return Py_BOOL(result);
-	} else {
-		return PyErr_NoMemory();
-	}
+	return poly_boolean_op(self, other, BOOL_UNION);
 }
 
 static PyObject *
-Poly_pnp_winding_test(PlanarPolygonObject *self, PyObject *point)
+Poly_difference(PlanarPolygonObject *self, PyObject *other)
 {
-	planar_vec2_t pt;
-	int result;
-	
-	if (!PlanarVec2_Parse(point, &pt.x, &pt.y)) {
-		PyErr_SetString(PyExc_TypeError,
-			"Polygon.contains_point(): "
-			"expected Vec2 object for argument");
-		return NULL;
-	}
-		result = pnp_winding_test(self, &pt);
-	if (result != -1) {
-		return Py_BOOL(result);
-	} else {
-		return PyErr_NoMemory();
-	}
+	return poly_boolean_op(self, other, BOOL_DIFFERENCE);
 }
 
 static PyObject *
-Poly__repr__(PlanarPolygonObject *self)
+Poly_symmetric_difference(PlanarPolygonObject *self, PyObject *other)
 {
-	char props[256];
-	
-	props[0] = 0;
-	if (self->flags & POLY_CONVEX_KNOWN_FLAG) {
-		if (!(self->flags & POLY_CONVEX_FLAG)
-			&& self->flags & POLY_SIMPLE_KNOWN_FLAG) {
-			PyOS_snprintf(props, 255, ", is_convex=%s, is_simple=%s",
-				self->flags & POLY_CONVEX_FLAG ? "True" : "False",
-				self->flags & POLY_SIMPLE_FLAG ? "True" : "False");
-		} else {
-			PyOS_snprintf(props, 255, ", is_convex=%s", 
-				self->flags & POLY_CONVEX_FLAG ? "True" : "False");
-		}
-	}
-	return Seq2__repr__((PlanarSeq2Object *)self, "Polygon", props);
+	return poly_boolean_op(self, other, BOOL_XOR);
 }
 
 static void
@@ -1247,16 +3870,19 @@ ahull_partition_points(planar_vec2_t **hull, planar_vec2_t **pts,
 	}
 }
 
-static planar_vec2_t *
-adaptive_quick_hull(planar_vec2_t *pts, Py_ssize_t *size)
+/* Compute the convex hull of the points into hull, returning the
+   number of hull vertices. The pt_sets and hull arrays must have
+   room for size entries */
+static Py_ssize_t
+adaptive_quick_hull(planar_vec2_t *pts, Py_ssize_t size, 
+	planar_vec2_t **pt_sets, planar_vec2_t *hull)
 {
 	planar_vec2_t *v, *v_end, *leftmost, *rightmost;
-	planar_vec2_t *hull_pt, *hull = NULL;
-	planar_vec2_t **pt_sets = NULL;
+	planar_vec2_t *hull_pt;
 	planar_vec2_t **upper_pts, **lower_pts;
 
 	leftmost = rightmost = pts;
-	v_end = pts + *size - 1;
+	v_end = pts + size - 1;
 	for (v = pts + 1; v <= v_end; ++v) {
 		if (v->x < leftmost->x) {
 			leftmost = v;
@@ -1266,15 +3892,8 @@ adaptive_quick_hull(planar_vec2_t *pts, Py_ssize_t *size)
 		}
 	}
 
-	pt_sets = (planar_vec2_t **)PyMem_Malloc(
-		sizeof(planar_vec2_t *) * (*size));
-	hull = (planar_vec2_t *)PyMem_Malloc(sizeof(planar_vec2_t) * (*size));
-	if (pt_sets == NULL || hull == NULL) {
-		PyErr_NoMemory();
-		goto error;
-	}
 	upper_pts = pt_sets;
-	lower_pts = pt_sets + *size;
+	lower_pts = pt_sets + size;
 	for (v = pts; v <= v_end; ++v) {
 		if ((v != leftmost) & (v != rightmost)) {
 			if (SIDE(leftmost, rightmost, v) > 0.0) {
@@ -1293,39 +3912,32 @@ adaptive_quick_hull(planar_vec2_t *pts, Py_ssize_t *size)
 		hull_pt->y = leftmost->y;
 		++hull_pt;
 	}
-	if (lower_pts < pt_sets + *size) {
+	if (lower_pts < pt_sets + size) {
 		ahull_partition_points(
-			&hull_pt, lower_pts, (pt_sets + *size) - lower_pts, 
+			&hull_pt, lower_pts, (pt_sets + size) - lower_pts, 
 			rightmost, leftmost);
 	} else {
 		hull_pt->x = rightmost->x;
 		hull_pt->y = rightmost->y;
 		++hull_pt;
 	}
-	*size = hull_pt - hull;
-	PyMem_Free(pt_sets);
-	return hull;
-error:
-	if (pt_sets != NULL) {
-		PyMem_Free(pt_sets);
-	}
-	if (hull != NULL) {
-		PyMem_Free(hull);
-	}
-	return NULL;
+	return hull_pt - hull;
 }
 
 static PlanarPolygonObject *
 Poly_convex_hull(PyTypeObject *type, PyObject *points) 
 {
-	planar_vec2_t *pts;
+	planar_vec2_t *pts = NULL;
 	planar_vec2_t *hull_pts = NULL;
+	planar_vec2_t **pt_sets = NULL;
 	PyObject *pts_alloc = NULL;
 	Py_ssize_t size;
 	PlanarPolygonObject *hull_poly = NULL;
+	PyThreadState *state;
+	PY_LONG_LONG start;
 
 	if (PlanarPolygon_CheckExact(points) && 
-		((PlanarPolygonObject *)points)->flags & POLY_CONVEX_FLAG) {
+		POLY_FLAGS((PlanarPolygonObject *)points) & POLY_CONVEX_FLAG) {
 		return (PlanarPolygonObject *)Poly_copy(
 			(PlanarPolygonObject *)points, NULL);
 	}
@@ -1333,36 +3945,206 @@ Poly_convex_hull(PyTypeObject *type, PyObject *points)
 		points = pts_alloc = call_from_points((PyObject *)type, points);
 		if (points == NULL) goto error;
 		pts = ((PlanarPolygonObject *)points)->vert;
-	} else {
-		pts = ((PlanarSeq2Object *)points)->vec;
+		size = Py_SIZE(points);
+	} else if (!Seq2_GetVectors((PlanarSeq2Object *)points, &pts, &size)) {
+		goto error;
+	}
+	pt_sets = (planar_vec2_t **)PyMem_Malloc(sizeof(planar_vec2_t *) * size);
+	hull_pts = (planar_vec2_t *)PyMem_Malloc(sizeof(planar_vec2_t) * size);
+	if (pt_sets == NULL || hull_pts == NULL) {
+		PyErr_NoMemory();
+		goto error;
+	}
+	start = PLANAR_STAT_START();
+	state = Planar_BeginNoGIL(size);
+	size = adaptive_quick_hull(pts, size, pt_sets, hull_pts);
+	Planar_EndNoGIL(state);
+	if (pts_alloc == NULL) {
+		Seq2_ReleaseVectors((PlanarSeq2Object *)points, pts);
+		pts = NULL;
 	}
-	size = Py_SIZE(points);
-	hull_pts = adaptive_quick_hull(pts, &size);
+	PLANAR_STAT_TIME(PLANAR_STAT_CONVEX_HULL, start);
 	hull_poly = Poly_new(type, size);
-	if (hull_pts == NULL || hull_poly == NULL) goto error;
+	if (hull_poly == NULL) goto error;
 	memcpy(hull_poly->vert, hull_pts, sizeof(planar_vec2_t) * size);
+	PyMem_Free(pt_sets);
 	PyMem_Free(hull_pts);
 	Py_XDECREF(pts_alloc);
 	hull_poly->flags = (POLY_CONVEX_KNOWN_FLAG | POLY_CONVEX_FLAG
 		| POLY_SIMPLE_KNOWN_FLAG | POLY_SIMPLE_FLAG);
 	return hull_poly;
 error:
-	if (hull_pts != NULL) {
-		PyMem_Free(hull_pts);
+	if (pts != NULL && pts_alloc == NULL) {
+		Seq2_ReleaseVectors((PlanarSeq2Object *)points, pts);
 	}
+	PyMem_Free(pt_sets);
+	PyMem_Free(hull_pts);
 	Py_XDECREF(hull_poly);
 	Py_XDECREF(pts_alloc);
 	return NULL;
 }
 
+#define POLY_BATCH_AREA 0
+#define POLY_BATCH_SIGNED_AREA 1
+#define POLY_BATCH_PERIMETER 2
+
+/* Compute a property for a sequence of polygons, returning
+   the results as an array of doubles */
+static PyObject *
+poly_batch_property(PyObject *polygons, int property)
+{
+	PyObject *seq, *data = NULL, *result = NULL;
+	PlanarPolygonObject *poly;
+	Py_ssize_t i, size;
+	double *values;
+
+	seq = PySequence_Fast(polygons, "expected iterable of Polygon objects");
+	if (seq == NULL) {
+		return NULL;
+	}
+	size = PySequence_Fast_GET_SIZE(seq);
+	data = PyBytes_FromStringAndSize(NULL, sizeof(double) * size);
+	if (data == NULL) {
+		goto finish;
+	}
+	values = (double *)PyBytes_AS_STRING(data);
+	for (i = 0; i < size; ++i) {
+		poly = (PlanarPolygonObject *)PySequence_Fast_GET_ITEM(seq, i);
+		if (!PlanarPolygon_Check(poly)) {
+			PyErr_SetString(PyExc_TypeError, 
+				"expected iterable of Polygon objects");
+			goto finish;
+		}
+		switch (property) {
+			case POLY_BATCH_AREA:
+				values[i] = fabs(poly_signed_area(poly));
+				break;
+			case POLY_BATCH_SIGNED_AREA:
+				values[i] = poly_signed_area(poly);
+				break;
+			default:
+				values[i] = poly_perimeter(poly);
+		}
+	}
+	result = new_array_from_bytes("d", data);
+finish:
+	Py_XDECREF(data);
+	Py_DECREF(seq);
+	return result;
+}
+
+static PyObject *
+Poly_areas(PyTypeObject *type, PyObject *polygons)
+{
+	return poly_batch_property(polygons, POLY_BATCH_AREA);
+}
+
+static PyObject *
+Poly_signed_areas(PyTypeObject *type, PyObject *polygons)
+{
+	return poly_batch_property(polygons, POLY_BATCH_SIGNED_AREA);
+}
+
+static PyObject *
+Poly_perimeters(PyTypeObject *type, PyObject *polygons)
+{
+	return poly_batch_property(polygons, POLY_BATCH_PERIMETER);
+}
+
+/* Pickle support. The vertices are pickled as packed data along with
+   the cached properties, so they need not be recalculated */
+
+#define POLY_PICKLED_FLAGS (POLY_CONVEX_KNOWN_FLAG | POLY_CONVEX_FLAG \
+	| POLY_SIMPLE_KNOWN_FLAG | POLY_SIMPLE_FLAG | POLY_DEGEN_KNOWN_FLAG \
+	| POLY_DEGEN_FLAG | POLY_DUP_VERTS_KNOWN_FLAG | POLY_DUP_VERTS_FLAG \
+	| POLY_CENTROID_KNOWN_FLAG | POLY_RADIUS_KNOWN_FLAG \
+	| POLY_AREA_KNOWN_FLAG | POLY_PERIMETER_KNOWN_FLAG)
+
+static PyObject *
+Poly_new_from_bytes(PyTypeObject *type, PyObject *data)
+{
+	PlanarPolygonObject *poly;
+	PyObject *result;
+	Py_buffer view;
+	Py_ssize_t size;
+
+	size = Seq2_GetBytesView(data, &view, sizeof(planar_vec2_t));
+	if (size == -1) {
+		return NULL;
+	}
+	poly = Poly_new(type, size);
+	if (poly != NULL) {
+		memcpy(poly->vert, view.buf, size * sizeof(planar_vec2_t));
+		if (size == 3) {
+			poly->flags = (POLY_CONVEX_FLAG | POLY_CONVEX_KNOWN_FLAG 
+				| POLY_SIMPLE_FLAG | POLY_SIMPLE_KNOWN_FLAG);
+		}
+	}
+	PyBuffer_Release(&view);
+	if (poly == NULL || PlanarPolygon_CheckExact(poly)) {
+		return (PyObject *)poly;
+	}
+	/* Let subclasses initialize themselves */
+	result = PyObject_CallMethod((PyObject *)type, "from_points", "O", poly);
+	Py_DECREF(poly);
+	return result;
+}
+
+static PyObject *
+Poly_reduce_ex(PlanarPolygonObject *self, PyObject *args)
+{
+	PyObject *state, *result;
+
+	state = Py_BuildValue("(k(dd)dddd)", 
+		POLY_FLAGS(self) & POLY_PICKLED_FLAGS,
+		self->centroid.x, self->centroid.y, self->signed_area, 
+		self->perimeter, self->max_r2, self->min_r2);
+	if (state == NULL) {
+		return NULL;
+	}
+	result = Seq2_Reduce((PyObject *)self, args, state);
+	Py_DECREF(state);
+	return result;
+}
+
+static PyObject *
+poly_setstate(PlanarPolygonObject *self, PyObject *state)
+{
+	unsigned long flags;
+
+	if (!PyTuple_Check(state)) {
+		PyErr_SetString(PyExc_TypeError, 
+			"Polygon.__setstate__: expected tuple");
+		return NULL;
+	}
+	if (!PyArg_ParseTuple(state, "k(dd)dddd:Polygon.__setstate__", &flags,
+		&self->centroid.x, &self->centroid.y, &self->signed_area, 
+		&self->perimeter, &self->max_r2, &self->min_r2)) {
+		return NULL;
+	}
+	self->flags = flags & POLY_PICKLED_FLAGS;
+	Py_RETURN_NONE;
+}
+
+static PyObject *
+Poly_setstate(PlanarPolygonObject *self, PyObject *state)
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = poly_setstate(self, state);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
 static PyMethodDef Poly_methods[] = {
-    {"regular", (PyCFunction)Poly_create_new_regular, 
-		METH_CLASS | METH_VARARGS | METH_KEYWORDS, 
+    {"regular", Planar_FASTCALL_KEYWORDS(Poly_create_new_regular), 
+		METH_CLASS | PLANAR_METH_FASTCALL_KEYWORDS, 
 		"Create a regular polygon with the specified number of vertices "
         "radius distance from the center point. Regular polygons are "
         "always convex."},
-    {"star", (PyCFunction)Poly_create_new_star, 
-		METH_CLASS | METH_VARARGS | METH_KEYWORDS, 
+    {"star", Planar_FASTCALL_KEYWORDS(Poly_create_new_star), 
+		METH_CLASS | PLANAR_METH_FASTCALL_KEYWORDS, 
 		"Create a circular pointed star polygon with the specified number "
         "of peaks."},
 	{"convex_hull", (PyCFunction)Poly_convex_hull, METH_CLASS | METH_O,
@@ -1372,17 +4154,164 @@ static PyMethodDef Poly_methods[] = {
 		"Given a point exterior to the polygon, return the pair of "
         "vertex points from the polygon that define the tangent lines with "
 		"the specified point."},
+	{"areas", (PyCFunction)Poly_areas, METH_CLASS | METH_O,
+		"Return the areas of a sequence of polygons as an array of doubles."},
+	{"signed_areas", (PyCFunction)Poly_signed_areas, METH_CLASS | METH_O,
+		"Return the signed areas of a sequence of polygons as an array "
+		"of doubles."},
+	{"perimeters", (PyCFunction)Poly_perimeters, METH_CLASS | METH_O,
+		"Return the perimeters of a sequence of polygons as an array "
+		"of doubles."},
     {"from_points", (PyCFunction)Poly_create_new_from_points, METH_CLASS | METH_O, 
 		"Create a new Polygon from an iterable of points"},
+	{"triangulate", (PyCFunction)Poly_triangulate, METH_NOARGS,
+		"Divide the polygon into triangles. Return an array of vertex "
+		"indices, three per triangle, with each triangle wound in the "
+		"same direction as the polygon."},
+	{"clip", (PyCFunction)Poly_clip, METH_O,
+		"Return the part of this polygon inside a convex polygon or "
+		"bounding box, or None if nothing remains after clipping."},
+	{"intersection", (PyCFunction)Poly_intersection, METH_O,
+		"Return the intersection of this polygon with a convex polygon "
+		"or bounding box, or None if they do not overlap."},
+	{"union", (PyCFunction)Poly_union, METH_O,
+		"Return the region covered by either this polygon or another "
+		"shape, as a list of polygons."},
+	{"difference", (PyCFunction)Poly_difference, METH_O,
+		"Return the region covered by this polygon but not by another "
+		"shape, as a list of polygons."},
+	{"symmetric_difference", (PyCFunction)Poly_symmetric_difference, METH_O,
+		"Return the region covered by exactly one of this polygon and "
+		"another shape, as a list of polygons."},
 	{"contains_point", (PyCFunction)Poly_contains_point, METH_O,
 		"Return True if the specified point is inside the polygon."},
+	{"contains_points", (PyCFunction)Poly_contains_points, METH_O,
+		"Test a batch of points for containment in the polygon. Return a "
+		"bytearray containing 1 for each point inside, 0 otherwise."},
+	{"prepare", (PyCFunction)Poly_prepare, METH_NOARGS,
+		"Accelerate repeated point containment tests using a grid of "
+		"the polygon's edges, built on first use."},
     {"__copy__", (PyCFunction)Poly_copy, METH_NOARGS, NULL}, 
     {"__deepcopy__", (PyCFunction)Poly_copy, METH_O, NULL}, 
+    {"_from_bytes", (PyCFunction)Poly_new_from_bytes, METH_CLASS | METH_O, 
+		"PRIVATE: Create a new polygon from packed vertex data"},
+    {"__reduce_ex__", (PyCFunction)Poly_reduce_ex, METH_VARARGS, NULL}, 
+    {"__setstate__", (PyCFunction)Poly_setstate, METH_O, NULL}, 
 	{"_pnp_y_monotone_test", (PyCFunction)Poly_pnp_y_monotone_test, METH_O, NULL},
 	{"_pnp_winding_test", (PyCFunction)Poly_pnp_winding_test, METH_O, NULL},
     {NULL, NULL}
 };
 
+/* Buffer interface. The buffer is exported read-only, since
+   changing vertices through it would bypass cache invalidation */
+
+static int
+Poly_getbuffer(PlanarPolygonObject *self, Py_buffer *view, int flags)
+{
+	return Seq2_GetBuffer((PyObject *)self, self->vert, Py_SIZE(self), 
+		self->buffer_shape, 1, view, flags);
+}
+
+static PyBufferProcs Poly_as_buffer = {
+#if PY_MAJOR_VERSION < 3
+	0,		/* bf_getreadbuffer */
+	0,		/* bf_getwritebuffer */
+	0,		/* bf_getsegcount */
+	0,		/* bf_getcharbuffer */
+#endif
+	(getbufferproc)Poly_getbuffer,	/* bf_getbuffer */
+	0,		/* bf_releasebuffer */
+};
+
+/* Arithmetic Operations */
+
+static PyObject *
+Poly__mul__(PyObject *a, PyObject *b)
+{
+	PyObject *result;
+
+	result = PlanarSeq2Type.tp_as_number->nb_multiply(a, b);
+	if (result != NULL && PlanarPolygon_Check(result)) {
+		/* Update the properties copied from the source polygon */
+		transform_cached_properties((PlanarPolygonObject *)result, 
+			(PlanarAffineObject *)(PlanarAffine_Check(a) ? a : b));
+	}
+	return result;
+}
+
+static PyObject *
+Poly__imul__(PyObject *a, PyObject *b)
+{
+	PyObject *result;
+	PlanarPolygonObject *poly = (PlanarPolygonObject *)(
+		PlanarPolygon_Check(a) ? a : b);
+
+	Planar_BEGIN_CRITICAL_SECTION(poly);
+	/* Invalidate results being computed concurrently 
+	   with the GIL released */
+	++poly->version;
+	result = PlanarSeq2Type.tp_as_number->nb_inplace_multiply(a, b);
+	if (result != NULL && PlanarPolygon_Check(result)) {
+		transform_cached_properties((PlanarPolygonObject *)result, 
+			(PlanarAffineObject *)(PlanarAffine_Check(a) ? a : b));
+	}
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static PyNumberMethods Poly_as_number = {
+    0,       /* binaryfunc nb_add */
+    0,       /* binaryfunc nb_subtract */
+    (binaryfunc)Poly__mul__,       /* binaryfunc nb_multiply */
+#if PY_MAJOR_VERSION < 3
+    0,       /* binaryfunc nb_div */
+#endif
+    0,       /* binaryfunc nb_remainder */
+    0,       /* binaryfunc nb_divmod */
+    0,       /* ternaryfunc nb_power */
+    0,       /* unaryfunc nb_negative */
+    0,       /* unaryfunc nb_positive */
+    0,       /* unaryfunc nb_absolute */
+    0,       /* inquiry nb_bool */
+    0,       /* unaryfunc nb_invert */
+    0,       /* binaryfunc nb_lshift */
+    0,       /* binaryfunc nb_rshift */
+    0,       /* binaryfunc nb_and */
+    0,       /* binaryfunc nb_xor */
+    0,       /* binaryfunc nb_or */
+#if PY_MAJOR_VERSION < 3
+    0,       /* coercion nb_coerce */
+#endif
+    0,       /* unaryfunc nb_int */
+    0,       /* void *nb_reserved */
+    0,       /* unaryfunc nb_float */
+#if PY_MAJOR_VERSION < 3
+    0,       /* binaryfunc nb_oct */
+    0,       /* binaryfunc nb_hex */
+#endif
+
+    0,       /* binaryfunc nb_inplace_add */
+    0,       /* binaryfunc nb_inplace_subtract */
+    (binaryfunc)Poly__imul__,       /* binaryfunc nb_inplace_multiply */
+#if PY_MAJOR_VERSION < 3
+    0,       /* binaryfunc nb_inplace_divide */
+#endif
+    0,       /* binaryfunc nb_inplace_remainder */
+    0,       /* ternaryfunc nb_inplace_power */
+    0,       /* binaryfunc nb_inplace_lshift */
+    0,       /* binaryfunc nb_inplace_rshift */
+    0,       /* binaryfunc nb_inplace_and */
+    0,       /* binaryfunc nb_inplace_xor */
+    0,       /* binaryfunc nb_inplace_or */
+
+    0,       /* binaryfunc nb_floor_divide */
+    0,       /* binaryfunc nb_true_divide */
+    0,       /* binaryfunc nb_inplace_floor_divide */
+    0,       /* binaryfunc nb_inplace_true_divide */
+
+    0,       /* unaryfunc nb_index */
+};
+
 PyDoc_STRVAR(Polygon__doc__, 
 	"Arbitrary polygon represented as a list of vertices.\n\n" 
     "The individual vertices of a polygon are mutable, but the number "
@@ -1390,7 +4319,7 @@ PyDoc_STRVAR(Polygon__doc__,
 
 PyTypeObject PlanarPolygonType = {
     PyVarObject_HEAD_INIT(NULL, 0)
-	"Polygon",		/*tp_name*/
+	"planar.Polygon",		/*tp_name*/
 	sizeof(PlanarPolygonObject),	/*tp_basicsize*/
 	sizeof(planar_vec2_t),		/*tp_itemsize*/
 	/* methods */
@@ -1400,7 +4329,7 @@ PyTypeObject PlanarPolygonType = {
 	0,                      /*tp_setattr*/
 	0,		        /*tp_compare*/
 	(reprfunc)Poly__repr__, /*tp_repr*/
-	0, //&Vec2Array_as_number,        /*tp_as_number*/
+	&Poly_as_number,        /*tp_as_number*/
 	&Poly_as_sequence,      /*tp_as_sequence*/
 	0, //&Vec2Array_as_mapping,	     /*tp_as_mapping*/
 	0,	                /*tp_hash*/
@@ -1408,8 +4337,9 @@ PyTypeObject PlanarPolygonType = {
 	(reprfunc)Poly__repr__, /*tp_str*/
 	0,                      /*tp_getattro*/
 	0,                      /*tp_setattro*/
-	0,                      /*tp_as_buffer*/
-	Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_CHECKTYPES,     /*tp_flags*/
+	&Poly_as_buffer,        /*tp_as_buffer*/
+	Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_CHECKTYPES
+		| Py_TPFLAGS_HAVE_NEWBUFFER,   /*tp_flags*/
 	Polygon__doc__,       /*tp_doc*/
 	0,                      /*tp_traverse*/
 	0,                      /*tp_clear*/
@@ -10,26 +10,30 @@
 ****************************************************************************/
 #include "Python.h"
 #include <float.h>
+#include "pythread.h"
 #include "planar.h"
 
 #define AFFINE_FREE_MAX 200
-static PyObject *affine_free_list = NULL;
-static int affine_free_size = 0;
 
 static int
-Affine_init(PlanarAffineObject *self, PyObject *args)
+Affine_init_array(PlanarAffineObject *self, PyObject *const *args, 
+    Py_ssize_t nargs)
 {
     int i;
     PyObject *f;
 
     assert(PlanarAffine_Check(self));
-    if (PyTuple_GET_SIZE(args) != 6) {
+    if (nargs != 6) {
         PyErr_SetString(PyExc_TypeError, 
             "Affine: wrong number of arguments");
         return -1;
     }
     for (i = 0; i < 6; i++) {
-        f = PyObject_ToFloat(PyTuple_GET_ITEM(args, i));
+        if (PyFloat_CheckExact(args[i])) {
+            self->m[i] = PyFloat_AS_DOUBLE(args[i]);
+            continue;
+        }
+        f = PyObject_ToFloat(args[i]);
         if (f == NULL) {
             return -1;
         }
@@ -40,37 +44,54 @@ Affine_init(PlanarAffineObject *self, PyObject *args)
     return 0;
 }
 
+static int
+Affine_init(PlanarAffineObject *self, PyObject *args)
+{
+    return Affine_init_array(self, 
+        &PyTuple_GET_ITEM(args, 0), PyTuple_GET_SIZE(args));
+}
+
+#if PY_VERSION_HEX >= 0x03090000
+PyObject *
+PlanarAffine_vectorcall(PyObject *type, PyObject *const *args, 
+    size_t nargsf, PyObject *kwnames)
+{
+    return Planar_VectorcallNew(&PlanarAffineType, 
+        (planar_initarrayfunc)Affine_init_array, type, args, nargsf, 
+        kwnames);
+}
+#endif
+
 static PyObject *
 Affine_alloc(PyTypeObject *type, Py_ssize_t nitems)
 {
     int i;
     PlanarAffineObject *t;
 
-    assert(PyType_IsSubtype(type, &PlanarAffineType));
-    if (affine_free_list != NULL) {
-        t = (PlanarAffineObject *)affine_free_list;
-        Py_INCREF(t);
-        affine_free_list = t->next_free;
-        --affine_free_size;
-		for (i = 0; i < 6; i++) {
-			t->m[i] = 0.0;
-		}
-		return (PyObject *)t;
-    } else {
-        return PyType_GenericAlloc(type, nitems);
+    assert(Planar_TypeIsSubtype(type, &PlanarAffineType));
+    if (Planar_TypeIsExact(type, &PlanarAffineType)) {
+        t = (PlanarAffineObject *)Planar_FreeListPop(
+            PLANAR_FREELIST(affine, type), type);
+        if (t != NULL) {
+            for (i = 0; i < 6; i++) {
+                t->m[i] = 0.0;
+            }
+            return (PyObject *)t;
+        }
     }
+    return PyType_GenericAlloc(type, nitems);
 }
 
 static void
 Affine_dealloc(PlanarAffineObject *self)
 {
-    if (PlanarAffine_CheckExact(self) && affine_free_size < AFFINE_FREE_MAX) {
-        self->next_free = affine_free_list;
-        affine_free_list = (PyObject *)self;
-        ++affine_free_size;
-    } else {
-        Py_TYPE(self)->tp_free((PyObject *)self);
+    PyTypeObject *type = Py_TYPE(self);
+
+    if (!PlanarAffine_CheckExact(self) || !Planar_FreeListPush(
+        PLANAR_FREELIST(affine, type), (PyObject *)self, AFFINE_FREE_MAX)) {
+        type->tp_free((PyObject *)self);
     }
+    Planar_DECREF_TYPE(type);
 }
 
 static PyObject *
@@ -282,7 +303,7 @@ Affine_new_identity(PyTypeObject *type)
 {
     PlanarAffineObject *t;
 
-    assert(PyType_IsSubtype(type, &PlanarAffineType));
+    assert(Planar_TypeIsSubtype(type, &PlanarAffineType));
     t = (PlanarAffineObject *)type->tp_alloc(type, 0);
     if (t == NULL) {
         return NULL;
@@ -297,7 +318,7 @@ Affine_new_translation(PyTypeObject *type, PyObject *offset)
     PlanarAffineObject *t;
     double ox, oy;
 
-    assert(PyType_IsSubtype(type, &PlanarAffineType));
+    assert(Planar_TypeIsSubtype(type, &PlanarAffineType));
     if (!PlanarVec2_Parse(offset, &ox, &oy)) {
         return NULL;
     }
@@ -336,15 +357,19 @@ Affine_new_scale(PyTypeObject *type, PyObject *scaling)
 }
 
 static PlanarAffineObject *
-Affine_new_shear(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+Affine_new_shear(PyTypeObject *type, PyObject *const *args, 
+    Py_ssize_t nargs, PyObject *kwnames)
 {
+    PyObject *values[2];
     PlanarAffineObject *t;
     double sx, sy, ax = 0.0, ay = 0.0;
 
-    static char *kwlist[] = {"x_angle", "y_angle", NULL};
+    static const char *const kwlist[] = {"x_angle", "y_angle", NULL};
 
-    if (!PyArg_ParseTupleAndKeywords(
-        args, kwargs, "|dd:Affine.shear", kwlist, &ax, &ay)) {
+    if (!Planar_ParseKeywords("Affine.shear", args, nargs, kwnames, 
+            kwlist, 0, values)
+        || !Planar_OptionalDouble(values[0], &ax)
+        || !Planar_OptionalDouble(values[1], &ay)) {
         return NULL;
     }
     t = (PlanarAffineObject *)type->tp_alloc(type, 0);
@@ -359,18 +384,21 @@ Affine_new_shear(PyTypeObject *type, PyObject *args, PyObject *kwargs)
 	return t;
 }
 
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Affine_new_shear)
+
 static PlanarAffineObject *
-Affine_new_rotation(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+Affine_new_rotation(PyTypeObject *type, PyObject *const *args, 
+    Py_ssize_t nargs, PyObject *kwnames)
 {
-    PyObject *pivot_arg = NULL;
+    PyObject *values[2];
     PlanarAffineObject *t;
     double angle, sa, ca, px, py;
 
-    static char *kwlist[] = {"angle", "pivot", NULL};
+    static const char *const kwlist[] = {"angle", "pivot", NULL};
 
-    if (!PyArg_ParseTupleAndKeywords(
-        args, kwargs, "d|O:Affine.shear", kwlist, 
-        &angle, &pivot_arg)) {
+    if (!Planar_ParseKeywords("Affine.rotation", args, nargs, kwnames, 
+            kwlist, 1, values)
+        || !Planar_OptionalDouble(values[0], &angle)) {
         return NULL;
     }
     t = (PlanarAffineObject *)type->tp_alloc(type, 0);
@@ -383,8 +411,8 @@ Affine_new_rotation(PyTypeObject *type, PyObject *args, PyObject *kwargs)
     t->d = -sa;
     t->e = ca;
 
-    if (pivot_arg != NULL) {
-        if (!PlanarVec2_Parse(pivot_arg, &px, &py)) {
+    if (values[1] != NULL) {
+        if (!PlanarVec2_Parse(values[1], &px, &py)) {
 			PyErr_SetString(PyExc_TypeError,
 				"Expected sequence of two numbers for pivot argument"); 
             Py_DECREF(t);
@@ -396,6 +424,8 @@ Affine_new_rotation(PyTypeObject *type, PyObject *args, PyObject *kwargs)
     return t;
 }
 
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Affine_new_rotation)
+
 static PyObject *
 Affine_repr(PlanarAffineObject *self)
 {
@@ -455,6 +485,7 @@ Affine_itransform(PlanarAffineObject *self, PyObject *seq)
     PyObject *point;
     PlanarSeq2Object *varray;
     double x, y, a, b, c, d, e, f;
+	PyThreadState *state;
 
     a = self->a;
     b = self->b;
@@ -466,12 +497,21 @@ Affine_itransform(PlanarAffineObject *self, PyObject *seq)
     if (PlanarSeq2_Check(seq)) {
 	/* Optimized code path for Seq2s */
 	varray = (PlanarSeq2Object *)seq;
-	for (i = 0; i < Py_SIZE(seq); i++) {
+	if (!Vec2Array_CheckWritable(varray)) {
+	    return NULL;
+	}
+	Planar_BEGIN_CRITICAL_SECTION(varray);
+	len = Py_SIZE(seq);
+	/* Vector arrays could be resized by another thread */
+	state = Planar_BeginNoGIL(PlanarVec2Array_Check(varray) ? 0 : len);
+	for (i = 0; i < len; i++) {
 	    x = varray->vec[i].x;
 	    y = varray->vec[i].y;
 	    varray->vec[i].x = x*a + y*d + c;
 	    varray->vec[i].y = x*b + y*e + f;
 	}
+	Planar_EndNoGIL(state);
+	Planar_END_CRITICAL_SECTION();
     } else {
 		/* General vector sequence */
 		len = PySequence_Length(seq);
@@ -508,6 +548,251 @@ Affine_itransform(PlanarAffineObject *self, PyObject *seq)
     return Py_None;
 }
 
+/* Arrays with at least this many points are transformed
+   with the GIL released */
+#define AFFINE_NOGIL_MIN_POINTS 4096
+/* Minimum number of points transformed by each thread */
+#define AFFINE_THREAD_MIN_POINTS 250000
+#define AFFINE_MAX_THREADS 64
+
+typedef struct {
+	double a, b, c, d, e, f;
+	char *src, *dst;
+	Py_ssize_t src_stride, src_ystride;
+	Py_ssize_t dst_stride, dst_ystride;
+	Py_ssize_t size;
+	PyThread_type_lock done;
+} affine_transform_job_t;
+
+static void
+affine_transform_run(affine_transform_job_t *job)
+{
+	Py_ssize_t i;
+	double x, y;
+	char *src = job->src;
+	char *dst = job->dst;
+
+	for (i = 0; i < job->size; ++i) {
+		x = *(double *)src;
+		y = *(double *)(src + job->src_ystride);
+		*(double *)dst = x*job->a + y*job->d + job->c;
+		*(double *)(dst + job->dst_ystride) = x*job->b + y*job->e + job->f;
+		src += job->src_stride;
+		dst += job->dst_stride;
+	}
+}
+
+static void
+affine_transform_thread(void *job)
+{
+	affine_transform_run((affine_transform_job_t *)job);
+	PyThread_release_lock(((affine_transform_job_t *)job)->done);
+}
+
+/* Return the number of CPUs available, or 1 if unknown */
+static Py_ssize_t
+cpu_count(void)
+{
+	static Py_ssize_t count = 0;
+	PyObject *os, *result;
+
+	if (count == 0) {
+		count = 1;
+		os = PyImport_ImportModule("os");
+		if (os != NULL) {
+			result = PyObject_CallMethod(os, "cpu_count", NULL);
+			if (result != NULL && result != Py_None) {
+				count = PyNumber_AsSsize_t(result, NULL);
+			}
+			Py_XDECREF(result);
+			Py_DECREF(os);
+		}
+		PyErr_Clear();
+		count = MAX(MIN(count, AFFINE_MAX_THREADS), 1);
+	}
+	return count;
+}
+
+/* Split the transform into jobs and run them in parallel. Must be 
+   called with the GIL released. If a thread cannot be started, its
+   job is run in the calling thread instead */
+static void
+affine_transform_parallel(affine_transform_job_t *jobs, Py_ssize_t job_count)
+{
+	Py_ssize_t i;
+	int started[AFFINE_MAX_THREADS];
+
+	for (i = 1; i < job_count; ++i) {
+		started[i] = 0;
+		if (jobs[i].done != NULL && PyThread_acquire_lock(jobs[i].done, 1)) {
+			if (PyThread_start_new_thread(
+				affine_transform_thread, &jobs[i]) != (unsigned long)-1) {
+				started[i] = 1;
+			} else {
+				PyThread_release_lock(jobs[i].done);
+			}
+		}
+	}
+	affine_transform_run(&jobs[0]);
+	for (i = 1; i < job_count; ++i) {
+		if (started[i]) {
+			/* Wait for thread to finish */
+			PyThread_acquire_lock(jobs[i].done, 1);
+			PyThread_release_lock(jobs[i].done);
+		} else {
+			affine_transform_run(&jobs[i]);
+		}
+	}
+}
+
+static PyObject *
+Affine_transform(PlanarAffineObject *self, PyObject *const *args, 
+	Py_ssize_t nargs, PyObject *kwnames)
+{
+	PyObject *values[2], *seq, *out = Py_None, *src_obj, *out_seq = NULL, *point;
+	Py_buffer src, dst;
+	Py_ssize_t size, out_size, src_stride, src_ystride, dst_stride, dst_ystride;
+	Py_ssize_t i, job_count, job_size;
+	affine_transform_job_t jobs[AFFINE_MAX_THREADS];
+
+    static const char *const kwlist[] = {"seq", "out", NULL};
+
+    assert(PlanarAffine_Check(self));
+    if (!Planar_ParseKeywords("transform", args, nargs, kwnames, kwlist, 
+		1, values)) {
+		return NULL;
+	}
+	seq = values[0];
+	if (values[1] != NULL) {
+		out = values[1];
+	}
+	if (PlanarVec2Array32_Check(seq) && out == Py_None) {
+		/* Single precision arrays stay single precision */
+		return PyNumber_Multiply(seq, (PyObject *)self);
+	}
+	if (Planar_CheckBuffer(seq) && !PlanarVec2Array32_Check(seq)) {
+		Py_INCREF(seq);
+		src_obj = seq;
+	} else {
+		/* General sequence of vectors */
+		src_obj = PyObject_CallFunctionObjArgs(
+			(PyObject *)PLANAR_TYPE(Seq2), seq, NULL);
+		if (src_obj == NULL) {
+			return NULL;
+		}
+	}
+	if (Seq2_GetVec2View(src_obj, &src, 0, 
+		&size, &src_stride, &src_ystride) == -1) {
+		Py_DECREF(src_obj);
+		return NULL;
+	}
+	if (out == Py_None) {
+		out = (PyObject *)Seq2_New(PLANAR_TYPE(Vec2Array), size);
+	} else if (!Planar_CheckBuffer(out) || PlanarVec2Array32_Check(out)) {
+		/* General mutable sequence destination, transform into 
+		   a temporary array and then copy the results */
+		out_seq = out;
+		out_size = PySequence_Size(out_seq);
+		if (out_size != size) {
+			PyBuffer_Release(&src);
+			Py_DECREF(src_obj);
+			if (out_size == -1) {
+				return NULL;
+			}
+			goto wrong_size;
+		}
+		out = (PyObject *)Seq2_New(PLANAR_TYPE(Vec2Array), size);
+	} else {
+		Py_INCREF(out);
+	}
+	if (out == NULL || Seq2_GetVec2View(out, &dst, 1, 
+		&out_size, &dst_stride, &dst_ystride) == -1) {
+		Py_XDECREF(out);
+		PyBuffer_Release(&src);
+		Py_DECREF(src_obj);
+		return NULL;
+	}
+	if (out_size != size) {
+		PyBuffer_Release(&dst);
+		PyBuffer_Release(&src);
+		Py_DECREF(src_obj);
+		Py_DECREF(out);
+		goto wrong_size;
+	}
+
+	job_count = cpu_count();
+	job_count = MIN(job_count, size / AFFINE_THREAD_MIN_POINTS);
+	job_count = MAX(job_count, 1);
+	job_size = size / job_count;
+	for (i = 0; i < job_count; ++i) {
+		jobs[i].a = self->a;
+		jobs[i].b = self->b;
+		jobs[i].c = self->c;
+		jobs[i].d = self->d;
+		jobs[i].e = self->e;
+		jobs[i].f = self->f;
+		jobs[i].src = (char *)src.buf + i * job_size * src_stride;
+		jobs[i].dst = (char *)dst.buf + i * job_size * dst_stride;
+		jobs[i].src_stride = src_stride;
+		jobs[i].src_ystride = src_ystride;
+		jobs[i].dst_stride = dst_stride;
+		jobs[i].dst_ystride = dst_ystride;
+		jobs[i].size = (i < job_count - 1) ? job_size : size - i * job_size;
+		jobs[i].done = i > 0 ? PyThread_allocate_lock() : NULL;
+	}
+	if (job_count > 1) {
+		Py_BEGIN_ALLOW_THREADS
+		affine_transform_parallel(jobs, job_count);
+		Py_END_ALLOW_THREADS
+	} else if (size >= AFFINE_NOGIL_MIN_POINTS) {
+		Py_BEGIN_ALLOW_THREADS
+		affine_transform_run(&jobs[0]);
+		Py_END_ALLOW_THREADS
+	} else {
+		affine_transform_run(&jobs[0]);
+	}
+	for (i = 1; i < job_count; ++i) {
+		if (jobs[i].done != NULL) {
+			PyThread_free_lock(jobs[i].done);
+		}
+	}
+	PyBuffer_Release(&dst);
+	PyBuffer_Release(&src);
+	Py_DECREF(src_obj);
+	if (out_seq != NULL) {
+		for (i = 0; i < size; ++i) {
+			point = (PyObject *)PlanarVec2_FromStruct(
+				((PlanarSeq2Object *)out)->vec + i);
+			if (point == NULL || PySequence_SetItem(out_seq, i, point) == -1) {
+				Py_XDECREF(point);
+				Py_DECREF(out);
+				return NULL;
+			}
+			Py_DECREF(point);
+		}
+		Py_DECREF(out);
+		Py_INCREF(out_seq);
+		return out_seq;
+	}
+	return out;
+
+wrong_size:
+	PyErr_Format(PyExc_ValueError,
+		"Affine.transform(): "
+		"destination length %zd does not match source length %zd",
+		out_size, size);
+	return NULL;
+}
+
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Affine_transform)
+
+static PyObject *
+Affine_reduce(PlanarAffineObject *self)
+{
+    return Py_BuildValue("(O(dddddd))", Py_TYPE(self), 
+        self->a, self->b, self->c, self->d, self->e, self->f);
+}
+
 static PyMethodDef Affine_methods[] = {
     {"identity", (PyCFunction)Affine_new_identity, 
         METH_CLASS | METH_NOARGS, 
@@ -519,18 +804,23 @@ static PyMethodDef Affine_methods[] = {
         METH_CLASS | METH_O, 
         "Create a scaling transform from a scalar or vector, "
         "optionally about an anchor point."},
-    {"shear", (PyCFunction)Affine_new_shear, 
-        METH_CLASS | METH_VARARGS | METH_KEYWORDS, 
+    {"shear", Planar_FASTCALL_KEYWORDS(Affine_new_shear), 
+        METH_CLASS | PLANAR_METH_FASTCALL_KEYWORDS, 
         "Create a shear transform from a vector, "
         "optionally about an anchor point."},
-    {"rotation", (PyCFunction)Affine_new_rotation, 
-        METH_CLASS | METH_VARARGS | METH_KEYWORDS, 
+    {"rotation", Planar_FASTCALL_KEYWORDS(Affine_new_rotation), 
+        METH_CLASS | PLANAR_METH_FASTCALL_KEYWORDS, 
         "Create a rotation transform at the specified angle, "
         "optionally about the specified anchor point."},
     {"almost_equals", (PyCFunction)Affine_almost_equals, METH_O, 
         "Compare transforms for approximate equality."},
     {"itransform", (PyCFunction)Affine_itransform, METH_O, 
         "Transform a sequence of points or vectors in place."},
+    {"transform", Planar_FASTCALL_KEYWORDS(Affine_transform), 
+        PLANAR_METH_FASTCALL_KEYWORDS, 
+        "Transform a sequence of points or vectors, storing the "
+        "results in a new array, or the destination array provided."},
+    {"__reduce__", (PyCFunction)Affine_reduce, METH_NOARGS, NULL},
     {NULL, NULL}
 };
 
@@ -558,7 +848,7 @@ Affine__mul__(PyObject *a, PyObject *b)
         /* Affine * Affine = Affine */
         ta = (PlanarAffineObject *)a;
         tb = (PlanarAffineObject *)b;
-        tr = (PlanarAffineObject *)PlanarAffineType.tp_alloc(Py_TYPE(a), 0);
+        tr = (PlanarAffineObject *)Py_TYPE(a)->tp_alloc(Py_TYPE(a), 0);
         if (tr == NULL) {
             return NULL;
         }
@@ -597,7 +887,7 @@ Affine__invert__(PlanarAffineObject *self)
         return NULL;
     }
     idet = 1.0 / idet;
-    t = (PlanarAffineObject *)PlanarAffineType.tp_alloc(Py_TYPE(self), 0);
+    t = (PlanarAffineObject *)Py_TYPE(self)->tp_alloc(Py_TYPE(self), 0);
     if (t == NULL) {
         return NULL;
     }
@@ -14,8 +14,6 @@
 #include "planar.h"
 
 #define VEC2_FREE_MAX 1000
-static PyObject *vec2_free_list = NULL;
-static int vec2_free_size = 0;
 
 static PlanarVec2Object *
 Vec2_result(PlanarVec2Object *self, double x, double y)
@@ -23,7 +21,7 @@ Vec2_result(PlanarVec2Object *self, double x, double y)
     PlanarVec2Object *v;
 
     assert(PlanarVec2_Check(self));
-    v = (PlanarVec2Object *)PlanarVec2Type.tp_alloc(Py_TYPE(self), 0);
+    v = (PlanarVec2Object *)Py_TYPE(self)->tp_alloc(Py_TYPE(self), 0);
     if (v == NULL) {
         return NULL;
     }
@@ -33,19 +31,25 @@ Vec2_result(PlanarVec2Object *self, double x, double y)
 }
 
 static int
-Vec2_init(PlanarVec2Object *self, PyObject *args)
+Vec2_init_array(PlanarVec2Object *self, PyObject *const *args, 
+    Py_ssize_t nargs)
 {
     PyObject *xarg;
     PyObject *yarg;
 
     assert(PlanarVec2_Check(self));
-    if (PyTuple_GET_SIZE(args) != 2) {
+    if (nargs != 2) {
         PyErr_SetString(PyExc_TypeError, 
             "Vec2: wrong number of arguments");
         return -1;
     }
-    xarg = PyObject_ToFloat(PyTuple_GET_ITEM(args, 0));
-    yarg = PyObject_ToFloat(PyTuple_GET_ITEM(args, 1));
+    if (PyFloat_CheckExact(args[0]) && PyFloat_CheckExact(args[1])) {
+        self->x = PyFloat_AS_DOUBLE(args[0]);
+        self->y = PyFloat_AS_DOUBLE(args[1]);
+        return 0;
+    }
+    xarg = PyObject_ToFloat(args[0]);
+    yarg = PyObject_ToFloat(args[1]);
     if (xarg == NULL || yarg == NULL) {
         Py_XDECREF(xarg);
         Py_XDECREF(yarg);
@@ -59,35 +63,50 @@ Vec2_init(PlanarVec2Object *self, PyObject *args)
     return 0;
 }
 
+static int
+Vec2_init(PlanarVec2Object *self, PyObject *args)
+{
+    return Vec2_init_array(self, 
+        &PyTuple_GET_ITEM(args, 0), PyTuple_GET_SIZE(args));
+}
+
+#if PY_VERSION_HEX >= 0x03090000
+PyObject *
+PlanarVec2_vectorcall(PyObject *type, PyObject *const *args, 
+    size_t nargsf, PyObject *kwnames)
+{
+    return Planar_VectorcallNew(&PlanarVec2Type, 
+        (planar_initarrayfunc)Vec2_init_array, type, args, nargsf, kwnames);
+}
+#endif
+
 static PyObject *
 Vec2_alloc(PyTypeObject *type, Py_ssize_t nitems)
 {
     PlanarVec2Object *v;
 
-    assert(PyType_IsSubtype(type, &PlanarVec2Type));
-    if (vec2_free_list != NULL) {
-        v = (PlanarVec2Object *)vec2_free_list;
-        Py_INCREF(v);
-        vec2_free_list = v->next_free;
-        --vec2_free_size;
-        v->x = v->y = 0.0;
-        return (PyObject *)v;
-    } else {
-        PyObject *p = PyType_GenericAlloc(type, nitems);
-        return p;
+    assert(Planar_TypeIsSubtype(type, &PlanarVec2Type));
+    if (Planar_TypeIsExact(type, &PlanarVec2Type)) {
+        v = (PlanarVec2Object *)Planar_FreeListPop(
+            PLANAR_FREELIST(vec2, type), type);
+        if (v != NULL) {
+            v->x = v->y = 0.0;
+            return (PyObject *)v;
+        }
     }
+    return PyType_GenericAlloc(type, nitems);
 }
 
 static void
 Vec2_dealloc(PlanarVec2Object *self)
 {
-    if (PlanarVec2_CheckExact(self) && vec2_free_size < VEC2_FREE_MAX) {
-        self->next_free = vec2_free_list;
-        vec2_free_list = (PyObject *)self;
-        ++vec2_free_size;
-    } else {
-        Py_TYPE(self)->tp_free((PyObject *)self);
+    PyTypeObject *type = Py_TYPE(self);
+
+    if (!PlanarVec2_CheckExact(self) || !Planar_FreeListPush(
+        PLANAR_FREELIST(vec2, type), (PyObject *)self, VEC2_FREE_MAX)) {
+        type->tp_free((PyObject *)self);
     }
+    Planar_DECREF_TYPE(type);
 }
 
 static PyObject *
@@ -207,42 +226,21 @@ static PyGetSetDef Vec2_getset[] = {
 /* Methods */
 
 static PyObject *
-Vec2_new_polar(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+Vec2_new_polar(PyTypeObject *type, PyObject *const *args, Py_ssize_t nargs,
+    PyObject *kwnames)
 {
-    PyObject *angle_arg;
-    PyObject *length_arg;
+    PyObject *values[2];
     PlanarVec2Object *v;
-    int arg_count;
     double angle;
     double length = 1.0;
 
-    static char *kwlist[] = {"angle", "length", NULL};
+    static const char *const kwlist[] = {"angle", "length", NULL};
 
-    assert(PyType_IsSubtype(type, &PlanarVec2Type));
-    if (kwargs == NULL) {
-        /* No kwargs, do fast manual arg handling */
-        arg_count = PyTuple_GET_SIZE(args);
-        if (arg_count != 1 && arg_count != 2) {
-            PyErr_SetString(PyExc_TypeError, 
-                "Vec2.polar(): wrong number of arguments");
-            return NULL;
-        }
-        angle_arg = PyObject_ToFloat(PyTuple_GET_ITEM(args, 0));
-        if (angle_arg == NULL) {
-            return NULL;
-        }
-        angle = PyFloat_AS_DOUBLE(angle_arg);
-        Py_DECREF(angle_arg);
-        if (arg_count == 2) {
-            length_arg = PyObject_ToFloat(PyTuple_GET_ITEM(args, 1));
-            if (length_arg == NULL) {
-                return NULL;
-            }
-            length = PyFloat_AS_DOUBLE(length_arg);
-            Py_DECREF(length_arg);
-        }
-    } else if (!PyArg_ParseTupleAndKeywords(
-        args, kwargs, "d|d:Vec2.polar", kwlist, &angle, &length)) {
+    assert(Planar_TypeIsSubtype(type, &PlanarVec2Type));
+    if (!Planar_ParseKeywords("Vec2.polar", args, nargs, kwnames, kwlist, 
+            1, values)
+        || !Planar_OptionalDouble(values[0], &angle)
+        || !Planar_OptionalDouble(values[1], &length)) {
         return NULL;
     }
 
@@ -255,6 +253,8 @@ Vec2_new_polar(PyTypeObject *type, PyObject *args, PyObject *kwargs)
     return (PyObject *)v;
 }
 
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Vec2_new_polar)
+
 static PyObject *
 Vec2_repr(PlanarVec2Object *self)
 {
@@ -421,17 +421,21 @@ Vec2_reflect(PlanarVec2Object *self, PyObject *other)
 }
 
 static PlanarVec2Object *
-Vec2_clamped(PlanarVec2Object *self, PyObject *args, PyObject *kwargs)
+Vec2_clamped(PlanarVec2Object *self, PyObject *const *args, 
+    Py_ssize_t nargs, PyObject *kwnames)
 {
     double min = 0.0;
     double max = DBL_MAX;
+    PyObject *values[2];
     double L, CL;
 
-    static char *kwlist[] = {"min_length", "max_length", NULL};
+    static const char *const kwlist[] = {"min_length", "max_length", NULL};
 
     assert(PlanarVec2_Check(self));
-    if (!PyArg_ParseTupleAndKeywords(
-        args, kwargs, "|dd:Vec2.clamped", kwlist, &min, &max)) {
+    if (!Planar_ParseKeywords("Vec2.clamped", args, nargs, kwnames, kwlist, 
+            0, values)
+        || !Planar_OptionalDouble(values[0], &min)
+        || !Planar_OptionalDouble(values[1], &max)) {
         return NULL;
     }
     if (min > max) {
@@ -452,17 +456,26 @@ Vec2_clamped(PlanarVec2Object *self, PyObject *args, PyObject *kwargs)
     }
 }
 
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Vec2_clamped)
+
 static PlanarVec2Object *
-Vec2_lerp(PlanarVec2Object *self, PyObject *args)
+Vec2_lerp(PlanarVec2Object *self, PyObject *const *args, Py_ssize_t nargs)
 {
-    PyObject *other;
     double v, ox, oy;
 
     assert(PlanarVec2_Check(self));
-    if (!PyArg_ParseTuple(args, "Od", &other, &v)) {
+    if (!Planar_CheckArgCount("lerp", nargs, 2)) {
         return NULL;
     }
-    if (!PlanarVec2_Parse(other, &ox, &oy)) {
+    v = PyFloat_AsDouble(args[1]);
+    if (v == -1.0 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (!PlanarVec2_Parse(args[0], &ox, &oy)) {
+        if (!PyErr_Occurred()) {
+            PyErr_SetString(PyExc_TypeError,
+                "Vec2.lerp(): expected Vec2 object for argument");
+        }
         return NULL;
     }
     return Vec2_result(self, 
@@ -470,6 +483,8 @@ Vec2_lerp(PlanarVec2Object *self, PyObject *args)
         self->y * (1.0 - v) + oy * v);
 }
 
+Planar_DEFINE_FASTCALL_COMPAT(Vec2_lerp)
+
 static PlanarVec2Object *
 Vec2_normalized(PlanarVec2Object *self)
 {
@@ -491,9 +506,15 @@ Vec2_perpendicular(PlanarVec2Object *self)
     return Vec2_result(self, -self->y, self->x);
 }
 
+static PyObject *
+Vec2_reduce(PlanarVec2Object *self)
+{
+    return Py_BuildValue("(O(dd))", Py_TYPE(self), self->x, self->y);
+}
+
 static PyMethodDef Vec2_methods[] = {
-    {"polar", (PyCFunction)Vec2_new_polar, 
-        METH_CLASS | METH_VARARGS | METH_KEYWORDS, 
+    {"polar", Planar_FASTCALL_KEYWORDS(Vec2_new_polar), 
+        METH_CLASS | PLANAR_METH_FASTCALL_KEYWORDS, 
         "Create a vector from polar coordinates."},
     {"almost_equals", (PyCFunction)Vec2_almost_equals, METH_O, 
         "Compare vectors for approximate equality."},
@@ -514,9 +535,10 @@ static PyMethodDef Vec2_methods[] = {
         "Compute the projection of another vector onto this one."},
     {"reflect", (PyCFunction)Vec2_reflect, METH_O, 
         "Compute the reflection of this vector against another."},
-    {"clamped", (PyCFunction)Vec2_clamped, METH_VARARGS | METH_KEYWORDS, 
+    {"clamped", Planar_FASTCALL_KEYWORDS(Vec2_clamped), 
+        PLANAR_METH_FASTCALL_KEYWORDS, 
         "Compute a vector in the same direction with a bounded length."},
-    {"lerp", (PyCFunction)Vec2_lerp, METH_VARARGS, 
+    {"lerp", Planar_FASTCALL(Vec2_lerp), PLANAR_METH_FASTCALL, 
         "Compute a vector by linear interpolation between "
         "this vector and another."},
     {"normalized", (PyCFunction)Vec2_normalized, METH_NOARGS, 
@@ -524,6 +546,7 @@ static PyMethodDef Vec2_methods[] = {
         "If the vector is null, the null vector is returned."},
     {"perpendicular", (PyCFunction)Vec2_perpendicular, METH_NOARGS, 
         "Compute the perpendicular vector."},
+    {"__reduce__", (PyCFunction)Vec2_reduce, METH_NOARGS, NULL}, 
     {NULL, NULL}
 };
 
@@ -816,13 +839,13 @@ Seq2_new_from_points(PyTypeObject *type, PyObject *points)
     Py_ssize_t size;
     Py_ssize_t i;
 
-	assert(PyType_IsSubtype(type, &PlanarSeq2Type));
+	assert(Planar_TypeIsSubtype(type, &PlanarSeq2Type));
 	/* This check is a bit of a hack to prevent
 	   bugs in user code from crashing the interpreter
 	   by "forcing" this to be called with known
 	   incompatible subclasses
 	*/
-	if (PyType_IsSubtype(type, &PlanarPolygonType)) {
+	if (Planar_TypeIsSubtype(type, &PlanarPolygonType)) {
 		PyErr_Format(PyExc_TypeError,
 			"Cannot call Seq2.from_points() on %.200s class",
 			type->tp_name);
@@ -876,12 +899,16 @@ Seq2_pynew(PyTypeObject *type, PyObject *args, PyObject *kwargs)
 static void
 Seq2_dealloc(PlanarSeq2Object *self)
 {
-	if (self->vec != NULL && self->vec != self->data) {
+	if (Py_TYPE(self)->tp_itemsize == 0 && self->mapping != NULL) {
+		/* Release the file mapping, the vectors are not ours to free */
+		Py_CLEAR(self->mapping);
+		self->vec = NULL;
+	} else if (self->vec != NULL && self->vec != self->data) {
 		/* Free externally allocated vector array */
 		PyMem_Free(self->vec);
 		self->vec = NULL;
 	}
-    Py_TYPE(self)->tp_free((PyObject *)self);
+    Planar_FreeObject((PyObject *)self);
 }
 
 static PyObject *
@@ -1043,13 +1070,54 @@ Seq2_copy(PlanarSeq2Object *self)
 	}
 }
 
+static PyObject *
+Seq2_reduce_ex(PlanarSeq2Object *self, PyObject *args)
+{
+	return Seq2_Reduce((PyObject *)self, args, NULL);
+}
+
+static PyObject *
+Seq2_new_from_bytes(PyTypeObject *type, PyObject *data)
+{
+	PlanarSeq2Object *varray;
+	PyObject *result;
+	Py_buffer view;
+	Py_ssize_t size;
+
+	size = Seq2_GetBytesView(data, &view, sizeof(planar_vec2_t));
+	if (size == -1) {
+		return NULL;
+	}
+	if (Planar_TypeIsExact(type, &PlanarSeq2Type) 
+		|| Planar_TypeIsExact(type, &PlanarVec2ArrayType)) {
+		varray = Seq2_New(type, size);
+	} else {
+		varray = Seq2_New(PLANAR_TYPE(Seq2), size);
+	}
+	if (varray != NULL) {
+		memcpy(varray->vec, view.buf, size * sizeof(planar_vec2_t));
+	}
+	PyBuffer_Release(&view);
+	if (varray == NULL || Py_TYPE(varray) == type) {
+		return (PyObject *)varray;
+	}
+	/* Let subclasses initialize themselves */
+	result = PyObject_CallMethod(
+		(PyObject *)type, "from_points", "O", varray);
+	Py_DECREF(varray);
+	return result;
+}
+
 static PyMethodDef Seq2_methods[] = {
     {"almost_equals", (PyCFunction)Seq2_almost_equals, METH_O, 
 		"Compare for approximate equality."},
     {"from_points", (PyCFunction)Seq2_new_from_points, METH_CLASS | METH_O, 
 		"Create a new 2D sequence from an iterable of points"},
+    {"_from_bytes", (PyCFunction)Seq2_new_from_bytes, METH_CLASS | METH_O, 
+		"PRIVATE: Create a new sequence from packed vector data"},
     {"__copy__", (PyCFunction)Seq2_copy, METH_NOARGS, NULL}, 
     {"__deepcopy__", (PyCFunction)Seq2_copy, METH_O, NULL}, 
+    {"__reduce_ex__", (PyCFunction)Seq2_reduce_ex, METH_VARARGS, NULL}, 
     {NULL, NULL}
 };
 
@@ -1060,9 +1128,10 @@ Seq2__mul__(PyObject *a, PyObject *b)
 {
     PlanarSeq2Object *src, *dst;
     PlanarAffineObject *t;
-    planar_vec2_t *srcv, *dstv;
+    planar_vec2_t *dstv;
     Py_ssize_t size;
-    double ta, tb, tc, td, te, tf;
+    double ta, tb, tc, td, te, tf, x, y;
+	PyThreadState *state;
 
     if (PlanarSeq2_Check(a) && PlanarAffine_Check(b)) {
 		src = (PlanarSeq2Object *)a;
@@ -1082,23 +1151,24 @@ Seq2__mul__(PyObject *a, PyObject *b)
     te = t->e;
     tf = t->f;
 
-    size = PySequence_Size((PyObject *)src);
-    if (size == -1) {
-		return NULL;
-    }
 	dst = (PlanarSeq2Object *)PyObject_CallMethod(
 		(PyObject *)src, "__copy__", NULL);
     if (dst == NULL) {
 		return NULL;
     }
-	srcv = src->vec;
+	/* Transform the copy in place, since the source 
+	   could be resized by another thread meanwhile */
+	size = Py_SIZE(dst);
     dstv = dst->vec;
+	state = Planar_BeginNoGIL(size);
     while (size--) {
-		dstv->x = srcv->x*ta + srcv->y*td + tc;
-		dstv->y = srcv->x*tb + srcv->y*te + tf;
-		++srcv;
+		x = dstv->x;
+		y = dstv->y;
+		dstv->x = x*ta + y*td + tc;
+		dstv->y = x*tb + y*te + tf;
 		++dstv;
     }
+	Planar_EndNoGIL(state);
     return (PyObject *)dst;
 }
 
@@ -1110,6 +1180,7 @@ Seq2__imul__(PyObject *a, PyObject *b)
     planar_vec2_t *sv;
     Py_ssize_t size;
     double ta, tb, tc, td, te, tf, x, y;
+	PyThreadState *state;
 
     if (PlanarSeq2_Check(a) && PlanarAffine_Check(b)) {
 		s = (PlanarSeq2Object *)a;
@@ -1121,6 +1192,9 @@ Seq2__imul__(PyObject *a, PyObject *b)
 		/* We support only transform operations */
 		RETURN_NOT_IMPLEMENTED;
     }
+	if (!Vec2Array_CheckWritable(s)) {
+		return NULL;
+	}
     ta = t->a;
     tb = t->b;
     tc = t->c;
@@ -1128,11 +1202,14 @@ Seq2__imul__(PyObject *a, PyObject *b)
     te = t->e;
     tf = t->f;
 
-    size = PySequence_Size((PyObject *)s);
-    if (size == -1) {
-		return NULL;
-    }
+	Planar_BEGIN_CRITICAL_SECTION(s);
+    size = Py_SIZE(s);
     sv = s->vec;
+	/* Polygons update their cached properties after the transform, so
+	   other threads must not observe their vertices part way through.
+	   Vector arrays could be resized by another thread */
+	state = Planar_BeginNoGIL(
+		PlanarPolygon_Check(s) || PlanarVec2Array_Check(s) ? 0 : size);
     while (size--) {
 		x = sv->x*ta + sv->y*td + tc;
 		y = sv->x*tb + sv->y*te + tf;
@@ -1140,6 +1217,8 @@ Seq2__imul__(PyObject *a, PyObject *b)
 		sv->y = y;
 		++sv;
     }
+	Planar_EndNoGIL(state);
+	Planar_END_CRITICAL_SECTION();
     Py_INCREF(s);
     return (PyObject *)s;
 }
@@ -1197,6 +1276,26 @@ static PyNumberMethods Seq2_as_number = {
     0,       /* unaryfunc nb_index */
 };
 
+/* Buffer interface */
+
+static int
+Seq2_getbuffer(PlanarSeq2Object *self, Py_buffer *view, int flags)
+{
+	return Seq2_GetBuffer((PyObject *)self, self->vec, Py_SIZE(self), 
+		self->buffer_shape, 0, view, flags);
+}
+
+static PyBufferProcs Seq2_as_buffer = {
+#if PY_MAJOR_VERSION < 3
+	0,		/* bf_getreadbuffer */
+	0,		/* bf_getwritebuffer */
+	0,		/* bf_getsegcount */
+	0,		/* bf_getcharbuffer */
+#endif
+	(getbufferproc)Seq2_getbuffer,	/* bf_getbuffer */
+	0,		/* bf_releasebuffer */
+};
+
 
 PyDoc_STRVAR(Seq2__doc__, "Fixed length vector sequence");
 
@@ -1220,8 +1319,9 @@ PyTypeObject PlanarSeq2Type = {
 	0,                      /*tp_str*/
 	0,                      /*tp_getattro*/
 	0,                      /*tp_setattro*/
-	0,                      /*tp_as_buffer*/
-	Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_CHECKTYPES,     /*tp_flags*/
+	&Seq2_as_buffer,        /*tp_as_buffer*/
+	Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_CHECKTYPES
+		| Py_TPFLAGS_HAVE_NEWBUFFER,   /*tp_flags*/
 	Seq2__doc__,            /*tp_doc*/
 	0,                      /*tp_traverse*/
 	0,                      /*tp_clear*/
@@ -1256,6 +1356,25 @@ Vec2Array_new(PyTypeObject *type, PyObject *args, PyObject *kwargs)
 	}
 }
 
+/* Return true if the array can be resized, otherwise set an
+   exception and return false. Arrays with exported buffers cannot
+   be resized, since that may move the underlying memory */
+static int
+Vec2Array_check_resizable(PlanarSeq2Object *self)
+{
+	if (self->exports > 0) {
+		PyErr_SetString(PyExc_BufferError,
+			"Existing exports of data: Vec2Array cannot be resized");
+		return 0;
+	}
+	if (self->mapping != NULL) {
+		PyErr_SetString(PyExc_BufferError,
+			"Memory-mapped Vec2Array cannot be resized");
+		return 0;
+	}
+	return 1;
+}
+
 static int
 Vec2Array_resize(PlanarSeq2Object *self, Py_ssize_t newsize) 
 {
@@ -1263,12 +1382,16 @@ Vec2Array_resize(PlanarSeq2Object *self, Py_ssize_t newsize)
 	Py_ssize_t allocated = self->allocated;
 	void *realloc_vec;
 
+	if (newsize != Py_SIZE(self) && !Vec2Array_check_resizable(self)) {
+		return -1;
+	}
+
 	/* Bypass realloc() when a previous overallocation is large enough
 	   to accommodate the newsize.  If the newsize falls lower than half
 	   the allocated size, then proceed with the realloc() to shrink the array.
 	*/
 	if (allocated >= newsize && newsize >= (allocated >> 1)) {
-		Py_SIZE(self) = newsize;
+		Py_SET_SIZE(self, newsize);
 		return 0;
 	}
 
@@ -1296,12 +1419,12 @@ Vec2Array_resize(PlanarSeq2Object *self, Py_ssize_t newsize)
 	}
 	self->vec = (planar_vec2_t *)realloc_vec;
 	self->allocated = new_allocated;
-	Py_SIZE(self) = newsize;
+	Py_SET_SIZE(self, newsize);
 	return 0;
 }
 
 static PyObject *
-Vec2Array_append(PlanarSeq2Object *self, PyObject *vector) 
+vec2array_append(PlanarSeq2Object *self, PyObject *vector) 
 {
 	double x, y;
 	Py_ssize_t i = Py_SIZE(self);
@@ -1330,7 +1453,8 @@ Vec2Array_append(PlanarSeq2Object *self, PyObject *vector)
 }
 
 static PyObject *
-Vec2Array_insert(PlanarSeq2Object *self, PyObject *args)
+vec2array_insert(PlanarSeq2Object *self, PyObject *const *args, 
+	Py_ssize_t nargs)
 {
 	double x, y;
 	PyObject *vector; 
@@ -1338,9 +1462,14 @@ Vec2Array_insert(PlanarSeq2Object *self, PyObject *args)
 	Py_ssize_t n = Py_SIZE(self);
 
     assert(PlanarVec2Array_Check(self));
-	if (!PyArg_ParseTuple(args, "nO:insert", &where, &vector)) {
+	if (!Planar_CheckArgCount("insert", nargs, 2)) {
+		return NULL;
+	}
+	where = PyNumber_AsSsize_t(args[0], PyExc_OverflowError);
+	if (where == -1 && PyErr_Occurred()) {
 		return NULL;
 	}
+	vector = args[1];
 	if (n == PY_SSIZE_T_MAX) {
 		PyErr_SetString(PyExc_OverflowError,
 			"cannot add more objects to array");
@@ -1375,7 +1504,7 @@ Vec2Array_insert(PlanarSeq2Object *self, PyObject *args)
 }
 
 static PyObject *
-Vec2Array_extend(PlanarSeq2Object *self, PyObject *vectors) 
+vec2array_extend(PlanarSeq2Object *self, PyObject *vectors) 
 {
 	Py_ssize_t size, j;
 	Py_ssize_t i = Py_SIZE(self);
@@ -1449,6 +1578,9 @@ Vec2Array_ass_slice(PlanarSeq2Object *self,
 	Py_ssize_t d; /* Change in size */
 	PlanarSeq2Object *seq;
 
+	if (!Vec2Array_CheckWritable(self)) {
+		return -1;
+	}
 	if (vectors == NULL) {
 		seq = NULL;
 		n = 0;
@@ -1457,7 +1589,7 @@ Vec2Array_ass_slice(PlanarSeq2Object *self,
 		Py_INCREF(seq);
 		n = Py_SIZE(seq);
 	} else {
-		seq = Seq2_new_from_points(&PlanarSeq2Type, vectors);
+		seq = Seq2_new_from_points(PLANAR_TYPE(Seq2), vectors);
 		if (seq == NULL) {
 			goto error;
 		}
@@ -1477,6 +1609,9 @@ Vec2Array_ass_slice(PlanarSeq2Object *self,
 	norig = ihigh - ilow;
 	assert(norig >= 0);
 	d = n - norig;
+	if (d != 0 && !Vec2Array_check_resizable(self)) {
+		goto error;
+	}
 	if (Py_SIZE(self) + d == 0) {
 		Py_XDECREF(seq);
 		return Vec2Array_resize(self, 0);
@@ -1503,7 +1638,7 @@ Vec2Array_ass_slice(PlanarSeq2Object *self,
 }
 
 static int
-Vec2Array_ass_item(PlanarSeq2Object *self, Py_ssize_t i, PyObject *vector)
+vec2array_ass_item(PlanarSeq2Object *self, Py_ssize_t i, PyObject *vector)
 {
 	double x, y;
 
@@ -1515,6 +1650,9 @@ Vec2Array_ass_item(PlanarSeq2Object *self, Py_ssize_t i, PyObject *vector)
 	if (vector == NULL) {
 		return Vec2Array_ass_slice(self, i, i+1, vector);
 	}
+	if (!Vec2Array_CheckWritable(self)) {
+		return -1;
+	}
 	if (!PlanarVec2_Parse(vector, &x, &y)) {
 		if (!PyErr_Occurred()) {
 			PyErr_Format(PyExc_TypeError, 
@@ -1584,9 +1722,12 @@ Vec2Array_subscript(PlanarSeq2Object* self, PyObject* item)
 }
 
 static int
-Vec2Array_ass_subscript(PlanarSeq2Object* self, 
+vec2array_ass_subscript(PlanarSeq2Object* self, 
 	PyObject* item, PyObject* value)
 {
+	if (!Vec2Array_CheckWritable(self)) {
+		return -1;
+	}
 	if (PyIndex_Check(item)) {
 		Py_ssize_t i = PyNumber_AsSsize_t(item, PyExc_IndexError);
 		if (i == -1 && PyErr_Occurred()) {
@@ -1595,7 +1736,7 @@ Vec2Array_ass_subscript(PlanarSeq2Object* self,
 		if (i < 0) {
 			i += Py_SIZE(self);
 		}
-		return Vec2Array_ass_item(self, i, value);
+		return vec2array_ass_item(self, i, value);
 	}
 	else if (PySlice_Check(item)) {
 		Py_ssize_t start, stop, step, slicelength;
@@ -1624,6 +1765,9 @@ Vec2Array_ass_subscript(PlanarSeq2Object* self,
 			if (slicelength <= 0) {
 				return 0;
 			}
+			if (!Vec2Array_check_resizable(self)) {
+				return -1;
+			}
 
 			if (step < 0) {
 				stop = start + 1;
@@ -1659,7 +1803,7 @@ Vec2Array_ass_subscript(PlanarSeq2Object* self,
 					 sizeof(planar_vec2_t));
 			}
 
-			Py_SIZE(self) -= slicelength;
+			Py_SET_SIZE(self, Py_SIZE(self) - slicelength);
 			Vec2Array_resize(self, Py_SIZE(self));
 
 			return 0;
@@ -1670,7 +1814,7 @@ Vec2Array_ass_subscript(PlanarSeq2Object* self,
 			Py_ssize_t cur, i;
 
 			if (!PlanarSeq2_Check(value)) {
-				 seq = Seq2_new_from_points(&PlanarSeq2Type, value);
+				 seq = Seq2_new_from_points(PLANAR_TYPE(Seq2), value);
 				 if (seq == NULL) {
 				 	return -1;
 				}
@@ -1713,6 +1857,68 @@ Vec2Array_ass_subscript(PlanarSeq2Object* self,
 	}
 }
 
+/* Methods that may resize an array hold its critical section, so the
+   vectors are not moved while another thread copies or transforms them */
+
+static PyObject *
+Vec2Array_append(PlanarSeq2Object *self, PyObject *vector) 
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = vec2array_append(self, vector);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static PyObject *
+Vec2Array_insert(PlanarSeq2Object *self, PyObject *const *args, 
+	Py_ssize_t nargs)
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = vec2array_insert(self, args, nargs);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+Planar_DEFINE_FASTCALL_COMPAT(Vec2Array_insert)
+
+static PyObject *
+Vec2Array_extend(PlanarSeq2Object *self, PyObject *vectors) 
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = vec2array_extend(self, vectors);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static int
+Vec2Array_ass_item(PlanarSeq2Object *self, Py_ssize_t i, PyObject *vector)
+{
+	int result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = vec2array_ass_item(self, i, vector);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static int
+Vec2Array_ass_subscript(PlanarSeq2Object* self, 
+	PyObject* item, PyObject* value)
+{
+	int result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = vec2array_ass_subscript(self, item, value);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
 static PyMappingMethods Vec2Array_as_mapping = {
 	(lenfunc)Seq2_length,
 	(binaryfunc)Vec2Array_subscript,
@@ -1781,6 +1987,9 @@ Vec2Array_normalize(PlanarSeq2Object *self)
 	double L;
 	Py_ssize_t i;
 
+	if (!Vec2Array_CheckWritable(self)) {
+		return NULL;
+	}
 	for (i = 0; i < Py_SIZE(self); ++i) {
 		L = sqrt(self->vec[i].x * self->vec[i].x + 
 			self->vec[i].y * self->vec[i].y);
@@ -1811,20 +2020,24 @@ Vec2Array_normalized(PlanarSeq2Object *self)
 }
 
 static PlanarSeq2Object *
-Vec2Array_clamped(PlanarSeq2Object *self, PyObject *args, PyObject *kwargs)
+Vec2Array_clamped(PlanarSeq2Object *self, PyObject *const *args, 
+    Py_ssize_t nargs, PyObject *kwnames)
 {
     double min = 0.0;
     double max = DBL_MAX;
+    PyObject *values[2];
 	double min2, max2;
     double L;
 	Py_ssize_t i;
 	PlanarSeq2Object *varray;
 
-    static char *kwlist[] = {"min_length", "max_length", NULL};
+    static const char *const kwlist[] = {"min_length", "max_length", NULL};
 
     assert(PlanarVec2Array_Check(self));
-    if (!PyArg_ParseTupleAndKeywords(
-        args, kwargs, "|dd:Vec2Array.clamped", kwlist, &min, &max)) {
+    if (!Planar_ParseKeywords("Vec2Array.clamped", args, nargs, kwnames, 
+            kwlist, 0, values)
+        || !Planar_OptionalDouble(values[0], &min)
+        || !Planar_OptionalDouble(values[1], &max)) {
         return NULL;
     }
 	if (min < 0) {
@@ -1863,20 +2076,26 @@ Vec2Array_clamped(PlanarSeq2Object *self, PyObject *args, PyObject *kwargs)
 	return varray;
 }
 
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Vec2Array_clamped)
+
 static PyObject *
-Vec2Array_clamp(PlanarSeq2Object *self, PyObject *args, PyObject *kwargs)
+Vec2Array_clamp(PlanarSeq2Object *self, PyObject *const *args, 
+    Py_ssize_t nargs, PyObject *kwnames)
 {
     double min = 0.0;
     double max = DBL_MAX;
+    PyObject *values[2];
 	double min2, max2;
     double L;
 	Py_ssize_t i;
 
-    static char *kwlist[] = {"min_length", "max_length", NULL};
+    static const char *const kwlist[] = {"min_length", "max_length", NULL};
 
     assert(PlanarVec2Array_Check(self));
-    if (!PyArg_ParseTupleAndKeywords(
-        args, kwargs, "|dd:Vec2Array.clamped", kwlist, &min, &max)) {
+    if (!Planar_ParseKeywords("Vec2Array.clamp", args, nargs, kwnames, 
+            kwlist, 0, values)
+        || !Planar_OptionalDouble(values[0], &min)
+        || !Planar_OptionalDouble(values[1], &max)) {
         return NULL;
     }
 	if (min < 0) {
@@ -1889,6 +2108,9 @@ Vec2Array_clamp(PlanarSeq2Object *self, PyObject *args, PyObject *kwargs)
             "Vec2Array.clamped: expected min_length <= max_length");
         return NULL;
     }
+	if (!Vec2Array_CheckWritable(self)) {
+		return NULL;
+	}
 	min2 = min*min;
 	max2 = max < DBL_MAX ? max*max : DBL_MAX;
 
@@ -1908,133 +2130,606 @@ Vec2Array_clamp(PlanarSeq2Object *self, PyObject *args, PyObject *kwargs)
 	Py_RETURN_NONE;
 }
 
-static PyMethodDef Vec2Array_methods[] = {
-    {"append", (PyCFunction)Vec2Array_append, METH_O, 
-		"Append all vectors in iterable to the end of the array."},
-    {"insert", (PyCFunction)Vec2Array_insert, METH_VARARGS, 
-		"Insert a vector at the specified index."},
-    {"extend", (PyCFunction)Vec2Array_extend, METH_O, 
-		"Extend an array appending vectors from the given sequence."},
-    {"longest", (PyCFunction)Vec2Array_longest, METH_NOARGS, 
-		"Return the vector in the array with the maximum length."},
-    {"shortest", (PyCFunction)Vec2Array_shortest, METH_NOARGS, 
-		"Return the vector in the array with the minimum length."},
-    {"normalize", (PyCFunction)Vec2Array_normalize, METH_NOARGS, 
-		"Normalize the vectors in the array in place."},
-    {"normalized", (PyCFunction)Vec2Array_normalized, METH_NOARGS, 
-		"Create a new array containing normalized vectors calculated "
-        "from this array."},
-    {"clamp", (PyCFunction)Vec2Array_clamp, METH_VARARGS | METH_KEYWORDS, 
-        "Clamp the length of the vectors in this array in place between "
-        "min_length and max_length."},
-    {"clamped", (PyCFunction)Vec2Array_clamped, METH_VARARGS | METH_KEYWORDS, 
-        "Create a new array of vectors with lengths clamped between "
-        "min_length and max_length."},
-    {NULL, NULL}
-};
-
-/* Arithmetic Operations */
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Vec2Array_clamp)
 
-/* Create the proper seq2 result object for arithmetic operations
-   given the two operands and the result sequence
-*/
-static PyObject *
-create_result_seq2(PyObject *a, PyObject *b, PyObject *seq)
-{
-	if (!PlanarVec2Array_Check(b) && PlanarSeq2_Check(b)) {
-		return call_from_points(b, seq);
-	} else if (!PlanarVec2Array_Check(a) && PlanarSeq2_Check(a)) {
-		return call_from_points(a, seq);
-	} else if (!PlanarVec2Array_CheckExact(b) && PlanarSeq2_Check(b)) {
-		return call_from_points(b, seq);
-	} else if (!PlanarVec2Array_CheckExact(a) && PlanarSeq2_Check(a)) {
-		return call_from_points(a, seq);
-	} else {
-		Py_INCREF(seq);
-		return seq;
-	}
-}
+/* Reductions and elementwise kernels */
 
+/* Create an array.array of doubles from the bytes object 
+   specified, which is consumed */
 static PyObject *
-Vec2Array_add(PyObject *a, PyObject *b, PlanarSeq2Object *dst)
+double_array_from_bytes(PyObject *bytes)
 {
-	Py_ssize_t size, i;
-	double x, y;
-	PlanarSeq2Object *seq2_a, *seq2_b, *varray;
+	planar_state *state = Planar_GetState();
+	PyObject *module, *result;
 
-	assert(dst == NULL || PlanarSeq2_Check(dst));
-	if (PlanarSeq2_Check(a) && PlanarSeq2_Check(b)) {
-		size = Py_SIZE(a);
-		if (Py_SIZE(b) != size) {
-			PyErr_SetString(PyExc_ValueError,
-				"cannot add arrays with different lengths");
+	if (bytes == NULL) {
+		return NULL;
+	}
+	if (state->array_type == NULL) {
+		module = PyImport_ImportModule("array");
+		if (module == NULL) {
+			Py_DECREF(bytes);
 			return NULL;
 		}
-		if (dst == NULL) {
-			dst = Seq2_New(&PlanarVec2ArrayType, size);
-			if (dst == NULL) {
-				return NULL;
-			}
-		} else {
-			Py_INCREF(dst);
-		}
-		seq2_a = (PlanarSeq2Object *)a;
-		seq2_b = (PlanarSeq2Object *)b;
-		for (i = 0; i < size; ++i) {
-			dst->vec[i].x = seq2_a->vec[i].x + seq2_b->vec[i].x;
-			dst->vec[i].y = seq2_a->vec[i].y + seq2_b->vec[i].y;
-		}
-		return (PyObject *)dst;
-	} else if (PlanarVec2Array_Check(a) && PlanarVec2_Parse(b, &x, &y)) {
-		varray = (PlanarSeq2Object *)a;
-	} else if (PlanarVec2Array_Check(b) && PlanarVec2_Parse(a, &x, &y)) {
-		varray = (PlanarSeq2Object *)b;
-	} else {
-        PyErr_Clear();
-        Py_INCREF(Py_NotImplemented);
-        return Py_NotImplemented;
-    }
-	
-	/* Add vector to sequence */
-	if (dst == NULL) {
-		dst = Seq2_New(&PlanarVec2ArrayType, Py_SIZE(varray));
-		if (dst == NULL) {
+		state->array_type = PyObject_GetAttrString(module, "array");
+		Py_DECREF(module);
+		if (state->array_type == NULL) {
+			Py_DECREF(bytes);
 			return NULL;
 		}
-	} else {
-		Py_INCREF(dst);
-	}
-	for (i = 0; i < Py_SIZE(varray); ++i) {
-		dst->vec[i].x = varray->vec[i].x + x;
-		dst->vec[i].y = varray->vec[i].y + y;
 	}
-	PyErr_Clear();
-	return (PyObject *)dst;
+	result = PyObject_CallFunction(state->array_type, "sO", "d", bytes);
+	Py_DECREF(bytes);
+	return result;
 }
 
+#define NEW_DOUBLE_BYTES(size) \
+	PyBytes_FromStringAndSize(NULL, (size) * sizeof(double))
+#define DOUBLE_BYTES_AS_ARRAY(bytes) ((double *)PyBytes_AS_STRING(bytes))
+
 static PyObject *
-Vec2Array__add__(PyObject *a, PyObject *b)
+Vec2Array_lengths(PlanarSeq2Object *self)
 {
-	PyObject *varray, *result;
+	PyObject *bytes;
+	double *out;
+	Py_ssize_t i;
 
-	varray = Vec2Array_add(a, b, NULL);
-	if (varray == NULL || varray == Py_NotImplemented) {
-		return varray;
+	bytes = NEW_DOUBLE_BYTES(Py_SIZE(self));
+	if (bytes == NULL) {
+		return NULL;
 	}
-	assert(PlanarVec2Array_Check(varray));
-	result = create_result_seq2(a, b, varray);
-	Py_DECREF(varray);
-	return result;
+	out = DOUBLE_BYTES_AS_ARRAY(bytes);
+	for (i = 0; i < Py_SIZE(self); ++i) {
+		out[i] = sqrt(self->vec[i].x * self->vec[i].x + 
+			self->vec[i].y * self->vec[i].y);
+	}
+	return double_array_from_bytes(bytes);
 }
 
 static PyObject *
-Vec2Array__iadd__(PyObject *a, PyObject *b)
+Vec2Array_lengths2(PlanarSeq2Object *self)
 {
-	if (PlanarVec2Array_Check(a)) {
-		return Vec2Array_add(a, b, (PlanarSeq2Object *)a);
-	} else {
-        Py_INCREF(Py_NotImplemented);
-        return Py_NotImplemented;
+	PyObject *bytes;
+	double *out;
+	Py_ssize_t i;
+
+	bytes = NEW_DOUBLE_BYTES(Py_SIZE(self));
+	if (bytes == NULL) {
+		return NULL;
+	}
+	out = DOUBLE_BYTES_AS_ARRAY(bytes);
+	for (i = 0; i < Py_SIZE(self); ++i) {
+		out[i] = self->vec[i].x * self->vec[i].x + 
+			self->vec[i].y * self->vec[i].y;
+	}
+	return double_array_from_bytes(bytes);
+}
+
+#define KERNEL_DOT 0
+#define KERNEL_CROSS 1
+#define KERNEL_DISTANCE 2
+
+/* Apply a binary kernel to the vectors in the array paired
+   with either a single vector or another vector sequence. The
+   action describes the kernel in the error for mismatched lengths */
+static PyObject *
+Vec2Array_kernel(PlanarSeq2Object *self, PyObject *other, int kernel,
+	const char *name, const char *action)
+{
+	PyObject *bytes;
+	planar_vec2_t *a, *b, single;
+	double *out, dx, dy;
+	Py_ssize_t i, size, b_step;
+
+	size = Py_SIZE(self);
+	if (PlanarSeq2_Check(other)) {
+		if (Py_SIZE(other) != size) {
+			PyErr_Format(PyExc_ValueError,
+				"cannot %s arrays with different lengths", action);
+			return NULL;
+		}
+		b = ((PlanarSeq2Object *)other)->vec;
+		b_step = 1;
+	} else if (PlanarVec2_Parse(other, &single.x, &single.y)) {
+		b = &single;
+		b_step = 0;
+	} else {
+		PyErr_Format(PyExc_TypeError,
+			"Vec2Array.%s(): expected Vec2 or Seq2 for argument", name);
+		return NULL;
+	}
+	bytes = NEW_DOUBLE_BYTES(size);
+	if (bytes == NULL) {
+		return NULL;
+	}
+	out = DOUBLE_BYTES_AS_ARRAY(bytes);
+	a = self->vec;
+	switch (kernel) {
+		case KERNEL_DOT:
+			for (i = 0; i < size; ++i, ++a, b += b_step) {
+				out[i] = a->x * b->x + a->y * b->y;
+			}
+			break;
+		case KERNEL_CROSS:
+			for (i = 0; i < size; ++i, ++a, b += b_step) {
+				out[i] = a->x * b->y - a->y * b->x;
+			}
+			break;
+		case KERNEL_DISTANCE:
+			for (i = 0; i < size; ++i, ++a, b += b_step) {
+				dx = a->x - b->x;
+				dy = a->y - b->y;
+				out[i] = sqrt(dx*dx + dy*dy);
+			}
+			break;
+	}
+	return double_array_from_bytes(bytes);
+}
+
+static PyObject *
+Vec2Array_dots(PlanarSeq2Object *self, PyObject *other)
+{
+	return Vec2Array_kernel(self, other, KERNEL_DOT, "dots",
+		"compute dot products of");
+}
+
+static PyObject *
+Vec2Array_crosses(PlanarSeq2Object *self, PyObject *other)
+{
+	return Vec2Array_kernel(self, other, KERNEL_CROSS, "crosses",
+		"compute cross products of");
+}
+
+static PyObject *
+Vec2Array_distances_to(PlanarSeq2Object *self, PyObject *other)
+{
+	return Vec2Array_kernel(self, other, KERNEL_DISTANCE, "distances_to",
+		"compute distances between");
+}
+
+static void
+Vec2Array_sum_vec(PlanarSeq2Object *self, planar_vec2_t *sum)
+{
+	Py_ssize_t i;
+
+	sum->x = sum->y = 0.0;
+	for (i = 0; i < Py_SIZE(self); ++i) {
+		sum->x += self->vec[i].x;
+		sum->y += self->vec[i].y;
+	}
+}
+
+static PyObject *
+Vec2Array_sum(PlanarSeq2Object *self)
+{
+	planar_vec2_t sum;
+
+	Vec2Array_sum_vec(self, &sum);
+	return (PyObject *)PlanarVec2_FromStruct(&sum);
+}
+
+static PyObject *
+Vec2Array_mean(PlanarSeq2Object *self)
+{
+	planar_vec2_t sum;
+
+	if (Py_SIZE(self) == 0) {
+		Py_RETURN_NONE;
+	}
+	Vec2Array_sum_vec(self, &sum);
+	sum.x /= Py_SIZE(self);
+	sum.y /= Py_SIZE(self);
+	return (PyObject *)PlanarVec2_FromStruct(&sum);
+}
+
+static PyObject *
+Vec2Array_min_point(PlanarSeq2Object *self)
+{
+	planar_vec2_t min;
+	Py_ssize_t i;
+
+	if (Py_SIZE(self) == 0) {
+		Py_RETURN_NONE;
+	}
+	min = self->vec[0];
+	for (i = 1; i < Py_SIZE(self); ++i) {
+		min.x = MIN(min.x, self->vec[i].x);
+		min.y = MIN(min.y, self->vec[i].y);
+	}
+	return (PyObject *)PlanarVec2_FromStruct(&min);
+}
+
+static PyObject *
+Vec2Array_max_point(PlanarSeq2Object *self)
+{
+	planar_vec2_t max;
+	Py_ssize_t i;
+
+	if (Py_SIZE(self) == 0) {
+		Py_RETURN_NONE;
+	}
+	max = self->vec[0];
+	for (i = 1; i < Py_SIZE(self); ++i) {
+		max.x = MAX(max.x, self->vec[i].x);
+		max.y = MAX(max.y, self->vec[i].y);
+	}
+	return (PyObject *)PlanarVec2_FromStruct(&max);
+}
+
+static PlanarSeq2Object *
+Vec2Array_new_from_buffer(PyTypeObject *type, PyObject *obj)
+{
+	PlanarSeq2Object *varray;
+	Py_buffer view;
+	Py_ssize_t size, i, xstride, ystride;
+	char *p;
+
+	if (Seq2_GetVec2View(obj, &view, 0, &size, &xstride, &ystride) == -1) {
+		return NULL;
+	}
+	varray = Seq2_New(type, size);
+	if (varray == NULL) {
+		PyBuffer_Release(&view);
+		return NULL;
+	}
+	if (xstride == sizeof(planar_vec2_t) && ystride == sizeof(double)) {
+		/* Contiguous, copy directly */
+		memcpy(varray->vec, view.buf, size * sizeof(planar_vec2_t));
+	} else {
+		p = (char *)view.buf;
+		for (i = 0; i < size; ++i) {
+			varray->vec[i].x = *(double *)p;
+			varray->vec[i].y = *(double *)(p + ystride);
+			p += xstride;
+		}
+	}
+	PyBuffer_Release(&view);
+	return varray;
+}
+
+#if PY_MAJOR_VERSION < 3
+/* mmap objects only support the old buffer interface in Py 2, so wrap
+   their memory in a memoryview by hand. The view holds a reference to
+   the mmap object */
+static PyObject *
+mmap_memoryview(PyObject *mapped, int readonly)
+{
+	Py_buffer info;
+	PyObject *mapping;
+	void *buf;
+	Py_ssize_t len;
+
+	if (readonly) {
+		if (PyObject_AsReadBuffer(
+			mapped, (const void **)&buf, &len) == -1) {
+			return NULL;
+		}
+	} else if (PyObject_AsWriteBuffer(mapped, &buf, &len) == -1) {
+		return NULL;
+	}
+	if (PyBuffer_FillInfo(
+		&info, mapped, buf, len, readonly, PyBUF_FULL_RO) == -1) {
+		return NULL;
+	}
+	mapping = PyMemoryView_FromBuffer(&info);
+	if (mapping == NULL) {
+		PyBuffer_Release(&info);
+	}
+	return mapping;
+}
+#endif
+
+static PlanarSeq2Object *
+Vec2Array_open_mmap(PyTypeObject *type, PyObject *const *args, 
+	Py_ssize_t nargs, PyObject *kwnames)
+{
+	PlanarSeq2Object *varray = NULL;
+	PyObject *values[2], *path, *io = NULL, *mmap = NULL, *file = NULL;
+	PyObject *fileno = NULL, *mapped = NULL, *mapping = NULL, *r;
+	PyObject *map_type = NULL, *map_args = NULL, *map_kwargs = NULL;
+	PyObject *exc_type, *exc_value, *exc_tb;
+	Py_buffer *view;
+	char *mode = "r";
+	char *access_name, *file_mode;
+	Py_ssize_t size;
+
+    static const char *const kwlist[] = {"path", "mode", NULL};
+
+    if (!Planar_ParseKeywords("Vec2Array.open_mmap", args, nargs, kwnames, 
+            kwlist, 1, values)) {
+        return NULL;
+    }
+	path = values[0];
+	if (values[1] != NULL) {
+		mode = (char *)Planar_AsString(values[1]);
+		if (mode == NULL) {
+			if (!PyErr_Occurred()) {
+				PyErr_SetString(PyExc_TypeError,
+					"Vec2Array.open_mmap: expected string for mode");
+			}
+			return NULL;
+		}
+	}
+	if (strcmp(mode, "r") == 0) {
+		access_name = "ACCESS_READ";
+		file_mode = "rb";
+	} else if (strcmp(mode, "r+") == 0) {
+		access_name = "ACCESS_WRITE";
+		file_mode = "r+b";
+	} else if (strcmp(mode, "c") == 0) {
+		access_name = "ACCESS_COPY";
+		file_mode = "rb";
+	} else {
+		PyErr_Format(PyExc_ValueError,
+			"Vec2Array.open_mmap: invalid mode '%.200s', "
+			"expected 'r', 'r+' or 'c'", mode);
+		return NULL;
+	}
+	io = PyImport_ImportModule("io");
+	mmap = PyImport_ImportModule("mmap");
+	if (io == NULL || mmap == NULL) {
+		goto done;
+	}
+	file = PyObject_CallMethod(io, "open", "Os", path, file_mode);
+	if (file == NULL) {
+		goto done;
+	}
+	fileno = PyObject_CallMethod(file, "fileno", NULL);
+	if (fileno == NULL) {
+		goto done;
+	}
+	r = PyObject_CallMethod(file, "seek", "ii", 0, 2);
+	if (r == NULL) {
+		goto done;
+	}
+	size = PyNumber_AsSsize_t(r, PyExc_OverflowError);
+	Py_DECREF(r);
+	if (size == -1 && PyErr_Occurred()) {
+		goto done;
+	}
+	if (size % sizeof(planar_vec2_t) != 0) {
+		PyErr_Format(PyExc_ValueError,
+			"Vec2Array.open_mmap: file size %zd is not a multiple "
+			"of the vector size %d", size, (int)sizeof(planar_vec2_t));
+		goto done;
+	}
+	if (size == 0) {
+		/* Empty files cannot be mapped */
+		varray = Seq2_New(type, 0);
+		goto done;
+	}
+	map_type = PyObject_GetAttrString(mmap, "mmap");
+	map_args = Py_BuildValue("(Oi)", fileno, 0);
+	map_kwargs = PyDict_New();
+	r = PyObject_GetAttrString(mmap, access_name);
+	if (map_type == NULL || map_args == NULL || map_kwargs == NULL || r == NULL
+		|| PyDict_SetItemString(map_kwargs, "access", r) < 0) {
+		Py_XDECREF(r);
+		goto done;
+	}
+	Py_DECREF(r);
+	mapped = PyObject_Call(map_type, map_args, map_kwargs);
+	if (mapped == NULL) {
+		goto done;
+	}
+	/* The memoryview holds an export of the mmap open for the life of
+	   the array, so it cannot be closed or resized underneath us */
+#if PY_MAJOR_VERSION >= 3
+	mapping = PyMemoryView_FromObject(mapped);
+#else
+	mapping = mmap_memoryview(mapped, strcmp(mode, "r") == 0);
+#endif
+	if (mapping == NULL) {
+		goto done;
+	}
+	view = PyMemoryView_GET_BUFFER(mapping);
+	varray = (PlanarSeq2Object *)type->tp_alloc(type, 0);
+	if (varray == NULL) {
+		goto done;
+	}
+	Py_SET_SIZE(varray, view->len / sizeof(planar_vec2_t));
+	varray->vec = (planar_vec2_t *)view->buf;
+	varray->allocated = Py_SIZE(varray);
+	varray->exports = 0;
+	varray->mapping = mapping;
+	mapping = NULL;
+done:
+	if (file != NULL) {
+		/* The mapping does not need the file to remain open. Keep
+		   any pending error, close() may clear it */
+		PyErr_Fetch(&exc_type, &exc_value, &exc_tb);
+		r = PyObject_CallMethod(file, "close", NULL);
+		if (r == NULL) {
+			Py_CLEAR(varray);
+			if (exc_type != NULL) {
+				/* Report the original error */
+				PyErr_Clear();
+			}
+		}
+		Py_XDECREF(r);
+		if (exc_type != NULL) {
+			PyErr_Restore(exc_type, exc_value, exc_tb);
+		}
+	}
+	Py_XDECREF(mapping);
+	Py_XDECREF(mapped);
+	Py_XDECREF(map_kwargs);
+	Py_XDECREF(map_args);
+	Py_XDECREF(map_type);
+	Py_XDECREF(fileno);
+	Py_XDECREF(file);
+	Py_XDECREF(mmap);
+	Py_XDECREF(io);
+	return varray;
+}
+
+Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(Vec2Array_open_mmap)
+
+static PyMethodDef Vec2Array_methods[] = {
+    {"open_mmap", Planar_FASTCALL_KEYWORDS(Vec2Array_open_mmap), 
+		METH_CLASS | PLANAR_METH_FASTCALL_KEYWORDS, 
+		"Create an array backed by a memory mapped file of packed "
+		"x, y double pairs. Mode is 'r' (read-only), 'r+' (read-write) "
+		"or 'c' (copy-on-write)."},
+    {"from_buffer", (PyCFunction)Vec2Array_new_from_buffer, 
+		METH_CLASS | METH_O, 
+		"Create a new array by copying the contents of an object "
+		"supporting the buffer protocol with shape (n, 2) or (2*n,)."},
+    {"append", (PyCFunction)Vec2Array_append, METH_O, 
+		"Append all vectors in iterable to the end of the array."},
+    {"insert", Planar_FASTCALL(Vec2Array_insert), PLANAR_METH_FASTCALL, 
+		"Insert a vector at the specified index."},
+    {"extend", (PyCFunction)Vec2Array_extend, METH_O, 
+		"Extend an array appending vectors from the given sequence."},
+    {"longest", (PyCFunction)Vec2Array_longest, METH_NOARGS, 
+		"Return the vector in the array with the maximum length."},
+    {"shortest", (PyCFunction)Vec2Array_shortest, METH_NOARGS, 
+		"Return the vector in the array with the minimum length."},
+    {"normalize", (PyCFunction)Vec2Array_normalize, METH_NOARGS, 
+		"Normalize the vectors in the array in place."},
+    {"normalized", (PyCFunction)Vec2Array_normalized, METH_NOARGS, 
+		"Create a new array containing normalized vectors calculated "
+        "from this array."},
+    {"clamp", Planar_FASTCALL_KEYWORDS(Vec2Array_clamp), 
+        PLANAR_METH_FASTCALL_KEYWORDS, 
+        "Clamp the length of the vectors in this array in place between "
+        "min_length and max_length."},
+    {"clamped", Planar_FASTCALL_KEYWORDS(Vec2Array_clamped), 
+        PLANAR_METH_FASTCALL_KEYWORDS, 
+        "Create a new array of vectors with lengths clamped between "
+        "min_length and max_length."},
+    {"lengths", (PyCFunction)Vec2Array_lengths, METH_NOARGS, 
+		"Return the lengths of the vectors in the array."},
+    {"lengths2", (PyCFunction)Vec2Array_lengths2, METH_NOARGS, 
+		"Return the squared lengths of the vectors in the array."},
+    {"dots", (PyCFunction)Vec2Array_dots, METH_O, 
+		"Return the dot products of the vectors in the array with a "
+		"single vector, or pairwise with another vector sequence."},
+    {"crosses", (PyCFunction)Vec2Array_crosses, METH_O, 
+		"Return the cross products of the vectors in the array with a "
+		"single vector, or pairwise with another vector sequence."},
+    {"distances_to", (PyCFunction)Vec2Array_distances_to, METH_O, 
+		"Return the distances from the vectors in the array to a "
+		"single point, or pairwise to another vector sequence."},
+    {"sum", (PyCFunction)Vec2Array_sum, METH_NOARGS, 
+		"Return the sum of the vectors in the array."},
+    {"mean", (PyCFunction)Vec2Array_mean, METH_NOARGS, 
+		"Return the mean of the vectors in the array, or None "
+		"if the array is empty."},
+    {"min_point", (PyCFunction)Vec2Array_min_point, METH_NOARGS, 
+		"Return a vector of the minimum x and minimum y values in "
+		"the array, or None if the array is empty."},
+    {"max_point", (PyCFunction)Vec2Array_max_point, METH_NOARGS, 
+		"Return a vector of the maximum x and maximum y values in "
+		"the array, or None if the array is empty."},
+    {NULL, NULL}
+};
+
+/* Arithmetic Operations */
+
+/* Create the proper seq2 result object for arithmetic operations
+   given the two operands and the result sequence
+*/
+static PyObject *
+create_result_seq2(PyObject *a, PyObject *b, PyObject *seq)
+{
+	if (!PlanarVec2Array_Check(b) && PlanarSeq2_Check(b)) {
+		return call_from_points(b, seq);
+	} else if (!PlanarVec2Array_Check(a) && PlanarSeq2_Check(a)) {
+		return call_from_points(a, seq);
+	} else if (!PlanarVec2Array_CheckExact(b) && PlanarSeq2_Check(b)) {
+		return call_from_points(b, seq);
+	} else if (!PlanarVec2Array_CheckExact(a) && PlanarSeq2_Check(a)) {
+		return call_from_points(a, seq);
+	} else {
+		Py_INCREF(seq);
+		return seq;
+	}
+}
+
+static PyObject *
+Vec2Array_add(PyObject *a, PyObject *b, PlanarSeq2Object *dst)
+{
+	Py_ssize_t size, i;
+	double x, y;
+	PlanarSeq2Object *seq2_a, *seq2_b, *varray;
+
+	assert(dst == NULL || PlanarSeq2_Check(dst));
+	if (PlanarSeq2_Check(a) && PlanarSeq2_Check(b)) {
+		size = Py_SIZE(a);
+		if (Py_SIZE(b) != size) {
+			PyErr_SetString(PyExc_ValueError,
+				"cannot add arrays with different lengths");
+			return NULL;
+		}
+		if (dst == NULL) {
+			dst = Seq2_New(PLANAR_TYPE(Vec2Array), size);
+			if (dst == NULL) {
+				return NULL;
+			}
+		} else {
+			Py_INCREF(dst);
+		}
+		seq2_a = (PlanarSeq2Object *)a;
+		seq2_b = (PlanarSeq2Object *)b;
+		for (i = 0; i < size; ++i) {
+			dst->vec[i].x = seq2_a->vec[i].x + seq2_b->vec[i].x;
+			dst->vec[i].y = seq2_a->vec[i].y + seq2_b->vec[i].y;
+		}
+		return (PyObject *)dst;
+	} else if (PlanarVec2Array_Check(a) && PlanarVec2_Parse(b, &x, &y)) {
+		varray = (PlanarSeq2Object *)a;
+	} else if (PlanarVec2Array_Check(b) && PlanarVec2_Parse(a, &x, &y)) {
+		varray = (PlanarSeq2Object *)b;
+	} else {
+        PyErr_Clear();
+        Py_INCREF(Py_NotImplemented);
+        return Py_NotImplemented;
+    }
+	
+	/* Add vector to sequence */
+	if (dst == NULL) {
+		dst = Seq2_New(PLANAR_TYPE(Vec2Array), Py_SIZE(varray));
+		if (dst == NULL) {
+			return NULL;
+		}
+	} else {
+		Py_INCREF(dst);
+	}
+	for (i = 0; i < Py_SIZE(varray); ++i) {
+		dst->vec[i].x = varray->vec[i].x + x;
+		dst->vec[i].y = varray->vec[i].y + y;
+	}
+	PyErr_Clear();
+	return (PyObject *)dst;
+}
+
+static PyObject *
+Vec2Array__add__(PyObject *a, PyObject *b)
+{
+	PyObject *varray, *result;
+
+	varray = Vec2Array_add(a, b, NULL);
+	if (varray == NULL || varray == Py_NotImplemented) {
+		return varray;
+	}
+	assert(PlanarVec2Array_Check(varray));
+	result = create_result_seq2(a, b, varray);
+	Py_DECREF(varray);
+	return result;
+}
+
+static PyObject *
+Vec2Array__iadd__(PyObject *a, PyObject *b)
+{
+	if (PlanarVec2Array_Check(a)) {
+		if (!Vec2Array_CheckWritable((PlanarSeq2Object *)a)) {
+			return NULL;
+		}
+		return Vec2Array_add(a, b, (PlanarSeq2Object *)a);
+	} else {
+        Py_INCREF(Py_NotImplemented);
+        return Py_NotImplemented;
 	}
 }
 
@@ -2055,7 +2750,7 @@ Vec2Array_sub(PyObject *a, PyObject *b, PlanarSeq2Object *dst)
 			return NULL;
 		}
 		if (dst == NULL) {
-			dst = Seq2_New(&PlanarVec2ArrayType, size);
+			dst = Seq2_New(PLANAR_TYPE(Vec2Array), size);
 			if (dst == NULL) {
 				return NULL;
 			}
@@ -2073,7 +2768,7 @@ Vec2Array_sub(PyObject *a, PyObject *b, PlanarSeq2Object *dst)
 		varray = (PlanarSeq2Object *)a;
 		/* Subtract vector from sequence */
 		if (dst == NULL) {
-			dst = Seq2_New(&PlanarVec2ArrayType, Py_SIZE(varray));
+			dst = Seq2_New(PLANAR_TYPE(Vec2Array), Py_SIZE(varray));
 			if (dst == NULL) {
 				return NULL;
 			}
@@ -2111,6 +2806,9 @@ static PyObject *
 Vec2Array__isub__(PyObject *a, PyObject *b)
 {
 	if (PlanarVec2Array_Check(a)) {
+		if (!Vec2Array_CheckWritable((PlanarSeq2Object *)a)) {
+			return NULL;
+		}
 		return Vec2Array_sub(a, b, (PlanarSeq2Object *)a);
 	} else {
         Py_INCREF(Py_NotImplemented);
@@ -2135,7 +2833,7 @@ Vec2Array_mul(PyObject *a, PyObject *b, PlanarSeq2Object *dst)
 			return NULL;
 		}
 		if (dst == NULL) {
-			dst = Seq2_New(&PlanarVec2ArrayType, size);
+			dst = Seq2_New(PLANAR_TYPE(Vec2Array), size);
 			if (dst == NULL) {
 				return NULL;
 			}
@@ -2168,7 +2866,7 @@ Vec2Array_mul(PyObject *a, PyObject *b, PlanarSeq2Object *dst)
 	
 	/* Multiply sequence by scalar or vector */
 	if (dst == NULL) {
-		dst = Seq2_New(&PlanarVec2ArrayType, Py_SIZE(varray));
+		dst = Seq2_New(PLANAR_TYPE(Vec2Array), Py_SIZE(varray));
 		if (dst == NULL) {
 			return NULL;
 		}
@@ -2209,7 +2907,10 @@ Vec2Array__imul__(PyObject *a, PyObject *b)
 
 	if (PlanarVec2Array_Check(a) && 
 		(PlanarVec2Array_Check(b) || !PlanarSeq2_Check(b))) {
-		varray = Vec2Array_mul(a, b, (PlanarSeq2Object *)a);
+		if (!Vec2Array_CheckWritable((PlanarSeq2Object *)a)) {
+			return NULL;
+		}
+		varray = Vec2Array_mul(a, b, (PlanarSeq2Object *)a);
 		if (varray == NULL && !PyErr_Occurred()) {
 			varray = Seq2__imul__(a, b);
 		}
@@ -2246,7 +2947,7 @@ Vec2Array_div(PyObject *a, PyObject *b, PlanarSeq2Object *dst)
 			}
 		}
 		if (dst == NULL) {
-			dst = Seq2_New(&PlanarVec2ArrayType, size);
+			dst = Seq2_New(PLANAR_TYPE(Vec2Array), size);
 			if (dst == NULL) {
 				return NULL;
 			}
@@ -2275,7 +2976,7 @@ Vec2Array_div(PyObject *a, PyObject *b, PlanarSeq2Object *dst)
 		goto div_by_zero;
 	}
 	if (dst == NULL) {
-		dst = Seq2_New(&PlanarVec2ArrayType, Py_SIZE(varray));
+		dst = Seq2_New(PLANAR_TYPE(Vec2Array), Py_SIZE(varray));
 		if (dst == NULL) {
 			return NULL;
 		}
@@ -2314,6 +3015,9 @@ Vec2Array__itruediv__(PyObject *a, PyObject *b)
 {
 	if (PlanarVec2Array_Check(a) && 
 		(PlanarVec2Array_Check(b) || !PlanarSeq2_Check(b))) {
+		if (!Vec2Array_CheckWritable((PlanarSeq2Object *)a)) {
+			return NULL;
+		}
 		return Vec2Array_div(a, b, (PlanarSeq2Object *)a);
 	} else {
 		PyErr_Format(PyExc_TypeError,
@@ -2359,6 +3063,9 @@ Vec2Array__ifloordiv__(PyObject *a, PyObject *b)
 
 	if (PlanarVec2Array_Check(a) && 
 		(PlanarVec2Array_Check(b) || !PlanarSeq2_Check(b))) {
+		if (!Vec2Array_CheckWritable((PlanarSeq2Object *)a)) {
+			return NULL;
+		}
 		varray = Vec2Array_div(a, b, (PlanarSeq2Object *)a);
 		if (varray != NULL && varray != Py_NotImplemented) {
 			Vec2Array_floor((PlanarSeq2Object *)varray);
@@ -2379,7 +3086,7 @@ Vec2Array_neg(PlanarSeq2Object *self)
 	PlanarSeq2Object *varray;
 	Py_ssize_t i;
 
-	varray = Seq2_New(&PlanarVec2ArrayType, Py_SIZE(self));
+	varray = Seq2_New(PLANAR_TYPE(Vec2Array), Py_SIZE(self));
 	if (varray == NULL) {
 		return NULL;
 	}
@@ -2455,6 +3162,45 @@ static PyNumberMethods Vec2Array_as_number = {
     0,       /* unaryfunc nb_index */
 };
 
+/* Buffer interface */
+
+static int
+Vec2Array_getbuffer(PlanarSeq2Object *self, Py_buffer *view, int flags)
+{
+	int readonly = self->mapping != NULL
+		&& PyMemoryView_GET_BUFFER(self->mapping)->readonly;
+
+	int result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = Seq2_GetBuffer((PyObject *)self, self->vec, Py_SIZE(self), 
+		self->buffer_shape, readonly, view, flags);
+	if (result == 0) {
+		self->exports++;
+	}
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static void
+Vec2Array_releasebuffer(PlanarSeq2Object *self, Py_buffer *view)
+{
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	self->exports--;
+	Planar_END_CRITICAL_SECTION();
+}
+
+static PyBufferProcs Vec2Array_as_buffer = {
+#if PY_MAJOR_VERSION < 3
+	0,		/* bf_getreadbuffer */
+	0,		/* bf_getwritebuffer */
+	0,		/* bf_getsegcount */
+	0,		/* bf_getcharbuffer */
+#endif
+	(getbufferproc)Vec2Array_getbuffer,	/* bf_getbuffer */
+	(releasebufferproc)Vec2Array_releasebuffer, /* bf_releasebuffer */
+};
+
 PyDoc_STRVAR(Vec2Array__doc__, "Dynamic vector array");
 
 PyTypeObject PlanarVec2ArrayType = {
@@ -2477,8 +3223,9 @@ PyTypeObject PlanarVec2ArrayType = {
 	(reprfunc)Vec2Array__repr__, /*tp_str*/
 	0,                      /*tp_getattro*/
 	0,                      /*tp_setattro*/
-	0,                      /*tp_as_buffer*/
-	Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_CHECKTYPES,     /*tp_flags*/
+	&Vec2Array_as_buffer,   /*tp_as_buffer*/
+	Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_CHECKTYPES
+		| Py_TPFLAGS_HAVE_NEWBUFFER,   /*tp_flags*/
 	Vec2Array__doc__,       /*tp_doc*/
 	0,                      /*tp_traverse*/
 	0,                      /*tp_clear*/
@@ -2501,3 +3248,655 @@ PyTypeObject PlanarVec2ArrayType = {
 	0,                      /*tp_is_gc*/
 };
 
+
+/***************************************************************************/
+
+/* Single precision vector array */
+
+static PlanarVec2Array32Object *
+Vec2Array32_New(PyTypeObject *type, Py_ssize_t size)
+{
+	PlanarVec2Array32Object *varray;
+
+	varray = (PlanarVec2Array32Object *)type->tp_alloc(type, 0);
+	if (varray == NULL) {
+		return NULL;
+	}
+	varray->vec = PyMem_Malloc((size > 0 ? size : 1) * sizeof(planar_vec2f_t));
+	if (varray->vec == NULL) {
+		Py_DECREF(varray);
+		return (PlanarVec2Array32Object *)PyErr_NoMemory();
+	}
+	Py_SET_SIZE(varray, size);
+	varray->allocated = size;
+	varray->exports = 0;
+	return varray;
+}
+
+static int
+Vec2Array32_resize(PlanarVec2Array32Object *self, Py_ssize_t newsize) 
+{
+	Py_ssize_t new_allocated;
+	void *realloc_vec;
+
+	if (newsize != Py_SIZE(self) && self->exports > 0) {
+		PyErr_SetString(PyExc_BufferError,
+			"Existing exports of data: Vec2Array32 cannot be resized");
+		return -1;
+	}
+	if (self->allocated >= newsize && newsize >= (self->allocated >> 1)) {
+		Py_SET_SIZE(self, newsize);
+		return 0;
+	}
+	/* Same growth pattern as Vec2Array */
+	new_allocated = (newsize >> 3) + (newsize < 9 ? 3 : 6);
+	if (new_allocated > PY_SIZE_MAX - newsize) {
+		PyErr_NoMemory();
+		return -1;
+	} else {
+		new_allocated += newsize;
+	}
+	realloc_vec = PyMem_Realloc(self->vec, 
+		(new_allocated > 0 ? new_allocated : 1) * sizeof(planar_vec2f_t));
+	if (realloc_vec == NULL) {
+		PyErr_NoMemory();
+		return -1;
+	}
+	self->vec = (planar_vec2f_t *)realloc_vec;
+	self->allocated = new_allocated;
+	Py_SET_SIZE(self, newsize);
+	return 0;
+}
+
+static PyObject *
+vec2array32_extend(PlanarVec2Array32Object *self, PyObject *vectors) 
+{
+	Py_ssize_t size, j;
+	Py_ssize_t i = Py_SIZE(self);
+	planar_vec2_t *src;
+	double x, y;
+
+	if (PlanarVec2Array32_Check(vectors)) {
+		size = Py_SIZE(vectors);
+		if (Vec2Array32_resize(self, i + size) == -1) {
+			return NULL;
+		}
+		memmove(&self->vec[i], ((PlanarVec2Array32Object *)vectors)->vec, 
+			sizeof(planar_vec2f_t) * size);
+    } else if (PlanarSeq2_Check(vectors)) {
+		/* Convert from double precision (optimized) */
+		size = Py_SIZE(vectors);
+		if (Vec2Array32_resize(self, i + size) == -1) {
+			return NULL;
+		}
+		src = ((PlanarSeq2Object *)vectors)->vec;
+		for (j = 0; j < size; ++j, ++i) {
+			self->vec[i].x = (float)src[j].x;
+			self->vec[i].y = (float)src[j].y;
+		}
+    } else {
+		vectors = PySequence_Fast(vectors, 
+			"expected iterable of Vec2 objects");
+		if (vectors == NULL) {
+			return NULL;
+		}
+		size = PySequence_Fast_GET_SIZE(vectors);
+		if (Vec2Array32_resize(self, i + size) == -1) {
+			Py_DECREF(vectors);
+			return NULL;
+		}
+		for (j = 0; j < size; ++j, ++i) {
+			if (!PlanarVec2_Parse(PySequence_Fast_GET_ITEM(vectors, j), 
+				&x, &y)) {
+				PyErr_SetString(PyExc_TypeError,
+					"expected iterable of Vec2 objects");
+				Py_SET_SIZE(self, i - j);
+				Py_DECREF(vectors);
+				return NULL;
+			}
+			self->vec[i].x = (float)x;
+			self->vec[i].y = (float)y;
+		}
+		Py_DECREF(vectors);
+    }
+	Py_RETURN_NONE;
+}
+
+static PlanarVec2Array32Object *
+Vec2Array32_pynew(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+{
+	PlanarVec2Array32Object *varray;
+	PyObject *vectors = NULL, *result;
+
+    static char *kwlist[] = {"vectors", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|O:Vec2Array32", kwlist,
+		&vectors)) {
+		return NULL;
+	}
+	varray = Vec2Array32_New(type, 0);
+	if (varray == NULL || vectors == NULL) {
+		return varray;
+	}
+	result = vec2array32_extend(varray, vectors);
+	if (result == NULL) {
+		Py_DECREF(varray);
+		return NULL;
+	}
+	Py_DECREF(result);
+	return varray;
+}
+
+static void
+Vec2Array32_dealloc(PlanarVec2Array32Object *self)
+{
+	if (self->vec != NULL) {
+		PyMem_Free(self->vec);
+		self->vec = NULL;
+	}
+    Planar_FreeObject((PyObject *)self);
+}
+
+static PyObject *
+Vec2Array32_new_from_points(PyTypeObject *type, PyObject *points)
+{
+	return PyObject_CallFunctionObjArgs((PyObject *)type, points, NULL);
+}
+
+static PlanarVec2Array32Object *
+Vec2Array32_new_from_buffer(PyTypeObject *type, PyObject *obj)
+{
+	PlanarVec2Array32Object *varray;
+	Py_buffer view;
+	Py_ssize_t size, i, xstride, ystride;
+	char *p;
+
+	if (Planar_GetBuffer(obj, &view, PyBUF_STRIDES | PyBUF_FORMAT) == -1) {
+		return NULL;
+	}
+	if (view.itemsize != sizeof(float) || view.format == NULL
+		|| (strcmp(view.format, "f") != 0 
+			&& strcmp(view.format, "@f") != 0
+			&& strcmp(view.format, "=f") != 0)) {
+		PyErr_Format(PyExc_TypeError,
+			"Expected buffer of floats, got format '%.20s'",
+			view.format != NULL ? view.format : "B");
+		PyBuffer_Release(&view);
+		return NULL;
+	}
+	if (view.ndim == 2 && view.shape[1] == 2) {
+		size = view.shape[0];
+		xstride = view.strides[0];
+		ystride = view.strides[1];
+	} else if (view.ndim == 1 && view.shape[0] % 2 == 0) {
+		size = view.shape[0] / 2;
+		xstride = view.strides[0] * 2;
+		ystride = view.strides[0];
+	} else {
+		PyErr_SetString(PyExc_ValueError,
+			"Expected buffer of shape (n, 2) or (2*n,)");
+		PyBuffer_Release(&view);
+		return NULL;
+	}
+	varray = Vec2Array32_New(type, size);
+	if (varray == NULL) {
+		PyBuffer_Release(&view);
+		return NULL;
+	}
+	if (xstride == sizeof(planar_vec2f_t) && ystride == sizeof(float)) {
+		memcpy(varray->vec, view.buf, size * sizeof(planar_vec2f_t));
+	} else {
+		p = (char *)view.buf;
+		for (i = 0; i < size; ++i) {
+			varray->vec[i].x = *(float *)p;
+			varray->vec[i].y = *(float *)(p + ystride);
+			p += xstride;
+		}
+	}
+	PyBuffer_Release(&view);
+	return varray;
+}
+
+static PlanarSeq2Object *
+Vec2Array32_to_array(PlanarVec2Array32Object *self)
+{
+	PlanarSeq2Object *varray;
+	Py_ssize_t i;
+
+	varray = Seq2_New(PLANAR_TYPE(Vec2Array), Py_SIZE(self));
+	if (varray == NULL) {
+		return NULL;
+	}
+	for (i = 0; i < Py_SIZE(self); ++i) {
+		varray->vec[i].x = self->vec[i].x;
+		varray->vec[i].y = self->vec[i].y;
+	}
+	return varray;
+}
+
+static PyObject *
+vec2array32_append(PlanarVec2Array32Object *self, PyObject *vector) 
+{
+	double x, y;
+	Py_ssize_t i = Py_SIZE(self);
+
+	if (!PlanarVec2_Parse(vector, &x, &y)) {
+		if (!PyErr_Occurred()) {
+			PyErr_Format(PyExc_TypeError, 
+				"Cannot append %.200s to %.200s",
+				Py_TYPE(vector)->tp_name, Py_TYPE(self)->tp_name);
+	    }
+		return NULL;
+	}
+	if (Vec2Array32_resize(self, i + 1) == -1) {
+		return NULL;
+	}
+	self->vec[i].x = (float)x;
+	self->vec[i].y = (float)y;
+	Py_RETURN_NONE;
+}
+
+/* Like Vec2Array, resizing methods hold the array's critical section */
+
+static PyObject *
+Vec2Array32_append(PlanarVec2Array32Object *self, PyObject *vector) 
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = vec2array32_append(self, vector);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static PyObject *
+Vec2Array32_extend(PlanarVec2Array32Object *self, PyObject *vectors) 
+{
+	PyObject *result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = vec2array32_extend(self, vectors);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static PyObject *
+Vec2Array32_copy(PlanarVec2Array32Object *self)
+{
+	return PyObject_CallFunctionObjArgs(
+		(PyObject *)Py_TYPE(self), (PyObject *)self, NULL);
+}
+
+static PyObject *
+Vec2Array32_almost_equals(PlanarVec2Array32Object *self, PyObject *other)
+{
+    double dx, dy;
+    Py_ssize_t i;
+	planar_vec2f_t *ov;
+
+	if (Py_TYPE(self) != Py_TYPE(other) || Py_SIZE(self) != Py_SIZE(other)) {
+		Py_RETURN_FALSE;
+	}
+	ov = ((PlanarVec2Array32Object *)other)->vec;
+	for (i = 0; i < Py_SIZE(self); ++i) {
+		dx = (double)self->vec[i].x - ov[i].x;
+		dy = (double)self->vec[i].y - ov[i].y;
+		if (dx*dx + dy*dy > PLANAR_EPSILON2) {
+			Py_RETURN_FALSE;
+		}
+	}
+	Py_RETURN_TRUE;
+}
+
+static PyObject *
+Vec2Array32_compare(PyObject *a, PyObject *b, int op)
+{
+	int equal;
+
+	if (op != Py_EQ && op != Py_NE) {
+		RETURN_NOT_IMPLEMENTED;
+	}
+	equal = PlanarVec2Array32_Check(a) && Py_TYPE(a) == Py_TYPE(b)
+		&& Py_SIZE(a) == Py_SIZE(b)
+		&& memcmp(((PlanarVec2Array32Object *)a)->vec, 
+			((PlanarVec2Array32Object *)b)->vec, 
+			Py_SIZE(a) * sizeof(planar_vec2f_t)) == 0;
+	if (equal == (op == Py_EQ)) {
+		Py_RETURN_TRUE;
+	} else {
+		Py_RETURN_FALSE;
+	}
+}
+
+static PyObject *
+Vec2Array32_reduce_ex(PlanarVec2Array32Object *self, PyObject *args)
+{
+	return Seq2_Reduce((PyObject *)self, args, NULL);
+}
+
+static PlanarVec2Array32Object *
+Vec2Array32_new_from_bytes(PyTypeObject *type, PyObject *data)
+{
+	PlanarVec2Array32Object *varray;
+	Py_buffer view;
+	Py_ssize_t size;
+
+	size = Seq2_GetBytesView(data, &view, sizeof(planar_vec2f_t));
+	if (size == -1) {
+		return NULL;
+	}
+	varray = Vec2Array32_New(type, size);
+	if (varray != NULL) {
+		memcpy(varray->vec, view.buf, size * sizeof(planar_vec2f_t));
+	}
+	PyBuffer_Release(&view);
+	return varray;
+}
+
+static PyMethodDef Vec2Array32_methods[] = {
+    {"from_points", (PyCFunction)Vec2Array32_new_from_points, 
+		METH_CLASS | METH_O, 
+		"Create a new array from an iterable of points."},
+    {"from_buffer", (PyCFunction)Vec2Array32_new_from_buffer, 
+		METH_CLASS | METH_O, 
+		"Create a new array by copying the contents of an object "
+		"supporting the buffer protocol containing floats with "
+		"shape (n, 2) or (2*n,)."},
+    {"to_array", (PyCFunction)Vec2Array32_to_array, METH_NOARGS, 
+		"Return a double precision copy of this array."},
+    {"append", (PyCFunction)Vec2Array32_append, METH_O, 
+		"Append a vector to the end of the array."},
+    {"extend", (PyCFunction)Vec2Array32_extend, METH_O, 
+		"Append all vectors in iterable to the end of the array."},
+    {"almost_equals", (PyCFunction)Vec2Array32_almost_equals, METH_O, 
+		"Compare for approximate equality."},
+    {"_from_bytes", (PyCFunction)Vec2Array32_new_from_bytes, 
+		METH_CLASS | METH_O, 
+		"PRIVATE: Create a new array from packed vector data"},
+    {"__copy__", (PyCFunction)Vec2Array32_copy, METH_NOARGS, NULL}, 
+    {"__deepcopy__", (PyCFunction)Vec2Array32_copy, METH_O, NULL}, 
+    {"__reduce_ex__", (PyCFunction)Vec2Array32_reduce_ex, METH_VARARGS, NULL}, 
+    {NULL, NULL}
+};
+
+/* Sequence Methods */
+
+static Py_ssize_t
+Vec2Array32_length(PlanarVec2Array32Object *self)
+{
+    return Py_SIZE(self);
+}
+
+static PyObject *
+Vec2Array32_getitem(PlanarVec2Array32Object *self, Py_ssize_t index)
+{
+    if (index >= 0 && index < Py_SIZE(self)) {
+        return (PyObject *)PlanarVec2_FromDoubles(
+			self->vec[index].x, self->vec[index].y);
+    }
+    PyErr_Format(PyExc_IndexError, "index %d out of range", (int)index);
+    return NULL;
+}
+
+static int
+Vec2Array32_assitem(PlanarVec2Array32Object *self, Py_ssize_t index, 
+	PyObject *v)
+{
+    double x, y;
+
+    if (v == NULL) {
+		PyErr_Format(PyExc_TypeError, 
+			"Cannot delete items from %.200s", Py_TYPE(self)->tp_name);
+		return -1;
+	}
+    if (index < 0 || index >= Py_SIZE(self)) {
+		PyErr_Format(PyExc_IndexError, 
+			"assignment index %d out of range", (int)index);
+		return -1;
+	}
+	if (!PlanarVec2_Parse(v, &x, &y)) {
+		if (!PyErr_Occurred()) {
+			PyErr_Format(PyExc_TypeError, 
+				"Cannot assign %.200s into %.200s",
+				Py_TYPE(v)->tp_name, Py_TYPE(self)->tp_name);
+		}
+		return -1;
+	}
+	self->vec[index].x = (float)x;
+	self->vec[index].y = (float)y;
+	return 0;
+}
+
+static PySequenceMethods Vec2Array32_as_sequence = {
+	(lenfunc)Vec2Array32_length,	/* sq_length */
+	0,		/*sq_concat*/
+	0,		/*sq_repeat*/
+	(ssizeargfunc)Vec2Array32_getitem,		/*sq_item*/
+	0,		/* sq_slice */
+	(ssizeobjargproc)Vec2Array32_assitem,	/* sq_ass_item */
+};
+
+/* Arithmetic Operations */
+
+/* Transform the vectors in src into dst, which may be the same array.
+   The transform is calculated in double precision */
+static void
+Vec2Array32_transform(PlanarVec2Array32Object *src, 
+	PlanarVec2Array32Object *dst, PlanarAffineObject *t)
+{
+	const double ta = t->a, tb = t->b, tc = t->c;
+	const double td = t->d, te = t->e, tf = t->f;
+	planar_vec2f_t *srcv = src->vec, *dstv = dst->vec;
+	Py_ssize_t size = Py_SIZE(src);
+	double x, y;
+
+	while (size--) {
+		x = srcv->x;
+		y = srcv->y;
+		dstv->x = (float)(x*ta + y*td + tc);
+		dstv->y = (float)(x*tb + y*te + tf);
+		++srcv;
+		++dstv;
+	}
+}
+
+static PyObject *
+Vec2Array32__mul__(PyObject *a, PyObject *b)
+{
+	PlanarVec2Array32Object *src, *dst;
+	PlanarAffineObject *t;
+
+    if (PlanarVec2Array32_Check(a) && PlanarAffine_Check(b)) {
+		src = (PlanarVec2Array32Object *)a;
+		t = (PlanarAffineObject *)b;
+    } else if (PlanarVec2Array32_Check(b) && PlanarAffine_Check(a)) {
+		src = (PlanarVec2Array32Object *)b;
+		t = (PlanarAffineObject *)a;
+    } else {
+		RETURN_NOT_IMPLEMENTED;
+    }
+	dst = Vec2Array32_New(Py_TYPE(src), Py_SIZE(src));
+	if (dst == NULL) {
+		return NULL;
+	}
+	Vec2Array32_transform(src, dst, t);
+	return (PyObject *)dst;
+}
+
+static PyObject *
+Vec2Array32__imul__(PyObject *a, PyObject *b)
+{
+    if (PlanarVec2Array32_Check(a) && PlanarAffine_Check(b)) {
+		Vec2Array32_transform((PlanarVec2Array32Object *)a, 
+			(PlanarVec2Array32Object *)a, (PlanarAffineObject *)b);
+		Py_INCREF(a);
+		return a;
+    } 
+	RETURN_NOT_IMPLEMENTED;
+}
+
+static PyNumberMethods Vec2Array32_as_number = {
+    0,       /* binaryfunc nb_add */
+    0,       /* binaryfunc nb_subtract */
+    (binaryfunc)Vec2Array32__mul__,       /* binaryfunc nb_multiply */
+#if PY_MAJOR_VERSION < 3
+    0,       /* binaryfunc nb_div */
+#endif
+    0,       /* binaryfunc nb_remainder */
+    0,       /* binaryfunc nb_divmod */
+    0,       /* ternaryfunc nb_power */
+    0,       /* unaryfunc nb_negative */
+    0,       /* unaryfunc nb_positive */
+    0,       /* unaryfunc nb_absolute */
+    0,       /* inquiry nb_bool */
+    0,       /* unaryfunc nb_invert */
+    0,       /* binaryfunc nb_lshift */
+    0,       /* binaryfunc nb_rshift */
+    0,       /* binaryfunc nb_and */
+    0,       /* binaryfunc nb_xor */
+    0,       /* binaryfunc nb_or */
+#if PY_MAJOR_VERSION < 3
+    0,       /* coercion nb_coerce */
+#endif
+    0,       /* unaryfunc nb_int */
+    0,       /* void *nb_reserved */
+    0,       /* unaryfunc nb_float */
+#if PY_MAJOR_VERSION < 3
+    0,       /* binaryfunc nb_oct */
+    0,       /* binaryfunc nb_hex */
+#endif
+
+    0,       /* binaryfunc nb_inplace_add */
+    0,       /* binaryfunc nb_inplace_subtract */
+    (binaryfunc)Vec2Array32__imul__,       /* binaryfunc nb_inplace_multiply */
+#if PY_MAJOR_VERSION < 3
+    0,       /* binaryfunc nb_inplace_divide */
+#endif
+    0,       /* binaryfunc nb_inplace_remainder */
+    0,       /* ternaryfunc nb_inplace_power */
+    0,       /* binaryfunc nb_inplace_lshift */
+    0,       /* binaryfunc nb_inplace_rshift */
+    0,       /* binaryfunc nb_inplace_and */
+    0,       /* binaryfunc nb_inplace_xor */
+    0,       /* binaryfunc nb_inplace_or */
+
+    0,       /* binaryfunc nb_floor_divide */
+    0,       /* binaryfunc nb_true_divide */
+    0,       /* binaryfunc nb_inplace_floor_divide */
+    0,       /* binaryfunc nb_inplace_true_divide */
+
+    0,       /* unaryfunc nb_index */
+};
+
+/* Buffer interface */
+
+static int
+vec2array32_getbuffer(PlanarVec2Array32Object *self, Py_buffer *view, 
+	int flags)
+{
+	Seq2_SetBufferShape(view, self->buffer_shape, Py_SIZE(self), 
+		sizeof(float), flags);
+	view->buf = self->vec;
+	view->obj = (PyObject *)self;
+	Py_INCREF(self);
+	view->len = Py_SIZE(self) * sizeof(planar_vec2f_t);
+	view->readonly = 0;
+	view->itemsize = sizeof(float);
+	view->format = (flags & PyBUF_FORMAT) == PyBUF_FORMAT ? "f" : NULL;
+	view->suboffsets = NULL;
+	self->exports++;
+	return 0;
+}
+
+static int
+Vec2Array32_getbuffer(PlanarVec2Array32Object *self, Py_buffer *view, 
+	int flags)
+{
+	int result;
+
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	result = vec2array32_getbuffer(self, view, flags);
+	Planar_END_CRITICAL_SECTION();
+	return result;
+}
+
+static void
+Vec2Array32_releasebuffer(PlanarVec2Array32Object *self, Py_buffer *view)
+{
+	Planar_BEGIN_CRITICAL_SECTION(self);
+	self->exports--;
+	Planar_END_CRITICAL_SECTION();
+}
+
+static PyBufferProcs Vec2Array32_as_buffer = {
+#if PY_MAJOR_VERSION < 3
+	0,		/* bf_getreadbuffer */
+	0,		/* bf_getwritebuffer */
+	0,		/* bf_getsegcount */
+	0,		/* bf_getcharbuffer */
+#endif
+	(getbufferproc)Vec2Array32_getbuffer,	/* bf_getbuffer */
+	(releasebufferproc)Vec2Array32_releasebuffer, /* bf_releasebuffer */
+};
+
+static PyObject *
+Vec2Array32__repr__(PlanarVec2Array32Object *self)
+{
+	PlanarSeq2Object *varray;
+	PyObject *repr;
+
+	varray = Vec2Array32_to_array(self);
+	if (varray == NULL) {
+		return NULL;
+	}
+	repr = Seq2__repr__(varray, "Vec2Array32", NULL);
+	Py_DECREF(varray);
+	return repr;
+}
+
+PyDoc_STRVAR(Vec2Array32__doc__, "Compact single precision vector array");
+
+PyTypeObject PlanarVec2Array32Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+	"planar.Vec2Array32",		/*tp_name*/
+	sizeof(PlanarVec2Array32Object),	/*tp_basicsize*/
+	0,		/*tp_itemsize*/
+	/* methods */
+	(destructor)Vec2Array32_dealloc, /*tp_dealloc*/
+	0,			       /*tp_print*/
+	0,                      /*tp_getattr*/
+	0,                      /*tp_setattr*/
+	0,		        /*tp_compare*/
+	(reprfunc)Vec2Array32__repr__, /*tp_repr*/
+	&Vec2Array32_as_number,        /*tp_as_number*/
+	&Vec2Array32_as_sequence,      /*tp_as_sequence*/
+	0,	                /*tp_as_mapping*/
+	PyObject_HashNotImplemented, /*tp_hash*/
+	0,                      /*tp_call*/
+	(reprfunc)Vec2Array32__repr__, /*tp_str*/
+	0,                      /*tp_getattro*/
+	0,                      /*tp_setattro*/
+	&Vec2Array32_as_buffer,   /*tp_as_buffer*/
+	Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_CHECKTYPES
+		| Py_TPFLAGS_HAVE_NEWBUFFER,     /*tp_flags*/
+	Vec2Array32__doc__,       /*tp_doc*/
+	0,                      /*tp_traverse*/
+	0,                      /*tp_clear*/
+	Vec2Array32_compare,           /*tp_richcompare*/
+	0,                      /*tp_weaklistoffset*/
+	0,                      /*tp_iter*/
+	0,                      /*tp_iternext*/
+	Vec2Array32_methods,           /*tp_methods*/
+	0,                      /*tp_members*/
+	0,                      /*tp_getset*/
+	0,                      /*tp_base*/
+	0,                      /*tp_dict*/
+	0,                      /*tp_descr_get*/
+	0,                      /*tp_descr_set*/
+	0,                      /*tp_dictoffset*/
+	0,                      /*tp_init*/
+	0,    /*tp_alloc*/
+	(newfunc)Vec2Array32_pynew,      /*tp_new*/
+	0,                      /*tp_free*/
+	0,                      /*tp_is_gc*/
+};
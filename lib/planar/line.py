@@ -29,6 +29,10 @@
 from __future__ import division
 import planar
 import math
+import heapq
+from planar.util import SweepStatus
+
+_INFINITY = float('inf')
 
 
 class _LinearGeometry(object):
@@ -67,6 +71,47 @@ class _LinearGeometry(object):
         self._normal = normal
         self._direction = normal.perpendicular()
 
+    def intersection(self, other):
+        """Return the point where this shape and another line, ray or line
+        segment intersect, or None if they do not intersect. Parallel
+        shapes, including collinear shapes that overlap, are considered not
+        to intersect. Intersections within ``EPSILON`` of an endpoint
+        return that endpoint exactly.
+
+        :param other: The line, ray or line segment to intersect.
+        :rtype: Vec2
+        """
+        p1, d1, lo1, hi1 = self._extent()
+        try:
+            p2, d2, lo2, hi2 = other._extent()
+        except AttributeError:
+            raise TypeError("Expected Line, Ray or LineSegment")
+        denom = d1.cross(d2)
+        if -planar.EPSILON < denom < planar.EPSILON:
+            return None
+        to_other = p2 - p1
+        t = to_other.cross(d2) / denom
+        u = to_other.cross(d1) / denom
+        if lo1 <= t <= hi1 and lo2 <= u <= hi2:
+            for s, p, d, lo, hi in (
+                (t, p1, d1, lo1, hi1), (u, p2, d2, lo2, hi2)):
+                if s - lo < planar.EPSILON:
+                    return p + d * lo
+                if hi - s < planar.EPSILON:
+                    return p + d * hi
+            return p1 + d1 * t
+        # The containing lines cross outside of the shapes,
+        # but they may still touch at an endpoint
+        if t < lo1 or t > hi1:
+            point = p1 + d1 * (lo1 if t < lo1 else hi1)
+            if other.contains_point(point):
+                return point
+        if u < lo2 or u > hi2:
+            point = p2 + d2 * (lo2 if u < lo2 else hi2)
+            if self.contains_point(point):
+                return point
+        return None
+
 
 class Line(_LinearGeometry):
     """Infinite directed line.
@@ -130,6 +175,10 @@ class Line(_LinearGeometry):
         """
         point = self._normal * self.offset
         return (point, point + self._direction)
+
+    def _extent(self):
+        return (self._normal * self.offset, self._direction, 
+            -_INFINITY, _INFINITY)
     
     def distance_to(self, point):
         """Return the signed distance from the line to the specified point.
@@ -281,6 +330,9 @@ class Ray(_LinearGeometry):
         """
         return (self._anchor, self._anchor + self._direction)
 
+    def _extent(self):
+        return (self._anchor, self._direction, 0.0, _INFINITY)
+
     @property
     def anchor(self):
         """The anchor, or starting point of the ray."""
@@ -476,6 +528,9 @@ class LineSegment(_LinearGeometry):
         """Return the two endpoints of the line segment as a sequence."""
         return (self._anchor, self._anchor + self.direction * self.length)
 
+    def _extent(self):
+        return (self._anchor, self._direction, 0.0, self.length)
+
     @property
     def anchor(self):
         """The anchor, or starting point of the line segment."""
@@ -633,5 +688,216 @@ class LineSegment(_LinearGeometry):
             tuple(self.anchor), tuple(self.vector))
 
 
+def _snap_cell(value):
+    # Infinite coordinates have no cell, but keep their own
+    if value - value == 0.0:
+        return math.floor(value)
+    return value
+
+def _snap_points(points):
+    """Return a list of the points as ``(x, y)`` tuples, with each point
+    that is within ``planar.EPSILON`` of an earlier point replaced by it.
+    Points that differ only by rounding error, such as the shared vertices
+    of transformed shapes, become exactly equal.
+
+    The points are visited in order of the grid cells of size
+    ``planar.EPSILON`` that contain them, and each is compared with the
+    points kept so far in the neighboring cells, so this takes
+    O(n log n) time. Applying it again to the result changes nothing.
+    """
+    points = [tuple(planar.Vec2(*point)) for point in points]
+    epsilon = planar.EPSILON
+    epsilon2 = planar.EPSILON2
+    if epsilon <= 0.0:
+        return points
+    keys = []
+    for i, (x, y) in enumerate(points):
+        keys.append((_snap_cell(x / epsilon), _snap_cell(y / epsilon),
+            x, y, i))
+    keys.sort()
+    cells = {}
+    for cx, cy, x, y, i in keys:
+        found = None
+        for ncx in (cx - 1, cx, cx + 1):
+            for ncy in (cy - 1, cy, cy + 1):
+                for kept in cells.get((ncx, ncy), ()):
+                    if (kept[0] - x)**2 + (kept[1] - y)**2 < epsilon2:
+                        found = kept
+                        break
+                if found is not None:
+                    break
+            if found is not None:
+                break
+        if found is None:
+            cells.setdefault((cx, cy), []).append(points[i])
+        else:
+            points[i] = found
+    return points
+
+def find_intersections(segments):
+    """Find all points where two or more line segments intersect, using a
+    Bentley-Ottmann sweep. For ``n`` segments and ``k`` intersection
+    points this takes O((n + k) log n) time, much faster than testing
+    each pair of segments when there are few intersections.
+
+    Segments that touch at an endpoint are considered to intersect there.
+    Collinear segments that overlap intersect at the endpoints of the
+    overlap. Endpoints closer together than ``planar.EPSILON`` are treated
+    as the same point, so segments sharing an endpoint that differs only
+    by rounding error are found to touch there.
+
+    :param segments: Iterable of :class:`LineSegment` objects, or pairs of
+        endpoints.
+    :return: A list of ``(point, indices)`` tuples, one for each
+        intersection point in ascending x, then y order. ``indices`` is a
+        sorted tuple of the indices of the segments that meet at the point.
+    """
+    epsilon = planar.EPSILON
+    epsilon2 = planar.EPSILON2
+    points = []
+    for segment in segments:
+        try:
+            if isinstance(segment, LineSegment):
+                start, end = segment.points
+            else:
+                start, end = segment
+            points.append(planar.Vec2(*start))
+            points.append(planar.Vec2(*end))
+        except (TypeError, ValueError):
+            raise TypeError("Expected LineSegment or pair of points")
+    points = _snap_points(points)
+    ends = []
+    events = []
+    for i in range(len(points) // 2):
+        start = points[i * 2]
+        end = points[i * 2 + 1]
+        if end < start:
+            start, end = end, start
+        ends.append((start, end))
+        events.append((start[0], start[1], i))
+        if end != start:
+            events.append((end[0], end[1], -1))
+    heapq.heapify(events)
+
+    def y_at(i, x, y):
+        (ax, ay), (bx, by) = ends[i]
+        if ax == bx:
+            # Vertical segments are always level with the sweep point
+            return y
+        return ay + (x - ax) * (by - ay) / (bx - ax)
+
+    def slope(i):
+        (ax, ay), (bx, by) = ends[i]
+        if ax == bx:
+            return _INFINITY
+        return (by - ay) / (bx - ax)
+
+    def contains(i, x, y):
+        (ax, ay), (bx, by) = ends[i]
+        dx = bx - ax
+        dy = by - ay
+        px = x - ax
+        py = y - ay
+        t = (px * dx + py * dy) / (dx * dx + dy * dy)
+        if t < 0.0:
+            t = 0.0
+        elif t > 1.0:
+            t = 1.0
+        px -= dx * t
+        py -= dy * t
+        return px * px + py * py < epsilon2
+
+    def schedule(i, j, x, y):
+        # Add an event for the intersection of segments i and j
+        # if it is ahead of the sweep point
+        (ax, ay), (bx, by) = a, b = ends[i]
+        (cx, cy), (dx, dy) = c, d = ends[j]
+        rx = bx - ax
+        ry = by - ay
+        sx = dx - cx
+        sy = dy - cy
+        denom = rx * sy - ry * sx
+        r_len = math.sqrt(rx * rx + ry * ry)
+        s_len = math.sqrt(sx * sx + sy * sy)
+        if abs(denom) < epsilon * r_len * s_len:
+            return
+        wx = cx - ax
+        wy = cy - ay
+        t = (wx * sy - wy * sx) / denom
+        u = (wx * ry - wy * rx) / denom
+        if not (0.0 <= t <= 1.0 and 0.0 <= u <= 1.0):
+            # Segments touching at an endpoint are found at the endpoint
+            return
+        if t * r_len < epsilon:
+            qx, qy = a
+        elif (1.0 - t) * r_len < epsilon:
+            qx, qy = b
+        elif u * s_len < epsilon:
+            qx, qy = c
+        elif (1.0 - u) * s_len < epsilon:
+            qx, qy = d
+        else:
+            qx = ax + rx * t
+            qy = ay + ry * t
+        if ((qx > x or (qx == x and qy > y))
+            and (qx - x)**2 + (qy - y)**2 >= epsilon2):
+            heapq.heappush(events, (qx, qy, -1))
+
+    status = SweepStatus(len(ends))
+    intersections = []
+    last_x = last_y = None
+    while events:
+        x, y, i = heapq.heappop(events)
+        starting = []
+        if i >= 0:
+            starting.append(i)
+        while events and events[0][0] == x and events[0][1] == y:
+            i = heapq.heappop(events)[2]
+            if i >= 0:
+                starting.append(i)
+        if (not starting and last_x is not None
+            and (x - last_x)**2 + (y - last_y)**2 < epsilon2):
+            # Already handled at the last event, the
+            # difference is only rounding error
+            continue
+        last_x = x
+        last_y = y
+
+        # Find the segments passing through the event point,
+        # and those just below and above it
+        below = status.find_last(lambda i: y_at(i, x, y) < y)
+        while below is not None and contains(below, x, y):
+            below = status.prev(below)
+        if below is not None:
+            above = status.next(below)
+        else:
+            above = status.first()
+        passing = []
+        while above is not None and contains(above, x, y):
+            passing.append(above)
+            above = status.next(above)
+        for i in passing:
+            status.remove(i)
+        meeting = starting + passing
+        if len(meeting) > 1:
+            meeting.sort()
+            intersections.append((planar.Vec2(x, y), tuple(meeting)))
+
+        # Replace the segments at the event point with those 
+        # that continue past it, in their order beyond the point
+        continuing = [i for i in meeting 
+            if (ends[i][1][0] - x)**2 + (ends[i][1][1] - y)**2 >= epsilon2]
+        continuing.sort(key=slope)
+        last = below
+        for i in continuing:
+            status.insert_after(i, last)
+            last = i
+        if below is not None and continuing:
+            schedule(below, continuing[0], x, y)
+        if last is not None and above is not None:
+            schedule(last, above, x, y)
+    return intersections
+
+
 # vim: ai ts=4 sts=4 et sw=4 tw=78
 
@@ -0,0 +1,1109 @@
+#############################################################################
+# Copyright (c) 2010 by Casey Duncan
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name(s) of the copyright holders nor the names of its
+#   contributors may be used to endorse or promote products derived from this
+#   software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AS IS AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO
+# EVENT SHALL THE COPYRIGHT HOLDERS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#############################################################################
+"""Namespace module for the NumPy class implementations.
+
+These extend the Python implementations, storing the vertices of vector
+arrays and polygons in NumPy arrays of shape ``(n, 2)``, and vectorizing
+the bulk operations: transforms, bounding boxes, polygon classification,
+convex hulls and point containment tests, and the batch methods and
+arithmetic of :class:`Vec2Array`. They are used by the :mod:`planar`
+package when NumPy is installed and the C extension is not available.
+Types that do not store point sequences are the Python implementations.
+"""
+
+from __future__ import division
+
+__all__ = ('Vec2', 'Point', 'Vec2Array', 'Vec2Array32', 'Seq2',
+    'Affine', 'Line', 'Ray', 'LineSegment', 'BoundingBox', 'Polygon',
+    'RTree', 'KDTree', 'find_intersections')
+
+import pickle
+import functools
+from array import array
+import numpy
+import planar
+from planar import stats as _stats
+from planar import vector, transform, box
+from planar.vector import Vec2, Vec2Array32
+from planar.vector import Vec2 as Point
+from planar.line import Line, Ray, LineSegment, find_intersections
+from planar.index import RTree, KDTree
+from planar.polygon import BasePolygon, _unknown, \
+    _ahull_partition_points, _ahull_sort_points
+
+# Polygons with fewer vertices than this are tested for point containment
+# one point at a time, and convex hull partitions with fewer points are
+# computed by the Python implementation, where NumPy's per call overhead
+# exceeds the savings
+_MIN_VECTORIZED_SIZE = 64
+
+# Maximum number of point-edge pairs evaluated at once by the winding
+# number test, limiting the size of the temporary arrays
+_WINDING_CHUNK_SIZE = 1 << 18
+
+
+def _invalidates_array(method):
+    """Wrap a method that mutates the vector list of a sequence,
+    discarding its array, so it is converted from the list when next
+    needed.
+    """
+    @functools.wraps(method)
+    def mutator(self, *args):
+        method(self, *args)
+        self._array = None
+    return mutator
+
+
+class Seq2(vector.Seq2):
+    """Fixed length 2D point/vector sequence, stored in a NumPy array
+
+    :param vectors: A sequence of :class:`~planar.Vec2` objects, or
+        a NumPy array of shape ``(n, 2)``.
+    """
+
+    # The vectors are stored as an (n, 2) array of doubles, as a list of
+    # Vec2, or both. Each is converted from the other when first needed.
+    # Arrays are never modified once stored, so they can be shared by
+    # copies, and mutating the list discards the array.
+    _array = None
+    _list = None
+
+    def __init__(self, vectors):
+        if isinstance(vectors, Seq2):
+            self._array = vectors._coords()
+        elif (isinstance(vectors, numpy.ndarray) and vectors.ndim == 2
+            and vectors.shape[1] == 2 and vectors.dtype.kind in 'biuf'):
+            self._array = _frozen(vectors.astype(float))
+        else:
+            super(Seq2, self).__init__(vectors)
+
+    def _get_vectors(self):
+        if self._list is None:
+            self._list = _vectors(self._array)
+        return self._list
+
+    def _set_vectors(self, vectors):
+        self._list = vectors
+        self._array = None
+
+    _vectors = property(_get_vectors, _set_vectors)
+
+    def _coords(self):
+        """Return the vectors as an array of doubles of shape ``(n, 2)``.
+        The array is shared, and must not be modified.
+        """
+        if self._array is None:
+            self._array = _frozen(
+                numpy.array(self._list, dtype=float).reshape(-1, 2))
+        return self._array
+
+    def _assign(self, coords):
+        """Replace the vectors with the array ``coords``, without
+        copying it
+        """
+        self._array = _frozen(coords)
+        self._list = None
+
+    @classmethod
+    def _from_coords(cls, coords):
+        """Create a new sequence from an array of shape ``(n, 2)``,
+        without copying it
+        """
+        self = cls.__new__(cls)
+        self._array = _frozen(coords)
+        return self
+
+    @classmethod
+    def from_points(cls, points):
+        """Create a new 2D sequence from an iterable of points"""
+        if isinstance(points, Seq2) and points._array is not None:
+            return cls._from_coords(points._array)
+        return super(Seq2, cls).from_points(points)
+
+    def __len__(self):
+        if self._list is not None:
+            return len(self._list)
+        return len(self._array)
+
+    __setitem__ = _invalidates_array(vector.Seq2.__setitem__)
+
+    def almost_equals(self, other):
+        """Compare for approximate equality."""
+        if self.__class__ is other.__class__ and len(self) == len(other):
+            delta = self._coords() - other._coords()
+            return bool(((delta * delta).sum(axis=1)
+                < planar.EPSILON2).all())
+        else:
+            return False
+
+    def __eq__(self, other):
+        return (self.__class__ is other.__class__
+            and len(self) == len(other)
+            and bool((self._coords() == other._coords()).all()))
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __copy__(self, memo=None):
+        return self.from_points(self)
+
+    __deepcopy__ = __copy__
+
+    @classmethod
+    def _from_bytes(cls, data):
+        """Create a new sequence from packed native double ``x, y``
+        pairs, as pickled by :meth:`__reduce_ex__`.
+        """
+        return cls._from_coords(_coords_from_bytes(data))
+
+    def __reduce_ex__(self, protocol):
+        coords = self._coords()
+        if protocol >= 5 and hasattr(pickle, 'PickleBuffer'):
+            data = pickle.PickleBuffer(numpy.ascontiguousarray(coords))
+        else:
+            data = coords.tobytes()
+        return (vector._from_bytes, (self.__class__, data))
+
+    def __array__(self, dtype=None, copy=None):
+        """Return the vectors as a read-only NumPy array of shape
+        ``(n, 2)``, or a copy if requested.
+        """
+        coords = self._coords()
+        if copy or (dtype is not None and numpy.dtype(dtype) != coords.dtype):
+            return numpy.array(coords, dtype=dtype)
+        return coords.view()
+
+    def __nonzero__(self):
+        return len(self) > 0
+
+
+class Vec2Array(Seq2, vector.Vec2Array):
+    """Sequence of 2D vectors for batch operations, stored in a NumPy
+    array
+    """
+
+    def __init__(self, vectors=()):
+        Seq2.__init__(self, vectors)
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Create a new array by copying the contents of an object
+        supporting the buffer protocol, such as a NumPy array. The
+        buffer must contain doubles, in the shape ``(n, 2)`` or
+        as a flat sequence of ``x, y`` pairs.
+
+        :param buffer: Object supporting the buffer protocol.
+        """
+        return cls._from_coords(
+            numpy.array(_buffer_coords(memoryview(buffer)), dtype=float))
+
+    @classmethod
+    def open_mmap(cls, path, mode='r'):
+        """Create an array from a file of packed native double ``x, y``
+        pairs, as written by ``array.tofile()`` or ``ndarray.tofile()``.
+
+        The file is mapped into memory read-only, so the array is
+        available immediately without copying or parsing. Changes to the
+        vectors are not written back to the file, so unlike the C
+        implementation the ``'r+'`` mode is not supported.
+
+        :param path: Path of the file to map.
+        :param mode: ``'r'`` or ``'c'``, which both allow changes to the
+            array without writing them back.
+        """
+        if mode == 'r+':
+            raise ValueError(
+                "Vec2Array.open_mmap: mode 'r+' is not supported, "
+                "changes cannot be written back to the file")
+        if mode not in ('r', 'c'):
+            raise ValueError(
+                "Vec2Array.open_mmap: invalid mode '%s', "
+                "expected 'r' or 'c'" % mode)
+        with open(path, 'rb') as f:
+            f.seek(0, 2)
+            size = f.tell()
+        if size % 16 != 0:
+            raise ValueError(
+                "Vec2Array.open_mmap: file size %d is not a multiple "
+                "of the vector size 16" % size)
+        if not size:
+            return cls()
+        coords = numpy.memmap(path, dtype=float, mode='r')
+        return cls._from_coords(coords.view(numpy.ndarray).reshape(-1, 2))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) and self._list is None:
+            return self._from_coords(self._array[index])
+        return vector.Vec2Array.__getitem__(self, index)
+
+    __setitem__ = _invalidates_array(vector.Vec2Array.__setitem__)
+    __delitem__ = _invalidates_array(vector.Vec2Array.__delitem__)
+    append = _invalidates_array(vector.Vec2Array.append)
+    extend = _invalidates_array(vector.Vec2Array.extend)
+    insert = _invalidates_array(vector.Vec2Array.insert)
+
+    def _vector_at(self, index):
+        """Return the vector at index, without creating the others"""
+        if self._list is not None:
+            return self._list[index]
+        return tuple.__new__(Vec2, self._array[index].tolist())
+
+    def _lengths2(self):
+        coords = self._coords()
+        x = coords[:, 0]
+        y = coords[:, 1]
+        return x * x + y * y
+
+    def longest(self):
+        """Return the vector in the array with the maximum length."""
+        if len(self):
+            lengths2 = self._lengths2()
+            i = int(lengths2.argmax())
+            if lengths2[i] > 0:
+                return self._vector_at(i)
+
+    def shortest(self):
+        """Return the vector in the array with the minimum length."""
+        if len(self):
+            return self._vector_at(int(self._lengths2().argmin()))
+
+    def _normalized_coords(self):
+        coords = self._coords()
+        lengths = numpy.sqrt(self._lengths2())
+        scaled = lengths > planar.EPSILON
+        result = numpy.zeros_like(coords)
+        result[scaled] = coords[scaled] / lengths[scaled, None]
+        return result
+
+    def normalized(self):
+        """Create a new array containing normalized vectors calculated
+        from this array.
+
+        :rtype: Vec2Array
+        """
+        return self._from_coords(self._normalized_coords())
+
+    def normalize(self):
+        """Normalize the vectors in the array in place."""
+        self._assign(self._normalized_coords())
+
+    def lengths(self):
+        """Return the lengths of the vectors in the array.
+
+        :rtype: array.array of doubles
+        """
+        return _double_array(numpy.sqrt(self._lengths2()))
+
+    def lengths2(self):
+        """Return the squared lengths of the vectors in the array.
+
+        :rtype: array.array of doubles
+        """
+        return _double_array(self._lengths2())
+
+    def _paired_coords(self, other, op_name, action):
+        """Return the coordinates of a single vector, or of another vector
+        sequence, to pair with the vectors in the array.
+        """
+        if isinstance(other, vector.Seq2):
+            if len(self) != len(other):
+                raise ValueError(
+                    "cannot %s arrays with different lengths" % action)
+            return _as_coords(other)
+        try:
+            other = Vec2(*other)
+        except Exception:
+            raise TypeError("Vec2Array.%s(): expected Vec2 or Seq2 "
+                "for argument" % op_name)
+        return numpy.array(other)
+
+    def dots(self, other):
+        """Return the dot products of the vectors in the array with a
+        single vector, or pairwise with the vectors of another sequence
+        of the same length.
+
+        :type other: Vec2 or Seq2
+        :rtype: array.array of doubles
+        """
+        coords = self._coords()
+        other = self._paired_coords(other, 'dots',
+            'compute dot products of')
+        return _double_array(
+            coords[:, 0] * other[..., 0] + coords[:, 1] * other[..., 1])
+
+    def crosses(self, other):
+        """Return the cross products of the vectors in the array with a
+        single vector, or pairwise with the vectors of another sequence
+        of the same length.
+
+        :type other: Vec2 or Seq2
+        :rtype: array.array of doubles
+        """
+        coords = self._coords()
+        other = self._paired_coords(other, 'crosses',
+            'compute cross products of')
+        return _double_array(
+            coords[:, 0] * other[..., 1] - coords[:, 1] * other[..., 0])
+
+    def distances_to(self, other):
+        """Return the distances from the vectors in the array to a
+        single point, or pairwise to the points of another sequence
+        of the same length.
+
+        :type other: Vec2 or Seq2
+        :rtype: array.array of doubles
+        """
+        delta = self._coords() - self._paired_coords(other, 'distances_to',
+            'compute distances between')
+        x = delta[:, 0]
+        y = delta[:, 1]
+        return _double_array(numpy.sqrt(x * x + y * y))
+
+    def sum(self):
+        """Return the sum of the vectors in the array.
+
+        :rtype: Vec2
+        """
+        return Vec2(*self._coords().sum(axis=0).tolist())
+
+    def mean(self):
+        """Return the mean of the vectors in the array, i.e., the
+        centroid of the points. Return None if the array is empty.
+
+        :rtype: Vec2
+        """
+        if len(self):
+            return self.sum() / len(self)
+
+    def min_point(self):
+        """Return a vector of the minimum x and minimum y values in the
+        array. Return None if the array is empty.
+
+        :rtype: Vec2
+        """
+        if len(self):
+            return Vec2(*self._coords().min(axis=0).tolist())
+
+    def max_point(self):
+        """Return a vector of the maximum x and maximum y values in the
+        array. Return None if the array is empty.
+
+        :rtype: Vec2
+        """
+        if len(self):
+            return Vec2(*self._coords().max(axis=0).tolist())
+
+    def _operate(self, other, op, scalar=True, divide=False):
+        """Apply the NumPy operation ``op`` to the vectors in the array
+        and another array of the same length, a single vector, or if
+        ``scalar`` is true, a scalar value. Return the resulting
+        coordinates, or None for operands left to the Python
+        implementation, including those that raise an error.
+        """
+        if isinstance(other, Vec2Array):
+            if len(self) != len(other):
+                return None
+            operand = other._coords()
+        elif isinstance(other, vector.Seq2):
+            return None
+        else:
+            operand = None
+            if scalar:
+                try:
+                    operand = float(other)
+                except TypeError:
+                    pass
+                except ValueError:
+                    return None
+            if operand is None:
+                try:
+                    operand = numpy.array(Vec2(*other))
+                except Exception:
+                    return None
+        if divide and len(self) and not numpy.all(operand):
+            # Division by zero
+            return None
+        with numpy.errstate(all='ignore'):
+            return op(self._coords(), operand)
+
+    def __add__(self, other):
+        coords = self._operate(other, numpy.add, scalar=False)
+        if coords is None:
+            return vector.Vec2Array.__add__(self, other)
+        if isinstance(other, Vec2Array):
+            return other._from_coords(coords)
+        return self._from_coords(coords)
+
+    __radd__ = __add__
+
+    def __iadd__(self, other):
+        coords = self._operate(other, numpy.add, scalar=False)
+        if coords is None:
+            return vector.Vec2Array.__iadd__(self, other)
+        self._assign(coords)
+        return self
+
+    def __sub__(self, other):
+        coords = self._operate(other, numpy.subtract, scalar=False)
+        if coords is None:
+            return vector.Vec2Array.__sub__(self, other)
+        return self._from_coords(coords)
+
+
+    def __isub__(self, other):
+        coords = self._operate(other, numpy.subtract, scalar=False)
+        if coords is None:
+            return vector.Vec2Array.__isub__(self, other)
+        self._assign(coords)
+        return self
+
+    def __mul__(self, other):
+        coords = self._operate(other, numpy.multiply)
+        if coords is None:
+            return vector.Vec2Array.__mul__(self, other)
+        if isinstance(other, Vec2Array):
+            return other._from_coords(coords)
+        return self._from_coords(coords)
+
+    __rmul__ = __mul__
+
+    def __imul__(self, other):
+        if hasattr(other, 'itransform'):
+            other.itransform(self)
+            return self
+        coords = self._operate(other, numpy.multiply)
+        if coords is None:
+            return vector.Vec2Array.__imul__(self, other)
+        self._assign(coords)
+        return self
+
+    def __truediv__(self, other):
+        coords = self._operate(other, numpy.true_divide, divide=True)
+        if coords is None:
+            return vector.Vec2Array.__truediv__(self, other)
+        return self._from_coords(coords)
+
+
+    def __itruediv__(self, other):
+        coords = self._operate(other, numpy.true_divide, divide=True)
+        if coords is None:
+            return vector.Vec2Array.__itruediv__(self, other)
+        self._assign(coords)
+        return self
+
+    def __floordiv__(self, other):
+        coords = self._operate(other, numpy.floor_divide, divide=True)
+        if coords is None:
+            return vector.Vec2Array.__floordiv__(self, other)
+        return self._from_coords(coords)
+
+
+    def __ifloordiv__(self, other):
+        coords = self._operate(other, numpy.floor_divide, divide=True)
+        if coords is None:
+            return vector.Vec2Array.__ifloordiv__(self, other)
+        self._assign(coords)
+        return self
+
+    def __neg__(self):
+        """Create an array of the negation of the vectors in this array."""
+        return self._from_coords(-self._coords())
+
+
+class Affine(transform.Affine):
+    """Two dimensional affine transform, applied to the sequences of
+    this module using vectorized operations. See
+    :class:`planar.transform.Affine`.
+    """
+
+    def __new__(cls, *members):
+        return tuple.__new__(cls, transform.Affine(*members))
+
+    @classmethod
+    def identity(cls):
+        """Return the identity transform.
+
+        :rtype: Affine
+        """
+        return identity
+
+    def __reduce__(self):
+        return (Affine, self[:6])
+
+    def __mul__(self, other):
+        if isinstance(other, Seq2):
+            result = other._from_coords(_transformed(other._coords(), self))
+            if hasattr(result, '_transform_cached_properties'):
+                # Carry over the shape properties preserved by the transform
+                result._transform_cached_properties(other.__dict__, self)
+            return result
+        result = super(Affine, self).__mul__(other)
+        if type(result) is transform.Affine:
+            result = tuple.__new__(Affine, result)
+        return result
+
+
+    def itransform(self, seq):
+        """Transform a sequence of points or vectors in place.
+
+        :param seq: Mutable sequence of :class:`~planar.Vec2` to be
+            transformed.
+        :returns: None, the input sequence is mutated in place.
+        """
+        if isinstance(seq, Seq2):
+            if self is not identity and self != identity:
+                seq._assign(_transformed(seq._coords(), self))
+        else:
+            super(Affine, self).itransform(seq)
+
+    def transform(self, seq, out=None):
+        """Transform a sequence of points or vectors, storing the results
+        in a new array, or in the destination array provided. See
+        :meth:`planar.transform.Affine.transform`.
+        """
+        if out is None and isinstance(seq, Vec2Array32):
+            return seq * self
+        coords = _transformed(_as_coords(seq), self)
+        if out is None:
+            return planar.Vec2Array.from_buffer(coords)
+        if isinstance(out, Seq2):
+            dest = None
+        else:
+            try:
+                view = memoryview(out)
+            except TypeError:
+                dest = None
+            else:
+                if view.readonly:
+                    raise BufferError(
+                        "Affine.transform(): destination buffer is read-only")
+                dest = _buffer_coords(view)
+                out_len = len(dest)
+        if dest is None:
+            out_len = len(out)
+        if out_len != len(coords):
+            raise ValueError("Affine.transform(): destination length "
+                "%d does not match source length %d"
+                % (out_len, len(coords)))
+        if isinstance(out, Seq2):
+            out._assign(coords)
+        elif dest is not None:
+            dest[...] = coords
+        else:
+            for i, (x, y) in enumerate(coords.tolist()):
+                out[i] = (x, y)
+        return out
+
+
+    def __invert__(self):
+        return tuple.__new__(Affine, super(Affine, self).__invert__())
+
+
+    __hash__ = tuple.__hash__ # hash is not inherited in Py 3
+
+
+identity = Affine(1, 0, 0, 0, 1, 0)
+"""The identity transform"""
+
+
+class BoundingBox(box.BoundingBox):
+    """An axis-aligned immutable rectangular shape described
+    by two points that define the minimum and maximum
+    corners. The extent of the sequences of this module, and of
+    NumPy arrays of shape ``(n, 2)``, is computed using vectorized
+    operations.
+
+    :param points: Iterable containing one or more :class:`~planar.Vec2`
+        objects.
+    """
+
+    def _init_min_max(self, points):
+        if isinstance(points, Seq2):
+            coords = points._coords()
+        elif (isinstance(points, numpy.ndarray) and points.ndim == 2
+            and points.shape[1] == 2):
+            coords = points
+        else:
+            return super(BoundingBox, self)._init_min_max(points)
+        if not len(coords):
+            raise ValueError("BoundingBox() requires at least one point")
+        min_x, min_y = coords.min(axis=0).tolist()
+        max_x, max_y = coords.max(axis=0).tolist()
+        self._min = planar.Vec2(min_x * 1.0, min_y * 1.0)
+        self._max = planar.Vec2(max_x * 1.0, max_y * 1.0)
+
+
+class Polygon(BasePolygon, Seq2):
+    """Arbitrary polygon represented as a list of vertices, stored in a
+    NumPy array. See :class:`planar.polygon.Polygon` for details.
+
+    :param vertices: Iterable containing three or more :class:`~planar.Vec2`
+        objects, or a NumPy array of shape ``(n, 2)``.
+    :param is_convex: Optionally allows the polygon to be declared convex
+        or non-convex at construction time.
+    :type is_convex: bool
+    :param is_simple: Optionally allows the polygon to be declared simple
+        or non-simple at construction time.
+    :type is_simple: bool
+    """
+
+    def __init__(self, vertices, is_convex=None, is_simple=None):
+        Seq2.__init__(self, vertices)
+        # The vertices may be an iterator, so pass the stored sequence
+        BasePolygon.__init__(self, self, is_convex, is_simple)
+
+    @classmethod
+    def _from_coords(cls, coords):
+        poly = super(Polygon, cls)._from_coords(coords)
+        poly._clear_cached_properties()
+        return poly
+
+    def _assign(self, coords):
+        state = dict(self.__dict__) if _stats.enabled else None
+        super(Polygon, self)._assign(coords)
+        self._clear_cached_properties()
+        if state is not None:
+            self._count_invalidations(state)
+
+    @classmethod
+    def _from_bytes(cls, data):
+        """Create a new polygon from packed native double ``x, y``
+        pairs, as pickled by :meth:`__reduce_ex__`.
+        """
+        return cls._from_coords(_coords_from_bytes(data))
+
+    def _extreme_indices(self):
+        coords = self._coords()
+        left_i, min_i = coords.argmin(axis=0).tolist()
+        right_i, max_i = coords.argmax(axis=0).tolist()
+        return min_i, max_i, left_i, right_i
+
+    @_stats.timed('classify')
+    def _classify(self):
+        """Calculate the polygon convexity, winding direction,
+        detecting and handling degenerate cases, as in
+        :meth:`planar.polygon.Polygon._classify`.
+        """
+        coords = self._coords()
+        deltas = coords - numpy.roll(coords, 1, axis=0)
+        last_delta = deltas[-1:]
+        deltas = deltas[(deltas[:, 0] != 0.0) | (deltas[:, 1] != 0.0)]
+        # Direction of each edge, preceded by the last edge
+        dirs = _edge_directions(numpy.concatenate((last_delta, deltas)))
+        dir_changes = dirs[1:] == -dirs[:-1]
+        prev = numpy.concatenate((last_delta, deltas[:-1]))
+        cross = prev[:, 0] * deltas[:, 1] - prev[:, 1] * deltas[:, 0]
+        signs = (cross > 0.0).astype(int) - (cross < 0.0)
+        turns = numpy.flatnonzero(signs)
+        count = len(deltas)
+        angle_sign = 0
+        self._convex = True
+        self._winding = 0
+        if len(turns):
+            angle_sign = int(signs[turns[0]])
+            reversals = turns[signs[turns] != angle_sign]
+            if len(reversals):
+                # Stop at the first turn in the opposite direction
+                self._convex = False
+                count = int(reversals[0]) + 1
+        if int(dir_changes[:count].sum()) <= 2:
+            self._winding = angle_sign
+        else:
+            self._convex = False
+        if self._convex:
+            self._simple = True
+        self._degenerate = not count or not angle_sign
+        if self._convex and not self._degenerate:
+            self._dupe_verts = (count < len(self))
+            self._split_y_polylines()
+
+    def _pnp_winding_test(self, point):
+        if len(self) < _MIN_VECTORIZED_SIZE:
+            return super(Polygon, self)._pnp_winding_test(point)
+        px, py = point
+        return bool(_winding_numbers(self._coords(),
+            numpy.array([[px, py]], dtype=float))[0])
+
+    def _pnp_triangles_test(self, coords):
+        """Return a boolean array, True for each of the points in
+        ``coords`` inside the triangle polygon, using barycentric
+        coordinates as in :meth:`_pnp_triangle_test`.
+        """
+        inside = numpy.zeros(len(coords), dtype=bool)
+        lo, mid, hi = sorted(self, key=lambda xy: (xy[1], xy[0]))
+        v0 = lo - mid
+        v1 = hi - mid
+        if v0.is_null or v1.is_null:
+            return inside
+        dot01 = v0.dot(v1)
+        dot00 = v0.length2
+        dot11 = v1.length2
+        denom = (dot00 * dot11 - dot01 * dot01)
+        if not denom:
+            return inside # degenerate triangle
+        inv_denom = 1.0 / denom
+        v2_x = coords[:, 0] - mid[0]
+        v2_y = coords[:, 1] - mid[1]
+        dot02 = v0[0] * v2_x + v0[1] * v2_y
+        dot12 = v1[0] * v2_x + v1[1] * v2_y
+        u = (dot11 * dot02 - dot01 * dot12) * inv_denom
+        v = (dot00 * dot12 - dot01 * dot02) * inv_denom
+        if ((hi[0] - lo[0])*(mid[1] - lo[1])
+            - (mid[0] - lo[0])*(hi[1] - lo[1]) > 0.0):
+            # Triangle has 2 inclusive leading edges
+            return (u >= 0.0) & (v >= 0.0) & (u + v < 1.0)
+        else:
+            # Triangle has 1 inclusive leading edge
+            return (u > 0.0) & (v > 0.0) & (u + v <= 1.0)
+
+    def _pnp_y_monotone_points_test(self, coords):
+        """Return a boolean array, True for each of the points in
+        ``coords`` inside the polygon, using a binary search of the
+        polygon's y-monotone polylines as in :meth:`_pnp_y_monotone_test`.
+        """
+        if self._y_polylines is None:
+            self._split_y_polylines()
+        px = coords[:, 0]
+        py = coords[:, 1]
+        inside = numpy.ones(len(coords), dtype=bool)
+        for pline, left in zip(self._y_polylines, (True, False)):
+            pline = numpy.array(pline, dtype=float)
+            i = numpy.searchsorted(pline[:, 0], py, side='left')
+            if left:
+                # Point above or below
+                inside &= (i > 0) & (i < len(pline))
+            i = i.clip(1, len(pline) - 1)
+            v0_y, v0_x = pline[i - 1].T
+            v1_y, v1_x = pline[i].T
+            side = ((v1_x - v0_x) * (py - v0_y)
+                - (px - v0_x) * (v1_y - v0_y))
+            inside &= ~(side > 0) if left else (side > 0)
+        return inside
+
+    def contains_points(self, points):
+        """Test a batch of points for containment in the polygon. The test
+        strategy is selected once for the entire batch, and applied to
+        all the points using vectorized operations.
+
+        The result is a :class:`bytearray` with one byte per point, which
+        is 1 if the point is inside the polygon and 0 otherwise.
+
+        :param points: The points to test, either a
+            :class:`~planar.Vec2Array`, an object supporting the buffer
+            protocol with shape ``(n, 2)``, or an iterable of points.
+        :rtype: bytearray
+        """
+        coords = _as_coords(points)
+        count = _stats.count if _stats.enabled else lambda name, n: None
+        sides = len(self)
+        if sides == 3:
+            count('pip.triangle', len(coords))
+            return _byte_array(self._pnp_triangles_test(coords))
+        inside = numpy.zeros(len(coords), dtype=bool)
+        pending = numpy.arange(len(coords))
+        centroid = self._centroid
+        if (centroid is not _unknown and centroid is not None and sides > 4
+            and (self._min_r2 is not None or self._max_r2 is not None)):
+            dx = centroid[0] - coords[:, 0]
+            dy = centroid[1] - coords[:, 1]
+            d2 = dx * dx + dy * dy
+            decided = numpy.zeros(len(coords), dtype=bool)
+            if self._min_r2 is not None:
+                decided = inside = d2 < self._min_r2
+                count('pip.radius_inside', int(inside.sum()))
+            if self._max_r2 is not None:
+                outside = ~decided & (d2 > self._max_r2)
+                decided = decided | outside
+                count('pip.radius_outside', int(outside.sum()))
+            pending = numpy.flatnonzero(~decided)
+        coords = coords[pending]
+        if self.is_convex and sides > 5:
+            if _stats.enabled:
+                _stats.count_cache('y_polylines', 
+                    self._y_polylines is not None)
+            count('pip.y_monotone', len(pending))
+            inside[pending] = self._pnp_y_monotone_points_test(coords)
+            return _byte_array(inside)
+        if sides > 4:
+            bbox = self.bounding_box
+            (min_x, min_y), (max_x, max_y) = bbox.min_point, bbox.max_point
+            x = coords[:, 0]
+            y = coords[:, 1]
+            in_bbox = (min_x <= x) & (x < max_x) & (min_y < y) & (y <= max_y)
+            count('pip.bbox_reject', len(pending) - int(in_bbox.sum()))
+            pending = pending[in_bbox]
+            coords = coords[in_bbox]
+        if self._prepared:
+            if _stats.enabled:
+                _stats.count_cache('grid', self._grid is not None)
+            count('pip.grid', len(pending))
+            inside[pending] = [
+                self._pnp_grid_test(p) for p in coords.tolist()]
+        else:
+            count('pip.winding', len(pending))
+            inside[pending] = _winding_numbers(self._coords(), coords) != 0
+        return _byte_array(inside)
+
+    @classmethod
+    def convex_hull(cls, points):
+        """Return a new polygon that is the convex hull of the supplied
+        sequence of points.
+
+        If points is a polygon known to be convex, a copy of the
+        polygon is returned.
+
+        The hull is computed using the adaptive quick-hull algorithm of
+        :meth:`planar.polygon.Polygon.convex_hull`, partitioning the
+        points with vectorized operations.
+
+        :param points: A sequence of points.
+        :rtype: Polygon
+        """
+        if isinstance(points, BasePolygon):
+            if points.is_convex_known and points.is_convex:
+                return points.__copy__()
+        return cls(_adaptive_quick_hull(_as_coords(points)), is_convex=True)
+
+
+def _frozen(coords):
+    """Make the array ``coords`` read-only and return it"""
+    coords.flags.writeable = False
+    return coords
+
+def _vectors(coords):
+    """Return a list of the vectors in an array of shape ``(n, 2)``"""
+    return [tuple.__new__(Vec2, xy) for xy in coords.tolist()]
+
+def _double_array(values):
+    """Return a 1 dimensional array of doubles as an array.array"""
+    return array('d', numpy.ascontiguousarray(values, dtype=float).tobytes())
+
+def _byte_array(flags):
+    """Return a boolean array as a bytearray of zeros and ones"""
+    return bytearray(flags.astype(numpy.uint8).tobytes())
+
+def _coords_from_bytes(data):
+    """Return an array of shape ``(n, 2)`` copied from a buffer of packed
+    native double ``x, y`` pairs.
+    """
+    data = numpy.frombuffer(data, dtype=numpy.uint8)
+    if len(data) % 16 != 0:
+        raise ValueError(
+            "Expected data length to be a multiple of 16 bytes")
+    return data.view(float).reshape(-1, 2).copy()
+
+def _buffer_coords(view):
+    """Return an array of shape ``(n, 2)`` sharing the memory of a
+    buffer of doubles, in the shape ``(n, 2)`` or ``(2*n,)``.
+    """
+    if view.format not in ('d', '@d', '=d'):
+        raise TypeError("Expected buffer of doubles, got format '%s'"
+            % view.format)
+    if ((view.ndim == 2 and view.shape[1] == 2)
+        or (view.ndim == 1 and view.shape[0] % 2 == 0)):
+        return numpy.asarray(view).reshape(-1, 2)
+    raise ValueError("Expected buffer of shape (n, 2) or (2*n,)")
+
+def _as_coords(points):
+    """Return an array of shape ``(n, 2)`` containing the points in a
+    sequence of this module, an object supporting the buffer protocol,
+    or an iterable of points. The array may be shared, and must not be
+    modified.
+    """
+    if isinstance(points, Seq2):
+        return points._coords()
+    try:
+        view = memoryview(points)
+    except TypeError:
+        pass
+    else:
+        return _buffer_coords(view).astype(float, copy=False)
+    if not isinstance(points, (list, tuple)):
+        points = list(points)
+    try:
+        coords = numpy.array(points)
+    except (TypeError, ValueError):
+        coords = None
+    if (coords is None or coords.ndim != 2 or coords.shape[1] != 2
+        or coords.dtype.kind not in 'biuf'):
+        # Convert each point, raising errors as Vec2() does
+        coords = numpy.array([Vec2(*p) for p in points])
+    return coords.astype(float, copy=False).reshape(-1, 2)
+
+def _transformed(coords, t):
+    """Return the array of points ``coords`` transformed by the
+    Affine ``t``
+    """
+    a, b, c, d, e, f = tuple(t)[:6]
+    x = coords[:, 0]
+    y = coords[:, 1]
+    result = numpy.empty((len(coords), 2))
+    with numpy.errstate(all='ignore'):
+        result[:, 0] = x*a + y*d + c
+        result[:, 1] = x*b + y*e + f
+    return result
+
+def _edge_directions(deltas):
+    """Return the direction of each edge vector in ``deltas`` as used
+    to count direction changes when classifying polygons: -1 heading
+    right, or straight up, 1 heading left, or straight down, 0 for
+    null vectors.
+    """
+    dx = deltas[:, 0]
+    dy = deltas[:, 1]
+    return numpy.where(dx > 0, -1, numpy.where(dx < 0, 1,
+        numpy.where(dy > 0, -1, numpy.where(dy < 0, 1, 0))))
+
+def _winding_numbers(verts, coords):
+    """Return the winding numbers of the polygon with vertices ``verts``
+    around the points in ``coords``, computed as by
+    :meth:`Polygon._pnp_winding_test`.
+    """
+    v0 = numpy.roll(verts, 1, axis=0)
+    v0_x = v0[:, 0]
+    v0_y = v0[:, 1]
+    v1_x = verts[:, 0]
+    v1_y = verts[:, 1]
+    edge_x = v1_x - v0_x
+    edge_y = v1_y - v0_y
+    winding = numpy.zeros(len(coords), dtype=int)
+    chunk = max(_WINDING_CHUNK_SIZE // max(len(verts), 1), 1)
+    for start in range(0, len(coords), chunk):
+        px = coords[start:start + chunk, 0, None]
+        py = coords[start:start + chunk, 1, None]
+        v0_above = v0_y >= py
+        v1_above = v1_y >= py
+        side = edge_x * (py - v0_y) - (px - v0_x) * edge_y
+        # Upward crossings with the point right of the edge, and
+        # downward crossings with the point left of the edge
+        up = v1_above & ~v0_above & (side <= 0)
+        down = v0_above & ~v1_above & (side >= 0)
+        winding[start:start + chunk] = (
+            up.sum(axis=1) - down.sum(axis=1))
+    return winding
+
+@_stats.timed('convex_hull')
+def _adaptive_quick_hull(coords):
+    """Compute the convex hull of an array of points using the adaptive
+    quick hull algorithm of :func:`planar.polygon._adaptive_quick_hull`.
+    Return the points of the hull as a list in radial sequence.
+    """
+    x = coords[:, 0]
+    y = coords[:, 1]
+    leftmost = tuple.__new__(Vec2, coords[x.argmin()].tolist())
+    rightmost = tuple.__new__(Vec2, coords[x.argmax()].tolist())
+    lx, ly = leftmost
+    rx, ry = rightmost
+    line_w = rx - lx
+    line_h = ry - ly
+    upper = line_w * (y - ly) - (x - lx) * line_h > 0.0
+    ends = ((x == lx) & (y == ly)) | ((x == rx) & (y == ry))
+    upper_points = coords[upper & ~ends]
+    lower_points = coords[~upper & ~ends]
+    hull = []
+    if len(upper_points):
+        _ahull_partition_coords(hull, upper_points, leftmost, rightmost)
+    else:
+        hull.append(leftmost)
+    if len(lower_points):
+        _ahull_partition_coords(hull, lower_points, rightmost, leftmost)
+    else:
+        hull.append(rightmost)
+    return hull
+
+def _ahull_partition_coords(hull, coords, p0, p1):
+    """Partition the points 'above' p0->p1 to compute the sub-hull, as
+    :func:`planar.polygon._ahull_partition_points` does
+    """
+    if len(coords) < _MIN_VECTORIZED_SIZE:
+        _ahull_partition_points(hull, _vectors(coords), p0, p1)
+        return
+    x = coords[:, 0]
+    y = coords[:, 1]
+    p0_x, p0_y = p0
+    pline_dx = p1[0] - p0_x
+    pline_dy = p1[1] - p0_y
+    dist = pline_dx * (y - p0_y) - (x - p0_x) * pline_dy
+    partition_point = tuple.__new__(Vec2, coords[dist.argmax()].tolist())
+
+    # Cull the points inside the triangle partition_point->p0->p1,
+    # dividing the remaining points into left and right sets
+    v0 = p0 - partition_point
+    v1 = p1 - partition_point
+    dot00 = v0.length2
+    dot01 = v0.dot(v1)
+    dot11 = v1.length2
+    denom = (dot00 * dot11 - dot01 * dot01)
+    if denom:
+        inv_denom = 1.0 / denom
+        v2_x = x - partition_point[0]
+        v2_y = y - partition_point[1]
+        dot02 = v0[0] * v2_x + v0[1] * v2_y
+        dot12 = v1[0] * v2_x + v1[1] * v2_y
+        u = (dot11 * dot02 - dot01 * dot12) * inv_denom
+        v = (dot00 * dot12 - dot01 * dot02) * inv_denom
+        left = v < 0.0
+        left_points = coords[left]
+        right_points = coords[~left & (u < 0.0)]
+    else:
+        left_points = right_points = coords[:0]
+
+    left_count = len(left_points)
+    right_count = len(right_points)
+    max_partition = (len(coords) - left_count - right_count) * 4
+
+    if left_count <= 1:
+        # Trivial partition
+        hull.append(p0)
+        hull.extend(_vectors(left_points))
+    elif left_count <= max_partition:
+        _ahull_partition_coords(hull, left_points, p0, partition_point)
+    else:
+        _ahull_sort_coords(hull, left_points, p0, partition_point)
+
+    if right_count <= 1:
+        # Trivial partition
+        hull.append(partition_point)
+        hull.extend(_vectors(right_points))
+    elif right_count <= max_partition:
+        _ahull_partition_coords(hull, right_points, partition_point, p1)
+    else:
+        _ahull_sort_coords(hull, right_points, partition_point, p1)
+
+def _ahull_sort_coords(hull, coords, p0, p1):
+    """Compute the sub-hull using a sorted chain-hull algorithm, sorting
+    the points along p0->p1 before scanning them with
+    :func:`planar.polygon._ahull_sort_points`
+    """
+    dx, dy = p1 - p0
+    order = numpy.argsort(dx * (coords[:, 0] - p0[0])
+        + dy * (coords[:, 1] - p0[1]), kind='mergesort')
+    _ahull_sort_points(hull, _vectors(coords[order]), p0, p1)
+
+
+# vim: ai ts=4 sts=4 et sw=4 tw=78
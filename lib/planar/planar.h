@@ -10,6 +10,7 @@
 ****************************************************************************/
 #include "Python.h"
 #include <float.h>
+#include <string.h>
 
 #ifndef PY_PLANAR_H
 #define PY_PLANAR_H
@@ -17,12 +18,22 @@
 /* Python 2/3 compatibility */
 #if PY_MAJOR_VERSION < 3
 #define PyUnicode_InternFromString(o) PyString_InternFromString(o)
+#else
+#define PyInt_FromSsize_t(i) PyLong_FromSsize_t(i)
 #endif
 
 #ifndef Py_TPFLAGS_CHECKTYPES /* not in Py 3 */
 #define Py_TPFLAGS_CHECKTYPES 0
 #endif
 
+#if PY_MAJOR_VERSION >= 3 /* Py 2 types must opt in to bf_getbuffer */
+#define Py_TPFLAGS_HAVE_NEWBUFFER 0
+#endif
+
+#if PY_VERSION_HEX < 0x03090000 /* Py_SIZE() is not an lvalue in 3.11+ */
+#define Py_SET_SIZE(o, size) (Py_SIZE(o) = (size))
+#endif
+
 #if PY_MAJOR_VERSION >= 3
 #define RETURN_NOT_IMPLEMENTED {  \
     Py_INCREF(Py_NotImplemented); \
@@ -114,12 +125,32 @@ typedef struct {
     planar_vec2_t *vec;
     /* *vec points to the data[] array, so that it can
        be positioned differently in memory in subtypes */
+	Py_ssize_t buffer_shape[2]; /* Shape of exported buffers */
 	union {
 		planar_vec2_t data[1]; /* Used for fixed-length types */
-		Py_ssize_t allocated; /* Used for variable-length types */
+		struct { /* Used for variable-length types */
+			Py_ssize_t allocated;
+			Py_ssize_t exports; /* Number of exported buffers */
+			/* Memoryview of the file mapping containing the
+			   vectors, or NULL if they are allocated on the heap */
+			PyObject *mapping;
+		};
 	};
 } PlanarSeq2Object;
 
+typedef struct {
+    float x;
+    float y;
+} planar_vec2f_t;
+
+typedef struct {
+    PyObject_VAR_HEAD
+    planar_vec2f_t *vec;
+	Py_ssize_t buffer_shape[2]; /* Shape of exported buffers */
+	Py_ssize_t allocated;
+	Py_ssize_t exports; /* Number of exported buffers */
+} PlanarVec2Array32Object;
+
 typedef struct {
     PyObject_HEAD
     union {
@@ -137,15 +168,33 @@ typedef struct {
     };
 } PlanarBBoxObject;
 
+/* Uniform grid over a polygon's bounding box used to accelerate
+   point-in-polygon tests, see Polygon.prepare() */
+typedef struct {
+	planar_vec2_t min; /* Minimum corner of the grid */
+	double x_scale, y_scale; /* Cells per unit of x and y */
+	Py_ssize_t cols, rows;
+	Py_ssize_t *cell_start; /* Offset of each cell's edges, cols*rows+1 */
+	Py_ssize_t *cell_edges; /* Index of the end vertex of each cell edge */
+	int *winding; /* Winding number at each cell center */
+} planar_pip_grid_t;
+
 typedef struct {
 	PyObject_VAR_HEAD
     planar_vec2_t *vert;
 	unsigned long flags;
 	PlanarBBoxObject *bbox;
 	planar_vec2_t centroid;
+	double signed_area;
+	double perimeter;
 	double max_r2;
 	double min_r2;
 	planar_vec2_t *lt_y_poly, *rt_y_poly;
+	unsigned int *triangles; /* Cached triangle vertex indices */
+	Py_ssize_t triangle_count;
+	planar_pip_grid_t *grid; /* Point-in-polygon grid, when prepared */
+	unsigned long version; /* Incremented when the vertices change */
+	Py_ssize_t buffer_shape[2]; /* Shape of exported buffers */
 	planar_vec2_t data[1];
 } PlanarPolygonObject;
 
@@ -159,6 +208,50 @@ typedef struct {
 #define POLY_DUP_VERTS_FLAG 0x80
 #define POLY_CENTROID_KNOWN_FLAG 0x100
 #define POLY_RADIUS_KNOWN_FLAG 0x200
+#define POLY_AREA_KNOWN_FLAG 0x400
+#define POLY_PERIMETER_KNOWN_FLAG 0x800
+#define POLY_PREPARED_FLAG 0x1000
+
+/* Read and update the flags of a polygon that may be shared between
+   threads. Newly created polygons can assign their flags directly */
+#define POLY_FLAGS(poly) Planar_AtomicLoad(&(poly)->flags)
+#define POLY_SET_FLAGS(poly, bits) Planar_AtomicOr(&(poly)->flags, (bits))
+#define POLY_CLEAR_FLAGS(poly, bits) \
+	Planar_AtomicAnd(&(poly)->flags, ~(unsigned long)(bits))
+/* Replace the flags in mask with bits. Bits are set before the rest are
+   cleared so that threads storing the same result concurrently never
+   expose a missing flag */
+#define POLY_UPDATE_FLAGS(poly, mask, bits) {           \
+	unsigned long _update_bits = (bits);                \
+	POLY_SET_FLAGS((poly), _update_bits);               \
+	POLY_CLEAR_FLAGS((poly), (mask) & ~_update_bits);   \
+}
+
+typedef struct {
+	planar_vec2_t min;
+	planar_vec2_t max;
+	Py_ssize_t first; /* First child node, or shape index for leaf entries */
+	Py_ssize_t count; /* Number of child nodes, 0 for leaf entries */
+} planar_rtree_node_t;
+
+typedef struct {
+	PyObject_HEAD
+	PyObject *shapes; /* Tuple of indexed shapes */
+	planar_rtree_node_t *nodes; /* Tree nodes, root is last */
+	Py_ssize_t node_count;
+} PlanarRTreeObject;
+
+typedef struct {
+	planar_vec2_t pt;
+	Py_ssize_t index; /* Index of the point as originally indexed */
+} planar_kdtree_node_t;
+
+typedef struct {
+	PyObject_HEAD
+	Py_ssize_t size;
+	planar_kdtree_node_t *nodes; /* Implicit tree, each subtree's root
+	                                is at the midpoint of its range */
+} PlanarKDTreeObject;
 
 typedef struct {
     PyObject_HEAD
@@ -257,6 +350,226 @@ hash_double(double v)
 #define Py_BOOL(i) (i) ? (Py_INCREF(Py_True), Py_True) \
                        : (Py_INCREF(Py_False), Py_False)
 
+/***************************************************************************/
+
+/* Module state. From Python 3.12 each interpreter importing the module
+   gets its own copy of the types, exception and settings below so that
+   it can be used in isolated sub-interpreters (PEP 684). The heap types
+   are created from the static type definitions, which are used directly
+   by older Pythons that share a single state */
+
+#if PY_VERSION_HEX >= 0x030C0000
+#define PLANAR_HEAP_TYPES
+#endif
+
+/* List of deallocated objects kept for reuse */
+typedef struct {
+	PyObject *head;
+	int size;
+} planar_freelist_t;
+
+/* Statistics collected while enabled by planar.stats. The order must
+   match the names in cmodule.c */
+enum {
+	/* Point in polygon strategies, counted per point tested */
+	PLANAR_STAT_PIP_RADIUS_INSIDE,
+	PLANAR_STAT_PIP_RADIUS_OUTSIDE,
+	PLANAR_STAT_PIP_Y_MONOTONE,
+	PLANAR_STAT_PIP_BBOX_REJECT,
+	PLANAR_STAT_PIP_GRID,
+	PLANAR_STAT_PIP_WINDING,
+	/* Polygon cached properties, each with a hit, miss and
+	   invalidation counter in that order */
+	PLANAR_STAT_CACHE_CONVEX,
+	PLANAR_STAT_CACHE_SIMPLE = PLANAR_STAT_CACHE_CONVEX + 3,
+	PLANAR_STAT_CACHE_CENTROID = PLANAR_STAT_CACHE_SIMPLE + 3,
+	PLANAR_STAT_CACHE_AREA = PLANAR_STAT_CACHE_CENTROID + 3,
+	PLANAR_STAT_CACHE_PERIMETER = PLANAR_STAT_CACHE_AREA + 3,
+	PLANAR_STAT_CACHE_BBOX = PLANAR_STAT_CACHE_PERIMETER + 3,
+	PLANAR_STAT_CACHE_TRIANGLES = PLANAR_STAT_CACHE_BBOX + 3,
+	PLANAR_STAT_CACHE_Y_POLYLINES = PLANAR_STAT_CACHE_TRIANGLES + 3,
+	PLANAR_STAT_CACHE_GRID = PLANAR_STAT_CACHE_Y_POLYLINES + 3,
+	/* Timed operations, each with a call count and nanoseconds */
+	PLANAR_STAT_CLASSIFY = PLANAR_STAT_CACHE_GRID + 3,
+	PLANAR_STAT_CHECK_IS_SIMPLE = PLANAR_STAT_CLASSIFY + 2,
+	PLANAR_STAT_CONVEX_HULL = PLANAR_STAT_CHECK_IS_SIMPLE + 2,
+	PLANAR_STAT_COUNT = PLANAR_STAT_CONVEX_HULL + 2
+};
+
+typedef struct {
+	PyTypeObject *Vec2Type;
+	PyTypeObject *Seq2Type;
+	PyTypeObject *Vec2ArrayType;
+	PyTypeObject *Vec2Array32Type;
+	PyTypeObject *AffineType;
+	PyTypeObject *LineType;
+	PyTypeObject *RayType;
+	PyTypeObject *SegmentType;
+	PyTypeObject *BBoxType;
+	PyTypeObject *PolygonType;
+	PyTypeObject *RTreeType;
+	PyTypeObject *KDTreeType;
+	PyTypeObject *WKBIterType;
+	PyObject *TransformNotInvertibleError;
+	PyObject *from_points_str;
+	PyObject *bounding_box_str;
+	PyObject *from_bytes_func; /* planar.c._from_bytes() */
+	PyObject *array_type; /* array.array, imported on first use */
+	PyObject *holed_polygon_type; /* planar.wkb.PolygonWithHoles, ditto */
+	double epsilon; /* Accessed atomically, see PLANAR_EPSILON */
+	planar_freelist_t vec2_free;
+	planar_freelist_t affine_free;
+	planar_freelist_t bbox_free;
+	int stats_enabled;
+	PY_LONG_LONG stats[PLANAR_STAT_COUNT];
+} planar_state;
+
+#ifdef PLANAR_HEAP_TYPES
+/* The state of the main interpreter is found directly, the states of
+   sub-interpreters are cached per thread */
+typedef struct {
+	PY_INT64_T interp_id;
+	unsigned long generation;
+	planar_state *state;
+	planar_state *detached; /* State used while the GIL is released */
+} planar_state_cache_t;
+
+/* The globals below are shared by all interpreters, which may run in
+   parallel with their own GIL, so they are always accessed atomically */
+#ifdef _MSC_VER
+#include <intrin.h>
+#define Planar_SharedLoad(p) \
+	((unsigned long)_InterlockedOr((volatile long *)(p), 0))
+#define Planar_SharedIncrement(p) _InterlockedIncrement((volatile long *)(p))
+#define Planar_SharedLoadPtr(p) \
+	_InterlockedCompareExchangePointer((void *volatile *)(p), NULL, NULL)
+#define Planar_SharedStorePtr(p, value) \
+	_InterlockedExchangePointer((void *volatile *)(p), (value))
+#define Planar_SharedCompareExchangePtr(p, expected, value) \
+	(_InterlockedCompareExchangePointer( \
+		(void *volatile *)(p), (value), (expected)) == (expected))
+#else
+#define Planar_SharedLoad(p) __atomic_load_n((p), __ATOMIC_ACQUIRE)
+#define Planar_SharedIncrement(p) __atomic_add_fetch((p), 1, __ATOMIC_ACQ_REL)
+#define Planar_SharedLoadPtr(p) __atomic_load_n((p), __ATOMIC_ACQUIRE)
+#define Planar_SharedStorePtr(p, value) \
+	__atomic_store_n((p), (value), __ATOMIC_RELEASE)
+#define Planar_SharedCompareExchangePtr(p, expected, value) \
+	__extension__ ({ \
+		void *planar_expected_ = (expected); \
+		__atomic_compare_exchange_n((p), &planar_expected_, (value), 0, \
+			__ATOMIC_ACQ_REL, __ATOMIC_ACQUIRE); \
+	})
+#endif
+
+#ifdef _MSC_VER
+extern __declspec(thread) planar_state_cache_t planar_state_cache;
+#else
+extern _Thread_local planar_state_cache_t planar_state_cache;
+#endif
+/* Incremented when a module state is freed to invalidate the caches */
+extern unsigned long planar_state_generation;
+/* State of the main interpreter, which always has id 0 */
+extern planar_state *planar_main_state;
+extern struct PyModuleDef planar_moduledef;
+
+planar_state *Planar_LookupState(PY_INT64_T interp_id);
+
+/* Return the module state for the current interpreter. Between 
+   Planar_BeginNoGIL() and Planar_EndNoGIL(), when the thread has no
+   attached thread state, the state of the detached thread is returned */
+static planar_state *
+Planar_GetState(void)
+{
+	PY_INT64_T interp_id;
+	planar_state *state;
+
+	if (planar_state_cache.detached != NULL) {
+		return planar_state_cache.detached;
+	}
+	interp_id = PyInterpreterState_GetID(PyInterpreterState_Get());
+	if (interp_id == 0) {
+		state = (planar_state *)Planar_SharedLoadPtr(&planar_main_state);
+		if (state != NULL) {
+			return state;
+		}
+	}
+	if (planar_state_cache.state != NULL
+		&& planar_state_cache.interp_id == interp_id
+		&& planar_state_cache.generation 
+			== Planar_SharedLoad(&planar_state_generation)) {
+		return planar_state_cache.state;
+	}
+	return Planar_LookupState(interp_id);
+}
+
+/* Heap types are identified by the method table of their template */
+#define Planar_TypeIsExact(type, tmpl) \
+	((type)->tp_methods == (tmpl)->tp_methods)
+
+static int
+Planar_TypeIsSubtype(PyTypeObject *type, PyTypeObject *tmpl)
+{
+	for (; type != NULL; type = type->tp_base) {
+		if (type->tp_methods == tmpl->tp_methods) {
+			return 1;
+		}
+	}
+	return 0;
+}
+
+#define Planar_TypeCheck(op, tmpl) Planar_TypeIsSubtype(Py_TYPE(op), (tmpl))
+
+/* Return the module state of a type created by the module */
+#define Planar_TypeState(type) \
+	((planar_state *)PyType_GetModuleState(type))
+
+/* Instances of heap types own a reference to their type, which must be
+   released when they are deallocated and visited by the GC */
+#define Planar_DECREF_TYPE(type) Py_DECREF(type)
+#define Planar_VISIT_TYPE(self) Py_VISIT(Py_TYPE(self))
+#else
+extern planar_state planar_global_state;
+
+#define Planar_GetState() (&planar_global_state)
+#define Planar_TypeState(type) (&planar_global_state)
+#define Planar_TypeIsExact(type, tmpl) ((type) == (tmpl))
+#define Planar_TypeIsSubtype(type, tmpl) PyType_IsSubtype((type), (tmpl))
+#define Planar_TypeCheck(op, tmpl) PyObject_TypeCheck((op), (tmpl))
+#define Planar_DECREF_TYPE(type)
+#define Planar_VISIT_TYPE(self)
+#endif
+
+#define Planar_TypeCheckExact(op, tmpl) Planar_TypeIsExact(Py_TYPE(op), (tmpl))
+
+/* The type of the current interpreter defined by Planar<name>Type */
+#define PLANAR_TYPE(name) (Planar_GetState()->name##Type)
+
+/* Epsilon squared is derived from a single read of epsilon, so the two
+   values used are always consistent, even while another thread changes 
+   them in builds without the GIL */
+#define PLANAR_EPSILON Planar_AtomicLoadDouble(&Planar_GetState()->epsilon)
+#define PLANAR_EPSILON2 Planar_Epsilon2()
+#define PlanarTransformNotInvertibleError \
+	(Planar_GetState()->TransformNotInvertibleError)
+
+/* Allocate an object of the type specified */
+static PyObject *
+Planar_Alloc(PyTypeObject *type)
+{
+	return type->tp_alloc(type, 0);
+}
+
+/* Free an object and release the reference to its type */
+static void
+Planar_FreeObject(PyObject *self)
+{
+	PyTypeObject *type = Py_TYPE(self);
+
+	type->tp_free(self);
+	Planar_DECREF_TYPE(type);
+}
+
 /* Call the method "from_points(points)" on the Python object
    specified. This is the generic API for instantiating 
    a planar object from a sequence of points 
@@ -264,45 +577,83 @@ hash_double(double v)
 static PyObject *
 call_from_points(PyObject *obj, PyObject *points) 
 {
-	static PyObject *from_points_str = NULL;
-
-	if (from_points_str == NULL) {
-		from_points_str = PyUnicode_InternFromString("from_points");
-		if (from_points_str == NULL) {
-			return NULL;
-		}
-	}
-	return PyObject_CallMethodObjArgs(obj, from_points_str, points, NULL);
+	return PyObject_CallMethodObjArgs(
+		obj, Planar_GetState()->from_points_str, points, NULL);
 }
 
-/***************************************************************************/
-
-extern double PLANAR_EPSILON;
-extern double PLANAR_EPSILON2;
-
 extern PyTypeObject PlanarVec2Type;
 extern PyTypeObject PlanarSeq2Type;
 extern PyTypeObject PlanarVec2ArrayType;
+extern PyTypeObject PlanarVec2Array32Type;
 extern PyTypeObject PlanarAffineType;
 extern PyTypeObject PlanarLineType;
 extern PyTypeObject PlanarRayType;
 extern PyTypeObject PlanarSegmentType;
 extern PyTypeObject PlanarBBoxType;
 extern PyTypeObject PlanarPolygonType;
+extern PyTypeObject PlanarRTreeType;
+extern PyTypeObject PlanarKDTreeType;
+extern PyTypeObject PlanarWKBIterType;
+
+PyObject *Planar_find_intersections(PyObject *module, PyObject *segments);
 
-extern PyObject *PlanarTransformNotInvertibleError;
+/* Edge stored as a node of a sweep line status tree, an AVL tree
+   of the nodes in an array linked by index. Edge endpoints are
+   stored in lexicographical order */
+typedef struct {
+	planar_vec2_t *start;
+	planar_vec2_t *end;
+	Py_ssize_t left;
+	Py_ssize_t right;
+	Py_ssize_t parent;
+	int height;
+} planar_edge_node_t;
+
+Py_ssize_t edge_tree_first(planar_edge_node_t *nodes, Py_ssize_t n);
+Py_ssize_t edge_tree_prev(planar_edge_node_t *nodes, Py_ssize_t n);
+Py_ssize_t edge_tree_next(planar_edge_node_t *nodes, Py_ssize_t n);
+void edge_tree_insert_after(planar_edge_node_t *nodes, Py_ssize_t *root,
+	Py_ssize_t n, Py_ssize_t after);
+void edge_tree_remove(planar_edge_node_t *nodes, Py_ssize_t *root, 
+	Py_ssize_t n);
+
+typedef int (*planar_intersection_func)(double x, double y, 
+	Py_ssize_t *segments, Py_ssize_t count, void *arg);
+
+int planar_find_intersections(planar_vec2_t *ends, Py_ssize_t n,
+	planar_intersection_func report, void *arg);
+int planar_snap_points(planar_vec2_t *points, Py_ssize_t n);
+
+PyObject *Planar_from_wkb(PyObject *module, PyObject *data);
+PyObject *Planar_iter_wkb(PyObject *module, PyObject *data);
+PyObject *Planar_to_wkb(PyObject *module, PyObject *geom);
+
+#if PY_VERSION_HEX >= 0x03090000
+PyObject *PlanarVec2_vectorcall(PyObject *type, PyObject *const *args, 
+	size_t nargsf, PyObject *kwnames);
+PyObject *PlanarAffine_vectorcall(PyObject *type, PyObject *const *args, 
+	size_t nargsf, PyObject *kwnames);
+PyObject *PlanarBBox_vectorcall(PyObject *type, PyObject *const *args, 
+	size_t nargsf, PyObject *kwnames);
+PyObject *PlanarLine_vectorcall(PyObject *type, PyObject *const *args, 
+	size_t nargsf, PyObject *kwnames);
+PyObject *PlanarRay_vectorcall(PyObject *type, PyObject *const *args, 
+	size_t nargsf, PyObject *kwnames);
+PyObject *PlanarSegment_vectorcall(PyObject *type, PyObject *const *args, 
+	size_t nargsf, PyObject *kwnames);
+#endif
 
 /* Vec2 utils */
 
-#define PlanarVec2_Check(op) PyObject_TypeCheck(op, &PlanarVec2Type)
-#define PlanarVec2_CheckExact(op) (Py_TYPE(op) == &PlanarVec2Type)
+#define PlanarVec2_Check(op) Planar_TypeCheck(op, &PlanarVec2Type)
+#define PlanarVec2_CheckExact(op) Planar_TypeCheckExact(op, &PlanarVec2Type)
 
 static PlanarVec2Object *
 PlanarVec2_FromDoubles(double x, double y)
 {
     PlanarVec2Object *v;
 
-    v = (PlanarVec2Object *)PlanarVec2Type.tp_alloc(&PlanarVec2Type, 0);
+    v = (PlanarVec2Object *)Planar_Alloc(PLANAR_TYPE(Vec2));
     if (v == NULL) {
         return NULL;
     }
@@ -316,7 +667,7 @@ PlanarVec2_FromStruct(planar_vec2_t *vs)
 {
     PlanarVec2Object *v;
 
-    v = (PlanarVec2Object *)PlanarVec2Type.tp_alloc(&PlanarVec2Type, 0);
+    v = (PlanarVec2Object *)Planar_Alloc(PLANAR_TYPE(Vec2));
     if (v == NULL) {
         return NULL;
     }
@@ -439,10 +790,477 @@ done:
 	return repr;
 }
 
+/* GIL utils */
+
+/* Sequences of at least this many vectors are processed
+   with the GIL released */
+#define PLANAR_NOGIL_MIN_SIZE 2048
+
+/* Release the GIL to process a sequence of the given size. Return the
+   thread state to pass to Planar_EndNoGIL(), or NULL if the sequence is
+   too small to be worth releasing the GIL for */
+static PyThreadState *
+Planar_BeginNoGIL(Py_ssize_t size)
+{
+	if (size < PLANAR_NOGIL_MIN_SIZE) {
+		return NULL;
+	}
+#ifdef PLANAR_HEAP_TYPES
+	/* Make the module state available while detached */
+	planar_state_cache.detached = Planar_GetState();
+#endif
+	return PyEval_SaveThread();
+}
+
+static void
+Planar_EndNoGIL(PyThreadState *state)
+{
+	if (state != NULL) {
+		PyEval_RestoreThread(state);
+#ifdef PLANAR_HEAP_TYPES
+		planar_state_cache.detached = NULL;
+#endif
+	}
+}
+
+/* Free threading utils. In builds without the GIL (PEP 703), polygon
+   flag updates are atomic, and polygon cached structures are managed
+   within per-object critical sections. With the GIL these all reduce
+   to plain code */
+
+#ifdef Py_GIL_DISABLED
+#ifdef _MSC_VER
+#include <intrin.h>
+#define Planar_AtomicOr(p, bits) \
+	_InterlockedOr((volatile long *)(p), (long)(bits))
+#define Planar_AtomicAnd(p, bits) \
+	_InterlockedAnd((volatile long *)(p), (long)(bits))
+#define Planar_AtomicLoad(p) \
+	((unsigned long)_InterlockedOr((volatile long *)(p), 0))
+
+static double
+Planar_AtomicLoadDouble(const double *p)
+{
+	__int64 bits = __iso_volatile_load64((const volatile __int64 *)p);
+	double value;
+
+	memcpy(&value, &bits, sizeof(value));
+	return value;
+}
+
+static void
+Planar_AtomicStoreDouble(double *p, double value)
+{
+	__int64 bits;
+
+	memcpy(&bits, &value, sizeof(bits));
+	__iso_volatile_store64((volatile __int64 *)p, bits);
+}
+#else
+#define Planar_AtomicOr(p, bits) __atomic_fetch_or((p), (bits), __ATOMIC_SEQ_CST)
+#define Planar_AtomicAnd(p, bits) \
+	__atomic_fetch_and((p), (bits), __ATOMIC_SEQ_CST)
+#define Planar_AtomicLoad(p) __atomic_load_n((p), __ATOMIC_ACQUIRE)
+
+static double
+Planar_AtomicLoadDouble(const double *p)
+{
+	double value;
+
+	__atomic_load(p, &value, __ATOMIC_RELAXED);
+	return value;
+}
+
+static void
+Planar_AtomicStoreDouble(double *p, double value)
+{
+	__atomic_store(p, &value, __ATOMIC_RELAXED);
+}
+#endif
+#define Planar_BEGIN_CRITICAL_SECTION(op) Py_BEGIN_CRITICAL_SECTION(op)
+#define Planar_END_CRITICAL_SECTION() Py_END_CRITICAL_SECTION()
+#else
+#define Planar_AtomicOr(p, bits) (*(p) |= (bits))
+#define Planar_AtomicAnd(p, bits) (*(p) &= (bits))
+#define Planar_AtomicLoad(p) (*(p))
+#define Planar_AtomicLoadDouble(p) (*(p))
+#define Planar_AtomicStoreDouble(p, value) (*(p) = (value))
+#define Planar_BEGIN_CRITICAL_SECTION(op) {
+#define Planar_END_CRITICAL_SECTION() }
+#endif
+
+static double
+Planar_Epsilon2(void)
+{
+	double epsilon = PLANAR_EPSILON;
+
+	return epsilon * epsilon;
+}
+
+/* Statistics utils. Counters in the module state are only updated while
+   planar.stats is enabled, otherwise each costs a flag test. They are not
+   updated with the GIL released */
+
+#ifdef Py_GIL_DISABLED
+#ifdef _MSC_VER
+#define Planar_StatAdd(p, n) \
+	_InterlockedExchangeAdd64((volatile __int64 *)(p), (n))
+#else
+#define Planar_StatAdd(p, n) __atomic_fetch_add((p), (n), __ATOMIC_RELAXED)
+#endif
+#else
+#define Planar_StatAdd(p, n) (*(p) += (n))
+#endif
+
+#define PLANAR_STAT_ADD(stat, n) {                          \
+	planar_state *stat_state_ = Planar_GetState();          \
+	if (stat_state_->stats_enabled) {                       \
+		Planar_StatAdd(&stat_state_->stats[stat], (n));     \
+	}                                                       \
+}
+#define PLANAR_STAT(stat) PLANAR_STAT_ADD(stat, 1)
+
+/* Count a hit or miss of the polygon cached property stat */
+#define PLANAR_STAT_CACHE(stat, hit) PLANAR_STAT((stat) + !(hit))
+#define PLANAR_STAT_INVALIDATED(stat) PLANAR_STAT((stat) + 2)
+
+/* Return a monotonic time in nanoseconds */
+PY_LONG_LONG Planar_Clock(void);
+
+/* Return the start time of a timed operation to pass to
+   PLANAR_STAT_TIME() when it is done, or 0 if stats are disabled */
+#define PLANAR_STAT_START() \
+	(Planar_GetState()->stats_enabled ? Planar_Clock() : 0)
+
+#define PLANAR_STAT_TIME(stat, start) {                     \
+	if (start) {                                            \
+		PLANAR_STAT(stat);                                  \
+		PLANAR_STAT_ADD((stat) + 1, Planar_Clock() - (start)); \
+	}                                                       \
+}
+
+/* Freelist utils. Objects are only reused for the exact type of the
+   list, their first member after the object head must be next_free.
+   Freelists are kept in the module state. They are not used in 
+   free-threaded builds, where a shared list would need a lock and
+   objects left on per thread lists would leak when the thread exits */
+
+typedef struct {
+    PyObject_HEAD
+    PyObject *next_free;
+} PlanarFreeObject;
+
+/* Return the freelist name for the exact type specified */
+#ifdef Py_GIL_DISABLED
+#define PLANAR_FREELIST(name, type) ((planar_freelist_t *)NULL)
+#else
+#define PLANAR_FREELIST(name, type) (&Planar_TypeState(type)->name##_free)
+#endif
+
+/* Return an object from the freelist initialized as an instance of
+   type, or NULL if the list is empty */
+static PyObject *
+Planar_FreeListPop(planar_freelist_t *list, PyTypeObject *type)
+{
+	PyObject *op;
+
+	if (list == NULL || list->head == NULL) {
+		return NULL;
+	}
+	op = list->head;
+	list->head = ((PlanarFreeObject *)op)->next_free;
+	--list->size;
+	return PyObject_Init(op, type);
+}
+
+/* Add a deallocated object to the freelist, return 0 if it is full */
+static int
+Planar_FreeListPush(planar_freelist_t *list, PyObject *op, int max_size)
+{
+	if (list == NULL || list->size >= max_size) {
+		return 0;
+	}
+	((PlanarFreeObject *)op)->next_free = list->head;
+	list->head = op;
+	++list->size;
+	return 1;
+}
+
+/* Free the objects in a freelist */
+static void
+Planar_FreeListClear(planar_freelist_t *list)
+{
+	PyObject *op;
+
+	while (list->head != NULL) {
+		op = list->head;
+		list->head = ((PlanarFreeObject *)op)->next_free;
+		PyObject_Free(op);
+	}
+	list->size = 0;
+}
+
+/* Calling convention utils */
+
+/* Methods taking a few positional arguments use METH_FASTCALL where
+   available to avoid building an argument tuple. They are defined as
+   func(self, args, nargs) with args a C array. On older Pythons 
+   Planar_DEFINE_FASTCALL_COMPAT(func) defines a tuple taking wrapper */
+#if PY_VERSION_HEX >= 0x03070000
+#define PLANAR_METH_FASTCALL METH_FASTCALL
+#define Planar_FASTCALL(func) ((PyCFunction)(void (*)(void))(func))
+#define Planar_DEFINE_FASTCALL_COMPAT(func)
+#else
+#define PLANAR_METH_FASTCALL METH_VARARGS
+#define Planar_FASTCALL(func) ((PyCFunction)func##_varargs)
+#define Planar_DEFINE_FASTCALL_COMPAT(func)                     \
+static PyObject *                                                \
+func##_varargs(PyObject *self, PyObject *args)                   \
+{                                                                \
+    return (PyObject *)func((void *)self,                        \
+        &PyTuple_GET_ITEM(args, 0), PyTuple_GET_SIZE(args));     \
+}
+#endif
+
+/* Check the number of positional arguments passed to a function,
+   return 0 and set TypeError if it is not the number expected */
+static int
+Planar_CheckArgCount(const char *name, Py_ssize_t nargs, Py_ssize_t expected)
+{
+	if (nargs != expected) {
+		PyErr_Format(PyExc_TypeError, 
+			"%.200s() takes exactly %d argument%s (%d given)", name, 
+			(int)expected, expected == 1 ? "" : "s", (int)nargs);
+		return 0;
+	}
+	return 1;
+}
+
+/* Methods taking keyword arguments use METH_FASTCALL | METH_KEYWORDS
+   where available. They are defined as func(self, args, nargs, kwnames)
+   with the keyword values following the positional ones in args, and
+   parse them with Planar_ParseKeywords(). On older Pythons
+   Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(func) defines a wrapper taking 
+   an argument tuple and keyword dict */
+typedef PyObject *(*planar_fastcallkwfunc)(PyObject *self, 
+	PyObject *const *args, Py_ssize_t nargs, PyObject *kwnames);
+
+#if PY_VERSION_HEX >= 0x03070000
+#define PLANAR_METH_FASTCALL_KEYWORDS (METH_FASTCALL | METH_KEYWORDS)
+#define Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(func)
+#else
+#define PLANAR_METH_FASTCALL_KEYWORDS (METH_VARARGS | METH_KEYWORDS)
+#define Planar_DEFINE_FASTCALL_KEYWORDS_COMPAT(func)            \
+static PyObject *                                                \
+func##_varargs(PyObject *self, PyObject *args, PyObject *kwargs) \
+{                                                                \
+    return Planar_CallFastcallKeywords(                          \
+        (planar_fastcallkwfunc)func, self, args, kwargs);        \
+}
+
+/* Call a fastcall keywords function with an argument tuple and
+   keyword dict */
+static PyObject *
+Planar_CallFastcallKeywords(planar_fastcallkwfunc func, PyObject *self,
+	PyObject *args, PyObject *kwargs)
+{
+	Py_ssize_t i, nargs = PyTuple_GET_SIZE(args);
+	Py_ssize_t pos = 0, nkw = kwargs != NULL ? PyDict_Size(kwargs) : 0;
+	PyObject **stack, *kwnames = NULL, *key, *value, *result;
+
+	if (nkw == 0) {
+		return func(self, &PyTuple_GET_ITEM(args, 0), nargs, NULL);
+	}
+	stack = PyMem_New(PyObject *, nargs + nkw);
+	kwnames = PyTuple_New(nkw);
+	if (stack == NULL || kwnames == NULL) {
+		PyMem_Free(stack);
+		Py_XDECREF(kwnames);
+		return PyErr_NoMemory();
+	}
+	for (i = 0; i < nargs; ++i) {
+		stack[i] = PyTuple_GET_ITEM(args, i);
+	}
+	for (i = 0; PyDict_Next(kwargs, &pos, &key, &value); ++i) {
+		Py_INCREF(key);
+		PyTuple_SET_ITEM(kwnames, i, key);
+		stack[nargs + i] = value;
+	}
+	result = func(self, stack, nargs, kwnames);
+	PyMem_Free(stack);
+	Py_DECREF(kwnames);
+	return result;
+}
+#endif
+
+#define Planar_FASTCALL_KEYWORDS(func) Planar_FASTCALL(func)
+
+/* Return the contents of a string object as a C string, or NULL if
+   it is not a string */
+static const char *
+Planar_AsString(PyObject *op)
+{
+#if PY_MAJOR_VERSION >= 3
+	if (PyUnicode_Check(op)) {
+		return PyUnicode_AsUTF8(op);
+	}
+#else
+	if (PyString_Check(op)) {
+		return PyString_AS_STRING(op);
+	}
+#endif
+	return NULL;
+}
+
+/* Match the positional and keyword arguments passed to a fastcall
+   keywords function against the NULL terminated parameter names in 
+   kwlist. The first required parameters must be passed. Store the 
+   argument for each parameter in values, or NULL when it is omitted.
+   Return 0 and set TypeError if the arguments do not match */
+static int
+Planar_ParseKeywords(const char *name, PyObject *const *args, 
+	Py_ssize_t nargs, PyObject *kwnames, const char *const *kwlist,
+	Py_ssize_t required, PyObject **values)
+{
+	Py_ssize_t i, j, count, nkw;
+	const char *key;
+
+	for (count = 0; kwlist[count] != NULL; ++count);
+	if (nargs > count) {
+		PyErr_Format(PyExc_TypeError, 
+			"%.200s() takes at most %d argument%s (%d given)", name, 
+			(int)count, count == 1 ? "" : "s", (int)nargs);
+		return 0;
+	}
+	for (i = 0; i < count; ++i) {
+		values[i] = i < nargs ? args[i] : NULL;
+	}
+	nkw = kwnames != NULL ? PyTuple_GET_SIZE(kwnames) : 0;
+	for (j = 0; j < nkw; ++j) {
+		key = Planar_AsString(PyTuple_GET_ITEM(kwnames, j));
+		if (key == NULL) {
+			if (!PyErr_Occurred()) {
+				PyErr_SetString(PyExc_TypeError, "keywords must be strings");
+			}
+			return 0;
+		}
+		for (i = 0; i < count && strcmp(key, kwlist[i]) != 0; ++i);
+		if (i == count) {
+			PyErr_Format(PyExc_TypeError, 
+				"'%.200s' is an invalid keyword argument for %.200s()",
+				key, name);
+			return 0;
+		}
+		if (values[i] != NULL) {
+			PyErr_Format(PyExc_TypeError, 
+				"%.200s() got multiple values for argument '%.200s'",
+				name, key);
+			return 0;
+		}
+		values[i] = args[nargs + j];
+	}
+	for (i = 0; i < required; ++i) {
+		if (values[i] == NULL) {
+			PyErr_Format(PyExc_TypeError, 
+				"%.200s() missing required argument '%.200s' (pos %d)",
+				name, kwlist[i], (int)(i + 1));
+			return 0;
+		}
+	}
+	return 1;
+}
+
+/* Convert an optional float argument, leaving value unchanged if
+   arg is NULL. Return 0 and set an exception on failure */
+static int
+Planar_OptionalDouble(PyObject *arg, double *value)
+{
+	double v;
+
+	if (arg != NULL) {
+		v = PyFloat_AsDouble(arg);
+		if (v == -1.0 && PyErr_Occurred()) {
+			return 0;
+		}
+		*value = v;
+	}
+	return 1;
+}
+
+/* Convert an optional integer argument, leaving value unchanged if
+   arg is NULL. Return 0 and set an exception on failure */
+static int
+Planar_OptionalSsize(PyObject *arg, Py_ssize_t *value)
+{
+	Py_ssize_t v;
+
+	if (arg != NULL) {
+		v = PyNumber_AsSsize_t(arg, PyExc_OverflowError);
+		if (v == -1 && PyErr_Occurred()) {
+			return 0;
+		}
+		*value = v;
+	}
+	return 1;
+}
+
+#if PY_VERSION_HEX >= 0x03090000
+/* Initialize an object from a C array of positional arguments */
+typedef int (*planar_initarrayfunc)(PyObject *self, 
+	PyObject *const *args, Py_ssize_t nargs);
+
+/* Create an instance of type from vectorcall arguments. Instances of the
+   exact base type are allocated and initialized directly. Subtypes and
+   keyword arguments take the generic path through tp_new and tp_init */
+static PyObject *
+Planar_VectorcallNew(PyTypeObject *base, planar_initarrayfunc init,
+	PyObject *type, PyObject *const *args, size_t nargsf, PyObject *kwnames)
+{
+	Py_ssize_t i, nargs = PyVectorcall_NARGS(nargsf);
+	PyObject *self, *tuple, *kwargs = NULL;
+
+	if (Planar_TypeIsExact((PyTypeObject *)type, base)
+		&& (kwnames == NULL || PyTuple_GET_SIZE(kwnames) == 0)) {
+		self = ((PyTypeObject *)type)->tp_alloc((PyTypeObject *)type, 0);
+		if (self != NULL && init(self, args, nargs) == -1) {
+			Py_CLEAR(self);
+		}
+		return self;
+	}
+	tuple = PyTuple_New(nargs);
+	if (tuple == NULL) {
+		return NULL;
+	}
+	for (i = 0; i < nargs; ++i) {
+		Py_INCREF(args[i]);
+		PyTuple_SET_ITEM(tuple, i, args[i]);
+	}
+	if (kwnames != NULL) {
+		kwargs = PyDict_New();
+		if (kwargs == NULL) {
+			Py_DECREF(tuple);
+			return NULL;
+		}
+		for (i = 0; i < PyTuple_GET_SIZE(kwnames); ++i) {
+			if (PyDict_SetItem(kwargs, PyTuple_GET_ITEM(kwnames, i), 
+				args[nargs + i]) == -1) {
+				Py_DECREF(tuple);
+				Py_DECREF(kwargs);
+				return NULL;
+			}
+		}
+	}
+	self = PyType_Type.tp_call(type, tuple, kwargs);
+	Py_DECREF(tuple);
+	Py_XDECREF(kwargs);
+	return self;
+}
+#endif
+
 /* Seq2 utils */
 
-#define PlanarSeq2_Check(op) PyObject_TypeCheck(op, &PlanarSeq2Type)
-#define PlanarSeq2_CheckExact(op) (Py_TYPE(op) == &PlanarSeq2Type)
+#define PlanarSeq2_Check(op) Planar_TypeCheck(op, &PlanarSeq2Type)
+#define PlanarSeq2_CheckExact(op) Planar_TypeCheckExact(op, &PlanarSeq2Type)
 
 static PlanarSeq2Object *
 Seq2_New(PyTypeObject *type, Py_ssize_t size)
@@ -452,7 +1270,7 @@ Seq2_New(PyTypeObject *type, Py_ssize_t size)
     if (varray == NULL) {
 		return NULL;
     }
-	Py_SIZE(varray) = size;
+	Py_SET_SIZE(varray, size);
 	if (type->tp_itemsize == 0) {
 		/* We assume this means that the items are
 		   externally allocated */
@@ -462,6 +1280,7 @@ Seq2_New(PyTypeObject *type, Py_ssize_t size)
 			return (PlanarSeq2Object *)PyErr_NoMemory();
 		}
 		varray->allocated = size;
+		varray->exports = 0;
     } else {
 		/* Items allocated inline */
 		varray->vec = varray->data;
@@ -469,15 +1288,331 @@ Seq2_New(PyTypeObject *type, Py_ssize_t size)
     return varray;
 }
 
+#if PY_MAJOR_VERSION >= 3
+#define Planar_CheckBuffer(o) PyObject_CheckBuffer(o)
+#define Planar_GetBuffer(o, view, flags) PyObject_GetBuffer(o, view, flags)
+#else
+/* In Py 2, array.array only supports the old buffer interface, so 
+   one dimensional views of arrays of doubles and floats are made for
+   it here, allowing them to be used as buffers of vectors as in Py 3 */
+static char *
+Planar_OldArrayFormat(PyObject *obj, Py_ssize_t *itemsize)
+{
+	PyObject *typecode;
+	char *format = NULL;
+
+	if (PyObject_CheckBuffer(obj) || !PyObject_CheckReadBuffer(obj)
+		|| !PyObject_HasAttrString(obj, "typecode")) {
+		return NULL;
+	}
+	typecode = PyObject_GetAttrString(obj, "typecode");
+	if (typecode == NULL) {
+		PyErr_Clear();
+		return NULL;
+	}
+	if (PyString_Check(typecode) && PyString_GET_SIZE(typecode) == 1) {
+		if (PyString_AS_STRING(typecode)[0] == 'd') {
+			format = "d";
+			*itemsize = sizeof(double);
+		} else if (PyString_AS_STRING(typecode)[0] == 'f') {
+			format = "f";
+			*itemsize = sizeof(float);
+		}
+	}
+	Py_DECREF(typecode);
+	return format;
+}
+
+static int
+Planar_CheckBuffer(PyObject *obj)
+{
+	Py_ssize_t itemsize;
+
+	return PyObject_CheckBuffer(obj) 
+		|| Planar_OldArrayFormat(obj, &itemsize) != NULL;
+}
+
+static int
+Planar_GetBuffer(PyObject *obj, Py_buffer *view, int flags)
+{
+	Py_ssize_t itemsize, len;
+	char *format;
+	void *buf;
+
+	format = Planar_OldArrayFormat(obj, &itemsize);
+	if (format == NULL) {
+		return PyObject_GetBuffer(obj, view, flags);
+	}
+	if ((flags & PyBUF_WRITABLE) == PyBUF_WRITABLE) {
+		if (PyObject_AsWriteBuffer(obj, &buf, &len) == -1) {
+			return -1;
+		}
+	} else if (PyObject_AsReadBuffer(obj, (const void **)&buf, &len) == -1) {
+		return -1;
+	}
+	if (PyBuffer_FillInfo(view, obj, buf, len, 0, flags) == -1) {
+		return -1;
+	}
+	view->itemsize = itemsize;
+	view->format = (flags & PyBUF_FORMAT) == PyBUF_FORMAT ? format : NULL;
+	view->smalltable[0] = len / itemsize;
+	view->smalltable[1] = itemsize;
+	view->shape = (flags & PyBUF_ND) == PyBUF_ND ? 
+		&view->smalltable[0] : NULL;
+	view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? 
+		&view->smalltable[1] : NULL;
+	return 0;
+}
+#endif
+
+/* Return a Seq2 object for a sequence of points for batch operations.
+   Buffers and arbitrary iterables are copied, Seq2 objects
+   are used directly */
+static PlanarSeq2Object *
+Seq2_FromPoints(PyObject *points)
+{
+	if (PlanarSeq2_Check(points)) {
+		Py_INCREF(points);
+		return (PlanarSeq2Object *)points;
+	} else if (Planar_CheckBuffer(points)) {
+		return (PlanarSeq2Object *)PyObject_CallMethod(
+			(PyObject *)PLANAR_TYPE(Vec2Array), "from_buffer", "O", points);
+	} else {
+		return (PlanarSeq2Object *)PyObject_CallFunctionObjArgs(
+			(PyObject *)PLANAR_TYPE(Seq2), points, NULL);
+	}
+}
+
+/* Set the shape and strides of a buffer view of size contiguous vectors
+   as a 2 dimensional (size, 2) array of items of itemsize bytes. The
+   shape is stored in the exporting object rather than allocated for
+   each view, because the Py 2 memoryview copies the views it holds,
+   and exports copies of them */
+static void
+Seq2_SetBufferShape(Py_buffer *view, Py_ssize_t *shape, Py_ssize_t size,
+	Py_ssize_t itemsize, int flags)
+{
+	static Py_ssize_t double_strides[2] = {
+		2 * sizeof(double), sizeof(double)};
+	static Py_ssize_t float_strides[2] = {
+		2 * sizeof(float), sizeof(float)};
+
+	view->ndim = 1;
+	view->shape = NULL;
+	view->strides = NULL;
+	view->internal = NULL;
+	if ((flags & PyBUF_ND) == PyBUF_ND) {
+		shape[0] = size;
+		shape[1] = 2;
+		view->ndim = 2;
+		view->shape = shape;
+		if ((flags & PyBUF_STRIDES) == PyBUF_STRIDES) {
+			view->strides = itemsize == sizeof(float) ? 
+				float_strides : double_strides;
+		}
+	}
+}
+
+/* Fill in a buffer view of a contiguous vector array as a 2 dimensional
+   (size, 2) array of doubles, using shape to store its shape */
+static int
+Seq2_GetBuffer(PyObject *obj, planar_vec2_t *vec, Py_ssize_t size, 
+	Py_ssize_t *shape, int readonly, Py_buffer *view, int flags)
+{
+	if (readonly && (flags & PyBUF_WRITABLE) == PyBUF_WRITABLE) {
+		PyErr_Format(PyExc_BufferError, 
+			"%.200s object buffer is read-only", Py_TYPE(obj)->tp_name);
+		view->obj = NULL;
+		return -1;
+	}
+	Seq2_SetBufferShape(view, shape, size, sizeof(double), flags);
+	view->buf = vec;
+	view->obj = obj;
+	Py_INCREF(obj);
+	view->len = size * sizeof(planar_vec2_t);
+	view->readonly = readonly;
+	view->itemsize = sizeof(double);
+	view->format = (flags & PyBUF_FORMAT) == PyBUF_FORMAT ? "d" : NULL;
+	view->suboffsets = NULL;
+	return 0;
+}
+
+/* Return a value for __reduce_ex__() that pickles an object's vectors
+   using its buffer interface. The object is recreated by passing its 
+   type and the data to planar.c._from_bytes(), which calls the 
+   _from_bytes() class method of the type, and state, if not NULL,
+   is passed to its __setstate__() method. At protocol 5 and higher, the
+   data is pickled as a PickleBuffer so that it may be sent out-of-band
+   without copying */
+static PyObject *
+Seq2_Reduce(PyObject *self, PyObject *args, PyObject *state)
+{
+	PyObject *data;
+	Py_buffer view;
+	int protocol = 0;
+
+	if (!PyArg_ParseTuple(args, "|i:__reduce_ex__", &protocol)) {
+		return NULL;
+	}
+#if PY_VERSION_HEX >= 0x03080000
+	if (protocol >= 5) {
+		data = PyPickleBuffer_FromObject(self);
+	} else
+#endif
+	if (PyObject_GetBuffer(self, &view, PyBUF_SIMPLE) == 0) {
+		data = PyBytes_FromStringAndSize((char *)view.buf, view.len);
+		PyBuffer_Release(&view);
+	} else {
+		data = NULL;
+	}
+	if (data == NULL) {
+		return NULL;
+	}
+	if (state != NULL) {
+		return Py_BuildValue("O(ON)O", Planar_GetState()->from_bytes_func,
+			(PyObject *)Py_TYPE(self), data, state);
+	}
+	return Py_BuildValue("O(ON)", Planar_GetState()->from_bytes_func,
+		(PyObject *)Py_TYPE(self), data);
+}
+
+/* Get a simple buffer view of a bytes-like object containing packed 
+   vectors of vec_size bytes, as pickled by Seq2_Reduce(). Return the
+   number of vectors, or -1 on error. The view must be released with
+   PyBuffer_Release() */
+static Py_ssize_t
+Seq2_GetBytesView(PyObject *data, Py_buffer *view, size_t vec_size)
+{
+	if (PyObject_GetBuffer(data, view, PyBUF_SIMPLE) == -1) {
+		return -1;
+	}
+	if (view->len % vec_size != 0) {
+		PyErr_Format(PyExc_ValueError,
+			"Expected data length to be a multiple of %d bytes", 
+			(int)vec_size);
+		PyBuffer_Release(view);
+		return -1;
+	}
+	return view->len / vec_size;
+}
+
+/* Get a buffer view of a vector array from an object supporting the 
+   buffer protocol. The buffer must contain doubles with the shape (n, 2)
+   or (2*n,). On success, the number of vectors and the strides in bytes
+   between vectors and between the x and y components are stored. 
+   The view must be released with PyBuffer_Release() */
+static int
+Seq2_GetVec2View(PyObject *obj, Py_buffer *view, int writable, 
+	Py_ssize_t *size, Py_ssize_t *stride, Py_ssize_t *ystride)
+{
+	int flags = PyBUF_STRIDES | PyBUF_FORMAT;
+
+	if (writable) {
+		flags |= PyBUF_WRITABLE;
+	}
+	if (Planar_GetBuffer(obj, view, flags) == -1) {
+		return -1;
+	}
+	if (view->itemsize != sizeof(double) || view->format == NULL
+		|| (strcmp(view->format, "d") != 0 
+			&& strcmp(view->format, "@d") != 0
+			&& strcmp(view->format, "=d") != 0)) {
+		PyErr_Format(PyExc_TypeError,
+			"Expected buffer of doubles, got format '%.20s'",
+			view->format != NULL ? view->format : "B");
+		PyBuffer_Release(view);
+		return -1;
+	}
+	if (view->ndim == 2 && view->shape[1] == 2) {
+		*size = view->shape[0];
+		*stride = view->strides[0];
+		*ystride = view->strides[1];
+	} else if (view->ndim == 1 && view->shape[0] % 2 == 0) {
+		*size = view->shape[0] / 2;
+		*stride = view->strides[0] * 2;
+		*ystride = view->strides[0];
+	} else {
+		PyErr_SetString(PyExc_ValueError,
+			"Expected buffer of shape (n, 2) or (2*n,)");
+		PyBuffer_Release(view);
+		return -1;
+	}
+	return 0;
+}
+
 /* Vec2Array utils */
 
-#define PlanarVec2Array_Check(op) PyObject_TypeCheck(op, &PlanarVec2ArrayType)
-#define PlanarVec2Array_CheckExact(op) (Py_TYPE(op) == &PlanarVec2ArrayType)
+#define PlanarVec2Array_Check(op) Planar_TypeCheck(op, &PlanarVec2ArrayType)
+#define PlanarVec2Array_CheckExact(op) \
+	Planar_TypeCheckExact(op, &PlanarVec2ArrayType)
+
+/* Return true if the vectors in the array can be modified, otherwise
+   set an exception and return false. Arrays mapped read-only from
+   a file cannot be modified */
+static int
+Vec2Array_CheckWritable(PlanarSeq2Object *self)
+{
+	if (PlanarVec2Array_Check(self) && self->mapping != NULL
+		&& PyMemoryView_GET_BUFFER(self->mapping)->readonly) {
+		PyErr_Format(PyExc_TypeError,
+			"Cannot modify read-only %.200s", Py_TYPE(self)->tp_name);
+		return 0;
+	}
+	return 1;
+}
+
+/* Get the vectors of a sequence to read with the GIL released, storing
+   them in vec and their count in size. Vector arrays can be resized by
+   other threads meanwhile, so their vectors are copied. Other sequences
+   have fixed storage. Return 0 and set an exception on failure. Must be
+   paired with Seq2_ReleaseVectors() */
+static int
+Seq2_GetVectors(PlanarSeq2Object *seq, planar_vec2_t **vec, Py_ssize_t *size)
+{
+	int copy = PlanarVec2Array_Check(seq);
+
+#ifndef Py_GIL_DISABLED
+	/* Small arrays are read with the GIL held */
+	copy = copy && Py_SIZE(seq) >= PLANAR_NOGIL_MIN_SIZE;
+#endif
+	if (!copy) {
+		*vec = seq->vec;
+		*size = Py_SIZE(seq);
+		return 1;
+	}
+	Planar_BEGIN_CRITICAL_SECTION(seq);
+	*size = Py_SIZE(seq);
+	*vec = (planar_vec2_t *)PyMem_Malloc(
+		sizeof(planar_vec2_t) * (*size + 1));
+	if (*vec != NULL) {
+		memcpy(*vec, seq->vec, sizeof(planar_vec2_t) * *size);
+	}
+	Planar_END_CRITICAL_SECTION();
+	if (*vec == NULL) {
+		PyErr_NoMemory();
+		return 0;
+	}
+	return 1;
+}
+
+static void
+Seq2_ReleaseVectors(PlanarSeq2Object *seq, planar_vec2_t *vec)
+{
+	if (vec != seq->vec) {
+		PyMem_Free(vec);
+	}
+}
+
+#define PlanarVec2Array32_Check(op) \
+	Planar_TypeCheck(op, &PlanarVec2Array32Type)
+#define PlanarVec2Array32_CheckExact(op) \
+	Planar_TypeCheckExact(op, &PlanarVec2Array32Type)
 
 /* Affine utils */
 
-#define PlanarAffine_Check(op) PyObject_TypeCheck(op, &PlanarAffineType)
-#define PlanarAffine_CheckExact(op) (Py_TYPE(op) == &PlanarAffineType)
+#define PlanarAffine_Check(op) Planar_TypeCheck(op, &PlanarAffineType)
+#define PlanarAffine_CheckExact(op) \
+	Planar_TypeCheckExact(op, &PlanarAffineType)
 
 static PlanarAffineObject *
 PlanarAffine_FromDoubles(
@@ -485,8 +1620,7 @@ PlanarAffine_FromDoubles(
 {
 	PlanarAffineObject *t;
 
-	t = (PlanarAffineObject *)PlanarAffineType.tp_alloc(
-		&PlanarAffineType, 0);
+	t = (PlanarAffineObject *)Planar_Alloc(PLANAR_TYPE(Affine));
 	if (t != NULL) {
 		t->a = a;
 		t->b = b;
@@ -500,22 +1634,27 @@ PlanarAffine_FromDoubles(
 
 /* BoundingBox utils */
 
-#define PlanarBBox_Check(op) PyObject_TypeCheck(op, &PlanarBBoxType)
-#define PlanarBBox_CheckExact(op) (Py_TYPE(op) == &PlanarBBoxType)
+#define PlanarBBox_Check(op) Planar_TypeCheck(op, &PlanarBBoxType)
+#define PlanarBBox_CheckExact(op) Planar_TypeCheckExact(op, &PlanarBBoxType)
 
 static PlanarBBoxObject *
 PlanarBBox_fromSeq2(PlanarSeq2Object *seq)
 {
 	PlanarBBoxObject *b;
-	planar_vec2_t *vec;
-	Py_ssize_t i;
+	planar_vec2_t *vec, *vectors;
+	Py_ssize_t i, size;
 
-	b = (PlanarBBoxObject *)PlanarBBoxType.tp_alloc(
-		&PlanarBBoxType, 0);
+	PyThreadState *state;
+
+	if (!Seq2_GetVectors(seq, &vectors, &size)) {
+		return NULL;
+	}
+	b = (PlanarBBoxObject *)Planar_Alloc(PLANAR_TYPE(BBox));
 	if (b != NULL) {
 		b->min.x = b->min.y = FLT_MAX;
 		b->max.x = b->max.y = -FLT_MAX;
-		for (i = 0, vec = seq->vec; i < Py_SIZE(seq); ++i, ++vec) {
+		state = Planar_BeginNoGIL(size);
+		for (i = 0, vec = vectors; i < size; ++i, ++vec) {
 			if (vec->x < b->min.x) {
 				b->min.x = vec->x;
 			} 
@@ -529,7 +1668,9 @@ PlanarBBox_fromSeq2(PlanarSeq2Object *seq)
 				b->max.y = vec->y;
 			}
 		}
+		Planar_EndNoGIL(state);
 	}
+	Seq2_ReleaseVectors(seq, vectors);
 	return b;
 }
 
@@ -553,22 +1694,32 @@ Poly_new(PyTypeObject *type, Py_ssize_t size)
 	 * and last vert at either end to simplify many operations */
 	poly = (PlanarPolygonObject *)type->tp_alloc(type, size + 2);
 	if (poly != NULL) {
-		Py_SIZE(poly) = size;
+		Py_SET_SIZE(poly, size);
 		poly->vert = poly->data + 1;
 	}
 	return poly;
 }
 
-#define PlanarPolygon_Check(op) PyObject_TypeCheck(op, &PlanarPolygonType)
-#define PlanarPolygon_CheckExact(op) (Py_TYPE(op) == &PlanarPolygonType)
+#define PlanarPolygon_Check(op) Planar_TypeCheck(op, &PlanarPolygonType)
+#define PlanarPolygon_CheckExact(op) \
+	Planar_TypeCheckExact(op, &PlanarPolygonType)
+
+/* RTree utils */
+
+#define PlanarRTree_Check(op) Planar_TypeCheck(op, &PlanarRTreeType)
+#define PlanarRTree_CheckExact(op) Planar_TypeCheckExact(op, &PlanarRTreeType)
+#define PlanarKDTree_Check(op) Planar_TypeCheck(op, &PlanarKDTreeType)
+#define PlanarKDTree_CheckExact(op) \
+	Planar_TypeCheckExact(op, &PlanarKDTreeType)
 
 /* Line utils */
 
-#define PlanarLine_Check(op) PyObject_TypeCheck(op, &PlanarLineType)
-#define PlanarLine_CheckExact(op) (Py_TYPE(op) == &PlanarLineType)
-#define PlanarRay_Check(op) PyObject_TypeCheck(op, &PlanarRayType)
-#define PlanarRay_CheckExact(op) (Py_TYPE(op) == &PlanarRayType)
-#define PlanarSegment_Check(op) PyObject_TypeCheck(op, &PlanarSegmentType)
-#define PlanarSegment_CheckExact(op) (Py_TYPE(op) == &PlanarSegmentType)
+#define PlanarLine_Check(op) Planar_TypeCheck(op, &PlanarLineType)
+#define PlanarLine_CheckExact(op) Planar_TypeCheckExact(op, &PlanarLineType)
+#define PlanarRay_Check(op) Planar_TypeCheck(op, &PlanarRayType)
+#define PlanarRay_CheckExact(op) Planar_TypeCheckExact(op, &PlanarRayType)
+#define PlanarSegment_Check(op) Planar_TypeCheck(op, &PlanarSegmentType)
+#define PlanarSegment_CheckExact(op) \
+	Planar_TypeCheckExact(op, &PlanarSegmentType)
 
 #endif /* #ifdef PY_PLANAR_H */
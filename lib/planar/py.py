@@ -29,12 +29,14 @@
 #############################################################################
 """Convenience namespace module for importing Python class implementations"""
 
-__all__ = ('Vec2', 'Point', 'Vec2Array', 'Seq2', 
-	'Affine', 'Line', 'Ray', 'LineSegment', 'BoundingBox', 'Polygon')
+__all__ = ('Vec2', 'Point', 'Vec2Array', 'Vec2Array32', 'Seq2', 
+	'Affine', 'Line', 'Ray', 'LineSegment', 'BoundingBox', 'Polygon',
+	'RTree', 'KDTree', 'find_intersections')
 
-from planar.vector import Vec2, Vec2Array, Seq2
+from planar.vector import Vec2, Vec2Array, Vec2Array32, Seq2
 from planar.vector import Vec2 as Point
 from planar.transform import Affine
-from planar.line import Line, Ray, LineSegment
+from planar.line import Line, Ray, LineSegment, find_intersections
 from planar.box import BoundingBox
 from planar.polygon import Polygon
+from planar.index import RTree, KDTree
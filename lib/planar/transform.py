@@ -29,8 +29,11 @@
 from __future__ import division
 
 import math
+from array import array
 import planar
+from planar.vector import Vec2Array32
 from planar.util import cached_property, assert_unorderable, cos_sin_deg
+from planar.util import is_buffer
 
 
 class Affine(tuple):
@@ -151,6 +154,9 @@ class Affine(tuple):
         return ("Affine(%r, %r, %r,\n"
                 "       %r, %r, %r)") % self[:6]
 
+    def __reduce__(self):
+        return (Affine, self[:6])
+
     @cached_property
     def determinant(self):
         """The determinant of the transform matrix. This value
@@ -262,11 +268,15 @@ class Affine(tuple):
             Point = planar.Point
             points = getattr(other, 'points', other)
             try:
-                return other.from_points(
+                result = other.from_points(
                     Point(px*sa + py*sd + sc, px*sb + py*se + sf)
                     for px, py in points)
             except TypeError:
                 return NotImplemented
+            if hasattr(result, '_transform_cached_properties'):
+                # Carry over the shape properties preserved by the transform
+                result._transform_cached_properties(other.__dict__, self)
+            return result
         else:
             try:
                 vx, vy = other
@@ -300,6 +310,71 @@ class Affine(tuple):
             for i, (x, y) in enumerate(seq):
                 seq[i] = Vec2(x*sa + y*sd + sc, x*sb + y*se + sf)
 
+    def transform(self, seq, out=None):
+        """Transform a sequence of points or vectors, storing the results
+        in a new array, or in the destination array provided.
+
+        The C implementation of this method releases the GIL while
+        transforming large arrays, and splits very large arrays across
+        multiple threads.
+
+        :param seq: Sequence of :class:`~planar.Vec2` to be transformed.
+            This may be a :class:`~planar.Vec2Array`, an object supporting
+            the buffer protocol with shape ``(n, 2)`` or ``(2*n,)``, or 
+            an iterable of points.
+        :param out: Optional destination for the transformed points. This
+            may be a mutable sequence, or a writable buffer of doubles with
+            shape ``(n, 2)`` or ``(2*n,)``. The destination must have the
+            same number of points as ``seq``. It may be ``seq`` itself,
+            to transform it in place.
+        :returns: ``out`` if specified, otherwise a new
+            :class:`~planar.Vec2Array`, or a new
+            :class:`~planar.Vec2Array32` if ``seq`` is one.
+        """
+        if out is None and isinstance(seq, Vec2Array32):
+            # Single precision arrays stay single precision
+            return seq * self
+        if is_buffer(seq):
+            seq = planar.Vec2Array.from_buffer(seq)
+        else:
+            seq = planar.Vec2Array(seq)
+        sa, sb, sc, sd, se, sf, _, _, _ = self
+        points = [(x*sa + y*sd + sc, x*sb + y*se + sf) for x, y in seq]
+        if out is None:
+            return planar.Vec2Array(points)
+        if isinstance(out, array):
+            # Arrays cannot be viewed with memoryview in Python 2
+            view = out
+        elif is_buffer(out) and not isinstance(out, planar.Vec2Array):
+            view = memoryview(out)
+            if view.readonly:
+                raise BufferError(
+                    "Affine.transform(): destination buffer is read-only")
+        else:
+            view = None
+        if view is not None:
+            dest = planar.Vec2Array.from_buffer(view)
+            if len(dest) != len(points):
+                raise ValueError("Affine.transform(): destination length "
+                    "%d does not match source length %d" 
+                    % (len(dest), len(points)))
+            if isinstance(view, memoryview) and view.ndim == 2:
+                for i, (x, y) in enumerate(points):
+                    view[i, 0] = x
+                    view[i, 1] = y
+            else:
+                for i, (x, y) in enumerate(points):
+                    view[i * 2] = x
+                    view[i * 2 + 1] = y
+        else:
+            if len(out) != len(points):
+                raise ValueError("Affine.transform(): destination length "
+                    "%d does not match source length %d" 
+                    % (len(out), len(points)))
+            for i, point in enumerate(points):
+                out[i] = point
+        return out
+
     def __invert__(self):
         """Return the inverse transform.
         
@@ -12,6 +12,7 @@
 #############################################################################
 
 import math
+from array import array
 
 # Define assert_unorderable() depending on the language 
 # implicit ordering rules. This keeps things consistent
@@ -63,6 +64,247 @@ def cos_sin_deg(deg):
     rad = math.radians(deg)
     return math.cos(rad), math.sin(rad)
 
+def is_buffer(obj):
+    """Return true if obj supports the buffer protocol. Arrays are 
+    included, since in Python 2 they only support the old buffer
+    interface, and so cannot be viewed with memoryview.
+    """
+    if isinstance(obj, array):
+        return True
+    try:
+        memoryview(obj)
+    except TypeError:
+        return False
+    return True
+
+def array_bytes(values):
+    """Return the contents of an array as bytes"""
+    try:
+        return values.tobytes()
+    except AttributeError: # pragma: no cover
+        # Python 2
+        return values.tostring()
+
+def buffer_values(buffer, typecode, type_name):
+    """Return the values in an object supporting the buffer protocol,
+    in the shape ``(n, 2)`` or ``(2*n,)``, as a flat array of the
+    typecode specified. type_name is used in the error message when the
+    buffer contains values of a different type.
+    """
+    if isinstance(buffer, array):
+        format, shape = buffer.typecode, (len(buffer),)
+    else:
+        view = memoryview(buffer)
+        format, shape = view.format, view.shape
+    if format not in (typecode, '@' + typecode, '=' + typecode):
+        raise TypeError("Expected buffer of %s, got format '%s'"
+            % (type_name, format))
+    if not ((len(shape) == 2 and shape[1] == 2)
+        or (len(shape) == 1 and shape[0] % 2 == 0)):
+        raise ValueError("Expected buffer of shape (n, 2) or (2*n,)")
+    if isinstance(buffer, array):
+        return array(typecode, buffer)
+    return array(typecode, view.tobytes())
+
+class SweepStatus(object):
+    """Ordered set of the integers 0 through size - 1 kept in an AVL tree,
+    used as the status structure of plane sweep algorithms. Items are
+    ordered by the ``less`` function, and are their own tree nodes, so 
+    neighbors can be found and items removed without comparisons. All
+    operations take O(log n) time.
+    """
+
+    def __init__(self, size, less=None):
+        self.less = less
+        self.root = None
+        self.left = [None] * size
+        self.right = [None] * size
+        self.parent = [None] * size
+        self.height = [0] * size
+
+    def insert(self, item):
+        left = self.left
+        right = self.right
+        less = self.less
+        left[item] = right[item] = None
+        self.height[item] = 1
+        node = self.root
+        if node is None:
+            self.root = item
+            self.parent[item] = None
+            return
+        while True:
+            if less(item, node):
+                if left[node] is None:
+                    left[node] = item
+                    break
+                node = left[node]
+            else:
+                if right[node] is None:
+                    right[node] = item
+                    break
+                node = right[node]
+        self.parent[item] = node
+        self._rebalance(node)
+
+    def insert_after(self, item, after):
+        """Insert item immediately after the item ``after``, or first
+        if ``after`` is None, without comparisons.
+        """
+        left = self.left
+        right = self.right
+        left[item] = right[item] = None
+        self.height[item] = 1
+        if after is None:
+            if self.root is None:
+                self.root = item
+                self.parent[item] = None
+                return
+            node = self.first()
+            left[node] = item
+        elif right[after] is None:
+            node = after
+            right[node] = item
+        else:
+            node = right[after]
+            while left[node] is not None:
+                node = left[node]
+            left[node] = item
+        self.parent[item] = node
+        self._rebalance(node)
+
+    def remove(self, item):
+        left = self.left
+        right = self.right
+        parent = self.parent
+        if left[item] is not None and right[item] is not None:
+            # Replace the item with its successor
+            succ = right[item]
+            while left[succ] is not None:
+                succ = left[succ]
+            if parent[succ] != item:
+                start = parent[succ]
+                self._replace(succ, right[succ])
+                right[succ] = right[item]
+                parent[right[succ]] = succ
+            else:
+                start = succ
+            self._replace(item, succ)
+            left[succ] = left[item]
+            parent[left[succ]] = succ
+            self.height[succ] = self.height[item]
+        else:
+            start = parent[item]
+            if left[item] is not None:
+                self._replace(item, left[item])
+            else:
+                self._replace(item, right[item])
+        self._rebalance(start)
+
+    def find_last(self, before):
+        """Return the last item for which ``before(item)`` is True, or 
+        None. ``before`` must be True for all items ordered before
+        the result and False for all items after.
+        """
+        node = self.root
+        found = None
+        while node is not None:
+            if before(node):
+                found = node
+                node = self.right[node]
+            else:
+                node = self.left[node]
+        return found
+
+    def first(self):
+        """Return the first item, or None"""
+        node = self.root
+        if node is not None:
+            left = self.left
+            while left[node] is not None:
+                node = left[node]
+        return node
+
+    def prev(self, item):
+        """Return the item preceding the one given, or None"""
+        left = self.left
+        parent = self.parent
+        if left[item] is not None:
+            item = left[item]
+            right = self.right
+            while right[item] is not None:
+                item = right[item]
+            return item
+        while parent[item] is not None and left[parent[item]] == item:
+            item = parent[item]
+        return parent[item]
+
+    def next(self, item):
+        """Return the item following the one given, or None"""
+        right = self.right
+        parent = self.parent
+        if right[item] is not None:
+            item = right[item]
+            left = self.left
+            while left[item] is not None:
+                item = left[item]
+            return item
+        while parent[item] is not None and right[parent[item]] == item:
+            item = parent[item]
+        return parent[item]
+
+    def _replace(self, node, child):
+        """Replace node with child in node's parent"""
+        parent = self.parent[node]
+        if parent is None:
+            self.root = child
+        elif self.left[parent] == node:
+            self.left[parent] = child
+        else:
+            self.right[parent] = child
+        if child is not None:
+            self.parent[child] = parent
+
+    def _rotate(self, node, left, right):
+        """Rotate the subtree at node toward the 'left' side, return
+        the new subtree root
+        """
+        pivot = right[node]
+        right[node] = left[pivot]
+        if left[pivot] is not None:
+            self.parent[left[pivot]] = node
+        self._replace(node, pivot)
+        left[pivot] = node
+        self.parent[node] = pivot
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _h(self, node):
+        return self.height[node] if node is not None else 0
+
+    def _update(self, node):
+        self.height[node] = 1 + max(
+            self._h(self.left[node]), self._h(self.right[node]))
+
+    def _rebalance(self, node):
+        """Restore the height balance from node up to the root"""
+        left = self.left
+        right = self.right
+        h = self._h
+        while node is not None:
+            self._update(node)
+            balance = h(left[node]) - h(right[node])
+            if balance > 1:
+                if h(left[left[node]]) < h(right[left[node]]):
+                    self._rotate(left[node], left, right)
+                node = self._rotate(node, right, left)
+            elif balance < -1:
+                if h(right[right[node]]) < h(left[right[node]]):
+                    self._rotate(right[node], right, left)
+                node = self._rotate(node, left, right)
+            node = self.parent[node]
+
 
 # vim: ai ts=4 sts=4 et sw=4 tw=78
 
@@ -31,8 +31,12 @@
 from __future__ import division
 
 import math
+import operator
+import pickle
+from array import array
 import planar
 from planar.util import cached_property, assert_unorderable, cos_sin_deg
+from planar.util import buffer_values, array_bytes
 
 
 class Vec2(tuple):
@@ -70,6 +74,9 @@ class Vec2(tuple):
         """Precise string representation."""
         return "Vec2(%r, %r)" % self
 
+    def __reduce__(self):
+        return (Vec2, tuple(self))
+
     @property
     def x(self):
         """The horizontal coordinate."""
@@ -347,7 +354,7 @@ class Vec2(tuple):
             return NotImplemented
         return tuple.__new__(Vec2, (self[0] + ox, self[1] + oy))
 
-    __iadd__ = __add__
+    __radd__ = __iadd__ = __add__
 
     def __sub__(self, other):
         """Subtract the vectors componentwise.
@@ -363,6 +370,14 @@ class Vec2(tuple):
 
     __isub__ = __sub__
 
+    def __rsub__(self, other):
+        """Subtract this vector from another 2-number sequence."""
+        try:
+            ox, oy = other
+        except Exception:
+            return NotImplemented
+        return tuple.__new__(Vec2, (ox - self[0], oy - self[1]))
+
     def __mul__(self, other):
         """Either multiply the vector by a scalar or componentwise
         with another vector.
@@ -470,6 +485,14 @@ class Vec2(tuple):
 null = Vec2(0, 0)
 
 
+def _from_bytes(cls, data):
+    """Recreate a pickled vector sequence of type cls from its packed
+    vector data, see :meth:`Seq2.__reduce_ex__`. This is a module function
+    because class methods cannot be pickled in Python 2.
+    """
+    return cls._from_bytes(data)
+
+
 class Seq2(object):
     """Fixed length 2D point/vector sequence
     
@@ -529,6 +552,29 @@ class Seq2(object):
 
     __deepcopy__ = __copy__
 
+    @classmethod
+    def _from_bytes(cls, data):
+        """Create a new sequence from packed native double ``x, y``
+        pairs, as pickled by :meth:`__reduce_ex__`.
+        """
+        if not isinstance(data, array):
+            data = array('d', memoryview(data).tobytes())
+        if len(data) % 2 != 0:
+            raise ValueError(
+                "Expected data length to be a multiple of 16 bytes")
+        return cls.from_points(
+            [Vec2(x, y) for x, y in zip(data[::2], data[1::2])])
+
+    def __reduce_ex__(self, protocol):
+        data = array('d')
+        for v in self:
+            data.extend(v)
+        if protocol >= 5 and hasattr(pickle, 'PickleBuffer'):
+            data = pickle.PickleBuffer(data)
+        else:
+            data = array_bytes(data)
+        return (_from_bytes, (self.__class__, data))
+
     def __nonzero__(self):
         return bool(self._vectors)
 
@@ -542,6 +588,57 @@ class Vec2Array(Seq2):
     def __init__(self, vectors=()):
         super(Vec2Array, self).__init__(vectors)
 
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Create a new array by copying the contents of an object
+        supporting the buffer protocol, such as a NumPy array. The
+        buffer must contain doubles, in the shape ``(n, 2)`` or
+        as a flat sequence of ``x, y`` pairs.
+
+        :param buffer: Object supporting the buffer protocol.
+        """
+        values = buffer_values(buffer, 'd', 'doubles')
+        return cls.from_points(
+            [Vec2(x, y) for x, y in zip(values[::2], values[1::2])])
+
+    @classmethod
+    def open_mmap(cls, path, mode='r'):
+        """Create an array from a file of packed native double ``x, y``
+        pairs, as written by ``array.tofile()`` or ``ndarray.tofile()``.
+
+        The C implementation maps the file into memory, so the array
+        is available immediately without copying or parsing, and may
+        be larger than physical memory. Mapped arrays cannot be resized.
+        The pure Python implementation reads the file into memory
+        instead. Changes to the vectors are never written back to the
+        file, so the ``'r+'`` mode is not supported, and unlike the C
+        implementation the array returned for ``'r'`` is not read-only.
+
+        :param path: Path of the file to map.
+        :param mode: ``'r'`` or ``'c'``, which both allow changes to the
+            array without writing them back.
+        """
+        if mode == 'r+':
+            raise ValueError(
+                "Vec2Array.open_mmap: mode 'r+' is not supported, "
+                "changes cannot be written back to the file")
+        if mode not in ('r', 'c'):
+            raise ValueError(
+                "Vec2Array.open_mmap: invalid mode '%s', "
+                "expected 'r' or 'c'" % mode)
+        with open(path, 'rb') as f:
+            f.seek(0, 2)
+            size = f.tell()
+            if size % 16 != 0:
+                raise ValueError(
+                    "Vec2Array.open_mmap: file size %d is not a multiple "
+                    "of the vector size 16" % size)
+            f.seek(0)
+            values = array('d')
+            values.fromfile(f, size // 8)
+        return cls.from_points(
+            [Vec2(x, y) for x, y in zip(values[::2], values[1::2])])
+
     def __getitem__(self, index):
         if isinstance(index, slice):
             return self.from_points(self._vectors[index])
@@ -653,6 +750,112 @@ class Vec2Array(Seq2):
         self._vectors = [vector.clamped(min_length, max_length) 
             for vector in self._vectors]
 
+    def lengths(self):
+        """Return the lengths of the vectors in the array.
+
+        :rtype: array.array of doubles
+        """
+        return array('d', (vector.length for vector in self._vectors))
+
+    def lengths2(self):
+        """Return the squared lengths of the vectors in the array.
+
+        :rtype: array.array of doubles
+        """
+        return array('d', (vector.length2 for vector in self._vectors))
+
+    def _vectors_with(self, other, op_name, action):
+        """Return an iterable of vector pairs pairing the vectors in
+        the array with a single vector or another vector sequence.
+        """
+        if isinstance(other, Seq2):
+            if len(self) != len(other):
+                raise ValueError(
+                    "cannot %s arrays with different lengths" % action)
+            return zip(self._vectors, other)
+        try:
+            other = Vec2(*other)
+        except Exception:
+            raise TypeError("Vec2Array.%s(): expected Vec2 or Seq2 "
+                "for argument" % op_name)
+        return ((vector, other) for vector in self._vectors)
+
+    def dots(self, other):
+        """Return the dot products of the vectors in the array with a
+        single vector, or pairwise with the vectors of another sequence
+        of the same length.
+
+        :type other: Vec2 or Seq2
+        :rtype: array.array of doubles
+        """
+        return array('d', (a.dot(b) 
+            for a, b in self._vectors_with(other, 'dots',
+                'compute dot products of')))
+
+    def crosses(self, other):
+        """Return the cross products of the vectors in the array with a
+        single vector, or pairwise with the vectors of another sequence
+        of the same length.
+
+        :type other: Vec2 or Seq2
+        :rtype: array.array of doubles
+        """
+        return array('d', (a.cross(b) 
+            for a, b in self._vectors_with(other, 'crosses',
+                'compute cross products of')))
+
+    def distances_to(self, other):
+        """Return the distances from the vectors in the array to a
+        single point, or pairwise to the points of another sequence
+        of the same length.
+
+        :type other: Vec2 or Seq2
+        :rtype: array.array of doubles
+        """
+        return array('d', ((a - b).length 
+            for a, b in self._vectors_with(other, 'distances_to',
+                'compute distances between')))
+
+    def sum(self):
+        """Return the sum of the vectors in the array.
+
+        :rtype: Vec2
+        """
+        x = y = 0.0
+        for vx, vy in self._vectors:
+            x += vx
+            y += vy
+        return Vec2(x, y)
+
+    def mean(self):
+        """Return the mean of the vectors in the array, i.e., the
+        centroid of the points. Return None if the array is empty.
+
+        :rtype: Vec2
+        """
+        if self._vectors:
+            return self.sum() / len(self._vectors)
+
+    def min_point(self):
+        """Return a vector of the minimum x and minimum y values in the
+        array. Return None if the array is empty.
+
+        :rtype: Vec2
+        """
+        if self._vectors:
+            return Vec2(min(v.x for v in self._vectors), 
+                min(v.y for v in self._vectors))
+
+    def max_point(self):
+        """Return a vector of the maximum x and maximum y values in the
+        array. Return None if the array is empty.
+
+        :rtype: Vec2
+        """
+        if self._vectors:
+            return Vec2(max(v.x for v in self._vectors), 
+                max(v.y for v in self._vectors))
+
     def __add__(self, other):
         """Add this array to another vector sequence, or a single vector. When
         a single vector is added to an array, the vector is added to each
@@ -940,5 +1143,190 @@ class Vec2Array(Seq2):
     __str__ = __repr__
 
 
+class Vec2Array32(object):
+    """Compact array of 2D vectors stored as single precision floats,
+    using half of the memory of a :class:`Vec2Array`. Vectors are
+    converted to and from double precision :class:`Vec2` objects when
+    they are accessed, so values stored are rounded to single precision.
+
+    This array supports the basic :class:`Seq2` API, and can be transformed
+    by multiplying with an :class:`~planar.Affine` transform. Use 
+    :meth:`to_array` to convert it to a :class:`Vec2Array` for other
+    batch operations.
+
+    :param vectors: An iterable of :class:`~planar.Vec2` objects.
+    """
+
+    def __init__(self, vectors=()):
+        if isinstance(vectors, Vec2Array32):
+            self._data = array('f', vectors._data)
+        else:
+            self._data = array('f')
+            self.extend(vectors)
+
+    @classmethod
+    def from_points(cls, points):
+        """Create a new array from an iterable of points"""
+        return cls(points)
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Create a new array by copying the contents of an object
+        supporting the buffer protocol, such as a NumPy array. The
+        buffer must contain single precision floats, in the shape 
+        ``(n, 2)`` or as a flat sequence of ``x, y`` pairs.
+
+        :param buffer: Object supporting the buffer protocol.
+        """
+        values = buffer_values(buffer, 'f', 'floats')
+        self = cls.__new__(cls)
+        self._data = values
+        return self
+
+    def to_array(self):
+        """Return a double precision copy of this array.
+
+        :rtype: Vec2Array
+        """
+        data = self._data
+        return planar.Vec2Array(
+            [(data[i], data[i + 1]) for i in range(0, len(data), 2)])
+
+    def __len__(self):
+        return len(self._data) // 2
+
+    def _index(self, index):
+        try:
+            index = operator.index(index)
+        except TypeError:
+            raise TypeError("sequence index must be integer, not '%s'"
+                % type(index).__name__)
+        size = len(self._data) // 2
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("index %d out of range" % index)
+        return index * 2
+
+    def __getitem__(self, index):
+        i = self._index(index)
+        return Vec2(self._data[i], self._data[i + 1])
+
+    def __setitem__(self, index, value):
+        i = self._index(index)
+        self._data[i], self._data[i + 1] = Vec2(*value)
+
+    def __delitem__(self, index):
+        raise TypeError("Cannot delete items from %s"
+            % self.__class__.__name__)
+
+    def __iter__(self):
+        data = self._data
+        for i in range(0, len(data), 2):
+            yield Vec2(data[i], data[i + 1])
+
+    def append(self, vector):
+        """Append a vector to the end of the array.
+        
+        :param vector: Vector to append.
+        :type vector: Vec2 or 2-number sequence.
+        """
+        self._data.extend(Vec2(*vector))
+
+    def extend(self, iterable):
+        """Append all vectors in iterable to the end of the array.
+        
+        :param iterable: Iterable object containing vectors.
+        """
+        values = []
+        for vector in iterable:
+            values.extend(Vec2(*vector))
+        self._data.extend(values)
+
+    def _transformed(self, transform):
+        sa, sb, sc, sd, se, sf = tuple(transform)[:6]
+        data = self._data
+        xs = data[0::2]
+        ys = data[1::2]
+        result = array('f', data)
+        result[0::2] = array('f', 
+            [x*sa + y*sd + sc for x, y in zip(xs, ys)])
+        result[1::2] = array('f', 
+            [x*sb + y*se + sf for x, y in zip(xs, ys)])
+        return result
+
+    def __mul__(self, other):
+        """Transform the vectors in this array, returning a new array.
+
+        :type other: Affine
+        :rtype: Vec2Array32
+        """
+        if hasattr(other, 'itransform'):
+            result = self.__class__.__new__(self.__class__)
+            result._data = self._transformed(other)
+            return result
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __imul__(self, other):
+        """Transform the vectors in this array in place."""
+        if hasattr(other, 'itransform'):
+            self._data = self._transformed(other)
+            return self
+        return NotImplemented
+
+    def almost_equals(self, other):
+        """Compare for approximate equality."""
+        if self.__class__ is other.__class__ and len(self) == len(other):
+            for a, b in zip(self, other):
+                if not a.almost_equals(b):
+                    return False
+            return True
+        else:
+            return False
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and self._data == other._data
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __copy__(self, memo=None):
+        return self.__class__(self)
+
+    __deepcopy__ = __copy__
+
+    @classmethod
+    def _from_bytes(cls, data):
+        """Create a new array from packed native float ``x, y`` pairs,
+        as pickled by :meth:`__reduce_ex__`.
+        """
+        self = cls.__new__(cls)
+        if isinstance(data, array):
+            self._data = array('f', data)
+        else:
+            self._data = array('f', memoryview(data).tobytes())
+        if len(self._data) % 2 != 0:
+            raise ValueError("Expected data length to be a multiple of 8 bytes")
+        return self
+
+    def __reduce_ex__(self, protocol):
+        if protocol >= 5 and hasattr(pickle, 'PickleBuffer'):
+            data = pickle.PickleBuffer(self._data)
+        else:
+            data = array_bytes(self._data)
+        return (_from_bytes, (self.__class__, data))
+
+    def __hash__(self):
+        raise TypeError("unhashable type: %s" % self.__class__.__name__)
+
+    def __repr__(self):
+        return "%s([%s])" % (self.__class__.__name__,
+            ', '.join("(%r, %r)" % tuple(v) for v in self))
+
+    __str__ = __repr__
+
+
 # vim: ai ts=4 sts=4 et sw=4 tw=78
 
@@ -0,0 +1,289 @@
+#############################################################################
+# Copyright (c) 2010 by Casey Duncan
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, 
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name(s) of the copyright holders nor the names of its
+#   contributors may be used to endorse or promote products derived from this
+#   software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AS IS AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO
+# EVENT SHALL THE COPYRIGHT HOLDERS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, 
+# OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#############################################################################
+
+
+"""Well-known binary (WKB) geometry encoding and decoding"""
+
+import struct
+import planar
+from planar.vector import Vec2, Seq2, Vec2Array32
+from planar.line import LineSegment
+from planar.polygon import BasePolygon
+
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+WKB_MULTIPOINT = 4
+WKB_MULTILINESTRING = 5
+WKB_MULTIPOLYGON = 6
+WKB_GEOMETRYCOLLECTION = 7
+
+# EWKB type flags, as written by PostGIS
+_EWKB_Z_FLAG = 0x80000000
+_EWKB_M_FLAG = 0x40000000
+_EWKB_SRID_FLAG = 0x20000000
+
+_uint32_le = struct.Struct('<I')
+_header_le = struct.Struct('<BI')
+_point_le = struct.Struct('<dd')
+
+
+class PolygonWithHoles(tuple):
+    """Polygon with interior rings, as decoded from WKB. This is a tuple of
+    :class:`~planar.Polygon` objects, the exterior ring first followed by 
+    the holes. Unlike other tuples of polygons, which are encoded as 
+    multi-polygons, it is encoded as a single polygon with interior rings.
+
+    :param exterior: The exterior ring of the polygon.
+    :param holes: Sequence of the interior rings of the polygon.
+    """
+
+    def __new__(cls, exterior, holes=()):
+        rings = [exterior]
+        rings.extend(holes)
+        return tuple.__new__(cls, [ring if isinstance(ring, planar.Polygon) 
+            else planar.Polygon(ring) for ring in rings])
+
+    @property
+    def exterior(self):
+        """The exterior ring of the polygon."""
+        return self[0]
+
+    @property
+    def holes(self):
+        """Tuple of the interior rings of the polygon."""
+        return tuple(self[1:])
+
+    def __getnewargs__(self):
+        return (self[0], tuple(self[1:]))
+
+    def __repr__(self):
+        return "%s(%r, %r)" % (
+            self.__class__.__name__, self[0], list(self[1:]))
+
+
+def from_wkb(data):
+    """Decode a geometry from well-known binary (WKB) data. Both byte
+    orders are supported, as well as the Z, M and SRID extensions of
+    ISO WKB and PostGIS EWKB, though only the x and y coordinates are kept.
+
+    Points are decoded as :class:`~planar.Vec2` objects, line strings
+    as :class:`~planar.Vec2Array` objects and polygons as 
+    :class:`~planar.Polygon` objects, without the closing vertex.
+    Polygons with interior rings decode to :class:`PolygonWithHoles` 
+    objects. Multi-part geometries and geometry collections decode to 
+    a list of their parts. Empty polygons, which have no exterior ring,
+    raise :exc:`ValueError`.
+
+    :param data: Bytes-like object containing a single WKB geometry.
+    """
+    geometry, offset = _decode(data, 0)
+    if offset != len(data):
+        raise ValueError(
+            "from_wkb: unexpected data after geometry at byte %d" % offset)
+    return geometry
+
+
+def iter_wkb(data):
+    """Iterate the geometries in a sequence of concatenated WKB records,
+    decoding them as they are read. The data can be any bytes-like object,
+    such as a memory mapped file, so large data sets can be read without
+    loading them into memory.
+
+    :param data: Bytes-like object containing zero or more WKB geometries.
+    """
+    offset = 0
+    size = len(data)
+    while offset < size:
+        geometry, offset = _decode(data, offset)
+        yield geometry
+
+
+def to_wkb(geometry):
+    """Encode a geometry as little-endian well-known binary (WKB).
+    
+    :class:`~planar.Vec2` objects are encoded as points,
+    :class:`~planar.Vec2Array`, :class:`~planar.Vec2Array32` and
+    :class:`~planar.LineSegment` objects as line strings and
+    :class:`~planar.Polygon` objects as polygons with a single closed
+    ring. :class:`PolygonWithHoles` objects are encoded as polygons
+    with interior rings. Other lists and tuples are encoded as multi-points, multi-line strings
+    or multi-polygons if all of their items are of the same kind, and 
+    as geometry collections otherwise.
+
+    :rtype: bytes
+    """
+    parts = []
+    _encode(geometry, parts)
+    return b''.join(parts)
+
+
+def _check_size(data, offset, size):
+    # Check before unpacking, so that bad counts are not used to
+    # allocate huge tuples
+    if size > len(data) - offset:
+        raise ValueError("from_wkb: truncated data")
+
+
+def _check_count(data, offset, count, item_size):
+    # Each ring or part takes at least item_size bytes, so larger counts
+    # cannot be satisfied by the data remaining
+    if count > (len(data) - offset) // item_size:
+        raise ValueError("from_wkb: truncated data")
+
+
+def _decode(data, offset):
+    _check_size(data, offset, 5)
+    byte_order, = struct.unpack_from('B', data, offset)
+    if byte_order == 0:
+        endian = '>'
+    elif byte_order == 1:
+        endian = '<'
+    else:
+        raise ValueError(
+            "from_wkb: invalid byte order %d at byte %d" % (byte_order, offset))
+    type_code, = struct.unpack_from(endian + 'I', data, offset + 1)
+    offset += 5
+    dims = 2
+    if type_code & _EWKB_SRID_FLAG:
+        offset += 4
+    if type_code & _EWKB_Z_FLAG:
+        dims += 1
+    if type_code & _EWKB_M_FLAG:
+        dims += 1
+    iso_dims, geom_type = divmod(type_code & 0xfffffff, 1000)
+    if iso_dims == 3:
+        dims += 2
+    elif iso_dims:
+        dims += 1
+    if iso_dims > 3 or not WKB_POINT <= geom_type <= WKB_GEOMETRYCOLLECTION:
+        raise ValueError(
+            "from_wkb: unsupported geometry type %d" % type_code)
+
+    if geom_type == WKB_POINT:
+        _check_size(data, offset, dims * 8)
+        x, y = struct.unpack_from(endian + 'dd', data, offset)
+        return planar.Vec2(x, y), offset + dims * 8
+    _check_size(data, offset, 4)
+    count, = struct.unpack_from(endian + 'I', data, offset)
+    offset += 4
+    if geom_type == WKB_LINESTRING:
+        points, offset = _decode_points(data, offset, endian, dims, count)
+        return planar.Vec2Array.from_points(points), offset
+    if geom_type == WKB_POLYGON:
+        _check_count(data, offset, count, 4)
+        rings = []
+        for i in xrange(count):
+            _check_size(data, offset, 4)
+            ring_size, = struct.unpack_from(endian + 'I', data, offset)
+            points, offset = _decode_points(
+                data, offset + 4, endian, dims, ring_size)
+            if len(points) > 1 and points[0] == points[-1]:
+                del points[-1]
+            rings.append(planar.Polygon(points))
+        if not rings:
+            raise ValueError("from_wkb: empty polygons are not supported")
+        if len(rings) == 1:
+            return rings[0], offset
+        return PolygonWithHoles(rings[0], rings[1:]), offset
+    _check_count(data, offset, count, 5)
+    parts = []
+    for i in xrange(count):
+        part, offset = _decode(data, offset)
+        parts.append(part)
+    return parts, offset
+
+
+def _decode_points(data, offset, endian, dims, count):
+    _check_size(data, offset, count * dims * 8)
+    values = struct.unpack_from(
+        '%s%dd' % (endian, count * dims), data, offset)
+    point_type = planar.Vec2
+    points = [point_type(values[i], values[i + 1]) 
+        for i in range(0, count * dims, dims)]
+    return points, offset + count * dims * 8
+
+
+def _geometry_type(geometry):
+    if isinstance(geometry, (Vec2, planar.Vec2)):
+        return WKB_POINT
+    if isinstance(geometry, (BasePolygon, planar.Polygon)):
+        return WKB_POLYGON
+    if isinstance(geometry, PolygonWithHoles):
+        for ring in geometry:
+            if not isinstance(ring, (BasePolygon, planar.Polygon)):
+                raise TypeError(
+                    "to_wkb: polygon rings must be Polygon objects")
+        return WKB_POLYGON
+    if isinstance(geometry, (Seq2, Vec2Array32, LineSegment,
+        planar.Seq2, planar.Vec2Array32, planar.LineSegment)):
+        return WKB_LINESTRING
+    if isinstance(geometry, (list, tuple)):
+        types = set(_geometry_type(part) for part in geometry)
+        if len(types) == 1 and WKB_POINT in types:
+            return WKB_MULTIPOINT
+        if len(types) == 1 and WKB_LINESTRING in types:
+            return WKB_MULTILINESTRING
+        if len(types) == 1 and WKB_POLYGON in types:
+            return WKB_MULTIPOLYGON
+        return WKB_GEOMETRYCOLLECTION
+    raise TypeError("to_wkb: cannot encode %s object as WKB" 
+        % type(geometry).__name__)
+
+
+def _encode(geometry, parts, geom_type=None):
+    if geom_type is None:
+        geom_type = _geometry_type(geometry)
+    parts.append(_header_le.pack(1, geom_type))
+    if geom_type == WKB_POINT:
+        parts.append(_point_le.pack(*geometry))
+    elif geom_type == WKB_LINESTRING:
+        if isinstance(geometry, (LineSegment, planar.LineSegment)):
+            geometry = (geometry.anchor, geometry.end)
+        _encode_points(geometry, parts)
+    elif geom_type == WKB_POLYGON:
+        if isinstance(geometry, PolygonWithHoles):
+            rings = geometry
+        else:
+            rings = [geometry]
+        parts.append(_uint32_le.pack(len(rings)))
+        for ring in rings:
+            _encode_points(list(ring) + [ring[0]], parts)
+    else:
+        parts.append(_uint32_le.pack(len(geometry)))
+        for part in geometry:
+            _encode(part, parts)
+
+
+def _encode_points(points, parts):
+    values = [value for point in points for value in point]
+    parts.append(_uint32_le.pack(len(values) // 2))
+    parts.append(struct.pack('<%dd' % len(values), *values))
+
+
+# vim: ai ts=4 sts=4 et sw=4 tw=78
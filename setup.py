@@ -68,6 +68,8 @@ setup(
 			 'lib/planar/cline.c',
 			 'lib/planar/cbox.c',
 			 'lib/planar/cpolygon.c',
+			 'lib/planar/cindex.c',
+			 'lib/planar/cio.c',
 			], 
 			include_dirs=include_dirs,
 			#library_dirs=library_dirs,
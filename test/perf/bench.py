@@ -0,0 +1,731 @@
+"""Benchmark suite for the C, Python and NumPy implementations of planar.
+
+Runs a registry of micro-benchmarks covering vectors, vector arrays,
+transforms, bounding boxes, lines, polygons and spatial indexes against one
+or more implementations, and optionally writes the timings to a JSON file
+that can later be compared against to detect regressions. The NumPy
+implementation is skipped when NumPy is not installed.
+
+Usage:
+
+	python bench.py                        # run everything available
+	python bench.py -b c -k polygon        # C only, names containing "polygon"
+	python bench.py -o results.json        # save the timings
+	python bench.py -c baseline.json       # compare against saved timings
+	python bench.py -l                     # list the benchmarks
+
+When comparing, each benchmark slower than the baseline by more than the
+threshold (10% by default) is flagged, and the exit status is 1 if any
+were. Benchmarks missing from either side are ignored, so baselines remain
+usable as benchmarks are added. Timings are only comparable when taken on
+the same machine and Python version, which is recorded in the output file.
+
+Each benchmark is a function taking the implementation namespace and a size,
+which returns a callable to be timed. All of the setup happens before the
+callable is returned, and the test data is generated from a fixed random
+seed so that runs are repeatable.
+"""
+
+import sys
+import re
+import time
+import json
+import random
+import platform
+import optparse
+from timeit import default_timer
+
+benchmarks = []
+
+def benchmark(*sizes):
+	"""Decorator to register a benchmark function, run once for each of
+	the given sizes, if any
+	"""
+	def register(func):
+		name = func.__name__.replace('_', '.', 1)
+		benchmarks.append((name, func, sizes or (None,)))
+		return func
+	return register
+
+def bench_name(name, size):
+	if size is None:
+		return name
+	return '%s[%d]' % (name, size)
+
+
+class Implementation(object):
+	"""Namespace of the classes and functions of one implementation"""
+
+	names = ('Vec2', 'Vec2Array', 'Vec2Array32', 'Affine', 'Line', 'Ray',
+		'LineSegment', 'BoundingBox', 'Polygon', 'RTree', 'KDTree',
+		'find_intersections')
+
+	def __init__(self, name, module, codec):
+		self.name = name
+		for attr in self.names:
+			setattr(self, attr, getattr(module, attr))
+		self.from_wkb = codec.from_wkb
+		self.to_wkb = codec.to_wkb
+
+def load_implementation(name):
+	if name == 'c':
+		import planar.c
+		return Implementation(name, planar.c, planar.c)
+	elif name == 'py':
+		import planar.py
+		import planar.wkb
+		return Implementation(name, planar.py, planar.wkb)
+	elif name == 'np':
+		import planar.np
+		import planar.wkb
+		return Implementation(name, planar.np, planar.wkb)
+	raise ValueError('Unknown implementation %r' % name)
+
+implementation_names = ('c', 'py', 'np')
+
+
+def rand_pts(count, span=1000, seed=0):
+	rand = random.Random(seed)
+	return [(rand.random() * span, rand.random() * span) for i in range(count)]
+
+def rand_segments(impl, count, span=1000, length=50, seed=0):
+	rand = random.Random(seed)
+	segments = []
+	for i in range(count):
+		x, y = rand.random() * span, rand.random() * span
+		segments.append(impl.LineSegment.from_points([(x, y),
+			(x + (rand.random() - 0.5) * length,
+			 y + (rand.random() - 0.5) * length)]))
+	return segments
+
+def star(impl, size):
+	"""Return the vertices of a non-convex, simple star polygon with size
+	vertices, which must be even
+	"""
+	return list(impl.Polygon.star(size // 2, 300, 500, center=(500, 500)))
+
+def regular(impl, size, radius=500, center=(500, 500)):
+	return list(impl.Polygon.regular(size, radius, center=center))
+
+def each(func, items):
+	"""Return a callable that calls func for each item"""
+	def run():
+		for item in items:
+			func(item)
+	return run
+
+array_sizes = (16, 1024, 65536)
+poly_sizes = (16, 256, 4096)
+bool_sizes = (16, 64, 256)
+index_sizes = (256, 16384)
+
+
+## Vec2 ##
+
+@benchmark()
+def vec2_new(impl, size):
+	Vec2 = impl.Vec2
+	return lambda: Vec2(1.0, 2.0)
+
+@benchmark()
+def vec2_add(impl, size):
+	a, b = impl.Vec2(1.0, 2.0), impl.Vec2(3.0, 4.0)
+	return lambda: a + b
+
+@benchmark()
+def vec2_mul_scalar(impl, size):
+	a = impl.Vec2(1.0, 2.0)
+	return lambda: a * 3.0
+
+@benchmark()
+def vec2_dot(impl, size):
+	a, b = impl.Vec2(1.0, 2.0), impl.Vec2(3.0, 4.0)
+	return lambda: a.dot(b)
+
+@benchmark()
+def vec2_length(impl, size):
+	a = impl.Vec2(1.0, 2.0)
+	return lambda: a.length
+
+@benchmark()
+def vec2_normalized(impl, size):
+	a = impl.Vec2(1.0, 2.0)
+	return a.normalized
+
+@benchmark()
+def vec2_rotated(impl, size):
+	a = impl.Vec2(1.0, 2.0)
+	return lambda: a.rotated(33)
+
+@benchmark()
+def vec2_lerp(impl, size):
+	a, b = impl.Vec2(1.0, 2.0), impl.Vec2(3.0, 4.0)
+	return lambda: a.lerp(b, 0.25)
+
+@benchmark()
+def vec2_eq(impl, size):
+	a, b = impl.Vec2(1.0, 2.0), impl.Vec2(1.0, 2.0)
+	return lambda: a == b
+
+@benchmark()
+def vec2_almost_equals(impl, size):
+	a, b = impl.Vec2(1.0, 2.0), impl.Vec2(1.0, 2.000001)
+	return lambda: a.almost_equals(b)
+
+
+## Vec2Array ##
+
+@benchmark(*array_sizes)
+def vec2array_new(impl, size):
+	Vec2Array = impl.Vec2Array
+	pts = rand_pts(size)
+	return lambda: Vec2Array(pts)
+
+@benchmark(*array_sizes)
+def vec2array_iter(impl, size):
+	a = impl.Vec2Array(rand_pts(size))
+	return lambda: list(a)
+
+@benchmark(*array_sizes)
+def vec2array_add(impl, size):
+	a = impl.Vec2Array(rand_pts(size, seed=1))
+	b = impl.Vec2Array(rand_pts(size, seed=2))
+	return lambda: a + b
+
+@benchmark(*array_sizes)
+def vec2array_mul_scalar(impl, size):
+	a = impl.Vec2Array(rand_pts(size))
+	return lambda: a * 3.0
+
+@benchmark(*array_sizes)
+def vec2array_normalized(impl, size):
+	a = impl.Vec2Array(rand_pts(size))
+	return a.normalized
+
+@benchmark(*array_sizes)
+def vec2array_lengths(impl, size):
+	a = impl.Vec2Array(rand_pts(size))
+	return a.lengths
+
+@benchmark(*array_sizes)
+def vec2array_dots(impl, size):
+	a = impl.Vec2Array(rand_pts(size, seed=1))
+	b = impl.Vec2Array(rand_pts(size, seed=2))
+	return lambda: a.dots(b)
+
+@benchmark(*array_sizes)
+def vec2array_distances_to(impl, size):
+	a = impl.Vec2Array(rand_pts(size))
+	p = impl.Vec2(500, 500)
+	return lambda: a.distances_to(p)
+
+@benchmark(*array_sizes)
+def vec2array_sum(impl, size):
+	a = impl.Vec2Array(rand_pts(size))
+	return a.sum
+
+@benchmark(*array_sizes)
+def vec2array_min_point(impl, size):
+	a = impl.Vec2Array(rand_pts(size))
+	return a.min_point
+
+@benchmark(*array_sizes)
+def vec2array32_transform(impl, size):
+	a = impl.Vec2Array32(rand_pts(size))
+	xform = impl.Affine.rotation(33) * impl.Affine.scale(1.5)
+	return lambda: a * xform
+
+
+## Affine ##
+
+@benchmark()
+def affine_new(impl, size):
+	Affine = impl.Affine
+	return lambda: Affine(1.0, 0.5, 3.0, 0.25, 2.0, 4.0)
+
+@benchmark()
+def affine_rotation(impl, size):
+	Affine = impl.Affine
+	return lambda: Affine.rotation(33)
+
+@benchmark()
+def affine_mul(impl, size):
+	a = impl.Affine.rotation(33)
+	b = impl.Affine.scale(1.5)
+	return lambda: a * b
+
+@benchmark()
+def affine_invert(impl, size):
+	a = impl.Affine.rotation(33) * impl.Affine.scale(1.5)
+	return lambda: ~a
+
+@benchmark()
+def affine_mul_vec2(impl, size):
+	a = impl.Affine.rotation(33) * impl.Affine.scale(1.5)
+	v = impl.Vec2(1.0, 2.0)
+	return lambda: v * a
+
+@benchmark(*array_sizes)
+def affine_mul_vec2array(impl, size):
+	a = impl.Affine.rotation(33) * impl.Affine.scale(1.5)
+	pts = impl.Vec2Array(rand_pts(size))
+	return lambda: pts * a
+
+@benchmark(*array_sizes)
+def affine_transform(impl, size):
+	a = impl.Affine.rotation(33) * impl.Affine.scale(1.5)
+	pts = impl.Vec2Array(rand_pts(size))
+	out = impl.Vec2Array(pts)
+	return lambda: a.transform(pts, out)
+
+
+## BoundingBox ##
+
+@benchmark(*array_sizes)
+def boundingbox_new(impl, size):
+	BoundingBox = impl.BoundingBox
+	pts = impl.Vec2Array(rand_pts(size))
+	return lambda: BoundingBox(pts)
+
+@benchmark()
+def boundingbox_contains_point(impl, size):
+	box = impl.BoundingBox([(0, 0), (100, 100)])
+	p = impl.Vec2(50, 50)
+	return lambda: box.contains_point(p)
+
+@benchmark()
+def boundingbox_inflate(impl, size):
+	box = impl.BoundingBox([(0, 0), (100, 100)])
+	return lambda: box.inflate(10)
+
+@benchmark()
+def boundingbox_mul_affine(impl, size):
+	box = impl.BoundingBox([(0, 0), (100, 100)])
+	xform = impl.Affine.rotation(33)
+	return lambda: box * xform
+
+@benchmark(16, 1024)
+def boundingbox_from_shapes(impl, size):
+	box = impl.BoundingBox
+	boxes = [box.from_center(p, 10, 10) for p in rand_pts(size)]
+	return lambda: box.from_shapes(boxes)
+
+
+## Lines ##
+
+@benchmark()
+def line_from_points(impl, size):
+	Line = impl.Line
+	pts = [(0, 0), (3, 4)]
+	return lambda: Line.from_points(pts)
+
+@benchmark()
+def line_distance_to(impl, size):
+	line = impl.Line.from_points([(0, 0), (3, 4)])
+	p = impl.Vec2(5, 1)
+	return lambda: line.distance_to(p)
+
+@benchmark()
+def line_project(impl, size):
+	line = impl.Line.from_points([(0, 0), (3, 4)])
+	p = impl.Vec2(5, 1)
+	return lambda: line.project(p)
+
+@benchmark()
+def line_intersection(impl, size):
+	a = impl.Line.from_points([(0, 0), (3, 4)])
+	b = impl.Line.from_points([(0, 4), (3, 0)])
+	return lambda: a.intersection(b)
+
+@benchmark()
+def ray_contains_point(impl, size):
+	ray = impl.Ray((0, 0), (3, 4))
+	p = impl.Vec2(6, 8)
+	return lambda: ray.contains_point(p)
+
+@benchmark()
+def linesegment_distance_to(impl, size):
+	seg = impl.LineSegment.from_points([(0, 0), (3, 4)])
+	p = impl.Vec2(5, 1)
+	return lambda: seg.distance_to(p)
+
+@benchmark()
+def linesegment_intersection(impl, size):
+	a = impl.LineSegment.from_points([(0, 0), (3, 4)])
+	b = impl.LineSegment.from_points([(0, 4), (3, 0)])
+	return lambda: a.intersection(b)
+
+@benchmark(64, 1024)
+def line_find_intersections(impl, size):
+	find_intersections = impl.find_intersections
+	segments = rand_segments(impl, size)
+	return lambda: find_intersections(segments)
+
+
+## Polygon ##
+
+# Polygon properties are cached, so benchmarks of them construct a new
+# polygon each time, and include the cost of the construction, which is
+# measured separately by polygon.new
+
+@benchmark(*poly_sizes)
+def polygon_new(impl, size):
+	Polygon = impl.Polygon
+	verts = star(impl, size)
+	return lambda: Polygon(verts)
+
+@benchmark(*poly_sizes)
+def polygon_regular(impl, size):
+	Polygon = impl.Polygon
+	return lambda: Polygon.regular(size, 500)
+
+@benchmark(*poly_sizes)
+def polygon_is_convex(impl, size):
+	Polygon = impl.Polygon
+	verts = regular(impl, size)
+	return lambda: Polygon(verts).is_convex
+
+@benchmark(*poly_sizes)
+def polygon_is_simple(impl, size):
+	Polygon = impl.Polygon
+	verts = star(impl, size)
+	return lambda: Polygon(verts).is_simple
+
+@benchmark(*poly_sizes)
+def polygon_centroid(impl, size):
+	Polygon = impl.Polygon
+	verts = star(impl, size)
+	return lambda: Polygon(verts).centroid
+
+@benchmark(*poly_sizes)
+def polygon_area(impl, size):
+	Polygon = impl.Polygon
+	verts = star(impl, size)
+	return lambda: Polygon(verts).area
+
+@benchmark(*poly_sizes)
+def polygon_perimeter(impl, size):
+	Polygon = impl.Polygon
+	verts = star(impl, size)
+	return lambda: Polygon(verts).perimeter
+
+@benchmark(*poly_sizes)
+def polygon_bounding_box(impl, size):
+	Polygon = impl.Polygon
+	verts = star(impl, size)
+	return lambda: Polygon(verts).bounding_box
+
+@benchmark(*poly_sizes)
+def polygon_triangulate(impl, size):
+	Polygon = impl.Polygon
+	verts = star(impl, size)
+	return lambda: Polygon(verts).triangulate()
+
+@benchmark(16, 256)
+def polygon_areas(impl, size):
+	Polygon = impl.Polygon
+	polys = [list(Polygon.regular(size, 10, center=p))
+		for p in rand_pts(64)]
+	return lambda: Polygon.areas([Polygon(verts) for verts in polys])
+
+@benchmark(*poly_sizes)
+def polygon_convex_hull(impl, size):
+	convex_hull = impl.Polygon.convex_hull
+	pts = impl.Vec2Array(rand_pts(size))
+	return lambda: convex_hull(pts)
+
+@benchmark(*poly_sizes)
+def polygon_mul_affine(impl, size):
+	poly = impl.Polygon(star(impl, size))
+	poly.is_simple
+	xform = impl.Affine.rotation(33)
+	return lambda: poly * xform
+
+@benchmark(*poly_sizes)
+def polygon_eq(impl, size):
+	verts = star(impl, size)
+	a = impl.Polygon(verts)
+	b = impl.Polygon(verts[1:] + verts[:1])
+	return lambda: a == b
+
+# Point containment is timed over 256 points for each polygon, with the
+# polygon's properties already known, so only the point tests are measured
+
+def contains_point(impl, poly):
+	pts = [impl.Vec2(*p) for p in rand_pts(256)]
+	poly.contains_point(pts[0])
+	return each(poly.contains_point, pts)
+
+@benchmark(*poly_sizes)
+def polygon_contains_point_convex(impl, size):
+	return contains_point(impl, impl.Polygon(regular(impl, size)))
+
+@benchmark(*poly_sizes)
+def polygon_contains_point_simple(impl, size):
+	return contains_point(impl, impl.Polygon(star(impl, size)))
+
+@benchmark(*poly_sizes)
+def polygon_contains_point_prepared(impl, size):
+	poly = impl.Polygon(star(impl, size))
+	poly.prepare()
+	return contains_point(impl, poly)
+
+@benchmark(*poly_sizes)
+def polygon_contains_points(impl, size):
+	poly = impl.Polygon(star(impl, size))
+	pts = impl.Vec2Array(rand_pts(4096))
+	poly.contains_points(pts[:1])
+	return lambda: poly.contains_points(pts)
+
+@benchmark(*poly_sizes)
+def polygon_tangents_to_point(impl, size):
+	poly = impl.Polygon(regular(impl, size))
+	poly.is_convex
+	p = impl.Vec2(2000, 1000)
+	return lambda: poly.tangents_to_point(p)
+
+@benchmark(*poly_sizes)
+def polygon_clip(impl, size):
+	poly = impl.Polygon(star(impl, size))
+	clip = impl.Polygon(regular(impl, 8, radius=400))
+	return lambda: poly.clip(clip)
+
+@benchmark(*poly_sizes)
+def polygon_intersection(impl, size):
+	a = impl.Polygon(regular(impl, size))
+	b = impl.Polygon(regular(impl, size, center=(700, 600)))
+	return lambda: a.intersection(b)
+
+def bool_operands(impl, size):
+	a = impl.Polygon(star(impl, size))
+	b = impl.Polygon(list(impl.Polygon.star(
+		size // 2, 300, 500, center=(600, 550), angle=7)))
+	return a, b
+
+@benchmark(*bool_sizes)
+def polygon_union(impl, size):
+	a, b = bool_operands(impl, size)
+	return lambda: a.union(b)
+
+@benchmark(*bool_sizes)
+def polygon_difference(impl, size):
+	a, b = bool_operands(impl, size)
+	return lambda: a.difference(b)
+
+@benchmark(*bool_sizes)
+def polygon_symmetric_difference(impl, size):
+	a, b = bool_operands(impl, size)
+	return lambda: a.symmetric_difference(b)
+
+
+## Spatial indexes ##
+
+@benchmark(*index_sizes)
+def rtree_new(impl, size):
+	RTree = impl.RTree
+	boxes = [impl.BoundingBox.from_center(p, 10, 10) for p in rand_pts(size)]
+	return lambda: RTree(boxes)
+
+@benchmark(*index_sizes)
+def rtree_query_box(impl, size):
+	boxes = [impl.BoundingBox.from_center(p, 10, 10) for p in rand_pts(size)]
+	tree = impl.RTree(boxes)
+	queries = [impl.BoundingBox.from_center(p, 50, 50)
+		for p in rand_pts(256, seed=1)]
+	return each(tree.query_box, queries)
+
+@benchmark(*index_sizes)
+def kdtree_new(impl, size):
+	KDTree = impl.KDTree
+	pts = impl.Vec2Array(rand_pts(size))
+	return lambda: KDTree(pts)
+
+@benchmark(*index_sizes)
+def kdtree_nearest(impl, size):
+	tree = impl.KDTree(impl.Vec2Array(rand_pts(size)))
+	queries = [impl.Vec2(*p) for p in rand_pts(256, seed=1)]
+	return each(tree.nearest, queries)
+
+
+## WKB ##
+
+@benchmark(*poly_sizes)
+def wkb_to_wkb(impl, size):
+	to_wkb = impl.to_wkb
+	poly = impl.Polygon(star(impl, size))
+	return lambda: to_wkb(poly)
+
+@benchmark(*poly_sizes)
+def wkb_from_wkb(impl, size):
+	from_wkb = impl.from_wkb
+	data = impl.to_wkb(impl.Polygon(star(impl, size)))
+	return lambda: from_wkb(data)
+
+
+## Running ##
+
+def time_func(func, min_time, repeat):
+	"""Return the best time of a single call to func, calibrating the
+	number of calls per measurement so each takes at least min_time
+	"""
+	number = 1
+	while True:
+		start = default_timer()
+		for i in range(number):
+			func()
+		elapsed = default_timer() - start
+		if elapsed >= min_time:
+			break
+		# Aim a little over min_time to avoid another round
+		number = max(number * 2,
+			int(number * min_time * 1.2 / max(elapsed, 1e-9)))
+	best = elapsed / number
+	for i in range(repeat - 1):
+		start = default_timer()
+		for j in range(number):
+			func()
+		best = min(best, (default_timer() - start) / number)
+	return best
+
+def select(pattern, max_size):
+	"""Return the registered (name, func, size) to run whose names match
+	the regular expression pattern
+	"""
+	selected = []
+	match = re.compile(pattern or '').search
+	for name, func, sizes in benchmarks:
+		for size in sizes:
+			if size is not None and max_size and size > max_size:
+				continue
+			if match(bench_name(name, size)):
+				selected.append((name, func, size))
+	return selected
+
+def run(impl_names, selected, min_time, repeat, out=sys.stdout):
+	results = {}
+	impls = []
+	for name in impl_names:
+		try:
+			impls.append(load_implementation(name))
+		except ImportError:
+			if name != 'np':
+				raise
+			sys.stderr.write('Skipping np: NumPy is not available\n')
+	if not impls:
+		return results
+	for impl in impls:
+		results[impl.name] = {}
+	for name, func, size in selected:
+		full_name = bench_name(name, size)
+		out.write('%-44s' % full_name)
+		for impl in impls:
+			best = time_func(func(impl, size), min_time, repeat)
+			results[impl.name][full_name] = best
+			out.write(' %4s %10s' % (impl.name, format_time(best)))
+		if 'c' in results and 'py' in results:
+			out.write('  x%.1f' % (results['py'][full_name]
+				/ results['c'][full_name]))
+		out.write('\n')
+		out.flush()
+	return results
+
+def format_time(seconds):
+	for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+		if seconds >= scale:
+			return '%.3g%s' % (seconds / scale, unit)
+	return '%.3gns' % (seconds / 1e-9)
+
+def compare(baseline, results, threshold, out=sys.stdout):
+	"""Compare the results against the baseline results, writing a report of
+	the changes and returning the list of regressions, as
+	(implementation, name, ratio) tuples
+	"""
+	regressions = []
+	for impl_name in sorted(results):
+		base_times = baseline.get(impl_name, {})
+		for name in sorted(results[impl_name]):
+			if name not in base_times:
+				continue
+			ratio = results[impl_name][name] / base_times[name]
+			if ratio > 1.0 + threshold:
+				flag = 'SLOWER'
+				regressions.append((impl_name, name, ratio))
+			elif ratio < 1.0 - threshold:
+				flag = 'faster'
+			else:
+				flag = ''
+			out.write('%-4s %-44s %10s %10s %6.2f %s\n' % (impl_name, name,
+				format_time(base_times[name]),
+				format_time(results[impl_name][name]), ratio, flag))
+	return regressions
+
+def environment():
+	import planar
+	return {
+		'python': sys.version.split()[0],
+		'implementation': platform.python_implementation(),
+		'platform': platform.platform(),
+		'machine': platform.machine(),
+		'planar': planar.__version__,
+		'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+	}
+
+def main(args=None):
+	parser = optparse.OptionParser(usage='%prog [options]',
+		description='Run the planar benchmarks')
+	parser.add_option('-b', '--backend', action='append', dest='backends',
+		choices=implementation_names,
+		help='implementation to benchmark, c, py or np (default all)')
+	parser.add_option('-k', dest='pattern',
+		help='only run benchmarks with names matching this regex')
+	parser.add_option('-s', '--max-size', type='int', default=0,
+		help='skip benchmarks of sizes larger than this')
+	parser.add_option('-t', '--min-time', type='float', default=0.1,
+		help='minimum seconds per measurement (default %default)')
+	parser.add_option('-r', '--repeat', type='int', default=3,
+		help='measurements per benchmark, the best is kept '
+			'(default %default)')
+	parser.add_option('-o', '--output',
+		help='write the results to this JSON file')
+	parser.add_option('-c', '--compare', metavar='BASELINE',
+		help='compare the results against a saved JSON file')
+	parser.add_option('--threshold', type='float', default=0.1,
+		help='relative slowdown considered a regression when comparing '
+			'(default %default)')
+	parser.add_option('-l', '--list', action='store_true',
+		help='list the benchmarks and exit')
+	options, args = parser.parse_args(args)
+	if args:
+		parser.error('unexpected arguments')
+
+	selected = select(options.pattern, options.max_size)
+	if options.list:
+		for name, func, size in selected:
+			print(bench_name(name, size))
+		return 0
+	baseline = None
+	if options.compare:
+		with open(options.compare) as f:
+			baseline = json.load(f)
+	results = run(options.backends or implementation_names, selected,
+		options.min_time, options.repeat)
+	if not results:
+		return 1
+	if options.output:
+		with open(options.output, 'w') as f:
+			json.dump({'environment': environment(), 'results': results},
+				f, indent=1, sort_keys=True)
+	if baseline is not None:
+		if baseline['environment']['python'] != sys.version.split()[0]:
+			sys.stderr.write('Warning: baseline is from Python %s\n'
+				% baseline['environment']['python'])
+		print('')
+		regressions = compare(baseline['results'], results, options.threshold)
+		if regressions:
+			print('\n%d regression(s) over %d%%'
+				% (len(regressions), options.threshold * 100))
+			return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,26 @@
+from timeit import repeat
+from planar import Vec2, Affine, BoundingBox, Line, Ray, LineSegment
+
+v = Vec2(1.5, 2.5)
+w = Vec2(-3.0, 4.0)
+pts = [(0.0, 0.0), (1.0, 2.0)]
+number = 1000000
+
+calls = [
+	("Vec2(x, y)", lambda: Vec2(1.5, 2.5)),
+	("Vec2(int, int)", lambda: Vec2(1, 2)),
+	("Affine(a, b, c, d, e, f)", lambda: Affine(1.0, 0.0, 0.0, 0.0, 1.0, 0.0)),
+	("BoundingBox(points)", lambda: BoundingBox(pts)),
+	("Line(point, direction)", lambda: Line(v, w)),
+	("Ray(point, direction)", lambda: Ray(v, w)),
+	("LineSegment(point, vector)", lambda: LineSegment(v, w)),
+	("Line.from_normal(normal, offset)", lambda: Line.from_normal(w, 2.0)),
+	("v.dot(w)", lambda: v.dot(w)),
+	("v.lerp(w, t)", lambda: v.lerp(w, 0.25)),
+]
+
+# Time each call, subtracting the overhead of the lambda itself
+overhead = min(repeat(lambda: None, number=number, repeat=5))
+for name, func in calls:
+	elapsed = min(repeat(func, number=number, repeat=5)) - overhead
+	print("%-34s %6.1f ns/call" % (name, elapsed / number * 1e9))
@@ -34,8 +34,8 @@ for poly in itertools.chain(regulars, stars):
 		assert cross == winding == contains, (
 			list(poly), p, cross, winding, contains, poly._min_r, (p - poly.centroid).length, poly._max_r)
 
-print("ins", ins)
-print("outs", (len(regulars) + len(stars))*len(pts) - ins)
+print("ins %d" % ins)
+print("outs %d" % ((len(regulars) + len(stars))*len(pts) - ins))
 
 times = 10
 
@@ -55,9 +55,9 @@ def test_crossing(polys):
 				crossing_test(p)
 	return test
 
-print("crossing regular", timeit(test_crossing(regulars), number=times) - null)
-print("crossing stars", timeit(test_crossing(stars), number=times) - null)
-print("crossing rands", timeit(test_crossing(rands), number=times) - null)
+print("crossing regular %.6f" % (timeit(test_crossing(regulars), number=times) - null))
+print("crossing stars %.6f" % (timeit(test_crossing(stars), number=times) - null))
+print("crossing rands %.6f" % (timeit(test_crossing(rands), number=times) - null))
 
 def test_winding(polys):
 	def test():
@@ -67,10 +67,10 @@ def test_winding(polys):
 				winding_test(p)
 	return test
 
-print()
-print("winding regular", timeit(test_winding(regulars), number=times) - null)
-print("winding stars", timeit(test_winding(stars), number=times) - null)
-print("winding rands", timeit(test_winding(rands), number=times) - null)
+print('')
+print("winding regular %.6f" % (timeit(test_winding(regulars), number=times) - null))
+print("winding stars %.6f" % (timeit(test_winding(stars), number=times) - null))
+print("winding rands %.6f" % (timeit(test_winding(rands), number=times) - null))
 
 
 def test_contains(polys):
@@ -81,8 +81,8 @@ def test_contains(polys):
 				contains_test(p)
 	return test
 
-print()
-print("contains regular", timeit(test_contains(regulars), number=times) - null)
-print("contains stars", timeit(test_contains(stars), number=times) - null)
-print("contains rands", timeit(test_contains(rands), number=times) - null)
+print('')
+print("contains regular %.6f" % (timeit(test_contains(regulars), number=times) - null))
+print("contains stars %.6f" % (timeit(test_contains(stars), number=times) - null))
+print("contains rands %.6f" % (timeit(test_contains(rands), number=times) - null))
 
@@ -22,8 +22,8 @@ for tri in tris:
 		count += 1
 		assert cross == bary, (count, list(tri), p, cross, bary)
 
-print("ins", ins)
-print("outs", len(tris)*len(pts) - ins)
+print("ins %d" % ins)
+print("outs %d" % (len(tris)*len(pts) - ins))
 
 times = 10
 
@@ -41,7 +41,7 @@ def test_winding():
 		for p in pts:
 			winding_test(p)
 
-print("winding", timeit(test_winding, number=times) - null)
+print("winding %.6f" % (timeit(test_winding, number=times) - null))
 
 def test_bary():
 	for tri in tris:
@@ -49,5 +49,5 @@ def test_bary():
 		for p in pts:
 			bary_test(p)
 
-print("bary", timeit(test_bary, number=times) - null)
+print("bary %.6f" % (timeit(test_bary, number=times) - null))
 
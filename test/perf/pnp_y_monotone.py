@@ -74,8 +74,10 @@ for verts in [4, 5, 6, 7, 8, 9, 10, 20, 40, 80, 160, 320, 640, 1280, 3000]:
 		ymono = ymono_test(pt)
 		assert winding == ymono, (winding, ymono, pt, list(poly))
 		ins += ymono
-	print()
-	print("ins", ins, "outs", len(pts)-ins)
-	print(verts, "sided winding:", timeit(poly_winding_test(poly), number=100))
-	print(verts, "sided y-mono:", timeit(poly_ymono_test(poly), number=100))
+	print('')
+	print("ins %d outs %d" % (ins, len(pts)-ins))
+	print("%d sided winding: %.6f"
+		% (verts, timeit(poly_winding_test(poly), number=100)))
+	print("%d sided y-mono: %.6f"
+		% (verts, timeit(poly_ymono_test(poly), number=100)))
 
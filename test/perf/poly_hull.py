@@ -168,15 +168,15 @@ for count in [4, 8, 16, 32, 64, 128, 256, 512, 1024]:
     ahull = Polygon.convex_hull(rand)
     confirm_hull(rand, ahull)
 
-    print("Graham rand", count, "points:", 
+    print("Graham rand %d points: %.6f" % (count,
         timeit(functools.partial(graham_hull, rand_tuples),
-        number=times))
-    print("Quick rand", count, "points:", 
+        number=times)))
+    print("Quick rand %d points: %.6f" % (count,
         timeit(functools.partial(quick_hull, rand),
-        number=times))
-    print("Adaptive rand", count, "points:", 
+        number=times)))
+    print("Adaptive rand %d points: %.6f" % (count,
         timeit(functools.partial(Polygon.convex_hull, rand),
-        number=times))
+        number=times)))
     
     reg = Polygon.regular(count, 10, center=(20,0))
     reg_tuples = [tuple(p) for p in reg]
@@ -188,42 +188,42 @@ for count in [4, 8, 16, 32, 64, 128, 256, 512, 1024]:
     ahull = Polygon.convex_hull(reg)
     confirm_hull(reg, ahull)
 
-    print("Graham reg", count, "points:", 
+    print("Graham reg %d points: %.6f" % (count,
         timeit(functools.partial(graham_hull, reg_tuples),
-        number=times))
-    print("Quick reg", count, "points:", 
+        number=times)))
+    print("Quick reg %d points: %.6f" % (count,
         timeit(functools.partial(quick_hull, reg),
-        number=times))
-    print("Adaptive reg", count, "points:", 
+        number=times)))
+    print("Adaptive reg %d points: %.6f" % (count,
         timeit(functools.partial(Polygon.convex_hull, reg),
-        number=times))
+        number=times)))
     
     mixed = reg_tuples + rand_tuples
     count = len(mixed)
-    print("Graham mixed", count, "points:", 
+    print("Graham mixed %d points: %.6f" % (count,
         timeit(functools.partial(graham_hull, mixed),
-        number=times))
-    print("Quick mixed", count, "points:", 
+        number=times)))
+    print("Quick mixed %d points: %.6f" % (count,
         timeit(functools.partial(quick_hull, mixed),
-        number=times))
-    print("Adaptive mixed", count, "points:", 
+        number=times)))
+    print("Adaptive mixed %d points: %.6f" % (count,
         timeit(functools.partial(Polygon.convex_hull, mixed),
-        number=times))
+        number=times)))
     
     multi = (list(Polygon.regular(count, 5, center=(0,8))) + 
         list(Polygon.regular(count, 3, center=(-2.5, -2.5))) +
         list(Polygon.regular(count, 10, center=(3,-5))))
     count = len(multi)
-    print("Graham multi", count, "points:", 
+    print("Graham multi %d points: %.6f" % (count,
         timeit(functools.partial(graham_hull, multi),
-        number=times))
-    print("Quick multi", count, "points:", 
+        number=times)))
+    print("Quick multi %d points: %.6f" % (count,
         timeit(functools.partial(quick_hull, multi),
-        number=times))
-    print("Adaptive multi", count, "points:", 
+        number=times)))
+    print("Adaptive multi %d points: %.6f" % (count,
         timeit(functools.partial(Polygon.convex_hull, multi),
-        number=times))
+        number=times)))
 
-    print()
+    print('')
 
 
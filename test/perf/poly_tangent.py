@@ -37,16 +37,16 @@ for sides in [4, 5, 6, 7, 8, 9, 10, 20, 40, 80, 160, 320, 640]:
 		for pt in pts:
 			pt_tangents(pt)
 	
-	print()
-	print("General tangents", len(poly), "sides:", 
-		timeit(general_tangents, number=times) - null_time)
+	print('')
+	print("General tangents %d sides: %.6f" % (len(poly),
+		timeit(general_tangents, number=times) - null_time))
 	
 	def convex_tangents():
 		pt_tangents = poly.tangents_to_point
 		for pt in pts:
 			pt_tangents(pt)
 	
-	print("Convex tangents", len(poly), "sides:", 
-		timeit(convex_tangents, number=times) - null_time)
+	print("Convex tangents %d sides: %.6f" % (len(poly),
+		timeit(convex_tangents, number=times) - null_time))
 
 	
@@ -0,0 +1,54 @@
+from timeit import default_timer
+from threading import Thread
+from planar import Vec2Array, Affine, BoundingBox, Polygon
+from random import random
+import os
+
+def rand_pts(count, span=1000):
+	return Vec2Array([(random() * span, random() * span)
+		for i in range(count)])
+
+def run_threads(func, args, thread_count):
+	"""Run func once for each item in args using thread_count threads,
+	returning the elapsed time"""
+	chunks = [args[i::thread_count] for i in range(thread_count)]
+	def run(chunk):
+		for arg in chunk:
+			func(arg)
+	threads = [Thread(target=run, args=(chunk,)) for chunk in chunks]
+	start = default_timer()
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	return default_timer() - start
+
+tasks = 16
+star = list(Polygon.star(25000, 400, 500))
+pts = rand_pts(200000)
+xform = Affine.rotation(33) * Affine.scale(1.5)
+
+def new_polys():
+	return [Polygon(star) for i in range(tasks)]
+
+benchmarks = [
+	("convex_hull", Polygon.convex_hull, lambda: [pts] * tasks),
+	("is_simple", lambda poly: poly.is_simple, new_polys),
+	("centroid", lambda poly: poly.centroid, new_polys),
+	("contains_points", lambda poly: poly.contains_points(pts),
+		lambda: [Polygon.regular(100, 500, center=(500,500))] * tasks),
+	("transform", lambda a: a * xform, lambda: [pts] * tasks),
+	("bounding_box", BoundingBox, lambda: [pts] * tasks),
+]
+
+cpus = os.cpu_count() or 1
+thread_counts = sorted(set([1, 2, 4, cpus]))
+print("cpus %d" % cpus)
+
+for name, func, make_args in benchmarks:
+	base = None
+	for thread_count in thread_counts:
+		elapsed = run_threads(func, make_args(), thread_count)
+		base = base or elapsed
+		print("%s %d threads: %.4f speedup: %.2f"
+			% (name, thread_count, elapsed, base / elapsed))
@@ -0,0 +1,44 @@
+from timeit import timeit
+from planar import Vec2Array, Vec2Array32, Affine
+from random import random
+
+def rand_pts(count, span=1000):
+	return [(random() * span, random() * span) for i in range(count)]
+
+pts = rand_pts(100000)
+a64 = Vec2Array(pts)
+a32 = Vec2Array32(pts)
+
+print("bytes 64 %d" % memoryview(a64).nbytes)
+print("bytes 32 %d" % memoryview(a32).nbytes)
+
+# confirm that the arrays agree within single precision
+xform = Affine.rotation(33) * Affine.scale(1.5)
+t64 = a64 * xform
+t32 = a32 * xform
+for p64, p32 in zip(t64, t32):
+	assert (p64 - p32).length < 0.01, (p64, p32)
+
+times = 20
+
+def test_transform_64():
+	a64 * xform
+
+print("transform 64 %.6f" % timeit(test_transform_64, number=times))
+
+def test_transform_32():
+	a32 * xform
+
+print("transform 32 %.6f" % timeit(test_transform_32, number=times))
+
+def test_itransform_64():
+	global a64
+	a64 *= xform
+
+print("itransform 64 %.6f" % timeit(test_itransform_64, number=times))
+
+def test_itransform_32():
+	global a32
+	a32 *= xform
+
+print("itransform 32 %.6f" % timeit(test_itransform_32, number=times))
@@ -6,6 +6,11 @@ import math
 import unittest
 from nose.tools import assert_equal, assert_almost_equal, raises
 
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
 def seq_almost_equal(t1, t2, error=0.00001):
     assert len(t1) == len(t2), "%r != %r" % (t1, t2)
     for m1, m2 in zip(t1, t2):
@@ -308,6 +313,14 @@ class BoundingBoxBaseTestCase(object):
         assert_equal(str(bbox), 'BoundingBox([(-1.5, 0.25), (-1.25, 0.5)])')
         assert_equal(repr(bbox), str(bbox))
 
+    def test_pickle(self):
+        import pickle
+        bbox = self.BoundingBox([(-1.25, 0.1), (-1.5, 0.5)])
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            p = pickle.loads(pickle.dumps(bbox, protocol))
+            assert isinstance(p, self.BoundingBox)
+            assert_equal(p, bbox)
+
 
 class PyBoundingBoxTestCase(BoundingBoxBaseTestCase, unittest.TestCase):
     from planar.vector import Vec2, Seq2
@@ -318,6 +331,15 @@ class CBoundingBoxTestCase(BoundingBoxBaseTestCase, unittest.TestCase):
     from planar.c import Vec2, Seq2, BoundingBox
 
 
+if numpy is not None:
+    class NpBoundingBoxTestCase(BoundingBoxBaseTestCase, unittest.TestCase):
+        from planar.np import Vec2, Seq2, BoundingBox
+
+        def test_from_ndarray(self):
+            box = self.BoundingBox(numpy.array([[1, -2], [-3, 4], [0, 0]]))
+            assert_equal(box.min_point, self.Vec2(-3, -2))
+            assert_equal(box.max_point, self.Vec2(1, 4))
+
 if __name__ == '__main__':
     unittest.main()
 
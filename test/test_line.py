@@ -122,6 +122,20 @@ class LinearBaseTestCase(object):
         lg = self.LinearType((1, 2), (2, 3))
         lg.normal = (0, 0)
 
+    def test_pickle(self):
+        import pickle
+        lg = self.LinearType((0.1, -2), (3, 0.7))
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            p = pickle.loads(pickle.dumps(lg, protocol))
+            assert isinstance(p, self.LinearType)
+            assert_equal(p, lg)
+            for name in ('normal', 'direction', 'anchor', 'vector'):
+                if hasattr(lg, name):
+                    assert_equal(tuple(getattr(p, name)), 
+                        tuple(getattr(lg, name)))
+            if hasattr(lg, 'offset'):
+                assert_equal(p.offset, lg.offset)
+
 
 class LineBaseTestCase(LinearBaseTestCase):
 
@@ -293,6 +307,30 @@ class LineBaseTestCase(LinearBaseTestCase):
         assert not line.almost_equals(self.Line((1,-1.99), (2, 5)))
         assert not line.almost_equals(None)
 
+    def test_intersection(self):
+        line = self.Line((1, 1), (1, 1))
+        assert line.intersection(
+            self.Line((0, 2), (1, -1))).almost_equals((1, 1))
+        assert line.intersection(
+            self.Line((5, 0), (0, 3))).almost_equals((5, 5))
+        assert line.intersection(
+            self.Ray((1, -1), (-1, 0))).almost_equals((-1, -1))
+        assert_equal(line.intersection(self.Ray((1, -1), (0, -1))), None)
+        assert line.intersection(
+            self.LineSegment((-2, 0), (4, 0))).almost_equals((0, 0))
+        assert_equal(line.intersection(
+            self.LineSegment((-2, 4), (4, 0))), None)
+
+    def test_intersection_parallel(self):
+        line = self.Line((1, 1), (1, 1))
+        assert_equal(line.intersection(self.Line((0, 1), (2, 2))), None)
+        assert_equal(line.intersection(self.Line((4, 4), (-3, -3))), None)
+        assert_equal(line.intersection(line), None)
+
+    @raises(TypeError)
+    def test_intersection_wrong_type(self):
+        self.Line((1, 1), (1, 1)).intersection((0, 0))
+
     def test_transform(self):
         line = self.Line((0, 0), (-2, 1))
         line2 = line * self.Affine.rotation(-90, pivot=(-4, 2))
@@ -468,6 +506,24 @@ class RayBaseTestCase(LinearBaseTestCase):
         assert ray != None
         assert ray != ((1,-2), (2, 5))
 
+    def test_intersection(self):
+        ray = self.Ray((1, 1), (1, 0))
+        assert ray.intersection(
+            self.Ray((2, 0), (0, 1))).almost_equals((2, 1))
+        assert_equal(ray.intersection(self.Ray((2, 0), (0, -1))), None)
+        assert_equal(ray.intersection(self.Ray((0, 0), (0, 1))), None)
+        assert_equal(ray.intersection(self.Ray((1, 0), (0, 1))), (1, 1))
+        assert ray.intersection(
+            self.Ray((1, 2), (1, -1))).almost_equals((2, 1))
+        assert_equal(ray.intersection(self.Line((-5, 0), (0, 1))), None)
+        assert ray.intersection(
+            self.Line((5, 0), (0, 1))).almost_equals((5, 1))
+        assert ray.intersection(
+            self.LineSegment((3, 3), (0, -2))).almost_equals((3, 1))
+        assert_equal(ray.intersection(
+            self.LineSegment((3, 3), (0, -1))), None)
+        assert_equal(ray.intersection(self.Ray((1, 1), (1, 0))), None)
+
     def test_almost_equals(self):
         ray = self.Ray((1,-2), (2, 5))
         assert ray.almost_equals(self.Ray.from_points([(1,-2), (5,8)]))
@@ -534,6 +590,14 @@ class BaseLineSegmentTestCase(LinearBaseTestCase):
         assert_equal(line.end, self.Vec2(2,1))
         assert_equal(line.length, 0)
 
+    def test_pickle_degenerate(self):
+        import pickle
+        line = pickle.loads(pickle.dumps(
+            self.LineSegment.from_points([(2,1)]), 2))
+        assert_equal(line.anchor, self.Vec2(2,1))
+        assert_equal(line.end, self.Vec2(2,1))
+        assert_equal(line.length, 0)
+
     def test_from_points_too_few_distinct(self):
         """Test is n/a to LineSegment"""
 
@@ -764,10 +828,194 @@ class BaseLineSegmentTestCase(LinearBaseTestCase):
         assert line.almost_equals(line)
         assert not line.almost_equals(self.LineSegment((1,-1.99), (2, 5)))
 
+    def test_intersection(self):
+        seg = self.LineSegment((0, 0), (4, 2))
+        assert seg.intersection(
+            self.LineSegment((0, 2), (4, -2))).almost_equals((2, 1))
+        assert_equal(seg.intersection(
+            self.LineSegment((0, 2), (1, -1))), None)
+        assert_equal(seg.intersection(
+            self.LineSegment((5, 0), (0, 4))), None)
+        assert seg.intersection(
+            self.Line((1, 0), (0, 1))).almost_equals((1, 0.5))
+        assert_equal(seg.intersection(self.Line((5, 0), (0, 1))), None)
+        assert seg.intersection(
+            self.Ray((3, 3), (0, -1))).almost_equals((3, 1.5))
+        assert_equal(seg.intersection(self.Ray((3, 3), (0, 1))), None)
+
+    def test_intersection_at_endpoint(self):
+        seg = self.LineSegment((0, 0), (4, 2))
+        assert_equal(seg.intersection(
+            self.LineSegment((4, 2), (1, 5))), (4, 2))
+        assert seg.intersection(
+            self.LineSegment((1, 5), (3, -3))).almost_equals((4, 2))
+        assert_equal(seg.intersection(
+            self.LineSegment((2, 1), (-1, 3))), (2, 1))
+        assert_equal(seg.intersection(
+            self.LineSegment((-1, 3), (1, -3))), (0, 0))
+        assert_equal(seg.intersection(
+            self.LineSegment((0.000001, 0), (0, 5))), (0, 0))
+        assert seg.intersection(
+            self.LineSegment((4.000001, 2), (1, 3))).almost_equals((4, 2))
+        assert_equal(seg.intersection(
+            self.LineSegment((4.1, 2), (1, 3))), None)
+
+    def test_intersection_parallel(self):
+        seg = self.LineSegment((0, 0), (4, 2))
+        assert_equal(seg.intersection(
+            self.LineSegment((0, 1), (4, 2))), None)
+        assert_equal(seg.intersection(
+            self.LineSegment((2, 1), (4, 2))), None)
+        assert_equal(seg.intersection(self.Line((0, 0), (-2, -1))), None)
+
+    @raises(TypeError)
+    def test_intersection_wrong_type(self):
+        self.LineSegment((0, 0), (1, 1)).intersection(None)
+
+
+class FindIntersectionsBaseTestCase(object):
+
+    def test_no_segments(self):
+        assert_equal(self.find_intersections([]), [])
+        assert_equal(self.find_intersections(iter([])), [])
+
+    def test_no_intersections(self):
+        assert_equal(self.find_intersections([
+            ((0, 0), (1, 1)), ((0, 1), (1, 2)), ((2, 0), (3, -5))]), [])
+
+    def test_crossing(self):
+        result = self.find_intersections([
+            ((0, 0), (4, 4)), ((4, 0), (0, 4)), ((5, 0), (5, 1))])
+        assert_equal(len(result), 1)
+        point, indices = result[0]
+        assert point.almost_equals((2, 2)), point
+        assert_equal(indices, (0, 1))
+
+    def test_segments(self):
+        LineSegment = self.LineSegment
+        result = self.find_intersections([
+            LineSegment((0, 0), (4, 4)), LineSegment((4, 0), (-4, 4))])
+        assert_equal(len(result), 1)
+        point, indices = result[0]
+        assert point.almost_equals((2, 2)), point
+        assert_equal(indices, (0, 1))
+
+    def test_ordering(self):
+        result = self.find_intersections([
+            ((0, 3), (10, 3)), ((1, 0), (1, 5)), ((8, 5), (9, 0)), 
+            ((4, 0), (6, 6)), ((4, 5), (6, -1))])
+        points = [tuple(point) for point, indices in result]
+        assert_equal(points, sorted(points))
+        assert_equal([indices for point, indices in result],
+            [(0, 1), (0, 4), (3, 4), (0, 3), (0, 2)])
+
+    def test_many_through_point(self):
+        result = self.find_intersections([
+            ((-1, -1), (1, 1)), ((-1, 1), (1, -1)), ((0, -1), (0, 1)), 
+            ((-1, 0), (1, 0)), ((-2, -1), (2, 1))])
+        assert_equal(len(result), 1)
+        point, indices = result[0]
+        assert point.almost_equals((0, 0)), point
+        assert_equal(indices, (0, 1, 2, 3, 4))
+
+    def test_shared_endpoints(self):
+        assert_equal(self.find_intersections([
+            ((0, 0), (1, 1)), ((1, 1), (2, 0)), ((2, 0), (0, 0))]),
+            [((0, 0), (0, 2)), ((1, 1), (0, 1)), ((2, 0), (1, 2))])
+
+    def test_shared_endpoints_rounded(self):
+        LineSegment = self.LineSegment
+        # The end of the second segment is rounded to 5.999999999999999
+        result = self.find_intersections([
+            LineSegment.from_points([(6, 5), (6, 9)]),
+            LineSegment.from_points([(0, 0), (6, 9)])])
+        assert_equal(len(result), 1)
+        point, indices = result[0]
+        assert point.almost_equals((6, 9)), point
+        assert_equal(indices, (0, 1))
+
+    def test_closed_polyline_rounded(self):
+        import random
+        LineSegment = self.LineSegment
+        rand = random.Random(7)
+        for trial in range(5):
+            pts = [(rand.uniform(0, 100), rand.uniform(0, 100)) 
+                for i in range(100)]
+            segments = [LineSegment.from_points([pts[i - 1], pts[i]]) 
+                for i in range(len(pts))]
+            result = self.find_intersections(segments)
+            for i in range(len(pts)):
+                j = (i + 1) % len(pts)
+                assert [point for point, indices in result
+                    if point.almost_equals(pts[i]) 
+                    and i in indices and j in indices], (trial, i, j)
+
+    def test_index_types(self):
+        result = self.find_intersections([((0, 0), (2, 2)), ((0, 2), (2, 0))])
+        assert_equal([type(i) for i in result[0][1]], [int, int])
+
+    def test_endpoint_touching_segment(self):
+        assert_equal(self.find_intersections([
+            ((0, 0), (4, 0)), ((2, 3), (2, 0)), ((3, -2), (3, 0))]),
+            [((2, 0), (0, 1)), ((3, 0), (0, 2))])
+
+    def test_vertical(self):
+        assert_equal(self.find_intersections([
+            ((1, 0), (1, 4)), ((0, 1), (2, 1)), ((0, 4), (2, 2)),
+            ((1, 5), (1, 4)), ((0, 0), (2, 0))]),
+            [((1, 0), (0, 4)), ((1, 1), (0, 1)), ((1, 3), (0, 2)), 
+             ((1, 4), (0, 3))])
+
+    def test_collinear_overlap(self):
+        assert_equal(self.find_intersections([
+            ((0, 0), (2, 2)), ((3, 3), (1, 1)), ((5, 5), (4, 4))]),
+            [((1, 1), (0, 1)), ((2, 2), (0, 1))])
+
+    def test_degenerate_segment(self):
+        assert_equal(self.find_intersections([
+            ((0, 0), (2, 0)), ((1, 0), (1, 0)), ((3, 3), (3, 3))]),
+            [((1, 0), (0, 1))])
+
+    def test_matches_pairwise(self):
+        import random
+        import itertools
+        LineSegment = self.LineSegment
+        rand = random.Random(42)
+        segments = [
+            ((rand.randint(0, 10), rand.randint(0, 10)), 
+             (rand.randint(0, 10), rand.randint(0, 10)))
+            for i in range(80)]
+        result = self.find_intersections(segments)
+        points = [tuple(point) for point, indices in result]
+        assert_equal(points, sorted(set(points)))
+        segments = [LineSegment.from_points(s) for s in segments]
+        for point, indices in result:
+            for i in indices:
+                assert segments[i].distance_to(point) < 0.00001, (i, point)
+        for i, j in itertools.combinations(range(len(segments)), 2):
+            a, b = segments[i], segments[j]
+            meets = [p for p in tuple(a.points) + tuple(b.points)
+                if a.distance_to(p) < 0.00001 and b.distance_to(p) < 0.00001]
+            p = a.intersection(b)
+            if p is not None:
+                meets.append(p)
+            for p in meets:
+                assert [point for point, indices in result 
+                    if point.almost_equals(p) 
+                    and i in indices and j in indices], (i, j, p)
+
+    @raises(TypeError)
+    def test_not_segments(self):
+        self.find_intersections([((0, 0), (1, 1)), 5])
+
+    @raises(TypeError)
+    def test_too_many_points(self):
+        self.find_intersections([((0, 0), (1, 1), (2, 2))])
+
 
 class PyLineTestCase(LineBaseTestCase, unittest.TestCase):
     from planar.vector import Vec2
-    from planar.line import Line
+    from planar.line import Line, Ray, LineSegment
     from planar.transform import Affine
     LinearType = Line
 
@@ -781,7 +1029,7 @@ class PyLineTestCase(LineBaseTestCase, unittest.TestCase):
 
 
 class CLineTestCase(LineBaseTestCase, unittest.TestCase):
-    from planar.c import Vec2, Line, Affine
+    from planar.c import Vec2, Line, Ray, LineSegment, Affine
     LinearType = Line
 
     def test_str(self):
@@ -795,13 +1043,13 @@ class CLineTestCase(LineBaseTestCase, unittest.TestCase):
 
 class PyRayTestCase(RayBaseTestCase, unittest.TestCase):
     from planar.vector import Vec2
-    from planar.line import Ray, Line
+    from planar.line import Ray, Line, LineSegment
     from planar.transform import Affine
     LinearType = Ray
 
 
 class CRayTestCase(RayBaseTestCase, unittest.TestCase):
-    from planar.c import Vec2, Ray, Line, Affine
+    from planar.c import Vec2, Ray, Line, LineSegment, Affine
     LinearType = Ray
 
     def test_str(self):
@@ -815,7 +1063,7 @@ class CRayTestCase(RayBaseTestCase, unittest.TestCase):
 
 class PySegmentTestCase(BaseLineSegmentTestCase, unittest.TestCase):
     from planar.vector import Vec2
-    from planar.line import LineSegment, Line
+    from planar.line import LineSegment, Line, Ray
     from planar.transform import Affine
     LinearType = LineSegment
 
@@ -829,7 +1077,7 @@ class PySegmentTestCase(BaseLineSegmentTestCase, unittest.TestCase):
 
 
 class CSegmentTestCase(BaseLineSegmentTestCase, unittest.TestCase):
-    from planar.c import Vec2, LineSegment, Line, Affine
+    from planar.c import Vec2, LineSegment, Line, Ray, Affine
     LinearType = LineSegment
 
     def test_str(self):
@@ -840,6 +1088,18 @@ class CSegmentTestCase(BaseLineSegmentTestCase, unittest.TestCase):
         line = self.LineSegment((0.37, 0), (2, 23.5))
         assert_equal(repr(line), "LineSegment((0.37, 0), (2, 23.5))")
 
+
+class PyFindIntersectionsTestCase(
+    FindIntersectionsBaseTestCase, unittest.TestCase):
+    from planar.line import LineSegment, find_intersections
+    find_intersections = staticmethod(find_intersections)
+
+
+class CFindIntersectionsTestCase(
+    FindIntersectionsBaseTestCase, unittest.TestCase):
+    from planar.c import LineSegment, find_intersections
+    find_intersections = staticmethod(find_intersections)
+
 if __name__ == '__main__':
     unittest.main()
 
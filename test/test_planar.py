@@ -33,17 +33,43 @@ def test_set_epsilon():
 def test_py_imports():
 	import planar
 	import planar.py
-	from planar.py import (Vec2, Point, Vec2Array, Seq2, 
-		Line, Ray, LineSegment, Affine, BoundingBox, Polygon)
+	from planar.py import (Vec2, Point, Vec2Array, Vec2Array32, Seq2, 
+		Line, Ray, LineSegment, Affine, BoundingBox, Polygon, RTree,
+		KDTree, find_intersections)
 	assert set(planar.py.__all__).issubset(set(planar.__all__)), (
 		planar.py.__all__, planar.__all__)
 
+def test_np_imports():
+	try:
+		import numpy
+	except ImportError: # pragma: no cover
+		return
+	import planar
+	import planar.np
+	from planar.np import (Vec2, Point, Vec2Array, Vec2Array32, Seq2, 
+		Line, Ray, LineSegment, Affine, BoundingBox, Polygon, RTree,
+		KDTree, find_intersections)
+	assert set(planar.np.__all__).issubset(set(planar.__all__)), (
+		planar.np.__all__, planar.__all__)
+	assert issubclass(Polygon, Seq2)
+
 def test_c_imports():
 	import planar.c
-	from planar.c import (Vec2, Vec2Array, Seq2, 
-		Affine, BoundingBox, Polygon)
+	from planar.c import (Vec2, Vec2Array, Vec2Array32, Seq2, 
+		Line, Ray, LineSegment, Affine, BoundingBox, Polygon, RTree,
+		KDTree, find_intersections)
+
+def test_c_free_threaded():
+	import os, sys, sysconfig
+	if (not sysconfig.get_config_var('Py_GIL_DISABLED') 
+		or os.environ.get('PYTHON_GIL') == '1'):
+		return
+	import planar.c
+	# Importing the extension must not re-enable the GIL
+	assert not sys._is_gil_enabled()
 
 def test_direct_imports():
-	from planar import (Vec2, Point, Vec2Array, Seq2, 
-		Affine, BoundingBox, Polygon)
+	from planar import (Vec2, Point, Vec2Array, Vec2Array32, Seq2, 
+		Line, Ray, LineSegment, Affine, BoundingBox, Polygon, RTree,
+		KDTree, find_intersections)
 
@@ -3,9 +3,15 @@
 from __future__ import division
 import sys
 import math
+import array
 import unittest
 from nose.tools import assert_equal, assert_almost_equal, raises
 
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
 
 def assert_contains_point(polys, i, p):
     containing = [j for j, t in enumerate(polys) 
@@ -16,6 +22,20 @@ def assert_contains_point(polys, i, p):
         assert_equal([], containing)
 
 
+def assert_valid_triangulation(poly, triangles):
+    assert isinstance(triangles, array.array)
+    assert_equal(len(triangles) % 3, 0)
+    total_area = 0.0
+    for i in range(0, len(triangles), 3):
+        a, b, c = [poly[j] for j in triangles[i:i + 3]]
+        area = ((b[0] - a[0]) * (c[1] - a[1]) 
+            - (c[0] - a[0]) * (b[1] - a[1])) * 0.5
+        # Triangles are wound the same as the polygon
+        assert area * poly.signed_area >= 0.0, (a, b, c)
+        total_area += area
+    assert_almost_equal(total_area, poly.signed_area)
+
+
 class PolygonBaseTestCase(object):
 
     @raises(TypeError)
@@ -108,6 +128,12 @@ class PolygonBaseTestCase(object):
         # Triangle with coincident intruding edges
         poly = self.Polygon([(-2,0), (0,2), (-0.5,1), (0,2), (2,0)])
         assert not poly.is_convex
+        # Vertical edge retraced by the next one
+        poly = self.Polygon([(2,4), (2,1), (2,4), (1,3), (4,1), (4,2)])
+        assert not poly.is_convex
+        # Reflex first vertex after a zero-length closing edge
+        poly = self.Polygon([(1,1), (3,0), (1,2), (0,1), (0,0), (1,1)])
+        assert not poly.is_convex
 
     def test_convex_is_simple(self):
         poly = self.Polygon([(-1,-1), (1,-1), (0.5,0), (0, 0)])
@@ -137,6 +163,72 @@ class PolygonBaseTestCase(object):
         assert poly.is_simple_known
         assert not poly.is_simple # test cached value
     
+    def test_not_is_simple_touching(self):
+        # Vertex touching a non-adjacent edge
+        poly = self.Polygon([(0,0), (2,0), (2,2), (1,0), (0,2)])
+        assert not poly.is_simple
+        # Polygon pinched at a vertex
+        poly = self.Polygon([(0,0), (1,1), (2,0), (2,2), (1,1), (0,2)])
+        assert not poly.is_simple
+
+    def test_not_is_simple_overlapping_edges(self):
+        # Non-adjacent collinear edges overlap
+        poly = self.Polygon([(0,0), (3,0), (3,1), (2,0), (1,0), (0,1)])
+        assert not poly.is_simple
+        # Adjacent edges double back along each other
+        poly = self.Polygon([(1,2), (2,0), (0,2), (2,2)])
+        assert not poly.is_simple
+        # An edge retraced exactly backwards by the next one
+        poly = self.Polygon([(2,4), (2,1), (2,4), (1,3), (4,1), (4,2)])
+        assert not poly.is_simple
+        # A duplicate vertex between the edges does not hide it
+        poly = self.Polygon(
+            [(2,4), (2,1), (2,1), (2,3), (1,3), (4,1), (4,2)])
+        assert not poly.is_simple
+        # Adjacent collinear edges are simple
+        poly = self.Polygon([(0,0), (1,0), (2,0), (1,1)])
+        assert poly.is_simple
+
+    def test_is_simple_spiral(self):
+        # Many edges span the sweep line at once
+        outer = []
+        inner = []
+        for i in range(2000):
+            angle = i * 0.01
+            outer.append(
+                (math.cos(angle) * (angle + 1.0), 
+                 math.sin(angle) * (angle + 1.0)))
+            inner.append(
+                (math.cos(angle) * (angle + 2.0), 
+                 math.sin(angle) * (angle + 2.0)))
+        poly = self.Polygon(outer + inner[::-1])
+        assert poly.is_simple
+        poly = self.Polygon(outer + inner[::-1] + [(-30, 1)])
+        assert not poly.is_simple
+
+    def test_is_simple_matches_brute_force(self):
+        import random
+        rand = random.Random(42)
+        def crosses(a, b, c, d):
+            def side(p, q, r):
+                return ((q[0] - p[0])*(r[1] - p[1]) 
+                    - (r[0] - p[0])*(q[1] - p[1])) > 0.0
+            return (side(a, b, c) != side(a, b, d) 
+                and side(c, d, a) != side(c, d, b))
+        def brute_force_is_simple(verts):
+            n = len(verts)
+            for i in range(n):
+                for j in range(i + 2, n):
+                    if (j - i < n - 1 and crosses(
+                        verts[i - 1], verts[i], verts[j - 1], verts[j])):
+                        return False
+            return True
+        for i in range(200):
+            verts = [(rand.random(), rand.random()) 
+                for j in range(rand.randint(4, 12))]
+            poly = self.Polygon(verts, is_convex=False)
+            assert_equal(poly.is_simple, brute_force_is_simple(verts), verts)
+
     def test_mutation_invalidates_cached_properties(self):
         poly = self.Polygon([(0.5,0.5), (0.5,-0.5), (-0.5,-0.5), (-0.5,0.5)])
         assert poly.is_convex
@@ -306,6 +398,370 @@ class PolygonBaseTestCase(object):
         assert_equal(poly.centroid, None)
         assert not poly.is_simple
 
+    def test_area(self):
+        poly = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        assert_equal(poly.signed_area, 4)
+        assert_equal(poly.area, 4)
+        assert_equal(poly.signed_area, 4) # check cached value
+        poly = self.Polygon([(0,2), (2,2), (2,0), (0,0)])
+        assert_equal(poly.signed_area, -4)
+        assert_equal(poly.area, 4)
+
+    def test_area_concave(self):
+        poly = self.Polygon([(3,3), (1,-1), (-1,-1), (-3,3), (-1,-2), (1,-2)])
+        assert_equal(poly.signed_area, 4)
+        assert_equal(poly.area, 4)
+        poly = self.Polygon.star(5, 2, 1)
+        assert_almost_equal(poly.area, 
+            10 * 0.5 * 2 * 1 * math.sin(math.radians(36)))
+
+    def test_area_non_simple(self):
+        # Opposite loops cancel
+        poly = self.Polygon([(0,0), (2,2), (2,0), (0,2)])
+        assert_equal(poly.signed_area, 0)
+        assert_equal(poly.area, 0)
+
+    def test_area_from_centroid(self):
+        poly = self.Polygon([(3,3), (1,-1), (-1,-1), (-3,3), (-1,-2), (1,-2)])
+        poly.centroid
+        assert_equal(poly.signed_area, 4)
+
+    def test_perimeter(self):
+        poly = self.Polygon([(0,0), (3,0), (3,4)])
+        assert_equal(poly.perimeter, 12)
+        assert_equal(poly.perimeter, 12) # check cached value
+        poly = self.Polygon.regular(100, 1)
+        assert_almost_equal(poly.perimeter, 200 * math.sin(math.pi / 100))
+
+    def test_mutation_invalidates_area_and_perimeter(self):
+        poly = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        assert_equal(poly.area, 4)
+        assert_equal(poly.perimeter, 8)
+        poly[2] = (2, 4)
+        assert_equal(poly.area, 6)
+        assert_almost_equal(poly.perimeter, 8 + math.sqrt(8))
+        poly2 = poly * self.Affine.scale(2)
+        assert_equal(poly2.area, 24)
+        assert_equal(poly.area, 6)
+        poly *= self.Affine.scale(2)
+        assert_equal(poly.area, 24)
+
+    def test_copy_area_and_perimeter(self):
+        from copy import copy
+        poly = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        assert_equal(poly.area, 4)
+        assert_equal(poly.perimeter, 8)
+        poly2 = copy(poly)
+        assert_equal(poly2.area, 4)
+        assert_equal(poly2.perimeter, 8)
+
+    def test_batch_areas_and_perimeters(self):
+        polys = [
+            self.Polygon([(0,0), (2,0), (2,2), (0,2)]),
+            self.Polygon([(0,0), (0,4), (3,0)]),
+            self.Polygon.regular(6, 1),
+        ]
+        areas = self.Polygon.areas(polys)
+        assert isinstance(areas, array.array)
+        assert_equal(areas.typecode, 'd')
+        assert_equal(list(areas), [poly.area for poly in polys])
+        assert_equal(list(self.Polygon.signed_areas(polys)), 
+            [poly.signed_area for poly in polys])
+        assert_equal(list(self.Polygon.signed_areas(polys))[:2], [4, -6])
+        assert_equal(list(self.Polygon.perimeters(iter(polys))), 
+            [poly.perimeter for poly in polys])
+        assert_equal(list(self.Polygon.areas([])), [])
+
+    @raises(TypeError)
+    def test_batch_areas_wrong_type(self):
+        self.Polygon.areas([self.Polygon([(0,0), (0,4), (3,0)]), None])
+
+    def test_triangulate_triangle(self):
+        poly = self.Polygon([(0,0), (1,0), (0,1)])
+        assert_equal(list(poly.triangulate()), [0, 1, 2])
+
+    def test_triangulate_convex(self):
+        poly = self.Polygon.regular(6, 1)
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 12)
+        assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_concave(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 9)
+        assert_valid_triangulation(poly, triangles)
+        assert_equal(sorted(set(triangles)), [0, 1, 2, 3, 4])
+
+    def test_triangulate_clockwise(self):
+        poly = self.Polygon([(0,4), (2,1), (4,4), (4,0), (0,0)])
+        assert poly.signed_area < 0
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 9)
+        assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_star(self):
+        poly = self.Polygon.star(20, 1, 3)
+        assert_valid_triangulation(poly, poly.triangulate())
+        poly = self.Polygon.star(20, -1, -3)
+        assert_valid_triangulation(poly, poly.triangulate())
+
+    def test_triangulate_comb(self):
+        # Many split and merge vertices from teeth pointing both ways
+        verts = [(0, -1), (40, -1)]
+        for x in range(40, -1, -1):
+            verts.append((x, 5 if x % 2 == 0 else 1))
+        for teeth in (verts, [(y, x) for x, y in verts]):
+            poly = self.Polygon(teeth)
+            triangles = poly.triangulate()
+            assert_equal(len(triangles), (len(poly) - 2) * 3)
+            assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_collinear_verts(self):
+        poly = self.Polygon([(0,0), (1,0), (2,0), (2,2), (1,1), (0,2)])
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 12)
+        assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_duplicate_verts(self):
+        poly = self.Polygon([(0,0), (4,0), (4,0), (4,4), (2,1), (0,4), (0,0)],
+            is_simple=True)
+        triangles = poly.triangulate()
+        assert_equal(len(triangles), 9)
+        assert_valid_triangulation(poly, triangles)
+
+    def test_triangulate_random_star_shaped(self):
+        import random
+        rand = random.Random(42)
+        for i in range(100):
+            # One vertex per sector keeps the gaps under 180 degrees, 
+            # so the polygon is star-shaped around the origin
+            n = rand.randint(4, 50)
+            angles = [(j + rand.random()) * 360.0 / n for j in range(n)]
+            poly = self.Polygon([self.Vec2.polar(angle, rand.uniform(0.1, 1))
+                for angle in angles])
+            triangles = poly.triangulate()
+            assert_equal(len(triangles), (len(poly) - 2) * 3)
+            assert_valid_triangulation(poly, triangles)
+
+    @raises(ValueError)
+    def test_triangulate_non_simple(self):
+        self.Polygon([(0,0), (1,1), (1,0), (0,1)]).triangulate()
+
+    def test_triangulate_cached(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        triangles = poly.triangulate()
+        triangles[0] = 99
+        assert_equal(poly.triangulate()[0], poly.triangulate()[0])
+        assert 99 not in poly.triangulate()
+        poly[3] = (2, 8)
+        triangles = poly.triangulate()
+        assert_equal(list(triangles), [0, 1, 2, 0, 2, 3, 0, 3, 4])
+
+    def test_clip_convex(self):
+        square = self.Polygon([(0,0), (4,0), (4,4), (0,4)])
+        clipped = square.clip(self.Polygon([(2,2), (6,2), (2,6)]))
+        assert isinstance(clipped, self.Polygon)
+        assert_equal(len(clipped), 4)
+        assert_almost_equal(clipped.signed_area, 4)
+        assert_equal(sorted(tuple(p) for p in clipped), [(2,2), (2,4), (4,2), (4,4)])
+
+    def test_clip_concave(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        clipped = poly.clip(self.BoundingBox([(-1,2), (5,5)]))
+        # The two separate parts are joined along the clip boundary
+        assert_equal(len(clipped), 6)
+        assert_almost_equal(clipped.area, 8.0 / 3.0)
+        assert not clipped.is_simple
+
+    def test_clip_preserves_winding(self):
+        poly = self.Polygon([(0,4), (4,4), (4,0), (0,0)])
+        clipped = poly.clip(self.Polygon([(2,-1), (5,-1), (5,2), (2,2)]))
+        assert_almost_equal(clipped.signed_area, -4)
+        clipped = poly.clip(self.Polygon([(2,2), (5,2), (5,-1), (2,-1)]))
+        assert_almost_equal(clipped.signed_area, -4)
+
+    def test_clip_bounding_box(self):
+        poly = self.Polygon.regular(8, 2)
+        clipped = poly.clip(self.BoundingBox([(-1,-1), (1,1)]))
+        assert_equal(sorted(tuple(p) for p in clipped), [(-1,-1), (-1,1), (1,-1), (1,1)])
+        assert poly.clip(self.BoundingBox([(-5,-5), (5,5)])) == poly
+
+    def test_clip_outside(self):
+        poly = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        assert poly.clip(self.Polygon([(2,2), (3,2), (3,3)])) is None
+        assert poly.clip(self.BoundingBox([(1,0), (2,1)])) is None
+        assert poly.clip(self.BoundingBox([(0,0), (0,1)])) is None
+
+    @raises(ValueError)
+    def test_clip_non_convex(self):
+        poly = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        poly.clip(self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)]))
+
+    @raises(TypeError)
+    def test_clip_wrong_type(self):
+        self.Polygon([(0,0), (1,0), (1,1), (0,1)]).clip(None)
+
+    def test_intersection_convex(self):
+        square = self.Polygon([(0,0), (4,0), (4,4), (0,4)])
+        triangle = self.Polygon([(2,2), (6,2), (2,6)])
+        for a, b in ((square, triangle), (triangle, square)):
+            result = a.intersection(b)
+            assert result.is_convex_known
+            assert result.is_convex
+            assert_almost_equal(result.signed_area, 4)
+            assert_equal(sorted(tuple(p) for p in result), [(2,2), (2,4), (4,2), (4,4)])
+
+    def test_intersection_contained(self):
+        outer = self.Polygon.regular(6, 4)
+        inner = self.Polygon([(0,0), (1,0), (0,1)])
+        assert_equal(outer.intersection(inner), inner)
+        assert_equal(inner.intersection(outer), inner)
+        assert_equal(outer.intersection(outer), outer)
+
+    def test_intersection_shared_edge(self):
+        a = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        b = self.Polygon([(1,0), (3,0), (3,2), (1,2)])
+        assert_equal(sorted(tuple(p) for p in a.intersection(b)), 
+            [(1,0), (1,2), (2,0), (2,2)])
+        assert a.intersection(self.Polygon([(2,0), (3,0), (3,2), (2,2)])) is None
+
+    def test_intersection_disjoint(self):
+        a = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        assert a.intersection(self.Polygon([(2,2), (3,2), (3,3)])) is None
+        assert a.intersection(self.Polygon([(2,0), (3,0), (3,1)])) is None
+
+    def test_intersection_clockwise(self):
+        a = self.Polygon([(0,4), (4,4), (4,0), (0,0)])
+        result = a.intersection(self.Polygon([(2,2), (2,6), (6,2)]))
+        assert_almost_equal(result.signed_area, -4)
+
+    def test_intersection_concave(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        box = self.BoundingBox([(-1,2), (5,5)])
+        assert_equal(poly.intersection(box), poly.clip(box))
+
+    def test_intersection_matches_clip(self):
+        import random
+        rand = random.Random(42)
+        for i in range(100):
+            a = self.Polygon.convex_hull([self.Vec2(rand.random(), rand.random())
+                for j in range(rand.randint(3, 12))])
+            b = self.Polygon.convex_hull([self.Vec2(rand.random(), rand.random())
+                for j in range(rand.randint(3, 12))])
+            result = a.intersection(b)
+            clipped = a.clip(b)
+            if result is None:
+                assert clipped is None or clipped.area < 1e-9
+            else:
+                assert_almost_equal(result.area, clipped.area)
+                assert_almost_equal(result.area, b.intersection(a).area)
+
+    def test_union_overlapping(self):
+        a = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        b = self.Polygon([(1,1), (3,1), (3,3), (1,3)])
+        result = a.union(b)
+        assert_equal(len(result), 1)
+        assert_almost_equal(result[0].signed_area, 7)
+        assert_equal(sorted(tuple(p) for p in result[0]), 
+            [(0,0), (0,2), (1,2), (1,3), (2,0), (2,1), (3,1), (3,3)])
+
+    def test_union_shared_edge(self):
+        a = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        b = self.Polygon([(1,0), (2,0), (2,1), (1,1)])
+        result = a.union(b)
+        assert_equal(len(result), 1)
+        assert_equal(sorted(tuple(p) for p in result[0]), 
+            [(0,0), (0,1), (2,0), (2,1)])
+
+    def test_union_disjoint(self):
+        a = self.Polygon([(0,0), (1,0), (1,1), (0,1)])
+        b = self.Polygon([(3,1), (2,1), (2,0), (3,0)])
+        result = a.union(b)
+        assert_equal(len(result), 2)
+        for poly in result:
+            assert_almost_equal(poly.signed_area, 1)
+
+    def test_difference_overlapping(self):
+        a = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        b = self.Polygon([(1,1), (3,1), (3,3), (1,3)])
+        result = a.difference(b)
+        assert_equal(len(result), 1)
+        assert_almost_equal(result[0].signed_area, 3)
+        assert_equal(sorted(tuple(p) for p in result[0]), 
+            [(0,0), (0,2), (1,1), (1,2), (2,0), (2,1)])
+
+    def test_difference_hole(self):
+        outer = self.Polygon([(0,0), (4,0), (4,4), (0,4)])
+        inner = self.Polygon([(1,1), (2,1), (2,2), (1,2)])
+        result = outer.difference(inner)
+        assert_equal(len(result), 2)
+        areas = sorted(poly.signed_area for poly in result)
+        assert_almost_equal(areas[0], -1)
+        assert_almost_equal(areas[1], 16)
+        assert_equal(inner.difference(outer), [])
+
+    def test_difference_of_holes(self):
+        outer = self.Polygon([(0,0), (4,0), (4,4), (0,4)])
+        inner = self.Polygon([(1,1), (3,1), (3,3), (1,3)])
+        ring = outer.difference(inner)
+        result = self.Polygon([(2,0), (5,0), (5,4), (2,4)]).difference(ring)
+        assert_equal(len(result), 2)
+        assert_almost_equal(sum(poly.area for poly in result), 6)
+        assert_almost_equal(inner.union(ring)[0].area, 16)
+
+    def test_symmetric_difference(self):
+        a = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        b = self.Polygon([(1,1), (3,1), (3,3), (1,3)])
+        result = a.symmetric_difference(b)
+        assert_equal(len(result), 2)
+        for poly in result:
+            assert_almost_equal(poly.signed_area, 3)
+        assert_equal(a.symmetric_difference(a), [])
+
+    def test_boolean_clockwise_and_non_simple(self):
+        bowtie = self.Polygon([(0,0), (2,2), (2,0), (0,2)])
+        square = self.Polygon([(0,2), (2,2), (2,0), (0,0)])
+        result = square.difference(bowtie)
+        assert_equal(len(result), 2)
+        for poly in result:
+            assert_almost_equal(poly.signed_area, 1)
+        assert_almost_equal(bowtie.union(square)[0].signed_area, 4)
+
+    def test_boolean_preserves_type(self):
+        class SubPoly(self.Polygon):
+            pass
+        a = SubPoly([(0,0), (2,0), (2,2), (0,2)])
+        result = a.union(self.Polygon([(1,1), (3,1), (3,3), (1,3)]))
+        assert isinstance(result[0], SubPoly)
+
+    @raises(TypeError)
+    def test_boolean_wrong_type(self):
+        self.Polygon([(0,0), (1,0), (1,1), (0,1)]).union(None)
+
+    def test_boolean_random(self):
+        import random
+        rand = random.Random(23)
+        for i in range(50):
+            a = self.Polygon([self.Vec2(rand.random(), rand.random())
+                for j in range(rand.randint(3, 8))])
+            b = self.Polygon([self.Vec2(rand.random(), rand.random())
+                for j in range(rand.randint(3, 8))])
+            union = sum(p.signed_area for p in a.union(b))
+            diff_ab = sum(p.signed_area for p in a.difference(b))
+            diff_ba = sum(p.signed_area for p in b.difference(a))
+            xor = sum(p.signed_area for p in a.symmetric_difference(b))
+            assert_almost_equal(xor, diff_ab + diff_ba)
+            area_b = sum(p.signed_area for p in b.union(b))
+            assert_almost_equal(union, diff_ab + area_b)
+            for j in range(20):
+                pt = self.Vec2(rand.random(), rand.random())
+                in_a = a._pnp_winding_test(pt)
+                in_b = b._pnp_winding_test(pt)
+                winding = sum(1 if p.signed_area > 0 else -1 
+                    for p in a.union(b) if p._pnp_winding_test(pt))
+                assert_equal(winding > 0, in_a or in_b)
+
     def test_bounding_box(self):
         import planar
         poly = self.Polygon([(1, -2), (0, 0), (1, 0), (3, 0), (4, -2)])
@@ -458,6 +914,26 @@ class PolygonBaseTestCase(object):
         assert poly.contains_point((0, 0))
         assert not poly.contains_point((1,-1.5))
 
+    def test_contains_point_convex_extreme_vertex_ties(self):
+        # The leftmost vertex is also the highest, and the rightmost
+        # vertex the lowest
+        quad = [(0.0029,-0.99999), (-0.11196,-0.99371), (-0.52421,-0.85159),
+            (-0.93909,-0.34367)]
+        hexagon = [(0.00349,-0.99999), (-0.10453,-0.99452),
+            (-0.25882,-0.96593), (-0.5,-0.86603), (-0.76604,-0.64279),
+            (-0.93969,-0.34202)]
+        for verts in (quad, quad[::-1], hexagon, hexagon[::-1]):
+            poly = self.Polygon(verts)
+            assert poly.is_convex
+            assert poly.contains_point((-0.3, -0.9))
+            assert not poly.contains_point((-0.3, -0.7))
+            assert not poly.contains_point((-0.3, -0.99))
+            for i in range(13):
+                for j in range(9):
+                    pt = (i * 0.1 - 1.05, j * 0.1 - 1.05)
+                    assert_equal(poly._pnp_y_monotone_test(pt),
+                        poly._pnp_winding_test(pt), (verts, pt))
+
     def test_contains_point_regular(self):
         poly = self.Polygon.regular(8, 1.5, center=(1,1), angle=22.5)
         assert poly.is_centroid_known
@@ -665,6 +1141,144 @@ class PolygonBaseTestCase(object):
         assert_contains_point(polys, None, (5, 1.5))
         assert_contains_point(polys, None, (5, 1))
 
+    def assert_contains_points_consistent(self, poly):
+        points = [(x / 4.0, y / 4.0) 
+            for x in range(-12, 13) for y in range(-12, 13)]
+        expected = bytearray(poly.contains_point(p) for p in points)
+        result = poly.contains_points(points)
+        assert isinstance(result, bytearray)
+        assert_equal(result, expected)
+        assert_equal(poly.contains_points(
+            self.Seq2([self.Vec2(*p) for p in points])), expected)
+        assert_equal(poly.contains_points(
+            array.array('d', [c for p in points for c in p])), expected)
+
+    def test_contains_points_triangle(self):
+        self.assert_contains_points_consistent(
+            self.Polygon([(-1,-1), (2,0), (0,2)]))
+
+    def test_contains_points_convex(self):
+        poly = self.Polygon(
+            [(1,1), (0,2), (-0.9, 1.5), (-1,0.5), (-1,-1), (0.5,-1)])
+        self.assert_contains_points_consistent(poly)
+        assert poly.is_convex
+        self.assert_contains_points_consistent(poly)
+
+    def test_contains_points_regular(self):
+        self.assert_contains_points_consistent(
+            self.Polygon.regular(8, 1.5, center=(0.5,0.5), angle=22.5))
+        self.assert_contains_points_consistent(
+            self.Polygon.star(7, 1, 2.5))
+
+    def test_contains_points_concave(self):
+        self.assert_contains_points_consistent(self.Polygon(
+            [(0,0), (1,1), (2,0), (2,2), (1,1.5), (-1,2), (-0.5,-1)]))
+
+    def test_contains_points_non_simple(self):
+        self.assert_contains_points_consistent(self.Polygon(
+            [(-1,-1), (2,2), (2,-1), (-1,2)]))
+
+    def test_contains_points_non_simple_no_centroid(self):
+        poly = self.Polygon([(0,0), (4,4), (4,0), (0,4), (2,-1)])
+        assert poly.centroid is None
+        assert_equal(list(poly.contains_points([(3,1.5), (9,9)])), [1, 0])
+        assert poly.contains_point((3,1.5))
+        self.assert_contains_points_consistent(poly)
+
+    def test_contains_points_empty(self):
+        poly = self.Polygon([(-1,-1), (2,0), (0,2), (-1,1)])
+        assert_equal(poly.contains_points([]), bytearray())
+
+    @raises(TypeError)
+    def test_contains_points_bad_points(self):
+        self.Polygon([(-1,-1), (2,0), (0,2)]).contains_points([(1,2,3)])
+
+    def assert_prepared_consistent(self, poly):
+        points = [(x / 4.0, y / 4.0) 
+            for x in range(-12, 13) for y in range(-12, 13)]
+        unprepared = self.Polygon(poly)
+        expected = bytearray(unprepared.contains_point(p) for p in points)
+        poly.prepare()
+        assert_equal(bytearray(poly.contains_point(p) for p in points), 
+            expected)
+        assert_equal(poly.contains_points(points), expected)
+
+    def test_prepare_concave(self):
+        poly = self.Polygon([(-1,0), (-1,1), (2,1), (2,0), (1.5,-1), 
+            (1,0), (0.5,-1), (0,0), (-0.5,-1)])
+        self.assert_prepared_consistent(poly)
+        assert poly.contains_point((1, 0.5))
+        assert poly.contains_point((0.5, -0.6))
+        assert not poly.contains_point((0, -0.1))
+        assert not poly.contains_point((1.8, -0.8))
+        assert not poly.contains_point((100, 0))
+
+    def test_prepare_comb(self):
+        # Vertices aligned with the grid cell boundaries
+        verts = [(0,0), (3,0)]
+        for x in range(3, -3, -1):
+            verts.extend([(x, 3), (x - 0.5, 3), (x - 0.5, 1), (x - 1, 1)])
+        self.assert_prepared_consistent(self.Polygon(verts))
+
+    def test_prepare_non_simple(self):
+        poly = self.Polygon([(2,-2), (-2,-2), (-2,2), (0,2), (0,-1), 
+            (1,-1), (1,0), (-1,0), (-1,1), (2,1)])
+        self.assert_prepared_consistent(poly)
+        assert poly.contains_point((-0.5, 0.5)) # self-overlap
+        assert not poly.contains_point((0.5, -0.5)) # hole
+
+    def test_prepare_large(self):
+        self.assert_prepared_consistent(self.Polygon.star(200, 2, 2.8))
+
+    def test_prepare_convex(self):
+        self.assert_prepared_consistent(self.Polygon.regular(16, 2.5))
+
+    def test_prepare_with_mutation(self):
+        poly = self.Polygon([(-1,0), (-1,1), (2,1), (2,0), (1.5,-1), 
+            (1,0), (0.5,-1), (0,0), (-0.5,-1)])
+        poly.prepare()
+        assert not poly.contains_point((0.5, 1.5))
+        poly[2] = (2, 2)
+        assert poly.contains_point((0.5, 1.2))
+        self.assert_prepared_consistent(poly)
+
+    def test_prepare_with_transform(self):
+        poly = self.Polygon.star(20, 1, 2.5)
+        poly.prepare()
+        assert poly.contains_point((0.5, 0))
+        rotated = poly * self.Affine.rotation(45)
+        self.assert_prepared_consistent(rotated)
+        poly *= self.Affine.translation((1, 1))
+        self.assert_prepared_consistent(poly)
+
+    def test_threaded_properties(self):
+        import threading
+        verts = list(self.Polygon.star(1500, 1, 2))
+        points = [(x / 4.0, y / 4.0) 
+            for x in range(-12, 13) for y in range(-12, 13)]
+        def properties(poly):
+            return (poly.is_convex, poly.is_simple, poly.centroid, 
+                poly.bounding_box, poly.contains_points(points),
+                list(self.Polygon.convex_hull(poly)))
+        expected = properties(self.Polygon(verts))
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(properties(self.Polygon(verts))))
+            for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert_equal(results, [expected] * 4)
+
+    def test_prepare_copy(self):
+        import copy
+        poly = self.Polygon.star(20, 1, 2.5)
+        poly.prepare()
+        assert poly.contains_point((0.5, 0))
+        self.assert_prepared_consistent(copy.copy(poly))
+        self.assert_prepared_consistent(copy.deepcopy(poly))
+
     def test_tangents_to_point_convex(self):
         poly = self.Polygon.regular(30, 2)
         assert_equal(poly.tangents_to_point((0,10)), 
@@ -879,6 +1493,68 @@ class PolygonBaseTestCase(object):
         assert c[0] != p[0]
         assert c.bounding_box is not bbox
 
+    def test_pickle(self):
+        import pickle
+        p = self.Polygon([(0,0), (2,0), (2,2), (0,2)])
+        assert p.is_convex
+        centroid = p.centroid
+        area = p.area
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            c = pickle.loads(pickle.dumps(p, protocol))
+            assert isinstance(c, self.Polygon)
+            assert_equal(tuple(c), tuple(p))
+            assert c.is_convex_known
+            assert c.is_convex
+            assert c.is_simple_known
+            assert c.is_simple
+            assert c.is_centroid_known
+            assert_equal(c.centroid, centroid)
+            assert_equal(c.area, area)
+            for pt in [(1.5, 1), (0.5, 0.5), (3, 1)]:
+                assert_equal(c.contains_point(pt), p.contains_point(pt))
+
+    def test_pickle_not_simple(self):
+        import pickle
+        p = self.Polygon([(0,0), (1,1), (1,0), (0,1)])
+        assert not p.is_simple
+        c = pickle.loads(pickle.dumps(p, 2))
+        assert_equal(tuple(c), tuple(p))
+        assert c.is_convex_known
+        assert not c.is_convex
+        assert c.is_simple_known
+        assert not c.is_simple
+        assert not c.is_centroid_known
+        assert p.centroid is None
+        c = pickle.loads(pickle.dumps(p, 2))
+        assert c.is_centroid_known
+        assert c.centroid is None
+        c = pickle.loads(pickle.dumps(self.Polygon(p), 2))
+        assert not c.is_convex_known
+        assert not c.is_simple_known
+        assert not c.is_centroid_known
+
+    def test_pickle_known_centroid(self):
+        import pickle
+        p = self.Polygon.regular(5, 2, center=(1, 3))
+        assert p.is_centroid_known
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            c = pickle.loads(pickle.dumps(p, protocol))
+            assert c.is_centroid_known
+            assert_equal(c.centroid, (1, 3))
+
+    def test_pickle_out_of_band(self):
+        import pickle
+        if pickle.HIGHEST_PROTOCOL < 5:
+            return
+        p = self.Polygon.regular(100, 10)
+        buffers = []
+        data = pickle.dumps(p, 5, buffer_callback=buffers.append)
+        assert_equal(len(buffers), 1)
+        assert_equal(len(buffers[0].raw()), 1600)
+        c = pickle.loads(data, buffers=buffers)
+        assert_equal(tuple(c), tuple(p))
+        assert c.is_convex
+
     def test_imul_by_transform(self):
         b = a = self.Polygon([(1,2), (3,4), (5,6)])
         a *= self.Affine.translation((5, -4))
@@ -903,6 +1579,100 @@ class PolygonBaseTestCase(object):
     def test_mul_incompatible(self):
         a = self.Polygon([(1,2), (3,4), (5,6)]) * 2
 
+    def test_transform_keeps_classification(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        assert not poly.is_convex
+        assert poly.is_simple
+        t = self.Affine.rotation(30) * self.Affine.shear(10, 0)
+        for result in (poly * t, t * poly):
+            assert result.is_convex_known
+            assert not result.is_convex
+            assert result.is_simple_known
+            assert result.is_simple
+        poly *= self.Affine.scale((2, -1))
+        assert poly.is_convex_known
+        assert not poly.is_convex
+        assert poly.is_simple_known
+        assert not poly.contains_point((4, -3))
+        assert poly.contains_point((4, -0.5))
+
+    def test_transform_convex_contains_point(self):
+        poly = self.Polygon.regular(12, 2)
+        assert poly.is_convex
+        t = (self.Affine.translation((3, 1)) * self.Affine.rotation(10)
+            * self.Affine.scale((1, 0.5)))
+        result = poly * t
+        assert result.is_convex_known
+        assert result.is_convex
+        fresh = self.Polygon(list(result))
+        for point in [(3, 1), (4.5, 1.2), (1.2, 1), (3, 2.5), (10, 10)]:
+            assert_equal(result.contains_point(point), 
+                fresh.contains_point(point))
+
+    def test_transform_maps_centroid_and_area(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        centroid = poly.centroid
+        area = poly.signed_area
+        t = self.Affine.translation((1, 2)) * self.Affine.shear(20, 5) \
+            * self.Affine.scale((-2, 1))
+        result = poly * t
+        assert result.is_centroid_known
+        fresh = self.Polygon(list(result))
+        assert result.centroid.almost_equals(fresh.centroid)
+        assert result.centroid.almost_equals(t * centroid)
+        assert_almost_equal(result.signed_area, area * t.determinant)
+        assert_almost_equal(result.signed_area, fresh.signed_area)
+
+    def test_transform_not_simple_centroid(self):
+        poly = self.Polygon([(0,0), (1,1), (1,0), (0,1)])
+        assert poly.centroid is None
+        result = poly * self.Affine.rotation(45)
+        assert result.is_centroid_known
+        assert result.centroid is None
+
+    def test_transform_rectilinear_bounding_box(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (-1,4)])
+        poly.bounding_box
+        for t in (self.Affine.scale((2, -3)), self.Affine.rotation(90),
+            self.Affine.translation((-2, 3)) * self.Affine.rotation(270)):
+            result = poly * t
+            bbox = self.BoundingBox(list(result))
+            assert_equal(result.bounding_box.min_point, bbox.min_point)
+            assert_equal(result.bounding_box.max_point, bbox.max_point)
+        result = poly * self.Affine.rotation(30)
+        bbox = self.BoundingBox(list(result))
+        assert_equal(result.bounding_box.min_point, bbox.min_point)
+        assert_equal(result.bounding_box.max_point, bbox.max_point)
+
+    def test_transform_perimeter(self):
+        poly = self.Polygon.regular(7, 3)
+        perimeter = poly.perimeter
+        t = self.Affine.rotation(33) * self.Affine.scale(2)
+        assert_almost_equal((poly * t).perimeter, perimeter * 2)
+        t = self.Affine.scale((2, 1))
+        fresh = self.Polygon(list(poly * t))
+        assert_almost_equal((poly * t).perimeter, fresh.perimeter)
+
+    def test_transform_keeps_triangulation(self):
+        poly = self.Polygon([(0,0), (4,0), (4,4), (2,1), (0,4)])
+        triangles = poly.triangulate()
+        for t in (self.Affine.rotation(40), self.Affine.scale((-1, 2))):
+            result = poly * t
+            assert_equal(result.triangulate(), triangles)
+            for i in range(0, len(triangles), 3):
+                a, b, c = [result[j] for j in triangles[i:i + 3]]
+                assert_equal((b - a).cross(c - a) > 0, 
+                    result.signed_area > 0)
+
+    def test_degenerate_transform_clears_properties(self):
+        poly = self.Polygon.regular(6, 1)
+        poly.centroid
+        poly.bounding_box
+        result = poly * self.Affine.scale((1, 0))
+        assert not result.is_convex_known
+        assert not result.is_centroid_known
+        assert_equal(result.area, 0)
+
 
 class PyPolygonTestCase(PolygonBaseTestCase, unittest.TestCase):
     from planar.vector import Vec2, Seq2
@@ -915,6 +1685,111 @@ class CPolygonTestCase(PolygonBaseTestCase, unittest.TestCase):
     from planar.c import Vec2, Seq2, Affine, BoundingBox
     from planar.c import Polygon
 
+    def test_threaded_mutation(self):
+        # Properties computed with the GIL released while another
+        # thread mutates the polygon must not be cached
+        import threading
+        poly = self.Polygon.regular(4096, 10)
+        first = poly[0]
+        done = []
+        def mutate():
+            try:
+                for i in range(50):
+                    p = poly
+                    p[0] = (0, 0)
+                    p[0] = first
+                    p *= self.Affine.rotation(1)
+                    assert p is poly
+                poly[0] = (0, 0)
+            finally:
+                done.append(True)
+        def read():
+            while not done:
+                poly.is_convex
+                poly.is_simple
+                poly.centroid
+                poly.bounding_box
+                poly.contains_points([(0, 0), (5, 5), (20, 0)])
+        threads = [threading.Thread(target=mutate)] + [
+            threading.Thread(target=read) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = self.Polygon(poly)
+        assert not expected.is_convex
+        assert_equal(poly.is_convex, expected.is_convex)
+        assert_equal(poly.is_simple, expected.is_simple)
+        assert poly.centroid.almost_equals(expected.centroid)
+        assert_equal(poly.bounding_box, expected.bounding_box)
+        points = [(x / 2.0, y / 2.0) 
+            for x in range(-24, 25) for y in range(-24, 25)]
+        assert_equal(poly.contains_points(points), 
+            expected.contains_points(points))
+
+    def test_subinterpreters(self):
+        # Isolated sub-interpreters with their own GIL each get their
+        # own module state and types, available from Python 3.12
+        if sys.version_info < (3, 12):
+            raise unittest.SkipTest("module state shared by interpreters")
+        try:
+            import _interpreters as interpreters
+            create = lambda: interpreters.create('isolated')
+        except ImportError:
+            import _xxsubinterpreters as interpreters
+            create = lambda: interpreters.create(isolated=True)
+        import threading
+        verts = [tuple(v) for v in self.Polygon.star(500, 1, 2)]
+        expected = [tuple(v) for v in self.Polygon.convex_hull(verts)]
+        code = "\n".join([
+            "import sys",
+            "sys.path[:0] = %r" % sys.path,
+            "import planar.c",
+            "from planar.c import Polygon",
+            "planar.c._set_epsilon(0.01)",
+            "for i in range(20):",
+            "    hull = Polygon.convex_hull(%r)" % verts,
+            "    assert type(hull) is Polygon",
+            "    assert [tuple(v) for v in hull] == %r" % expected,
+        ])
+        errors = []
+        def run(interp):
+            try:
+                errors.append(interpreters.run_string(interp, code))
+            except Exception as err:
+                errors.append(err)
+        interps = [create() for i in range(4)]
+        try:
+            threads = [threading.Thread(target=run, args=(interp,))
+                for interp in interps]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            for interp in interps:
+                interpreters.destroy(interp)
+        assert_equal(errors, [None] * 4)
+        # Settings of the sub-interpreters do not leak into this one
+        from planar.c import Vec2
+        assert not Vec2(0, 0).almost_equals((0.001, 0))
+
+    def test_buffer(self):
+        poly = self.Polygon([(0,0), (1,0), (1,2), (0,1)])
+        view = memoryview(poly)
+        assert_equal(view.format, 'd')
+        assert_equal(view.shape, (4, 2))
+        assert_equal(view.strides, (16, 8))
+        assert view.readonly
+        assert_equal(array.array('d', view.tobytes()).tolist(), 
+            [0, 0, 1, 0, 1, 2, 0, 1])
+        poly[2] = (3, 4)
+        assert_equal(array.array('d', view.tobytes())[4:6].tolist(), [3, 4])
+        if sys.version_info >= (3,):
+            # Python 2 memoryviews cannot index multi-dimensional buffers
+            assert_equal(view.tolist(), [[0, 0], [1, 0], [3, 4], [0, 1]])
+            assert_equal(view[2, 0], 3)
+
 
 class PyPolygonWhiteBoxTestCase(unittest.TestCase):
     from planar.vector import Vec2, Seq2
@@ -940,6 +1815,89 @@ class PyPolygonWhiteBoxTestCase(unittest.TestCase):
             [(0,2), (3,2)]))
 
 
+if numpy is not None:
+    class NpPolygonTestCase(PolygonBaseTestCase, unittest.TestCase):
+        from planar.np import Vec2, Seq2, Affine, BoundingBox
+        from planar.np import Polygon
+
+        def random_polygon(self, count, convex=False):
+            rand = numpy.random.RandomState(count)
+            angles = numpy.sort(rand.uniform(0, 2 * math.pi, count))
+            radii = 1.0 if convex else rand.uniform(0.2, 1.0, count)
+            return self.Polygon(numpy.column_stack(
+                (radii * numpy.cos(angles), radii * numpy.sin(angles))))
+
+        def test_is_Seq2_subclass(self):
+            # planar.Seq2 is the NumPy Seq2 only without the C extension
+            assert issubclass(self.Polygon, self.Seq2)
+            poly = self.Polygon([(-1,0), (-1,1), (0,0), (0, -1)])
+            assert isinstance(poly, self.Seq2)
+
+        def test_classify_matches_python(self):
+            from planar.polygon import Polygon as PyPolygon
+            polys = [self.random_polygon(n, convex) 
+                for n in (5, 100, 1000) for convex in (True, False)]
+            polys.append(self.Polygon([(0,0), (1,0), (1,0), (1,1), (0,1)]))
+            polys.append(self.Polygon([(0,0), (1,0), (2,0), (3,0)]))
+            polys.append(self.Polygon([(0,0), (1,1), (1,0), (0,1)]))
+            for poly in polys:
+                py_poly = PyPolygon(list(poly))
+                assert_equal(poly.is_convex, py_poly.is_convex)
+                for name in ('_winding', '_degenerate', '_dupe_verts', 
+                    '_y_polylines'):
+                    assert_equal(getattr(poly, name, None), 
+                        getattr(py_poly, name, None), name)
+
+        def brute_force_contains(self, poly, points):
+            """Return the points not on the polygon boundary, and whether
+            each is inside by a brute force winding number
+            """
+            v1 = numpy.array(list(poly), dtype=float)
+            v0 = numpy.roll(v1, 1, axis=0)
+            ex, ey = (v1 - v0).T
+            px = points[:, :1]
+            py = points[:, 1:]
+            side = ex * (py - v0[:, 1]) - (px - v0[:, 0]) * ey
+            up = (v0[:, 1] <= py) & (py < v1[:, 1]) & (side > 0)
+            down = (v1[:, 1] <= py) & (py < v0[:, 1]) & (side < 0)
+            winding = up.sum(axis=1) - down.sum(axis=1)
+            t = ((px - v0[:, 0]) * ex + (py - v0[:, 1]) * ey) / (ex**2 + ey**2)
+            t = t.clip(0, 1)
+            d2 = (v0[:, 0] + t * ex - px)**2 + (v0[:, 1] + t * ey - py)**2
+            off_edge = d2.min(axis=1) > 1e-12
+            return points[off_edge], (winding[off_edge] != 0).tolist()
+
+        def test_contains_points_matches_winding_number(self):
+            points = numpy.random.RandomState(1).uniform(-1.2, 1.2, (500, 2))
+            polys = [self.random_polygon(n, convex) 
+                for n in (4, 6, 20, 200) for convex in (True, False)]
+            polys.append(self.Polygon([(0.0029,-0.99999), (-0.11196,-0.99371),
+                (-0.52421,-0.85159), (-0.93909,-0.34367)]))
+            polys.append(self.Polygon([(0.00349,-0.99999), 
+                (-0.10453,-0.99452), (-0.25882,-0.96593), (-0.5,-0.86603),
+                (-0.76604,-0.64279), (-0.93969,-0.34202)]))
+            for poly in polys:
+                pts, expected = self.brute_force_contains(poly, points)
+                poly.is_convex
+                assert_equal(list(map(bool, poly.contains_points(pts))), 
+                    expected)
+                assert_equal([poly.contains_point(p) for p in pts.tolist()],
+                    expected)
+                poly.prepare()
+                assert_equal(list(map(bool, poly.contains_points(pts))), 
+                    expected)
+
+        def test_convex_hull_many_points(self):
+            from planar.polygon import _adaptive_quick_hull
+            rand = numpy.random.RandomState(2)
+            for points in (rand.uniform(-1, 1, (5000, 2)), 
+                self.random_polygon(2000, convex=True)):
+                hull = self.Polygon.convex_hull(points)
+                assert hull.is_convex
+                expected = _adaptive_quick_hull(
+                    [self.Vec2(*p) for p in numpy.asarray(points).tolist()])
+                assert_equal(sorted(hull), sorted(expected))
+
 if __name__ == '__main__':
     unittest.main()
 
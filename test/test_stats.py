@@ -0,0 +1,227 @@
+"""Runtime statistics unit tests"""
+
+from __future__ import division
+import unittest
+from nose.tools import assert_equal, assert_almost_equal
+import planar.stats
+
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
+
+class StatsBaseTestCase(object):
+
+    def setUp(self):
+        planar.stats.reset()
+        planar.stats.enable()
+
+    def tearDown(self):
+        planar.stats.disable()
+        planar.stats.reset()
+
+    def star(self):
+        """Return a non-convex polygon without cached properties"""
+        return self.Polygon(list(self.Polygon.star(5, 1, 2)))
+
+    def assert_stats(self, **expected):
+        stats = planar.stats.snapshot()
+        for name, value in expected.items():
+            assert_equal(stats[name.replace('__', '.')], value, name)
+
+    def test_disabled(self):
+        planar.stats.disable()
+        assert not planar.stats.is_enabled()
+        poly = self.star()
+        poly.is_simple
+        poly.contains_point(self.Vec2(0, 0))
+        poly[0] = (0, 3)
+        self.Polygon.convex_hull(poly)
+        for name, value in planar.stats.snapshot().items():
+            assert_equal(value, 0, name)
+
+    def test_enable(self):
+        assert planar.stats.is_enabled()
+        planar.stats.disable()
+        assert not planar.stats.is_enabled()
+
+    def test_snapshot_names(self):
+        assert_equal(set(planar.stats.snapshot()), set(planar.stats.names))
+
+    def test_reset(self):
+        self.star().is_convex
+        self.assert_stats(cache__is_convex__misses=1)
+        planar.stats.reset()
+        self.assert_stats(cache__is_convex__misses=0, classify__calls=0,
+            classify__time=0)
+        assert planar.stats.is_enabled()
+
+    def test_pip_radius(self):
+        poly = self.Polygon.regular(8, 1)
+        assert poly.contains_point(self.Vec2(0.1, 0.1))
+        assert not poly.contains_point(self.Vec2(5, 1))
+        assert not poly.contains_point(self.Vec2(1, 5))
+        self.assert_stats(pip__radius_inside=1, pip__radius_outside=2)
+
+    def test_pip_y_monotone(self):
+        poly = self.Polygon.regular(8, 1)
+        poly.is_convex
+        # Between the inner and outer radius
+        assert poly.contains_point(self.Vec2(0.95, 0.05))
+        assert not poly.contains_point(self.Vec2(0.9, 0.3))
+        self.assert_stats(pip__y_monotone=2, pip__winding=0)
+
+    def test_pip_bbox_reject_and_winding(self):
+        poly = self.star()
+        assert poly.contains_point(self.Vec2(0, 0))
+        assert not poly.contains_point(self.Vec2(0.5, 1.8))
+        assert not poly.contains_point(self.Vec2(5, 0))
+        self.assert_stats(pip__winding=2, pip__bbox_reject=1, pip__grid=0)
+
+    def test_pip_grid(self):
+        poly = self.star()
+        poly.prepare()
+        assert poly.contains_point(self.Vec2(0, 0))
+        assert not poly.contains_point(self.Vec2(0.5, 1.8))
+        self.assert_stats(pip__grid=2, pip__winding=0,
+            cache__grid__misses=1, cache__grid__hits=1)
+
+    def test_contains_points(self):
+        poly = self.star()
+        assert_equal(list(poly.contains_points(
+            [(0, 0), (0.5, 1.8), (5, 0), (0.1, 0)])), [1, 0, 0, 1])
+        self.assert_stats(pip__winding=3, pip__bbox_reject=1)
+        planar.stats.reset()
+        poly = self.Polygon.regular(8, 1)
+        poly.contains_points([(0.1, 0.1), (5, 1), (0.95, 0.05)])
+        self.assert_stats(pip__radius_inside=1, pip__radius_outside=1,
+            pip__y_monotone=1)
+
+    def test_pip_cache_lookups(self):
+        hexagon = self.Polygon(
+            [(0, 0), (2, -1), (4, 0), (5, 2), (2, 4), (-1, 2)])
+        star = self.star()
+        for poly in (hexagon, star):
+            assert poly.contains_point(self.Vec2(1, 1))
+            assert not poly.contains_point(self.Vec2(9, 9))
+            assert_equal(list(poly.contains_points([(1, 1), (9, 9)])),
+                [1, 0])
+        self.assert_stats(pip__y_monotone=4, pip__winding=2,
+            pip__bbox_reject=2,
+            cache__is_convex__misses=2, cache__is_convex__hits=4,
+            cache__bounding_box__misses=1, cache__bounding_box__hits=2)
+        stats = planar.stats.snapshot()
+        # The polylines may be split by the convexity test, or by the
+        # first point containment test
+        assert_equal(stats['cache.y_polylines.hits']
+            + stats['cache.y_polylines.misses'], 3)
+
+    def test_cache_hits_and_misses(self):
+        poly = self.star()
+        assert not poly.is_convex
+        assert not poly.is_convex
+        assert poly.is_simple
+        poly.centroid
+        poly.centroid
+        poly.perimeter
+        poly.perimeter
+        poly.bounding_box
+        poly.bounding_box
+        poly.triangulate()
+        poly.triangulate()
+        stats = planar.stats.snapshot()
+        # Also counts uses by other operations
+        assert stats['cache.is_convex.hits'] >= 1
+        self.assert_stats(cache__is_convex__misses=1,
+            cache__is_simple__misses=1,
+            cache__centroid__misses=1, cache__centroid__hits=1,
+            cache__perimeter__misses=1, cache__perimeter__hits=1,
+            cache__bounding_box__misses=1, cache__bounding_box__hits=1,
+            cache__triangles__misses=1, cache__triangles__hits=1)
+
+    def test_cache_hit_rates(self):
+        poly = self.star()
+        for i in range(4):
+            poly.perimeter
+        rates = planar.stats.cache_hit_rates()
+        assert_equal(set(rates), set(planar.stats.cached_properties))
+        assert_almost_equal(rates['perimeter'], 0.75)
+        assert_equal(rates['grid'], None)
+        stats = planar.stats.snapshot()
+        poly.perimeter
+        assert_almost_equal(
+            planar.stats.cache_hit_rates(stats)['perimeter'], 0.75)
+
+    def test_invalidations_on_mutation(self):
+        poly = self.star()
+        poly.is_simple
+        poly.bounding_box
+        poly.perimeter
+        poly[0] = (0, 3)
+        self.assert_stats(
+            cache__is_convex__invalidations=1,
+            cache__is_simple__invalidations=1,
+            cache__bounding_box__invalidations=1,
+            cache__perimeter__invalidations=1,
+            cache__centroid__invalidations=0)
+        poly[0] = (0, 4)
+        self.assert_stats(cache__is_convex__invalidations=1)
+
+    def test_invalidations_on_transform(self):
+        poly = self.star()
+        poly.is_simple
+        poly.perimeter
+        poly.bounding_box
+        poly *= self.Affine.rotation(30) * self.Affine.scale((2, 1))
+        self.assert_stats(
+            cache__is_convex__invalidations=0,
+            cache__is_simple__invalidations=0,
+            cache__bounding_box__invalidations=1,
+            cache__perimeter__invalidations=1)
+
+    def test_timed_operations(self):
+        poly = self.star()
+        poly.is_simple
+        self.Polygon.convex_hull(poly)
+        self.Polygon.convex_hull([self.Vec2(0, 0), self.Vec2(1, 0), 
+            self.Vec2(1, 1), self.Vec2(0.5, 0.5)])
+        stats = planar.stats.snapshot()
+        assert_equal(stats['classify.calls'], 1)
+        assert_equal(stats['check_is_simple.calls'], 1)
+        assert_equal(stats['convex_hull.calls'], 2)
+        for name in ('classify', 'check_is_simple', 'convex_hull'):
+            assert stats[name + '.time'] > 0, name
+
+
+class PyStatsTestCase(StatsBaseTestCase, unittest.TestCase):
+    from planar.vector import Vec2
+    from planar.transform import Affine
+    from planar.polygon import Polygon
+
+    def test_pip_triangle(self):
+        poly = self.Polygon([(0, 0), (1, 0), (0, 1)])
+        assert poly.contains_point(self.Vec2(0.2, 0.2))
+        assert not poly.contains_point(self.Vec2(1, 1))
+        self.assert_stats(pip__triangle=2)
+
+
+class CStatsTestCase(StatsBaseTestCase, unittest.TestCase):
+    from planar.c import Vec2, Affine, Polygon
+
+
+if numpy is not None:
+    class NpStatsTestCase(StatsBaseTestCase, unittest.TestCase):
+        from planar.np import Vec2, Affine, Polygon
+
+        def test_pip_triangle(self):
+            poly = self.Polygon([(0, 0), (1, 0), (0, 1)])
+            assert_equal(list(poly.contains_points([(0.2, 0.2), (1, 1)])), 
+                [1, 0])
+            self.assert_stats(pip__triangle=2)
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+# vim: ai ts=4 sts=4 et sw=4 tw=78
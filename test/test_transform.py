@@ -3,9 +3,15 @@
 from __future__ import division
 import sys
 import math
+import array
 import unittest
 from nose.tools import assert_equal, assert_almost_equal, raises
 
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
 
 def seq_almost_equal(t1, t2, error=0.00001):
     assert len(t1) == len(t2), "%r != %r" % (t1, t2)
@@ -152,6 +158,18 @@ class AffineBaseTestCase(object):
     def test_rotation_contructor_wrong_arg_types(self):
         self.Affine.rotation(1,1)
 
+    def test_rotation_constructor_keywords(self):
+        assert_equal(tuple(self.Affine.rotation(angle=27, pivot=(2,-4))),
+            tuple(self.Affine.rotation(27, (2,-4))))
+
+    @raises(TypeError)
+    def test_rotation_constructor_bad_keyword(self):
+        self.Affine.rotation(27, anchor=(2,-4))
+
+    @raises(TypeError)
+    def test_rotation_constructor_duplicate_arg(self):
+        self.Affine.rotation(27, angle=27)
+
     def test_determinant(self):
         assert_equal(self.Affine.identity().determinant, 1)
         assert_equal(self.Affine.scale(2).determinant, 4)
@@ -283,6 +301,74 @@ class AffineBaseTestCase(object):
         assert r is None, r
         assert_equal(pts, [V(-8, -2), V(2,0), V(-6,-4)])
 
+    def test_transform_new_array(self):
+        import planar
+        V = self.Vec2
+        pts = [V(4,1), V(-1,0), V(3,2)]
+        r = self.Affine.scale(-2).transform(pts)
+        assert isinstance(r, planar.Vec2Array), r
+        assert_equal(tuple(r), (V(-8, -2), V(2,0), V(-6,-4)))
+        # original sequence is unchanged
+        assert_equal(pts, [V(4,1), V(-1,0), V(3,2)])
+        assert_equal(tuple(self.Affine.identity().transform([])), ())
+
+    def test_transform_from_buffer(self):
+        t = self.Affine.translation((1, -1)) * self.Affine.rotation(90)
+        r = t.transform(array.array('d', [1, 0, 0, 2]))
+        assert r[0].almost_equals((1, 0)), r[0]
+        assert r[1].almost_equals((-1, -1)), r[1]
+        if sys.version_info >= (3,):
+            src = memoryview(array.array('d', [1, 0, 0, 2])).cast('B').cast(
+                'd', (2, 2))
+            assert r.almost_equals(t.transform(src))
+
+    def test_transform_out(self):
+        import planar
+        V = self.Vec2
+        src = planar.Vec2Array([(1,2), (3,4)])
+        out = planar.Vec2Array([(0,0), (0,0)])
+        r = self.Affine.scale(2).transform(src, out)
+        assert r is out
+        assert_equal(tuple(out), (V(2,4), V(6,8)))
+        assert_equal(tuple(src), (V(1,2), V(3,4)))
+        out = [None, None]
+        r = self.Affine.translation((1,1)).transform(src, out=out)
+        assert r is out
+        assert_equal(out, [V(2,3), V(4,5)])
+
+    def test_transform_out_buffer(self):
+        V = self.Vec2
+        out = array.array('d', [0] * 6)
+        r = self.Affine.scale((2, 3)).transform([(1,2), (3,4), (5,6)], out)
+        assert r is out
+        assert_equal(list(out), [2, 6, 6, 12, 10, 18])
+        if sys.version_info >= (3,):
+            out2d = memoryview(array.array('d', [0] * 6)).cast('B').cast(
+                'd', (3, 2))
+            self.Affine.scale((2, 3)).transform([(1,2), (3,4), (5,6)], out2d)
+            assert_equal(out2d.tolist(), [[2, 6], [6, 12], [10, 18]])
+
+    def test_transform_in_place(self):
+        import planar
+        V = self.Vec2
+        pts = planar.Vec2Array([(1,2), (3,4)])
+        self.Affine.translation((-1,1)).transform(pts, pts)
+        assert_equal(tuple(pts), (V(0,3), V(2,5)))
+
+    @raises(ValueError)
+    def test_transform_out_wrong_length(self):
+        import planar
+        self.Affine.scale(2).transform([(1,2), (3,4)], 
+            planar.Vec2Array([(0,0)]))
+
+    @raises(BufferError)
+    def test_transform_out_read_only(self):
+        self.Affine.scale(2).transform([(1,2)], bytes(16))
+
+    @raises(TypeError)
+    def test_transform_wrong_type(self):
+        self.Affine.scale(2).transform([(1,2,3)])
+
     @raises(TypeError)
     def test_mul_wrong_type(self):
         self.Affine(1,2,3,4,5,6) * None
@@ -333,6 +419,14 @@ class AffineBaseTestCase(object):
         t = self.Affine.scale(0)
         self.assertRaises(TransformNotInvertibleError, lambda: ~t)
 
+    def test_pickle(self):
+        import pickle
+        t = self.Affine.rotation(33) * self.Affine.translation((0.1, -5))
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            p = pickle.loads(pickle.dumps(t, protocol))
+            assert isinstance(p, self.Affine)
+            assert_equal(tuple(p), tuple(t))
+
 
 class PyAffineTestCase(AffineBaseTestCase, unittest.TestCase):
     from planar.transform import Affine
@@ -358,6 +452,43 @@ class PyAffineTestCase(AffineBaseTestCase, unittest.TestCase):
 class CAffineTestCase(AffineBaseTestCase, unittest.TestCase):
     from planar.c import Affine, Vec2
 
+    def test_transform_large_array(self):
+        from planar.c import Vec2Array
+        size = 1000003
+        src = Vec2Array.from_buffer(array.array('d', range(size * 2)))
+        t = self.Affine(2, 0, 1, 0, -1, 3)
+        out = t.transform(src)
+        assert_equal(len(out), size)
+        for i in (0, 1, 250000, 500001, size // 2, size - 2, size - 1):
+            assert_equal(out[i], t * src[i])
+        t.transform(src, src)
+        assert_equal(src, out)
+
+
+if numpy is not None:
+    class NpAffineTestCase(AffineBaseTestCase, unittest.TestCase):
+        from planar.np import Affine, Vec2
+
+        def test_mul_vec2array(self):
+            from planar.np import Vec2Array
+            va = Vec2Array([(1, 0), (0, 2), (-3, 1)])
+            t = self.Affine.rotation(90) * self.Affine.translation((1, 1))
+            assert isinstance(t, self.Affine)
+            tva = t * va
+            assert isinstance(tva, Vec2Array)
+            assert_equal(tuple(tva), tuple(t * v for v in va))
+            va *= t
+            assert_equal(va, tva)
+
+        def test_transform_ndarray(self):
+            src = numpy.arange(8, dtype=float).reshape(4, 2)
+            t = self.Affine(2, 0, 1, 0, -1, 3)
+            out = numpy.zeros(8)
+            assert t.transform(src, out) is out
+            assert_equal(out.tolist(), 
+                [1, 2, 5, 0, 9, -2, 13, -4])
+            t.transform(src, src)
+            assert_equal(src.tolist(), [[1, 2], [5, 0], [9, -2], [13, -4]])
 
 if __name__ == '__main__':
     unittest.main()
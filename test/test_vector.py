@@ -3,9 +3,17 @@
 from __future__ import division
 import sys
 import math
+import array
+import os
+import tempfile
 import unittest
 from nose.tools import assert_equal, assert_almost_equal, raises
 
+try:
+    import numpy
+except ImportError: # pragma: no cover
+    numpy = None
+
 
 class Vec2BaseTestCase(object):
 
@@ -63,6 +71,22 @@ class Vec2BaseTestCase(object):
     def test_polar_bad_length(self):
         self.Vec2.polar(0, 'yikes')
 
+    @raises(TypeError)
+    def test_polar_bad_keyword(self):
+        self.Vec2.polar(0, radius=2)
+
+    @raises(TypeError)
+    def test_polar_duplicate_arg(self):
+        self.Vec2.polar(0, angle=2)
+
+    @raises(TypeError)
+    def test_polar_missing_angle(self):
+        self.Vec2.polar(length=2)
+
+    @raises(TypeError)
+    def test_polar_too_many_args(self):
+        self.Vec2.polar(0, 1, 2)
+
     def test_members_are_floats(self):
         x, y = self.Vec2(1, 5)
         assert isinstance(x, float)
@@ -214,6 +238,12 @@ class Vec2BaseTestCase(object):
         assert_equal(v.clamped(40, 60), v)
         assert_equal(v.clamped(50, 50), v)
         assert_equal(self.Vec2(0,0).clamped(min_length=20), self.Vec2(0,0))
+        assert_equal(v.clamped(40, max_length=60), v)
+        assert_equal(v.clamped(max_length=5, min_length=1), self.Vec2(3, 4))
+
+    @raises(TypeError)
+    def test_clamped_bad_keyword(self):
+        self.Vec2(3, 4).clamped(max=5)
 
     def test_lerp(self):
         v1 = self.Vec2(1, 1)
@@ -305,6 +335,15 @@ class Vec2BaseTestCase(object):
     def test_sub_wrong_len(self):
         self.Vec2(-1, 5) - (3, 4, 5)
 
+    def test_add_sub_sequence(self):
+        v = (1, 2) + self.Vec2(3, 4)
+        assert isinstance(v, self.Vec2), v
+        assert_equal(v, self.Vec2(4, 6))
+        v = (3, 3) - self.Vec2(1, 4)
+        assert isinstance(v, self.Vec2), v
+        assert_equal(v, self.Vec2(2, -1))
+        assert_equal([3, 3] - self.Vec2(1, 4), self.Vec2(2, -1))
+
     def test_mul(self):
         assert_equal(self.Vec2(2, 3) * 2, self.Vec2(4, 6))
         assert_equal(3 * self.Vec2(2, 1), self.Vec2(6, 3))
@@ -399,6 +438,41 @@ class Vec2BaseTestCase(object):
         assert self.Vec2(0,1) in s
         assert self.Vec2(0,0) not in s
 
+    def test_pickle(self):
+        import pickle
+        v = self.Vec2(0.1, -2.5)
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            p = pickle.loads(pickle.dumps(v, protocol))
+            assert isinstance(p, self.Vec2)
+            assert_equal(p, v)
+
+    def test_threaded_alloc(self):
+        import threading
+        errors = []
+        kept = []
+        def run(n):
+            try:
+                vecs = []
+                for i in range(5000):
+                    v = self.Vec2(n, i) + self.Vec2(0.5, 0.5)
+                    v = -(-v * 2) / 2
+                    if i % 3 == 0:
+                        vecs.append(v)
+                for i, v in enumerate(vecs):
+                    assert_equal(v, self.Vec2(n + 0.5, i * 3 + 0.5))
+                kept.extend(vecs[::100])
+            except Exception:
+                errors.append(sys.exc_info()[1])
+        threads = [threading.Thread(target=run, args=(n,))
+            for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert_equal(errors, [])
+        assert_equal(len(kept), 8 * 17)
+        assert self.Vec2(0.5, 0.5) in kept
+
 
 class PyVec2TestCase(Vec2BaseTestCase, unittest.TestCase):
     from planar.vector import Vec2
@@ -407,6 +481,21 @@ class PyVec2TestCase(Vec2BaseTestCase, unittest.TestCase):
 class CVec2TestCase(Vec2BaseTestCase, unittest.TestCase):
     from planar.c import Vec2
 
+    def test_subclass_init(self):
+        class Doubled(self.Vec2):
+            def __init__(self, x, y):
+                super(Doubled, self).__init__(x * 2, y * 2)
+        v = Doubled(1, 2)
+        assert isinstance(v, Doubled)
+        assert_equal(tuple(v), (2, 4))
+
+    def test_lerp_wrong_args(self):
+        v = self.Vec2(1, 2)
+        self.assertRaises(TypeError, v.lerp, (0, 0))
+        self.assertRaises(TypeError, v.lerp, (0, 0), 0.5, 1)
+        self.assertRaises(TypeError, v.lerp, (0, 0), "x")
+        self.assertRaises(TypeError, v.lerp, None, 0.5)
+
 
 class VectorSeqBaseTestCase(object):
 
@@ -576,6 +665,33 @@ class VectorSeqBaseTestCase(object):
         c[0] = (0,0.1)
         assert c[0] != p[0]
 
+    def test_pickle(self):
+        import pickle
+        a = self.VecSeq([(0.1,0), (1,-2.5), (1e100,1)])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            p = pickle.loads(pickle.dumps(a, protocol))
+            assert isinstance(p, self.VecSeq)
+            assert_equal(tuple(p), tuple(a))
+        p = pickle.loads(pickle.dumps(self.VecSeq([]), 2))
+        assert_equal(tuple(p), ())
+
+    def test_pickle_out_of_band(self):
+        import pickle
+        if pickle.HIGHEST_PROTOCOL < 5:
+            return
+        a = self.VecSeq([(i, -i) for i in range(100)])
+        buffers = []
+        data = pickle.dumps(a, 5, buffer_callback=buffers.append)
+        assert_equal(len(buffers), 1)
+        assert_equal(len(buffers[0].raw()), 1600)
+        assert len(data) < 200
+        p = pickle.loads(data, buffers=buffers)
+        assert_equal(tuple(p), tuple(a))
+
+    @raises(ValueError)
+    def test_from_bytes_bad_length(self):
+        self.VecSeq._from_bytes(b'x' * 24)
+
     @raises(TypeError)
     def test_unhashable(self):
         hash(self.VecSeq([(3,2), (6,0)]))
@@ -605,6 +721,25 @@ class CSeq2TestCase(VectorSeqBaseTestCase, unittest.TestCase):
     from planar.c import Vec2, Affine
     from planar.c import Seq2 as VecSeq
 
+    def test_buffer(self):
+        seq = self.VecSeq([(1,2), (3,4)])
+        view = memoryview(seq)
+        assert_equal(view.format, 'd')
+        assert_equal(view.shape, (2, 2))
+        assert not view.readonly
+        assert_equal(array.array('d', view.tobytes()).tolist(), [1, 2, 3, 4])
+        if sys.version_info >= (3,):
+            # Python 2 memoryviews cannot index multi-dimensional buffers
+            assert_equal(view.tolist(), [[1, 2], [3, 4]])
+            view[0, 1] = -2
+            assert_equal(seq[0], self.Vec2(1,-2))
+
+
+if numpy is not None:
+    class NpSeq2TestCase(VectorSeqBaseTestCase, unittest.TestCase):
+        from planar.np import Vec2, Affine
+        from planar.np import Seq2 as VecSeq
+
 
 class Vec2ArrayBaseTestCase(object):
     
@@ -898,6 +1033,11 @@ class Vec2ArrayBaseTestCase(object):
         va = self.Vec2Array([(3,-1)])
         va.clamped(-1, 1)
 
+    @raises(TypeError)
+    def test_clamped_duplicate_arg(self):
+        va = self.Vec2Array([(3,-1)])
+        va.clamped(1, min_length=1)
+
     def test_clamp(self):
         va = self.Vec2Array()
         assert_equal(va.clamp(1, 2), None)
@@ -926,6 +1066,78 @@ class Vec2ArrayBaseTestCase(object):
         va = self.Vec2Array([(3,-1)])
         va.clamp(-1, 1)
 
+    def test_lengths(self):
+        va = self.Vec2Array([(3,4), (0,0), (-1,0), (0,-2.5)])
+        lengths = va.lengths()
+        assert isinstance(lengths, array.array)
+        assert_equal(lengths.typecode, 'd')
+        assert_equal(list(lengths), [5, 0, 1, 2.5])
+        assert_equal(list(va.lengths2()), [25, 0, 1, 6.25])
+        assert_equal(len(self.Vec2Array().lengths()), 0)
+        assert_equal(len(self.Vec2Array().lengths2()), 0)
+
+    def test_dots(self):
+        va = self.Vec2Array([(1,2), (3,4), (-1,0)])
+        assert_equal(list(va.dots((2,-1))), [0, 2, -2])
+        assert_equal(list(va.dots(self.Vec2(0,1))), [2, 4, 0])
+        assert_equal(list(va.dots(self.Vec2Array([(1,1), (0,1), (2,2)]))),
+            [3, 4, -2])
+        assert_equal(list(va.dots(self.Seq2([(1,1), (0,1), (2,2)]))),
+            [3, 4, -2])
+        assert_equal(len(self.Vec2Array().dots((1,1))), 0)
+
+    def test_crosses(self):
+        va = self.Vec2Array([(1,2), (3,4), (-1,0)])
+        assert_equal(list(va.crosses((2,-1))), 
+            [v.cross((2,-1)) for v in va])
+        assert_equal(list(va.crosses(self.Vec2Array([(1,1), (0,1), (2,2)]))),
+            [-1, 3, -2])
+
+    def test_distances_to(self):
+        va = self.Vec2Array([(1,2), (4,6), (-1,0)])
+        assert_equal(list(va.distances_to((1,2))), 
+            [0, 5, math.sqrt(8)])
+        others = self.Vec2Array([(1,3), (1,2), (2,4)])
+        assert_equal(list(va.distances_to(others)), [1, 5, 5])
+
+    @raises(ValueError)
+    def test_dots_different_lengths(self):
+        self.Vec2Array([(1,2), (3,4)]).dots(self.Vec2Array([(1,2)]))
+
+    def test_crosses_different_lengths(self):
+        try:
+            self.Vec2Array([(1,2)]).crosses(self.Vec2Array([(1,2), (3,4)]))
+        except ValueError:
+            assert_equal(str(sys.exc_info()[1]), "cannot compute cross "
+                "products of arrays with different lengths")
+        else:
+            self.fail("ValueError not raised")
+
+    @raises(TypeError)
+    def test_dots_bad_arg(self):
+        self.Vec2Array([(1,2)]).dots(None)
+
+    @raises(TypeError)
+    def test_distances_to_bad_arg(self):
+        self.Vec2Array([(1,2)]).distances_to((1, 2, 3))
+
+    def test_sum_and_mean(self):
+        va = self.Vec2Array([(1,2), (3,4), (-1,0), (1,-2)])
+        assert_equal(va.sum(), self.Vec2(4,4))
+        assert_equal(va.mean(), self.Vec2(1,1))
+        assert_equal(self.Vec2Array().sum(), self.Vec2(0,0))
+        assert_equal(self.Vec2Array().mean(), None)
+        assert_equal(self.Vec2Array([(2,-3)]).mean(), self.Vec2(2,-3))
+
+    def test_min_and_max_point(self):
+        va = self.Vec2Array([(1,2), (3,-4), (-1,0), (1,5)])
+        assert_equal(va.min_point(), self.Vec2(-1,-4))
+        assert_equal(va.max_point(), self.Vec2(3,5))
+        assert_equal(self.Vec2Array([(2,-3)]).min_point(), self.Vec2(2,-3))
+        assert_equal(self.Vec2Array([(2,-3)]).max_point(), self.Vec2(2,-3))
+        assert_equal(self.Vec2Array().min_point(), None)
+        assert_equal(self.Vec2Array().max_point(), None)
+
     def test_add_arrays(self):
         va1 = self.Vec2Array([(1,2), (3,4)])
         va2 = self.Vec2Array([(-1,-1), (1,-2)])
@@ -1450,6 +1662,281 @@ class Vec2ArrayBaseTestCase(object):
         assert_equal(repr(va), 'Vec2Array([(0.0, 1.5), (2.0, 3.0)])')
         assert_equal(repr(va), str(va))
 
+    def test_from_buffer_2d(self):
+        if sys.version_info < (3,):
+            raise unittest.SkipTest("memoryview.cast() requires Python 3")
+        buf = memoryview(array.array('d', [0, 1, 2.5, -3, 4, 5])
+            ).cast('B').cast('d', (3, 2))
+        va = self.Vec2Array.from_buffer(buf)
+        assert isinstance(va, self.Vec2Array)
+        assert_equal(tuple(va), 
+            (self.Vec2(0,1), self.Vec2(2.5,-3), self.Vec2(4,5)))
+
+    def test_from_buffer_flat(self):
+        va = self.Vec2Array.from_buffer(array.array('d', [1, 2, 3, 4]))
+        assert_equal(tuple(va), (self.Vec2(1,2), self.Vec2(3,4)))
+        assert_equal(len(self.Vec2Array.from_buffer(array.array('d'))), 0)
+
+    def test_from_buffer_strided(self):
+        if sys.version_info < (3,):
+            raise unittest.SkipTest("strided memoryviews require Python 3")
+        buf = memoryview(array.array('d', range(8)))[::2]
+        va = self.Vec2Array.from_buffer(buf)
+        assert_equal(tuple(va), (self.Vec2(0,2), self.Vec2(4,6)))
+
+    def test_from_buffer_subclass(self):
+        class VASubclass(self.Vec2Array):
+            pass
+        va = VASubclass.from_buffer(array.array('d', [1, 2]))
+        assert isinstance(va, VASubclass)
+        assert_equal(tuple(va), (self.Vec2(1,2),))
+
+    @raises(TypeError)
+    def test_from_buffer_wrong_format(self):
+        self.Vec2Array.from_buffer(array.array('f', [1, 2]))
+
+    @raises(ValueError)
+    def test_from_buffer_wrong_shape(self):
+        self.Vec2Array.from_buffer(array.array('d', [1, 2, 3]))
+
+    @raises(TypeError)
+    def test_from_buffer_not_buffer(self):
+        self.Vec2Array.from_buffer([(1, 2)])
+
+    def write_points_file(self, values):
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as f:
+            array.array('d', values).tofile(f)
+        return path
+
+    def test_open_mmap(self):
+        path = self.write_points_file([0, 1, 2.5, -3, 4, 5])
+        va = self.Vec2Array.open_mmap(path)
+        assert isinstance(va, self.Vec2Array)
+        assert_equal(tuple(va), 
+            (self.Vec2(0,1), self.Vec2(2.5,-3), self.Vec2(4,5)))
+        assert_equal(tuple(va * self.Affine.translation((1, 1))),
+            (self.Vec2(1,2), self.Vec2(3.5,-2), self.Vec2(5,6)))
+
+    def test_open_mmap_empty(self):
+        path = self.write_points_file([])
+        assert_equal(len(self.Vec2Array.open_mmap(path)), 0)
+
+    def test_open_mmap_copy_on_write(self):
+        path = self.write_points_file([1, 2, 3, 4])
+        va = self.Vec2Array.open_mmap(path, 'c')
+        va[0] = (5, 6)
+        assert_equal(va[0], self.Vec2(5, 6))
+        del va
+        assert_equal(tuple(self.Vec2Array.open_mmap(path)),
+            (self.Vec2(1,2), self.Vec2(3,4)))
+
+    @raises(ValueError)
+    def test_open_mmap_bad_size(self):
+        path = self.write_points_file([1, 2, 3])
+        self.Vec2Array.open_mmap(path)
+
+    @raises(ValueError)
+    def test_open_mmap_bad_mode(self):
+        path = self.write_points_file([1, 2])
+        self.Vec2Array.open_mmap(path, 'w')
+
+
+class Vec2Array32BaseTestCase(object):
+
+    def test_new_empty(self):
+        va = self.Vec2Array32()
+        assert_equal(len(va), 0)
+        assert_equal(list(va), [])
+
+    def test_new_from_points(self):
+        va = self.Vec2Array32([(1.5, -2), self.Vec2(0.25, 4)])
+        assert_equal(len(va), 2)
+        assert_equal(va[0], self.Vec2(1.5, -2))
+        assert_equal(va[1], self.Vec2(0.25, 4))
+        assert_equal(va[-1], self.Vec2(0.25, 4))
+        assert_equal(list(va), [self.Vec2(1.5, -2), self.Vec2(0.25, 4)])
+        assert_equal(self.Vec2Array32.from_points(va), va)
+
+    def test_single_precision(self):
+        va = self.Vec2Array32([(0.1, 1e-50)])
+        assert_equal(va[0].x, array.array('f', [0.1])[0])
+        assert va[0].x != 0.1
+        assert_equal(va[0].y, 0)
+
+    def test_convert_from_and_to_array(self):
+        points = [(1.5, -2), (0.25, 4), (-8, 0.5)]
+        va64 = self.Vec2Array(points)
+        va = self.Vec2Array32(va64)
+        assert_equal(list(va), list(va64))
+        converted = va.to_array()
+        assert_equal(type(converted).__name__, 'Vec2Array')
+        assert_equal(tuple(converted), tuple(va64))
+        assert_equal(self.Vec2Array32(va), va)
+
+    def test_setitem(self):
+        va = self.Vec2Array32([(1, 2), (3, 4)])
+        va[0] = (5, 6)
+        va[-1] = self.Vec2(7, 8)
+        assert_equal(list(va), [self.Vec2(5, 6), self.Vec2(7, 8)])
+
+    @raises(IndexError)
+    def test_getitem_out_of_range(self):
+        self.Vec2Array32([(1, 2)])[1]
+
+    @raises(IndexError)
+    def test_setitem_out_of_range(self):
+        va = self.Vec2Array32([(1, 2)])
+        va[-2] = (0, 0)
+
+    @raises(TypeError)
+    def test_setitem_wrong_type(self):
+        va = self.Vec2Array32([(1, 2)])
+        va[0] = None
+
+    @raises(TypeError)
+    def test_delitem(self):
+        va = self.Vec2Array32([(1, 2)])
+        del va[0]
+
+    def test_append_and_extend(self):
+        va = self.Vec2Array32()
+        va.append((1, 2))
+        va.extend([(3, 4), self.Vec2(5, 6)])
+        va.extend(self.Vec2Array([(7, 8)]))
+        va.extend(va)
+        assert_equal(list(va), [self.Vec2(i, i + 1) for i in (1, 3, 5, 7)] * 2)
+
+    def test_extend_failure_leaves_array(self):
+        va = self.Vec2Array32([(1, 2)])
+        try:
+            va.extend([(3, 4), None])
+        except TypeError:
+            pass
+        else:
+            self.fail("TypeError not raised")
+        assert_equal(list(va), [self.Vec2(1, 2)])
+
+    def test_equality(self):
+        va = self.Vec2Array32([(1, 2), (3, 4)])
+        assert va == self.Vec2Array32([(1, 2), (3, 4)])
+        assert not va != self.Vec2Array32([(1, 2), (3, 4)])
+        assert va != self.Vec2Array32([(1, 2), (3, 5)])
+        assert va != self.Vec2Array32([(1, 2)])
+        assert va != self.Vec2Array([(1, 2), (3, 4)])
+        assert va.almost_equals(self.Vec2Array32([(1, 2), (3, 4.000001)]))
+        assert not va.almost_equals(self.Vec2Array32([(1, 2), (3, 4.1)]))
+
+    def test_copy(self):
+        import copy
+        va = self.Vec2Array32([(1, 2), (3, 4)])
+        for va2 in (copy.copy(va), copy.deepcopy(va)):
+            assert va2 is not va
+            assert_equal(va2, va)
+            va2[0] = (0, 0)
+            assert_equal(va[0], self.Vec2(1, 2))
+
+    def test_pickle(self):
+        import pickle
+        va = self.Vec2Array32([(0.1, 2), (3, -4)])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            p = pickle.loads(pickle.dumps(va, protocol))
+            assert isinstance(p, self.Vec2Array32)
+            assert_equal(p, va)
+        if pickle.HIGHEST_PROTOCOL >= 5:
+            buffers = []
+            data = pickle.dumps(va, 5, buffer_callback=buffers.append)
+            assert_equal(len(buffers), 1)
+            assert_equal(pickle.loads(data, buffers=buffers), va)
+
+    def test_transform(self):
+        va = self.Vec2Array32([(1, 0), (0, 2), (-4, 0.5)])
+        t = self.Affine.rotation(90) * self.Affine.scale(2)
+        result = va * t
+        assert isinstance(result, self.Vec2Array32)
+        assert result.almost_equals(self.Vec2Array32(
+            [(0, 2), (-4, 0), (-1, -8)]))
+        assert result.almost_equals(t * va)
+        assert_equal(va[0], self.Vec2(1, 0))
+        va *= t
+        assert va.almost_equals(result)
+
+    def test_affine_transform(self):
+        va = self.Vec2Array32([(1, 0), (0, 2), (-4, 0.5)])
+        t = self.Affine.rotation(90) * self.Affine.scale(2)
+        result = t.transform(va)
+        assert isinstance(result, self.Vec2Array32)
+        assert result.almost_equals(va * t)
+        out = self.Vec2Array([(0, 0)] * 3)
+        assert t.transform(va, out) is out
+        assert out.almost_equals(self.Vec2Array(result))
+        out = self.Vec2Array32([(0, 0)] * 3)
+        assert t.transform([(1, 0), (0, 2), (-4, 0.5)], out) is out
+        assert out.almost_equals(result)
+
+    @raises(TypeError)
+    def test_getitem_slice(self):
+        self.Vec2Array32([(1, 2), (3, 4)])[0:1]
+
+    def test_from_buffer(self):
+        va = self.Vec2Array32.from_buffer(array.array('f', [1, 2, 3, 4]))
+        assert_equal(list(va), [self.Vec2(1, 2), self.Vec2(3, 4)])
+        if sys.version_info >= (3,):
+            # Strided views are not available in Python 2
+            buf = memoryview(array.array('f', range(8)))[::2]
+            va = self.Vec2Array32.from_buffer(buf)
+            assert_equal(list(va), [self.Vec2(0, 2), self.Vec2(4, 6)])
+
+    @raises(TypeError)
+    def test_from_buffer_doubles(self):
+        self.Vec2Array32.from_buffer(array.array('d', [1, 2]))
+
+    @raises(ValueError)
+    def test_from_buffer_bad_shape(self):
+        self.Vec2Array32.from_buffer(array.array('f', [1, 2, 3]))
+
+    @raises(TypeError)
+    def test_unhashable(self):
+        hash(self.Vec2Array32())
+
+    def test_repr(self):
+        va = self.Vec2Array32([(0, 1.5), (2, 3)])
+        assert_equal(repr(va), str(va))
+        assert repr(va).startswith('Vec2Array32([')
+        assert_equal(eval(repr(va), {'Vec2Array32': self.Vec2Array32}), va)
+
+
+class PyVec2Array32TestCase(Vec2Array32BaseTestCase, unittest.TestCase):
+    from planar.vector import Vec2, Vec2Array, Vec2Array32
+    from planar.transform import Affine
+
+
+class CVec2Array32TestCase(Vec2Array32BaseTestCase, unittest.TestCase):
+    from planar.c import Vec2, Vec2Array, Vec2Array32, Affine
+
+    def test_buffer(self):
+        va = self.Vec2Array32([(1, 2), (3, 4)])
+        view = memoryview(va)
+        assert_equal(view.format, 'f')
+        assert_equal(view.itemsize, 4)
+        assert_equal(view.shape, (2, 2))
+        assert_equal(view.strides, (8, 4))
+        assert_equal(array.array('f', view.tobytes()).tolist(), [1, 2, 3, 4])
+        if sys.version_info >= (3,):
+            # Python 2 memoryviews cannot index multi-dimensional buffers
+            assert_equal(view.nbytes, 16)
+            assert_equal(view.tolist(), [[1, 2], [3, 4]])
+            view[1, 0] = 7
+            assert_equal(va[1], self.Vec2(7, 4))
+        assert_equal(self.Vec2Array32.from_buffer(va), va)
+
+    @raises(BufferError)
+    def test_buffer_export_prevents_resize(self):
+        va = self.Vec2Array32([(1, 2), (3, 4)])
+        view = memoryview(va)
+        va.append((5, 6))
+
 
 class PyVec2ArrayTestCase(
     Vec2ArrayBaseTestCase, VectorSeqBaseTestCase, unittest.TestCase):
@@ -1458,6 +1945,19 @@ class PyVec2ArrayTestCase(
     from planar.vector import Vec2, Seq2
     from planar.transform import Affine
 
+    @raises(ValueError)
+    def test_open_mmap_read_write(self):
+        path = self.write_points_file([1, 2])
+        self.Vec2Array.open_mmap(path, 'r+')
+
+    def test_open_mmap_read_is_copy(self):
+        path = self.write_points_file([1, 2, 3, 4])
+        va = self.Vec2Array.open_mmap(path)
+        va[0] = (5, 6)
+        assert_equal(va[0], self.Vec2(5, 6))
+        assert_equal(tuple(self.Vec2Array.open_mmap(path)),
+            (self.Vec2(1,2), self.Vec2(3,4)))
+
 
 class CVec2ArrayTestCase(
     Vec2ArrayBaseTestCase, VectorSeqBaseTestCase, unittest.TestCase):
@@ -1470,6 +1970,207 @@ class CVec2ArrayTestCase(
         assert_equal(repr(va), 'Vec2Array([(0, 1.5), (2, 3)])')
         assert_equal(repr(va), str(va))
 
+    def test_buffer(self):
+        va = self.Vec2Array([(0,1.5), (2,3), (-4,5)])
+        view = memoryview(va)
+        assert_equal(view.format, 'd')
+        assert_equal(view.itemsize, 8)
+        assert_equal(view.ndim, 2)
+        assert_equal(view.shape, (3, 2))
+        assert_equal(view.strides, (16, 8))
+        assert not view.readonly
+        assert_equal(array.array('d', view.tobytes()).tolist(), 
+            [0, 1.5, 2, 3, -4, 5])
+        if sys.version_info >= (3,):
+            # Python 2 memoryviews cannot index multi-dimensional buffers
+            assert view.c_contiguous
+            assert_equal(view.tolist(), [[0, 1.5], [2, 3], [-4, 5]])
+            view[1, 0] = 7
+            assert_equal(va[1], self.Vec2(7, 3))
+        assert_equal(tuple(self.Vec2Array.from_buffer(va)), tuple(va))
+
+    def test_buffer_empty(self):
+        view = memoryview(self.Vec2Array())
+        assert_equal(view.shape, (0, 2))
+        assert_equal(view.tobytes(), b'')
+
+    def test_buffer_export_prevents_resize(self):
+        va = self.Vec2Array([(0,1), (2,3), (4,5)])
+        view = memoryview(va)
+        for resize in [lambda: va.append((1,1)), 
+                       lambda: va.extend([(1,1)]),
+                       lambda: va.insert(0, (1,1)),
+                       lambda: va.__delitem__(0),
+                       lambda: va.__delitem__(slice(None, None, 2)),
+                       lambda: va.__setitem__(slice(0, 1), [])]:
+            try:
+                resize()
+            except BufferError:
+                pass
+            else:
+                self.fail('BufferError not raised')
+        assert_equal(tuple(va), 
+            (self.Vec2(0,1), self.Vec2(2,3), self.Vec2(4,5)))
+        va[0:1] = [(-1, -1)]
+        assert_equal(va[0], self.Vec2(-1,-1))
+        del view
+        va.append((6,7))
+        assert_equal(len(va), 4)
+
+    def test_threaded_read_and_resize(self):
+        import threading
+        from planar.c import BoundingBox, Polygon
+        va = self.Vec2Array([(i, -i) for i in range(20000)])
+        square = Polygon([(0, 0), (0, -10), (10, -10), (10, 0)])
+        errors = []
+        def read():
+            try:
+                for i in range(50):
+                    BoundingBox(va)
+                    Polygon.convex_hull(va)
+                    square.contains_points(va)
+                    va * self.Affine.scale(2)
+                    va.__imul__(self.Affine.identity())
+                    self.Affine.identity().itransform(va)
+            except Exception:
+                errors.append(sys.exc_info()[1])
+        def resize():
+            # Reading in other threads does not prevent resizing
+            try:
+                for i in range(2000):
+                    va.append((0, 0))
+                    del va[-1]
+            except Exception:
+                errors.append(sys.exc_info()[1])
+        threads = [threading.Thread(target=read) for i in range(3)] + [
+            threading.Thread(target=resize) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert_equal(errors, [])
+        assert_equal(len(va), 20000)
+
+    def test_open_mmap_read_only(self):
+        path = self.write_points_file([1, 2, 3, 4])
+        va = self.Vec2Array.open_mmap(path)
+        for modify in [lambda: va.__setitem__(0, (1,1)),
+                       lambda: va.__setitem__(slice(0, 1), [(1,1)]),
+                       lambda: va.__delitem__(0),
+                       lambda: va.__iadd__((1, 1)),
+                       lambda: va.__imul__(self.Affine.scale(2)),
+                       lambda: self.Affine.scale(2).itransform(va),
+                       va.normalize,
+                       va.clamp]:
+            try:
+                modify()
+            except TypeError:
+                pass
+            else:
+                self.fail('TypeError not raised')
+        assert_equal(tuple(va), (self.Vec2(1,2), self.Vec2(3,4)))
+        view = memoryview(va)
+        assert view.readonly
+        assert_equal(array.array('d', view.tobytes()).tolist(), [1, 2, 3, 4])
+
+    def test_open_mmap_read_write(self):
+        path = self.write_points_file([1, 2, 3, 4])
+        va = self.Vec2Array.open_mmap(path, 'r+')
+        va *= self.Affine.scale(2)
+        va[1] = (-1, -1)
+        assert not memoryview(va).readonly
+        del va
+        assert_equal(tuple(self.Vec2Array.open_mmap(path)),
+            (self.Vec2(2,4), self.Vec2(-1,-1)))
+
+    def test_open_mmap_prevents_resize(self):
+        path = self.write_points_file([1, 2, 3, 4])
+        va = self.Vec2Array.open_mmap(path, 'r+')
+        for resize in [lambda: va.append((1,1)), 
+                       lambda: va.extend([(1,1)]),
+                       lambda: va.__delitem__(0)]:
+            try:
+                resize()
+            except BufferError:
+                pass
+            else:
+                self.fail('BufferError not raised')
+        assert_equal(len(va), 2)
+
+
+    def test_pickle_open_mmap(self):
+        import pickle
+        path = self.write_points_file([1, 2, 3, 4])
+        va = self.Vec2Array.open_mmap(path)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            p = pickle.loads(pickle.dumps(va, protocol))
+            assert_equal(tuple(p), tuple(va))
+            p.append((5, 6))
+
+
+if numpy is not None:
+    class NpVec2ArrayTestCase(
+        Vec2ArrayBaseTestCase, VectorSeqBaseTestCase, unittest.TestCase):
+        from planar.np import Vec2Array
+        from planar.np import Vec2Array as VecSeq
+        from planar.np import Vec2, Seq2, Affine
+
+        def test_init_from_ndarray(self):
+            a = numpy.arange(6).reshape(3, 2)
+            va = self.Vec2Array(a)
+            assert_equal(tuple(va), 
+                (self.Vec2(0, 1), self.Vec2(2, 3), self.Vec2(4, 5)))
+            a[0] = (7, 8)
+            assert_equal(va[0], self.Vec2(0, 1))
+
+        def test_asarray(self):
+            va = self.Vec2Array([(0,1.5), (2,3), (-4,5)])
+            a = numpy.asarray(va)
+            assert_equal(a.shape, (3, 2))
+            assert_equal(a.dtype, numpy.float64)
+            assert not a.flags.writeable
+            assert_equal(a.tolist(), [[0, 1.5], [2, 3], [-4, 5]])
+            va[1] = (7, 3)
+            assert_equal(a.tolist(), [[0, 1.5], [2, 3], [-4, 5]])
+            assert_equal(numpy.asarray(va).tolist(), 
+                [[0, 1.5], [7, 3], [-4, 5]])
+            assert numpy.array(va, copy=True).flags.writeable
+
+        def test_copy_mutation_is_independent(self):
+            import copy
+            va = self.Vec2Array([(1, 2), (3, 4)])
+            va2 = copy.copy(va * 2)
+            va2[0] = (0, 0)
+            va2.append((5, 6))
+            assert_equal(tuple(va), (self.Vec2(1, 2), self.Vec2(3, 4)))
+            assert_equal(tuple(va2), 
+                (self.Vec2(0, 0), self.Vec2(6, 8), self.Vec2(5, 6)))
+
+        def test_large_arithmetic(self):
+            size = 1001
+            va = self.Vec2Array([(i, -i) for i in range(size)])
+            va2 = va * 2 + (1, 1) - va
+            va2 /= (2, 4)
+            assert_equal(len(va2), size)
+            for i in (0, 1, 500, size - 1):
+                assert_equal(va2[i], 
+                    (self.Vec2(i, -i) * 2 + (1, 1) - va[i]) / (2, 4))
+            assert_equal(va.dots((1, 1)), 
+                array.array('d', [0] * size))
+
+        @raises(ValueError)
+        def test_open_mmap_read_write(self):
+            path = self.write_points_file([1, 2])
+            self.Vec2Array.open_mmap(path, 'r+')
+
+        def test_open_mmap_read_is_copy(self):
+            path = self.write_points_file([1, 2, 3, 4])
+            va = self.Vec2Array.open_mmap(path)
+            va[0] = (5, 6)
+            assert_equal(va[0], self.Vec2(5, 6))
+            assert_equal(tuple(self.Vec2Array.open_mmap(path)),
+                (self.Vec2(1,2), self.Vec2(3,4)))
+
 
 if __name__ == '__main__':
     unittest.main()